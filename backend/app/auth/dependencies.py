@@ -18,6 +18,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.auth.principal_cache import principal_cache
 from app.config import settings
 from app.database import get_db
 from app.models import Group, RevokedToken, Role, User
@@ -112,10 +113,22 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    user_id = int(payload.get("sub"))
+    jti, sid = payload.get("jti"), payload.get("sid")
+
+    # Recently resolved (jti, sid): no revocation / user / session queries.
+    # Entries are dropped on logout, password change, role change and session end.
+    cached = principal_cache.get(jti, sid)
+    if cached is not None and cached.user_id == user_id:
+        user = await db.merge(cached.user, load=False)
+        user.__dict__["_principal_permissions"] = cached.permissions
+        return user
+
+    generation = principal_cache.generation
+
     # Check individual token revocation (JTI)
     await check_token_revocation(payload, db)
 
-    user_id = int(payload.get("sub"))
     user = await get_user_by_id(db, user_id)
 
     if user is None:
@@ -143,16 +156,23 @@ async def get_current_user(
             )
 
     # Check active session if token has sid claim
-    sid = payload.get("sid")
+    session_expires_at = None
     if sid:
-        from app.services.session_service import check_session_valid
-        if not await check_session_valid(sid, db):
+        from app.services.session_service import get_valid_session
+        session = await get_valid_session(sid, db)
+        if session is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Session expired — please log in again",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        session_expires_at = session.expires_at
 
+    principal_cache.put(
+        jti, sid, user, generation,
+        permissions=_get_user_permissions(user),
+        session_expires_at=session_expires_at,
+    )
     return user
 
 
@@ -217,6 +237,9 @@ class Perm(StrEnum):
 
 def _get_user_permissions(user: User) -> set[str]:
     """Resolve permissions via User -> Groups -> Roles -> Permissions chain."""
+    cached = vars(user).get("_principal_permissions")
+    if cached is not None:
+        return set(cached)
     perms = set()
     for group in user.groups:
         for role in group.roles:
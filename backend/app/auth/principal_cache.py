@@ -0,0 +1,327 @@
+"""
+Short-TTL cache of resolved principals for get_current_user.
+
+Every authenticated request used to cost three queries before the handler ran:
+the RevokedToken lookup, the User + groups/roles/permissions load and the
+ActiveSession check. Dashboards poll many endpoints every few seconds, so the
+same (jti, sid) pair was re-resolved constantly. PrincipalCache keeps the
+outcome of a successful resolution for PRINCIPAL_CACHE_TTL_SECONDS (capped at
+the session's own expiry):
+
+- the User with groups -> roles -> permissions loaded, as a detached copy.
+  A hit merges it into the request's session with ``merge(load=False)``, so
+  handlers get a normal attached instance (changes they commit persist) and
+  no SQL is issued;
+- the resolved permission set, ``tokens_valid_after`` and session validity.
+
+Invalidation is driven by the ORM rather than by every call site: session
+event hooks record which principals a transaction touched — a new
+RevokedToken (logout), an ActiveSession ended, any User change (password
+change bumps ``tokens_valid_after``, admin disable), and any change to
+groups / roles / permissions or their association tables (role change) —
+and drop them when the transaction commits. The same invalidation is then
+published on the ``auth:invalidate`` Redis channel so the other process
+(web / trader) drops its copies too.
+
+A generation counter guards the fill path: a resolution that started before
+an invalidation is not stored, so a request racing a logout cannot cache the
+pre-logout principal.
+"""
+
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+PRINCIPAL_CACHE_TTL_SECONDS = 30.0
+PRINCIPAL_CACHE_MAX_ENTRIES = 10_000
+INVALIDATION_CHANNEL = "auth:invalidate"
+
+# Tables whose writes change what get_current_user resolves. Core DML against
+# them (bulk updates, association-table inserts/deletes) invalidates everything.
+_RBAC_TABLES = frozenset({
+    "users", "groups", "roles", "permissions", "user_groups", "group_roles", "role_permissions",
+    "active_sessions",
+})
+
+_PENDING_KEY = "principal_cache_invalidations"
+
+Key = Tuple[str, Optional[str]]  # (jti, sid)
+
+
+@dataclass
+class CachedPrincipal:
+    user: Any  # detached User copy with groups/roles/permissions loaded
+    user_id: int
+    permissions: FrozenSet[str]
+    tokens_valid_after: Optional[datetime]
+    session_valid: bool
+    expires_at: float  # monotonic
+
+
+@dataclass
+class _Stats:
+    hits: int = 0
+    misses: int = 0
+    fills: int = 0
+    stale_fills: int = 0
+    invalidations: int = 0
+    remote_invalidations: int = 0
+    by_reason: Dict[str, int] = field(default_factory=dict)
+
+
+class PrincipalCache:
+    """(jti, sid) -> CachedPrincipal, thread-safe, invalidated on commit."""
+
+    def __init__(self, ttl: float = PRINCIPAL_CACHE_TTL_SECONDS, max_entries: int = PRINCIPAL_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Key, CachedPrincipal] = {}
+        self._by_user: Dict[int, Set[Key]] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.redis_fanout = False  # set at startup once the pub/sub subscriber runs
+        self._stats = _Stats()
+
+    # ------------------------------------------------------------------
+    # Lookup / fill
+    # ------------------------------------------------------------------
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, jti: Optional[str], sid: Optional[str]) -> Optional[CachedPrincipal]:
+        if not jti:
+            return None
+        with self._lock:
+            entry = self._entries.get((jti, sid))
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._drop((jti, sid))
+                entry = None
+            if entry is None:
+                self._stats.misses += 1
+            else:
+                self._stats.hits += 1
+            return entry
+
+    def put(
+        self,
+        jti: Optional[str],
+        sid: Optional[str],
+        user: Any,
+        generation: int,
+        permissions: Iterable[str] = (),
+        session_expires_at: Optional[datetime] = None,
+    ) -> bool:
+        """Cache a successful resolution started at ``generation``. Returns
+        False (and caches nothing) if an invalidation happened meanwhile."""
+        if not jti:
+            return False
+        try:
+            detached = _detached_copy(user)
+        except Exception as e:  # not a mapped instance (tests), or not clean
+            logger.debug(f"Principal not cacheable: {e}")
+            return False
+
+        ttl = self.ttl
+        if session_expires_at is not None:
+            from app.utils.timeutil import utcnow
+            ttl = min(ttl, (session_expires_at - utcnow()).total_seconds())
+        if ttl <= 0:
+            return False
+
+        entry = CachedPrincipal(
+            user=detached,
+            user_id=user.id,
+            permissions=frozenset(permissions),
+            tokens_valid_after=user.tokens_valid_after,
+            session_valid=True,
+            expires_at=time.monotonic() + ttl,
+        )
+        with self._lock:
+            if generation != self._generation:
+                self._stats.stale_fills += 1
+                return False
+            if len(self._entries) >= self.max_entries:
+                self._evict_expired()
+                if len(self._entries) >= self.max_entries:
+                    self._drop(next(iter(self._entries)))
+            key = (jti, sid)
+            self._entries[key] = entry
+            self._by_user.setdefault(entry.user_id, set()).add(key)
+            self._stats.fills += 1
+            return True
+
+    def _drop(self, key: Key) -> None:
+        # Caller holds self._lock
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            keys = self._by_user.get(entry.user_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_user[entry.user_id]
+
+    def _evict_expired(self) -> None:
+        # Caller holds self._lock
+        now = time.monotonic()
+        for key in [k for k, e in self._entries.items() if e.expires_at <= now]:
+            self._drop(key)
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def invalidate(self, targets: Iterable[Tuple[str, Any]], remote: bool = False) -> None:
+        """Drop cached principals. ``targets`` holds ("jti", jti), ("sid", sid),
+        ("user", user_id) or ("all", None) tuples."""
+        targets = list(targets)
+        if not targets:
+            return
+        with self._lock:
+            self._generation += 1
+            for kind, value in targets:
+                self._stats.by_reason[kind] = self._stats.by_reason.get(kind, 0) + 1
+                if kind == "all":
+                    self._entries.clear()
+                    self._by_user.clear()
+                elif kind == "user":
+                    for key in list(self._by_user.get(value, ())):
+                        self._drop(key)
+                elif kind in ("jti", "sid"):
+                    index = 0 if kind == "jti" else 1
+                    for key in [k for k in self._entries if k[index] == value]:
+                        self._drop(key)
+            if remote:
+                self._stats.remote_invalidations += 1
+            else:
+                self._stats.invalidations += 1
+
+    async def publish(self, targets: Iterable[Tuple[str, Any]]) -> None:
+        """Fan an invalidation out to the other processes (best-effort)."""
+        if not self.redis_fanout:
+            return
+        try:
+            from app.redis_client import get_redis
+            redis = await get_redis()
+            await redis.publish(INVALIDATION_CHANNEL, json.dumps([list(t) for t in targets]))
+        except Exception as e:
+            logger.warning(f"Principal cache invalidation publish failed (TTL still bounds staleness): {e}")
+
+    def handle_message(self, raw: str) -> None:
+        """Apply an invalidation received on INVALIDATION_CHANNEL."""
+        try:
+            targets = [(kind, value) for kind, value in json.loads(raw)]
+        except (ValueError, TypeError):
+            logger.warning(f"Principal cache: invalid invalidation message {raw[:80]!r}")
+            return
+        self.invalidate(targets, remote=True)
+
+    def clear(self) -> None:
+        self.invalidate([("all", None)])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            s = self._stats
+            lookups = s.hits + s.misses
+            return {
+                "entries": len(self._entries),
+                "hits": s.hits,
+                "misses": s.misses,
+                "hit_ratio": round(s.hits / lookups, 4) if lookups else 0.0,
+                "fills": s.fills,
+                "stale_fills": s.stale_fills,
+                "invalidations": s.invalidations,
+                "remote_invalidations": s.remote_invalidations,
+                "invalidations_by_reason": dict(s.by_reason),
+            }
+
+
+def _detached_copy(user: Any) -> Any:
+    """Copy a clean, loaded User (and its loaded relationships) out of its session."""
+    scratch = Session()
+    try:
+        copy = scratch.merge(user, load=False)
+        scratch.expunge_all()
+        return copy
+    finally:
+        scratch.close()
+
+
+# ---------------------------------------------------------------------------
+# ORM hooks: collect invalidations per transaction, apply them on commit
+# ---------------------------------------------------------------------------
+
+
+def _pending(session: Session) -> Set[Tuple[str, Any]]:
+    return session.info.setdefault(_PENDING_KEY, set())
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    from app.models import ActiveSession, Group, Permission, RevokedToken, Role, User
+
+    pending = None
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, RevokedToken):
+            target = ("jti", obj.jti)
+        elif isinstance(obj, ActiveSession) and obj not in session.new:
+            target = ("sid", obj.session_id)
+        elif isinstance(obj, User) and obj not in session.new:
+            target = ("user", obj.id)
+        elif isinstance(obj, (Group, Role, Permission)) and obj not in session.new:
+            target = ("all", None)
+        else:
+            continue
+        if pending is None:
+            pending = _pending(session)
+        pending.add(target)
+
+
+def _do_orm_execute(orm_execute_state) -> None:
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if getattr(table, "name", None) in _RBAC_TABLES:
+        _pending(orm_execute_state.session).add(("all", None))
+
+
+def _after_commit(session: Session) -> None:
+    targets = session.info.pop(_PENDING_KEY, None)
+    if not targets:
+        return
+    principal_cache.invalidate(targets)
+    if principal_cache.redis_fanout:
+        import asyncio
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # sync session outside the event loop; TTL bounds the other process
+        loop.create_task(principal_cache.publish(sorted(targets, key=str)))
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def install_session_hooks() -> None:
+    """Register the ORM hooks on every Session (idempotent)."""
+    if event.contains(Session, "after_commit", _after_commit):
+        return
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "do_orm_execute", _do_orm_execute)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+
+
+# Global instance
+principal_cache = PrincipalCache()
+install_session_hooks()
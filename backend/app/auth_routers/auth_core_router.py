@@ -26,6 +26,7 @@ from app.auth.dependencies import (
 )
 from app.config import settings
 from app.database import get_db
+from app.json_response import utc_isoformat
 from app.models import EmailVerificationToken, Group, RevokedToken, TrustedDevice, User
 
 from app.auth_routers.helpers import (
@@ -245,7 +246,7 @@ async def login(
     if has_any_limits(policy):
         response.session_policy = policy
         response.session_expires_at = (
-            session_expires_at.isoformat() if session_expires_at else None
+            utc_isoformat(session_expires_at) if session_expires_at else None
         )
 
     return response
@@ -340,7 +341,7 @@ async def refresh_token(
         )
         sess_row = sess_result.first()
         if sess_row and sess_row[0]:
-            response.session_expires_at = sess_row[0].isoformat()
+            response.session_expires_at = utc_isoformat(sess_row[0])
 
     return response
 
@@ -19,6 +19,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
+from app.json_response import utc_isoformat
 from app.models import TrustedDevice, User
 
 from app.auth_routers.schemas import GroupResponse, LoginResponse, UserResponse
@@ -331,6 +332,6 @@ async def _complete_mfa_login(
 
     if has_any_limits(policy):
         response.session_policy = policy
-        response.session_expires_at = session_expires_at.isoformat() if session_expires_at else None
+        response.session_expires_at = utc_isoformat(session_expires_at) if session_expires_at else None
 
     return response
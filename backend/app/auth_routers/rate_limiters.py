@@ -1,24 +1,27 @@
 """
 Rate limiting logic for authentication endpoints.
 
-Hybrid approach: in-memory dict for fast lookups + DB persistence so
-rate-limit state survives application restarts.  On startup the in-memory
-cache is cold; the first check for any key falls through to a DB count
-query and warms the cache.
+Hybrid approach: in-memory GCRA state (app.rate_limit_engine, constant memory
+per key) for fast lookups + DB persistence so rate-limit state survives
+application restarts.  On startup the in-memory state is cold; the first
+async check for any key falls through to a DB count query and warms it.
+The async _check/_record pair shares its state through Redis when
+attach_shared_redis() has run, and then needs no warming.
 
 Categories: login, signup, forgot_pw, resend, mfa
 """
 
 import logging
+import math
 from app.utils.timeutil import utcnow
 import time
-from collections import defaultdict
 from datetime import timedelta
 
 from fastapi import HTTPException
 from sqlalchemy import delete, func, select
 
 from app.database import async_session_maker
+from app.rate_limit_engine import RateLimitDecision, RateLimitEngine
 
 logger = logging.getLogger(__name__)
 
@@ -41,32 +44,10 @@ _LIMITS = {
 }
 
 # ---------------------------------------------------------------------------
-# In-memory cache (fast path — identical to the original implementation)
+# In-memory state (fast path): one GCRA arrival time per (category, key)
 # ---------------------------------------------------------------------------
 
-_login_attempts: dict = defaultdict(list)
-_login_attempts_by_username: dict = defaultdict(list)
-_signup_attempts: dict = defaultdict(list)
-_forgot_pw_attempts: dict = defaultdict(list)
-_forgot_pw_by_email: dict = defaultdict(list)
-_resend_attempts: dict = defaultdict(list)
-_mfa_attempts: dict = defaultdict(list)
-_disposable_email_attempts: dict = defaultdict(list)
-_refresh_attempts: dict = defaultdict(list)
-_change_pw_attempts: dict = defaultdict(list)
-
-_CATEGORY_STORE = {
-    "login":              _login_attempts,
-    "login_user":         _login_attempts_by_username,
-    "signup":             _signup_attempts,
-    "forgot_pw":          _forgot_pw_attempts,
-    "forgot_pw_email":    _forgot_pw_by_email,
-    "resend":             _resend_attempts,
-    "mfa":                _mfa_attempts,
-    "disposable_email":   _disposable_email_attempts,
-    "refresh":            _refresh_attempts,
-    "change_pw":          _change_pw_attempts,
-}
+_limiter = RateLimitEngine("auth")
 
 # Track whether a key has been warmed from DB
 _warmed: set = set()
@@ -157,20 +138,15 @@ def _fire_and_forget(coro):
 
 
 def _prune_memory():
-    """Periodically prune stale in-memory entries."""
+    """Periodically drop keys whose budget has fully refilled."""
     global _last_prune_time
     now = time.time()
     if now - _last_prune_time < _PRUNE_INTERVAL:
         return
     _last_prune_time = now
-    total = 0
-    for cat, store in _CATEGORY_STORE.items():
-        _, window = _LIMITS[cat]
-        stale = [k for k, ts in store.items() if not any(now - t < window for t in ts)]
-        for k in stale:
-            del store[k]
-            _warmed.discard((cat, k))
-        total += len(stale)
+    stale = _limiter.prune()
+    _warmed.difference_update(stale)
+    total = len(stale)
     # Cap _warmed set — it's a "have I loaded from DB" tracker that rebuilds on demand
     if len(_warmed) > _MAX_WARMED_SIZE:
         _warmed.clear()
@@ -179,12 +155,27 @@ def _prune_memory():
         logger.debug("Pruned %d stale rate limiter entries", total)
 
 
-def _mem_count(store: dict, key: str, window: int) -> tuple[int, list]:
-    """Count recent in-memory attempts and return cleaned list."""
-    now = time.time()
-    cleaned = [t for t in store[key] if now - t < window]
-    store[key] = cleaned
-    return len(cleaned), cleaned
+def _peek(category: str, key: str) -> RateLimitDecision:
+    max_attempts, window = _LIMITS[category]
+    return _limiter.peek((category, key), max_attempts, window)
+
+
+def _hit(category: str, key: str) -> None:
+    """Count an attempt in memory (always — attempts are counted even when limited)."""
+    max_attempts, window = _LIMITS[category]
+    _limiter.hit((category, key), max_attempts, window, force=True)
+    _warmed.add((category, key))
+
+
+def _raise_limited(error_msg: str, retry_after: float, unit: str = "minute"):
+    retry_after = math.ceil(retry_after)
+    seconds = 3600 if unit == "hour" else 60
+    count = max(1, (retry_after + seconds - 1) // seconds)
+    raise HTTPException(
+        status_code=429,
+        detail=f"{error_msg} Try again in {count} {unit}{'s' if count != 1 else ''}.",
+        headers={"Retry-After": str(max(retry_after, 1))},
+    )
 
 
 def _get_rate_limit_backend():
@@ -194,36 +185,26 @@ def _get_rate_limit_backend():
 
 
 async def _check(category: str, key: str, error_msg: str):
-    """Unified rate limit check: memory first, DB fallback on cold cache."""
+    """Unified rate limit check: memory (or shared Redis) first, DB fallback on cold cache."""
     _prune_memory()
     max_attempts, window = _LIMITS[category]
-    store = _CATEGORY_STORE[category]
     cache_key = (category, key)
 
-    # Warm from backend on first access after restart
-    if cache_key not in _warmed:
+    # Warm from backend on first access after restart (Redis state survives restarts)
+    if cache_key not in _warmed and not _limiter.shared:
         db_count = await _get_rate_limit_backend().count_recent(category, key, window)
-        if db_count > 0:
-            # Backfill memory with synthetic timestamps spread across the window
-            now = time.time()
-            store[key] = [now - (window * i / max(db_count, 1)) for i in range(db_count)]
+        _limiter.load(cache_key, db_count, max_attempts, window)
         _warmed.add(cache_key)
 
-    count, timestamps = _mem_count(store, key, window)
-    if count >= max_attempts:
-        oldest = min(timestamps)
-        retry_after = int(oldest + window - time.time())
-        minutes = (retry_after + 59) // 60
-        raise HTTPException(
-            status_code=429,
-            detail=f"{error_msg} Try again in {minutes} minute{'s' if minutes != 1 else ''}.",
-            headers={"Retry-After": str(max(retry_after, 1))},
-        )
+    decision = await _limiter.apeek(cache_key, max_attempts, window)
+    if not decision.allowed:
+        _raise_limited(error_msg, decision.retry_after)
 
 
 async def _record(category: str, key: str):
     """Record an attempt in both memory and backend."""
-    _CATEGORY_STORE[category][key].append(time.time())
+    max_attempts, window = _LIMITS[category]
+    await _limiter.ahit((category, key), max_attempts, window, force=True)
     _warmed.add((category, key))
     await _get_rate_limit_backend().record_attempt(category, key)
 
@@ -236,36 +217,21 @@ async def _record(category: str, key: str):
 
 def _check_rate_limit(ip: str, username=None):
     """Synchronous check (called from sync login endpoint).
-    Falls back to memory-only on first call; DB warming happens on next async check.
+    Memory-only; DB warming happens on the async path.
     """
     _prune_memory()
-    max_attempts, window = _LIMITS["login"]
-
-    count, timestamps = _mem_count(_login_attempts, ip, window)
-    exceeded = count >= max_attempts
-
-    if username and not exceeded:
-        count, timestamps = _mem_count(_login_attempts_by_username, username, window)
-        exceeded = count >= max_attempts
-
-    if exceeded:
-        oldest = min(timestamps)
-        retry_after = int(oldest + window - time.time())
-        minutes = (retry_after + 59) // 60
-        raise HTTPException(
-            status_code=429,
-            detail=f"Too many login attempts. Try again in {minutes} minute{'s' if minutes != 1 else ''}.",
-            headers={"Retry-After": str(max(retry_after, 1))},
-        )
+    decision = _peek("login", ip)
+    if decision.allowed and username:
+        decision = _peek("login_user", username)
+    if not decision.allowed:
+        _raise_limited("Too many login attempts.", decision.retry_after)
 
 
 def _record_attempt(ip: str, username=None):
     """Record failed login attempt (sync wrapper — DB write is best-effort)."""
-    _login_attempts[ip].append(time.time())
-    _warmed.add(("login", ip))
+    _hit("login", ip)
     if username:
-        _login_attempts_by_username[username].append(time.time())
-        _warmed.add(("login_user", username))
+        _hit("login_user", username)
     # Fire-and-forget backend persistence (bounded task tracking)
     _fire_and_forget(_get_rate_limit_backend().record_attempt("login", ip))
     if username:
@@ -276,22 +242,13 @@ def _record_attempt(ip: str, username=None):
 
 def _check_signup_rate_limit(ip: str):
     _prune_memory()
-    max_attempts, window = _LIMITS["signup"]
-    count, timestamps = _mem_count(_signup_attempts, ip, window)
-    if count >= max_attempts:
-        oldest = min(timestamps)
-        retry_after = int(oldest + window - time.time())
-        minutes = (retry_after + 59) // 60
-        raise HTTPException(
-            status_code=429,
-            detail=f"Too many signup attempts. Try again in {minutes} minute{'s' if minutes != 1 else ''}.",
-            headers={"Retry-After": str(max(retry_after, 1))},
-        )
+    decision = _peek("signup", ip)
+    if not decision.allowed:
+        _raise_limited("Too many signup attempts.", decision.retry_after)
 
 
 def _record_signup_attempt(ip: str):
-    _signup_attempts[ip].append(time.time())
-    _warmed.add(("signup", ip))
+    _hit("signup", ip)
     _fire_and_forget(_get_rate_limit_backend().record_attempt("signup", ip))
 
 
@@ -299,38 +256,22 @@ def _record_signup_attempt(ip: str):
 
 def _check_forgot_pw_rate_limit(ip: str):
     _prune_memory()
-    max_attempts, window = _LIMITS["forgot_pw"]
-    count, timestamps = _mem_count(_forgot_pw_attempts, ip, window)
-    if count >= max_attempts:
-        oldest = min(timestamps)
-        retry_after = int(oldest + window - time.time())
-        minutes = (retry_after + 59) // 60
-        raise HTTPException(
-            status_code=429,
-            detail=f"Too many requests. Try again in {minutes} minute{'s' if minutes != 1 else ''}.",
-            headers={"Retry-After": str(max(retry_after, 1))},
-        )
+    decision = _peek("forgot_pw", ip)
+    if not decision.allowed:
+        _raise_limited("Too many requests.", decision.retry_after)
 
 
 def _record_forgot_pw_attempt(ip: str):
-    _forgot_pw_attempts[ip].append(time.time())
-    _warmed.add(("forgot_pw", ip))
+    _hit("forgot_pw", ip)
     _fire_and_forget(_get_rate_limit_backend().record_attempt("forgot_pw", ip))
 
 
 def _is_forgot_pw_email_rate_limited(email: str) -> bool:
-    now = time.time()
-    _, window = _LIMITS["forgot_pw_email"]
-    max_attempts = _LIMITS["forgot_pw_email"][0]
-    _forgot_pw_by_email[email] = [
-        t for t in _forgot_pw_by_email[email] if now - t < window
-    ]
-    return len(_forgot_pw_by_email[email]) >= max_attempts
+    return not _peek("forgot_pw_email", email).allowed
 
 
 def _record_forgot_pw_email_attempt(email: str):
-    _forgot_pw_by_email[email].append(time.time())
-    _warmed.add(("forgot_pw_email", email))
+    _hit("forgot_pw_email", email)
     _fire_and_forget(_get_rate_limit_backend().record_attempt("forgot_pw_email", email))
 
 
@@ -338,24 +279,14 @@ def _record_forgot_pw_email_attempt(email: str):
 
 def _check_resend_rate_limit(user_id: int):
     _prune_memory()
-    key = str(user_id)
-    max_attempts, window = _LIMITS["resend"]
-    count, timestamps = _mem_count(_resend_attempts, key, window)
-    if count >= max_attempts:
-        oldest = min(timestamps)
-        retry_after = int(oldest + window - time.time())
-        minutes = (retry_after + 59) // 60
-        raise HTTPException(
-            status_code=429,
-            detail=f"Too many resend attempts. Try again in {minutes} minute{'s' if minutes != 1 else ''}.",
-            headers={"Retry-After": str(max(retry_after, 1))},
-        )
+    decision = _peek("resend", str(user_id))
+    if not decision.allowed:
+        _raise_limited("Too many resend attempts.", decision.retry_after)
 
 
 def _record_resend_attempt(user_id: int):
     key = str(user_id)
-    _resend_attempts[key].append(time.time())
-    _warmed.add(("resend", key))
+    _hit("resend", key)
     _fire_and_forget(_get_rate_limit_backend().record_attempt("resend", key))
 
 
@@ -363,9 +294,7 @@ def _record_resend_attempt(user_id: int):
 
 def _check_mfa_rate_limit(mfa_token: str):
     _prune_memory()
-    max_attempts, window = _LIMITS["mfa"]
-    count, _ = _mem_count(_mfa_attempts, mfa_token, window)
-    if count >= max_attempts:
+    if not _peek("mfa", mfa_token).allowed:
         raise HTTPException(
             status_code=429,
             detail="Too many MFA attempts. Please login again.",
@@ -373,8 +302,7 @@ def _check_mfa_rate_limit(mfa_token: str):
 
 
 def _record_mfa_attempt(mfa_token: str):
-    _mfa_attempts[mfa_token].append(time.time())
-    _warmed.add(("mfa", mfa_token))
+    _hit("mfa", mfa_token)
     _fire_and_forget(_get_rate_limit_backend().record_attempt("mfa", mfa_token))
 
 
@@ -388,20 +316,11 @@ def _check_disposable_email_jail(ip: str):
     allowed through (with a warning); the second offence within 24h is jailed.
     """
     _prune_memory()
-    max_attempts, window = _LIMITS["disposable_email"]
-    count, timestamps = _mem_count(_disposable_email_attempts, ip, window)
-    if count >= max_attempts:
-        oldest = min(timestamps)
-        retry_after = int(oldest + window - time.time())
-        hours = max(1, (retry_after + 3599) // 3600)
-        raise HTTPException(
-            status_code=429,
-            detail=f"Too many invalid signup attempts. Try again in {hours} hour{'s' if hours != 1 else ''}.",
-            headers={"Retry-After": str(max(retry_after, 1))},
-        )
+    decision = _peek("disposable_email", ip)
+    if not decision.allowed:
+        _raise_limited("Too many invalid signup attempts.", decision.retry_after, unit="hour")
 
 
 def _record_disposable_email_attempt(ip: str):
-    _disposable_email_attempts[ip].append(time.time())
-    _warmed.add(("disposable_email", ip))
+    _hit("disposable_email", ip)
     _fire_and_forget(_get_rate_limit_backend().record_attempt("disposable_email", ip))
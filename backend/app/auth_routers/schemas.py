@@ -3,11 +3,12 @@ Pydantic models (schemas) for authentication endpoints.
 """
 
 import re
-from datetime import datetime
 from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 
+from app.json_response import UTCDatetime
+
 
 class LoginRequest(BaseModel):
     """Login request with email or username and password"""
@@ -94,10 +95,10 @@ class UserResponse(BaseModel):
     mfa_enabled: bool = False
     mfa_email_enabled: bool = False
     email_verified: bool = False
-    email_verified_at: Optional[datetime] = None
-    created_at: datetime
-    last_login_at: Optional[datetime]
-    terms_accepted_at: Optional[datetime] = None  # NULL = must accept terms
+    email_verified_at: Optional[UTCDatetime] = None
+    created_at: UTCDatetime
+    last_login_at: Optional[UTCDatetime]
+    terms_accepted_at: Optional[UTCDatetime] = None  # NULL = must accept terms
     last_seen_history_count: int = 0
     last_seen_failed_count: int = 0
     groups: List[GroupResponse] = []
@@ -226,8 +227,8 @@ class TrustedDeviceResponse(BaseModel):
     device_name: Optional[str]
     ip_address: Optional[str]
     location: Optional[str]
-    created_at: datetime
-    expires_at: datetime
+    created_at: UTCDatetime
+    expires_at: UTCDatetime
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -7,6 +7,12 @@ a performance report (P&L, win rate, max drawdown, Sharpe ratio, trade list).
 The engine reuses the existing TradingStrategy base class — strategies don't
 need modification. A simulated broker handles order fills, position tracking,
 and P&L calculation.
+
+By default the replay is streaming: each bar the strategy sees a zero-copy
+CandleWindow over the history instead of a fresh ``candles[:i + 1]`` copy, and
+indicator-based strategies update a run-private indicator stream by one candle
+instead of recomputing every indicator over the whole prefix. Results are
+identical to the re-slicing replay (``streaming=False``).
 """
 
 import logging
@@ -14,6 +20,8 @@ import math
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
+from app.backtesting.candle_window import CandleWindow
+from app.indicator_stream import IndicatorStreamRegistry
 from app.strategies import StrategyRegistry
 
 logger = logging.getLogger(__name__)
@@ -222,6 +230,7 @@ async def run_backtest(
     fee_pct: float = 0.0,
     user_id: Optional[int] = None,
     account_id: Optional[int] = None,
+    streaming: bool = True,
 ) -> BacktestResult:
     """Run a backtest by replaying candles through a strategy.
 
@@ -234,6 +243,9 @@ async def run_backtest(
         fee_pct: Trading fee as percentage (e.g., 0.6 for 0.6%)
         user_id: For account scoping (passed to strategy)
         account_id: For account scoping (passed to strategy)
+        streaming: Feed the strategy zero-copy candle windows and incremental
+                   indicator state (O(1) per bar). False re-slices the history
+                   every bar (O(N) per bar) — same results, kept for parity checks.
 
     Returns:
         BacktestResult with all metrics and trade history
@@ -261,9 +273,13 @@ async def run_backtest(
 
     prev_equity = initial_capital
 
+    # Private to this run, so a backtest never evicts or collides with the
+    # live monitor's shared indicator streams.
+    stream_kwargs = {"indicator_streams": IndicatorStreamRegistry()} if streaming else {}
+
     for i in range(min_candles, len(candles)):
-        # Slice candles up to current bar (simulating real-time)
-        historical = candles[:i + 1]
+        # Candles up to current bar (simulating real-time)
+        historical = CandleWindow(candles, 0, i + 1) if streaming else candles[:i + 1]
         current_candle = candles[i]
         current_price = float(current_candle.get("close", 0))
         timestamp = int(float(current_candle.get("start", current_candle.get("time", i * 60))))
@@ -280,6 +296,7 @@ async def run_backtest(
                 position=mock_position,
                 action_context="hold" if mock_position else "open",
                 db=None, user_id=user_id, bot=None, account_id=account_id,
+                **stream_kwargs,
             )
         except Exception as e:
             logger.debug(f"Backtest: analyze_signal error at bar {i}: {e}")
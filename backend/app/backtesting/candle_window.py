@@ -0,0 +1,53 @@
+"""
+Zero-copy candle window for the streaming backtest.
+
+``run_backtest`` used to hand strategies ``candles[:i + 1]`` on every bar, which
+copies the whole prefix each time (O(N²) over a run). A CandleWindow is a
+read-only view of ``candles[start:stop]`` over the original list: indexing,
+``len`` and iteration behave like the sliced list, and slicing a window
+returns another window, so ``window[:-1]`` and ``window[-50:]`` are O(1).
+"""
+
+from collections.abc import Sequence
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class CandleWindow(Sequence):
+    """Read-only list-like view of ``candles[start:stop]``."""
+
+    __slots__ = ("_candles", "_start", "_stop")
+
+    def __init__(self, candles: List[Dict[str, Any]], start: int = 0, stop: Optional[int] = None):
+        self._candles = candles
+        self._start = start
+        self._stop = len(candles) if stop is None else stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self._candles[self._start + i] for i in range(start, stop, step)]
+            return CandleWindow(self._candles, self._start + start, self._start + max(start, stop))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("candle window index out of range")
+        return self._candles[self._start + index]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        candles = self._candles
+        for i in range(self._start, self._stop):
+            yield candles[i]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, CandleWindow)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"CandleWindow(start={self._start}, stop={self._stop})"
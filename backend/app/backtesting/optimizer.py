@@ -17,14 +17,38 @@ Usage:
         fitness_metric="total_return_pct",
         top_n=5,
     )
+
+Large sweeps run in a process pool sized by ResourcePlan.optimizer_workers_max.
+The candles go into one shared-memory block that every worker attaches to once
+(tasks carry only the parameter dict), workers run at lowered CPU priority so
+the trader keeps its share, and results stream back as each backtest finishes.
+Setting cancel_event returns the results gathered so far; cancelling the
+sweep task releases the pool and re-raises CancelledError.
+
+``search`` picks how combinations are chosen (see backtesting/search.py): the
+default "grid" runs them all, while "random", "halving" (successive halving on
+growing candle windows) and "bayesian" (Gaussian-process surrogate) spend a
+budget of ``max_evaluations`` backtests. The report counts the backtests and
+candle-bars each search actually evaluated.
 """
 
+import asyncio
 import itertools
 import logging
+import math
+import multiprocessing
+import os
+import random
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
 
 from app.backtesting import run_backtest, BacktestResult
+from app.backtesting.search import SEARCH_STRATEGIES, SearchSpace, default_budget, planned_backtests
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +79,10 @@ class OptimizationReport:
     fitness_metric: str
     total_combinations: int
     results: List[OptimizationResult] = field(default_factory=list)
+    completed: int = 0  # backtests finished (succeeded or failed), at any window
+    cancelled: bool = False
+    search: str = "grid"
+    bars_evaluated: int = 0  # candles backtested across all runs
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -63,6 +91,10 @@ class OptimizationReport:
             "total_combinations": self.total_combinations,
             "top_results": [r.to_dict() for r in self.results[:10]],
             "all_results_count": len(self.results),
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "search": self.search,
+            "bars_evaluated": self.bars_evaluated,
         }
 
 
@@ -118,10 +150,212 @@ def _generate_permutations(
     return configs
 
 
+# ---------------------------------------------------------------------------
+# Process-pool workers
+# ---------------------------------------------------------------------------
+
+# Bar-evaluations (candles x combinations) below which a sweep runs in-process:
+# spawning workers costs about a second, more than a small sweep takes.
+PARALLEL_MIN_BAR_EVALUATIONS = 20_000
+
+# Worker CPU priority bump (nice) so sweeps yield to the trader and API.
+WORKER_NICE = 10
+
+# Shortest candle window a successive-halving rung backtests on.
+MIN_WINDOW_CANDLES = 200
+
+_CANDLE_COLUMNS = (
+    "start", "open", "high", "low", "close", "volume",
+    "_synthetic", "_synthetic_count", "_synthetic_total",
+)
+
+# Per-worker state set once by _init_worker.
+_worker_candles: List[Dict[str, Any]] = []
+_worker_run_kwargs: Dict[str, Any] = {}
+
+
+def _share_candles(candles: List[Dict[str, Any]]) -> shared_memory.SharedMemory:
+    """Copy candles into a shared (n x 9) float64 block workers attach to.
+
+    The gap-fill flags (``_synthetic`` and the aggregated ``_synthetic_count`` /
+    ``_synthetic_total``) ride along so workers see the same candles as an
+    in-process run.
+    """
+    rows = np.array(
+        [
+            [float(c.get("start", c.get("time", 0))), float(c["open"]), float(c["high"]),
+             float(c["low"]), float(c["close"]), float(c["volume"]), float(bool(c.get("_synthetic"))),
+             float(c.get("_synthetic_count", 0)), float(c.get("_synthetic_total", 0))]
+            for c in candles
+        ],
+        dtype=np.float64,
+    ).reshape(len(candles), len(_CANDLE_COLUMNS))
+    shm = shared_memory.SharedMemory(create=True, size=max(rows.nbytes, 1))
+    np.ndarray(rows.shape, dtype=np.float64, buffer=shm.buf)[:] = rows
+    return shm
+
+
+def _init_worker(shm_name: str, n_candles: int, run_kwargs: Dict[str, Any]) -> None:
+    """Attach to the shared candles once and rebuild them as candle dicts."""
+    global _worker_candles, _worker_run_kwargs
+    try:
+        os.nice(WORKER_NICE)
+    except (AttributeError, OSError):
+        pass
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        rows = np.ndarray((n_candles, len(_CANDLE_COLUMNS)), dtype=np.float64, buffer=shm.buf).tolist()
+    finally:
+        shm.close()
+    _worker_candles = []
+    for row in rows:
+        candle = {"start": int(row[0]), "open": row[1], "high": row[2], "low": row[3], "close": row[4],
+                  "volume": row[5]}
+        if row[6]:
+            candle["_synthetic"] = True
+        if row[8]:
+            candle["_synthetic_count"] = int(row[7])
+            candle["_synthetic_total"] = int(row[8])
+        _worker_candles.append(candle)
+    _worker_run_kwargs = run_kwargs
+
+
+def _run_in_worker(config: Dict[str, Any], window: int) -> BacktestResult:
+    """Backtest one parameter combination on the worker's newest ``window`` candles."""
+    candles = _worker_candles[-window:] if window < len(_worker_candles) else _worker_candles
+    return asyncio.run(run_backtest(strategy_config=config, candles=candles, **_worker_run_kwargs))
+
+
+RecordFn = Callable[[int, Optional[BacktestResult], Optional[BaseException]], None]
+
+
+class _SweepCancelled(Exception):
+    """Raised out of a search when the sweep's cancel_event is set."""
+
+
+class _BacktestRunner:
+    """Runs batches of backtests for one sweep, in-process or on a process pool.
+
+    The pool and shared candle block are created on the first parallel batch
+    and reused by every later batch of the sweep (adaptive searches submit
+    several), then released by close().
+    """
+
+    def __init__(
+        self,
+        candles: List[Dict[str, Any]],
+        run_kwargs: Dict[str, Any],
+        workers: int,
+        cancel_event: Optional[asyncio.Event],
+    ):
+        self.candles = candles
+        self.run_kwargs = run_kwargs
+        self.workers = workers
+        self.cancel_event = cancel_event
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._shm: Optional[shared_memory.SharedMemory] = None
+
+    def window(self, fraction: float) -> int:
+        """Candles covered by a run on the newest ``fraction`` of the history."""
+        n = len(self.candles)
+        if fraction >= 1.0:
+            return n
+        return min(n, max(MIN_WINDOW_CANDLES, math.ceil(n * fraction)))
+
+    def cancelled(self) -> bool:
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+    async def run(self, configs: List[Dict[str, Any]], window: int, record: RecordFn) -> None:
+        """Backtest each config on the newest ``window`` candles, calling
+        record(index, result, error) as each one finishes.
+
+        Raises _SweepCancelled if cancel_event is set before the batch is done.
+        """
+        if self.workers:
+            await self._run_parallel(configs, window, record)
+        else:
+            candles = self.candles[-window:] if window < len(self.candles) else self.candles
+            for index, config in enumerate(configs):
+                if self.cancelled():
+                    break
+                try:
+                    bt_result = await run_backtest(strategy_config=config, candles=candles, **self.run_kwargs)
+                except Exception as e:
+                    record(index, None, e)
+                else:
+                    record(index, bt_result, None)
+                await asyncio.sleep(0)  # let cancellation and other requests in between runs
+        if self.cancelled():
+            raise _SweepCancelled()
+
+    async def _run_parallel(self, configs: List[Dict[str, Any]], window: int, record: RecordFn) -> None:
+        """Fan configs out to the pool, recording results as they complete."""
+        loop = asyncio.get_running_loop()
+        if self._pool is None:
+            self._shm = _share_candles(self.candles)
+            # spawn: forking a process that runs an event loop and threads is unsafe.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self._shm.name, len(self.candles), self.run_kwargs),
+            )
+        pending = {
+            loop.run_in_executor(self._pool, _run_in_worker, config, window): index
+            for index, config in enumerate(configs)
+        }
+        cancel_wait = asyncio.ensure_future(self.cancel_event.wait()) if self.cancel_event is not None else None
+        try:
+            while pending:
+                wait_on = set(pending) | ({cancel_wait} if cancel_wait is not None else set())
+                done, _ = await asyncio.wait(wait_on, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    if future is cancel_wait:
+                        continue
+                    index = pending.pop(future)
+                    error = future.exception()
+                    record(index, None if error else future.result(), error)
+                if cancel_wait is not None and cancel_wait.done():
+                    break
+        finally:
+            if cancel_wait is not None:
+                cancel_wait.cancel()
+            for future in pending:
+                future.cancel()
+
+    def close(self) -> None:
+        if self._pool is None:
+            return
+        # Backtests already running finish in the background; the shared block
+        # is released only once no worker can still be attaching to it.
+        threading.Thread(target=_release_pool, args=(self._pool, self._shm), daemon=True).start()
+        self._pool = self._shm = None
+
+
+def _release_pool(pool: ProcessPoolExecutor, shm: shared_memory.SharedMemory) -> None:
+    pool.shutdown(wait=True, cancel_futures=True)
+    shm.close()
+    shm.unlink()
+
+
 # ---------------------------------------------------------------------------
 # Main optimization runner
 # ---------------------------------------------------------------------------
 
+ProgressCallback = Callable[[int, int, Optional[OptimizationResult]], Any]
+
+
+def _resolve_workers(max_workers: Optional[int], total: int, n_candles: int) -> int:
+    """Worker processes for a sweep: 0 means run in-process."""
+    if max_workers is None:
+        if n_candles * total < PARALLEL_MIN_BAR_EVALUATIONS:
+            return 0
+        from app.server_resources import get_resource_plan
+        max_workers = get_resource_plan().optimizer_workers_max
+    workers = min(max_workers, total)
+    return workers if workers > 1 else 0
+
+
 async def run_optimization(
     strategy_type: str,
     strategy_config: Dict[str, Any],
@@ -134,6 +368,12 @@ async def run_optimization(
     top_n: int = 5,
     user_id: Optional[int] = None,
     account_id: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    progress_callback: Optional[ProgressCallback] = None,
+    cancel_event: Optional[asyncio.Event] = None,
+    search: str = "grid",
+    max_evaluations: Optional[int] = None,
+    seed: Optional[int] = None,
 ) -> OptimizationReport:
     """Run a parameter sweep optimization.
 
@@ -149,54 +389,97 @@ async def run_optimization(
         top_n: Number of top results to keep in detail
         user_id: For account scoping
         account_id: For account scoping
+        max_workers: Worker processes (default: ResourcePlan.optimizer_workers_max
+                     for sweeps large enough to amortize the pool; 0/1 = in-process)
+        progress_callback: Called as (backtests_done, backtests_planned, result)
+                           after each backtest; result is None for a failed run
+                           or a short-window (halving) run
+        cancel_event: Set to stop the sweep early and return partial results
+                      (cancelling the task instead re-raises CancelledError
+                      once the worker pool is released)
+        search: Search strategy (see SEARCH_STRATEGIES): "grid" runs every
+                combination; "random", "halving" and "bayesian" spend a budget
+        max_evaluations: Budget of combinations for adaptive searches
+                         (default: a tenth of the grid, at least 10)
+        seed: Random seed for adaptive searches (reproducible sweeps)
 
     Returns:
-        OptimizationReport with all results ranked by fitness score
+        OptimizationReport with the full-history results ranked by fitness score
+        (cancelled=True with the partial results if cancel_event was set)
     """
-    configs = _generate_permutations(strategy_config, parameter_ranges)
-    total = len(configs)
-    logger.info(f"Strategy optimizer: {total} combinations for {strategy_type}")
-
-    results: List[OptimizationResult] = []
-
-    for i, config in enumerate(configs):
-        try:
-            bt_result = await run_backtest(
-                strategy_type=strategy_type,
-                strategy_config=config,
-                candles=candles,
-                product_id=product_id,
-                initial_capital=initial_capital,
-                fee_pct=fee_pct,
-                user_id=user_id,
-                account_id=account_id,
-            )
-
-            score = _compute_score(bt_result, fitness_metric)
-            results.append(OptimizationResult(
-                params={k: config[k] for k in parameter_ranges},
-                metrics=bt_result,
-                score=score,
-            ))
-
-        except Exception as e:
-            logger.warning(f"Optimization run {i+1}/{total} failed: {e}")
-            continue
+    strategy = SEARCH_STRATEGIES.get(search)
+    if strategy is None:
+        raise ValueError(f"Unknown search strategy '{search}' (expected one of {', '.join(SEARCH_STRATEGIES)})")
+    space = SearchSpace(parameter_ranges)
+    budget = max_evaluations if max_evaluations is not None else default_budget(space.size)
+    planned = planned_backtests(search, space.size, budget)
+    workers = _resolve_workers(max_workers, planned, len(candles))
+    logger.info(
+        f"Strategy optimizer: {search} search over {space.size} combinations for {strategy_type}, "
+        f"{planned} backtests planned ({f'{workers} worker processes' if workers else 'in-process'})"
+    )
 
-        if (i + 1) % 10 == 0:
-            logger.info(f"Optimization progress: {i+1}/{total}")
+    report = OptimizationReport(
+        strategy_type=strategy_type,
+        fitness_metric=fitness_metric,
+        total_combinations=space.size,
+        search=search,
+    )
+    run_kwargs = dict(
+        strategy_type=strategy_type, product_id=product_id, initial_capital=initial_capital,
+        fee_pct=fee_pct, user_id=user_id, account_id=account_id,
+    )
+    runner = _BacktestRunner(candles, run_kwargs, workers, cancel_event)
+
+    # Submission order of each result, so ties rank in search order even when
+    # workers finish out of order.
+    submission_order: Dict[int, int] = {}
+    submitted = 0
+
+    async def evaluate(params_list: List[Dict[str, Any]], fraction: float) -> List[Optional[float]]:
+        nonlocal submitted
+        offset = submitted
+        submitted += len(params_list)
+        window = runner.window(fraction)
+        full_history = window == len(candles)
+        scores: List[Optional[float]] = [None] * len(params_list)
+
+        def record(index: int, bt_result: Optional[BacktestResult], error: Optional[BaseException]) -> None:
+            report.completed += 1
+            report.bars_evaluated += window
+            result = None
+            if error is not None:
+                logger.warning(f"Optimization run {report.completed}/{planned} failed: {error}")
+            else:
+                scores[index] = _compute_score(bt_result, fitness_metric)
+                if full_history:
+                    result = OptimizationResult(params=params_list[index], metrics=bt_result, score=scores[index])
+                    submission_order[id(result)] = offset + index
+                    report.results.append(result)
+            if report.completed % 10 == 0:
+                logger.info(f"Optimization progress: {report.completed}/{planned}")
+            if progress_callback is not None:
+                progress_callback(report.completed, planned, result)
+
+        await runner.run([{**strategy_config, **params} for params in params_list], window, record)
+        return scores
+
+    try:
+        await strategy(space, evaluate, budget, random.Random(seed), max(1, workers))
+    except _SweepCancelled:
+        report.cancelled = True
+    finally:
+        # Also runs on task cancellation, which then propagates to the caller
+        runner.close()
 
     # Sort by score descending
-    results.sort(key=lambda r: r.score, reverse=True)
+    report.results.sort(key=lambda r: submission_order[id(r)])
+    report.results.sort(key=lambda r: r.score, reverse=True)
 
     logger.info(
-        f"Optimization complete: {len(results)}/{total} runs succeeded. "
-        f"Best score: {results[0].score:.4f}" if results else "No results"
+        f"Optimization {'cancelled' if report.cancelled else 'complete'}: "
+        f"{report.completed} backtests, {len(report.results)} full-history results. "
+        f"Best score: {report.results[0].score:.4f}" if report.results else "No results"
     )
 
-    return OptimizationReport(
-        strategy_type=strategy_type,
-        fitness_metric=fitness_metric,
-        total_combinations=total,
-        results=results,
-    )
+    return report
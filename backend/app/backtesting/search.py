@@ -0,0 +1,232 @@
+"""
+Search strategies for the strategy optimizer.
+
+An exhaustive grid sweep backtests every combination in ``parameter_ranges``,
+so its cost multiplies with every parameter added. The adaptive strategies
+here spend a fixed budget of backtests instead:
+
+- random:   backtest a uniform sample of the grid
+- halving:  successive halving — backtest a sample on a short window of the
+            most recent candles, promote the top 1/HALVING_ETA to a window
+            HALVING_ETA times longer, until the survivors run on the full history
+- bayesian: fit a Gaussian-process surrogate to the scores seen so far and
+            backtest the combinations with the highest expected improvement
+
+Every strategy is an async function registered in SEARCH_STRATEGIES and
+called as ``strategy(space, evaluate, budget, rng, batch_size)``.
+``await evaluate(params_list, fraction)`` backtests a batch of parameter dicts
+on the newest ``fraction`` of the candles (1.0 = all) and returns their
+FITNESS_METRICS scores (None for a failed run). run_optimization owns
+execution, scoring and the report; strategies only choose what to run.
+"""
+
+import itertools
+import math
+import random
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+EvaluateFn = Callable[[List[Dict[str, Any]], float], Awaitable[List[Optional[float]]]]
+
+# Budget when the caller gives none: a tenth of the grid, at least 10.
+DEFAULT_BUDGET_FRACTION = 0.10
+MIN_DEFAULT_BUDGET = 10
+
+# Successive halving: keep the top 1/ETA per rung; each rung's window is ETA
+# times longer than the previous one.
+HALVING_ETA = 3
+
+# Bayesian search: random evaluations before the surrogate takes over, how many
+# unseen combinations the acquisition function scores per step, and the RBF
+# kernel length scale in normalized parameter space (scaled by sqrt(dims)).
+BAYES_MIN_INITIAL = 5
+BAYES_CANDIDATE_POOL = 2048
+BAYES_LENGTH_SCALE = 0.3
+BAYES_NOISE = 1e-6
+BAYES_XI = 0.01
+
+
+class SearchSpace:
+    """Discrete parameter grid addressed by combination index.
+
+    Index order matches ``itertools.product`` over the ranges (last parameter
+    varies fastest), so index i is the i-th combination of a grid sweep.
+    """
+
+    def __init__(self, parameter_ranges: Dict[str, Sequence[Any]]):
+        self.keys = list(parameter_ranges)
+        self.values = [list(parameter_ranges[key]) for key in self.keys]
+        self.size = math.prod(len(values) for values in self.values)
+
+    def params(self, index: int) -> Dict[str, Any]:
+        """Parameter dict of one combination."""
+        params = {}
+        for key, values in zip(reversed(self.keys), reversed(self.values)):
+            index, position = divmod(index, len(values))
+            params[key] = values[position]
+        return {key: params[key] for key in self.keys}
+
+    def grid(self) -> List[Dict[str, Any]]:
+        """Every combination, in index order."""
+        return [dict(zip(self.keys, combination)) for combination in itertools.product(*self.values)]
+
+    def sample(self, n: int, rng: random.Random) -> List[int]:
+        """``n`` distinct combination indices, uniformly at random."""
+        return rng.sample(range(self.size), min(n, self.size))
+
+    def coordinates(self, indices: Sequence[int]) -> np.ndarray:
+        """Combinations as points in [0, 1]^dims (each value's position in its range)."""
+        points = np.zeros((len(indices), len(self.keys)))
+        for row, index in enumerate(indices):
+            for col in range(len(self.keys) - 1, -1, -1):
+                size = len(self.values[col])
+                index, position = divmod(index, size)
+                points[row, col] = position / (size - 1) if size > 1 else 0.0
+        return points
+
+
+def default_budget(size: int) -> int:
+    """Backtest budget for an adaptive search over ``size`` combinations."""
+    return min(size, max(MIN_DEFAULT_BUDGET, math.ceil(size * DEFAULT_BUDGET_FRACTION)))
+
+
+def _rank(indices: List[int], scores: List[Optional[float]]) -> List[int]:
+    """Indices by score descending; failed runs last, ties in input order."""
+    order = sorted(
+        range(len(indices)),
+        key=lambda i: -scores[i] if scores[i] is not None and not math.isnan(scores[i]) else math.inf,
+    )
+    return [indices[i] for i in order]
+
+
+def _halving_rungs(n_candidates: int) -> int:
+    return max(1, int(math.log(n_candidates, HALVING_ETA) + 1e-9)) if n_candidates > 1 else 1
+
+
+def planned_backtests(search: str, size: int, budget: int) -> int:
+    """Backtests a search will run (an upper bound if it is cancelled early)."""
+    if search == "grid":
+        return size
+    n = min(budget, size)
+    if search == "halving":
+        total = 0
+        for _ in range(_halving_rungs(n)):
+            total += n
+            n = max(1, math.ceil(n / HALVING_ETA))
+        return total
+    return n
+
+
+# ---------------------------------------------------------------------------
+# Strategies
+# ---------------------------------------------------------------------------
+
+async def grid_search(space: SearchSpace, evaluate: EvaluateFn, budget: int,
+                      rng: random.Random, batch_size: int) -> None:
+    """Every combination on the full history (budget ignored)."""
+    await evaluate(space.grid(), 1.0)
+
+
+async def random_search(space: SearchSpace, evaluate: EvaluateFn, budget: int,
+                        rng: random.Random, batch_size: int) -> None:
+    """``budget`` random combinations on the full history."""
+    await evaluate([space.params(i) for i in space.sample(budget, rng)], 1.0)
+
+
+async def successive_halving(space: SearchSpace, evaluate: EvaluateFn, budget: int,
+                             rng: random.Random, batch_size: int) -> None:
+    """Sample ``budget`` combinations, then race them on growing candle windows."""
+    candidates = space.sample(budget, rng)
+    rungs = _halving_rungs(len(candidates))
+    for rung in range(rungs):
+        fraction = float(HALVING_ETA) ** (rung - rungs + 1)
+        scores = await evaluate([space.params(i) for i in candidates], fraction)
+        if rung < rungs - 1:
+            keep = max(1, math.ceil(len(candidates) / HALVING_ETA))
+            candidates = _rank(candidates, scores)[:keep]
+
+
+async def bayesian_search(space: SearchSpace, evaluate: EvaluateFn, budget: int,
+                          rng: random.Random, batch_size: int) -> None:
+    """Gaussian-process surrogate with expected-improvement acquisition.
+
+    Starts from a random sample, then repeatedly fits the surrogate to every
+    score seen so far and backtests the ``batch_size`` unseen combinations
+    with the highest expected improvement (one batch fills the worker pool).
+    """
+    budget = min(budget, space.size)
+    initial = space.sample(min(budget, max(BAYES_MIN_INITIAL, budget // 4)), rng)
+    observed: Dict[int, Optional[float]] = dict(
+        zip(initial, await evaluate([space.params(i) for i in initial], 1.0))
+    )
+
+    while len(observed) < budget:
+        pool = _unseen_candidates(space, observed, rng)
+        if not pool:
+            break
+        seen = list(observed)
+        scores = _clean_scores([observed[i] for i in seen])
+        mean, std = _gp_posterior(space.coordinates(seen), scores, space.coordinates(pool))
+        ei = _expected_improvement(mean, std, best=float(scores.max()))
+        take = min(batch_size, budget - len(observed))
+        chosen = [pool[i] for i in np.argsort(-ei, kind="stable")[:take]]
+        observed.update(zip(chosen, await evaluate([space.params(i) for i in chosen], 1.0)))
+
+
+def _unseen_candidates(space: SearchSpace, observed: Dict[int, Any], rng: random.Random) -> List[int]:
+    if space.size - len(observed) <= BAYES_CANDIDATE_POOL:
+        return [i for i in range(space.size) if i not in observed]
+    pool = set()
+    while len(pool) < BAYES_CANDIDATE_POOL:
+        index = rng.randrange(space.size)
+        if index not in observed:
+            pool.add(index)
+    return sorted(pool)
+
+
+def _clean_scores(scores: List[Optional[float]]) -> np.ndarray:
+    """Scores as floats; failed/NaN runs count as the worst score seen."""
+    finite = [s for s in scores if s is not None and math.isfinite(s)]
+    worst = min(finite) if finite else 0.0
+    return np.array([s if s is not None and math.isfinite(s) else worst for s in scores], dtype=np.float64)
+
+
+def _rbf(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    length = BAYES_LENGTH_SCALE * math.sqrt(max(a.shape[1], 1))
+    sq_dist = ((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2)
+    return np.exp(-sq_dist / (2 * length ** 2))
+
+
+def _gp_posterior(x: np.ndarray, y: np.ndarray, x_new: np.ndarray):
+    """Posterior mean and std of a zero-mean GP on standardized scores."""
+    y_mean = y.mean()
+    y_std = y.std() or 1.0
+    y_norm = (y - y_mean) / y_std
+    chol = np.linalg.cholesky(_rbf(x, x) + BAYES_NOISE * np.eye(len(x)))
+    alpha = np.linalg.solve(chol.T, np.linalg.solve(chol, y_norm))
+    k_new = _rbf(x, x_new)
+    mean = k_new.T @ alpha
+    v = np.linalg.solve(chol, k_new)
+    var = np.clip(1.0 - (v ** 2).sum(axis=0), 1e-12, None)
+    return mean * y_std + y_mean, np.sqrt(var) * y_std
+
+
+_erf = np.vectorize(math.erf, otypes=[float])
+
+
+def _expected_improvement(mean: np.ndarray, std: np.ndarray, best: float) -> np.ndarray:
+    """Expected improvement over the best observed score (maximization)."""
+    improvement = mean - best - BAYES_XI * (abs(best) or 1.0)
+    z = improvement / std
+    cdf = 0.5 * (1.0 + _erf(z / math.sqrt(2.0)))
+    pdf = np.exp(-0.5 * z ** 2) / math.sqrt(2.0 * math.pi)
+    return improvement * cdf + std * pdf
+
+
+SEARCH_STRATEGIES = {
+    "grid": grid_search,
+    "random": random_search,
+    "halving": successive_halving,
+    "bayesian": bayesian_search,
+}
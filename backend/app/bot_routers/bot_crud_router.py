@@ -504,6 +504,15 @@ async def update_bot(
     await db.commit()
     await db.refresh(bot)
 
+    # Publish domain event (best-effort) — the monitor reloads its bot roster
+    try:
+        from app.event_bus import event_bus, BOT_UPDATED, BotUpdatedPayload
+        await event_bus.publish(BOT_UPDATED, BotUpdatedPayload(
+            bot_id=bot.id, user_id=current_user.id,
+        ))
+    except Exception as e:
+        logger.warning(f"Event bus publish failed (non-critical): {e}")
+
     bot_response = BotResponse.model_validate(bot)
     return bot_response
 
@@ -581,9 +590,19 @@ async def delete_bot(
         bot.reserved_usd_for_longs = 0.0
         bot.reserved_btc_for_shorts = 0.0
 
+    bot_id = bot.id
     await db.delete(bot)
     await db.commit()
 
+    # Publish domain event (best-effort)
+    try:
+        from app.event_bus import event_bus, BOT_UPDATED, BotUpdatedPayload
+        await event_bus.publish(BOT_UPDATED, BotUpdatedPayload(
+            bot_id=bot_id, user_id=current_user.id, deleted=True,
+        ))
+    except Exception as e:
+        logger.warning(f"Event bus publish failed (non-critical): {e}")
+
     return {"message": f"Bot '{bot.name}' deleted successfully"}
 
 
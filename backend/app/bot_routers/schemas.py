@@ -4,11 +4,12 @@ Bot Router Pydantic Schemas
 Shared request/response models for all bot router modules.
 """
 
-from datetime import datetime
 from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict
 
+from app.json_response import UTCDatetime
+
 
 class BotCreate(BaseModel):
     name: str
@@ -56,9 +57,9 @@ class BotResponse(BaseModel):
     reserved_usd_balance: float = 0.0
     budget_percentage: float = 0.0
     is_active: bool
-    created_at: datetime
-    updated_at: datetime
-    last_signal_check: Optional[datetime]
+    created_at: UTCDatetime
+    updated_at: UTCDatetime
+    last_signal_check: Optional[UTCDatetime]
     open_positions_count: int = 0
     total_positions_count: int = 0
     closed_positions_count: int = 0
@@ -114,7 +115,7 @@ class AIBotLogCreate(BaseModel):
 class AIBotLogResponse(BaseModel):
     id: int
     bot_id: int
-    timestamp: datetime
+    timestamp: UTCDatetime
     thinking: str
     decision: str
     confidence: Optional[float]
@@ -139,7 +140,7 @@ class ScannerLogCreate(BaseModel):
 class ScannerLogResponse(BaseModel):
     id: int
     bot_id: int
-    timestamp: datetime
+    timestamp: UTCDatetime
     product_id: str
     scan_type: str
     decision: str
@@ -155,7 +156,7 @@ class IndicatorLogResponse(BaseModel):
     """Response schema for indicator condition evaluation logs."""
     id: int
     bot_id: int
-    timestamp: datetime
+    timestamp: UTCDatetime
     product_id: str
     phase: str  # "base_order", "safety_order", "take_profit"
     conditions_met: bool
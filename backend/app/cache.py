@@ -11,23 +11,53 @@ from datetime import datetime
 import json
 import logging
 import os
+import sys
 import threading
 import time
-from datetime import timedelta
-from typing import Any, Awaitable, Callable, Dict, Optional
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Per-prefix counters keep at most this many distinct prefixes; the rest are "other"
+_MAX_TRACKED_PREFIXES = 64
+
+
+def _key_prefix(key: str) -> str:
+    """Counter bucket for a key: the text before the first "_" ("price_BTC-USD" -> "price")."""
+    return key.split("_", 1)[0]
+
+
+def approx_size(value: Any, _depth: int = 0) -> int:
+    """Approximate deep size in bytes of JSON-like data (dicts, lists, scalars)."""
+    size = sys.getsizeof(value)
+    if _depth > 8:
+        return size
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += approx_size(k, _depth + 1) + approx_size(v, _depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += approx_size(item, _depth + 1)
+    return size
+
 
 class CacheEntry:
-    """Single cache entry with TTL"""
+    """Single cache entry with TTL (monotonic clock) and optional stale window"""
 
-    def __init__(self, value: Any, ttl_seconds: int):
+    __slots__ = ("value", "expires_at", "stale_ttl", "size")
+
+    def __init__(self, value: Any, ttl_seconds: float, stale_ttl: float = 0, size: int = 0):
         self.value = value
-        self.expires_at = utcnow() + timedelta(seconds=ttl_seconds)
+        self.expires_at = time.monotonic() + ttl_seconds
+        # For stale_ttl seconds past expires_at, get_or_fetch may still serve the
+        # value while one background refresh runs.
+        self.stale_ttl = stale_ttl
+        self.size = size
 
-    def is_expired(self) -> bool:
-        return utcnow() >= self.expires_at
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        return (time.monotonic() if now is None else now) >= self.expires_at
 
 
 class SimpleCache:
@@ -36,10 +66,25 @@ class SimpleCache:
 
     Thread-safe for asyncio use. Supports single-flight pattern to prevent
     thundering herd on cache expiry (multiple concurrent fetches for same key).
+
+    Bounded mode: with ``max_entries`` and/or ``max_bytes`` (approximate deep
+    size of the cached values) the least recently used entries are evicted once
+    a budget is exceeded. Unbounded by default.
+
+    Stale-while-revalidate: ``get_or_fetch(..., stale_ttl=N)`` keeps the entry
+    for N seconds past its TTL; a call in that window returns the old value at
+    once and starts a single background refresh instead of waiting on the
+    fetch. ``get`` never returns an expired value.
+
+    Hits, misses, stale hits and evictions are counted per key prefix
+    (``stats()``).
     """
 
-    def __init__(self):
-        self._cache: Dict[str, CacheEntry] = {}
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._bytes = 0
         # threading.Lock (not asyncio.Lock) so cache is safe from both the
         # main event loop and the secondary event loop.  No `await` expression
         # appears inside any of the lock-guarded blocks — all operations are
@@ -49,32 +94,98 @@ class SimpleCache:
         # Keyed by (id(loop), key) so Futures from different event loops never
         # share a slot — awaiting a Future from the wrong loop raises RuntimeError.
         self._in_flight: Dict[tuple, asyncio.Future] = {}
+        # Background stale-while-revalidate refreshes (strong refs until done)
+        self._refresh_tasks: Set[asyncio.Task] = set()
         # Negative cache: key -> monotonic expiry time
         self._not_found: Dict[str, float] = {}
+        # prefix -> [hits, misses, stale_hits, evictions]
+        self._prefix_stats: Dict[str, list] = {}
+        self._refreshes = 0
+        self._refresh_errors = 0
+
+    # ------------------------------------------------------------------
+    # Internals (caller holds self._lock)
+    # ------------------------------------------------------------------
+
+    def _count(self, key: str, index: int) -> None:
+        prefix = _key_prefix(key)
+        counters = self._prefix_stats.get(prefix)
+        if counters is None:
+            if len(self._prefix_stats) >= _MAX_TRACKED_PREFIXES:
+                prefix = "other"
+            counters = self._prefix_stats.setdefault(prefix, [0, 0, 0, 0])
+        counters[index] += 1
+
+    def _drop(self, key: str) -> None:
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _entry(self, key: str, now: float) -> Optional[CacheEntry]:
+        """Entry for ``key`` if it is live or within its stale window."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if now >= entry.expires_at + entry.stale_ttl:
+            self._drop(key)
+            return None
+        self._cache.move_to_end(key)
+        return entry
+
+    def _store(self, key: str, value: Any, ttl_seconds: float, stale_ttl: float = 0) -> None:
+        size = approx_size(value) if self.max_bytes is not None else 0
+        self._drop(key)
+        self._cache[key] = CacheEntry(value, ttl_seconds, stale_ttl, size)
+        self._bytes += size
+        while self._cache and (
+            (self.max_entries is not None and len(self._cache) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            oldest, entry = self._cache.popitem(last=False)
+            self._bytes -= entry.size
+            self._count(oldest, 3)
+
+    def _lookup_local(self, key: str) -> Tuple[Optional[Any], bool]:
+        """(value, is_stale) from this process; (None, False) on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entry(key, now)
+            if entry is None:
+                self._count(key, 1)
+                return None, False
+            if now < entry.expires_at:
+                self._count(key, 0)
+                return entry.value, False
+            return entry.value, True
+
+    async def _lookup(self, key: str) -> Tuple[Optional[Any], bool]:
+        """get_or_fetch's read path; TwoTierCache adds its shared tier here."""
+        return self._lookup_local(key)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
 
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache if not expired"""
+        now = time.monotonic()
         with self._lock:
-            entry = self._cache.get(key)
-            if entry is None:
+            entry = self._entry(key, now)
+            if entry is None or now >= entry.expires_at:
+                self._count(key, 1)
                 return None
-
-            if entry.is_expired():
-                del self._cache[key]
-                return None
-
+            self._count(key, 0)
             return entry.value
 
-    async def set(self, key: str, value: Any, ttl_seconds: int):
-        """Set value in cache with TTL"""
+    async def set(self, key: str, value: Any, ttl_seconds: int, stale_ttl: float = 0):
+        """Set value in cache with TTL (and an optional stale-while-revalidate window)"""
         with self._lock:
-            self._cache[key] = CacheEntry(value, ttl_seconds)
+            self._store(key, value, ttl_seconds, stale_ttl)
 
     async def delete(self, key: str):
         """Delete a cache entry"""
         with self._lock:
-            if key in self._cache:
-                del self._cache[key]
+            self._drop(key)
 
     async def mark_not_found(self, key: str, ttl_seconds: int):
         """Mark a key as not-found with a TTL (negative cache)."""
@@ -96,6 +207,7 @@ class SimpleCache:
         """Clear all cache entries"""
         with self._lock:
             self._cache.clear()
+            self._bytes = 0
             self._not_found.clear()
 
     async def delete_prefix(self, prefix: str):
@@ -103,21 +215,25 @@ class SimpleCache:
         with self._lock:
             keys_to_delete = [key for key in self._cache if key.startswith(prefix)]
             for key in keys_to_delete:
-                del self._cache[key]
+                self._drop(key)
 
     async def cleanup_expired(self):
-        """Remove all expired entries"""
+        """Remove all expired entries (those still inside a stale window are kept)"""
+        now = time.monotonic()
         with self._lock:
-            expired_keys = [key for key, entry in self._cache.items() if entry.is_expired()]
+            expired_keys = [key for key, entry in self._cache.items() if now >= entry.expires_at + entry.stale_ttl]
             for key in expired_keys:
-                del self._cache[key]
-            now = time.monotonic()
+                self._drop(key)
             expired_nf = [key for key, expiry in self._not_found.items() if now >= expiry]
             for key in expired_nf:
                 del self._not_found[key]
 
     async def get_or_fetch(
-        self, key: str, fetch_fn: Callable[[], Awaitable[Any]], ttl_seconds: int
+        self,
+        key: str,
+        fetch_fn: Callable[[], Awaitable[Any]],
+        ttl_seconds: int,
+        stale_ttl: float = 0,
     ) -> Any:
         """
         Get from cache or fetch with single-flight protection.
@@ -130,10 +246,12 @@ class SimpleCache:
             key: Cache key
             fetch_fn: Async callable that produces the value
             ttl_seconds: TTL for the cached result
+            stale_ttl: Seconds past the TTL the old value may still be returned
+                while one background refresh runs (0 = always wait for a fetch)
         """
         # Fast path: check cache
-        cached = await self.get(key)
-        if cached is not None:
+        cached, stale = await self._lookup(key)
+        if cached is not None and not stale:
             return cached
 
         # Key by (loop_id, key) so Futures from different event loops never share
@@ -142,20 +260,21 @@ class SimpleCache:
         loop = asyncio.get_running_loop()
         loop_key = (id(loop), key)
 
+        if stale:
+            with self._lock:
+                self._count(key, 2)
+            if loop_key not in self._in_flight:
+                self._start_refresh(loop, loop_key, key, fetch_fn, ttl_seconds, stale_ttl)
+            return cached
+
         # Check if another coroutine on THIS loop is already fetching this key
         if loop_key in self._in_flight:
             return await self._in_flight[loop_key]
 
         # We're the first on this loop — create a future and fetch
-        future: asyncio.Future = loop.create_future()
-        # Prevent "Future exception was never retrieved" when no concurrent
-        # waiters exist — the caller handles the error via re-raise below.
-        future.add_done_callback(lambda f: f.exception() if not f.cancelled() else None)
-        self._in_flight[loop_key] = future
-
+        future = self._claim(loop, loop_key)
         try:
-            result = await fetch_fn()
-            await self.set(key, result, ttl_seconds)
+            result = await self._fill(key, fetch_fn, ttl_seconds, stale_ttl)
             future.set_result(result)
             return result
         except Exception as exc:
@@ -164,9 +283,378 @@ class SimpleCache:
         finally:
             self._in_flight.pop(loop_key, None)
 
+    def _claim(self, loop: asyncio.AbstractEventLoop, loop_key: tuple) -> asyncio.Future:
+        future: asyncio.Future = loop.create_future()
+        # Prevent "Future exception was never retrieved" when no concurrent
+        # waiters exist — the caller handles the error via re-raise.
+        future.add_done_callback(lambda f: f.exception() if not f.cancelled() else None)
+        self._in_flight[loop_key] = future
+        return future
 
-# Global cache instance
-api_cache = SimpleCache()
+    def _start_refresh(self, loop, loop_key, key, fetch_fn, ttl_seconds, stale_ttl) -> None:
+        future = self._claim(loop, loop_key)
+
+        async def _refresh():
+            try:
+                result = await self._fill(key, fetch_fn, ttl_seconds, stale_ttl)
+                future.set_result(result)
+                self._refreshes += 1
+            except Exception as exc:
+                # The stale value keeps being served until its window closes
+                self._refresh_errors += 1
+                logger.warning(f"Background refresh of cache key {key!r} failed: {exc}")
+                future.set_exception(exc)
+            finally:
+                self._in_flight.pop(loop_key, None)
+
+        task = loop.create_task(_refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _fill(
+        self, key: str, fetch_fn: Callable[[], Awaitable[Any]], ttl_seconds: int, stale_ttl: float = 0
+    ) -> Any:
+        """Produce and store the value for a get_or_fetch miss (one caller per loop)."""
+        result = await fetch_fn()
+        await self.set(key, result, ttl_seconds, stale_ttl)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            by_prefix = {
+                prefix: {"hits": c[0], "misses": c[1], "stale_hits": c[2], "evictions": c[3]}
+                for prefix, c in sorted(self._prefix_stats.items())
+            }
+            entries, size = len(self._cache), self._bytes
+        hits = sum(p["hits"] for p in by_prefix.values())
+        misses = sum(p["misses"] for p in by_prefix.values())
+        stale_hits = sum(p["stale_hits"] for p in by_prefix.values())
+        lookups = hits + misses + stale_hits
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "bytes": size if self.max_bytes is not None else None,
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+            "stale_hits": stale_hits,
+            "hit_ratio": round((hits + stale_hits) / lookups, 4) if lookups else 0.0,
+            "evictions": sum(p["evictions"] for p in by_prefix.values()),
+            "refreshes": self._refreshes,
+            "refresh_errors": self._refresh_errors,
+            "by_prefix": by_prefix,
+        }
+
+
+API_CACHE_MAX_ENTRIES = 10_000
+API_CACHE_MAX_BYTES = 64 * 1024 * 1024
+CACHE_INVALIDATION_CHANNEL = "cache:invalidate"
+CACHE_KEY_PREFIX = "zenith:cache:"
+# With a shared tier, an L1 copy is trusted for at most this long so a value
+# rewritten by the other process is picked up quickly (deletes are pushed).
+L1_MAX_TTL_SECONDS = 5
+SHARED_LOCK_TTL_SECONDS = 15
+SHARED_LOCK_WAIT_SECONDS = 10.0
+_LOCK_POLL_SECONDS = 0.05
+
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+  return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class TwoTierCache(SimpleCache):
+    """
+    Bounded SimpleCache (L1) in front of an optional Redis tier (L2) shared by
+    the web and trader processes.
+
+    Until ``attach_redis`` is called it behaves exactly like SimpleCache.
+    With Redis attached:
+
+    - ``get`` falls through to Redis on an L1 miss and copies the hit into L1
+      (for at most L1_MAX_TTL_SECONDS);
+    - ``set`` writes both tiers. Only values that survive a JSON round trip
+      unchanged are shared — Decimals, tuples and other objects stay L1-only.
+      Stale-while-revalidate windows apply to the L1 copy only;
+    - ``get_or_fetch`` adds cross-process single-flight (see ``_fill``);
+    - ``delete`` / ``delete_prefix`` / ``clear`` remove the keys from Redis and
+      publish on CACHE_INVALIDATION_CHANNEL so the other process drops its L1
+      copies.
+
+    Redis errors never fail a lookup: they are counted and the cache falls
+    back to L1 and a local fetch. Negative-cache entries stay per-process.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = API_CACHE_MAX_ENTRIES,
+        max_bytes: Optional[int] = API_CACHE_MAX_BYTES,
+        l1_max_ttl: float = L1_MAX_TTL_SECONDS,
+        key_prefix: str = CACHE_KEY_PREFIX,
+        lock_ttl: int = SHARED_LOCK_TTL_SECONDS,
+        lock_wait: float = SHARED_LOCK_WAIT_SECONDS,
+    ):
+        super().__init__(max_entries=max_entries, max_bytes=max_bytes)
+        self.l1_max_ttl = l1_max_ttl
+        self.key_prefix = key_prefix
+        self.lock_ttl = lock_ttl
+        self.lock_wait = lock_wait
+        self._redis = None
+        self._origin = uuid.uuid4().hex  # lets handle_message skip our own publishes
+        self._shared_stats = {
+            "l2_hits": 0, "l2_misses": 0, "l2_writes": 0, "l2_errors": 0, "l2_unshareable": 0,
+            "lock_acquired": 0, "lock_waits": 0, "lock_wait_hits": 0, "lock_wait_timeouts": 0,
+            "invalidations_published": 0, "remote_invalidations": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Wiring
+    # ------------------------------------------------------------------
+
+    def attach_redis(self, redis) -> None:
+        """Enable the shared tier (``redis.asyncio`` client with decode_responses=True)."""
+        self._redis = redis
+
+    def detach_redis(self) -> None:
+        self._redis = None
+
+    @property
+    def shared(self) -> bool:
+        return self._redis is not None
+
+    def _count_shared(self, name: str) -> None:
+        with self._lock:
+            self._shared_stats[name] += 1
+
+    def _l2_error(self, op: str, exc: Exception) -> None:
+        self._count_shared("l2_errors")
+        logger.warning(f"Shared cache {op} failed, using the in-process tier: {exc}")
+
+    def _store_l1(self, key: str, value: Any, ttl_seconds: float, stale_ttl: float = 0) -> None:
+        if self._redis is not None:
+            ttl_seconds = min(ttl_seconds, self.l1_max_ttl)
+        with self._lock:
+            self._store(key, value, ttl_seconds, stale_ttl)
+
+    # ------------------------------------------------------------------
+    # L2 (Redis)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _encode(value: Any) -> Optional[str]:
+        """JSON for values that decode back equal; None means keep it local."""
+        try:
+            raw = json.dumps(value, separators=(",", ":"))
+        except (TypeError, ValueError):
+            return None
+        return raw if json.loads(raw) == value else None
+
+    async def _l2_get(self, key: str) -> Tuple[Optional[Any], float]:
+        """(value, seconds left) from Redis; (None, 0) on a miss or error."""
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.get(self.key_prefix + key)
+            pipe.pttl(self.key_prefix + key)
+            raw, pttl = await pipe.execute()
+        except Exception as e:
+            self._l2_error("get", e)
+            return None, 0
+        if raw is None:
+            self._count_shared("l2_misses")
+            return None, 0
+        self._count_shared("l2_hits")
+        return json.loads(raw), (pttl / 1000 if pttl and pttl > 0 else self.l1_max_ttl)
+
+    async def _l2_set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        raw = self._encode(value)
+        if raw is None:
+            self._count_shared("l2_unshareable")
+            return
+        try:
+            await self._redis.set(self.key_prefix + key, raw, px=max(int(ttl_seconds * 1000), 1))
+            self._count_shared("l2_writes")
+        except Exception as e:
+            self._l2_error("set", e)
+
+    async def _publish(self, op: str, arg: str = "") -> None:
+        try:
+            await self._redis.publish(
+                CACHE_INVALIDATION_CHANNEL, json.dumps({"op": op, "arg": arg, "origin": self._origin})
+            )
+            self._count_shared("invalidations_published")
+        except Exception as e:
+            self._l2_error("invalidation publish", e)
+
+    async def _l2_delete_prefix(self, prefix: str) -> None:
+        try:
+            batch = []
+            async for redis_key in self._redis.scan_iter(match=self.key_prefix + prefix + "*", count=500):
+                batch.append(redis_key)
+                if len(batch) >= 500:
+                    await self._redis.delete(*batch)
+                    batch = []
+            if batch:
+                await self._redis.delete(*batch)
+        except Exception as e:
+            self._l2_error("delete_prefix", e)
+
+    def handle_message(self, raw: str) -> None:
+        """Apply an invalidation received on CACHE_INVALIDATION_CHANNEL (L1 only)."""
+        try:
+            msg = json.loads(raw)
+            op, arg, origin = msg["op"], msg.get("arg", ""), msg.get("origin")
+        except (ValueError, TypeError, KeyError):
+            logger.warning(f"Shared cache: invalid invalidation message {str(raw)[:80]!r}")
+            return
+        if origin == self._origin:
+            return
+        with self._lock:
+            if op == "delete":
+                self._drop(arg)
+            elif op == "prefix":
+                for key in [k for k in self._cache if k.startswith(arg)]:
+                    self._drop(key)
+            elif op == "clear":
+                self._cache.clear()
+                self._bytes = 0
+            else:
+                return
+            self._shared_stats["remote_invalidations"] += 1
+
+    # ------------------------------------------------------------------
+    # SimpleCache API
+    # ------------------------------------------------------------------
+
+    async def _lookup(self, key: str) -> Tuple[Optional[Any], bool]:
+        value, stale = self._lookup_local(key)
+        if value is not None or self._redis is None:
+            return value, stale
+        value, ttl_left = await self._l2_get(key)
+        if value is not None:
+            self._store_l1(key, value, ttl_left)
+        return value, False
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await super().get(key)
+        if value is not None or self._redis is None:
+            return value
+        value, ttl_left = await self._l2_get(key)
+        if value is not None:
+            self._store_l1(key, value, ttl_left)
+        return value
+
+    async def set(self, key: str, value: Any, ttl_seconds: int, stale_ttl: float = 0):
+        self._store_l1(key, value, ttl_seconds, stale_ttl)
+        if self._redis is not None:
+            await self._l2_set(key, value, ttl_seconds)
+
+    async def delete(self, key: str):
+        await super().delete(key)
+        if self._redis is not None:
+            try:
+                await self._redis.delete(self.key_prefix + key)
+            except Exception as e:
+                self._l2_error("delete", e)
+            await self._publish("delete", key)
+
+    async def delete_prefix(self, prefix: str):
+        await super().delete_prefix(prefix)
+        if self._redis is not None:
+            await self._l2_delete_prefix(prefix)
+            await self._publish("prefix", prefix)
+
+    async def clear(self):
+        await super().clear()
+        if self._redis is not None:
+            await self._l2_delete_prefix("")
+            await self._publish("clear")
+
+    async def _fill(
+        self, key: str, fetch_fn: Callable[[], Awaitable[Any]], ttl_seconds: int, stale_ttl: float = 0
+    ) -> Any:
+        """
+        Cross-process single-flight for a get_or_fetch miss or refresh.
+
+        The caller that owns this loop's in-flight Future takes the Redis lock
+        for ``key`` before fetching, so the web and trader processes don't
+        both hit the exchange. A caller that finds the lock held polls the
+        shared tier until the other process's value lands, retrying the lock
+        on every poll: if the holder's fetch failed (or its value is not
+        shareable) the lock is released without a value, and the waiter takes
+        over at once instead of sitting out ``lock_wait``. It fetches without
+        the lock only if the wait expires.
+        """
+        if self._redis is None:
+            return await super()._fill(key, fetch_fn, ttl_seconds, stale_ttl)
+        lock_key = f"{self.key_prefix}lock:{key}"
+        token = uuid.uuid4().hex
+        deadline = None
+        while True:
+            try:
+                acquired = await self._redis.set(lock_key, token, nx=True, ex=self.lock_ttl)
+            except Exception as e:
+                self._l2_error("lock", e)
+                return await super()._fill(key, fetch_fn, ttl_seconds, stale_ttl)
+
+            if acquired:
+                self._count_shared("lock_acquired")
+                try:
+                    # The other process may have filled the key between our miss and the lock
+                    value, ttl_left = await self._l2_get(key)
+                    if value is not None:
+                        self._store_l1(key, value, ttl_left, stale_ttl)
+                        return value
+                    return await super()._fill(key, fetch_fn, ttl_seconds, stale_ttl)
+                finally:
+                    try:
+                        await self._redis.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                    except Exception as e:
+                        self._l2_error("unlock", e)
+
+            if deadline is None:
+                self._count_shared("lock_waits")
+                deadline = time.monotonic() + self.lock_wait
+            elif time.monotonic() >= deadline:
+                self._count_shared("lock_wait_timeouts")
+                return await super()._fill(key, fetch_fn, ttl_seconds, stale_ttl)
+            await asyncio.sleep(_LOCK_POLL_SECONDS)
+            value, ttl_left = await self._l2_get(key)
+            if value is not None:
+                self._count_shared("lock_wait_hits")
+                self._store_l1(key, value, ttl_left, stale_ttl)
+                return value
+
+    def stats(self) -> Dict[str, Any]:
+        l1 = super().stats()
+        with self._lock:
+            s = dict(self._shared_stats)
+        l2_lookups = s["l2_hits"] + s["l2_misses"]
+        return {
+            "shared": self.shared,
+            "l1": l1,
+            "l2": {
+                "hits": s["l2_hits"],
+                "misses": s["l2_misses"],
+                "hit_ratio": round(s["l2_hits"] / l2_lookups, 4) if l2_lookups else 0.0,
+                "writes": s["l2_writes"],
+                "unshareable": s["l2_unshareable"],
+                "errors": s["l2_errors"],
+            },
+            "single_flight": {
+                "lock_acquired": s["lock_acquired"],
+                "lock_waits": s["lock_waits"],
+                "lock_wait_hits": s["lock_wait_hits"],
+                "lock_wait_timeouts": s["lock_wait_timeouts"],
+            },
+            "invalidations_published": s["invalidations_published"],
+            "remote_invalidations": s["remote_invalidations"],
+        }
+
+
+# Global cache instance (the Redis tier is attached at startup in split deployments)
+api_cache = TwoTierCache()
 
 
 class PersistentPortfolioCache:
@@ -9,7 +9,12 @@ from typing import Any, Callable, Dict, List, Optional
 from sqlalchemy import text
 
 from app.cache import api_cache
-from app.constants import BALANCE_CACHE_TTL, AGGREGATE_VALUE_CACHE_TTL, MIN_USD_BALANCE_FOR_AGGREGATE
+from app.constants import (
+    AGGREGATE_VALUE_CACHE_TTL,
+    BALANCE_CACHE_TTL,
+    BALANCE_STALE_TTL,
+    MIN_USD_BALANCE_FOR_AGGREGATE,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -23,16 +28,25 @@ async def get_accounts(
 
     Coinbase API may paginate results. This function fetches all pages to ensure
     no accounts are missed.
+
+    Once cached, an expired list is served for up to BALANCE_STALE_TTL more
+    seconds while one background refresh fetches the new one.
     """
     acct_suffix = str(account_id) if account_id is not None else "none"
     cache_key = f"accounts_list_{acct_suffix}"
 
-    if not force_fresh:
-        cached = await api_cache.get(cache_key)
-        if cached is not None:
-            logger.debug(f"Using cached accounts list ({len(cached)} accounts)")
-            return cached
+    if force_fresh:
+        all_accounts = await _fetch_all_accounts(request_func)
+        await api_cache.set(cache_key, all_accounts, BALANCE_CACHE_TTL, stale_ttl=BALANCE_STALE_TTL)
+        return all_accounts
 
+    return await api_cache.get_or_fetch(
+        cache_key, lambda: _fetch_all_accounts(request_func), BALANCE_CACHE_TTL, stale_ttl=BALANCE_STALE_TTL
+    )
+
+
+async def _fetch_all_accounts(request_func: Callable) -> List[Dict[str, Any]]:
+    """Fetch every page of /accounts."""
     all_accounts = []
     cursor = None
     page_count = 0
@@ -59,12 +73,7 @@ async def get_accounts(
     if page_count >= max_pages:
         logger.warning(f"Hit max page limit ({max_pages}) when fetching accounts - some may be missing")
 
-    # Cache for 60 seconds (same as BALANCE_CACHE_TTL)
-    await api_cache.set(cache_key, all_accounts, BALANCE_CACHE_TTL)
-    logger.info(
-        f"Fetched {len(all_accounts)} total accounts across {page_count} page(s), "
-        f"cached for {BALANCE_CACHE_TTL}s"
-    )
+    logger.info(f"Fetched {len(all_accounts)} total accounts across {page_count} page(s)")
     return all_accounts
 
 
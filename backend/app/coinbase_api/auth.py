@@ -16,9 +16,12 @@ import jwt
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import serialization
 
+from app.http_pool import http_pool
+
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://api.coinbase.com"
+REQUEST_TIMEOUT = 30.0
 
 
 def load_cdp_credentials_from_file(file_path: str) -> Tuple[str, str]:
@@ -149,56 +152,57 @@ async def authenticated_request(
             "Content-Type": "application/json",
         }
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                headers = _build_headers()
-                if method == "GET":
-                    response = await client.get(url, headers=headers, params=params)
-                elif method == "POST":
-                    response = await client.post(url, headers=headers, json=data)
-                elif method == "DELETE":
-                    response = await client.delete(url, headers=headers, params=params)
-                else:
-                    raise ValueError(f"Unsupported method: {method}")
-
-                response.raise_for_status()
-                return response.json()
-
-            except httpx.HTTPStatusError as e:
-                # 429: rate limited. 401: transient auth rejection (clock skew /
-                # JWT timing) — retried with freshly generated credentials.
-                if e.response.status_code in (429, 401):
-                    if attempt < max_retries - 1:
-                        # Exponential backoff: 1s, 2s, 4s
-                        wait_time = 2**attempt
-                        logger.warning(
-                            f"⚠️  HTTP {e.response.status_code} on {method} {endpoint}, "
-                            f"retrying in {wait_time}s... (attempt {attempt + 1}/{max_retries})"
-                        )
-                        await asyncio.sleep(wait_time)
-                        continue
-                    else:
-                        logger.error(
-                            f"❌ HTTP {e.response.status_code} persisted after {max_retries} "
-                            f"attempts on {method} {endpoint}"
-                        )
-                        raise
+    # Shared keep-alive client (see http_pool.py): no per-request TCP/TLS setup.
+    client = http_pool.client(url)
+    max_retries = 3
+    for attempt in range(max_retries):
+        try:
+            headers = _build_headers()
+            if method == "GET":
+                response = await client.get(url, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
+            elif method == "POST":
+                response = await client.post(url, headers=headers, json=data, timeout=REQUEST_TIMEOUT)
+            elif method == "DELETE":
+                response = await client.delete(url, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
+            else:
+                raise ValueError(f"Unsupported method: {method}")
+
+            response.raise_for_status()
+            return response.json()
+
+        except httpx.HTTPStatusError as e:
+            # 429: rate limited. 401: transient auth rejection (clock skew /
+            # JWT timing) — retried with freshly generated credentials.
+            if e.response.status_code in (429, 401):
+                if attempt < max_retries - 1:
+                    # Exponential backoff: 1s, 2s, 4s
+                    wait_time = 2**attempt
+                    logger.warning(
+                        f"⚠️  HTTP {e.response.status_code} on {method} {endpoint}, "
+                        f"retrying in {wait_time}s... (attempt {attempt + 1}/{max_retries})"
+                    )
+                    await asyncio.sleep(wait_time)
+                    continue
                 else:
-                    # Non-429 error, log detailed error and raise
-                    try:
-                        error_body = e.response.json()
-                        logger.error(
-                            f"❌ Coinbase API error {e.response.status_code} on "
-                            f"{method} {endpoint}: {error_body}"
-                        )
-                    except Exception:
-                        logger.error(
-                            f"❌ Coinbase API error {e.response.status_code} on "
-                            f"{method} {endpoint}: {e.response.text}"
-                        )
+                    logger.error(
+                        f"❌ HTTP {e.response.status_code} persisted after {max_retries} "
+                        f"attempts on {method} {endpoint}"
+                    )
                     raise
+            else:
+                # Non-429 error, log detailed error and raise
+                try:
+                    error_body = e.response.json()
+                    logger.error(
+                        f"❌ Coinbase API error {e.response.status_code} on "
+                        f"{method} {endpoint}: {error_body}"
+                    )
+                except Exception:
+                    logger.error(
+                        f"❌ Coinbase API error {e.response.status_code} on "
+                        f"{method} {endpoint}: {e.response.text}"
+                    )
+                raise
 
     # Should never reach here (all paths return or raise)
     raise RuntimeError(f"Unexpected: No response after {max_retries} attempts")
@@ -12,9 +12,13 @@ from app.cache import api_cache
 from app.constants import (
     NEGATIVE_CACHE_TTL,
     PRICE_CACHE_TTL,
+    PRICE_STALE_TTL,
     PRODUCT_STATS_CACHE_TTL,
+    PRODUCTS_STALE_TTL,
     get_usd_equivalent_pair_price,
 )
+from app.coinbase_api.market_data_stream import stream_ticker
+from app.monitor.order_book_store import order_books
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +34,7 @@ async def list_products(request_func: Callable, bypass_cache: bool = False) -> L
         return await _fetch()
 
     # Single-flight: only one requester fetches when cache expires
-    return await api_cache.get_or_fetch("all_products", _fetch, ttl_seconds=3600)
+    return await api_cache.get_or_fetch("all_products", _fetch, ttl_seconds=3600, stale_ttl=PRODUCTS_STALE_TTL)
 
 
 async def get_product(request_func: Callable, product_id: str = "ETH-BTC") -> Dict[str, Any]:
@@ -41,7 +45,11 @@ async def get_product(request_func: Callable, product_id: str = "ETH-BTC") -> Di
 
 
 async def get_ticker(request_func: Callable, product_id: str = "ETH-BTC") -> Dict[str, Any]:
-    """Get current ticker/price for a product"""
+    """Get current ticker/price for a product (live stream first, REST fallback)"""
+    streamed = stream_ticker(product_id)
+    if streamed is not None:
+        return streamed
+
     cache_key = f"ticker_{product_id}"
 
     # Skip API call if we already know this product is delisted
@@ -110,7 +118,7 @@ async def get_current_price(request_func: Callable, auth_type: str, product_id:
 
         return price
 
-    return await api_cache.get_or_fetch(cache_key, _fetch_price, PRICE_CACHE_TTL)
+    return await api_cache.get_or_fetch(cache_key, _fetch_price, PRICE_CACHE_TTL, stale_ttl=PRICE_STALE_TTL)
 
 
 async def get_btc_usd_price(request_func: Callable, auth_type: str) -> float:
@@ -142,7 +150,9 @@ async def get_product_stats(request_func: Callable, product_id: str = "ETH-BTC")
             "price_percentage_change_24h": float(result.get("price_percentage_change_24h", 0)),
         }
 
-    return await api_cache.get_or_fetch(cache_key, _fetch, PRODUCT_STATS_CACHE_TTL)
+    return await api_cache.get_or_fetch(
+        cache_key, _fetch, PRODUCT_STATS_CACHE_TTL, stale_ttl=PRODUCTS_STALE_TTL
+    )
 
 
 async def get_candles(
@@ -172,6 +182,11 @@ async def get_product_book(
     """
     Get order book (Level 2) for a product.
 
+    Served from the local order book (monitor/order_book_store.py) when it
+    holds a trusted book: the live level2 stream, or a REST snapshot fetched
+    within the last couple of seconds. Otherwise fetches a snapshot and
+    loads it there.
+
     Args:
         request_func: The authenticated request function
         product_id: Trading pair (e.g., "ETH-BTC")
@@ -180,17 +195,25 @@ async def get_product_book(
     Returns:
         Dict with 'pricebook' containing bids and asks arrays
     """
-    cache_key = f"orderbook_{product_id}_{limit}"
+    local = order_books.pricebook(product_id, limit)
+    if local is not None:
+        return local
 
     async def _fetch():
-        return await request_func(
+        result = await request_func(
             "GET",
             "/api/v3/brokerage/product_book",
             params={"product_id": product_id, "limit": str(limit)}
         )
+        pricebook = result.get("pricebook", {})
+        order_books.apply_snapshot(
+            product_id, pricebook.get("bids") or [], pricebook.get("asks") or [],
+            source="rest", depth_limit=limit,
+        )
+        return result
 
-    # Cache for 2 seconds (order book changes rapidly)
-    return await api_cache.get_or_fetch(cache_key, _fetch, 2)
+    # Single-flight: concurrent misses for the same book share one request
+    return await api_cache.get_or_fetch(f"orderbook_{product_id}_{limit}", _fetch, 2)
 
 
 async def test_connection(request_func: Callable) -> bool:
@@ -0,0 +1,388 @@
+"""
+Coinbase Advanced Trade WebSocket market-data stream.
+
+Prices and candles used to be pulled over REST only: every bot cycle, limit
+order check and ``/api/prices/batch`` call paid a ticker or product-list
+request. This client keeps one public WebSocket open and pushes updates into
+the same caches the REST paths read, so REST becomes the fallback:
+
+- ``ticker``  → ``MarketDataState`` tickers plus the shared ``price_{id}``
+  entry in ``api_cache`` (what ``get_current_price`` serves).
+- ``candles`` → candle listeners; ``MultiBotMonitor`` registers one that
+  merges the five-minute candles into its shared candle store.
+- ``level2``  → the shared ``monitor.order_book_store.order_books`` (what
+  ``get_product_book``, the slippage guard and paper fills read).
+
+Coinbase stamps every message on a connection with ``sequence_num``. A gap
+means a message was dropped, so the level2 books can no longer be trusted:
+they are marked stale and level2 is re-subscribed, which makes Coinbase send
+a fresh snapshot (resnapshot). Tickers carry full state and need no recovery.
+A connection that goes quiet (no heartbeat) or drops is reconnected with
+exponential backoff; state is cleared on disconnect so readers fall back to
+REST instead of serving frozen prices. For the same reason a ticker older than
+STREAM_TICKER_MAX_AGE is not served, and products dropped by ``set_products``
+lose their ticker and stream book at once.
+
+State lives in the process that started the stream (the trader). Readers in
+other processes simply find it empty and keep using REST.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+import websockets
+
+from app.cache import api_cache
+from app.constants import PRICE_CACHE_TTL
+from app.monitor.order_book_store import OrderBookStore, order_books
+
+logger = logging.getLogger(__name__)
+
+WS_URL = "wss://advanced-trade-ws.coinbase.com"
+DEFAULT_CHANNELS = ("ticker", "candles", "level2")
+# Candles channel always streams five-minute candles.
+STREAM_CANDLE_GRANULARITY = "FIVE_MINUTE"
+# Heartbeats arrive every second; this long without any frame means a dead link.
+IDLE_TIMEOUT_SECONDS = 30.0
+RECONNECT_MIN_SECONDS = 1.0
+RECONNECT_MAX_SECONDS = 60.0
+# A streamed ticker is served as long as the price cache entry it writes lives
+STREAM_TICKER_MAX_AGE = float(PRICE_CACHE_TTL)
+
+# Subscription channel name -> channel name Coinbase stamps on its messages
+_MESSAGE_CHANNELS = {"level2": "l2_data"}
+
+
+def _float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class MarketDataState:
+    """Thread-safe latest tickers pushed by the stream, plus its level2 books."""
+
+    def __init__(self, books: Optional[OrderBookStore] = None, ticker_max_age: float = STREAM_TICKER_MAX_AGE):
+        self._lock = threading.Lock()
+        self._tickers: Dict[str, dict] = {}
+        self.ticker_max_age = ticker_max_age
+        self.books = books if books is not None else OrderBookStore()
+        self._connected: bool = False
+        self.stats_counters = {
+            "messages": 0,
+            "sequence_gaps": 0,
+            "resnapshots": 0,
+            "reconnects": 0,
+        }
+
+    @property
+    def connected(self) -> bool:
+        with self._lock:
+            return self._connected
+
+    @connected.setter
+    def connected(self, value: bool):
+        with self._lock:
+            self._connected = value
+
+    def reset(self) -> None:
+        """Forget everything (connection lost) so readers fall back to REST."""
+        with self._lock:
+            self._connected = False
+            self._tickers.clear()
+        self.books.drop("stream")
+
+    def forget(self, product_ids: Iterable[str]) -> None:
+        """Drop the tickers and stream books of products no longer streamed."""
+        product_ids = list(product_ids)
+        with self._lock:
+            for product_id in product_ids:
+                self._tickers.pop(product_id, None)
+        self.books.drop("stream", product_ids)
+
+    def update_ticker(self, product_id: str, data: dict) -> None:
+        data.setdefault("received_at", time.time())
+        with self._lock:
+            self._tickers[product_id] = data
+
+    def get_ticker(self, product_id: str) -> Optional[dict]:
+        """Latest ticker pushed for ``product_id`` on the live connection, or None if none is recent."""
+        with self._lock:
+            if not self._connected:
+                return None
+            ticker = self._tickers.get(product_id)
+        if ticker is None or time.time() - ticker["received_at"] > self.ticker_max_age:
+            return None
+        return ticker
+
+    def get_price(self, product_id: str) -> Optional[float]:
+        """Mid of best bid/ask (last trade if either side is empty), or None."""
+        ticker = self.get_ticker(product_id)
+        if ticker is None:
+            return None
+        if ticker["best_bid"] > 0 and ticker["best_ask"] > 0:
+            return (ticker["best_bid"] + ticker["best_ask"]) / 2.0
+        return ticker["price"] or None
+
+    def get_prices(self, product_ids: Iterable[str]) -> Dict[str, float]:
+        prices = {}
+        for product_id in product_ids:
+            price = self.get_price(product_id)
+            if price:
+                prices[product_id] = price
+        return prices
+
+    def apply_level2(self, product_id: str, snapshot: bool, updates: List[dict]) -> bool:
+        """Apply one level2 event; returns False if an update hit a stale book."""
+        if snapshot:
+            bids = [(_float(u.get("price_level")), _float(u.get("new_quantity"))) for u in updates
+                    if u.get("side") == "bid"]
+            asks = [(_float(u.get("price_level")), _float(u.get("new_quantity"))) for u in updates
+                    if u.get("side") != "bid"]
+            self.books.apply_snapshot(product_id, bids, asks, source="stream")
+            return True
+        # Not applied to a stale book: wait for the snapshot rather than patch an untrusted one
+        return self.books.apply_updates(product_id, [
+            (u.get("side"), _float(u.get("price_level")), _float(u.get("new_quantity"))) for u in updates
+        ])
+
+    def mark_books_stale(self) -> None:
+        self.books.mark_stale("stream")
+
+    def get_snapshot(self) -> dict:
+        """Point-in-time summary for status endpoints."""
+        with self._lock:
+            snapshot = {
+                **self.stats_counters,
+                "connected": self._connected,
+                "tickers": len(self._tickers),
+            }
+        snapshot["order_books"] = self.books.stats()
+        return snapshot
+
+
+class CoinbaseMarketStream:
+    """
+    One public Advanced Trade WebSocket connection for a set of products.
+
+    ``start()`` runs the connection loop as a task on the current event loop;
+    ``set_products()`` diffs the wanted products against the subscription and
+    sends only the subscribe/unsubscribe messages needed.
+    """
+
+    def __init__(
+        self,
+        url: str = WS_URL,
+        channels: Iterable[str] = DEFAULT_CHANNELS,
+        connect: Callable = websockets.connect,
+        idle_timeout: float = IDLE_TIMEOUT_SECONDS,
+        books: Optional[OrderBookStore] = None,
+    ):
+        self.url = url
+        self.channels = tuple(channels)
+        self._connect = connect
+        self.idle_timeout = idle_timeout
+        self.state = MarketDataState(books)
+        self._products: Set[str] = set()
+        self._subscribed: Set[str] = set()
+        self._candle_listeners: List[Callable[[str, str, List[dict]], None]] = []
+        self._ws = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_sequence: Optional[int] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def add_candle_listener(self, listener: Callable[[str, str, List[dict]], None]) -> None:
+        """Call ``listener(product_id, granularity, candles)`` for streamed candles."""
+        if listener not in self._candle_listeners:
+            self._candle_listeners.append(listener)
+
+    def remove_candle_listener(self, listener: Callable[[str, str, List[dict]], None]) -> None:
+        if listener in self._candle_listeners:
+            self._candle_listeners.remove(listener)
+
+    async def start(self, product_ids: Iterable[str] = ()) -> None:
+        if self.running:
+            return
+        self._products = set(product_ids)
+        self._task = asyncio.create_task(self._run(), name="coinbase-market-stream")
+        logger.info(f"Coinbase market stream started ({', '.join(self.channels)})")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.state.reset()
+        logger.info("Coinbase market stream stopped")
+
+    async def set_products(self, product_ids: Iterable[str]) -> None:
+        """Stream exactly ``product_ids`` (subscribes new ones, drops the rest)."""
+        wanted = set(product_ids)
+        self.state.forget(self._products - wanted)
+        self._products = wanted
+        if self._ws is None:
+            return  # applied on (re)connect
+        added = self._products - self._subscribed
+        removed = self._subscribed - self._products
+        try:
+            if removed:
+                await self._send("unsubscribe", sorted(removed), self.channels)
+            if added:
+                await self._send("subscribe", sorted(added), self.channels)
+        except websockets.ConnectionClosed:
+            return  # the run loop reconnects and subscribes the full set
+        self._subscribed = set(self._products)
+
+    # ------------------------------------------------------------------
+    # Connection loop
+    # ------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        backoff = RECONNECT_MIN_SECONDS
+        while True:
+            try:
+                async with self._connect(self.url, max_size=None) as ws:
+                    self._ws = ws
+                    self._last_sequence = None
+                    self._subscribed = set()
+                    await self._send("subscribe", [], ("heartbeats",))
+                    if self._products:
+                        await self._send("subscribe", sorted(self._products), self.channels)
+                        self._subscribed = set(self._products)
+                    self.state.connected = True
+                    logger.info(f"Coinbase market stream connected ({len(self._products)} products)")
+                    backoff = RECONNECT_MIN_SECONDS
+                    while True:
+                        raw = await asyncio.wait_for(ws.recv(), timeout=self.idle_timeout)
+                        await self.handle_message(raw)
+            except asyncio.CancelledError:
+                raise
+            except asyncio.TimeoutError:
+                logger.warning(f"Coinbase market stream idle for {self.idle_timeout:.0f}s; reconnecting")
+            except Exception as e:
+                logger.warning(f"Coinbase market stream disconnected: {e}")
+            finally:
+                self._ws = None
+                self.state.reset()
+            self.state.stats_counters["reconnects"] += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, RECONNECT_MAX_SECONDS)
+
+    async def _send(self, action: str, product_ids: List[str], channels: Iterable[str]) -> None:
+        for channel in channels:
+            message = {"type": action, "channel": channel}
+            if product_ids:
+                message["product_ids"] = product_ids
+            await self._ws.send(json.dumps(message))
+
+    # ------------------------------------------------------------------
+    # Message handling
+    # ------------------------------------------------------------------
+
+    async def handle_message(self, raw: Any) -> None:
+        """Apply one raw frame from the socket."""
+        try:
+            message = json.loads(raw)
+        except (TypeError, ValueError):
+            logger.debug(f"Ignoring non-JSON market stream frame: {raw!r:.200}")
+            return
+        self.state.stats_counters["messages"] += 1
+
+        sequence = message.get("sequence_num")
+        if sequence is not None:
+            last, self._last_sequence = self._last_sequence, sequence
+            if last is not None and sequence != last + 1:
+                self.state.stats_counters["sequence_gaps"] += 1
+                logger.warning(f"Coinbase market stream sequence gap ({last} → {sequence}); resnapshotting books")
+                await self._resnapshot()
+
+        channel = message.get("channel")
+        events = message.get("events") or []
+        if channel == "ticker":
+            await self._on_ticker(events)
+        elif channel == "candles":
+            self._on_candles(events)
+        elif channel == _MESSAGE_CHANNELS["level2"]:
+            self._on_level2(events)
+        elif message.get("type") == "error":
+            logger.warning(f"Coinbase market stream error: {message.get('message')}")
+
+    async def _resnapshot(self) -> None:
+        self.state.mark_books_stale()
+        if "level2" not in self.channels or self._ws is None or not self._subscribed:
+            return
+        products = sorted(self._subscribed)
+        await self._send("unsubscribe", products, ("level2",))
+        await self._send("subscribe", products, ("level2",))
+        self.state.stats_counters["resnapshots"] += 1
+
+    async def _on_ticker(self, events: List[dict]) -> None:
+        now = time.time()
+        for event in events:
+            for ticker in event.get("tickers") or []:
+                product_id = ticker.get("product_id")
+                if not product_id:
+                    continue
+                data = {
+                    "price": _float(ticker.get("price")),
+                    "best_bid": _float(ticker.get("best_bid")),
+                    "best_ask": _float(ticker.get("best_ask")),
+                    "best_bid_quantity": _float(ticker.get("best_bid_quantity")),
+                    "best_ask_quantity": _float(ticker.get("best_ask_quantity")),
+                    "received_at": now,
+                }
+                self.state.update_ticker(product_id, data)
+                price = self.state.get_price(product_id)
+                if price:
+                    await api_cache.set(f"price_{product_id}", price, PRICE_CACHE_TTL)
+
+    def _on_candles(self, events: List[dict]) -> None:
+        by_product: Dict[str, List[dict]] = {}
+        for event in events:
+            for candle in event.get("candles") or []:
+                product_id = candle.get("product_id")
+                if product_id:
+                    by_product.setdefault(product_id, []).append(candle)
+        for product_id, candles in by_product.items():
+            candles.sort(key=lambda c: int(_float(c.get("start"))))
+            for listener in self._candle_listeners:
+                try:
+                    listener(product_id, STREAM_CANDLE_GRANULARITY, candles)
+                except Exception as e:
+                    logger.error(f"Candle listener failed for {product_id}: {e}")
+
+    def _on_level2(self, events: List[dict]) -> None:
+        for event in events:
+            product_id = event.get("product_id")
+            if product_id:
+                self.state.apply_level2(product_id, event.get("type") == "snapshot", event.get("updates") or [])
+
+
+def stream_ticker(product_id: str) -> Optional[Dict[str, Any]]:
+    """Live ticker in the REST ``/ticker`` response shape, or None if not streamed."""
+    ticker = market_data_stream.state.get_ticker(product_id)
+    if ticker is None:
+        return None
+    return {
+        "product_id": product_id,
+        "price": str(ticker["price"]),
+        "best_bid": str(ticker["best_bid"]),
+        "best_ask": str(ticker["best_ask"]),
+        "trades": [],
+        "source": "stream",
+    }
+
+
+# Global instance
+market_data_stream = CoinbaseMarketStream(books=order_books)
@@ -14,6 +14,9 @@ from app.product_precision import format_quote_amount_for_product, format_base_a
 
 logger = logging.getLogger(__name__)
 
+# Order IDs per historical/batch request when polling many orders at once
+ORDER_STATUS_BATCH_SIZE = 50
+
 
 async def create_market_order(
     request_func: Callable,
@@ -156,6 +159,30 @@ async def get_order(request_func: Callable, auth_type: str, order_id: str) -> Di
     return result
 
 
+async def get_orders(request_func: Callable, order_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Get details of several orders with the historical batch endpoint
+
+    Args:
+        request_func: Authenticated request function
+        order_ids: Coinbase order IDs (sent ORDER_STATUS_BATCH_SIZE per request)
+
+    Returns:
+        Dict of order_id -> order details; IDs Coinbase did not return are absent
+    """
+    orders: Dict[str, Dict[str, Any]] = {}
+    for i in range(0, len(order_ids), ORDER_STATUS_BATCH_SIZE):
+        chunk = order_ids[i:i + ORDER_STATUS_BATCH_SIZE]
+        result = await request_func(
+            "GET", "/api/v3/brokerage/orders/historical/batch",
+            params={"order_ids": chunk, "limit": len(chunk)},
+        )
+        for order in result.get("orders", []):
+            if order.get("order_id"):
+                orders[order["order_id"]] = order
+    return orders
+
+
 async def cancel_order(request_func: Callable, order_id: str) -> Dict[str, Any]:
     """
     Cancel an open order
@@ -21,6 +21,8 @@ from typing import Any, Dict, List, Optional
 import httpx
 
 from app.cache import api_cache
+from app.coinbase_api.market_data_stream import market_data_stream, stream_ticker
+from app.http_pool import http_pool
 from app.constants import (
     NEGATIVE_CACHE_TTL,
     PRICE_CACHE_TTL,
@@ -64,8 +66,7 @@ async def _public_request(
 
     for attempt in range(2):
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                resp = await client.get(url, params=params)
+            resp = await http_pool.client(url).get(url, params=params, timeout=10.0)
 
             if resp.status_code == 429:
                 logger.warning("Public API rate-limited (429), backing off 1s")
@@ -117,7 +118,7 @@ async def list_products(bypass_cache: bool = False) -> List[Dict[str, Any]]:
 # ---------------------------------------------------------------------------
 
 
-async def bulk_prices_for_products(product_ids: List[str]) -> Dict[str, float]:
+async def bulk_prices_for_products(product_ids: List[str], bypass_cache: bool = False) -> Dict[str, float]:
     """Resolve current prices for many products in one cached fetch.
 
     Uses the 1-hour-cached ``list_products()`` endpoint to get ALL Coinbase
@@ -133,22 +134,31 @@ async def bulk_prices_for_products(product_ids: List[str]) -> Dict[str, float]:
       * Products with price=0 / empty / missing → filtered out. A zero
         price would poison downstream valuation math, so treat it as
         "no price available" just like a missing product.
-      * Any exception from ``list_products()`` → ``{}``. The caller's
+      * Products streamed by ``market_data_stream`` → live mid-price, and no
+        upstream call at all when every product is streamed.
+      * Any exception from ``list_products()`` → streamed prices only. The caller's
         fallback path keeps the endpoint responsive on Coinbase outages.
+      * ``bypass_cache=True`` → refetch the product list (and refresh its
+        cache entry) instead of reading the hourly copy.
 
     Returns: ``{product_id: price_float}`` for products with valid prices.
     """
     if not product_ids:
         return {}
 
+    # Products on the live market stream are served from it; only the rest
+    # need the (up to an hour old) bulk list.
+    prices: Dict[str, float] = market_data_stream.state.get_prices(product_ids)
+    wanted = set(product_ids) - prices.keys()
+    if not wanted:
+        return prices
+
     try:
-        products = await list_products()
+        products = await list_products(bypass_cache=bypass_cache)
     except Exception:
         logger.exception("bulk_prices_for_products: list_products failed")
-        return {}
+        return prices
 
-    wanted = set(product_ids)
-    prices: Dict[str, float] = {}
     for p in products:
         pid = p.get("product_id")
         if not pid or pid not in wanted:
@@ -190,7 +200,10 @@ async def get_product(product_id: str) -> Dict[str, Any]:
 # ---------------------------------------------------------------------------
 
 async def get_ticker(product_id: str) -> Dict[str, Any]:
-    """Fetch best bid/ask for a product."""
+    """Fetch best bid/ask for a product (live stream first, REST fallback)."""
+    streamed = stream_ticker(product_id)
+    if streamed is not None:
+        return streamed
     return await _public_request(
         f"/api/v3/brokerage/market/products/{product_id}/ticker"
     )
@@ -364,6 +364,10 @@ class CoinbaseClient:
         """Get order details"""
         return await order_api.get_order(self._request, self.auth_type, order_id)
 
+    async def get_orders(self, order_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get details of several orders (batched), keyed by order ID"""
+        return await order_api.get_orders(self._request, order_ids)
+
     async def cancel_order(self, order_id: str) -> Dict[str, Any]:
         """Cancel an open order"""
         return await order_api.cancel_order(self._request, order_id)
@@ -24,6 +24,8 @@ class Settings(BaseSettings):
     coinbase_cdp_key_file: str = ""  # Path to cdp_api_key.json file
     coinbase_cdp_key_name: str = ""  # API key name from CDP
     coinbase_cdp_private_key: str = ""  # EC private key from CDP
+    # Public WebSocket ticker/candles/level2 stream (trader process); REST is the fallback
+    coinbase_market_stream_enabled: bool = True
 
     @field_validator("coinbase_cdp_private_key")
     @classmethod
@@ -47,6 +49,12 @@ class Settings(BaseSettings):
     # Database
     database_url: str = "sqlite+aiosqlite:///./trading.db"
     redis_url: str = "redis://localhost:6379/0"   # DB 0: rate limiting / general cache
+    # Back api_cache with a Redis tier shared by the web and trader processes
+    # (only when PROCESS_ROLE is web or trader; a combined process keeps it in memory)
+    shared_cache_enabled: bool = True
+    # Keep login/public-endpoint rate-limit budgets in Redis so every process
+    # enforces one limit per key (same PROCESS_ROLE rule as shared_cache_enabled)
+    shared_rate_limit_enabled: bool = True
 
     # Ethereum RPC URL (optional override for DEX features).
     # When empty, DexWalletService falls back to a public-node RPC.
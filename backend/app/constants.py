@@ -114,6 +114,11 @@ PRICE_CACHE_TTL = 60  # Cache prices for 60 seconds (budget calc doesn't need re
 NEGATIVE_CACHE_TTL = 300  # Cache 404 not-found responses for 5 minutes
 AGGREGATE_VALUE_CACHE_TTL = 300  # Cache aggregate portfolio values for 5 minutes (was 2 min)
 PRODUCT_STATS_CACHE_TTL = 600  # Cache product stats (24h volume, etc.) for 10 minutes
+# Stale-while-revalidate windows: after the TTL, get_or_fetch keeps serving the old
+# value for this long while one background refresh runs, so reads don't wait on Coinbase
+BALANCE_STALE_TTL = 60
+PRICE_STALE_TTL = 30
+PRODUCTS_STALE_TTL = 3600
 MIN_USD_BALANCE_FOR_AGGREGATE = 1.0  # Skip dust balances below $1 in aggregate calculations
 
 # Market-buy fee reserve: spend this fraction of available quote on a market buy,
@@ -143,6 +148,10 @@ CANDLE_CACHE_TTL = {
 }
 CANDLE_CACHE_DEFAULT_TTL = 300  # 5 minutes default for unknown timeframes
 
+# Candles retained per (product, granularity) in the monitor's shared candle store.
+# Matches Coinbase's 300-candles-per-request cap, the deepest window any caller asks for.
+CANDLE_STORE_CAPACITY = 300
+
 # Throttling for low-resource environments (t2.micro)
 # These delays are critical for allowing HTTP API requests to be processed
 # during bot monitoring (single uvicorn worker shares event loop with monitor)
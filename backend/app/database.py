@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 from sqlalchemy.orm import DeclarativeBase
 
 from app.config import settings
+from app.performance_metrics import track_db_queries
 from app.server_resources import get_resource_plan
 
 logger = logging.getLogger(__name__)
@@ -61,6 +62,9 @@ if not settings.is_postgres:
         cursor.execute("PRAGMA foreign_keys = ON")
         cursor.close()
 
+# Per-request SQL statement counts (performance summary / Server-Timing)
+track_db_queries(engine.sync_engine)
+
 async_session_maker = async_sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False, autoflush=False  # Disable autoflush to avoid greenlet issues
 )
@@ -90,6 +94,8 @@ else:
 
 read_engine = create_async_engine(settings.database_url, **_read_engine_kwargs)
 
+track_db_queries(read_engine.sync_engine)
+
 read_async_session_maker = async_sessionmaker(
     read_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
 )
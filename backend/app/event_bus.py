@@ -33,6 +33,7 @@ POSITION_OPENED = "position.opened"
 POSITION_CLOSED = "position.closed"
 BOT_STARTED = "bot.started"
 BOT_STOPPED = "bot.stopped"
+BOT_UPDATED = "bot.updated"
 GOAL_ACHIEVED = "goal.achieved"
 
 
@@ -88,6 +89,14 @@ class BotStoppedPayload:
     user_id: int
 
 
+@dataclass
+class BotUpdatedPayload:
+    """Published when a bot's config changes or the bot is deleted."""
+    bot_id: int
+    user_id: int
+    deleted: bool = False
+
+
 # ---------------------------------------------------------------------------
 # In-process pub/sub implementation
 # ---------------------------------------------------------------------------
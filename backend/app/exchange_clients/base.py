@@ -374,6 +374,31 @@ class ExchangeClient(ABC):
         """
         pass
 
+    async def get_orders(self, order_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get status and details of several orders, keyed by order ID.
+
+        Default implementation calls get_order() in a loop; orders that fail
+        to load are left out. Subclasses (e.g., CoinbaseAdapter) may override
+        with a true batch API.
+
+        Args:
+            order_ids: Orders to look up
+
+        Returns:
+            Dict of order_id -> order details (missing IDs were not found)
+        """
+        results = {}
+        for oid in order_ids:
+            try:
+                order = await self.get_order(oid)
+            except Exception as e:
+                logger.debug(f"get_orders: {oid} not loaded: {e}")
+                continue
+            if order:
+                results[oid] = order
+        return results
+
     @abstractmethod
     async def cancel_order(self, order_id: str) -> Dict[str, Any]:
         """
@@ -220,6 +220,10 @@ class CoinbaseAdapter(ExchangeClient):
         """Get status and details of an order."""
         return await self._client.get_order(order_id)
 
+    async def get_orders(self, order_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get several orders via the historical batch endpoint."""
+        return await self._client.get_orders(order_ids)
+
     async def cancel_order(self, order_id: str) -> Dict[str, Any]:
         """Cancel a pending order."""
         return await self._client.cancel_order(order_id)
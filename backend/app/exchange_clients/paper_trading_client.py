@@ -5,7 +5,6 @@ Simulates order execution for paper trading accounts without hitting real exchan
 Uses real market data for price feeds but fakes order fills and balance updates.
 """
 
-import asyncio
 from app.utils.timeutil import utcnow
 import json
 import logging
@@ -17,33 +16,46 @@ from sqlalchemy import select
 
 from app.exchange_clients.base import ExchangeClient
 from app.models import Account
-from app.trading_engine.book_depth_guard import (
-    calculate_vwap_from_asks,
-    calculate_vwap_from_bids,
-)
+from app.monitor.order_book_store import LocalOrderBook, order_books
 
 logger = logging.getLogger(__name__)
 
-# Per-account-per-loop locks to serialize balance operations.
-# Keyed by (loop_id, account_id) so the main event loop and the secondary
-# event loop each get their own asyncio.Lock, eliminating cross-loop binding.
-# Without per-account locks, concurrent PaperTradingClient instances for the
-# same account read stale snapshots of paper_balances and the last writer wins.
-_account_balance_locks: Dict[tuple, asyncio.Lock] = {}
-
 # Per-task toggle for VWAP-based fill simulation.
 # Each asyncio.Task in multi_bot_monitor gets its own copy via ContextVar,
 # so concurrent bots on the same paper account don't race.
 simulate_slippage_ctx: ContextVar[bool] = ContextVar('simulate_slippage', default=False)
 
+# Prices fetched once for a whole valuation pass (account snapshots); get_price
+# reads them before going to the exchange. Scoped to the task that sets it.
+valuation_prices_ctx: ContextVar[Optional[Dict[str, float]]] = ContextVar('valuation_prices', default=None)
+
+
+def _vwap_fill_price(
+    book: LocalOrderBook,
+    side: str,
+    mid_price: float,
+    size: Optional[float],
+    funds: Optional[float],
+) -> float:
+    """VWAP fill for a market order against ``book``; mid_price if it can't be filled."""
+    if side == "buy":
+        if funds:
+            vwap, _, _ = book.buy_vwap_quote(funds)
+        elif size:
+            # Size-based buy: the book must hold the whole size
+            vwap, _, filled = book.buy_vwap(size)
+            if not filled:
+                return mid_price
+        else:
+            return mid_price
+    else:  # sell
+        if not size:
+            return mid_price
+        vwap, _, _ = book.sell_vwap(size)
 
-def _get_account_lock(account_id: int) -> asyncio.Lock:
-    """Return (or create) the asyncio.Lock for (current_loop, account_id)."""
-    loop = asyncio.get_running_loop()
-    key = (id(loop), account_id)
-    if key not in _account_balance_locks:
-        _account_balance_locks[key] = asyncio.Lock()
-    return _account_balance_locks[key]
+    if vwap <= 0:
+        return mid_price
+    return vwap
 
 
 class PaperTradingClient(ExchangeClient):
@@ -52,6 +64,11 @@ class PaperTradingClient(ExchangeClient):
 
     Inherits from ExchangeClient base class and overrides order methods
     to simulate execution without hitting real exchanges.
+
+    Balances are owned by the process-wide paper ledger
+    (app/services/paper_ledger.py), shared by every client for the same
+    account: fills are checked and applied there atomically and persisted
+    write-behind.
     """
 
     def __init__(
@@ -83,73 +100,38 @@ class PaperTradingClient(ExchangeClient):
         self._order_cache: Dict[str, Dict[str, Any]] = {}
         self._available_product_ids_cache: Optional[set[str]] = None
 
-        # Load virtual balances
+        # Snapshot used until the ledger has loaded this account
         if account.paper_balances:
-            self.balances = json.loads(account.paper_balances)
+            self._initial_balances = json.loads(account.paper_balances)
         else:
             # Default balances
-            self.balances = {
+            self._initial_balances = {
                 "BTC": 1.0,
                 "ETH": 10.0,
                 "USD": 100000.0,
                 "USDC": 0.0,
                 "USDT": 0.0
             }
-            account.paper_balances = json.dumps(self.balances)
+            account.paper_balances = json.dumps(self._initial_balances)
 
         logger.info(f"Initialized paper trading client for account {account.id}")
 
-    async def _reload_balances(self):
-        """Re-read paper_balances from the database for the current account.
-
-        Must be called inside the per-account lock so we never operate on a
-        stale in-memory snapshot.
-
-        Uses a fresh session each time to avoid greenlet_spawn errors when
-        the original session is used across different async contexts.
-        """
-        from app.database import async_session_maker as _default_sm
-        sm = self._session_maker or _default_sm
-        async with sm() as db:
-            result = await db.execute(
-                select(Account).where(Account.id == self.account_id)
-            )
-            fresh = result.scalar_one_or_none()
-            if fresh and fresh.paper_balances:
-                self.balances = json.loads(fresh.paper_balances)
+    @property
+    def balances(self) -> Dict[str, float]:
+        """Current balances (a copy) from the shared ledger, served from memory."""
+        from app.services.paper_ledger import paper_ledger
+        balances = paper_ledger.peek(self.account_id)
+        return balances if balances is not None else dict(self._initial_balances)
 
-    async def _save_balances(self):
-        """Save current balances to database with retry for SQLite lock contention.
+    async def _reload_balances(self):
+        """Make sure the paper ledger holds this account.
 
-        Uses a fresh session each time to avoid greenlet_spawn errors.
-        Retries with exponential backoff + jitter to avoid thundering herd.
+        Reads paper_balances from the database only the first time the
+        account is used in this process; afterwards the ledger's in-memory
+        balances are authoritative.
         """
-        import random
-        from app.database import async_session_maker as _default_sm
-        sm = self._session_maker or _default_sm
-        max_attempts = 5
-        for attempt in range(max_attempts):
-            try:
-                async with sm() as db:
-                    result = await db.execute(
-                        select(Account).where(Account.id == self.account_id)
-                    )
-                    account = result.scalar_one_or_none()
-                    if account:
-                        account.paper_balances = json.dumps(self.balances)
-                        await db.commit()
-                return
-            except Exception as e:
-                err_str = str(e).lower()
-                if ("database is locked" in err_str or "not persistent" in err_str) and attempt < max_attempts - 1:
-                    delay = (0.15 * (2 ** attempt)) + random.uniform(0, 0.1)
-                    logger.warning(
-                        f"Paper balance save failed (attempt {attempt + 1}/{max_attempts},"
-                        f" retry in {delay:.2f}s): {e}"
-                    )
-                    await asyncio.sleep(delay)
-                else:
-                    raise
+        from app.services.paper_ledger import paper_ledger
+        await paper_ledger.load(self.account_id, self._session_maker, fallback=self._initial_balances)
 
     async def _calculate_vwap_fill_price(
         self,
@@ -161,60 +143,21 @@ class PaperTradingClient(ExchangeClient):
     ) -> float:
         """Walk the order book to compute a VWAP fill price.
 
+        Uses the local order book (live level2 stream or a recent snapshot)
+        when one is held, else fetches a snapshot from the real client.
         Returns mid_price as fallback if the book is empty or fetch fails.
         """
-        try:
-            book = await self.real_client.get_product_book(product_id)
-            pricebook = book.get("pricebook", {})
-
-            if side == "buy":
-                asks = pricebook.get("asks", [])
-                if not asks:
-                    return mid_price
-                if funds:
-                    vwap, _, filled = calculate_vwap_from_asks(asks, funds)
-                elif size:
-                    # Estimate funds needed then walk asks
-                    estimated_funds = size * mid_price * 1.1  # 10% headroom
-                    vwap, _, filled = calculate_vwap_from_asks(asks, estimated_funds)
-                    if not filled or vwap <= 0:
-                        return mid_price
-                    # For size-based buys, we need a VWAP for a specific base amount.
-                    # Walk asks by base amount using bids logic on reversed perspective:
-                    # treat ask levels as "available base" and compute cost.
-                    remaining = size
-                    total_quote = 0.0
-                    total_base = 0.0
-                    for level in asks:
-                        price = float(level["price"])
-                        level_size = float(level["size"])
-                        if price <= 0 or level_size <= 0:
-                            continue
-                        fill = min(remaining, level_size)
-                        total_quote += fill * price
-                        total_base += fill
-                        remaining -= fill
-                        if remaining <= 1e-12:
-                            break
-                    if total_base > 0:
-                        vwap = total_quote / total_base
-                    else:
-                        return mid_price
-                else:
-                    return mid_price
-            else:  # sell
-                bids = pricebook.get("bids", [])
-                if not bids or not size:
-                    return mid_price
-                vwap, _, filled = calculate_vwap_from_bids(bids, size)
-
-            if vwap <= 0:
-                return mid_price
-            return vwap
+        with order_books.reading(product_id) as book:
+            if book is not None:
+                return _vwap_fill_price(book, side, mid_price, size, funds)
 
+        try:
+            book_data = await self.real_client.get_product_book(product_id)
+            book = LocalOrderBook.from_pricebook(book_data.get("pricebook", {}))
         except Exception as e:
             logger.warning(f"Slippage simulation book fetch failed for {product_id}: {e}")
             return mid_price
+        return _vwap_fill_price(book, side, mid_price, size, funds)
 
     async def get_price(self, product_id: str) -> Optional[float]:
         """
@@ -223,6 +166,9 @@ class PaperTradingClient(ExchangeClient):
         Paper trading uses real price data for realistic simulation.
         Falls back to the public (no-auth) Coinbase API when no real_client.
         """
+        shared = valuation_prices_ctx.get()
+        if shared and shared.get(product_id):
+            return shared[product_id]
         if self.real_client:
             return await self.real_client.get_current_price(product_id)
 
@@ -234,11 +180,9 @@ class PaperTradingClient(ExchangeClient):
             return None
 
     async def get_all_balances(self) -> Dict[str, float]:
-        """Get all virtual balances (re-reads from DB for consistency)."""
-        lock = _get_account_lock(self.account.id)
-        async with lock:
-            await self._reload_balances()
-        return self.balances.copy()
+        """Get all virtual balances."""
+        await self._reload_balances()
+        return self.balances
 
     async def place_order(
         self,
@@ -268,7 +212,7 @@ class PaperTradingClient(ExchangeClient):
         """
         base_currency, quote_currency = product_id.split("-")
 
-        # Get current market price OUTSIDE the lock (slow network call)
+        # Get current market price (slow network call)
         current_price = await self.get_price(product_id)
         if not current_price:
             raise Exception(f"Could not get price for {product_id}")
@@ -281,58 +225,37 @@ class PaperTradingClient(ExchangeClient):
                 product_id, side, current_price, size=size, funds=funds,
             )
 
-        # Serialize all balance mutations for this account.
-        # Inside the lock: re-read fresh balances → check → modify → save.
-        lock = _get_account_lock(self.account.id)
-        async with lock:
-            await self._reload_balances()
-
-            # Calculate order size
-            if side == "buy":
-                if funds:
-                    # Market buy with funds
-                    actual_size = funds / fill_price
-                    actual_funds = funds
-                elif size:
-                    # Buy specific size
-                    actual_size = size
-                    actual_funds = size * fill_price
-                else:
-                    raise ValueError("Must specify either size or funds for buy order")
-
-                # Check sufficient quote currency
-                available_quote = self.balances.get(quote_currency, 0.0)
-                if available_quote < actual_funds:
-                    raise Exception(
-                        f"Insufficient {quote_currency} balance. "
-                        f"Available: {available_quote}, Required: {actual_funds}"
-                    )
-
-                # Execute simulated buy
-                self.balances[quote_currency] -= actual_funds
-                self.balances[base_currency] = self.balances.get(base_currency, 0.0) + actual_size
-
-            else:  # sell
-                if not size:
-                    raise ValueError("Must specify size for sell order")
-
+        # Calculate order size
+        if side == "buy":
+            if funds:
+                # Market buy with funds
+                actual_size = funds / fill_price
+                actual_funds = funds
+            elif size:
+                # Buy specific size
                 actual_size = size
                 actual_funds = size * fill_price
-
-                # Check sufficient base currency
-                available_base = self.balances.get(base_currency, 0.0)
-                if available_base < actual_size:
-                    raise Exception(
-                        f"Insufficient {base_currency} balance. "
-                        f"Available: {available_base}, Required: {actual_size}"
-                    )
-
-                # Execute simulated sell
-                self.balances[base_currency] -= actual_size
-                self.balances[quote_currency] = self.balances.get(quote_currency, 0.0) + actual_funds
-
-            # Save updated balances
-            await self._save_balances()
+            else:
+                raise ValueError("Must specify either size or funds for buy order")
+            deltas = {quote_currency: -actual_funds, base_currency: actual_size}
+            require = {quote_currency: actual_funds}
+        else:  # sell
+            if not size:
+                raise ValueError("Must specify size for sell order")
+            actual_size = size
+            actual_funds = size * fill_price
+            deltas = {base_currency: -actual_size, quote_currency: actual_funds}
+            require = {base_currency: actual_size}
+
+        # Check and apply atomically in the shared ledger (raises
+        # InsufficientPaperBalance), then persist write-behind.
+        from app.services.paper_ledger import paper_ledger
+        await self._reload_balances()
+        paper_ledger.apply(
+            self.account_id, deltas, require=require, kind="fill",
+            detail={"product_id": product_id, "side": side, "size": actual_size, "price": fill_price},
+        )
+        await paper_ledger.persist(self._session_maker)
 
         # Generate fake order ID
         order_id = f"paper-{uuid.uuid4()}"
@@ -464,6 +387,9 @@ class PaperTradingClient(ExchangeClient):
 
     async def get_btc_usd_price(self) -> float:
         """Get BTC/USD price from real exchange."""
+        shared = valuation_prices_ctx.get()
+        if shared and shared.get("BTC-USD"):
+            return shared["BTC-USD"]
         if self.real_client:
             return await self.real_client.get_btc_usd_price()
 
@@ -497,9 +423,7 @@ class PaperTradingClient(ExchangeClient):
     async def get_accounts(self, force_fresh: bool = False) -> List[Dict[str, Any]]:
         """Get virtual accounts (returns single paper trading account)."""
         if force_fresh:
-            lock = _get_account_lock(self.account.id)
-            async with lock:
-                await self._reload_balances()
+            await self._reload_balances()
         accounts = []
         for currency, balance in self.balances.items():
             if balance > 0:
@@ -543,10 +467,8 @@ class PaperTradingClient(ExchangeClient):
         return self.balances.get("USDT", 0.0)
 
     async def get_balance(self, currency: str) -> Dict[str, Any]:
-        """Get balance for specific currency (reloads from DB for freshness)."""
-        lock = _get_account_lock(self.account.id)
-        async with lock:
-            await self._reload_balances()
+        """Get balance for specific currency (from the shared ledger)."""
+        await self._reload_balances()
         balance = self.balances.get(currency.upper(), 0.0)
         return {
             "currency": currency.upper(),
@@ -556,12 +478,10 @@ class PaperTradingClient(ExchangeClient):
 
     async def adjust_balance(self, currency: str, amount: float):
         """Add or subtract from a paper trading balance (for position reconciliation)."""
-        lock = _get_account_lock(self.account.id)
-        async with lock:
-            await self._reload_balances()
-            currency = currency.upper()
-            self.balances[currency] = self.balances.get(currency, 0.0) + amount
-            await self._save_balances()
+        from app.services.paper_ledger import paper_ledger
+        await self._reload_balances()
+        paper_ledger.apply(self.account_id, {currency.upper(): amount}, kind="adjust")
+        await paper_ledger.persist(self._session_maker)
 
     async def invalidate_balance_cache(self):
         """No-op for paper trading (balances always up-to-date in memory)."""
@@ -927,24 +847,16 @@ class PaperTradingClient(ExchangeClient):
         self, from_currency: str, to_currency: str, amount: float
     ) -> Dict[str, Any]:
         """Simulate USD↔USDC 1:1 conversion for paper trading."""
-        lock = _get_account_lock(self.account.id)
-        async with lock:
-            await self._reload_balances()
-
-            available = self.balances.get(from_currency, 0.0)
-            if available < amount:
-                return {
-                    "error_response": {
-                        "message": (
-                            f"Insufficient {from_currency} balance. "
-                            f"Available: {available}, Required: {amount}"
-                        )
-                    }
-                }
-
-            self.balances[from_currency] = available - amount
-            self.balances[to_currency] = self.balances.get(to_currency, 0.0) + amount
-            await self._save_balances()
+        from app.services.paper_ledger import InsufficientPaperBalance, paper_ledger
+        await self._reload_balances()
+        try:
+            paper_ledger.apply(
+                self.account_id, {from_currency: -amount, to_currency: amount},
+                require={from_currency: amount}, kind="convert",
+            )
+        except InsufficientPaperBalance as e:
+            return {"error_response": {"message": str(e)}}
+        await paper_ledger.persist(self._session_maker)
 
         order_id = f"paper-convert-{uuid.uuid4()}"
         logger.info(
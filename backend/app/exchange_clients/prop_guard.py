@@ -663,6 +663,9 @@ class PropGuardClient(ExchangeClient):
     async def get_order(self, order_id: str) -> Dict[str, Any]:
         return await self._inner.get_order(order_id)
 
+    async def get_orders(self, order_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        return await self._inner.get_orders(order_ids)
+
     async def edit_order(
         self,
         order_id: str,
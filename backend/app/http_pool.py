@@ -0,0 +1,149 @@
+"""
+Pooled HTTP clients for outbound exchange API calls.
+
+Opening an ``httpx.AsyncClient`` per request pays a TCP connect and a TLS
+handshake on every call. HttpClientPool keeps one long-lived client per
+(event loop, host) instead, so requests reuse warm keep-alive connections (and
+multiplex over HTTP/2 when the optional ``h2`` package is installed).
+
+Clients are scoped per event loop because an httpx connection pool belongs to
+the loop it was first used on: the main loop and the secondary loop each get
+their own. Each host's client caps its open connections at
+HTTP_POOL_MAX_CONNECTIONS_PER_HOST; requests beyond the cap wait for a free
+connection (bounded by the request's pool timeout).
+
+Pooled clients never store cookies: one client serves every account and
+caller on the host, so a ``Set-Cookie`` from one response must not ride along
+on the next caller's request.
+
+Clients are created lazily on first use and closed per loop by ``aclose()``
+(main.shutdown_event, secondary_loop.stop_secondary_loop). stats() reports
+requests sent, connections opened, and the share of requests that reused an
+open connection (surfaced in MultiBotMonitor.get_status).
+"""
+
+import asyncio
+import importlib.util
+import logging
+import threading
+import weakref
+from http.cookiejar import CookieJar
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+HTTP_POOL_MAX_CONNECTIONS_PER_HOST = 20
+HTTP_POOL_MAX_KEEPALIVE_PER_HOST = 10
+HTTP_POOL_KEEPALIVE_EXPIRY = 30.0  # Seconds an idle connection is kept open
+HTTP_POOL_DEFAULT_TIMEOUT = 30.0  # Callers pass tighter per-request timeouts
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class _NoCookieJar(CookieJar):
+    """Cookie jar that drops every cookie it is given."""
+
+    def set_cookie(self, cookie) -> None:
+        pass
+
+    def extract_cookies(self, response, request) -> None:
+        pass
+
+
+class HttpClientPool:
+    """Shared ``httpx.AsyncClient`` per (event loop, host) with reuse metrics."""
+
+    def __init__(
+        self,
+        max_connections_per_host: int = HTTP_POOL_MAX_CONNECTIONS_PER_HOST,
+        max_keepalive_per_host: int = HTTP_POOL_MAX_KEEPALIVE_PER_HOST,
+        keepalive_expiry: float = HTTP_POOL_KEEPALIVE_EXPIRY,
+        http2: bool = HTTP2_AVAILABLE,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections_per_host,
+            max_keepalive_connections=max_keepalive_per_host,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        # Weak keys: a client dies with its loop. threading.Lock because the
+        # main and secondary loops run on different threads.
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+        self.clients_created = 0
+
+    def client(self, url: str) -> httpx.AsyncClient:
+        """The running loop's shared client for ``url``'s host.
+
+        Do not close it (no ``async with``); it is owned by the pool.
+        """
+        loop = asyncio.get_running_loop()
+        origin = _origin(url)
+        with self._lock:
+            clients = self._clients.setdefault(loop, {})
+            client = clients.get(origin)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    timeout=HTTP_POOL_DEFAULT_TIMEOUT,
+                    limits=self.limits,
+                    http2=self.http2,
+                    cookies=_NoCookieJar(),
+                    event_hooks={"request": [self._on_request]},
+                )
+                clients[origin] = client
+                self.clients_created += 1
+        return client
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        with self._lock:
+            self.requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        # httpcore emits connect_tcp only when a request has to open a connection.
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections_opened += 1
+
+    async def aclose(self) -> None:
+        """Close the running loop's clients (call on that loop at shutdown)."""
+        with self._lock:
+            clients = self._clients.pop(asyncio.get_running_loop(), {})
+        for origin, client in clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"HTTP client for {origin} failed to close: {e}")
+        if clients:
+            logger.info(f"Closed {len(clients)} pooled HTTP client(s)")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            open_clients = sum(len(clients) for clients in self._clients.values())
+            requests, opened = self.requests, self.connections_opened
+        reused = max(requests - opened, 0)
+        return {
+            "requests": requests,
+            "connections_opened": opened,
+            "reused_requests": reused,
+            "reuse_ratio": round(reused / requests, 4) if requests else 0.0,
+            "clients": open_clients,
+            "clients_created": self.clients_created,
+            "http2": self.http2,
+        }
+
+
+# Global instance
+http_pool = HttpClientPool()
@@ -0,0 +1,276 @@
+"""
+Vectorized indicator computation across many pairs at once.
+
+When one bot scans dozens of pairs, running IndicatorCalculator once per pair
+repeats the same pure-Python loops N times. This module takes the candles of
+N pairs stacked into 2-D arrays (one row per pair, oldest-first columns) and
+computes every required indicator key for all rows together: each step of a
+recurrence (EMA, Wilder RSI) is a single numpy operation over the N pairs.
+
+Semantics mirror ``IndicatorCalculator.calculate_all_indicators`` exactly —
+the last column is the forming candle and is excluded from indicators, the
+result per pair has the same keys, and ``prev_*`` keys are produced the same
+way. Sums are accumulated column by column in the same order as the scalar
+path, so the values are bit-identical rather than merely close.
+
+Usage:
+    batch = stack_candles([candles_a, candles_b, ...])
+    results = calculate_indicators_batch(batch, required, calculate_previous=True)
+    results[0]  # same dict as calculate_all_indicators(candles_a, required, True)
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+# Column arrays a batch must carry, in (N pairs, T candles) shape.
+BATCH_COLUMNS = ("close", "high", "low", "volume")
+
+
+def stack_candles(candle_lists: Sequence[List[Dict[str, Any]]]) -> Dict[str, np.ndarray]:
+    """Stack per-pair candle lists into (N, T) float arrays.
+
+    Every list must have the same length — group pairs by candle count before
+    stacking. Also builds the synthetic-candle weights used for gap_fill_pct
+    (``_synthetic_count/_synthetic_total`` for aggregated candles, the
+    ``_synthetic`` flag for base candles).
+    """
+    lengths = {len(candles) for candles in candle_lists}
+    if len(lengths) > 1:
+        raise ValueError(f"candle lists must have equal length, got {sorted(lengths)}")
+    n_pairs = len(candle_lists)
+    n_candles = lengths.pop() if lengths else 0
+
+    batch = {
+        name: np.array(
+            [[float(candle[name]) for candle in candles] for candles in candle_lists], dtype=np.float64
+        ).reshape(n_pairs, n_candles)
+        for name in BATCH_COLUMNS
+    }
+    syn_count = np.zeros((n_pairs, n_candles), dtype=np.float64)
+    syn_total = np.ones((n_pairs, n_candles), dtype=np.float64)
+    for row, candles in enumerate(candle_lists):
+        for col, candle in enumerate(candles):
+            sc = candle.get("_synthetic_count", 0)
+            st = candle.get("_synthetic_total", 0)
+            if sc > 0 and st > 0:
+                syn_count[row, col] = sc
+                syn_total[row, col] = st
+            elif candle.get("_synthetic"):
+                syn_count[row, col] = 1
+    batch["synthetic_count"] = syn_count
+    batch["synthetic_total"] = syn_total
+    return batch
+
+
+def calculate_indicators_batch(
+    batch: Dict[str, np.ndarray], required_indicators: Set[str], calculate_previous: bool = False,
+) -> List[Dict[str, float]]:
+    """
+    Calculate the required indicators for every pair in a stacked batch.
+
+    Args:
+        batch: (N, T) arrays keyed "close", "high", "low", "volume" (as built by
+               stack_candles); optional "synthetic_count"/"synthetic_total"
+               weights for gap_fill_pct (no synthetic candles if absent)
+        required_indicators: Indicator keys, as from extract_required_indicators
+        calculate_previous: Also produce prev_* keys for crossing detection
+
+    Returns:
+        One indicator dict per row, identical to what
+        IndicatorCalculator.calculate_all_indicators returns for that pair
+    """
+    closes = np.asarray(batch["close"], dtype=np.float64)
+    if closes.ndim != 2:
+        raise ValueError("batch arrays must be 2-D (pairs x candles)")
+    n_pairs, n_candles = closes.shape
+    if n_candles == 0:
+        return [{} for _ in range(n_pairs)]
+
+    results = _calculate_columns(batch, n_candles, required_indicators)
+    if calculate_previous and n_candles > 3:
+        prev = _calculate_columns(batch, n_candles - 1, required_indicators)
+        results.update({f"prev_{key}": values for key, values in prev.items()})
+
+    # Transpose {key: column} into one dict per pair with plain floats.
+    columns = [(key, values.tolist() if isinstance(values, np.ndarray) else values) for key, values in results.items()]
+    out: List[Dict[str, float]] = [{} for _ in range(n_pairs)]
+    for key, values in columns:
+        for row in range(n_pairs):
+            value = values[row]
+            if value is not _MISSING:
+                out[row][key] = value
+    return out
+
+
+# Marks a per-row value the scalar path would leave out of the dict
+# (e.g. VWAP for a pair with no traded volume).
+_MISSING = object()
+
+
+def _calculate_columns(
+    batch: Dict[str, np.ndarray], length: int, required_indicators: Set[str],
+) -> Dict[str, Any]:
+    """Indicators for the first ``length`` candles of every row, keyed by output key."""
+    closes = np.asarray(batch["close"], dtype=np.float64)[:, :length]
+    volumes = np.asarray(batch["volume"], dtype=np.float64)[:, :length]
+    columns: Dict[str, Any] = {"price": closes[:, -1], "volume": volumes[:, -1]}
+
+    # The forming candle is excluded, as in the scalar path.
+    closed = length - 1 if length > 1 else length
+    if closed < 2:
+        return columns
+    closes = closes[:, :closed]
+    volumes = volumes[:, :closed]
+    highs = np.asarray(batch["high"], dtype=np.float64)[:, :closed]
+    lows = np.asarray(batch["low"], dtype=np.float64)[:, :closed]
+
+    for indicator_key in required_indicators:
+        if indicator_key.startswith("rsi_"):
+            period = int(indicator_key.split("_")[1])
+            if closed >= period + 1:
+                columns[indicator_key] = _rsi(closes, period)
+
+        elif indicator_key.startswith("macd_"):
+            parts = indicator_key.split("_")
+            if len(parts) >= 4:
+                fast, slow, signal_period = int(parts[1]), int(parts[2]), int(parts[3])
+                if closed >= slow + signal_period:
+                    macd_line, signal_line = _macd(closes, fast, slow, signal_period)
+                    columns[f"macd_{fast}_{slow}_{signal_period}"] = macd_line
+                    columns[f"macd_signal_{fast}_{slow}_{signal_period}"] = signal_line
+                    columns[f"macd_histogram_{fast}_{slow}_{signal_period}"] = macd_line - signal_line
+
+        elif indicator_key.startswith("sma_"):
+            period = int(indicator_key.split("_")[1])
+            if closed >= period:
+                columns[indicator_key] = _sequential_sum(closes[:, -period:]) / period
+
+        elif indicator_key.startswith("ema_"):
+            period = int(indicator_key.split("_")[1])
+            if closed >= period:
+                columns[indicator_key] = _ema_series(closes, period)[:, -1]
+
+        elif indicator_key.startswith("bb_"):
+            parts = indicator_key.split("_")
+            if len(parts) >= 4:
+                period = int(parts[2])
+                std_dev_str = parts[3]
+                std_dev = float(std_dev_str)
+                if closed >= period:
+                    window = closes[:, -period:]
+                    middle = _sequential_sum(window) / period
+                    std = np.sqrt(_sequential_sum((window - middle[:, None]) ** 2) / period)
+                    columns[f"bb_upper_{period}_{std_dev_str}"] = middle + (std_dev * std)
+                    columns[f"bb_middle_{period}_{std_dev_str}"] = middle
+                    columns[f"bb_lower_{period}_{std_dev_str}"] = middle - (std_dev * std)
+
+        elif indicator_key.startswith("stoch_"):
+            parts = indicator_key.split("_")
+            if len(parts) >= 4:
+                k_period, d_period = int(parts[2]), int(parts[3])
+                if closed >= k_period:
+                    k_value, d_value = _stochastic(highs, lows, closes, k_period, d_period)
+                    columns[f"stoch_k_{k_period}_{d_period}"] = k_value
+                    columns[f"stoch_d_{k_period}_{d_period}"] = d_value
+
+        elif indicator_key.startswith("volume_rsi_"):
+            period = int(indicator_key.split("_")[2])
+            if closed >= period + 1:
+                columns[indicator_key] = _rsi(volumes, period)
+
+        elif indicator_key == "vwap":
+            columns["vwap"] = _vwap(highs, lows, closes, volumes)
+
+        elif indicator_key == "gap_fill_pct":
+            if "synthetic_count" in batch:
+                syn_count = np.asarray(batch["synthetic_count"], dtype=np.float64)[:, :closed]
+                syn_total = np.asarray(batch["synthetic_total"], dtype=np.float64)[:, :closed]
+                columns["gap_fill_pct"] = (_sequential_sum(syn_count) / _sequential_sum(syn_total)) * 100
+            else:
+                columns["gap_fill_pct"] = np.zeros(closes.shape[0])
+
+    return columns
+
+
+def _sequential_sum(values: np.ndarray) -> np.ndarray:
+    """Row sums accumulated left to right, matching Python's ``sum()`` order.
+
+    ``ndarray.sum`` uses pairwise summation, which rounds differently; a
+    column-by-column fold keeps the batch path bit-identical to the scalar one.
+    """
+    total = np.zeros(values.shape[0])
+    for col in range(values.shape[1]):
+        total = total + values[:, col]
+    return total
+
+
+def _ema_series(prices: np.ndarray, period: int) -> np.ndarray:
+    """EMA of every row from candle ``period - 1`` onward, shape (N, T - period + 1)."""
+    multiplier = 2 / (period + 1)
+    n_pairs, length = prices.shape
+    out = np.empty((n_pairs, length - period + 1))
+    ema = _sequential_sum(prices[:, :period]) / period
+    out[:, 0] = ema
+    for col in range(period, length):
+        ema = (prices[:, col] - ema) * multiplier + ema
+        out[:, col - period + 1] = ema
+    return out
+
+
+def _rsi(prices: np.ndarray, period: int) -> np.ndarray:
+    """Wilder RSI of every row over its full history."""
+    changes = prices[:, 1:] - prices[:, :-1]
+    gains = np.where(changes > 0, changes, 0.0)
+    losses = np.where(changes < 0, -changes, 0.0)
+    avg_gain = _sequential_sum(gains[:, :period]) / period
+    avg_loss = _sequential_sum(losses[:, :period]) / period
+    for col in range(period, changes.shape[1]):
+        avg_gain = (avg_gain * (period - 1) + gains[:, col]) / period
+        avg_loss = (avg_loss * (period - 1) + losses[:, col]) / period
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+    return np.where(avg_loss == 0, 100.0, rsi)
+
+
+def _macd(prices: np.ndarray, fast: int, slow: int, signal_period: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(macd_line, signal_line) of every row; caller guarantees enough candles."""
+    fast_ema = _ema_series(prices, fast)
+    slow_ema = _ema_series(prices, slow)
+    # MACD history starts where the slow EMA is first defined.
+    macd_values = fast_ema[:, slow - fast:] - slow_ema
+    return macd_values[:, -1], _ema_series(macd_values, signal_period)[:, -1]
+
+
+def _stochastic(
+    highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, k_period: int, d_period: int,
+) -> Tuple[np.ndarray, List[Optional[float]]]:
+    """(%K, %D) of every row; %D is None per row when history is too short."""
+    length = closes.shape[1]
+    k_value = _stoch_k(highs[:, -k_period:], lows[:, -k_period:], closes[:, -1])
+    if length < k_period + d_period:
+        return k_value, [None] * closes.shape[0]
+    # Earlier %K values use the k candles *before* candle i (scalar-path window).
+    k_total = np.zeros(closes.shape[0])
+    for i in range(length - d_period, length - 1):
+        k_total = k_total + _stoch_k(highs[:, i - k_period:i], lows[:, i - k_period:i], closes[:, i])
+    return k_value, (k_total + k_value) / d_period
+
+
+def _stoch_k(highs: np.ndarray, lows: np.ndarray, close: np.ndarray) -> np.ndarray:
+    highest_high = highs.max(axis=1)
+    lowest_low = lows.min(axis=1)
+    span = highest_high - lowest_low
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k_value = ((close - lowest_low) / span) * 100
+    return np.where(span == 0, 50.0, k_value)
+
+
+def _vwap(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, volumes: np.ndarray) -> List[Any]:
+    """VWAP of every row; _MISSING where the scalar path returns None."""
+    numerator = _sequential_sum(((highs + lows + closes) / 3.0) * volumes)
+    denominator = _sequential_sum(volumes)
+    traded = (volumes > 0).any(axis=1) & (denominator > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vwap = (numerator / denominator).tolist()
+    return [value if ok else _MISSING for value, ok in zip(vwap, traded.tolist())]
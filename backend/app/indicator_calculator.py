@@ -16,7 +16,7 @@ Supports:
 """
 
 import math
-from typing import Any, Dict, List, Set
+from typing import Any, Dict, Hashable, List, Optional, Set
 
 
 class IndicatorCalculator:
@@ -38,6 +38,7 @@ class IndicatorCalculator:
     def calculate_all_indicators(
         self, candles: List[Dict[str, Any]], required_indicators: Set[str],
         calculate_previous: bool = False, previous_indicators_cache: Dict[str, float] = None,
+        stream_key: Optional[Hashable] = None, streams: Optional[Any] = None,
     ) -> Dict[str, float]:
         """
         Calculate all required indicators from candle data
@@ -51,6 +52,12 @@ class IndicatorCalculator:
             required_indicators: Set of indicator keys needed (e.g., {"rsi_14", "macd_12_26_9"})
             calculate_previous: If True, also calculate indicators for previous candle
                                (for crossing detection - prev_ prefix added to keys)
+            stream_key: Optional series key (e.g. (product_id, granularity)). When set,
+                        the shared incremental state for that series and window start is
+                        used instead of recomputing from scratch (see indicator_stream.py);
+                        the values are identical to the batch path over the same candles.
+            streams: IndicatorStreamRegistry to use with stream_key (defaults to the
+                     process-wide shared registry; backtests pass a private one).
 
         Returns:
             Dictionary of indicator values (includes prev_* keys if calculate_previous=True)
@@ -60,6 +67,13 @@ class IndicatorCalculator:
         if not candles:
             return {}
 
+        if stream_key is not None:
+            if streams is None:
+                from app.indicator_stream import indicator_streams as streams
+            return streams.calculate(
+                stream_key, candles, required_indicators, calculate_previous, previous_indicators_cache
+            )
+
         indicators = {}
 
         # Always include live price from current (incomplete) candle for position calculations
@@ -84,93 +98,9 @@ class IndicatorCalculator:
 
         # Calculate indicators based on what's required
         for indicator_key in required_indicators:
-            if indicator_key.startswith("rsi_"):
-                period = int(indicator_key.split("_")[1])
-                value = self.calculate_rsi(closes, period)
-                if value is not None:
-                    indicators[indicator_key] = value
-
-            elif indicator_key.startswith("macd_"):
-                parts = indicator_key.split("_")
-                if len(parts) >= 4:
-                    fast = int(parts[1])
-                    slow = int(parts[2])
-                    signal_period = int(parts[3])
-                    macd_line, signal_line, histogram = self.calculate_macd(closes, fast, slow, signal_period)
-                    if macd_line is not None:
-                        indicators[f"macd_{fast}_{slow}_{signal_period}"] = macd_line
-                        indicators[f"macd_signal_{fast}_{slow}_{signal_period}"] = signal_line
-                        indicators[f"macd_histogram_{fast}_{slow}_{signal_period}"] = histogram
-
-            elif indicator_key.startswith("sma_"):
-                period = int(indicator_key.split("_")[1])
-                value = self.calculate_sma(closes, period)
-                if value is not None:
-                    indicators[indicator_key] = value
-
-            elif indicator_key.startswith("ema_"):
-                period = int(indicator_key.split("_")[1])
-                value = self.calculate_ema(closes, period)
-                if value is not None:
-                    indicators[indicator_key] = value
-
-            elif indicator_key.startswith("bb_"):
-                # bb_upper_20_2, bb_middle_20_2, bb_lower_20_2
-                parts = indicator_key.split("_")
-                if len(parts) >= 4:
-                    # parts[1] is upper/middle/lower — ignored, all bands are returned
-                    period = int(parts[2])
-                    std_dev_str = parts[3]  # Keep original format for key (avoids 2.0 vs 2 mismatch)
-                    std_dev = float(std_dev_str)
-                    upper, middle, lower = self.calculate_bollinger_bands(closes, period, std_dev)
-                    if upper is not None:
-                        indicators[f"bb_upper_{period}_{std_dev_str}"] = upper
-                        indicators[f"bb_middle_{period}_{std_dev_str}"] = middle
-                        indicators[f"bb_lower_{period}_{std_dev_str}"] = lower
-
-            elif indicator_key.startswith("stoch_"):
-                # stoch_k_14_3, stoch_d_14_3
-                parts = indicator_key.split("_")
-                if len(parts) >= 4:
-                    # parts[1] is k or d — ignored, both lines are returned
-                    k_period = int(parts[2])
-                    d_period = int(parts[3])
-                    k_value, d_value = self.calculate_stochastic(highs, lows, closes, k_period, d_period)
-                    if k_value is not None:
-                        indicators[f"stoch_k_{k_period}_{d_period}"] = k_value
-                        indicators[f"stoch_d_{k_period}_{d_period}"] = d_value
-
-            elif indicator_key.startswith("volume_rsi_"):
-                period = int(indicator_key.split("_")[2])
-                value = self.calculate_rsi(volumes, period)
-                if value is not None:
-                    indicators[indicator_key] = value
-
-            elif indicator_key == "vwap":
-                value = self.calculate_vwap(highs, lows, closes, volumes)
-                if value is not None:
-                    indicators["vwap"] = value
-
-            elif indicator_key == "gap_fill_pct":
-                # Count synthetic/filler candles as a percentage
-                # For aggregated candles, use _synthetic_count/_synthetic_total
-                # For base candles, use _synthetic flag
-                syn_count = 0
-                total_count = 0
-                for c in closed_candles:
-                    sc = c.get("_synthetic_count", 0)
-                    st = c.get("_synthetic_total", 0)
-                    if sc > 0 and st > 0:
-                        syn_count += sc
-                        total_count += st
-                    else:
-                        total_count += 1
-                        if c.get("_synthetic"):
-                            syn_count += 1
-                if total_count > 0:
-                    indicators["gap_fill_pct"] = (syn_count / total_count) * 100
-                else:
-                    indicators["gap_fill_pct"] = 0.0
+            indicators.update(
+                self.calculate_indicator(indicator_key, closes, highs, lows, volumes, closed_candles)
+            )
 
         # Calculate indicators for the previous CLOSED candle (for crossing detection)
         # We need at least 4 candles total: 3 closed + 1 incomplete
@@ -194,6 +124,137 @@ class IndicatorCalculator:
 
         return indicators
 
+    def calculate_indicators_for_pairs(
+        self, candle_lists: List[List[Dict[str, Any]]], required_indicators: Set[str],
+        calculate_previous: bool = False,
+    ) -> List[Dict[str, float]]:
+        """
+        Vectorized calculate_all_indicators over many pairs (see indicator_batch.py).
+
+        Pairs are grouped by candle count and each group is computed in one
+        numpy pass. Returns one dict per input list, in input order, identical
+        to calling calculate_all_indicators on each list.
+        """
+        from app.indicator_batch import calculate_indicators_batch, stack_candles
+
+        groups: Dict[int, List[int]] = {}
+        for index, candles in enumerate(candle_lists):
+            groups.setdefault(len(candles), []).append(index)
+
+        results: List[Dict[str, float]] = [{} for _ in candle_lists]
+        for indexes in groups.values():
+            batch = stack_candles([candle_lists[i] for i in indexes])
+            values = calculate_indicators_batch(batch, required_indicators, calculate_previous)
+            for index, pair_values in zip(indexes, values):
+                results[index] = pair_values
+        return results
+
+    def calculate_indicator(
+        self,
+        indicator_key: str,
+        closes: List[float],
+        highs: List[float],
+        lows: List[float],
+        volumes: List[float],
+        closed_candles: List[Dict[str, Any]],
+    ) -> Dict[str, float]:
+        """
+        Calculate one required indicator key from closed-candle arrays.
+
+        Returns the output entries for that key (a MACD, Bollinger or stochastic
+        key yields all of its lines); empty if there is not enough data.
+        """
+        values: Dict[str, float] = {}
+        if indicator_key.startswith("rsi_"):
+            period = int(indicator_key.split("_")[1])
+            value = self.calculate_rsi(closes, period)
+            if value is not None:
+                values[indicator_key] = value
+
+        elif indicator_key.startswith("macd_"):
+            parts = indicator_key.split("_")
+            if len(parts) >= 4:
+                fast = int(parts[1])
+                slow = int(parts[2])
+                signal_period = int(parts[3])
+                macd_line, signal_line, histogram = self.calculate_macd(closes, fast, slow, signal_period)
+                if macd_line is not None:
+                    values[f"macd_{fast}_{slow}_{signal_period}"] = macd_line
+                    values[f"macd_signal_{fast}_{slow}_{signal_period}"] = signal_line
+                    values[f"macd_histogram_{fast}_{slow}_{signal_period}"] = histogram
+
+        elif indicator_key.startswith("sma_"):
+            period = int(indicator_key.split("_")[1])
+            value = self.calculate_sma(closes, period)
+            if value is not None:
+                values[indicator_key] = value
+
+        elif indicator_key.startswith("ema_"):
+            period = int(indicator_key.split("_")[1])
+            value = self.calculate_ema(closes, period)
+            if value is not None:
+                values[indicator_key] = value
+
+        elif indicator_key.startswith("bb_"):
+            # bb_upper_20_2, bb_middle_20_2, bb_lower_20_2
+            parts = indicator_key.split("_")
+            if len(parts) >= 4:
+                # parts[1] is upper/middle/lower — ignored, all bands are returned
+                period = int(parts[2])
+                std_dev_str = parts[3]  # Keep original format for key (avoids 2.0 vs 2 mismatch)
+                std_dev = float(std_dev_str)
+                upper, middle, lower = self.calculate_bollinger_bands(closes, period, std_dev)
+                if upper is not None:
+                    values[f"bb_upper_{period}_{std_dev_str}"] = upper
+                    values[f"bb_middle_{period}_{std_dev_str}"] = middle
+                    values[f"bb_lower_{period}_{std_dev_str}"] = lower
+
+        elif indicator_key.startswith("stoch_"):
+            # stoch_k_14_3, stoch_d_14_3
+            parts = indicator_key.split("_")
+            if len(parts) >= 4:
+                # parts[1] is k or d — ignored, both lines are returned
+                k_period = int(parts[2])
+                d_period = int(parts[3])
+                k_value, d_value = self.calculate_stochastic(highs, lows, closes, k_period, d_period)
+                if k_value is not None:
+                    values[f"stoch_k_{k_period}_{d_period}"] = k_value
+                    values[f"stoch_d_{k_period}_{d_period}"] = d_value
+
+        elif indicator_key.startswith("volume_rsi_"):
+            period = int(indicator_key.split("_")[2])
+            value = self.calculate_rsi(volumes, period)
+            if value is not None:
+                values[indicator_key] = value
+
+        elif indicator_key == "vwap":
+            value = self.calculate_vwap(highs, lows, closes, volumes)
+            if value is not None:
+                values["vwap"] = value
+
+        elif indicator_key == "gap_fill_pct":
+            # Count synthetic/filler candles as a percentage
+            # For aggregated candles, use _synthetic_count/_synthetic_total
+            # For base candles, use _synthetic flag
+            syn_count = 0
+            total_count = 0
+            for c in closed_candles:
+                sc = c.get("_synthetic_count", 0)
+                st = c.get("_synthetic_total", 0)
+                if sc > 0 and st > 0:
+                    syn_count += sc
+                    total_count += st
+                else:
+                    total_count += 1
+                    if c.get("_synthetic"):
+                        syn_count += 1
+            if total_count > 0:
+                values["gap_fill_pct"] = (syn_count / total_count) * 100
+            else:
+                values["gap_fill_pct"] = 0.0
+
+        return values
+
     def calculate_rsi(self, prices: List[float], period: int = 14) -> float | None:
         """Calculate RSI (Relative Strength Index)"""
         if len(prices) < period + 1:
@@ -0,0 +1,570 @@
+"""
+Incremental (streaming) indicator engine for IndicatorCalculator.
+
+An IndicatorStream holds indicator state for one candle window and advances it
+by one step per newly closed candle instead of recomputing from scratch:
+
+- Recurrence indicators (EMA, Wilder RSI / volume RSI, MACD) keep their state
+  (EMA seeds, Wilder averages) and update in O(1) per closed candle.
+- Stochastic keeps monotonic deques of the rolling highest high / lowest low,
+  so %K is O(1) per candle and %D O(d_period).
+- SMA and Bollinger only look at the last few candles, so the stream keeps a
+  bounded tail and evaluates the batch formula on it — O(period).
+- VWAP and gap_fill_pct are sums over the caller's window, not over history,
+  so they are evaluated on the candles passed in.
+
+Every update repeats the batch path's floating-point operations in the same
+order, and a stream's history always starts at its caller's first candle, so
+the values equal ``IndicatorCalculator.calculate_all_indicators`` over the
+same candles. EMA/RSI/MACD are seeded from the window's first candles, so a
+window whose first candle moved can't resume: the stream re-anchors to it and
+replays the window. A growing window (fixed start, as in backtests) costs O(1)
+per close; a sliding one replays once per close, and every further call on
+the same window (other bots, later monitor cycles) folds in nothing.
+
+Streams are shared through the module-level ``indicator_streams`` registry,
+keyed by (product_id, granularity) and then by window start, so every bot
+asking for the same window reuses one state and lookbacks of different depth
+don't re-anchor each other. A stream also replays when its newest candle was
+revised or there is a gap between it and the window. A window that ends before
+the stream's newest candle is served by the batch path without touching it.
+"""
+
+import logging
+from collections import OrderedDict, deque
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+from app.indicator_calculator import IndicatorCalculator
+
+logger = logging.getLogger(__name__)
+
+# Total streams kept across all series (LRU).
+_MAX_STREAMS = 4096
+
+# Window starts kept per series (LRU); a sliding window leaves one stale
+# stream behind per close, so this stays a little above the lookbacks in use.
+_MAX_WINDOWS_PER_SERIES = 4
+
+# Keys summed over the caller's window rather than carried across history
+_WINDOW_SCOPED_KEYS = ("vwap", "gap_fill_pct")
+
+# IndicatorStream._resume_index results other than "fold in closed[i:]"
+_REPLAY = -1
+_BEHIND = -2
+
+
+class _Ema:
+    """EMA recurrence seeded with the SMA of the first ``period`` values."""
+
+    __slots__ = ("period", "multiplier", "count", "seed_sum", "value")
+
+    def __init__(self, period: int):
+        self.period = period
+        self.multiplier = 2 / (period + 1)
+        self.count = 0
+        self.seed_sum = 0
+        self.value: Optional[float] = None
+
+    def push(self, x: float) -> None:
+        self.count += 1
+        if self.count <= self.period:
+            self.seed_sum += x
+            if self.count == self.period:
+                self.value = self.seed_sum / self.period
+        else:
+            self.value = (x - self.value) * self.multiplier + self.value
+
+
+class _EmaState:
+    __slots__ = ("key", "ema", "prev")
+
+    def __init__(self, key: str, period: int):
+        self.key = key
+        self.ema = _Ema(period)
+        self.prev: Dict[str, float] = {}
+
+    def values(self) -> Dict[str, float]:
+        return {self.key: self.ema.value} if self.ema.value is not None else {}
+
+    def push(self, close: float, high: float, low: float, volume: float, candle: Dict[str, Any]) -> None:
+        self.prev = self.values()
+        self.ema.push(close)
+
+
+class _RsiState:
+    """Wilder RSI over closes (``rsi_N``) or volumes (``volume_rsi_N``)."""
+
+    __slots__ = ("key", "period", "use_volume", "last", "changes", "gain_sum", "loss_sum",
+                 "avg_gain", "avg_loss", "prev")
+
+    def __init__(self, key: str, period: int, use_volume: bool):
+        self.key = key
+        self.period = period
+        self.use_volume = use_volume
+        self.last: Optional[float] = None
+        self.changes = 0
+        self.gain_sum = 0
+        self.loss_sum = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.prev: Dict[str, float] = {}
+
+    def values(self) -> Dict[str, float]:
+        if self.changes < self.period:
+            return {}
+        if self.avg_loss == 0:
+            return {self.key: 100.0}
+        rs = self.avg_gain / self.avg_loss
+        return {self.key: 100 - (100 / (1 + rs))}
+
+    def push(self, close: float, high: float, low: float, volume: float, candle: Dict[str, Any]) -> None:
+        self.prev = self.values()
+        price = volume if self.use_volume else close
+        if self.last is None:
+            self.last = price
+            return
+        change = price - self.last
+        self.last = price
+        gain = change if change > 0 else 0
+        loss = -change if change < 0 else 0
+        self.changes += 1
+        period = self.period
+        if self.changes <= period:
+            self.gain_sum += gain
+            self.loss_sum += loss
+            if self.changes == period:
+                self.avg_gain = self.gain_sum / period
+                self.avg_loss = self.loss_sum / period
+        else:
+            self.avg_gain = (self.avg_gain * (period - 1) + gain) / period
+            self.avg_loss = (self.avg_loss * (period - 1) + loss) / period
+
+
+class _MacdState:
+    __slots__ = ("fast", "slow", "signal_period", "count", "fast_ema", "slow_ema", "signal_ema", "prev")
+
+    def __init__(self, fast: int, slow: int, signal_period: int):
+        self.fast = fast
+        self.slow = slow
+        self.signal_period = signal_period
+        self.count = 0
+        self.fast_ema = _Ema(fast)
+        self.slow_ema = _Ema(slow)
+        self.signal_ema = _Ema(signal_period)
+        self.prev: Dict[str, float] = {}
+
+    def values(self) -> Dict[str, float]:
+        if self.count < self.slow + self.signal_period:
+            return {}
+        macd_line = self.fast_ema.value - self.slow_ema.value
+        signal_line = self.signal_ema.value
+        suffix = f"{self.fast}_{self.slow}_{self.signal_period}"
+        return {
+            f"macd_{suffix}": macd_line,
+            f"macd_signal_{suffix}": signal_line,
+            f"macd_histogram_{suffix}": macd_line - signal_line,
+        }
+
+    def push(self, close: float, high: float, low: float, volume: float, candle: Dict[str, Any]) -> None:
+        self.prev = self.values()
+        self.count += 1
+        self.fast_ema.push(close)
+        self.slow_ema.push(close)
+        if self.count >= self.slow:
+            self.signal_ema.push(self.fast_ema.value - self.slow_ema.value)
+
+
+class _StochState:
+    """Stochastic %K/%D with monotonic deques for the rolling highest high / lowest low.
+
+    Mirrors IndicatorCalculator.calculate_stochastic, including its %D inputs:
+    the earlier %K values there use the k_period candles *before* each index
+    with that index's close, so each one is taken just before its candle is
+    pushed.
+    """
+
+    __slots__ = ("k_period", "d_period", "count", "highs", "lows", "last_close", "recent_k", "prev")
+
+    def __init__(self, k_period: int, d_period: int):
+        self.k_period = k_period
+        self.d_period = d_period
+        self.count = 0
+        self.highs: deque = deque()  # (index, high), highs decreasing
+        self.lows: deque = deque()  # (index, low), lows increasing
+        self.last_close: Optional[float] = None
+        self.recent_k: deque = deque(maxlen=max(d_period, 1))  # (index, %K for the %D average)
+        self.prev: Dict[str, float] = {}
+
+    def _k(self, close: float) -> float:
+        highest_high = self.highs[0][1]
+        lowest_low = self.lows[0][1]
+        if highest_high == lowest_low:
+            return 50.0
+        return ((close - lowest_low) / (highest_high - lowest_low)) * 100
+
+    def values(self) -> Dict[str, float]:
+        n, k_period, d_period = self.count, self.k_period, self.d_period
+        if n < k_period:
+            return {}
+        k_value = self._k(self.last_close)
+        first = max(k_period, n - d_period)
+        k_values = [value for i, value in self.recent_k if first <= i < n - 1]
+        k_values.append(k_value)
+        d_value = sum(k_values[-d_period:]) / d_period if len(k_values) >= d_period else None
+        suffix = f"{k_period}_{d_period}"
+        return {f"stoch_k_{suffix}": k_value, f"stoch_d_{suffix}": d_value}
+
+    def push(self, close: float, high: float, low: float, volume: float, candle: Dict[str, Any]) -> None:
+        self.prev = self.values()
+        i = self.count
+        if i >= self.k_period:
+            # The deques hold candles [i - k_period, i) here
+            self.recent_k.append((i, self._k(close)))
+        while self.highs and self.highs[-1][1] <= high:
+            self.highs.pop()
+        self.highs.append((i, high))
+        while self.lows and self.lows[-1][1] >= low:
+            self.lows.pop()
+        self.lows.append((i, low))
+        oldest = i - self.k_period
+        while self.highs[0][0] <= oldest:
+            self.highs.popleft()
+        while self.lows[0][0] <= oldest:
+            self.lows.popleft()
+        self.count += 1
+        self.last_close = close
+
+
+def _recurrence_state(indicator_key: str):
+    """Build the O(1)-update state for a whole-history key, or None for window keys."""
+    if indicator_key.startswith("rsi_"):
+        return _RsiState(indicator_key, int(indicator_key.split("_")[1]), use_volume=False)
+    if indicator_key.startswith("macd_"):
+        parts = indicator_key.split("_")
+        if len(parts) >= 4:
+            return _MacdState(int(parts[1]), int(parts[2]), int(parts[3]))
+        return None
+    if indicator_key.startswith("ema_"):
+        return _EmaState(indicator_key, int(indicator_key.split("_")[1]))
+    if indicator_key.startswith("volume_rsi_"):
+        return _RsiState(indicator_key, int(indicator_key.split("_")[2]), use_volume=True)
+    if indicator_key.startswith("stoch_"):
+        parts = indicator_key.split("_")
+        if len(parts) >= 4:
+            return _StochState(int(parts[2]), int(parts[3]))
+    return None
+
+
+def _window_length(indicator_key: str) -> int:
+    """Closed candles a fixed-window key reads (0 for keys it ignores).
+
+    Includes one extra candle so the previous-candle value can be evaluated
+    from the same tail."""
+    parts = indicator_key.split("_")
+    if indicator_key.startswith("sma_"):
+        return int(parts[1]) + 1
+    if indicator_key.startswith("bb_") and len(parts) >= 4:
+        return int(parts[2]) + 1
+    return 0
+
+
+def _candle_start(candle: Dict[str, Any]) -> Optional[float]:
+    value = candle.get("start", candle.get("time"))
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class IndicatorStream:
+    """Incremental indicator state for one candle window, resumed while its start stays put."""
+
+    def __init__(self, calculator: Optional[IndicatorCalculator] = None):
+        self._calc = calculator or IndicatorCalculator()
+        self._states: Dict[str, Any] = {}
+        self._window_keys: Set[str] = set()
+        self._tail_len = 0
+        self._tail: Dict[str, deque] = {}
+        # (candles folded in, whether the history was re-anchored) for the last update
+        self.last_update: Tuple[int, bool] = (0, False)
+        self._reset()
+
+    def _reset(self) -> None:
+        self._anchor = None
+        self._count = 0
+        self._last_start = None
+        self._last_close: Optional[float] = None
+        self._states.clear()
+        self._window_keys.clear()
+        self._set_tail_len(0)
+
+    def _set_tail_len(self, length: int) -> None:
+        self._tail_len = length
+        self._tail = {name: deque(maxlen=max(length, 1)) for name in ("close", "high", "low", "volume")}
+
+    def __len__(self) -> int:
+        """Closed candles folded into the state since the anchor."""
+        return self._count
+
+    @property
+    def anchor(self) -> Any:
+        """Start timestamp of the first closed candle in the history (the window start)."""
+        return self._anchor
+
+    def _resume_index(self, closed: List[Dict[str, Any]]) -> int:
+        """Where ``closed`` continues the history: fold in ``closed[i:]``.
+
+        Returns _REPLAY when the stream has to restart from ``closed`` and
+        _BEHIND when ``closed`` ends before the stream's newest candle.
+        """
+        if self._count == 0 or not closed or self._anchor is None:
+            return _REPLAY
+        first = _candle_start(closed[0])
+        if first is None or first != self._anchor:
+            return _REPLAY  # no timestamps, or the window start moved (slid or deeper lookback)
+        # The stream's newest candle is normally the last or second-to-last
+        # closed candle, so this scan is O(new candles).
+        for i in range(len(closed) - 1, -1, -1):
+            start = _candle_start(closed[i])
+            if start is None:
+                return _REPLAY
+            if start == self._last_start:
+                return i + 1 if float(closed[i]["close"]) == self._last_close else _REPLAY
+            if start < self._last_start:
+                return _BEHIND if i == len(closed) - 1 else _REPLAY
+        return _REPLAY  # gap between the history and the window
+
+    def _push(self, candle: Dict[str, Any]) -> None:
+        close = float(candle["close"])
+        high = float(candle["high"])
+        low = float(candle["low"])
+        volume = float(candle["volume"])
+        for state in self._states.values():
+            state.push(close, high, low, volume, candle)
+        if self._tail_len:
+            self._tail["close"].append(close)
+            self._tail["high"].append(high)
+            self._tail["low"].append(low)
+            self._tail["volume"].append(volume)
+        if self._count == 0:
+            self._anchor = _candle_start(candle)
+        self._count += 1
+        self._last_start = _candle_start(candle)
+        self._last_close = close
+
+    def _track(self, required: Set[str], history: List[Dict[str, Any]]) -> None:
+        """Start tracking keys not seen before, replaying ``history`` into them.
+
+        ``history`` is every candle already folded in (the window shares the
+        stream's anchor), so new keys agree with the keys tracked before them.
+        """
+        new_states = {}
+        tail_needed = self._tail_len
+        for key in required:
+            if key in self._states or key in self._window_keys:
+                continue
+            state = _recurrence_state(key)
+            if state is not None:
+                new_states[key] = state
+                continue
+            length = _window_length(key)
+            if length:
+                self._window_keys.add(key)
+                tail_needed = max(tail_needed, length)
+
+        if tail_needed > self._tail_len:
+            self._set_tail_len(tail_needed)
+            for candle in history[-tail_needed:]:
+                self._tail["close"].append(float(candle["close"]))
+                self._tail["high"].append(float(candle["high"]))
+                self._tail["low"].append(float(candle["low"]))
+                self._tail["volume"].append(float(candle["volume"]))
+
+        for key, state in new_states.items():
+            for candle in history:
+                state.push(float(candle["close"]), float(candle["high"]),
+                           float(candle["low"]), float(candle["volume"]), candle)
+            self._states[key] = state
+
+    def update(self, closed: List[Dict[str, Any]], required: Set[str]) -> Optional[int]:
+        """Bring the state up to date with ``closed``; returns candles folded in.
+
+        Appends only the candles past the stream's newest one; re-anchors and
+        replays when ``closed`` doesn't continue the history. Returns None,
+        leaving the state untouched, when ``closed`` ends before the history.
+        """
+        index = self._resume_index(closed)
+        if index == _BEHIND:
+            self.last_update = (0, False)
+            return None
+        replay = index == _REPLAY
+        if replay:
+            self._reset()
+            index = 0
+        self._track(required, closed[:index])
+        new = closed[index:]
+        for candle in new:
+            self._push(candle)
+        self.last_update = (len(new), replay)
+        return len(new)
+
+    def _window_values(self, required: Set[str], previous: bool) -> Dict[str, float]:
+        closes = list(self._tail["close"])
+        highs = list(self._tail["high"])
+        lows = list(self._tail["low"])
+        volumes = list(self._tail["volume"])
+        if previous:
+            closes, highs, lows, volumes = closes[:-1], highs[:-1], lows[:-1], volumes[:-1]
+        values: Dict[str, float] = {}
+        for key in required:
+            if key in self._window_keys:
+                values.update(self._calc.calculate_indicator(key, closes, highs, lows, volumes, []))
+        return values
+
+    def values(self, required: Set[str], previous: bool = False) -> Dict[str, float]:
+        """Indicator values at the last closed candle (or the one before it)."""
+        values: Dict[str, float] = {}
+        for key in required:
+            state = self._states.get(key)
+            if state is not None:
+                values.update(state.prev if previous else state.values())
+        values.update(self._window_values(required, previous))
+        return values
+
+    def calculate(
+        self,
+        candles: List[Dict[str, Any]],
+        required_indicators: Set[str],
+        calculate_previous: bool = False,
+        previous_indicators_cache: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, float]:
+        """Streaming equivalent of ``IndicatorCalculator.calculate_all_indicators``."""
+        if len(candles) < 3:
+            # Fewer than two closed candles: the batch path's early exits apply.
+            return self._calc.calculate_all_indicators(
+                candles, required_indicators, calculate_previous, previous_indicators_cache
+            )
+
+        closed = candles[:-1]
+        if self.update(closed, required_indicators) is None:
+            return self._calc.calculate_all_indicators(
+                candles, required_indicators, calculate_previous, previous_indicators_cache
+            )
+
+        indicators: Dict[str, float] = {
+            "price": float(candles[-1]["close"]),
+            "volume": float(candles[-1]["volume"]),
+        }
+        indicators.update(self.values(required_indicators))
+        indicators.update(self._window_scoped_values(closed, required_indicators))
+
+        if calculate_previous and len(candles) > 3:
+            if previous_indicators_cache:
+                for key, value in previous_indicators_cache.items():
+                    if not key.startswith("prev_"):
+                        indicators[f"prev_{key}"] = value
+            else:
+                indicators["prev_price"] = float(closed[-1]["close"])
+                indicators["prev_volume"] = float(closed[-1]["volume"])
+                previous = self.values(required_indicators, previous=True)
+                previous.update(self._window_scoped_values(closed[:-1], required_indicators))
+                for key, value in previous.items():
+                    indicators[f"prev_{key}"] = value
+
+        return indicators
+
+    def _window_scoped_values(self, closed: List[Dict[str, Any]], required: Set[str]) -> Dict[str, float]:
+        """VWAP / gap_fill_pct over exactly the caller's closed candles, as the batch path does."""
+        keys = [key for key in _WINDOW_SCOPED_KEYS if key in required]
+        if not keys:
+            return {}
+        if len(closed) < 2:
+            return {}  # the batch path returns before any indicator below two closed candles
+        closes = [float(c["close"]) for c in closed]
+        highs = [float(c["high"]) for c in closed]
+        lows = [float(c["low"]) for c in closed]
+        volumes = [float(c["volume"]) for c in closed]
+        values: Dict[str, float] = {}
+        for key in keys:
+            values.update(self._calc.calculate_indicator(key, closes, highs, lows, volumes, closed))
+        return values
+
+
+class IndicatorStreamRegistry:
+    """Shared IndicatorStreams per (product_id, granularity) series and window start.
+
+    Bots that fetch the same window for a pair share one stream; a different
+    lookback depth gets its own, so neither re-anchors the other.
+    """
+
+    def __init__(self, max_streams: int = _MAX_STREAMS):
+        self._streams: "OrderedDict[Hashable, OrderedDict[Any, IndicatorStream]]" = OrderedDict()
+        self._max_streams = max_streams
+        self._count = 0
+        self._calc = IndicatorCalculator()
+        self.appended = 0
+        self.replayed = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _stream_for(self, series_key: Hashable, window_start: Any) -> IndicatorStream:
+        windows = self._streams.get(series_key)
+        if windows is None:
+            windows = self._streams[series_key] = OrderedDict()
+        else:
+            self._streams.move_to_end(series_key)
+        stream = windows.get(window_start)
+        if stream is not None:
+            windows.move_to_end(window_start)
+            return stream
+        stream = windows[window_start] = IndicatorStream(self._calc)
+        self._count += 1
+        if len(windows) > _MAX_WINDOWS_PER_SERIES:
+            windows.popitem(last=False)
+            self._count -= 1
+        while self._count > self._max_streams:
+            oldest_key, oldest = next(iter(self._streams.items()))
+            oldest.popitem(last=False)
+            self._count -= 1
+            if not oldest:
+                del self._streams[oldest_key]
+        return stream
+
+    def calculate(
+        self,
+        series_key: Hashable,
+        candles: List[Dict[str, Any]],
+        required_indicators: Set[str],
+        calculate_previous: bool = False,
+        previous_indicators_cache: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, float]:
+        """Calculate indicators for ``candles`` on the shared stream for ``series_key``."""
+        if not candles:
+            return {}
+        stream = self._stream_for(series_key, _candle_start(candles[0]))
+        stream.last_update = (0, False)
+        result = stream.calculate(candles, required_indicators, calculate_previous, previous_indicators_cache)
+        folded, reanchored = stream.last_update
+        if reanchored:
+            self.replayed += folded
+        else:
+            self.appended += folded
+        return result
+
+    def discard(self, series_key: Hashable) -> None:
+        """Drop a series' streams (e.g. the pair is no longer traded)."""
+        windows = self._streams.pop(series_key, None)
+        if windows:
+            self._count -= len(windows)
+
+    def clear(self) -> None:
+        self._streams.clear()
+        self._count = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"streams": self._count, "appended": self.appended, "replayed": self.replayed}
+
+
+# Module-level singleton shared by every IndicatorCalculator in the process
+indicator_streams = IndicatorStreamRegistry()
@@ -0,0 +1,82 @@
+"""
+Default JSON response class: orjson rendering with UTC-suffixed datetimes.
+
+The ORM stores naive UTC datetimes (see app/utils/timeutil.py), which the
+stock encoders render without an offset ("2025-11-16T01:50:13.090200"), so a
+browser parses them as local time. The old DatetimeTimezoneMiddleware fixed
+that after the fact: it buffered every JSON body with ``body += chunk`` and
+ran a regex over the bytes to append "Z" — quadratic copying plus a full
+extra pass on the large position / history payloads, and it also rewrote
+datetime-looking strings that were not datetimes at all.
+
+The suffix is now emitted where the value is serialized, on each of the three
+paths a response can take:
+
+- ``UTCJSONResponse`` (the app's ``default_response_class``) renders with
+  orjson using OPT_NAIVE_UTC | OPT_UTC_Z, so datetimes handed to it directly
+  come out as "...Z" in a single native pass;
+- ``jsonable_encoder`` (endpoints returning dicts / lists without a
+  response_model) gets a naive-UTC datetime encoder via
+  ``install_datetime_encoder()``;
+- response models serialize through pydantic's core, so their datetime fields
+  use the ``UTCDatetime`` annotation, which is JSON-mode only — Python-mode
+  ``model_dump()`` still returns the naive datetime.
+"""
+
+from datetime import datetime, timedelta
+from typing import Annotated, Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import PlainSerializer
+
+ORJSON_OPTIONS = (
+    orjson.OPT_NAIVE_UTC
+    | orjson.OPT_UTC_Z
+    | orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_SERIALIZE_NUMPY
+)
+
+
+def utc_isoformat(value: datetime) -> str:
+    """ISO 8601 string for a datetime, treating naive values as UTC ("...Z").
+
+    Matches orjson's OPT_NAIVE_UTC | OPT_UTC_Z output, so a timestamp reads the
+    same whichever serialization path produced it.
+    """
+    if value.tzinfo is None:
+        return value.isoformat() + "Z"
+    if value.utcoffset() == timedelta(0):
+        return value.replace(tzinfo=None).isoformat() + "Z"
+    return value.isoformat()
+
+
+# Use in response schemas in place of ``datetime``
+UTCDatetime = Annotated[datetime, PlainSerializer(utc_isoformat, return_type=str, when_used="json")]
+
+
+def _default(obj: Any) -> Any:
+    # Types orjson does not handle natively (Decimal, sets, pydantic models, ...)
+    from fastapi.encoders import jsonable_encoder
+    return jsonable_encoder(obj)
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes the way every API response is rendered."""
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class UTCJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson; naive datetimes are emitted as UTC."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def install_datetime_encoder() -> None:
+    """Make FastAPI's jsonable_encoder emit naive datetimes as UTC (idempotent)."""
+    from fastapi import encoders
+    encoders.ENCODERS_BY_TYPE[datetime] = utc_isoformat
+
+
+install_datetime_encoder()
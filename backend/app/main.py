@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Optional
 
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.datastructures import Default
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
@@ -19,8 +20,10 @@ from app.middleware.public_rate_limit import PublicEndpointRateLimiter
 from app.middleware.intrusion_detect import IntrusionDetector
 from app.config import settings
 from app.database import init_db
+from app.json_response import UTCJSONResponse
 from app.multi_bot_monitor import MultiBotMonitor
-from app.performance_metrics import record_server_timing
+from app.performance_metrics import record_server_queries, record_server_timing, start_db_query_count
+from app.rate_limit_engine import attach_shared_redis
 from app.utils.db_corruption import is_db_corruption_error
 from app.position_routers import perps_router
 from app.routers import account_value_router  # Account value history tracking
@@ -108,6 +111,8 @@ app = FastAPI(
     title=f"{_brand['shortName']} Trading Platform",
     docs_url=None, redoc_url=None, openapi_url=None,
     lifespan=_lifespan,
+    # Default(): response_model routes keep FastAPI's pydantic dump_json fast path
+    default_response_class=Default(UTCJSONResponse),
 )
 
 # TTS thread pool — created at module level (no async dependency) so it is
@@ -146,12 +151,14 @@ class ServerTimingMiddleware(BaseHTTPMiddleware):
 
     async def dispatch(self, request: Request, call_next):
         started = time.perf_counter()
+        queries = start_db_query_count()
         response: Response = await call_next(request)
         duration_ms = (time.perf_counter() - started) * 1000
         response.headers["Server-Timing"] = f"app;dur={duration_ms:.1f}"
         route = request.scope.get("route")
         route_path = getattr(route, "path", "/unmatched")
         record_server_timing(request.method, route_path, duration_ms)
+        record_server_queries(request.method, route_path, queries[0])
         return response
 
 
@@ -465,10 +472,11 @@ def _wire_event_bus_subscribers() -> None:
     Handler exceptions are caught by the bus — polling fallback ensures correctness.
     """
     from app.event_bus import (
-        event_bus, ORDER_FILLED, BOT_STARTED, BOT_STOPPED, POSITION_CLOSED,
+        event_bus, ORDER_FILLED, BOT_STARTED, BOT_STOPPED, BOT_UPDATED, POSITION_CLOSED,
         POSITION_OPENED,
     )
     from app.indicators.ai_opinion_logger import on_position_closed
+    from app.services.pnl_rollup_service import on_position_closed as refresh_pnl_rollup
     from app.services.telegram_service import (
         notify_order_filled, notify_position_opened,
         notify_position_closed, notify_bot_started, notify_bot_stopped,
@@ -501,14 +509,27 @@ def _wire_event_bus_subscribers() -> None:
     event_bus.subscribe(BOT_STOPPED, notify_bot_stopped)
     event_bus.subscribe(POSITION_CLOSED, on_position_closed)
     event_bus.subscribe(POSITION_CLOSED, notify_position_closed)
+    event_bus.subscribe(POSITION_CLOSED, refresh_pnl_rollup)
     event_bus.subscribe(POSITION_OPENED, notify_position_opened)
 
+    # Monitor bot roster: reload on any change to which bots need processing
+    # (stopped bots stay on the roster while they have open positions). The web
+    # process has no monitor, so it forwards the events to the trader over Redis.
+    from app.monitor.bot_scheduler import publish_roster_invalidation
+    roster_handler = (
+        publish_roster_invalidation if settings.process_role == "web" else price_monitor.bot_scheduler.on_bot_event
+    )
+    for topic in (BOT_STARTED, BOT_STOPPED, BOT_UPDATED, POSITION_OPENED, POSITION_CLOSED):
+        event_bus.subscribe(topic, roster_handler)
+
     logger.info(
         "Event bus: subscribers wired "
         "(order.filled → auto_buy + rebalance + telegram, "
-        "position.closed → ai_opinion_log + telegram, "
+        "position.closed → ai_opinion_log + telegram + pnl rollup, "
         "position.opened → telegram, "
-        "bot.started/stopped → telegram)"
+        "bot.started/stopped → telegram, "
+        "bot.*/position.* → monitor roster"
+        f"{' via Redis' if settings.process_role == 'web' else ''})"
     )
 
 
@@ -578,16 +599,33 @@ async def startup_event():
     from app.services.websocket_manager import ws_manager as _ws_manager
     from app.redis_client import get_redis as _get_redis
 
+    from app.auth.principal_cache import INVALIDATION_CHANNEL, principal_cache
+    from app.cache import CACHE_INVALIDATION_CHANNEL, api_cache
+    from app.monitor.bot_scheduler import ROSTER_INVALIDATION_CHANNEL
+
     async def _redis_subscriber():
         redis = await _get_redis()
         pubsub = redis.pubsub()
         await pubsub.psubscribe("ws:*")
-        logger.info("Redis pub/sub subscriber started — listening on ws:*")
+        await pubsub.subscribe(INVALIDATION_CHANNEL, CACHE_INVALIDATION_CHANNEL, ROSTER_INVALIDATION_CHANNEL)
+        logger.info(
+            f"Redis pub/sub subscriber started — listening on ws:*, {INVALIDATION_CHANNEL}, "
+            f"{CACHE_INVALIDATION_CHANNEL} and {ROSTER_INVALIDATION_CHANNEL}"
+        )
         try:
             async for msg in pubsub.listen():
                 if msg["type"] not in ("pmessage", "message"):
                     continue
                 channel = msg.get("channel") or msg.get("pattern", "")
+                if channel == INVALIDATION_CHANNEL:
+                    principal_cache.handle_message(msg["data"])
+                    continue
+                if channel == CACHE_INVALIDATION_CHANNEL:
+                    api_cache.handle_message(msg["data"])
+                    continue
+                if channel == ROSTER_INVALIDATION_CHANNEL:
+                    price_monitor.bot_scheduler.handle_message(msg["data"])
+                    continue
                 await route_redis_message(channel, msg["data"], _ws_manager)
         finally:
             # Release the dedicated pub/sub connection on shutdown so it isn't
@@ -596,6 +634,15 @@ async def startup_event():
 
     _sub_task = _asyncio.create_task(_redis_subscriber())
     app.state.redis_subscriber_task = _sub_task
+    # Principal cache invalidations (logout, password/role change) reach the other process
+    principal_cache.redis_fanout = True
+    # Split web/trader deployment: both processes share one Redis cache tier
+    if settings.shared_cache_enabled and settings.process_role != "combined":
+        api_cache.attach_redis(await _get_redis())
+        logger.info("api_cache: Redis shared tier active")
+    if settings.shared_rate_limit_enabled and settings.process_role != "combined":
+        attach_shared_redis(await _get_redis())
+        logger.info("rate limits: Redis-backed GCRA state active")
 
     logger.info("Initializing database...")
     await init_db()
@@ -620,6 +667,13 @@ async def startup_event():
     app.state.trading_started = True
     logger.info("PROCESS_ROLE=%s — exclusive trading leadership active", settings.process_role)
 
+    # Paper balances: replay any crash journal, then serve them from memory
+    try:
+        from app.services.paper_ledger import paper_ledger
+        await paper_ledger.start()
+    except Exception as e:
+        logger.warning(f"Paper ledger write-behind not started, writing through: {e}")
+
     # ── TIER 1: Start on main event loop (real-time trading) ─────────────────
     logger.info("Starting Tier 1 monitors (main event loop)...")
 
@@ -627,6 +681,11 @@ async def startup_event():
     await price_monitor.start_async()
     logger.info("Multi-bot monitor started - bot monitoring active")
 
+    if settings.coinbase_market_stream_enabled:
+        logger.info("Starting Coinbase market data stream...")
+        from app.coinbase_api.market_data_stream import market_data_stream
+        await market_data_stream.start()
+
     logger.info("Starting limit order monitor...")
     limit_order_monitor_task = asyncio.create_task(run_limit_order_monitor())
     logger.info("Limit order monitor started - checking every 10 seconds")
@@ -734,6 +793,10 @@ async def shutdown_event():
             if monitor:
                 await monitor.stop()
 
+        logger.info("🛑 Stopping Coinbase market stream...")
+        from app.coinbase_api.market_data_stream import market_data_stream
+        await market_data_stream.stop()
+
         logger.info("🛑 Stopping PropGuard monitor...")
         await stop_prop_guard_monitor()
 
@@ -750,10 +813,21 @@ async def shutdown_event():
         ]:
             await _cancel_task(task)
 
+        logger.info("🛑 Flushing paper ledger...")
+        from app.services.paper_ledger import paper_ledger
+        try:
+            await paper_ledger.stop()
+        except Exception as e:
+            logger.error(f"Paper ledger final flush failed (journal kept for replay): {e}")
+
     # Close all cached exchange clients (releases httpx connections etc.)
     from app.services.exchange_service import clear_exchange_client_cache
     clear_exchange_client_cache()
 
+    # Close this loop's pooled Coinbase HTTP clients (keep-alive connections)
+    from app.http_pool import http_pool
+    await http_pool.aclose()
+
     trading_leader_lease = getattr(app.state, "trading_leader_lease", None)
     if trading_leader_lease is not None:
         await trading_leader_lease.release()
@@ -770,6 +844,9 @@ async def shutdown_event():
         await _cancel_task(app.state.redis_subscriber_task)
         logger.info("Redis pub/sub subscriber task cancelled")
 
+    from app.cache import api_cache
+    api_cache.detach_redis()  # the client is about to close
+
     from app.redis_client import close_redis
     await close_redis()
 
@@ -1,5 +1 @@
 """Custom middleware for FastAPI application"""
-
-from .datetime_timezone import DatetimeTimezoneMiddleware
-
-__all__ = ["DatetimeTimezoneMiddleware"]
@@ -3,13 +3,15 @@ IP-based rate limiter for public (unauthenticated) API endpoints.
 
 Prevents DoS on endpoints that don't require authentication.
 Runs as raw ASGI middleware for minimal overhead on non-matching paths.
+Limits are GCRA (app.rate_limit_engine): one timestamp per IP, shared
+across processes through Redis once attach_shared_redis() has run.
 """
 
-import time
-from collections import defaultdict
 from starlette.types import ASGIApp, Receive, Scope, Send
 from starlette.responses import JSONResponse
 
+from app.rate_limit_engine import RateLimitEngine
+
 # Public path prefixes that should be rate-limited
 _PUBLIC_PREFIXES = (
     "/api/ticker/",
@@ -28,13 +30,12 @@ _COIN_ICON_PREFIX = "/api/coin-icons/"
 
 _MAX_REQUESTS = 120   # per window
 _WINDOW = 60.0        # 60 seconds
-_STALE_SECONDS = 120.0  # prune entries older than this
 
 
 class PublicEndpointRateLimiter:
     """ASGI middleware that rate-limits public endpoints by client IP."""
 
-    _ip_timestamps: dict[str, list[float]] = defaultdict(list)
+    _limiter = RateLimitEngine("public")
 
     def __init__(self, app: ASGIApp):
         self.app = app
@@ -59,12 +60,8 @@ class PublicEndpointRateLimiter:
             client = scope.get("client")
             client_ip = client[0] if client else "unknown"
 
-        now = time.time()
-        cutoff = now - _WINDOW
-        timestamps = self._ip_timestamps[client_ip]
-        timestamps[:] = [t for t in timestamps if t > cutoff]
-
-        if len(timestamps) >= _MAX_REQUESTS:
+        decision = await self._limiter.ahit(client_ip, _MAX_REQUESTS, _WINDOW)
+        if not decision.allowed:
             response = JSONResponse(
                 {"detail": "Too many requests. Please slow down."},
                 status_code=429,
@@ -73,15 +70,9 @@ class PublicEndpointRateLimiter:
             await response(scope, receive, send)
             return
 
-        timestamps.append(now)
         await self.app(scope, receive, send)
 
     @classmethod
     def prune_stale(cls) -> int:
-        """Remove stale IP entries. Called by periodic cleanup job."""
-        now = time.time()
-        stale = [ip for ip, ts in cls._ip_timestamps.items()
-                 if not ts or (now - max(ts)) > _STALE_SECONDS]
-        for ip in stale:
-            del cls._ip_timestamps[ip]
-        return len(stale)
+        """Remove IPs whose budget has fully refilled. Called by periodic cleanup job."""
+        return len(cls._limiter.prune())
@@ -25,7 +25,7 @@ from app.models.content import (
     UserArticleTTSHistory, UserContentSeenStatus,
 )
 from app.models.reporting import (
-    AccountValueSnapshot, MetricSnapshot, PropFirmState, PropFirmEquitySnapshot,
+    AccountValueSnapshot, MetricSnapshot, PnlDailyRollup, PropFirmState, PropFirmEquitySnapshot,
     ReportGoal, ExpenseItem, GoalProgressSnapshot,
     ReportSchedule, ReportScheduleGoal, Report, AccountTransfer,
 )
@@ -61,7 +61,7 @@ __all__ = [
     "UserSourceSubscription", "ArticleTTS", "UserVoiceSubscription",
     "UserArticleTTSHistory", "UserContentSeenStatus",
     # Reporting
-    "AccountValueSnapshot", "MetricSnapshot", "PropFirmState", "PropFirmEquitySnapshot",
+    "AccountValueSnapshot", "MetricSnapshot", "PnlDailyRollup", "PropFirmState", "PropFirmEquitySnapshot",
     "ReportGoal", "ExpenseItem", "GoalProgressSnapshot",
     "ReportSchedule", "ReportScheduleGoal", "Report", "AccountTransfer",
     # Social
@@ -9,6 +9,7 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     JSON,
     LargeBinary,
@@ -70,6 +71,42 @@ class MetricSnapshot(Base):
     recorded_at = Column(DateTime, nullable=False, default=utcnow, index=True)
 
 
+class PnlDailyRollup(Base):
+    """
+    Realized P&L of closed positions per (account, bot, product, UTC day).
+
+    Read by the P&L chart, completed-trade stats and realized-PnL endpoints so
+    they scale with trading days instead of closed positions. Rows are
+    recomputed per (account, day) from positions by pnl_rollup_service.
+    """
+    __tablename__ = "pnl_daily_rollups"
+    __table_args__ = (
+        Index("ix_pnl_daily_rollups_account_day", "account_id", "day"),
+        {'schema': 'reporting'},
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    account_id = Column(Integer, ForeignKey("trading.accounts.id", ondelete="CASCADE"), nullable=False)
+    bot_id = Column(Integer, nullable=True)
+    product_id = Column(String, nullable=False)
+    day = Column(Date, nullable=False)
+
+    # All closed positions
+    closed_count = Column(Integer, nullable=False, default=0)
+    profit_usd = Column(Float, nullable=False, default=0.0)
+    profit_btc = Column(Float, nullable=False, default=0.0)    # BTC pairs: profit_quote; others: USD / BTC price
+    profit_quote = Column(Float, nullable=False, default=0.0)  # native quote currency (USD fallback for stables)
+
+    # Completed-trade stats exclude manual closes
+    stats_count = Column(Integer, nullable=False, default=0)
+    stats_profit_usd = Column(Float, nullable=False, default=0.0)
+    stats_profit_btc = Column(Float, nullable=False, default=0.0)
+    win_count = Column(Integer, nullable=False, default=0)
+    loss_count = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
+
+
 class PropFirmState(Base):
     """
     Tracks equity state for prop firm accounts across restarts.
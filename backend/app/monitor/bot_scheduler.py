@@ -0,0 +1,226 @@
+"""Deadline scheduler and in-memory bot roster for the multi-bot monitor.
+
+The monitor used to wake every 10 seconds, re-read every active (and stopped
+with open positions) bot from the database, and compare each one against its
+next check time. BotScheduler keeps that roster in memory instead and orders
+the bots in a min-heap keyed by their next deadline (``next_check_time_aligned``),
+so the loop sleeps exactly until the next bot is due and starts it right at
+its candle close.
+
+The roster is reloaded only when it is invalidated — by ``bot.started``,
+``bot.stopped``, ``bot.updated`` and position open/close events from the event
+bus — or when it is older than ROSTER_MAX_AGE_SECONDS. The age limit is a
+safety net for writers that change ``Bot.is_active`` without publishing an
+event (Telegram commands, automation rules, seasonality, delisted-pair
+cleanup).
+
+In a split deployment the bot endpoints run in the web process while the
+monitor runs in the trader, so the web process forwards those events on
+ROSTER_INVALIDATION_CHANNEL (``publish_roster_invalidation``) and the trader's
+Redis subscriber applies them with ``handle_message``, the same way
+``cache:invalidate`` reaches the other process's API cache.
+
+Heap entries are never removed in place: rescheduling pushes a new entry and
+``_deadlines`` records the live one, stale entries are skipped when popped.
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.utils.timeutil import utcnow
+
+logger = logging.getLogger(__name__)
+
+ROSTER_MAX_AGE_SECONDS = 120
+ROSTER_INVALIDATION_CHANNEL = "monitor:roster:invalidate"
+RETRY_DELAY_SECONDS = 10  # Bot whose run did not advance its deadline (error, no exchange)
+
+
+def _now() -> float:
+    # Same clock frame as MultiBotMonitor._bot_next_check (utcnow().timestamp())
+    return utcnow().timestamp()
+
+
+@dataclass
+class RosterEntry:
+    """Scalar snapshot of a bot, detached from any DB session."""
+    bot_id: int
+    name: str
+    check_interval: int  # candle-aligned signal check interval (seconds)
+    ai_interval: int  # minimum seconds between AI analyses
+    last_ai_check: Optional[datetime] = None
+    pairs: List[str] = field(default_factory=list)
+
+
+class BotScheduler:
+    """Min-heap of bot deadlines plus an event-invalidated roster."""
+
+    def __init__(self, roster_max_age: float = ROSTER_MAX_AGE_SECONDS, clock: Callable[[], float] = _now):
+        self.roster_max_age = roster_max_age
+        self._clock = clock
+        self.roster: Dict[int, RosterEntry] = {}
+        self._roster_loaded_at: Optional[float] = None
+        self._roster_dirty = True
+        self._heap: List[Tuple[float, int]] = []
+        self._deadlines: Dict[int, float] = {}
+        self._wake = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.roster_loads = 0
+        self.invalidations = 0
+        self.remote_invalidations = 0
+
+    # ------------------------------------------------------------------
+    # Roster
+    # ------------------------------------------------------------------
+
+    @property
+    def roster_stale(self) -> bool:
+        if self._roster_dirty or self._roster_loaded_at is None:
+            return True
+        return self._clock() - self._roster_loaded_at >= self.roster_max_age
+
+    def set_roster(self, entries: List[RosterEntry]) -> None:
+        """Replace the roster; bots no longer on it are unscheduled."""
+        self.roster = {entry.bot_id: entry for entry in entries}
+        self._roster_loaded_at = self._clock()
+        self._roster_dirty = False
+        self.roster_loads += 1
+        for bot_id in [b for b in self._deadlines if b not in self.roster]:
+            del self._deadlines[bot_id]
+
+    def invalidate(self) -> None:
+        """Mark the roster stale and wake the loop so it reloads now."""
+        self._roster_dirty = True
+        self.invalidations += 1
+        self._notify()
+
+    async def on_bot_event(self, payload: Any) -> None:
+        """Event bus handler: any bot/position change invalidates the roster."""
+        self.invalidate()
+
+    def handle_message(self, raw: str) -> None:
+        """Apply an invalidation received on ROSTER_INVALIDATION_CHANNEL."""
+        self.remote_invalidations += 1
+        self.invalidate()
+
+    # ------------------------------------------------------------------
+    # Deadlines
+    # ------------------------------------------------------------------
+
+    def schedule(self, bot_id: int, deadline: float) -> None:
+        """Set (or move) a bot's next deadline."""
+        self._deadlines[bot_id] = deadline
+        wakes_earlier = not self._heap or deadline < self._heap[0][0]
+        heapq.heappush(self._heap, (deadline, bot_id))
+        if wakes_earlier:
+            self._notify()
+
+    def unschedule(self, bot_id: int) -> None:
+        self._deadlines.pop(bot_id, None)
+
+    def now(self) -> float:
+        return self._clock()
+
+    def deadline(self, bot_id: int) -> Optional[float]:
+        return self._deadlines.get(bot_id)
+
+    def next_deadline(self) -> Optional[float]:
+        self._drop_stale_head()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: Optional[float] = None) -> List[int]:
+        """Unschedule and return every bot whose deadline is <= now, earliest first."""
+        now = self._clock() if now is None else now
+        due = []
+        self._drop_stale_head()
+        while self._heap and self._heap[0][0] <= now:
+            _, bot_id = heapq.heappop(self._heap)
+            del self._deadlines[bot_id]
+            due.append(bot_id)
+            self._drop_stale_head()
+        return due
+
+    def _drop_stale_head(self) -> None:
+        heap = self._heap
+        while heap and self._deadlines.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        # Many reschedules leave dead entries behind; compact occasionally.
+        if len(heap) > 2 * len(self._deadlines) + 64:
+            self._heap = [(d, b) for b, d in self._deadlines.items()]
+            heapq.heapify(self._heap)
+
+    # ------------------------------------------------------------------
+    # Waiting
+    # ------------------------------------------------------------------
+
+    def seconds_until_wake(self) -> float:
+        """Time until the next deadline or roster expiry, whichever is first."""
+        now = self._clock()
+        if self.roster_stale:
+            return 0.0
+        wake_at = self._roster_loaded_at + self.roster_max_age
+        next_deadline = self.next_deadline()
+        if next_deadline is not None:
+            wake_at = min(wake_at, next_deadline)
+        return max(wake_at - now, 0.0)
+
+    async def wait(self, max_wait: Optional[float] = None) -> None:
+        """Sleep until the next bot is due, the roster expires, or something
+        earlier is scheduled / the roster is invalidated."""
+        self._loop = asyncio.get_running_loop()
+        # Clear before reading state: a notify after this point sets the event,
+        # and anything earlier is already reflected in the timeout.
+        self._wake.clear()
+        timeout = self.seconds_until_wake()
+        if max_wait is not None:
+            timeout = min(timeout, max_wait)
+        if timeout <= 0:
+            return
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def _notify(self) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            self._wake.set()
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._wake.set()
+        else:
+            # Published from another thread's loop (e.g. the secondary loop)
+            loop.call_soon_threadsafe(self._wake.set)
+
+    def stats(self) -> Dict[str, Any]:
+        next_deadline = self.next_deadline()
+        return {
+            "roster_size": len(self.roster),
+            "scheduled": len(self._deadlines),
+            "roster_loads": self.roster_loads,
+            "invalidations": self.invalidations,
+            "remote_invalidations": self.remote_invalidations,
+            "next_due_in": round(max(next_deadline - self._clock(), 0.0), 3) if next_deadline is not None else None,
+        }
+
+
+async def publish_roster_invalidation(payload: Any) -> None:
+    """Event bus handler for a process without the monitor: forward the event to the trader over Redis."""
+    try:
+        from app.redis_client import get_redis
+        redis = await get_redis()
+        await redis.publish(
+            ROSTER_INVALIDATION_CHANNEL,
+            json.dumps({"event": type(payload).__name__, "bot_id": getattr(payload, "bot_id", None)}),
+        )
+    except Exception as e:
+        logger.warning(f"Bot roster invalidation publish failed (ROSTER_MAX_AGE_SECONDS still bounds staleness): {e}")
@@ -0,0 +1,227 @@
+"""Shared columnar OHLCV candle store for the multi-bot monitor.
+
+One ring buffer per (product, granularity) holds the most recent candles as
+parallel numpy columns. Every lookback size is served as a slice of the same
+buffer, so a 100-candle and a 200-candle request for the same pair share one
+copy of the data and one exchange fetch. Refreshes merge only the candles that
+closed (or are still forming) since the newest stored candle instead of
+re-downloading the whole window.
+
+The buffer is stored twice back-to-back (the "mirrored ring" trick): slot ``i``
+is written at both ``i`` and ``i + capacity``, so any window of up to
+``capacity`` candles is one contiguous zero-copy view even after the head wraps.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+_FLOAT_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+def _candle_start(candle: Dict[str, Any]) -> int:
+    return int(float(candle.get("start", candle.get("time", 0)) or 0))
+
+
+def _as_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+class CandleSeries:
+    """Fixed-capacity columnar ring buffer of OHLCV candles (oldest-first)."""
+
+    __slots__ = (
+        "capacity", "_start", "_cols", "_synthetic", "_size", "_head", "depth", "fetched_at", "version",
+        "_dicts", "_dicts_version",
+    )
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._start = np.zeros(2 * capacity, dtype=np.int64)
+        self._cols = {name: np.zeros(2 * capacity, dtype=np.float64) for name in _FLOAT_COLUMNS}
+        self._synthetic = np.zeros(2 * capacity, dtype=np.bool_)
+        self._size = 0
+        self._head = 0  # physical slot the next appended candle is written to
+        # Largest lookback this series was fully fetched for — a larger request
+        # than this needs a full (deeper) fetch, not an incremental top-up.
+        self.depth = 0
+        self.fetched_at = 0.0
+        # Bumped on every mutation so derived views (synthetic timeframes) know
+        # when to rebuild.
+        self.version = 0
+        # Materialized dict lists per lookback, valid for _dicts_version only
+        self._dicts: Dict[int, List[Dict[str, Any]]] = {}
+        self._dicts_version = -1
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last_start(self) -> Optional[int]:
+        """Start timestamp of the newest stored candle, or None if empty."""
+        if not self._size:
+            return None
+        return int(self._start[(self._head - 1) % self.capacity])
+
+    @property
+    def nbytes(self) -> int:
+        """Resident bytes of the column buffers."""
+        return int(
+            self._start.nbytes + self._synthetic.nbytes
+            + sum(col.nbytes for col in self._cols.values())
+        )
+
+    def clear(self) -> None:
+        self._size = 0
+        self._head = 0
+        self.depth = 0
+        self.version += 1
+
+    def _write(self, slot: int, start: int, candle: Dict[str, Any]) -> None:
+        for mirror in (slot, slot + self.capacity):
+            self._start[mirror] = start
+            for name in _FLOAT_COLUMNS:
+                self._cols[name][mirror] = _as_float(candle.get(name))
+            self._synthetic[mirror] = bool(candle.get("_synthetic"))
+
+    def merge(self, candles: Iterable[Dict[str, Any]]) -> int:
+        """Merge oldest-first candles into the buffer; returns candles appended.
+
+        A candle with the same start as the newest stored one replaces it (the
+        forming candle is re-fetched until it closes); older candles are
+        ignored; newer ones are appended, overwriting the oldest when full.
+        """
+        appended = 0
+        changed = False
+        for candle in candles:
+            start = _candle_start(candle)
+            last = self.last_start
+            if last is not None and start < last:
+                continue
+            if last is not None and start == last:
+                self._write((self._head - 1) % self.capacity, start, candle)
+            else:
+                self._write(self._head, start, candle)
+                self._head = (self._head + 1) % self.capacity
+                self._size = min(self._size + 1, self.capacity)
+                appended += 1
+            changed = True
+        if changed:
+            self.version += 1
+        return appended
+
+    def window(self, lookback: int) -> Dict[str, np.ndarray]:
+        """Return the newest ``lookback`` candles as zero-copy column views.
+
+        Views alias the live buffer: copy them if they must outlive the next
+        ``merge``.
+        """
+        n = min(max(lookback, 0), self._size)
+        # Until the buffer fills, candles occupy [0, head). Once full, the
+        # mirrored copy makes [head, head + capacity) oldest..newest.
+        end = self._head + self.capacity if self._size == self.capacity else self._head
+        begin = end - n
+        view = {name: col[begin:end] for name, col in self._cols.items()}
+        view["start"] = self._start[begin:end]
+        view["_synthetic"] = self._synthetic[begin:end]
+        return view
+
+    def to_dicts(self, lookback: int) -> List[Dict[str, Any]]:
+        """Materialize the newest ``lookback`` candles in the exchange dict shape."""
+        view = self.window(lookback)
+        starts = view["start"].tolist()
+        opens = view["open"].tolist()
+        highs = view["high"].tolist()
+        lows = view["low"].tolist()
+        closes = view["close"].tolist()
+        volumes = view["volume"].tolist()
+        synthetic = view["_synthetic"].tolist()
+        out = []
+        for i in range(len(starts)):
+            candle = {
+                "start": starts[i],
+                "open": opens[i],
+                "high": highs[i],
+                "low": lows[i],
+                "close": closes[i],
+                "volume": volumes[i],
+            }
+            if synthetic[i]:
+                candle["_synthetic"] = True
+            out.append(candle)
+        return out
+
+    def cached_dicts(self, lookback: int) -> List[Dict[str, Any]]:
+        """``to_dicts(lookback)``, built once per series version.
+
+        Repeated reads between merges return the same list, so a cache hit is
+        O(1). Callers must treat it as read-only, like any cached candle list.
+        """
+        if self._dicts_version != self.version:
+            self._dicts = {}
+            self._dicts_version = self.version
+        out = self._dicts.get(lookback)
+        if out is None:
+            out = self._dicts[lookback] = self.to_dicts(lookback)
+        return out
+
+
+class CandleStore:
+    """Registry of :class:`CandleSeries` keyed by (product_id, granularity).
+
+    Tracks per-key hit/miss/refresh counters so the monitor can report how
+    much exchange traffic the shared store is saving.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._series: Dict[Tuple[str, str], CandleSeries] = {}
+        self.hits = 0
+        self.misses = 0  # cold or too-shallow series → full window fetch
+        self.refreshes = 0  # stale series → incremental top-up fetch
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._series
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def keys(self) -> List[Tuple[str, str]]:
+        return list(self._series)
+
+    def get(self, product_id: str, granularity: str) -> Optional[CandleSeries]:
+        return self._series.get((product_id, granularity))
+
+    def series(self, product_id: str, granularity: str) -> CandleSeries:
+        """Return the series for a key, creating an empty one if needed."""
+        key = (product_id, granularity)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = CandleSeries(self.capacity)
+        return series
+
+    def discard(self, key: Tuple[str, str]) -> None:
+        self._series.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters plus resident bytes, overall and per pair."""
+        lookups = self.hits + self.misses + self.refreshes
+        bytes_by_pair: Dict[str, int] = {}
+        for (product_id, _), series in self._series.items():
+            bytes_by_pair[product_id] = bytes_by_pair.get(product_id, 0) + series.nbytes
+        total_bytes = sum(bytes_by_pair.values())
+        return {
+            "series": len(self._series),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "total_bytes": total_bytes,
+            "bytes_per_pair": round(total_bytes / len(bytes_by_pair)) if bytes_by_pair else 0,
+            "bytes_by_pair": bytes_by_pair,
+        }
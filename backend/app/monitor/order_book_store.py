@@ -0,0 +1,297 @@
+"""Locally maintained level-2 order books.
+
+Each side of a :class:`LocalOrderBook` is two parallel ``array('d')`` columns
+(price key, size) kept sorted ascending with the BEST level at the tail: bids
+are keyed by price, asks by negated price. A level update is a binary search
+(O(log n)) plus an in-place size write; adding or removing a level shifts only
+the levels behind it, which for the near-touch levels that churn the most is a
+short memmove. Depth queries walk from the tail, so a VWAP over the first ``k``
+levels costs O(k) no matter how deep the book is.
+
+:class:`OrderBookStore` holds one book per product, fed by the Coinbase level2
+stream (``source="stream"``, trusted until the stream marks it stale or drops
+it, or until it has gone STREAM_BOOK_MAX_AGE seconds without a snapshot or
+update) or by REST ``product_book`` snapshots (``source="rest"``, trusted for
+REST_BOOK_MAX_AGE seconds, like the response cache it replaces). The slippage
+guard and paper fills query it without network I/O.
+"""
+
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# A REST snapshot receives no updates; serve it as long as the old 2s response cache did.
+REST_BOOK_MAX_AGE = 2.0
+# A stream book that has heard nothing for this long may have lost its
+# subscription without a sequence gap; it is evicted so readers use REST.
+STREAM_BOOK_MAX_AGE = 60.0
+
+_BID_SIDES = ("bid", "bids", "buy")
+
+
+def _level(entry: Any) -> Tuple[float, float]:
+    """``{"price", "size"}`` dict or ``(price, size)`` pair → floats."""
+    if isinstance(entry, dict):
+        return float(entry.get("price") or 0), float(entry.get("size") or 0)
+    return float(entry[0]), float(entry[1])
+
+
+class LocalOrderBook:
+    """Sorted-array level-2 book for one product."""
+
+    __slots__ = ("_bid_keys", "_bid_sizes", "_ask_keys", "_ask_sizes", "source", "stale", "updated_at", "depth_limit")
+
+    def __init__(self, source: str = "stream"):
+        self._bid_keys = array("d")
+        self._bid_sizes = array("d")
+        self._ask_keys = array("d")  # negated prices
+        self._ask_sizes = array("d")
+        self.source = source
+        self.stale = False
+        self.updated_at = 0.0
+        # Levels per side the snapshot was requested with (REST); None = full book
+        self.depth_limit: Optional[int] = None
+
+    @classmethod
+    def from_pricebook(cls, pricebook: Dict[str, Any], source: str = "rest") -> "LocalOrderBook":
+        """Build a book from a REST ``pricebook`` (``{"bids": [...], "asks": [...]}``)."""
+        book = cls(source)
+        book.load(pricebook.get("bids") or [], pricebook.get("asks") or [])
+        return book
+
+    def load(self, bids: Iterable[Any], asks: Iterable[Any]) -> None:
+        """Replace both sides with a snapshot (levels in any order)."""
+        for entries, keys, sizes, sign in (
+            (bids, self._bid_keys, self._bid_sizes, 1.0),
+            (asks, self._ask_keys, self._ask_sizes, -1.0),
+        ):
+            levels: Dict[float, float] = {}
+            for entry in entries:
+                price, size = _level(entry)
+                if price > 0 and size > 0:
+                    levels[sign * price] = size
+            ordered = sorted(levels.items())
+            keys[:] = array("d", (key for key, _ in ordered))
+            sizes[:] = array("d", (size for _, size in ordered))
+        self.stale = False
+        self.updated_at = time.time()
+
+    def update(self, side: str, price: float, size: float) -> None:
+        """Set the size at one price level; ``size <= 0`` removes the level."""
+        if side in _BID_SIDES:
+            keys, sizes, key = self._bid_keys, self._bid_sizes, price
+        else:
+            keys, sizes, key = self._ask_keys, self._ask_sizes, -price
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            if size > 0:
+                sizes[i] = size
+            else:
+                del keys[i]
+                del sizes[i]
+        elif size > 0 and price > 0:
+            keys.insert(i, key)
+            sizes.insert(i, size)
+        self.updated_at = time.time()
+
+    def __len__(self) -> int:
+        return len(self._bid_keys) + len(self._ask_keys)
+
+    @property
+    def best_bid(self) -> float:
+        return self._bid_keys[-1] if self._bid_keys else 0.0
+
+    @property
+    def best_ask(self) -> float:
+        return -self._ask_keys[-1] if self._ask_keys else 0.0
+
+    def bids(self, depth: int) -> List[Tuple[float, float]]:
+        """Best ``depth`` bids, highest first."""
+        n = len(self._bid_keys)
+        return [(self._bid_keys[i], self._bid_sizes[i]) for i in range(n - 1, max(n - depth, 0) - 1, -1)]
+
+    def asks(self, depth: int) -> List[Tuple[float, float]]:
+        """Best ``depth`` asks, lowest first."""
+        n = len(self._ask_keys)
+        return [(-self._ask_keys[i], self._ask_sizes[i]) for i in range(n - 1, max(n - depth, 0) - 1, -1)]
+
+    def to_pricebook(self, product_id: str, limit: int) -> Dict[str, Any]:
+        """Best ``limit`` levels per side in the REST ``product_book`` shape."""
+        return {
+            "pricebook": {
+                "product_id": product_id,
+                "bids": [{"price": str(price), "size": str(size)} for price, size in self.bids(limit)],
+                "asks": [{"price": str(price), "size": str(size)} for price, size in self.asks(limit)],
+            },
+            "source": self.source,
+        }
+
+    # ------------------------------------------------------------------
+    # Depth queries — O(levels consumed)
+    # ------------------------------------------------------------------
+
+    def sell_vwap(self, base_amount: float) -> Tuple[float, float, bool]:
+        """VWAP for selling ``base_amount`` into the bids.
+
+        Returns ``(vwap, filled_base, fully_filled)`` with the same semantics as
+        ``book_depth_guard.calculate_vwap_from_bids``.
+        """
+        return self._walk_base(self._bid_keys, self._bid_sizes, 1.0, base_amount)
+
+    def buy_vwap(self, base_amount: float) -> Tuple[float, float, bool]:
+        """VWAP for buying ``base_amount`` from the asks: ``(vwap, filled_base, fully_filled)``."""
+        return self._walk_base(self._ask_keys, self._ask_sizes, -1.0, base_amount)
+
+    def buy_vwap_quote(self, quote_amount: float) -> Tuple[float, float, bool]:
+        """VWAP for spending ``quote_amount`` on the asks.
+
+        Returns ``(vwap, filled_quote, fully_filled)`` with the same semantics as
+        ``book_depth_guard.calculate_vwap_from_asks``.
+        """
+        if quote_amount <= 0 or not self._ask_keys:
+            return 0.0, 0.0, False
+        keys, sizes = self._ask_keys, self._ask_sizes
+        remaining = quote_amount
+        total_quote = 0.0
+        total_base = 0.0
+        for i in range(len(keys) - 1, -1, -1):
+            price = -keys[i]
+            spend = min(remaining, price * sizes[i])
+            total_quote += spend
+            total_base += spend / price
+            remaining -= spend
+            if remaining <= 1e-12:
+                break
+        if total_base <= 0:
+            return 0.0, 0.0, False
+        return total_quote / total_base, total_quote, remaining <= 1e-12
+
+    @staticmethod
+    def _walk_base(keys: array, sizes: array, sign: float, base_amount: float) -> Tuple[float, float, bool]:
+        if base_amount <= 0 or not keys:
+            return 0.0, 0.0, False
+        remaining = base_amount
+        total_quote = 0.0
+        total_base = 0.0
+        for i in range(len(keys) - 1, -1, -1):
+            fill = min(remaining, sizes[i])
+            total_quote += fill * sign * keys[i]
+            total_base += fill
+            remaining -= fill
+            if remaining <= 1e-12:
+                break
+        if total_base <= 0:
+            return 0.0, 0.0, False
+        return total_quote / total_base, total_base, remaining <= 1e-12
+
+
+class OrderBookStore:
+    """Thread-safe registry of :class:`LocalOrderBook` keyed by product_id.
+
+    The stream writes on the main event loop while readers may run on the
+    secondary loop's thread, so every mutation and query happens under one
+    lock. Queries hold it only for an O(k) walk.
+    """
+
+    def __init__(self, rest_max_age: float = REST_BOOK_MAX_AGE, stream_max_age: float = STREAM_BOOK_MAX_AGE):
+        self.rest_max_age = rest_max_age
+        self.stream_max_age = stream_max_age
+        self._lock = threading.Lock()
+        self._books: Dict[str, LocalOrderBook] = {}
+        self.stats_counters = {"snapshots": 0, "updates": 0, "hits": 0, "misses": 0, "expired": 0}
+
+    def __len__(self) -> int:
+        return len(self._books)
+
+    def apply_snapshot(
+        self,
+        product_id: str,
+        bids: Iterable[Any],
+        asks: Iterable[Any],
+        source: str = "stream",
+        depth_limit: Optional[int] = None,
+    ) -> None:
+        with self._lock:
+            book = self._books.get(product_id)
+            if book is not None and book.source == "stream" and not book.stale and source != "stream":
+                return  # a live stream book is never replaced by a REST snapshot
+            if book is None or book.source != source:
+                book = self._books[product_id] = LocalOrderBook(source)
+            book.load(bids, asks)
+            book.depth_limit = depth_limit
+            self.stats_counters["snapshots"] += 1
+
+    def apply_updates(self, product_id: str, updates: Iterable[Tuple[str, float, float]]) -> bool:
+        """Apply ``(side, price, size)`` updates; False if there is no trusted stream book to patch."""
+        with self._lock:
+            book = self._books.get(product_id)
+            if book is None or book.stale or book.source != "stream":
+                return False
+            for side, price, size in updates:
+                book.update(side, price, size)
+                self.stats_counters["updates"] += 1
+            return True
+
+    def mark_stale(self, source: Optional[str] = None) -> None:
+        with self._lock:
+            for book in self._books.values():
+                if source is None or book.source == source:
+                    book.stale = True
+
+    def drop(self, source: Optional[str] = None, product_ids: Optional[Iterable[str]] = None) -> None:
+        """Forget books (all, or only those from ``source`` and/or for ``product_ids``)."""
+        with self._lock:
+            candidates = self._books if product_ids is None else [p for p in product_ids if p in self._books]
+            for product_id in [p for p in candidates if source is None or self._books[p].source == source]:
+                del self._books[product_id]
+
+    def _fresh(self, product_id: str, depth: Optional[int]) -> Optional[LocalOrderBook]:
+        # Caller holds self._lock
+        book = self._books.get(product_id)
+        if book is None or book.stale:
+            return None
+        if book.source == "stream":
+            if time.time() - book.updated_at > self.stream_max_age:
+                del self._books[product_id]
+                self.stats_counters["expired"] += 1
+                return None
+        else:
+            if time.time() - book.updated_at > self.rest_max_age:
+                return None
+            if depth is not None and book.depth_limit is not None and depth > book.depth_limit:
+                return None
+        return book
+
+    @contextmanager
+    def reading(self, product_id: str, depth: Optional[int] = None) -> Iterator[Optional[LocalOrderBook]]:
+        """Yield the trusted book for ``product_id`` (or None) with the store locked.
+
+        Keep the block to in-memory queries; the lock is held for its duration.
+        """
+        with self._lock:
+            book = self._fresh(product_id, depth)
+            self.stats_counters["hits" if book is not None else "misses"] += 1
+            yield book
+
+    def pricebook(self, product_id: str, limit: int = 50) -> Optional[Dict[str, Any]]:
+        """Trusted book as a REST ``product_book`` response, or None."""
+        with self.reading(product_id, limit) as book:
+            return book.to_pricebook(product_id, limit) if book is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            books = list(self._books.values())
+            return {
+                **self.stats_counters,
+                "books": len(books),
+                "stream_books": sum(1 for b in books if b.source == "stream"),
+                "stale_books": sum(1 for b in books if b.stale),
+                "levels": sum(len(b) for b in books),
+            }
+
+
+# Global instance (fed by coinbase_api.market_data_stream and REST product_book calls)
+order_books = OrderBookStore()
@@ -227,6 +227,32 @@ async def _fetch_legacy_candles(
 # ---------------------------------------------------------------------------
 
 
+async def _script_data_kwargs(monitor, bot: Bot, product_id: str, strategy: Any) -> dict:
+    """
+    Prefetch the prices a DSL script reads, before it runs.
+
+    The compiled script lists its price() symbols up front, so the other
+    pairs' prices are fetched together instead of the script failing on a
+    missing price. Returns analyze_signal kwargs ({} for other strategies).
+    """
+    if bot.strategy_type != "dsl_trading":
+        return {}
+
+    symbols = sorted(
+        s for s in strategy.get_required_symbols() if isinstance(s, str) and s != product_id
+    )
+    results = await asyncio.gather(
+        *(monitor.exchange.get_current_price(s) for s in symbols), return_exceptions=True,
+    )
+    prices = {}
+    for symbol, result in zip(symbols, results):
+        if isinstance(result, Exception):
+            logger.warning(f"  Could not prefetch {symbol} price for DSL script: {result}")
+        elif result:
+            prices[symbol] = float(result)
+    return {"symbol": product_id, "prices": prices}
+
+
 async def _analyze_signal(
     monitor, bot: Bot, product_id: str, strategy: Any,
     candles: list, current_price: float, candles_by_timeframe: dict,
@@ -244,6 +270,7 @@ async def _analyze_signal(
 
     cache_key = (bot.id, product_id)
     previous_indicators_from_cache = monitor._previous_indicators_cache.get(cache_key)
+    script_kwargs = await _script_data_kwargs(monitor, bot, product_id, strategy)
 
     if skip_ai_analysis:
         if bot.strategy_type in ("conditional_dca", "indicator_based"):
@@ -261,7 +288,7 @@ async def _analyze_signal(
                 position=existing_position,
                 previous_indicators_cache=previous_indicators_from_cache,
                 db=None, user_id=bot.user_id, product_id=product_id,
-                use_cached_ai=True,
+                use_cached_ai=True, **script_kwargs,
             )
     else:
         if bot.strategy_type in ("conditional_dca", "indicator_based"):
@@ -277,7 +304,7 @@ async def _analyze_signal(
                 candles, current_price,
                 position=existing_position,
                 previous_indicators_cache=previous_indicators_from_cache,
-                db=None, user_id=bot.user_id, product_id=product_id
+                db=None, user_id=bot.user_id, product_id=product_id, **script_kwargs,
             )
 
 
@@ -20,11 +20,13 @@ from sqlalchemy import select
 from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.json_response import utc_isoformat
 from app.utils.db_corruption import is_db_corruption_error
 
 from app.constants import (
     CANDLE_CACHE_DEFAULT_TTL,
     CANDLE_CACHE_TTL,
+    CANDLE_STORE_CAPACITY,
     PAIR_PROCESSING_DELAY_SECONDS,
     compute_dynamic_concurrency,
 )
@@ -33,12 +35,17 @@ from app.services.rebalance_monitor import (
     quote_is_overweight as _quote_is_overweight,
 )
 from app.database import async_session_maker
+from app.coinbase_api.market_data_stream import market_data_stream
 from app.exchange_clients.base import ExchangeClient
 from app.exchange_clients.paper_trading_client import simulate_slippage_ctx
+from app.http_pool import http_pool
 from app.models import Bot
 from app.performance_metrics import record_server_timing
 from app.services.realmoney_audit import set_subsystem
 from app.monitor.batch_analyzer import process_bot_batch as _process_bot_batch
+from app.monitor.bot_scheduler import RETRY_DELAY_SECONDS, BotScheduler, RosterEntry
+from app.monitor.candle_store import CandleStore
+from app.services.candle_archive import candle_source, get_archived_candles
 from app.monitor.bull_flag_processor import process_bull_flag_bot as _process_bull_flag_bot
 from app.monitor.pair_processor import process_bot_pair as _process_bot_pair
 from app.monitor.pair_filters import (
@@ -120,14 +127,17 @@ class MultiBotMonitor:
         # Initialize order monitor (will get exchange per-bot)
         self.order_monitor = None  # Initialized lazily when needed
 
-        # Cache for candle data (to avoid fetching same data multiple times)
-        # Shared across all bots monitoring the same product_id:granularity
-        # TTL is per-timeframe (e.g., 15-min candles cached for 15 minutes)
-        self._candle_cache: Dict[str, tuple] = {}  # product_id:granularity -> (timestamp, candles)
-        # Per-key fetch locks: concurrent cache misses for the same key share
+        # Shared columnar candle store (to avoid fetching same data multiple times)
+        # One series per (product_id, granularity), shared across all bots and all
+        # lookback sizes. TTL is per-timeframe (e.g., 15-min candles cached for 15 minutes)
+        self._candle_store = CandleStore(CANDLE_STORE_CAPACITY)
+        # Synthetic-timeframe aggregates: (product_id, granularity, lookback) ->
+        # (base series version, candles); rebuilt only when the base series changes.
+        self._synthetic_candles: Dict[tuple, tuple] = {}
+        # Per-series fetch locks: concurrent cache misses for the same series share
         # one exchange call (request coalescing) instead of fanning out
         # identical API requests — pairs are processed concurrently.
-        self._candle_fetch_locks: Dict[str, asyncio.Lock] = {}
+        self._candle_fetch_locks: Dict[tuple, asyncio.Lock] = {}
 
         # Cache for exchange clients per account (with lock for concurrent safety)
         self._exchange_cache: Dict[int, ExchangeClient] = {}
@@ -144,23 +154,30 @@ class MultiBotMonitor:
         # Bots check only when their fastest indicator timeframe closes
         self._bot_next_check: Dict[int, int] = {}
 
+        # Deadline heap + in-memory roster (replaces the 10s polling sweep).
+        # Invalidated by bot/position events wired in main._wire_event_bus_subscribers.
+        self.bot_scheduler = BotScheduler()
+        # bot_id -> running task; a bot is never dispatched twice concurrently
+        self._bot_tasks: Dict[int, asyncio.Task] = {}
+
     def cleanup_caches(self) -> dict:
         """Evict expired/stale entries from all in-memory caches. Returns counts."""
         now = utcnow().timestamp()
 
-        # Candle cache — remove expired entries (and their fetch locks). Use the
-        # PER-GRANULARITY TTL (keys are "product:granularity:lookback") to match
-        # _cached_candles_if_fresh; the flat default would prematurely evict still-
-        # valid hourly/daily candles and force needless refetches.
+        # Candle store — drop series that have gone unrefreshed for more than one
+        # TTL (and their fetch locks). A series that is merely stale is still worth
+        # keeping for an incremental top-up, but one nobody has read for a whole
+        # interval belongs to a pair no bot is scanning right now. Use the
+        # PER-GRANULARITY TTL to match _cached_candles_if_fresh; the flat default
+        # would prematurely evict still-valid hourly/daily candles.
         stale_candles = []
-        for k, (ts, _) in self._candle_cache.items():
-            parts = k.split(":")
-            granularity = parts[1] if len(parts) >= 2 else ""
-            if now - ts > CANDLE_CACHE_TTL.get(granularity, CANDLE_CACHE_DEFAULT_TTL):
-                stale_candles.append(k)
-        for k in stale_candles:
-            del self._candle_cache[k]
-            self._candle_fetch_locks.pop(k, None)
+        for key in self._candle_store.keys():
+            series = self._candle_store.get(*key)
+            ttl = CANDLE_CACHE_TTL.get(key[1], CANDLE_CACHE_DEFAULT_TTL)
+            if now - series.fetched_at > 2 * ttl:
+                stale_candles.append(key)
+        for key in stale_candles:
+            self._drop_candle_series(key)
 
         # Previous indicators — remove entries for bots not in _bot_next_check
         active_bot_ids = set(self._bot_next_check.keys())
@@ -189,9 +206,12 @@ class MultiBotMonitor:
                         except RuntimeError:
                             logger.debug("stale exchange client close skipped (no running loop)")
 
+        candle_stats = self._candle_store.stats()
         return {
             "candles_evicted": len(stale_candles),
-            "candles_remaining": len(self._candle_cache),
+            "candles_remaining": len(self._candle_store),
+            "candle_hit_rate": candle_stats["hit_rate"],
+            "candle_bytes": candle_stats["total_bytes"],
             "indicators_evicted": len(stale_indicators),
             "indicators_remaining": len(self._previous_indicators_cache),
             "exchange_evicted": len(stale_exchange),
@@ -254,6 +274,14 @@ class MultiBotMonitor:
         """Returns current exchange client (per-bot task context) or fallback"""
         return _ctx_exchange.get() or self._current_exchange or self._fallback_exchange
 
+    def _drop_candle_series(self, key: tuple) -> None:
+        """Forget a product:granularity series along with its lock and derived aggregates."""
+        self._candle_store.discard(key)
+        self._candle_fetch_locks.pop(key, None)
+        product_id = key[0]
+        for memo_key in [k for k in self._synthetic_candles if k[0] == product_id]:
+            del self._synthetic_candles[memo_key]
+
     async def get_active_bots(self, db: AsyncSession) -> List[Bot]:
         """
         Fetch all bots that need processing:
@@ -324,127 +352,216 @@ class MultiBotMonitor:
         Note: THREE_MINUTE is not natively supported by Coinbase, so it's synthesized
         by aggregating ONE_MINUTE candles.
 
-        Caching: Uses per-timeframe TTL (e.g., 15-min candles cached for 15 minutes).
-        This dramatically reduces API calls since candles don't change until the next
-        candle closes.
+        Caching: candles live in one shared columnar series per product:granularity
+        (see monitor/candle_store.py), so every lookback size is a slice of the same
+        buffer. Per-timeframe TTL (e.g., 15-min candles cached for 15 minutes) decides
+        when to refresh; a refresh only fetches candles newer than the last stored one.
         """
-        # Candle data is public (same for all users/accounts). The cache key includes
-        # lookback_candles so a 200-candle indicator request is never served a cached
-        # 100-candle price fetch (each size is cached/coalesced independently — and a
-        # sparse pair that returns fewer than requested is still cached, not re-fetched
-        # every call).
-        cache_key = f"{product_id}:{granularity}:{lookback_candles}"
-
-        cached = self._cached_candles_if_fresh(cache_key, product_id, granularity)
+        if granularity in SYNTHETIC_TIMEFRAMES:
+            return await self._get_synthetic_candles(product_id, granularity, lookback_candles)
+
+        cached = self._cached_candles_if_fresh(product_id, granularity, lookback_candles)
         if cached is not None:
             return cached
 
-        # Coalesce concurrent misses for the same key into ONE fetch — pairs
+        # Coalesce concurrent misses for the same series into ONE fetch — pairs
         # are processed concurrently, and duplicate fetches burn exchange
         # rate budget for identical public data.
-        lock = self._candle_fetch_locks.setdefault(cache_key, asyncio.Lock())
+        lock = self._candle_fetch_locks.setdefault((product_id, granularity), asyncio.Lock())
         async with lock:
-            cached = self._cached_candles_if_fresh(cache_key, product_id, granularity)
+            cached = self._cached_candles_if_fresh(product_id, granularity, lookback_candles)
             if cached is not None:
                 return cached
-            return await self._fetch_candles(cache_key, product_id, granularity, lookback_candles)
+            return await self._fetch_candles(product_id, granularity, lookback_candles)
 
     def _cached_candles_if_fresh(
-        self, cache_key: str, product_id: str, granularity: str
+        self, product_id: str, granularity: str, lookback_candles: int
     ) -> Optional[List[Dict[str, Any]]]:
-        """Return cached candles if present and within their TTL, else None.
+        """Return the newest ``lookback_candles`` if the series is deep enough and
+        within its TTL, else None.
 
-        (Distinct lookback sizes are kept under distinct cache keys, so this no longer
-        needs a length check — a given key always holds the size it was fetched for.)"""
-        if cache_key not in self._candle_cache:
+        A sparse pair that returned fewer candles than requested still counts as
+        covering the requested depth, so it is served from cache, not re-fetched."""
+        series = self._candle_store.get(product_id, granularity)
+        if series is None or lookback_candles > series.depth:
             return None
         now = utcnow().timestamp()
-        cached_time, cached_candles = self._candle_cache[cache_key]
         # Get TTL for this specific timeframe (falls back to default for unknown timeframes)
         cache_ttl = CANDLE_CACHE_TTL.get(granularity, CANDLE_CACHE_DEFAULT_TTL)
-        age_seconds = now - cached_time
+        age_seconds = now - series.fetched_at
         if age_seconds >= cache_ttl:
             return None
+        self._candle_store.hits += 1
         # Cache hit - log occasionally for monitoring (every ~5 minutes)
         if int(now) % 300 < 10:  # Log for 10 seconds every 5 minutes
             logger.debug(
                 f"📦 Cache hit: {product_id} {granularity} (age: {int(age_seconds)}s, TTL: {cache_ttl}s)"
             )
-        return cached_candles
+        return series.cached_dicts(lookback_candles)
+
+    def apply_stream_candles(self, product_id: str, granularity: str, candles: List[Dict[str, Any]]) -> int:
+        """Merge candles pushed by the market stream into an already-fetched series.
+
+        Only extends a series contiguously: a cold series, or one whose newest
+        candle is more than one interval behind the pushed ones, is left to the
+        REST fetch (which gap-fills). A merged series counts as freshly fetched,
+        so a live stream keeps it from ever going stale; if the stream stops,
+        the TTL lapses and REST takes over again. Returns candles appended.
+        """
+        series = self._candle_store.get(product_id, granularity)
+        if series is None or series.last_start is None or not candles:
+            return 0
+        step = timeframe_to_seconds(granularity)
+        newer = [c for c in candles if int(float(c.get("start", 0))) >= series.last_start]
+        if not newer or int(float(newer[0]["start"])) > series.last_start + step:
+            return 0
+        appended = series.merge(newer)
+        series.depth = min(max(series.depth, len(series)), self._candle_store.capacity)
+        series.fetched_at = utcnow().timestamp()
+        return appended
 
     async def _fetch_candles(
-        self, cache_key: str, product_id: str, granularity: str, lookback_candles: int
+        self, product_id: str, granularity: str, lookback_candles: int
     ) -> List[Dict[str, Any]]:
-        """Fetch candles from the exchange (or aggregate a synthetic timeframe) and cache them."""
+        """Fill or top up the shared series for product:granularity from the exchange.
+
+        A cold series (or one shallower than the requested lookback) gets a full
+        window fetch. A stale series only fetches from its newest stored candle
+        onward: that candle is re-fetched (it may still have been forming) and any
+        candles closed since are appended.
+
+        Both read through the on-disk candle archive (services/candle_archive.py),
+        so closed candles already archived (e.g. before a restart) are not
+        re-fetched from the exchange.
+        """
         now = utcnow().timestamp()
+        series = self._candle_store.series(product_id, granularity)
         try:
             import time
 
-            # Check if this is a synthetic timeframe that needs aggregation
-            if granularity in SYNTHETIC_TIMEFRAMES:
-                base_timeframe, aggregation_factor = SYNTHETIC_TIMEFRAMES[granularity]
-
-                # Need N x base candles to create the requested number of synthetic candles
-                # Coinbase API limit is 300 candles max per request, so we cap accordingly
-                base_candles_needed = min(lookback_candles * aggregation_factor, 300)
-                base_candles = await self.get_candles_cached(
-                    product_id, base_timeframe, base_candles_needed
-                )
-                if base_candles:
-                    # Gap-fill the base candles first (for sparse BTC pairs)
-                    # This ensures continuous data like charting platforms show
-                    base_interval_seconds = timeframe_to_seconds(base_timeframe)
-                    original_count = len(base_candles)
-                    base_candles = fill_candle_gaps(base_candles, base_interval_seconds, base_candles_needed)
-                    filled_count = len(base_candles)
-
-                    candles = aggregate_candles(base_candles, aggregation_factor)
-                    if filled_count > original_count:
-                        logger.info(
-                            f"  📊 Gap-filled {product_id}: {original_count}→{filled_count} {base_timeframe}, "
-                            f"aggregated to {len(candles)} {granularity}"
-                        )
-                    else:
-                        logger.debug(
-                            f"Aggregated {len(base_candles)} {base_timeframe} into "
-                            f"{len(candles)} {granularity} for {product_id}"
-                        )
-                    # Cache the aggregated result
-                    self._candle_cache[cache_key] = (now, candles)
-                    return candles
-                logger.debug(f"No {base_timeframe} candles for {product_id}, {granularity} empty")
-                return []
-
             # Calculate time range based on granularity
             granularity_seconds = timeframe_to_seconds(granularity)
             end_time = int(time.time())
-            start_time = end_time - (lookback_candles * granularity_seconds)
-
-            candles = await self.exchange.get_candles(
-                product_id=product_id, start=start_time, end=end_time, granularity=granularity
+            last_start = series.last_start
+            incremental = (
+                last_start is not None
+                and lookback_candles <= series.depth
+                and (end_time - last_start) // granularity_seconds < self._candle_store.capacity
             )
 
-            # All exchange adapters now return candles oldest-first (chronological)
-
-            # Gap-fill sparse candles (BTC pairs often have low volume)
-            # This ensures indicators have continuous data like charting platforms
-            if candles and len(candles) > 0:
-                original_count = len(candles)
-                candles = fill_candle_gaps(candles, granularity_seconds, lookback_candles)
-                if len(candles) > original_count:
-                    logger.info(
-                        f"  📊 Gap-filled {product_id} {granularity}: {original_count}→{len(candles)} candles"
+            if incremental:
+                self._candle_store.refreshes += 1
+                candles = await get_archived_candles(
+                    self.exchange, product_id, last_start, end_time, granularity
+                )
+                if candles:
+                    # Prefix the stored tail so gaps between it and the new candles
+                    # are filled the same way as on a full fetch.
+                    candles = fill_candle_gaps(
+                        series.to_dicts(1) + candles, granularity_seconds, self._candle_store.capacity
                     )
+                    series.merge(candles)
+            else:
+                self._candle_store.misses += 1
+                start_time = end_time - (lookback_candles * granularity_seconds)
+                candles = await get_archived_candles(
+                    self.exchange, product_id, start_time, end_time, granularity
+                )
 
-            # Cache the result
-            self._candle_cache[cache_key] = (now, candles)
+                # All exchange adapters now return candles oldest-first (chronological)
 
-            return candles
+                # Gap-fill sparse candles (BTC pairs often have low volume)
+                # This ensures indicators have continuous data like charting platforms
+                if candles and len(candles) > 0:
+                    original_count = len(candles)
+                    candles = fill_candle_gaps(candles, granularity_seconds, lookback_candles)
+                    if len(candles) > original_count:
+                        logger.info(
+                            f"  📊 Gap-filled {product_id} {granularity}: {original_count}→{len(candles)} candles"
+                        )
+
+                series.clear()
+                series.merge(candles or [])
+                series.depth = lookback_candles
+
+            series.depth = min(max(series.depth, len(series)), self._candle_store.capacity)
+            series.fetched_at = now
+            return series.cached_dicts(lookback_candles)
 
         except Exception as e:
             logger.error(f"Error fetching candles for {product_id} ({granularity}): {e}")
             return []
 
+    async def _get_synthetic_candles(
+        self, product_id: str, granularity: str, lookback_candles: int
+    ) -> List[Dict[str, Any]]:
+        """Aggregate a synthetic timeframe from its base series.
+
+        The aggregate is memoized against the base series version, so it is only
+        rebuilt after the base series actually changes. Lookbacks deeper than the
+        live base series (e.g. 100 ONE_MONTH candles = 3000 days) are completed
+        with older closed candles from the on-disk candle archive."""
+        base_timeframe, aggregation_factor = SYNTHETIC_TIMEFRAMES[granularity]
+
+        # Need N x base candles to create the requested number of synthetic candles.
+        # The live series holds at most CANDLE_STORE_CAPACITY; the archive supplies the rest.
+        history_needed = lookback_candles * aggregation_factor
+        base_candles_needed = min(history_needed, CANDLE_STORE_CAPACITY)
+        base_candles = await self.get_candles_cached(product_id, base_timeframe, base_candles_needed)
+        if not base_candles:
+            logger.debug(f"No {base_timeframe} candles for {product_id}, {granularity} empty")
+            return []
+
+        base_series = self._candle_store.get(product_id, base_timeframe)
+        base_version = base_series.version if base_series is not None else None
+        memo_key = (product_id, granularity, lookback_candles)
+        memo = self._synthetic_candles.get(memo_key)
+        if memo is not None and base_version is not None and memo[0] == base_version:
+            return memo[1]
+
+        base_interval_seconds = timeframe_to_seconds(base_timeframe)
+        if history_needed > len(base_candles) and candle_source(self.exchange) is not None:
+            base_candles = await self._prepend_archived_history(
+                product_id, base_timeframe, base_candles, history_needed
+            )
+            base_candles_needed = history_needed
+
+        # Gap-fill the base candles first (for sparse BTC pairs)
+        # This ensures continuous data like charting platforms show
+        original_count = len(base_candles)
+        base_candles = fill_candle_gaps(base_candles, base_interval_seconds, base_candles_needed)
+        filled_count = len(base_candles)
+
+        candles = aggregate_candles(base_candles, aggregation_factor)
+        if filled_count > original_count:
+            logger.info(
+                f"  📊 Gap-filled {product_id}: {original_count}→{filled_count} {base_timeframe}, "
+                f"aggregated to {len(candles)} {granularity}"
+            )
+        else:
+            logger.debug(
+                f"Aggregated {len(base_candles)} {base_timeframe} into "
+                f"{len(candles)} {granularity} for {product_id}"
+            )
+        self._synthetic_candles[memo_key] = (base_version, candles)
+        return candles
+
+    async def _prepend_archived_history(
+        self, product_id: str, granularity: str, candles: List[Dict[str, Any]], history_needed: int
+    ) -> List[Dict[str, Any]]:
+        """Extend ``candles`` backwards to ``history_needed`` candles from the archive."""
+        seconds = timeframe_to_seconds(granularity)
+        first_start = int(candles[0]["start"])
+        older_start = first_start - (history_needed - len(candles)) * seconds
+        try:
+            older = await get_archived_candles(
+                self.exchange, product_id, older_start, first_start - 1, granularity, include_forming=False
+            )
+        except Exception as e:
+            logger.warning(f"Archived {granularity} history unavailable for {product_id}: {e}")
+            return candles
+        return [c for c in older if int(c["start"]) < first_start] + candles
+
     async def _resolve_scannable_pairs(
         self, db: AsyncSession, bot: Bot, trading_pairs: list, pairs_with_positions: set,
     ) -> Tuple[list, Optional[Dict[str, Any]]]:
@@ -846,200 +963,231 @@ class MultiBotMonitor:
                 except Exception as e:
                     logger.error(f"Error processing bot {bot_name}: {e}", exc_info=True)
 
-    async def monitor_loop(self):
-        """Main monitoring loop for all active bots"""
-        logger.info("monitor_loop() ENTERED - starting multi-bot monitor loop")
-        # Note: self.running is set to True in start() to prevent race conditions
+    async def _load_roster(self) -> None:
+        """Reload the bot roster from the database and reseed the scheduler.
+
+        Runs on startup, after a bot/position event invalidates the roster, and
+        every ROSTER_MAX_AGE_SECONDS as a safety net — not on every wake-up.
+        """
+        entries: List[RosterEntry] = []
+        active_pairs: set[tuple] = set()
+        all_active_pairs: set[str] = set()
 
-        while self.running:
-            loop_started_at = time.perf_counter()
-            logger.debug(f"Monitor loop iteration, self.running={self.running}")
-            # Recompute concurrency from current available RAM each cycle.
-            # Sigmoid scaling keeps us within DB pool budget while adapting to
-            # memory pressure or hardware upgrades without manual config changes.
-            new_bot, new_pair = compute_dynamic_concurrency()
-            if (new_bot, new_pair) != (self._bot_concurrency, self._pair_concurrency):
+        async with async_session_maker() as db:
+            logger.debug("Calling get_active_bots()...")
+            bots = await self.get_active_bots(db)
+            logger.debug(f"Got {len(bots)} bots from get_active_bots()")
+
+            if not bots:
+                logger.warning("No active bots to monitor")
+            else:
+                logger.debug(f"Monitoring {len(bots)} active bot(s)")
+
+            # On first load after restart, stagger bots to avoid
+            # SQLite lock contention from all bots writing at once.
+            if not self._bot_next_check and len(bots) > 5:
+                current_ts = int(utcnow().timestamp())
+                for i, bot in enumerate(bots):
+                    # Spread bots across the first 30 seconds (groups of 5 every 2s)
+                    delay = (i // 5) * 2
+                    self._bot_next_check[bot.id] = current_ts + delay
                 logger.info(
-                    f"Concurrency adjusted: bot {self._bot_concurrency}→{new_bot}, "
-                    f"pair {self._pair_concurrency}→{new_pair}"
+                    f"Staggered {len(bots)} bots across "
+                    f"{(len(bots) // 5) * 2}s to reduce startup DB contention"
                 )
-                self._bot_concurrency = new_bot
-                self._pair_concurrency = new_pair
-                self._bot_semaphore = asyncio.Semaphore(self._bot_concurrency)
-            try:
-                bots_to_process: List[tuple] = []  # (bot_id, bot_name, needs_ai_analysis, bot_check_interval)
-                active_bot_ids: set[int] = set()
-                active_pairs: set[tuple] = set()
-                all_active_pairs: set[str] = set()
-                has_active_bots = False
-
-                async with async_session_maker() as db:
-                    # Get all active bots
-                    logger.debug("Calling get_active_bots()...")
-                    bots = await self.get_active_bots(db)
-                    logger.debug(f"Got {len(bots)} bots from get_active_bots()")
-
-                    if not bots:
-                        logger.warning("No active bots to monitor")
-                    else:
-                        has_active_bots = True
-                        logger.debug(f"Monitoring {len(bots)} active bot(s)")
-
-                        # On first iteration after restart, stagger bots to avoid
-                        # SQLite lock contention from all bots writing at once.
-                        if not self._bot_next_check and len(bots) > 5:
-                            current_ts = int(utcnow().timestamp())
-                            for i, bot in enumerate(bots):
-                                # Spread bots across the first 30 seconds (groups of 5 every 2s)
-                                delay = (i // 5) * 2
-                                self._bot_next_check[bot.id] = current_ts + delay
-                            logger.info(
-                                f"Staggered {len(bots)} bots across "
-                                f"{(len(bots) // 5) * 2}s to reduce startup DB contention"
-                            )
-
-                        # Determine which bots are due for processing. Build a
-                        # scalar work list so the parent DB session can close
-                        # before the expensive per-bot/pair tasks run.
-                        for bot in bots:
-                            try:
-                                logger.debug(f"Checking bot: {bot.name} (ID: {bot.id})")
-
-                                # Phase 2 Optimization: Smart check scheduling
-                                bot_check_interval = calculate_bot_check_interval(bot.strategy_config or {})
-                                current_timestamp = int(utcnow().timestamp())
-
-                                # Check if this bot is due for a check
-                                if bot.id in self._bot_next_check:
-                                    next_check = self._bot_next_check[bot.id]
-                                    if current_timestamp < next_check:
-                                        seconds_until = next_check - current_timestamp
-                                        logger.debug(
-                                            f"Skipping {bot.name} - not due yet "
-                                            f"(next check in {seconds_until}s, interval: {bot_check_interval}s)"
-                                        )
-                                        continue
-
-                                # Determine if we need AI analysis
-                                ai_check_interval = bot.check_interval_seconds or self.interval_seconds
-                                needs_ai_analysis = True
-                                now = utcnow()
-
-                                if bot.last_ai_check:
-                                    time_since_last_ai_check = (now - bot.last_ai_check).total_seconds()
-                                    if time_since_last_ai_check < ai_check_interval:
-                                        needs_ai_analysis = False
-                                        logger.debug(
-                                            f"{bot.name}: Technical-only check "
-                                            f"(last AI: {time_since_last_ai_check:.0f}s ago, "
-                                            f"AI interval: {ai_check_interval}s, "
-                                            f"candle interval: {bot_check_interval}s)"
-                                        )
-                                    else:
-                                        logger.debug(
-                                            f"{bot.name}: Full check with AI analysis "
-                                            f"(AI: {ai_check_interval}s, candle: {bot_check_interval}s)"
-                                        )
-                                else:
-                                    logger.debug(
-                                        f"{bot.name}: First-time AI analysis "
-                                        f"(candle interval: {bot_check_interval}s)"
-                                    )
-
-                                bots_to_process.append((bot.id, bot.name, needs_ai_analysis, bot_check_interval))
-                            except Exception as e:
-                                logger.error(f"Error scheduling bot {bot.name}: {e}")
-                                continue
-
-                        # Snapshot active IDs/pairs while ORM relationships are
-                        # still attached; pruning happens after the session closes.
-                        active_bot_ids = {b.id for b in bots}
-                        for b in bots:
-                            for p in b.get_trading_pairs():
-                                active_pairs.add((b.id, p))
-                                all_active_pairs.add(p)
-
-                # Process bots concurrently only after the scheduler's parent
-                # session has closed. Each bot task opens its own short-lived
-                # session and each pair task still uses its own isolated session.
-                if bots_to_process:
+
+            # Snapshot scalars while ORM relationships are still attached so the
+            # session can close before any bot runs.
+            for bot in bots:
+                try:
+                    entries.append(RosterEntry(
+                        bot_id=bot.id,
+                        name=bot.name,
+                        # Phase 2 Optimization: check when the fastest indicator candle closes
+                        check_interval=calculate_bot_check_interval(bot.strategy_config or {}),
+                        ai_interval=bot.check_interval_seconds or self.interval_seconds,
+                        last_ai_check=bot.last_ai_check,
+                        pairs=list(bot.get_trading_pairs()),
+                    ))
+                except Exception as e:
+                    logger.error(f"Error scheduling bot {bot.name}: {e}")
+                    continue
+
+            active_bot_ids = {b.id for b in bots}
+            for b in bots:
+                for p in b.get_trading_pairs():
+                    active_pairs.add((b.id, p))
+                    all_active_pairs.add(p)
+
+        scheduler = self.bot_scheduler
+        scheduler.set_roster(entries)
+        now = int(utcnow().timestamp())
+        for entry in entries:
+            # Running bots are rescheduled when they finish; keep any deadline
+            # already queued (e.g. a retry) rather than snapping back.
+            if entry.bot_id in self._bot_tasks or scheduler.deadline(entry.bot_id) is not None:
+                continue
+            scheduler.schedule(entry.bot_id, self._bot_next_check.get(entry.bot_id, now))
+
+        if bots:
+            self._prune_inactive_caches(active_bot_ids, active_pairs, all_active_pairs)
+        await market_data_stream.set_products(all_active_pairs)
+
+    def _prune_inactive_caches(self, active_bot_ids: set, active_pairs: set, all_active_pairs: set) -> None:
+        """Drop cache entries for bots/pairs that left the roster."""
+        stale_indicator_keys = [
+            k for k in self._previous_indicators_cache
+            if k not in active_pairs
+        ]
+        for k in stale_indicator_keys:
+            del self._previous_indicators_cache[k]
+        if stale_indicator_keys:
+            logger.debug(
+                f"Pruned {len(stale_indicator_keys)} stale "
+                "entries from indicators cache"
+            )
+
+        # Prune _bot_next_check for deleted/deactivated bots
+        stale_schedule_keys = [
+            bid for bid in self._bot_next_check
+            if bid not in active_bot_ids
+        ]
+        for bid in stale_schedule_keys:
+            del self._bot_next_check[bid]
+
+        # Prune the candle store for pairs no longer tracked by any bot
+        stale_candle_keys = [
+            k for k in self._candle_store.keys()
+            if k[0] not in all_active_pairs
+        ]
+        for k in stale_candle_keys:
+            self._drop_candle_series(k)
+        if stale_candle_keys:
+            logger.debug(
+                f"Pruned {len(stale_candle_keys)} stale "
+                "entries from candle cache"
+            )
+
+    def _dispatch_due_bots(self) -> int:
+        """Start a task for every bot whose deadline has passed. Returns the count."""
+        scheduler = self.bot_scheduler
+        dispatched = 0
+        now = utcnow()
+        for bot_id in scheduler.pop_due():
+            entry = scheduler.roster.get(bot_id)
+            if entry is None or bot_id in self._bot_tasks:
+                continue
+
+            # Determine if we need AI analysis
+            needs_ai_analysis = True
+            if entry.last_ai_check:
+                time_since_last_ai_check = (now - entry.last_ai_check).total_seconds()
+                if time_since_last_ai_check < entry.ai_interval:
+                    needs_ai_analysis = False
                     logger.debug(
-                        f"Processing {len(bots_to_process)} bot(s) concurrently "
-                        f"(max {self._bot_concurrency} parallel)"
+                        f"{entry.name}: Technical-only check "
+                        f"(last AI: {time_since_last_ai_check:.0f}s ago, "
+                        f"AI interval: {entry.ai_interval}s, "
+                        f"candle interval: {entry.check_interval}s)"
                     )
-                    tasks = [
-                        asyncio.create_task(
-                            self._process_single_bot(
-                                bot_id, bot_name, needs_ai,
-                                bot_check_interval=bot_check_interval,
-                            ),
-                            name=f"bot-{bot_id}-{bot_name}"
-                        )
-                        for bot_id, bot_name, needs_ai, bot_check_interval in bots_to_process
-                    ]
-                    await asyncio.gather(*tasks, return_exceptions=True)
-                    logger.debug(f"Finished processing {len(bots_to_process)} bot(s)")
-
-                if has_active_bots:
-                    # Prune stale entries from unbounded caches
-
-                    # Prune _previous_indicators_cache
-                    stale_indicator_keys = [
-                        k for k in self._previous_indicators_cache
-                        if k not in active_pairs
-                    ]
-                    for k in stale_indicator_keys:
-                        del self._previous_indicators_cache[k]
-                    if stale_indicator_keys:
-                        logger.debug(
-                            f"Pruned {len(stale_indicator_keys)} stale "
-                            "entries from indicators cache"
-                        )
+                else:
+                    logger.debug(
+                        f"{entry.name}: Full check with AI analysis "
+                        f"(AI: {entry.ai_interval}s, candle: {entry.check_interval}s)"
+                    )
+            else:
+                logger.debug(f"{entry.name}: First-time AI analysis (candle interval: {entry.check_interval}s)")
+            if needs_ai_analysis:
+                entry.last_ai_check = now  # mirrors the DB write in _process_single_bot
+
+            self._bot_tasks[bot_id] = asyncio.create_task(
+                self._run_scheduled_bot(entry, needs_ai_analysis),
+                name=f"bot-{bot_id}-{entry.name}",
+            )
+            dispatched += 1
+        return dispatched
+
+    async def _run_scheduled_bot(self, entry: RosterEntry, needs_ai_analysis: bool) -> None:
+        """Run one bot, then queue its next deadline (set by _process_single_bot)."""
+        try:
+            await self._process_single_bot(
+                entry.bot_id, entry.name, needs_ai_analysis,
+                bot_check_interval=entry.check_interval,
+            )
+        finally:
+            self._bot_tasks.pop(entry.bot_id, None)
+            scheduler = self.bot_scheduler
+            if entry.bot_id in scheduler.roster:
+                now = scheduler.now()
+                next_check = self._bot_next_check.get(entry.bot_id)
+                if next_check is None or next_check <= now:
+                    # Run failed before computing its next check — retry shortly
+                    next_check = now + RETRY_DELAY_SECONDS
+                scheduler.schedule(entry.bot_id, next_check)
+
+    async def monitor_loop(self):
+        """Main monitoring loop for all active bots.
 
-                    # Prune _bot_next_check for deleted/deactivated bots
-                    stale_schedule_keys = [
-                        bid for bid in self._bot_next_check
-                        if bid not in active_bot_ids
-                    ]
-                    for bid in stale_schedule_keys:
-                        del self._bot_next_check[bid]
-
-                    # Prune _candle_cache for pairs no longer tracked by any bot
-                    # Cache keys are "product:granularity:lookback"; the
-                    # product id is the FIRST segment. (rsplit(":",1)[0] left
-                    # "product:granularity", which never matched the bare
-                    # product in all_active_pairs, so the cache was pruned
-                    # entirely every cycle → a fresh fetch per pair per tick.)
-                    stale_candle_keys = [
-                        k for k in self._candle_cache
-                        if k.split(":", 1)[0] not in all_active_pairs
-                    ]
-                    for k in stale_candle_keys:
-                        del self._candle_cache[k]
-                        self._candle_fetch_locks.pop(k, None)
-                    if stale_candle_keys:
+        Event-driven: sleeps until the earliest bot deadline (or a roster
+        invalidation) instead of polling, and starts each due bot as its own
+        task so one slow bot never delays another's candle-close check.
+        """
+        logger.info("monitor_loop() ENTERED - starting multi-bot monitor loop")
+        # Note: self.running is set to True in start() to prevent race conditions
+
+        try:
+            while self.running:
+                loop_started_at = time.perf_counter()
+                # Recompute concurrency from current available RAM between bursts.
+                # Sigmoid scaling keeps us within DB pool budget while adapting to
+                # memory pressure or hardware upgrades without manual config changes.
+                # Skipped while bots are running: they still hold the old semaphore.
+                new_bot, new_pair = compute_dynamic_concurrency()
+                if not self._bot_tasks and (new_bot, new_pair) != (self._bot_concurrency, self._pair_concurrency):
+                    logger.info(
+                        f"Concurrency adjusted: bot {self._bot_concurrency}→{new_bot}, "
+                        f"pair {self._pair_concurrency}→{new_pair}"
+                    )
+                    self._bot_concurrency = new_bot
+                    self._pair_concurrency = new_pair
+                    self._bot_semaphore = asyncio.Semaphore(self._bot_concurrency)
+                try:
+                    if self.bot_scheduler.roster_stale:
+                        await self._load_roster()
+
+                    # Per-bot tasks open their own short-lived sessions; the
+                    # roster session above is already closed.
+                    dispatched = self._dispatch_due_bots()
+                    if dispatched:
                         logger.debug(
-                            f"Pruned {len(stale_candle_keys)} stale "
-                            "entries from candle cache"
+                            f"Started {dispatched} due bot(s) "
+                            f"(max {self._bot_concurrency} parallel)"
                         )
 
-                record_server_timing("TRADER", "monitor_loop", (time.perf_counter() - loop_started_at) * 1000)
+                    record_server_timing("TRADER", "monitor_loop", (time.perf_counter() - loop_started_at) * 1000)
 
-                # Wait for next interval - check frequently so bots with short intervals are responsive
-                logger.debug("Sleeping 10 seconds before next iteration...")
-                await asyncio.sleep(10)  # Check every 10 seconds for bots that need processing
+                    if self.running:
+                        await self.bot_scheduler.wait()
 
-            except asyncio.CancelledError:
-                logger.info("Monitor loop cancelled — exiting cleanly")
-                raise  # propagate so the task is marked cancelled
-            except Exception as e:
-                if is_db_corruption_error(e):
-                    logger.warning(f"Database corruption in monitor loop; retrying next cycle: {e}")
-                else:
-                    logger.error(f"Error in monitor loop: {e}", exc_info=True)
-                record_server_timing("TRADER", "monitor_loop", (time.perf_counter() - loop_started_at) * 1000)
-                # Wait a bit before retrying
-                await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    if is_db_corruption_error(e):
+                        logger.warning(f"Database corruption in monitor loop; retrying next cycle: {e}")
+                    else:
+                        logger.error(f"Error in monitor loop: {e}", exc_info=True)
+                    record_server_timing("TRADER", "monitor_loop", (time.perf_counter() - loop_started_at) * 1000)
+                    # Wait a bit before retrying
+                    await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            logger.info("Monitor loop cancelled — exiting cleanly")
+            for task in self._bot_tasks.values():
+                task.cancel()
+            raise  # propagate so the task is marked cancelled
+
+        # Graceful exit (running flipped off): let in-flight bots finish
+        if self._bot_tasks:
+            await asyncio.gather(*self._bot_tasks.values(), return_exceptions=True)
 
         logger.info("Multi-bot monitor loop EXITED")
         logger.info("Multi-bot monitor stopped")
@@ -1049,6 +1197,7 @@ class MultiBotMonitor:
         if not self.running:
             self.running = True  # Set IMMEDIATELY to prevent race condition (double-start)
             self.task = asyncio.create_task(self.monitor_loop())
+            market_data_stream.add_candle_listener(self.apply_stream_candles)
             # Start order monitor alongside bot monitor (if available)
             if self.order_monitor:
                 asyncio.create_task(self.order_monitor.start())
@@ -1063,6 +1212,7 @@ class MultiBotMonitor:
             logger.debug("Setting self.running=True and creating tasks")
             self.running = True  # Set IMMEDIATELY to prevent race condition (double-start)
             self.task = asyncio.create_task(self.monitor_loop())
+            market_data_stream.add_candle_listener(self.apply_stream_candles)
             # Start order monitor alongside bot monitor (if available)
             if self.order_monitor:
                 asyncio.create_task(self.order_monitor.start())
@@ -1081,6 +1231,7 @@ class MultiBotMonitor:
         due to reconciliation and exchange API calls).
         """
         self.running = False
+        market_data_stream.remove_candle_listener(self.apply_stream_candles)
         # Stop order monitor (if available)
         if self.order_monitor:
             await self.order_monitor.stop()
@@ -1101,6 +1252,10 @@ class MultiBotMonitor:
                     "running": self.running,
                     "interval_seconds": self.interval_seconds,
                     "active_bots": len(bots),
+                    "candle_store": self._candle_store.stats(),
+                    "http_pool": http_pool.stats(),
+                    "market_stream": market_data_stream.state.get_snapshot(),
+                    "scheduler": self.bot_scheduler.stats(),
                     "bots": [
                         {
                             "id": bot.id,
@@ -1108,7 +1263,7 @@ class MultiBotMonitor:
                             "product_ids": (pairs := bot.get_trading_pairs()),  # Multi-pair support
                             "product_id": pairs[0] if pairs else None,  # Legacy compatibility
                             "strategy": bot.strategy_type,
-                            "last_check": bot.last_signal_check.isoformat() if bot.last_signal_check else None,
+                            "last_check": utc_isoformat(bot.last_signal_check) if bot.last_signal_check else None,
                         }
                         for bot in bots
                     ],
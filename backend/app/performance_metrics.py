@@ -3,13 +3,20 @@
 import math
 import threading
 from collections import defaultdict, deque
+from contextvars import ContextVar
+from typing import Optional
 
 
 _MAX_SAMPLES = 500
 _server_samples: dict[str, deque[float]] = defaultdict(lambda: deque(maxlen=_MAX_SAMPLES))
 _client_samples: dict[str, deque[float]] = defaultdict(lambda: deque(maxlen=_MAX_SAMPLES))
+_query_samples: dict[str, deque[float]] = defaultdict(lambda: deque(maxlen=_MAX_SAMPLES))
 _lock = threading.Lock()
 
+# Per-request SQL statement counter. The request middleware installs a fresh
+# one-element list; tasks spawned by the handler inherit the same list.
+_db_query_counter: ContextVar[Optional[list]] = ContextVar("db_query_counter", default=None)
+
 
 def _percentile(values: list[float], percentile: float) -> float:
     if not values:
@@ -26,6 +33,33 @@ def record_server_timing(method: str, route: str, duration_ms: float) -> None:
         _server_samples[key].append(float(duration_ms))
 
 
+def start_db_query_count() -> list:
+    """Begin counting SQL statements for the current request context."""
+    counter = [0]
+    _db_query_counter.set(counter)
+    return counter
+
+
+def _count_db_query(*_args) -> None:
+    counter = _db_query_counter.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def track_db_queries(sync_engine) -> None:
+    """Count every statement executed on ``sync_engine`` against the current request."""
+    from sqlalchemy import event
+    if not event.contains(sync_engine, "before_cursor_execute", _count_db_query):
+        event.listen(sync_engine, "before_cursor_execute", _count_db_query)
+
+
+def record_server_queries(method: str, route: str, count: int) -> None:
+    """Record how many SQL statements one request issued."""
+    key = f"{method.upper()} {route}"
+    with _lock:
+        _query_samples[key].append(float(count))
+
+
 def record_client_timings(route: str, timings: dict[str, float]) -> None:
     """Record browser startup measures keyed only by route and metric name."""
     safe_route = route if route.startswith("/") and len(route) <= 80 else "/unknown"
@@ -50,12 +84,26 @@ def _summarize(samples: dict[str, deque[float]]) -> dict[str, dict]:
     }
 
 
+def _summarize_queries(samples: dict[str, deque[float]]) -> dict[str, dict]:
+    return {
+        key: {
+            "count": len(values),
+            "mean": round(sum(values) / len(values), 2),
+            "p95": _percentile(list(values), 0.95),
+            "max": int(max(values)),
+        }
+        for key, values in sorted(samples.items())
+        if values
+    }
+
+
 def get_performance_snapshot() -> dict:
     """Return aggregate percentiles; raw samples and identities never leave memory."""
     with _lock:
         return {
             "server": _summarize(_server_samples),
             "client": _summarize(_client_samples),
+            "db_queries": _summarize_queries(_query_samples),
         }
 
 
@@ -64,3 +112,4 @@ def clear_performance_samples() -> None:
     with _lock:
         _server_samples.clear()
         _client_samples.clear()
+        _query_samples.clear()
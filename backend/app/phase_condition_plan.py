@@ -0,0 +1,345 @@
+"""
+Compiled phase-condition plans
+
+PhaseConditionEvaluator interprets the condition JSON on every call: it
+re-detects the grouped vs. legacy format, builds indicator keys with string
+formatting and allocates a detail dict per condition. Bot configs change far
+less often than bots are checked, so compile_condition_plan() turns an
+expression into a ConditionPlan once:
+
+- every indicator key the expression reads (``FIVE_MINUTE_rsi_14``,
+  ``prev_FIVE_MINUTE_price``, ...) is resolved to a slot in a flat list;
+- each condition becomes a closure over its slot indices, threshold and
+  operator, and groups short-circuit (``and`` stops at the first False,
+  ``or`` at the first True).
+
+Evaluation gathers the slots from the indicator dict in one pass and runs the
+closures on the list. Plans don't capture condition details — callers that
+log them use PhaseConditionEvaluator.evaluate_expression(capture_details=True),
+which keeps the interpreted path. Results match that path exactly.
+
+Plans are cached by a hash of the expression (plus legacy logic and position
+direction), so the per-cycle strategy instances of a bot share one plan until
+its config changes.
+"""
+
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PLAN_CACHE_SIZE = 1024
+
+# Minimum crossing magnitude to filter floating-point noise (as in PhaseConditionEvaluator)
+CROSSING_EPSILON = 1e-7
+
+_AGGREGATE_TYPES = ("ai_buy", "ai_sell", "bull_flag", "vwap_bounce_up", "vwap_bounce_down", "qfl_crack")
+_CROSSING_OPERATORS = ("crossing_above", "crossing_below")
+_DIRECTION_OPERATORS = ("increasing", "decreasing")
+
+Values = List[Optional[float]]
+Getter = Callable[[Values], Optional[float]]
+Test = Callable[[Values, Optional[Values]], bool]
+
+
+def _false(cur: Values, prev: Optional[Values]) -> bool:
+    return False
+
+
+def _none(vals: Values) -> None:
+    return None
+
+
+class _SlotTable:
+    """Assigns each distinct indicator key one index in the flat value list."""
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+
+    def __call__(self, key: str) -> int:
+        if key not in self.index:
+            self.index[key] = len(self.index)
+        return self.index[key]
+
+    def keys(self) -> Tuple[str, ...]:
+        return tuple(self.index)
+
+
+def _slot_getter(i: int) -> Getter:
+    return lambda vals: vals[i]
+
+
+def _difference_getter(i_price: int, i_other: int) -> Getter:
+    def get(vals):
+        price, other = vals[i_price], vals[i_other]
+        if price is None or other is None:
+            return None
+        return price - other
+    return get
+
+
+def _bb_percent_getter(i_price: int, i_upper: int, i_lower: int) -> Getter:
+    def get(vals):
+        price, upper, lower = vals[i_price], vals[i_upper], vals[i_lower]
+        if price is None or upper is None or lower is None:
+            return None
+        if upper == lower:
+            return 50.0
+        return ((price - lower) / (upper - lower)) * 100
+    return get
+
+
+def _value_getter(condition_type: Any, condition: Dict[str, Any], slot: _SlotTable, prefix: str) -> Getter:
+    """Compiled form of PhaseConditionEvaluator._get_indicator_value ("" prefix)
+    and _get_previous_indicator_value ("prev_" prefix)."""
+    tf = f"{prefix}{condition.get('timeframe', 'FIVE_MINUTE')}"
+
+    if condition_type == "rsi":
+        return _slot_getter(slot(f"{tf}_rsi_{condition.get('period', 14)}"))
+    if condition_type == "macd":
+        fast = condition.get("fast_period", 12)
+        slow = condition.get("slow_period", 26)
+        signal = condition.get("signal_period", 9)
+        return _slot_getter(slot(f"{tf}_macd_histogram_{fast}_{slow}_{signal}"))
+    if condition_type == "bb_percent":
+        period = condition.get("period", 20)
+        std_dev = condition.get("std_dev", 2)
+        return _bb_percent_getter(
+            slot(f"{tf}_price"), slot(f"{tf}_bb_upper_{period}_{std_dev}"), slot(f"{tf}_bb_lower_{period}_{std_dev}"),
+        )
+    if condition_type == "ema_cross":
+        return _difference_getter(slot(f"{tf}_price"), slot(f"{tf}_ema_{condition.get('period', 50)}"))
+    if condition_type == "sma_cross":
+        return _difference_getter(slot(f"{tf}_price"), slot(f"{tf}_sma_{condition.get('period', 50)}"))
+    if condition_type == "stochastic":
+        return _slot_getter(slot(f"{tf}_stoch_k_{condition.get('period', 14)}_3"))
+    if condition_type == "volume":
+        return _slot_getter(slot(f"{tf}_volume"))
+    if condition_type == "volume_rsi":
+        return _slot_getter(slot(f"{tf}_volume_rsi_{condition.get('period', 14)}"))
+    if condition_type == "gap_fill_pct":
+        return _slot_getter(slot(f"{tf}_gap_fill_pct"))
+    if condition_type == "vwap":
+        return _difference_getter(slot(f"{tf}_price"), slot(f"{tf}_vwap"))
+    if condition_type in _AGGREGATE_TYPES:
+        # Aggregate indicators don't use a timeframe prefix
+        return _slot_getter(slot(f"{prefix}{condition_type}"))
+    # price_change (not implemented) and unknown types never have a value
+    return _none
+
+
+def _crossed(prev: float, curr: float, threshold: float, above: bool) -> bool:
+    if abs(prev - threshold) <= CROSSING_EPSILON and abs(curr - threshold) <= CROSSING_EPSILON:
+        return False
+    if above:
+        return prev <= threshold and curr > threshold
+    return prev >= threshold and curr < threshold
+
+
+def _crossing_test(current: Getter, candle_prev: Getter, threshold: Any, above: bool) -> Test:
+    """Fires if either the previous candle or the previous check cycle was on the other side."""
+    def test(cur, prev):
+        value = current(cur)
+        if value is None:
+            return False
+        candle_value = candle_prev(cur)
+        cycle_value = current(prev) if prev is not None else None
+        if candle_value is not None and _crossed(candle_value, value, threshold, above):
+            return True
+        return cycle_value is not None and _crossed(cycle_value, value, threshold, above)
+    return test
+
+
+def _direction_test(current: Getter, candle_prev: Getter, min_pct: Any, increasing: bool) -> Test:
+    """Compares against the previous check cycle, falling back to the previous candle."""
+    def test(cur, prev):
+        value = current(cur)
+        if value is None:
+            return False
+        previous = current(prev) if prev is not None else None
+        if previous is None:
+            previous = candle_prev(cur)
+            if previous is None:
+                return False
+        if previous == 0:
+            return value > 0 if increasing else value < 0
+        if min_pct > 0:
+            pct_change = ((value - previous) / abs(previous)) * 100
+            return pct_change >= min_pct if increasing else pct_change <= -min_pct
+        return value > previous if increasing else value < previous
+    return test
+
+
+def _comparison_test(current: Getter, operator: Any, threshold: Any) -> Test:
+    if operator == "greater_than":
+        def test(cur, prev):
+            value = current(cur)
+            return value is not None and value > threshold
+    elif operator == "less_than":
+        def test(cur, prev):
+            value = current(cur)
+            return value is not None and value < threshold
+    elif operator == "greater_equal":
+        def test(cur, prev):
+            value = current(cur)
+            return value is not None and value >= threshold
+    elif operator == "less_equal":
+        def test(cur, prev):
+            value = current(cur)
+            return value is not None and value <= threshold
+    elif operator == "equal":
+        def test(cur, prev):
+            value = current(cur)
+            return value is not None and value == threshold
+    elif operator == "not_equal":
+        def test(cur, prev):
+            value = current(cur)
+            return value is not None and value != threshold
+    else:
+        return _false
+    return test
+
+
+def _negated(test: Test) -> Test:
+    return lambda cur, prev: not test(cur, prev)
+
+
+def _compile_condition(
+    condition: Dict[str, Any], slot: _SlotTable, position_direction: Optional[str],
+) -> Tuple[Test, bool]:
+    """Returns (test, reads_previous_cycle)."""
+    negate = bool(condition.get("negate", False))
+    condition_direction = condition.get("direction")
+    if condition_direction and position_direction and condition_direction != position_direction:
+        # Doesn't apply to this position's direction: False, then NOT as usual
+        return (_negated(_false) if negate else _false), False
+
+    condition_type = condition.get("type")
+    operator = condition.get("operator")
+    threshold = condition.get("value", 0)
+    current = _value_getter(condition_type, condition, slot, "")
+
+    if operator in _CROSSING_OPERATORS:
+        candle_prev = _value_getter(condition_type, condition, slot, "prev_")
+        test = _crossing_test(current, candle_prev, threshold, operator == "crossing_above")
+        reads_previous = True
+    elif operator in _DIRECTION_OPERATORS:
+        candle_prev = _value_getter(condition_type, condition, slot, "prev_")
+        test = _direction_test(current, candle_prev, threshold or 0, operator == "increasing")
+        reads_previous = True
+    else:
+        test = _comparison_test(current, operator, threshold)
+        reads_previous = False
+
+    return (_negated(test) if negate else test), reads_previous
+
+
+def _combine(tests: List[Test], logic: Any) -> Test:
+    """AND/OR over tests, short-circuiting; an empty list is False."""
+    if not tests:
+        return _false
+    if logic == "and":
+        def run_all(cur, prev):
+            for test in tests:
+                if not test(cur, prev):
+                    return False
+            return True
+        return run_all
+
+    def run_any(cur, prev):
+        for test in tests:
+            if test(cur, prev):
+                return True
+        return False
+    return run_any
+
+
+def _compile_conditions(
+    conditions: List[Dict[str, Any]], logic: Any, slot: _SlotTable, position_direction: Optional[str],
+) -> Tuple[Test, bool]:
+    compiled = [_compile_condition(c, slot, position_direction) for c in conditions]
+    return _combine([test for test, _ in compiled], logic), any(reads for _, reads in compiled)
+
+
+class ConditionPlan:
+    """A compiled expression: indicator slot keys plus one root closure."""
+
+    __slots__ = ("keys", "needs_previous", "_root")
+
+    def __init__(self, keys: Tuple[str, ...], root: Test, needs_previous: bool):
+        self.keys = keys
+        self.needs_previous = needs_previous
+        self._root = root
+
+    def bind(self, indicators: Dict[str, Any]) -> Values:
+        """The plan's indicator values as a flat list, in slot order."""
+        get = indicators.get
+        return [get(key) for key in self.keys]
+
+    def run(self, current: Values, previous: Optional[Values] = None) -> bool:
+        """Evaluate against already-bound value lists."""
+        return self._root(current, previous)
+
+    def evaluate(
+        self, current_indicators: Dict[str, Any], previous_indicators: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        previous = None
+        if self.needs_previous and previous_indicators is not None:
+            previous = self.bind(previous_indicators)
+        return self._root(self.bind(current_indicators), previous)
+
+
+def _build_plan(expression: Any, legacy_logic: str, position_direction: Optional[str]) -> ConditionPlan:
+    slot = _SlotTable()
+    needs_previous = False
+
+    if not expression:
+        root = _false
+    elif isinstance(expression, dict) and "groups" in expression:
+        group_tests = []
+        for group in expression.get("groups", []):
+            test, reads = _compile_conditions(
+                group.get("conditions", []), group.get("logic", "and"), slot, position_direction,
+            )
+            group_tests.append(test)
+            needs_previous = needs_previous or reads
+        root = _combine(group_tests, expression.get("groupLogic", "and"))
+    elif isinstance(expression, list):
+        root, needs_previous = _compile_conditions(expression, legacy_logic, slot, position_direction)
+    else:
+        logger.warning(f"Unknown expression format: {type(expression)}")
+        root = _false
+
+    return ConditionPlan(slot.keys(), root, needs_previous)
+
+
+def expression_digest(expression: Any) -> str:
+    """Stable hash of a condition expression (the config "version" a plan belongs to)."""
+    encoded = json.dumps(expression, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(encoded.encode()).hexdigest()
+
+
+_plan_cache: "OrderedDict[Tuple[str, str, Optional[str]], ConditionPlan]" = OrderedDict()
+
+
+def compile_condition_plan(
+    expression: Any, legacy_logic: str = "and", position_direction: Optional[str] = None,
+) -> ConditionPlan:
+    """Compile ``expression`` (grouped dict or legacy list), reusing a cached plan for the same config."""
+    key = (expression_digest(expression), legacy_logic, position_direction)
+    plan = _plan_cache.get(key)
+    if plan is not None:
+        _plan_cache.move_to_end(key)
+        return plan
+    plan = _build_plan(expression, legacy_logic, position_direction)
+    _plan_cache[key] = plan
+    if len(_plan_cache) > PLAN_CACHE_SIZE:
+        _plan_cache.popitem(last=False)
+    return plan
+
+
+def clear_plan_cache() -> None:
+    _plan_cache.clear()
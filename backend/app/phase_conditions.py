@@ -7,12 +7,17 @@ Supports advanced condition grouping with AND/OR/NOT logic:
 - Individual conditions can be negated (NOT)
 
 Example: (RSI < 30 AND MACD > 0) OR (BB% < 20) AND NOT (price_change > 5)
+
+Signal-only evaluation runs a compiled plan (app.phase_condition_plan);
+capture_details=True keeps the interpreted path below, which also builds the
+per-condition detail dicts for the indicator log.
 """
 
 import logging
 from typing import Any, Dict, List, Optional, Union
 
 from app.indicator_calculator import IndicatorCalculator
+from app.phase_condition_plan import ConditionPlan, compile_condition_plan
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +39,14 @@ class PhaseConditionEvaluator:
         self.indicator_calculator = indicator_calculator
         self.position_direction = position_direction  # "long", "short", or None
 
+    def compile(
+        self,
+        expression: Union[Dict[str, Any], List[Dict[str, Any]]],
+        legacy_logic: str = "and",
+    ) -> ConditionPlan:
+        """Compiled plan for an expression (cached by a hash of the expression)."""
+        return compile_condition_plan(expression, legacy_logic, self.position_direction)
+
     def evaluate_expression(
         self,
         expression: Union[Dict[str, Any], List[Dict[str, Any]]],
@@ -58,6 +71,9 @@ class PhaseConditionEvaluator:
             If capture_details=False: True if expression is satisfied, False otherwise
             If capture_details=True: (bool, List[Dict]) tuple with result and condition details
         """
+        if not capture_details:
+            return self.compile(expression, legacy_logic).evaluate(current_indicators, previous_indicators)
+
         # Handle empty/None
         if not expression:
             return (False, []) if capture_details else False
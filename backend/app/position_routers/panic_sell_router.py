@@ -20,6 +20,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.auth.dependencies import Perm, get_current_user, require_permission
 from app.auth.mfa_verification import verify_mfa
 from app.database import get_db
+from app.json_response import utc_isoformat
 from app.models.auth import User
 from app.models.trading import Account, Bot, BotRebalancerGroup, Position
 from app.services.account_access import manager_account_ids
@@ -71,7 +72,7 @@ def _init_task(task_id: str, user_id: int = None) -> None:
         "conversion_status_url": None,
         "errors": [],
         "progress_pct": 0,
-        "started_at": utcnow().isoformat(),
+        "started_at": utc_isoformat(utcnow()),
         "completed_at": None,
     }
 
@@ -86,7 +87,7 @@ def _update_task(task_id: str, **kwargs) -> None:
     if total > 0:
         task["progress_pct"] = int((current / total) * 100)
     if kwargs.get("status") in ("completed", "failed"):
-        task["completed_at"] = utcnow().isoformat()
+        task["completed_at"] = utc_isoformat(utcnow())
 
 
 @router.post("/panic-sell-send-mfa")
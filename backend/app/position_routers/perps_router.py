@@ -20,6 +20,7 @@ from sqlalchemy.orm import selectinload
 
 from app.coinbase_unified_client import CoinbaseClient
 from app.database import get_db
+from app.json_response import utc_isoformat
 from app.models import Account, Position, User
 from app.position_routers.dependencies import get_coinbase
 from app.auth.dependencies import get_current_user, require_permission, Perm
@@ -181,7 +182,7 @@ async def list_perps_positions(
                 "tp_price": p.tp_price,
                 "sl_price": p.sl_price,
                 "funding_fees_total": p.funding_fees_total,
-                "opened_at": p.opened_at.isoformat() if p.opened_at else None,
+                "opened_at": utc_isoformat(p.opened_at) if p.opened_at else None,
                 "trade_count": len(p.trades) if p.trades else 0,
             }
             for p in positions
@@ -12,18 +12,20 @@ import time
 from typing import Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response
-from sqlalchemy import case, desc, func, or_, select
+from sqlalchemy import case, desc, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.models import AIBotLog, AIOpinionLog, BlacklistedCoin, Bot, PendingOrder, Position, Trade, User
+from app.json_response import utc_isoformat
+from app.models import (
+    AIBotLog, AIOpinionLog, BlacklistedCoin, Bot, PendingOrder, PnlDailyRollup, Position, Trade, User,
+)
 from app.auth.dependencies import get_current_user
 from app.services.account_access import accessible_account_ids
 from app.services.portfolio_service import get_account_balances
 from app.schemas import AIBotLogResponse, AIOpinionLogResponse, PositionResponse, TradeResponse
 from app.schemas.position import LimitOrderDetails
 from app.constants import VALID_CATEGORIES
-from app.services.pnl_service import resolve_btc_usd_price
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -313,47 +315,38 @@ async def get_pnl_timeseries(
     """
     Get P&L time series data for cumulative profit chart.
 
-    Returns cumulative profit over time from closed positions.
+    Returns cumulative profit over time from closed positions, read from the
+    per-(account, bot, product, day) rollups: ``summary`` has one point per
+    bot/pair/day with ``trade_count`` closed positions behind it.
     If account_id is provided, only returns data for that account.
     """
-    # Get closed positions ordered by close date.
-    # NB: .isnot(None) — not Python `is not None`, which evaluates at
-    # construction time to the Column object's Python identity (always
-    # True) and never reaches the SQL layer. Fixed in v2.166.6 per the
-    # multiuser-security audit's Low finding.
-    query = select(Position).where(
-        Position.status == "closed",
-        Position.closed_at.isnot(None),
-        Position.profit_usd.isnot(None),
-    )
-
     user_account_ids = await accessible_account_ids(db, current_user.id)
-    if user_account_ids:
-        query = query.where(Position.account_id.in_(user_account_ids))
-    else:
+    if not user_account_ids:
         return {"summary": [], "by_day": [], "by_pair": [], "active_trades": 0, "most_profitable_bot": None}
 
+    # closed_count only counts closes with a recorded profit_usd; skip buckets
+    # made up entirely of closes without one (they still feed realized-pnl).
+    query = select(PnlDailyRollup).where(
+        PnlDailyRollup.account_id.in_(user_account_ids),
+        PnlDailyRollup.closed_count > 0,
+    )
     # Filter by account_id if provided (must be owned by user)
     if account_id is not None:
-        query = query.where(Position.account_id == account_id)
+        query = query.where(PnlDailyRollup.account_id == account_id)
+    query = query.order_by(PnlDailyRollup.day, PnlDailyRollup.bot_id, PnlDailyRollup.product_id)
 
-    query = query.order_by(Position.closed_at)
+    rollups = (await db.execute(query)).scalars().all()
 
-    result = await db.execute(query)
-    positions = result.scalars().all()
-
-    if not positions:
+    if not rollups:
         # No data yet
         return {"summary": [], "by_day": [], "by_pair": []}
 
-    # Pre-fetch bot names for all positions to avoid N+1 queries
-    bot_ids = list(set(pos.bot_id for pos in positions if pos.bot_id))
+    # Pre-fetch bot names to avoid N+1 queries
+    bot_ids = list(set(r.bot_id for r in rollups if r.bot_id))
     bot_name_map: Dict[int, str] = {}
     if bot_ids:
-        bots_query = select(Bot).where(Bot.id.in_(bot_ids))
-        bots_result = await db.execute(bots_query)
-        for bot in bots_result.scalars().all():
-            bot_name_map[bot.id] = bot.name
+        bots_result = await db.execute(select(Bot.id, Bot.name).where(Bot.id.in_(bot_ids)))
+        bot_name_map = {bot_id: name for bot_id, name in bots_result.all()}
 
     # Build cumulative P&L over time
     cumulative_pnl_usd = 0.0
@@ -363,55 +356,44 @@ async def get_pnl_timeseries(
     daily_pnl_btc: Dict[str, float] = defaultdict(float)
     pair_pnl_usd: Dict[str, float] = defaultdict(float)
     pair_pnl_btc: Dict[str, float] = defaultdict(float)
+    bot_pnl_map: Dict[int, dict] = {}
 
-    for pos in positions:
-        profit_usd = pos.profit_usd or 0.0
-
-        # Calculate profit_btc based on pair type
-        if pos.product_id and "-BTC" in pos.product_id:
-            # BTC pair: profit_quote IS the BTC profit
-            profit_btc = pos.profit_quote or 0.0
-        else:
-            # USD/USDC/USDT pair: convert USD profit to BTC
-            btc_price = resolve_btc_usd_price(pos)
-            if btc_price > 0:
-                profit_btc = profit_usd / btc_price
-            else:
-                profit_btc = 0.0
-
-        cumulative_pnl_usd += profit_usd
-        cumulative_pnl_btc += profit_btc
+    for r in rollups:
+        cumulative_pnl_usd += r.profit_usd
+        cumulative_pnl_btc += r.profit_btc
+        day_key = r.day.isoformat()
 
-        # Add to summary timeline
         summary_data.append(
             {
-                "timestamp": pos.closed_at.isoformat(),
-                "date": pos.closed_at.strftime("%Y-%m-%d"),
+                "timestamp": utc_isoformat(datetime.combine(r.day, datetime.min.time())),
+                "date": day_key,
                 "cumulative_pnl_usd": round(cumulative_pnl_usd, 2),
                 "cumulative_pnl_btc": round(cumulative_pnl_btc, 8),
-                "profit_usd": round(profit_usd, 2),
-                "profit_btc": round(profit_btc, 8),
-                "product_id": pos.product_id,  # Include pair for frontend filtering
-                "bot_id": pos.bot_id,  # Include bot_id for frontend filtering
-                "bot_name": bot_name_map.get(pos.bot_id, "Unknown"),  # Include bot name for display
+                "profit_usd": round(r.profit_usd, 2),
+                "profit_btc": round(r.profit_btc, 8),
+                "trade_count": r.closed_count,
+                "product_id": r.product_id,  # Include pair for frontend filtering
+                "bot_id": r.bot_id,  # Include bot_id for frontend filtering
+                "bot_name": bot_name_map.get(r.bot_id, "Unknown"),  # Include bot name for display
             }
         )
 
-        # Aggregate by day
-        day_key = pos.closed_at.date().isoformat()
-        daily_pnl_usd[day_key] += profit_usd
-        daily_pnl_btc[day_key] += profit_btc
+        daily_pnl_usd[day_key] += r.profit_usd
+        daily_pnl_btc[day_key] += r.profit_btc
+        pair_pnl_usd[r.product_id] += r.profit_usd
+        pair_pnl_btc[r.product_id] += r.profit_btc
 
-        # Aggregate by pair
-        pair_pnl_usd[pos.product_id] += profit_usd
-        pair_pnl_btc[pos.product_id] += profit_btc
+        if r.bot_id:
+            if r.bot_id not in bot_pnl_map:
+                bot_pnl_map[r.bot_id] = {"total_pnl_usd": 0.0, "total_pnl_btc": 0.0}
+            bot_pnl_map[r.bot_id]["total_pnl_usd"] += r.profit_usd
+            bot_pnl_map[r.bot_id]["total_pnl_btc"] += r.profit_btc
 
     # Convert daily P&L to cumulative
     by_day_data = []
     cumulative_usd = 0.0
     cumulative_btc = 0.0
-    all_days = sorted(set(daily_pnl_usd.keys()) | set(daily_pnl_btc.keys()))
-    for day in all_days:
+    for day in sorted(daily_pnl_usd.keys()):
         cumulative_usd += daily_pnl_usd[day]
         cumulative_btc += daily_pnl_btc[day]
         by_day_data.append({
@@ -423,14 +405,13 @@ async def get_pnl_timeseries(
         })
 
     # Convert pair P&L to list
-    all_pairs = sorted(set(pair_pnl_usd.keys()) | set(pair_pnl_btc.keys()))
     by_pair_data = [
         {
             "pair": pair,
             "total_pnl_usd": round(pair_pnl_usd[pair], 2),
             "total_pnl_btc": round(pair_pnl_btc[pair], 8)
         }
-        for pair in all_pairs
+        for pair in sorted(pair_pnl_usd.keys())
     ]
     # Sort by USD profit (descending)
     by_pair_data.sort(key=lambda x: x["total_pnl_usd"], reverse=True)
@@ -438,31 +419,13 @@ async def get_pnl_timeseries(
     # Get active trades count (scoped to current user's accounts)
     active_count_query = select(func.count(Position.id)).where(
         Position.status == "open",
-        Position.account_id.in_(user_account_ids) if user_account_ids else Position.id < 0,
+        Position.account_id.in_(user_account_ids),
     )
     if account_id is not None:
         active_count_query = active_count_query.where(Position.account_id == account_id)
     active_count_result = await db.execute(active_count_query)
     active_trades = active_count_result.scalar() or 0
 
-    # Calculate bot-level P&L from already-fetched positions
-    bot_pnl_map: Dict[int, dict] = {}
-    for pos in positions:
-        if pos.bot_id:
-            profit_usd = pos.profit_usd or 0.0
-
-            # Calculate profit_btc based on pair type
-            if pos.product_id and "-BTC" in pos.product_id:
-                profit_btc = pos.profit_quote or 0.0
-            else:
-                btc_price = resolve_btc_usd_price(pos)
-                profit_btc = profit_usd / btc_price if btc_price > 0 else 0.0
-
-            if pos.bot_id not in bot_pnl_map:
-                bot_pnl_map[pos.bot_id] = {"total_pnl_usd": 0.0, "total_pnl_btc": 0.0}
-            bot_pnl_map[pos.bot_id]["total_pnl_usd"] += profit_usd
-            bot_pnl_map[pos.bot_id]["total_pnl_btc"] += profit_btc
-
     most_profitable_bot = None
     if bot_pnl_map:
         # Find bot with highest USD profit
@@ -516,39 +479,21 @@ async def get_completed_trades_stats(
     if not user_account_ids:
         return empty_stats
 
-    # Build conditions for closed positions — exclude manual closes from win rate stats
-    conditions = [
-        Position.status == "closed",
-        Position.account_id.in_(user_account_ids),
-        or_(Position.exit_reason.is_(None), Position.exit_reason != "manual"),
-    ]
-    if account_id is not None:
-        conditions.append(Position.account_id == account_id)
-
-    # Use SQL aggregation instead of materializing all rows
-    # BTC profit: profit_quote for BTC pairs, profit_usd/btc_usd_price_at_close for others
-    btc_profit_expr = func.coalesce(func.sum(
-        case(
-            (Position.product_id.like('%-BTC'), Position.profit_quote),
-            else_=case(
-                (Position.btc_usd_price_at_close > 0,
-                 Position.profit_usd / Position.btc_usd_price_at_close),
-                else_=0.0,
-            ),
-        )
-    ), 0.0)
-
+    # Sum the rollups' stats columns (closed positions excluding manual closes)
     agg_query = select(
-        func.count(Position.id),
-        func.coalesce(func.sum(Position.profit_usd), 0.0),
-        func.count(case((Position.profit_usd > 0, 1))),
-        func.count(case((Position.profit_usd < 0, 1))),
-        btc_profit_expr,
-    ).where(*conditions)
+        func.coalesce(func.sum(PnlDailyRollup.stats_count), 0),
+        func.coalesce(func.sum(PnlDailyRollup.stats_profit_usd), 0.0),
+        func.coalesce(func.sum(PnlDailyRollup.win_count), 0),
+        func.coalesce(func.sum(PnlDailyRollup.loss_count), 0),
+        func.coalesce(func.sum(PnlDailyRollup.stats_profit_btc), 0.0),
+    ).where(PnlDailyRollup.account_id.in_(user_account_ids))
+    if account_id is not None:
+        agg_query = agg_query.where(PnlDailyRollup.account_id == account_id)
 
     result = await db.execute(agg_query)
     row = result.one()
     total_trades, total_profit_usd, winning_trades, losing_trades, total_profit_btc = row
+    total_trades, winning_trades, losing_trades = int(total_trades), int(winning_trades), int(losing_trades)
 
     if total_trades == 0:
         return empty_stats
@@ -628,14 +573,12 @@ async def get_realized_pnl(
             empty[f"{p}_profit_by_quote"] = {}
         return empty
 
-    base_where = [
-        Position.status == "closed",
-        Position.closed_at.isnot(None),
-        Position.account_id.in_(user_account_ids),
-    ]
+    base_where = [PnlDailyRollup.account_id.in_(user_account_ids)]
     if account_id is not None:
-        base_where.append(Position.account_id == account_id)
+        base_where.append(PnlDailyRollup.account_id == account_id)
 
+    # Every period starts at midnight and ends just before one, so whole-day
+    # rollup buckets cover them exactly.
     period_bounds = {
         "daily": (start_of_today, None),
         "yesterday": (start_of_yesterday, end_of_yesterday),
@@ -650,21 +593,12 @@ async def get_realized_pnl(
         "alltime": (None, None),
     }
 
-    # One grouped SQL query returns one row per product rather than one row per
-    # closed position. Both USD totals and native quote totals are aggregated in
-    # the database; Python only maps the small product result set into currencies.
-    usd_value = func.coalesce(Position.profit_usd, 0.0)
-    stable_quote = or_(
-        Position.product_id.like('%-USD'),
-        Position.product_id.like('%-USDC'),
-        Position.product_id.like('%-USDT'),
-    )
-    quote_value = func.coalesce(
-        Position.profit_quote,
-        case((stable_quote, usd_value), else_=0.0),
-        0.0,
-    )
-    aggregate_columns = [Position.product_id.label("product_id")]
+    # One grouped SQL query over the daily rollups returns one row per product.
+    # Both USD totals and native quote totals are aggregated in the database;
+    # Python only maps the small product result set into currencies.
+    usd_value = PnlDailyRollup.profit_usd
+    quote_value = PnlDailyRollup.profit_quote
+    aggregate_columns = [PnlDailyRollup.product_id.label("product_id")]
     for period_name, (start, end) in period_bounds.items():
         if start is None:
             aggregate_columns.extend([
@@ -672,14 +606,17 @@ async def get_realized_pnl(
                 func.coalesce(func.sum(quote_value), 0.0).label(f"{period_name}_quote"),
             ])
             continue
-        condition = Position.closed_at >= start if end is None else Position.closed_at.between(start, end)
+        condition = (
+            PnlDailyRollup.day >= start.date() if end is None
+            else PnlDailyRollup.day.between(start.date(), end.date())
+        )
         aggregate_columns.extend([
             func.coalesce(func.sum(case((condition, usd_value), else_=0.0)), 0.0).label(f"{period_name}_usd"),
             func.coalesce(func.sum(case((condition, quote_value), else_=0.0)), 0.0).label(f"{period_name}_quote"),
         ])
 
     grouped_result = await db.execute(
-        select(*aggregate_columns).where(*base_where).group_by(Position.product_id)
+        select(*aggregate_columns).where(*base_where).group_by(PnlDailyRollup.product_id)
     )
     grouped_rows = grouped_result.mappings().all()
 
@@ -9,10 +9,14 @@ Components:
 - CoinbasePriceFeed: Centralized exchange price feed (Coinbase)
 - DEXPriceFeed: Decentralized exchange price feed (Uniswap, etc.)
 - PriceAggregator: Combines multiple feeds for best price discovery
+- TriangularDetector: Incremental 3-cycle scanner for triangular arbitrage
+- StatArbAnalyzer: Rolling pair correlation / z-scores for statistical arbitrage
 """
 
 from app.price_feeds.base import PriceFeed, PriceQuote, OrderBook, OrderBookLevel
 from app.price_feeds.aggregator import PriceAggregator, AggregatedPrice, ArbitrageOpportunity
+from app.price_feeds.stat_arb_analyzer import CorrelationResult, StatArbAnalyzer, StatArbSignal
+from app.price_feeds.triangular_detector import TriangularDetector, TriangularOpportunity, TriangularPath
 
 __all__ = [
     "PriceFeed",
@@ -22,4 +26,10 @@ __all__ = [
     "PriceAggregator",
     "AggregatedPrice",
     "ArbitrageOpportunity",
+    "CorrelationResult",
+    "StatArbAnalyzer",
+    "StatArbSignal",
+    "TriangularDetector",
+    "TriangularOpportunity",
+    "TriangularPath",
 ]
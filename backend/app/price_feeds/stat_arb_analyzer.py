@@ -0,0 +1,346 @@
+"""
+Statistical Arbitrage Analyzer
+
+Rolling pair statistics for StatisticalArbitrageStrategy: correlation, hedge
+ratio and spread z-score between two products' log prices.
+
+Closes are placed on a fixed candle grid (slot = start // granularity) in a
+per-product ring buffer of the last ``window`` slots. Each tracked pair keeps
+running sums of its aligned samples (Σx, Σy, Σx², Σy², Σxy), so a new candle
+updates mean, variance, covariance, hedge ratio and z-score in O(1):
+
+    β      = cov(x, y) / var(y)
+    spread = x - β·y
+    z      = (spread_now - mean(spread)) / std(spread)
+
+Sums are taken relative to the pair's first sample and re-summed from the
+window every ``window`` updates, which keeps float cancellation and drift
+bounded.
+
+correlation_matrix() is the pair-selection path: it stacks the ring buffers
+and computes every product's correlation with every other in one vectorized
+pass, each pair over the slots both products have a close for.
+"""
+
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.utils.timeutil import utcfromtimestamp, utcnow
+
+
+@dataclass
+class CorrelationResult:
+    """Rolling relationship between two products' log prices."""
+    pair_1: str
+    pair_2: str
+    correlation: float
+    hedge_ratio: float  # β: units of pair_2 log price per unit of pair_1
+    samples: int
+    timestamp: datetime = field(default_factory=utcnow)
+
+
+@dataclass
+class StatArbSignal:
+    """Spread z-score and the action it implies."""
+    pair_1: str
+    pair_2: str
+    direction: str  # "long_spread", "short_spread", "exit" or "hold"
+    z_score: float
+    pair_1_action: Optional[str]  # "buy" / "sell" for entries, else None
+    pair_2_action: Optional[str]
+    confidence: float  # 0-1
+    timestamp: datetime = field(default_factory=utcnow)
+
+
+class _ProductWindow:
+    """Ring buffer of log closes indexed by candle slot."""
+
+    __slots__ = ("values", "slots", "last_slot")
+
+    def __init__(self, window: int):
+        self.values = np.full(window, np.nan)
+        self.slots = np.full(window, -1, dtype=np.int64)
+        self.last_slot = -1
+
+    def get(self, slot: int) -> Optional[float]:
+        i = slot % len(self.slots)
+        return float(self.values[i]) if self.slots[i] == slot else None
+
+
+class _PairStats:
+    """Running sums over the last ``window`` aligned samples of (x, y)."""
+
+    __slots__ = ("window", "samples", "x0", "y0", "sx", "sy", "sxx", "syy", "sxy", "since_resum")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.samples: Deque[Tuple[int, float, float]] = deque()
+        self.x0 = self.y0 = 0.0
+        self.sx = self.sy = self.sxx = self.syy = self.sxy = 0.0
+        self.since_resum = 0
+
+    def push(self, slot: int, x: float, y: float) -> None:
+        if self.samples:
+            last_slot = self.samples[-1][0]
+            if slot < last_slot:
+                return  # Late candle for a slot already behind the window head
+            if slot == last_slot:
+                self._remove(*self.samples.pop()[1:])  # In-progress candle update
+        else:
+            self.x0, self.y0 = x, y
+        self._add(x, y)
+        self.samples.append((slot, x, y))
+        if len(self.samples) > self.window:
+            self._remove(*self.samples.popleft()[1:])
+        self.since_resum += 1
+        if self.since_resum >= self.window:
+            self._resum()
+
+    def _add(self, x: float, y: float) -> None:
+        dx, dy = x - self.x0, y - self.y0
+        self.sx += dx
+        self.sy += dy
+        self.sxx += dx * dx
+        self.syy += dy * dy
+        self.sxy += dx * dy
+
+    def _remove(self, x: float, y: float) -> None:
+        dx, dy = x - self.x0, y - self.y0
+        self.sx -= dx
+        self.sy -= dy
+        self.sxx -= dx * dx
+        self.syy -= dy * dy
+        self.sxy -= dx * dy
+
+    def _resum(self) -> None:
+        _, self.x0, self.y0 = self.samples[0]
+        self.sx = self.sy = self.sxx = self.syy = self.sxy = 0.0
+        for _, x, y in self.samples:
+            self._add(x, y)
+        self.since_resum = 0
+
+    def moments(self) -> Optional[Tuple[float, float, float, float, float]]:
+        """(mean_x, mean_y, var_x, var_y, cov) of the shifted samples, population form."""
+        n = len(self.samples)
+        if n < 2:
+            return None
+        mx, my = self.sx / n, self.sy / n
+        var_x = max(self.sxx / n - mx * mx, 0.0)
+        var_y = max(self.syy / n - my * my, 0.0)
+        return mx, my, var_x, var_y, self.sxy / n - mx * my
+
+
+class StatArbAnalyzer:
+    """
+    Incremental pair statistics over a rolling candle window.
+
+    Usage:
+        analyzer = StatArbAnalyzer(window=720, granularity_seconds=3600)
+        analyzer.add_candles("ETH-USD", candles)             # backfill
+        analyzer.update("ETH-USD", candle["start"], close)   # per new candle
+        corr = analyzer.calculate_correlation("ETH-USD", "ETH-BTC")
+        signal = analyzer.get_signal("ETH-USD", "ETH-BTC", entry_threshold=2.0)
+    """
+
+    def __init__(self, window: int = 720, granularity_seconds: int = 3600, min_samples: int = 30):
+        """
+        Args:
+            window: Candles per rolling window (e.g. 30 days of 1h candles = 720)
+            granularity_seconds: Candle size; timestamps are bucketed to this grid
+            min_samples: Aligned samples required before a pair reports statistics
+        """
+        self.window = window
+        self.granularity_seconds = granularity_seconds
+        self.min_samples = min_samples
+        self._products: Dict[str, _ProductWindow] = {}
+        self._pairs: Dict[Tuple[str, str], _PairStats] = {}
+        self._pairs_by_product: Dict[str, List[Tuple[str, str]]] = {}
+
+    def update(self, product_id: str, timestamp: float, price: float) -> None:
+        """Record a close for ``product_id`` (a repeat of the latest slot replaces it)."""
+        if price is None or price <= 0:
+            return
+        slot = int(timestamp) // self.granularity_seconds
+        product = self._products.get(product_id)
+        if product is None:
+            product = self._products[product_id] = _ProductWindow(self.window)
+        if slot <= product.last_slot - self.window:
+            return  # Older than the window
+        log_price = math.log(price)
+        i = slot % self.window
+        product.values[i] = log_price
+        product.slots[i] = slot
+        product.last_slot = max(product.last_slot, slot)
+
+        for key in self._pairs_by_product.get(product_id, ()):
+            other = self._products.get(key[1] if key[0] == product_id else key[0])
+            other_value = other.get(slot) if other is not None else None
+            if other_value is None:
+                continue
+            x, y = (log_price, other_value) if key[0] == product_id else (other_value, log_price)
+            self._pairs[key].push(slot, x, y)
+
+    def add_candles(self, product_id: str, candles: Iterable[Dict[str, Any]]) -> None:
+        """Backfill from exchange candles ({"start": epoch seconds, "close": price})."""
+        for candle in sorted(candles, key=lambda c: int(c["start"])):
+            self.update(product_id, int(candle["start"]), float(candle["close"]))
+
+    def track_pair(self, pair_1: str, pair_2: str) -> None:
+        """Start O(1) tracking of (pair_1, pair_2), seeded from the stored windows."""
+        self._pair_stats(pair_1, pair_2)
+
+    def _pair_stats(self, pair_1: str, pair_2: str) -> _PairStats:
+        key = (pair_1, pair_2)
+        stats = self._pairs.get(key)
+        if stats is not None:
+            return stats
+        stats = self._pairs[key] = _PairStats(self.window)
+        self._pairs_by_product.setdefault(pair_1, []).append(key)
+        if pair_2 != pair_1:
+            self._pairs_by_product.setdefault(pair_2, []).append(key)
+
+        first, second = self._products.get(pair_1), self._products.get(pair_2)
+        if first is not None and second is not None:
+            for slot in sorted(int(s) for s in first.slots if s >= 0):
+                y = second.get(slot)
+                if y is not None:
+                    stats.push(slot, first.get(slot), y)
+        return stats
+
+    def calculate_correlation(self, pair_1: str, pair_2: str) -> Optional[CorrelationResult]:
+        """Rolling correlation and hedge ratio, or None until ``min_samples`` aligned candles."""
+        stats = self._pair_stats(pair_1, pair_2)
+        if len(stats.samples) < self.min_samples:
+            return None
+        moments = stats.moments()
+        if moments is None:
+            return None
+        _, _, var_x, var_y, cov = moments
+        if var_x <= 0 or var_y <= 0:
+            return None
+        return CorrelationResult(
+            pair_1=pair_1,
+            pair_2=pair_2,
+            correlation=max(-1.0, min(1.0, cov / math.sqrt(var_x * var_y))),
+            hedge_ratio=cov / var_y,
+            samples=len(stats.samples),
+            timestamp=utcfromtimestamp(stats.samples[-1][0] * self.granularity_seconds),
+        )
+
+    def get_signal(
+        self,
+        pair_1: str,
+        pair_2: str,
+        entry_threshold: float = 2.0,
+        exit_threshold: float = 0.5,
+        current_position: Optional[str] = None,
+    ) -> Optional[StatArbSignal]:
+        """
+        Spread z-score signal for the latest aligned candle.
+
+        Without a position: "short_spread" above +entry (sell pair_1, buy
+        pair_2), "long_spread" below -entry, otherwise "hold". With a position
+        ("long_spread"/"short_spread"): "exit" once the z-score has come back
+        inside ±exit, otherwise "hold". Returns None until the pair has
+        ``min_samples`` aligned candles and a non-degenerate spread.
+        """
+        stats = self._pair_stats(pair_1, pair_2)
+        if len(stats.samples) < self.min_samples:
+            return None
+        moments = stats.moments()
+        if moments is None:
+            return None
+        mx, my, var_x, var_y, cov = moments
+        if var_y <= 0:
+            return None
+        beta = cov / var_y
+        spread_var = var_x - 2 * beta * cov + beta * beta * var_y
+        if spread_var <= 1e-18:
+            return None
+        slot, x, y = stats.samples[-1]
+        spread = (x - stats.x0) - beta * (y - stats.y0)
+        z_score = (spread - (mx - beta * my)) / math.sqrt(spread_var)
+
+        pair_1_action = pair_2_action = None
+        if current_position == "long_spread":
+            direction = "exit" if z_score >= -exit_threshold else "hold"
+        elif current_position == "short_spread":
+            direction = "exit" if z_score <= exit_threshold else "hold"
+        elif z_score >= entry_threshold:
+            direction, pair_1_action, pair_2_action = "short_spread", "sell", "buy"
+        elif z_score <= -entry_threshold:
+            direction, pair_1_action, pair_2_action = "long_spread", "buy", "sell"
+        else:
+            direction = "hold"
+
+        return StatArbSignal(
+            pair_1=pair_1,
+            pair_2=pair_2,
+            direction=direction,
+            z_score=z_score,
+            pair_1_action=pair_1_action,
+            pair_2_action=pair_2_action,
+            confidence=min(1.0, abs(z_score) / (2 * entry_threshold)) if entry_threshold > 0 else 1.0,
+            timestamp=utcfromtimestamp(slot * self.granularity_seconds),
+        )
+
+    def correlation_matrix(self, product_ids: Optional[List[str]] = None) -> Tuple[List[str], np.ndarray]:
+        """
+        Correlation of log prices for every pair of ``product_ids`` (default: all).
+
+        Each pair is correlated over the window slots both products have a
+        close for, so a newly listed or sparse product only affects its own
+        row. The pairwise sums are computed for all pairs at once with masked
+        matrix products. Pairs with fewer than ``min_samples`` shared slots or
+        a flat price get NaN. Returns (product_ids, N x N matrix).
+        """
+        products = [p for p in (product_ids or list(self._products)) if p in self._products]
+        if not products:
+            return [], np.empty((0, 0))
+        head = max(self._products[p].last_slot for p in products)
+        wanted = np.arange(head - self.window + 1, head + 1)
+        idx = wanted % self.window
+
+        prices = np.empty((len(products), self.window))
+        for row, product_id in enumerate(products):
+            window = self._products[product_id]
+            prices[row] = np.where(window.slots[idx] == wanted, window.values[idx], np.nan)
+
+        present = ~np.isnan(prices)
+        mask = present.astype(np.float64)
+        # Centre each row on its own mean to keep the pairwise sums well conditioned
+        x = np.where(present, prices, 0.0)
+        x -= x.sum(axis=1, keepdims=True) / np.maximum(mask.sum(axis=1, keepdims=True), 1)
+        x *= mask
+
+        n = mask @ mask.T                # shared slots per pair
+        sums = x @ mask.T                # [i, j]: Σ x_i over slots shared with j
+        squares = (x * x) @ mask.T       # [i, j]: Σ x_i² over slots shared with j
+        cross = x @ x.T                  # [i, j]: Σ x_i·x_j over shared slots
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = cross - sums * sums.T / n
+            var = squares - sums * sums / n
+            matrix = cov / np.sqrt(var * var.T)
+        matrix[(n < self.min_samples) | (var <= 0) | (var.T <= 0)] = np.nan
+        return products, np.clip(matrix, -1.0, 1.0)
+
+    def top_pairs(
+        self,
+        product_ids: Optional[List[str]] = None,
+        min_correlation: float = 0.7,
+        limit: int = 20,
+    ) -> List[Tuple[str, str, float]]:
+        """Most correlated (|ρ| ≥ min_correlation) product pairs, strongest first."""
+        products, matrix = self.correlation_matrix(product_ids)
+        if len(products) < 2:
+            return []
+        rows, cols = np.triu_indices(len(products), k=1)
+        values = matrix[rows, cols]
+        keep = np.flatnonzero(np.abs(np.nan_to_num(values)) >= min_correlation)
+        keep = keep[np.argsort(-np.abs(values[keep]), kind="stable")][:limit]
+        return [(products[rows[k]], products[cols[k]], float(values[k])) for k in keep]
@@ -0,0 +1,324 @@
+"""
+Triangular Arbitrage Detector
+
+Finds profitable 3-currency cycles (e.g. ETH → BTC → USDT → ETH) on a single
+exchange for TriangularArbitrageStrategy.
+
+The product list is turned into a currency graph once: every BASE-QUOTE pair
+gives a "sell" edge (BASE → QUOTE at the bid) and a "buy" edge (QUOTE → BASE at
+1/ask). All directed 3-cycles are enumerated up front and kept as rows of edge
+indices in a numpy array.
+
+Edge rates are stored as negative log-weights, fee included:
+
+    w(sell) = -log(bid) - log(1 - fee)
+    w(buy)  =  log(ask) - log(1 - fee)
+
+so a cycle is profitable exactly when the sum of its three weights is below
+zero. A ticker update rewrites two edge weights and re-sums only the cycles
+that use that product — a few hundred array rows on a busy hub pair — instead
+of rescanning the graph.
+
+The scores are a top-of-book bound. find_profitable_paths() walks only the
+cycles that pass it through order-book depth (or the ticker's top-of-book size)
+at the requested start amount, with exact Decimal arithmetic, before reporting
+them.
+"""
+
+import math
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.price_feeds.base import OrderBook, OrderBookLevel, PriceQuote
+from app.utils.timeutil import utcnow
+
+SELL = "sell"  # BASE → QUOTE, fills against bids
+BUY = "buy"    # QUOTE → BASE, fills against asks
+
+
+@dataclass(frozen=True)
+class TriangularPath:
+    """A 3-leg cycle starting and ending in currencies[0]."""
+    currencies: Tuple[str, str, str, str]
+    pairs: Tuple[str, str, str]
+    directions: Tuple[str, str, str]
+
+    def __str__(self) -> str:
+        return " → ".join(self.currencies)
+
+
+@dataclass
+class TriangularOpportunity:
+    """A cycle evaluated at a concrete start amount, after fees and depth."""
+    path: TriangularPath
+    start_amount: Decimal
+    end_amount: Decimal
+    profit: Decimal
+    profit_pct: Decimal
+    rates: List[Decimal]  # Average fill price per leg (quote per base)
+    fees: List[Decimal]   # Fee per leg, in the currency received on that leg
+    timestamp: datetime = field(default_factory=utcnow)
+
+
+def _sell_base(levels: List[OrderBookLevel], base_amount: Decimal) -> Optional[Tuple[Decimal, Decimal]]:
+    """Sell ``base_amount`` into bids. Returns (quote_received, avg_price) or None if too thin."""
+    remaining = base_amount
+    quote = Decimal("0")
+    for level in levels:
+        fill = min(remaining, level.quantity)
+        quote += fill * level.price
+        remaining -= fill
+        if remaining <= 0:
+            return quote, quote / base_amount
+    return None
+
+
+def _buy_with_quote(levels: List[OrderBookLevel], quote_amount: Decimal) -> Optional[Tuple[Decimal, Decimal]]:
+    """Spend ``quote_amount`` on asks. Returns (base_received, avg_price) or None if too thin."""
+    remaining = quote_amount
+    base = Decimal("0")
+    for level in levels:
+        spend = min(remaining, level.price * level.quantity)
+        base += spend / level.price
+        remaining -= spend
+        if remaining <= 0:
+            return base, quote_amount / base
+    return None
+
+
+class TriangularDetector:
+    """
+    Incremental triangular-arbitrage scanner over one exchange's pairs.
+
+    Usage:
+        detector = TriangularDetector(product_ids, fee_pct=Decimal("0.6"))
+        detector.update_ticker("ETH-BTC", bid, ask, bid_size, ask_size)  # per tick
+        paths = await detector.find_profitable_paths(["ETH"], Decimal("0.1"), Decimal("0.5"))
+    """
+
+    def __init__(self, product_ids: Iterable[str], fee_pct: Decimal = Decimal("0.1")):
+        """
+        Build the currency graph and enumerate its 3-cycles.
+
+        Args:
+            product_ids: Pairs in "BASE-QUOTE" format (malformed ids are skipped)
+            fee_pct: Taker fee percentage charged on every leg
+        """
+        self.fee_pct = Decimal(str(fee_pct))
+        self._fee_weight = -math.log1p(-float(self.fee_pct) / 100)
+
+        self.currencies: List[str] = []
+        self._currency_index: Dict[str, int] = {}
+        self._edge_product: List[str] = []
+        self._edge_direction: List[str] = []
+        self._product_edges: Dict[str, Tuple[int, int]] = {}  # product → (sell edge, buy edge)
+        out_edges: List[Dict[int, int]] = []  # currency → {neighbour: edge}
+
+        def currency(symbol: str) -> int:
+            idx = self._currency_index.get(symbol)
+            if idx is None:
+                idx = self._currency_index[symbol] = len(self.currencies)
+                self.currencies.append(symbol)
+                out_edges.append({})
+            return idx
+
+        for product_id in product_ids:
+            parts = product_id.split("-")
+            if len(parts) != 2 or product_id in self._product_edges:
+                continue
+            base, quote = currency(parts[0]), currency(parts[1])
+            if base == quote or quote in out_edges[base]:
+                continue  # Self-pair, or QUOTE-BASE already listed
+            sell_edge = len(self._edge_product)
+            self._edge_product += [product_id, product_id]
+            self._edge_direction += [SELL, BUY]
+            out_edges[base][quote] = sell_edge
+            out_edges[quote][base] = sell_edge + 1
+            self._product_edges[product_id] = (sell_edge, sell_edge + 1)
+
+        self._edge_target = np.empty(len(self._edge_product), dtype=np.intp)
+        for src, neighbours in enumerate(out_edges):
+            for dst, edge in neighbours.items():
+                self._edge_target[edge] = dst
+
+        # Each directed cycle once, anchored at its lowest currency index;
+        # the other two rotations are recovered per start currency below.
+        cycles: List[Tuple[int, int, int]] = []
+        anchors: List[int] = []
+        for a, a_out in enumerate(out_edges):
+            for b, e1 in a_out.items():
+                if b < a:
+                    continue
+                for c, e2 in out_edges[b].items():
+                    if c <= a:
+                        continue
+                    e3 = out_edges[c].get(a)
+                    if e3 is not None:
+                        cycles.append((e1, e2, e3))
+                        anchors.append(a)
+
+        self._cycle_edges = np.array(cycles, dtype=np.intp).reshape(-1, 3)
+        self._cycle_score = np.full(len(cycles), np.inf)
+        self._weight = np.full(len(self._edge_product), np.inf)
+
+        by_product: Dict[str, List[int]] = {}
+        by_start: Dict[int, Tuple[List[int], List[int]]] = {}
+        for cycle_id, (edges, anchor) in enumerate(zip(cycles, anchors)):
+            start = anchor
+            for rotation, edge in enumerate(edges):
+                by_product.setdefault(self._edge_product[edge], []).append(cycle_id)
+                ids, rotations = by_start.setdefault(start, ([], []))
+                ids.append(cycle_id)
+                rotations.append(rotation)
+                start = int(self._edge_target[edge])
+        self._cycles_by_product = {
+            product: np.unique(np.array(ids, dtype=np.intp)) for product, ids in by_product.items()
+        }
+        self._cycles_by_start = {
+            self.currencies[start]: (np.array(ids, dtype=np.intp), np.array(rotations, dtype=np.intp))
+            for start, (ids, rotations) in by_start.items()
+        }
+
+        self._tickers: Dict[str, Tuple[Decimal, Decimal, Optional[Decimal], Optional[Decimal]]] = {}
+        self._books: Dict[str, OrderBook] = {}
+
+    @property
+    def cycle_count(self) -> int:
+        """Number of distinct directed 3-cycles in the graph."""
+        return len(self._cycle_edges)
+
+    def update_ticker(
+        self,
+        product_id: str,
+        bid: Decimal,
+        ask: Decimal,
+        bid_size: Optional[Decimal] = None,
+        ask_size: Optional[Decimal] = None,
+    ) -> int:
+        """
+        Apply a top-of-book update and re-score the cycles that trade this pair.
+
+        Sizes cap how much a leg may fill when no order book is loaded for the
+        pair (None = uncapped). Returns the number of cycles re-scored.
+        """
+        edges = self._product_edges.get(product_id)
+        if edges is None:
+            return 0
+        bid, ask = Decimal(str(bid)), Decimal(str(ask))
+        self._tickers[product_id] = (bid, ask, bid_size, ask_size)
+
+        sell_edge, buy_edge = edges
+        self._weight[sell_edge] = -math.log(bid) + self._fee_weight if bid > 0 else np.inf
+        self._weight[buy_edge] = math.log(ask) + self._fee_weight if ask > 0 else np.inf
+
+        cycle_ids = self._cycles_by_product.get(product_id)
+        if cycle_ids is None:
+            return 0
+        self._cycle_score[cycle_ids] = self._weight[self._cycle_edges[cycle_ids]].sum(axis=1)
+        return len(cycle_ids)
+
+    def update_quote(self, quote: PriceQuote) -> int:
+        """Apply a PriceFeed quote (see update_ticker)."""
+        return self.update_ticker(quote.product_id, quote.bid, quote.ask, quote.bid_size, quote.ask_size)
+
+    def update_order_book(self, book: OrderBook) -> int:
+        """Store depth for leg evaluation and update the pair's top of book."""
+        if book.product_id not in self._product_edges or not book.bids or not book.asks:
+            return 0
+        self._books[book.product_id] = book
+        return self.update_ticker(
+            book.product_id, book.bids[0].price, book.asks[0].price,
+            book.bids[0].quantity, book.asks[0].quantity,
+        )
+
+    async def find_profitable_paths(
+        self,
+        start_currencies: List[str],
+        min_profit_pct: Decimal,
+        start_amount: Decimal,
+        max_paths_per_currency: int = 20,
+    ) -> List[TriangularOpportunity]:
+        """
+        Return opportunities clearing ``min_profit_pct`` after fees and depth.
+
+        For each start currency, the best ``max_paths_per_currency`` cycles by
+        top-of-book score are filled leg by leg at ``start_amount``. Results are
+        sorted by profit percentage, best first.
+        """
+        min_profit_pct = Decimal(str(min_profit_pct))
+        start_amount = Decimal(str(start_amount))
+        threshold = -math.log1p(float(min_profit_pct) / 100)
+
+        opportunities = []
+        for symbol in start_currencies:
+            entry = self._cycles_by_start.get(symbol)
+            if entry is None:
+                continue
+            ids, rotations = entry
+            scores = self._cycle_score[ids]
+            hits = np.flatnonzero(scores < threshold)
+            if hits.size == 0:
+                continue
+            hits = hits[np.argsort(scores[hits], kind="stable")][:max_paths_per_currency]
+            for hit in hits:
+                opportunity = self._evaluate(int(ids[hit]), int(rotations[hit]), start_amount)
+                if opportunity is not None and opportunity.profit_pct >= min_profit_pct:
+                    opportunities.append(opportunity)
+
+        opportunities.sort(key=lambda o: o.profit_pct, reverse=True)
+        return opportunities
+
+    def _levels(self, product_id: str, direction: str) -> Optional[List[OrderBookLevel]]:
+        book = self._books.get(product_id)
+        if book is not None:
+            return book.bids if direction == SELL else book.asks
+        ticker = self._tickers.get(product_id)
+        if ticker is None:
+            return None
+        bid, ask, bid_size, ask_size = ticker
+        price, size = (bid, bid_size) if direction == SELL else (ask, ask_size)
+        return [OrderBookLevel(price=price, quantity=Decimal(str(size)) if size is not None else Decimal("Infinity"))]
+
+    def _evaluate(self, cycle_id: int, rotation: int, start_amount: Decimal) -> Optional[TriangularOpportunity]:
+        edges = [int(e) for e in np.roll(self._cycle_edges[cycle_id], -rotation)]
+        fee_rate = self.fee_pct / 100
+
+        amount = start_amount
+        currencies = []
+        rates, fees = [], []
+        for edge in edges:
+            product_id = self._edge_product[edge]
+            direction = self._edge_direction[edge]
+            base, quote = product_id.split("-")
+            currencies.append(base if direction == SELL else quote)
+            levels = self._levels(product_id, direction)
+            if not levels:
+                return None
+            fill = _sell_base(levels, amount) if direction == SELL else _buy_with_quote(levels, amount)
+            if fill is None:
+                return None  # Not enough depth for this size
+            received, price = fill
+            fee = received * fee_rate
+            rates.append(price)
+            fees.append(fee)
+            amount = received - fee
+        currencies.append(currencies[0])
+
+        profit = amount - start_amount
+        return TriangularOpportunity(
+            path=TriangularPath(
+                currencies=tuple(currencies),
+                pairs=tuple(self._edge_product[e] for e in edges),
+                directions=tuple(self._edge_direction[e] for e in edges),
+            ),
+            start_amount=start_amount,
+            end_amount=amount,
+            profit=profit,
+            profit_pct=profit / start_amount * 100 if start_amount > 0 else Decimal("0"),
+            rates=rates,
+            fees=fees,
+        )
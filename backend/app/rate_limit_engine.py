@@ -0,0 +1,260 @@
+"""
+GCRA rate-limit engine shared by the auth, per-user and public-endpoint limiters.
+
+A "max N per window W" limit is enforced with the generic cell rate algorithm
+(the token bucket seen from the other side): each key stores one number, its
+theoretical arrival time (TAT). With emission interval T = W / N a fresh key
+admits N requests back to back, then one more every T seconds; a request is
+admitted while TAT + T - now <= W. Memory per key is one float and a check is
+O(1) — there is no timestamp list to rebuild.
+
+- GCRALimiter: in-process state (dict of key -> TAT, monotonic clock).
+- RedisGCRALimiter: the same arithmetic in one Lua script on Redis TIME, so
+  every process shares one budget per key.
+- RateLimitEngine: what the limiters use. Sync calls are always in-process;
+  async calls go to Redis once attach_shared_redis() has run and fall back to
+  the in-process state if Redis errors.
+
+Keys are namespaced per engine (``zenith:rl:<name>:<key>`` on Redis).
+"""
+
+import logging
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "zenith:rl:"
+
+# Float slack so N requests at the same instant fit a limit of N exactly
+_EPSILON = 1e-9
+
+# KEYS[1] = key; ARGV = emission_ms, window_ms, mode (0 peek, 1 hit, 2 force)
+# Returns {allowed, retry_after_ms, used}. Time comes from Redis so processes
+# on different hosts agree on it.
+GCRA_LUA = """
+if redis.replicate_commands then redis.replicate_commands() end
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local emission = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local mode = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then tat = now end
+local allowed = (tat + emission - now) <= window
+if (mode == 1 and allowed) or mode == 2 then
+  tat = math.min(tat + emission, now + window)
+  redis.call('SET', KEYS[1], tat, 'PX', math.max(1, tat - now))
+end
+local used = math.ceil((tat - now) / emission)
+local retry = math.max(0, tat + emission - now - window)
+return {allowed and 1 or 0, retry, used}
+"""
+
+
+class RateLimitDecision(NamedTuple):
+    allowed: bool        # this request was (peek: would be) admitted
+    retry_after: float   # seconds until the key admits another request
+    used: int            # requests counted in the current window
+
+
+def _emission(limit: int, window: float) -> float:
+    return window / limit
+
+
+def _decision(tat: float, now: float, emission: float, window: float, allowed: bool) -> RateLimitDecision:
+    ahead = max(tat - now, 0.0)
+    return RateLimitDecision(
+        allowed=allowed,
+        retry_after=max(0.0, ahead + emission - window),
+        used=math.ceil(ahead / emission - _EPSILON) if ahead > 0 else 0,
+    )
+
+
+class GCRALimiter:
+    """In-process GCRA state: one theoretical arrival time per key."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._tat: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+
+    def _apply(self, key: Hashable, limit: int, window: float, mode: int) -> RateLimitDecision:
+        emission = _emission(limit, window)
+        with self._lock:
+            now = self.clock()
+            tat = max(self._tat.get(key, now), now)
+            allowed = tat + emission - now <= window + _EPSILON
+            if (mode == 1 and allowed) or mode == 2:
+                tat = min(tat + emission, now + window)
+                self._tat[key] = tat
+            return _decision(tat, now, emission, window, allowed)
+
+    def peek(self, key: Hashable, limit: int, window: float) -> RateLimitDecision:
+        """Would a request be admitted now? Records nothing."""
+        return self._apply(key, limit, window, 0)
+
+    def hit(self, key: Hashable, limit: int, window: float, *, force: bool = False) -> RateLimitDecision:
+        """Admit and count a request if the limit allows it.
+
+        ``force=True`` counts it either way (failed-attempt tracking); the
+        count is capped at the limit so a burst can't extend the lockout
+        past one window.
+        """
+        return self._apply(key, limit, window, 2 if force else 1)
+
+    def load(self, key: Hashable, used: int, limit: int, window: float) -> None:
+        """Mark ``used`` requests as just made (warming from a persisted count)."""
+        if used <= 0:
+            return
+        with self._lock:
+            now = self.clock()
+            tat = now + min(used, limit) * _emission(limit, window)
+            self._tat[key] = max(self._tat.get(key, now), tat)
+
+    def reset(self, key: Hashable) -> None:
+        with self._lock:
+            self._tat.pop(key, None)
+
+    def prune(self) -> List[Hashable]:
+        """Drop keys whose budget has fully refilled; returns the dropped keys."""
+        with self._lock:
+            now = self.clock()
+            stale = [key for key, tat in self._tat.items() if tat <= now]
+            for key in stale:
+                del self._tat[key]
+        return stale
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tat.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._tat
+
+    def __len__(self) -> int:
+        return len(self._tat)
+
+
+class RedisGCRALimiter:
+    """GCRA state in Redis, updated atomically by GCRA_LUA."""
+
+    def __init__(self, redis, prefix: str = REDIS_KEY_PREFIX):
+        self._redis = redis
+        self._prefix = prefix
+
+    def _key(self, key: Hashable) -> str:
+        if isinstance(key, tuple):
+            key = ":".join(str(part) for part in key)
+        return f"{self._prefix}{key}"
+
+    async def _apply(self, key: Hashable, limit: int, window: float, mode: int) -> RateLimitDecision:
+        emission_ms = max(1, round(_emission(limit, window) * 1000))
+        window_ms = round(window * 1000)
+        allowed, retry_ms, used = await self._redis.eval(
+            GCRA_LUA, 1, self._key(key), emission_ms, window_ms, mode,
+        )
+        return RateLimitDecision(bool(int(allowed)), int(retry_ms) / 1000.0, int(used))
+
+    async def peek(self, key: Hashable, limit: int, window: float) -> RateLimitDecision:
+        return await self._apply(key, limit, window, 0)
+
+    async def hit(self, key: Hashable, limit: int, window: float, *, force: bool = False) -> RateLimitDecision:
+        return await self._apply(key, limit, window, 2 if force else 1)
+
+    async def reset(self, key: Hashable) -> None:
+        await self._redis.delete(self._key(key))
+
+
+class RateLimitEngine:
+    """One limiter's state: in-process for sync callers, Redis-shared for async ones."""
+
+    def __init__(self, name: str, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.local = GCRALimiter(clock)
+        self._shared: Optional[RedisGCRALimiter] = None
+        self._redis_errors = 0
+        _ENGINES.append(self)
+
+    @property
+    def shared(self) -> bool:
+        return self._shared is not None
+
+    def attach_redis(self, redis) -> None:
+        self._shared = RedisGCRALimiter(redis, prefix=f"{REDIS_KEY_PREFIX}{self.name}:")
+
+    def detach_redis(self) -> None:
+        self._shared = None
+
+    # -- in-process (sync callers) --
+
+    def peek(self, key: Hashable, limit: int, window: float) -> RateLimitDecision:
+        return self.local.peek(key, limit, window)
+
+    def hit(self, key: Hashable, limit: int, window: float, *, force: bool = False) -> RateLimitDecision:
+        return self.local.hit(key, limit, window, force=force)
+
+    def load(self, key: Hashable, used: int, limit: int, window: float) -> None:
+        self.local.load(key, used, limit, window)
+
+    def reset(self, key: Hashable) -> None:
+        self.local.reset(key)
+
+    def prune(self) -> List[Hashable]:
+        return self.local.prune()
+
+    def clear(self) -> None:
+        self.local.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.local
+
+    def __len__(self) -> int:
+        return len(self.local)
+
+    # -- shared when Redis is attached (async callers) --
+
+    async def _shared_call(self, op: str, *args, **kwargs) -> Tuple[bool, Any]:
+        if self._shared is None:
+            return False, None
+        try:
+            return True, await getattr(self._shared, op)(*args, **kwargs)
+        except Exception as e:
+            self._redis_errors += 1
+            logger.warning(f"rate_limit_engine[{self.name}]: Redis {op} failed, using in-process state: {e}")
+            return False, None
+
+    async def apeek(self, key: Hashable, limit: int, window: float) -> RateLimitDecision:
+        ok, decision = await self._shared_call("peek", key, limit, window)
+        return decision if ok else self.local.peek(key, limit, window)
+
+    async def ahit(self, key: Hashable, limit: int, window: float, *, force: bool = False) -> RateLimitDecision:
+        ok, decision = await self._shared_call("hit", key, limit, window, force=force)
+        return decision if ok else self.local.hit(key, limit, window, force=force)
+
+    async def areset(self, key: Hashable) -> None:
+        await self._shared_call("reset", key)
+        self.local.reset(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"keys": len(self.local), "shared": self.shared, "redis_errors": self._redis_errors}
+
+
+_ENGINES: List[RateLimitEngine] = []
+
+
+def attach_shared_redis(redis) -> None:
+    """Share every engine's async checks through ``redis`` (multi-process deployments)."""
+    for engine in _ENGINES:
+        engine.attach_redis(redis)
+
+
+def detach_shared_redis() -> None:
+    for engine in _ENGINES:
+        engine.detach_redis()
+
+
+def engine_stats() -> Dict[str, Dict[str, Any]]:
+    return {engine.name: engine.stats() for engine in _ENGINES}
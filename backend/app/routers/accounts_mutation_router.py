@@ -19,6 +19,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.exceptions import AppError
 from app.database import get_db
 from app.encryption import encrypt_value, mask_api_key
+from app.json_response import utc_isoformat
 from app.models import Account, Bot, User
 from app.auth.dependencies import require_permission, Perm
 from app.services.account_service import (
@@ -711,7 +712,7 @@ async def update_dust_sweep_settings(
         "enabled": account.dust_sweep_enabled or False,
         "threshold_usd": account.dust_sweep_threshold_usd or 5.0,
         "last_sweep_at": (
-            account.dust_last_sweep_at.isoformat()
+            utc_isoformat(account.dust_last_sweep_at)
             if account.dust_last_sweep_at else None
         ),
     }
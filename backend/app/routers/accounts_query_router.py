@@ -21,6 +21,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.encryption import mask_api_key
+from app.json_response import utc_isoformat
 from app.models import Account, Bot, User
 from app.models.sharing import AccountMembership
 from app.auth.dependencies import Perm, get_current_user, require_permission
@@ -560,8 +561,8 @@ async def list_speculative_weights_proposals(
             "divergence_pp": r.divergence_pp,
             "baseline_weights": r.baseline_weights,
             "proposed_weights": r.proposed_weights,
-            "created_at": r.created_at.isoformat() if r.created_at else None,
-            "decided_at": r.decided_at.isoformat() if r.decided_at else None,
+            "created_at": utc_isoformat(r.created_at) if r.created_at else None,
+            "decided_at": utc_isoformat(r.decided_at) if r.decided_at else None,
             "reason": r.reason,
         }
         for r in rows
@@ -820,7 +821,7 @@ async def get_dust_sweep_settings(
         "enabled": account.dust_sweep_enabled or False,
         "threshold_usd": account.dust_sweep_threshold_usd or 5.0,
         "last_sweep_at": (
-            account.dust_last_sweep_at.isoformat()
+            utc_isoformat(account.dust_last_sweep_at)
             if account.dust_last_sweep_at else None
         ),
         "dust_positions": dust_positions,
@@ -20,6 +20,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.database import get_db
+from app.json_response import utc_isoformat
 from app.models import (
     Group, Permission, Role, User,
     group_roles, role_permissions, user_groups,
@@ -157,8 +158,8 @@ async def list_users(
             "mfa_email_enabled": bool(u.mfa_email_enabled),
             "groups": [{"id": g.id, "name": g.name} for g in u.groups],
             "session_policy_override": u.session_policy_override,
-            "last_login_at": u.last_login_at.isoformat() if u.last_login_at else None,
-            "created_at": u.created_at.isoformat() if u.created_at else None,
+            "last_login_at": utc_isoformat(u.last_login_at) if u.last_login_at else None,
+            "created_at": utc_isoformat(u.created_at) if u.created_at else None,
             "is_online": u.id in online_ids,
             "admin_display_name": u.admin_display_name,
             "login_locations": observer_locations.get(u.id),
@@ -633,8 +634,8 @@ async def list_user_sessions(
                 "session_id": s.session_id,
                 "ip_address": s.ip_address,
                 "user_agent": s.user_agent,
-                "created_at": s.created_at.isoformat() if s.created_at else None,
-                "expires_at": s.expires_at.isoformat() if s.expires_at else None,
+                "created_at": utc_isoformat(s.created_at) if s.created_at else None,
+                "expires_at": utc_isoformat(s.expires_at) if s.expires_at else None,
             }
             for s in sessions
         ],
@@ -874,7 +875,7 @@ def _format_ban_snapshot(snapshot):
         "currently_banned": snapshot.currently_banned,
         "total_banned": snapshot.total_banned,
         "total_failed": snapshot.total_failed,
-        "last_updated": utcfromtimestamp(snapshot.last_updated).isoformat()
+        "last_updated": utc_isoformat(utcfromtimestamp(snapshot.last_updated))
         if snapshot.last_updated > 0 else None,
         "banned_ips": [
             {
@@ -15,7 +15,6 @@ news analysis and coin categorization.
 
 import logging
 from app.utils.timeutil import utcnow
-from datetime import datetime
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -27,6 +26,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.encryption import encrypt_value, decrypt_value, is_encrypted
+from app.json_response import UTCDatetime
 from app.models import AIProviderCredential, User
 from app.auth.dependencies import get_current_user, require_permission, Perm
 
@@ -62,9 +62,9 @@ class AICredentialResponse(BaseModel):
     is_active: bool
     has_api_key: bool  # True if API key is set
     api_key_preview: str  # Shows only last 4 chars like "...abc1234"
-    created_at: datetime
-    updated_at: datetime
-    last_used_at: Optional[datetime] = None
+    created_at: UTCDatetime
+    updated_at: UTCDatetime
+    last_used_at: Optional[UTCDatetime] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -35,20 +35,14 @@ from app.auth_routers.rate_limiters import (  # noqa: F401
     _check_rate_limit,
     _check_resend_rate_limit,
     _check_signup_rate_limit,
-    _forgot_pw_attempts,
-    _forgot_pw_by_email,
     _is_forgot_pw_email_rate_limited,
-    _login_attempts,
-    _login_attempts_by_username,
-    _mfa_attempts,
+    _limiter,
     _record_attempt,
     _record_forgot_pw_attempt,
     _record_forgot_pw_email_attempt,
     _record_mfa_attempt,
     _record_resend_attempt,
     _record_signup_attempt,
-    _resend_attempts,
-    _signup_attempts,
 )
 
 # Re-export schemas (used by tests and endpoint function imports)
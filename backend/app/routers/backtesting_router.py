@@ -4,10 +4,11 @@ Backtesting Router
 Endpoints for running backtests and retrieving results.
 """
 
+import asyncio
 import logging
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -65,6 +66,7 @@ async def _prepare_backtest_inputs(
     single source of truth. Returns (account_id, candles); raises HTTPException on any
     validation or fetch failure.
     """
+    from app.services.candle_archive import get_archived_candles
     from app.services.exchange_service import get_exchange_client_for_account
     from app.strategies import StrategyRegistry
 
@@ -106,8 +108,10 @@ async def _prepare_backtest_inputs(
     if not exchange:
         raise HTTPException(status_code=400, detail="Could not create exchange client for account")
 
+    # Read through the local candle archive: closed history is backfilled in
+    # pages once, so multi-month ranges are not truncated to one exchange request.
     try:
-        candles = await exchange.get_candles(product_id, start_ts, end_ts, granularity)
+        candles = await get_archived_candles(exchange, product_id, start_ts, end_ts, granularity)
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Failed to fetch candles: {e}")
 
@@ -177,42 +181,133 @@ class OptimizeRequest(BaseModel):
     fitness_metric: str = "total_return_pct"
     top_n: int = 5
     account_id: Optional[int] = None  # For account-scoped data fetching
+    search: str = "grid"  # grid | random | halving | bayesian
+    max_evaluations: Optional[int] = None  # Backtest budget for adaptive searches
+    seed: Optional[int] = None
+
+
+# Seconds between client-disconnect checks while a sweep runs
+_DISCONNECT_POLL_SECONDS = 1.0
+
+
+class _OptimizationJob:
+    """Progress and cancel handle for one user's running sweep."""
+
+    def __init__(self):
+        self.cancel_event = asyncio.Event()
+        self.completed = 0
+        self.planned = 0
+        self.best_score: Optional[float] = None
+
+    def on_progress(self, completed: int, planned: int, result: Any) -> None:
+        self.completed = completed
+        self.planned = planned
+        if result is not None and (self.best_score is None or result.score > self.best_score):
+            self.best_score = result.score
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "completed": self.completed,
+            "planned": self.planned,
+            "best_score": self.best_score,
+            "cancelling": self.cancel_event.is_set(),
+        }
+
+
+# user_id -> the sweep that user is running (one at a time per user)
+_running_optimizations: Dict[int, _OptimizationJob] = {}
+
+
+async def _cancel_on_disconnect(http_request: Request, job: _OptimizationJob) -> None:
+    """Stop the sweep once the client has gone away — nobody is waiting for the result."""
+    while not job.cancel_event.is_set():
+        if await http_request.is_disconnected():
+            logger.info("Optimization client disconnected, cancelling sweep")
+            job.cancel_event.set()
+            return
+        await asyncio.sleep(_DISCONNECT_POLL_SECONDS)
 
 
 @router.post("/optimize", response_model=BacktestResponse)
 async def optimize_strategy(
     request: OptimizeRequest,
+    http_request: Request,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> BacktestResponse:
     """Run a strategy parameter sweep synchronously.
 
-    Generates every combination from ``parameter_ranges``, backtests each over the
+    Searches the combinations in ``parameter_ranges`` (every one for ``search="grid"``,
+    a ``max_evaluations`` budget for the adaptive searches), backtests them over the
     fetched candles, and returns the configurations ranked by ``fitness_metric``.
+
+    Progress is available from ``GET /optimize/progress`` while the sweep runs.
+    ``POST /optimize/cancel`` (or closing the connection) stops it early; the
+    response then carries the partial results with ``cancelled: true``.
     """
     from app.backtesting.optimizer import run_optimization
 
-    account_id, candles = await _prepare_backtest_inputs(
-        db, current_user, request.strategy_type, request.account_id,
-        request.product_id, request.start_ts, request.end_ts, request.granularity,
-    )
-
+    if current_user.id in _running_optimizations:
+        raise HTTPException(status_code=409, detail="An optimization is already running")
+    # Reserve the slot before the first await so a concurrent request gets the 409
+    job = _running_optimizations[current_user.id] = _OptimizationJob()
     try:
-        report = await run_optimization(
-            strategy_type=request.strategy_type,
-            strategy_config=request.strategy_config,
-            parameter_ranges=request.parameter_ranges,
-            candles=candles,
-            product_id=request.product_id,
-            initial_capital=request.initial_capital,
-            fee_pct=request.fee_pct,
-            fitness_metric=request.fitness_metric,
-            top_n=request.top_n,
-            user_id=current_user.id,
-            account_id=account_id,
+        account_id, candles = await _prepare_backtest_inputs(
+            db, current_user, request.strategy_type, request.account_id,
+            request.product_id, request.start_ts, request.end_ts, request.granularity,
         )
-    except Exception as e:
-        logger.error(f"Optimization failed: {e}", exc_info=True)
-        return BacktestResponse(status="error", error=str(e))
+
+        watcher = asyncio.create_task(_cancel_on_disconnect(http_request, job))
+        try:
+            report = await run_optimization(
+                strategy_type=request.strategy_type,
+                strategy_config=request.strategy_config,
+                parameter_ranges=request.parameter_ranges,
+                candles=candles,
+                product_id=request.product_id,
+                initial_capital=request.initial_capital,
+                fee_pct=request.fee_pct,
+                fitness_metric=request.fitness_metric,
+                top_n=request.top_n,
+                user_id=current_user.id,
+                account_id=account_id,
+                search=request.search,
+                max_evaluations=request.max_evaluations,
+                seed=request.seed,
+                progress_callback=job.on_progress,
+                cancel_event=job.cancel_event,
+            )
+        except Exception as e:
+            logger.error(f"Optimization failed: {e}", exc_info=True)
+            return BacktestResponse(status="error", error=str(e))
+        finally:
+            watcher.cancel()
+    finally:
+        # Only release the slot this request reserved
+        if _running_optimizations.get(current_user.id) is job:
+            del _running_optimizations[current_user.id]
 
     return BacktestResponse(status="ok", result=report.to_dict())
+
+
+@router.get("/optimize/progress")
+async def get_optimization_progress(
+    current_user: User = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """Backtests done/planned and the best full-history score of the caller's running sweep."""
+    job = _running_optimizations.get(current_user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="No optimization running")
+    return job.to_dict()
+
+
+@router.post("/optimize/cancel")
+async def cancel_optimization(
+    current_user: User = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """Stop the caller's running sweep; the /optimize request returns its partial results."""
+    job = _running_optimizations.get(current_user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="No optimization running")
+    job.cancel_event.set()
+    return job.to_dict()
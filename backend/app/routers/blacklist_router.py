@@ -19,6 +19,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
+from app.json_response import utc_isoformat
 from app.models import BlacklistedCoin, Settings, User, Account, AccountMembership
 from app.auth.dependencies import (
     get_current_user,
@@ -431,7 +432,7 @@ async def list_blacklisted_coins(
             id=coin.id,
             symbol=coin.symbol,
             reason=coin.reason,
-            created_at=coin.created_at.isoformat() if coin.created_at else "",
+            created_at=utc_isoformat(coin.created_at) if coin.created_at else "",
             is_global=True,
             user_override_category=user_overrides.get(coin.symbol),
         )
@@ -483,7 +484,7 @@ async def add_to_blacklist(
                 id=entry.id,
                 symbol=entry.symbol,
                 reason=entry.reason,
-                created_at=entry.created_at.isoformat() if entry.created_at else "",
+                created_at=utc_isoformat(entry.created_at) if entry.created_at else "",
                 is_global=True,
             )
         )
@@ -536,7 +537,7 @@ async def add_single_to_blacklist(
         id=entry.id,
         symbol=entry.symbol,
         reason=entry.reason,
-        created_at=entry.created_at.isoformat() if entry.created_at else "",
+        created_at=utc_isoformat(entry.created_at) if entry.created_at else "",
         is_global=True,
     )
 
@@ -608,7 +609,7 @@ async def update_blacklist_reason(
         id=entry.id,
         symbol=entry.symbol,
         reason=entry.reason,
-        created_at=entry.created_at.isoformat() if entry.created_at else "",
+        created_at=utc_isoformat(entry.created_at) if entry.created_at else "",
         is_global=True,
     )
 
@@ -18,6 +18,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import require_permission, Perm
 from app.database import get_db
+from app.json_response import utc_isoformat
 from app.models import User
 from app.models.donations import Donation
 from app.models.system import Settings
@@ -203,8 +204,8 @@ async def list_donations(
             "notes": d.notes,
             "status": d.status,
             "confirmed_by": d.confirmed_by,
-            "donation_date": d.donation_date.isoformat() if d.donation_date else None,
-            "created_at": d.created_at.isoformat() if d.created_at else None,
+            "donation_date": utc_isoformat(d.donation_date) if d.donation_date else None,
+            "created_at": utc_isoformat(d.created_at) if d.created_at else None,
         }
         for d in donations
     ]
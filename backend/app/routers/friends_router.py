@@ -16,6 +16,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import require_permission, Perm
 from app.database import get_db
+from app.json_response import utc_isoformat
 from app.models import User
 from app.models.auth import user_groups, group_roles, role_permissions, Permission
 from app.models.social import BlockedUser, FriendRequest, Friendship
@@ -190,7 +191,7 @@ async def list_friend_requests(
             "id": req.id,
             "from_user_id": req.from_user_id,
             "from_display_name": user.display_name,
-            "created_at": req.created_at.isoformat() if req.created_at else None,
+            "created_at": utc_isoformat(req.created_at) if req.created_at else None,
         }
         for req, user in rows
     ]
@@ -214,7 +215,7 @@ async def list_sent_friend_requests(
             "id": req.id,
             "to_user_id": req.to_user_id,
             "to_display_name": user.display_name,
-            "created_at": req.created_at.isoformat() if req.created_at else None,
+            "created_at": utc_isoformat(req.created_at) if req.created_at else None,
         }
         for req, user in rows
     ]
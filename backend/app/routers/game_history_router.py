@@ -17,6 +17,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import get_current_user, require_permission, Perm
 from app.database import get_db
+from app.json_response import utc_isoformat
 from app.models import User
 from app.models.social import (
     Friendship,
@@ -174,7 +175,7 @@ async def _build_game_history_response(
             "result": my_result,
             "score": my_score,
             "opponent_names": opponent_names,
-            "finished_at": g.finished_at.isoformat() if g.finished_at else None,
+            "finished_at": utc_isoformat(g.finished_at) if g.finished_at else None,
             "duration_seconds": duration_seconds,
             "tournament_id": g.tournament_id,
         })
@@ -385,8 +386,8 @@ async def get_game_result_detail(
         "room_id": game.room_id,
         "game_id": game.game_id,
         "mode": game.mode,
-        "started_at": game.started_at.isoformat() if game.started_at else None,
-        "finished_at": game.finished_at.isoformat() if game.finished_at else None,
+        "started_at": utc_isoformat(game.started_at) if game.started_at else None,
+        "finished_at": utc_isoformat(game.finished_at) if game.finished_at else None,
         "result_data": game.result_data,
         "tournament_id": game.tournament_id,
         "players": players,
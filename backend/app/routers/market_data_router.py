@@ -26,8 +26,10 @@ from app.coinbase_unified_client import CoinbaseClient
 from app.config import settings
 from app.constants import CANDLE_CACHE_TTL, CANDLE_CACHE_DEFAULT_TTL
 from app.database import get_db
+from app.json_response import utc_isoformat
 from app.models import Account
 from app.auth.dependencies import get_current_user
+from app.services.candle_archive import get_archived_candles
 from app.services.exchange_service import get_exchange_client_for_account
 
 logger = logging.getLogger(__name__)
@@ -41,6 +43,10 @@ _market_data_cache = SimpleCache()
 # Cache for candle data (shared across all users — candles are public)
 _candle_cache = SimpleCache()
 
+# Deepest base-candle history a synthetic chart interval aggregates (e.g. 100
+# ONE_MONTH candles = 3000 daily candles).
+CHART_MAX_BASE_CANDLES = 3000
+
 router = APIRouter(prefix="/api", tags=["market_data"])
 
 
@@ -74,7 +80,7 @@ async def get_ticker(product_id: str, coinbase: CoinbaseClient = Depends(get_coi
         return {
             "product_id": product_id,
             "price": current_price,
-            "time": utcnow().isoformat(),
+            "time": utc_isoformat(utcnow()),
         }
     except Exception:
         raise HTTPException(status_code=500, detail="An internal error occurred")
@@ -116,7 +122,7 @@ async def get_prices_batch(products: str, coinbase: CoinbaseClient = Depends(get
 
         return {
             "prices": prices,
-            "time": utcnow().isoformat(),
+            "time": utc_isoformat(utcnow()),
         }
     except (HTTPException, AppError):
         raise
@@ -180,23 +186,18 @@ async def get_candles(
             factor = synth["factor"]
             base_seconds = native_intervals[base_interval]
 
-            # Coinbase max is ~300 candles per request
-            # Cap synthetic candle count based on what we can fetch in one request
-            max_base_candles = 300
-            max_synthetic_candles = max_base_candles // factor
+            # Base candles come from the local candle archive (backfilled in
+            # pages on first use), so the cap is on history depth, not on the
+            # ~300-candle exchange request limit.
+            max_synthetic_candles = CHART_MAX_BASE_CANDLES // factor
             effective_limit = min(limit, max_synthetic_candles)
 
-            # Fetch base candles
+            # Fetch base candles (oldest first)
             fetch_count = effective_limit * factor + factor
             end_time = int(time.time())
             start_time = end_time - (base_seconds * fetch_count)
 
-            base_candles = await coinbase.get_candles(
-                product_id=product_id, start=start_time, end=end_time, granularity=base_interval
-            )
-
-            # Sort chronologically for aggregation
-            base_candles = list(reversed(base_candles))
+            base_candles = await get_archived_candles(coinbase, product_id, start_time, end_time, base_interval)
 
             # Aggregate candles
             aggregated = []
@@ -221,14 +222,12 @@ async def get_candles(
             end_time = int(time.time())
             start_time = end_time - (seconds * limit)
 
-            candles = await coinbase.get_candles(
-                product_id=product_id, start=start_time, end=end_time, granularity=interval
-            )
+            candles = await get_archived_candles(coinbase, product_id, start_time, end_time, interval)
 
-            # Coinbase returns candles in reverse chronological order
-            # Format: {"start": timestamp, "low": str, "high": str, "open": str, "close": str, "volume": str}
+            # Archive returns candles oldest first
+            # Format: {"start": timestamp, "low", "high", "open", "close", "volume"} (str or float)
             formatted_candles = []
-            for candle in reversed(candles):  # Reverse to get chronological order
+            for candle in candles:
                 formatted_candles.append(
                     {
                         "time": int(candle["start"]),
@@ -544,7 +543,7 @@ async def get_orderbook(
             "product_id": product_id,
             "bids": bids,
             "asks": asks,
-            "time": utcnow().isoformat(),
+            "time": utc_isoformat(utcnow()),
         }
     except HTTPException:
         raise
@@ -564,7 +563,7 @@ async def get_btc_usd_price(coinbase: CoinbaseClient = Depends(get_coinbase)):
         price = await coinbase.get_btc_usd_price()
         return {
             "price": price,
-            "time": utcnow().isoformat(),
+            "time": utc_isoformat(utcnow()),
         }
     except Exception as e:
         logger.error(f"Error fetching BTC/USD price: {e}")
@@ -582,7 +581,7 @@ async def get_eth_usd_price(coinbase: CoinbaseClient = Depends(get_coinbase)):
         price = await coinbase.get_eth_usd_price()
         return {
             "price": price,
-            "time": utcnow().isoformat(),
+            "time": utc_isoformat(utcnow()),
         }
     except Exception as e:
         logger.error(f"Error fetching ETH/USD price: {e}")
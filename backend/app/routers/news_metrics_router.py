@@ -10,6 +10,7 @@ from app.utils.timeutil import utcnow
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 
+from app.json_response import utc_isoformat
 from app.models import User
 from app.auth.dependencies import get_current_user
 from app.news_data import (
@@ -279,7 +280,7 @@ async def get_btc_supply(current_user: User = Depends(get_current_user)):
 
     height = cache.get("height", 0)
     result = calculate_btc_supply(height)
-    result["cached_at"] = cache.get("timestamp", utcnow().isoformat())
+    result["cached_at"] = cache.get("timestamp", utc_isoformat(utcnow()))
     return result
 
 
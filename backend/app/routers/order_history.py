@@ -5,7 +5,6 @@ Provides endpoints for viewing order history (successful and failed orders).
 Complete order history page with filtering and pagination.
 """
 
-from datetime import datetime
 from typing import Generic, List, Optional, TypeVar
 
 from fastapi import APIRouter, Depends, Query
@@ -14,6 +13,7 @@ from sqlalchemy import desc, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
+from app.json_response import UTCDatetime
 from app.models import Bot, OrderHistory, User
 from app.auth.dependencies import get_current_user
 from app.services.account_access import accessible_account_ids
@@ -27,7 +27,7 @@ class OrderHistoryResponse(BaseModel):
     """Order history record for API response"""
 
     id: int
-    timestamp: datetime
+    timestamp: UTCDatetime
     bot_id: int
     bot_name: str
     account_id: Optional[int]
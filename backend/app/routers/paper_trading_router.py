@@ -16,6 +16,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models import Account
+from app.services.paper_ledger import paper_ledger
+from app.services.pnl_rollup_service import delete_account_rollups
 from app.auth.dependencies import get_current_user, require_permission, Perm
 
 logger = logging.getLogger(__name__)
@@ -54,10 +56,11 @@ async def get_paper_balance(
     if not paper_account:
         raise HTTPException(status_code=404, detail="Paper trading account not found")
 
-    # Parse JSON balances
-    if paper_account.paper_balances:
+    # Parse JSON balances (the trading process's ledger may be one flush ahead of the row)
+    balances = paper_ledger.live(paper_account.id)
+    if balances is None and paper_account.paper_balances:
         balances = json.loads(paper_account.paper_balances)
-    else:
+    elif balances is None:
         balances = DEFAULT_PAPER_BALANCES
         # Save default balances if none exist
         paper_account.paper_balances = json.dumps(DEFAULT_PAPER_BALANCES)
@@ -124,6 +127,7 @@ async def deposit_to_paper_account(
     # Save updated balances
     paper_account.paper_balances = json.dumps(balances)
     await db.commit()
+    paper_ledger.request_reconcile()  # merge into the ledger's in-memory balances
 
     logger.info(
         f"Paper trading deposit: user_id={current_user.id}, "
@@ -209,10 +213,14 @@ async def reset_paper_account(
     for order in pending_orders:
         await db.delete(order)
 
+    # P&L rollups are derived from the deleted positions
+    await delete_account_rollups(db, paper_account.id)
+
     # Reset balances to defaults
     paper_account.paper_balances = json.dumps(DEFAULT_PAPER_BALANCES)
 
     await db.commit()
+    paper_ledger.request_reconcile()
 
     logger.info(
         f"Paper trading account reset: user_id={current_user.id}, "
@@ -291,6 +299,7 @@ async def withdraw_from_paper_account(
     # Save updated balances
     paper_account.paper_balances = json.dumps(balances)
     await db.commit()
+    paper_ledger.request_reconcile()  # merge into the ledger's in-memory balances
 
     logger.info(
         f"Paper trading withdrawal: user_id={current_user.id}, "
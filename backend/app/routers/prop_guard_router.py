@@ -17,6 +17,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from fastapi import Query
 from app.database import get_db
+from app.json_response import utc_isoformat
 from app.models import Account, PropFirmState, PropFirmEquitySnapshot
 from app.auth.dependencies import get_current_user
 
@@ -96,12 +97,12 @@ async def get_propguard_status(
         "initial_deposit": state.initial_deposit,
         "current_equity": state.current_equity,
         "current_equity_timestamp": (
-            state.current_equity_timestamp.isoformat()
+            utc_isoformat(state.current_equity_timestamp)
             if state.current_equity_timestamp else None
         ),
         "daily_start_equity": state.daily_start_equity,
         "daily_start_timestamp": (
-            state.daily_start_timestamp.isoformat()
+            utc_isoformat(state.daily_start_timestamp)
             if state.daily_start_timestamp else None
         ),
         "daily_drawdown_pct": round(daily_dd, 2),
@@ -113,7 +114,7 @@ async def get_propguard_status(
         "is_killed": state.is_killed,
         "kill_reason": state.kill_reason,
         "kill_timestamp": (
-            state.kill_timestamp.isoformat()
+            utc_isoformat(state.kill_timestamp)
             if state.kill_timestamp else None
         ),
     }
@@ -279,7 +280,7 @@ async def get_propguard_history(
         "hours": hours,
         "count": len(snapshots),
         "snapshots": [{
-            "timestamp": s.timestamp.isoformat() if s.timestamp else None,
+            "timestamp": utc_isoformat(s.timestamp) if s.timestamp else None,
             "equity": s.equity,
             "daily_drawdown_pct": s.daily_drawdown_pct,
             "total_drawdown_pct": s.total_drawdown_pct,
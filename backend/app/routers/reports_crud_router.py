@@ -21,6 +21,7 @@ from sqlalchemy.orm import selectinload
 
 from app.auth.dependencies import get_current_user, require_permission, Perm
 from app.database import get_db, get_read_db
+from app.json_response import utc_isoformat
 from app.models import (
     Account,
     AIProviderCredential,
@@ -258,11 +259,11 @@ def _goal_to_dict(goal: ReportGoal) -> dict:
         "tax_withholding_pct": goal.tax_withholding_pct or 0,
         "expense_sort_mode": goal.expense_sort_mode or "amount_asc",
         "time_horizon_months": goal.time_horizon_months,
-        "start_date": goal.start_date.isoformat() if goal.start_date else None,
-        "target_date": goal.target_date.isoformat() if goal.target_date else None,
+        "start_date": utc_isoformat(goal.start_date) if goal.start_date else None,
+        "target_date": utc_isoformat(goal.target_date) if goal.target_date else None,
         "is_active": goal.is_active,
-        "achieved_at": goal.achieved_at.isoformat() if goal.achieved_at else None,
-        "created_at": goal.created_at.isoformat() if goal.created_at else None,
+        "achieved_at": utc_isoformat(goal.achieved_at) if goal.achieved_at else None,
+        "created_at": utc_isoformat(goal.created_at) if goal.created_at else None,
         "chart_horizon": goal.chart_horizon or "auto",
         "show_minimap": goal.show_minimap if goal.show_minimap is not None else True,
         "minimap_threshold_days": goal.minimap_threshold_days or 90,
@@ -355,15 +356,15 @@ def _schedule_to_dict(schedule: ReportSchedule) -> dict:
         ),
         "goal_ids": goal_ids,
         "last_run_at": (
-            schedule.last_run_at.isoformat()
+            utc_isoformat(schedule.last_run_at)
             if schedule.last_run_at else None
         ),
         "next_run_at": (
-            schedule.next_run_at.isoformat()
+            utc_isoformat(schedule.next_run_at)
             if schedule.next_run_at else None
         ),
         "created_at": (
-            schedule.created_at.isoformat()
+            utc_isoformat(schedule.created_at)
             if schedule.created_at else None
         ),
         "retention_count": schedule.retention_count,
@@ -17,6 +17,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import get_current_user, require_permission, Perm
 from app.database import get_db, get_read_db
+from app.json_response import utc_isoformat
 from app.models import (
     ExpenseItem,
     GoalProgressSnapshot,
@@ -174,7 +175,7 @@ def _expense_item_to_dict(
         "percent_basis": getattr(item, "percent_basis", None),
         "is_active": item.is_active,
         "sort_order": item.sort_order or 0,
-        "created_at": item.created_at.isoformat() if item.created_at else None,
+        "created_at": utc_isoformat(item.created_at) if item.created_at else None,
         # Savings target fields
         "item_type": item_type,
         "savings_target_amount": getattr(item, "savings_target_amount", None),
@@ -23,6 +23,7 @@ from app.auth.dependencies import (
     security,
 )
 from app.database import get_db
+from app.json_response import utc_isoformat
 from app.models import User
 from app.models.auth import ActiveSession
 from app.services.session_service import (
@@ -85,7 +86,7 @@ async def list_other_active_sessions(
             "session_id": s.session_id,
             "ip_address": s.ip_address,
             "user_agent": s.user_agent,
-            "created_at": s.created_at.isoformat() if s.created_at else None,
+            "created_at": utc_isoformat(s.created_at) if s.created_at else None,
         }
         for s in sessions
         if s.session_id != current_sid
@@ -22,6 +22,7 @@ from app.config import settings
 from app.database import get_db
 from app.encryption import decrypt_value, is_encrypted
 from app.exchange_clients.factory import create_exchange_client, ExchangeClientConfig, CoinbaseCredentials
+from app.json_response import utc_isoformat
 from app.models import Account, Settings, User
 from app.auth.dependencies import get_current_user, require_permission, require_superuser, Perm
 from app.schemas import SettingsUpdate, TestConnectionRequest
@@ -236,7 +237,7 @@ async def get_setting_by_key(
         "value": setting.value,
         "value_type": setting.value_type,
         "description": setting.description,
-        "updated_at": setting.updated_at.isoformat() if setting.updated_at else None
+        "updated_at": utc_isoformat(setting.updated_at) if setting.updated_at else None
     }
 
 
@@ -266,5 +267,5 @@ async def update_setting_by_key(
         "message": f"Setting '{key}' updated successfully",
         "key": setting.key,
         "value": setting.value,
-        "updated_at": setting.updated_at.isoformat() if setting.updated_at else None
+        "updated_at": utc_isoformat(setting.updated_at) if setting.updated_at else None
     }
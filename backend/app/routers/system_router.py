@@ -30,6 +30,7 @@ from app.config import settings, AI_PROVIDER_BILLING_URLS
 from app.database import get_db, get_pool_capacity_snapshot
 from app.encryption import decrypt_value, is_encrypted
 from app.exchange_clients.factory import create_exchange_client, ExchangeClientConfig, CoinbaseCredentials
+from app.json_response import utc_isoformat
 from app.models import Account, MarketData, Position, Signal, Trade, User
 from app.multi_bot_monitor import MultiBotMonitor
 from app.auth.dependencies import get_current_user, require_permission, require_superuser, Perm
@@ -57,7 +58,7 @@ class ClientPerformancePayload(BaseModel):
 
 # Captured once at process start — lets the frontend detect actual restarts
 # vs. just a tag push (where the live git version changes but the process hasn't restarted).
-_STARTUP_TIME = utcnow().isoformat()
+_STARTUP_TIME = utc_isoformat(utcnow())
 
 # Short-lived cache for git version — avoids spawning a subprocess on every health/version poll.
 _version_cache: Optional[str] = None
@@ -229,7 +230,17 @@ async def get_performance_summary(
     current_user: User = Depends(require_superuser),
 ):
     """Return bounded p50/p95 performance aggregates to superusers."""
-    return get_performance_snapshot()
+    from app.auth.principal_cache import principal_cache
+    from app.cache import api_cache
+    from app.rate_limit_engine import engine_stats
+    from app.services.websocket_manager import ws_manager
+    return {
+        **get_performance_snapshot(),
+        "principal_cache": principal_cache.stats(),
+        "api_cache": api_cache.stats(),
+        "rate_limits": engine_stats(),
+        "websocket": ws_manager.stats(),
+    }
 
 
 @router.get("/api/performance/capacity")
@@ -584,7 +595,7 @@ async def get_status(
         connection_ok = await coinbase.test_connection()
         monitor_status = await price_monitor.get_status()
 
-        return {"api_connected": connection_ok, "monitor": monitor_status, "timestamp": utcnow().isoformat()}
+        return {"api_connected": connection_ok, "monitor": monitor_status, "timestamp": utc_isoformat(utcnow())}
     except Exception:
         raise HTTPException(status_code=500, detail="An internal error occurred")
 
@@ -4,7 +4,6 @@ Bot Template Router
 Handles CRUD operations for bot templates.
 """
 
-from datetime import datetime
 from app.utils.timeutil import utcnow
 from typing import List, Optional
 
@@ -15,6 +14,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
+from app.json_response import UTCDatetime
 from app.models import BotTemplate, BotTemplateProduct, User
 from app.strategies import StrategyRegistry
 from app.auth.dependencies import get_current_user, require_permission, Perm
@@ -49,8 +49,8 @@ class TemplateResponse(BaseModel):
     product_ids: Optional[List[str]]
     split_budget_across_pairs: bool
     is_default: bool
-    created_at: datetime
-    updated_at: datetime
+    created_at: UTCDatetime
+    updated_at: UTCDatetime
 
     model_config = ConfigDict(from_attributes=True)
 
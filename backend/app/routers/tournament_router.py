@@ -15,6 +15,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import require_permission, Perm
 from app.database import get_db
+from app.json_response import utc_isoformat
 from app.models import User
 from app.models.social import (
     Tournament,
@@ -67,7 +68,7 @@ async def create_tournament(
         "game_ids": tournament.game_ids,
         "config": tournament.config,
         "status": tournament.status,
-        "created_at": tournament.created_at.isoformat() if tournament.created_at else None,
+        "created_at": utc_isoformat(tournament.created_at) if tournament.created_at else None,
     }
 
 
@@ -113,8 +114,8 @@ async def list_tournaments(
             "game_ids": t.game_ids,
             "status": t.status,
             "player_count": player_count,
-            "created_at": t.created_at.isoformat() if t.created_at else None,
-            "started_at": t.started_at.isoformat() if t.started_at else None,
+            "created_at": utc_isoformat(t.created_at) if t.created_at else None,
+            "started_at": utc_isoformat(t.started_at) if t.started_at else None,
         })
 
     return items
@@ -160,7 +161,7 @@ async def get_tournament_detail(
             "display_name": user.display_name,
             "total_score": player.total_score,
             "placement": player.placement,
-            "joined_at": player.joined_at.isoformat() if player.joined_at else None,
+            "joined_at": utc_isoformat(player.joined_at) if player.joined_at else None,
         }
         for player, user in players_q.all()
     ]
@@ -174,9 +175,9 @@ async def get_tournament_detail(
         "config": tournament.config,
         "status": tournament.status,
         "player_count": len(players),
-        "created_at": tournament.created_at.isoformat() if tournament.created_at else None,
-        "started_at": tournament.started_at.isoformat() if tournament.started_at else None,
-        "finished_at": tournament.finished_at.isoformat() if tournament.finished_at else None,
+        "created_at": utc_isoformat(tournament.created_at) if tournament.created_at else None,
+        "started_at": utc_isoformat(tournament.started_at) if tournament.started_at else None,
+        "finished_at": utc_isoformat(tournament.finished_at) if tournament.finished_at else None,
         "players": players,
     }
 
@@ -283,7 +284,7 @@ async def start_tournament(
     return {
         "id": tournament.id,
         "status": tournament.status,
-        "started_at": tournament.started_at.isoformat(),
+        "started_at": utc_isoformat(tournament.started_at),
     }
 
 
@@ -20,6 +20,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import get_current_user
 from app.database import get_db
+from app.json_response import utc_isoformat
 from app.models import Account, AccountTransfer, User
 from app.services.account_access import accessible_account_ids
 
@@ -61,9 +62,9 @@ def _transfer_to_dict(t: AccountTransfer) -> dict:
         "amount": t.amount,
         "currency": t.currency,
         "amount_usd": t.amount_usd,
-        "occurred_at": t.occurred_at.isoformat() if t.occurred_at else None,
+        "occurred_at": utc_isoformat(t.occurred_at) if t.occurred_at else None,
         "source": t.source,
-        "created_at": t.created_at.isoformat() if t.created_at else None,
+        "created_at": utc_isoformat(t.created_at) if t.created_at else None,
     }
 
 
@@ -292,7 +293,7 @@ async def get_recent_summary(
         "last_30d_withdrawal_count": len(withdrawals),
         "transfers": [
             {
-                "occurred_at": t.occurred_at.isoformat(),
+                "occurred_at": utc_isoformat(t.occurred_at),
                 "type": t.transfer_type,
                 "amount_usd": t.amount_usd,
                 "currency": t.currency,
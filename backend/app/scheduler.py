@@ -157,6 +157,17 @@ def register_jobs(startup_time: datetime, scheduler: AsyncIOScheduler = schedule
         next_run_time=startup_time + timedelta(minutes=30),
     )
 
+    from app.services.pnl_rollup_service import run_pnl_rollup_maintenance_once
+    scheduler.add_job(
+        run_pnl_rollup_maintenance_once,
+        IntervalTrigger(hours=1),
+        id="pnl_rollup_maintenance",
+        max_instances=1,
+        coalesce=True,
+        replace_existing=True,
+        next_run_time=startup_time + timedelta(seconds=30),
+    )
+
     from app.services.delisted_pair_monitor import trading_pair_monitor
     scheduler.add_job(
         trading_pair_monitor.run_once,
@@ -4,11 +4,12 @@ Moved here from accounts_query_router so that accounts_mutation_router
 does not have to reach across the router layer to reuse them.
 """
 
-from datetime import datetime
 from typing import Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.json_response import UTCDatetime
+
 
 class AccountBase(BaseModel):
     """Base fields for account creation/update"""
@@ -97,9 +98,9 @@ class AccountResponse(BaseModel):
     wallet_type: Optional[str] = None
 
     # Metadata
-    created_at: datetime
-    updated_at: datetime
-    last_used_at: Optional[datetime] = None
+    created_at: UTCDatetime
+    updated_at: UTCDatetime
+    last_used_at: Optional[UTCDatetime] = None
 
     # Perpetual Futures
     perps_portfolio_uuid: Optional[str] = None
@@ -1,14 +1,15 @@
 """Market data and signal-related Pydantic schemas"""
 
-from datetime import datetime
 from typing import Optional
 
 from pydantic import BaseModel, ConfigDict
 
+from app.json_response import UTCDatetime
+
 
 class SignalResponse(BaseModel):
     id: int
-    timestamp: datetime
+    timestamp: UTCDatetime
     signal_type: str
     macd_value: float
     macd_signal: float
@@ -22,7 +23,7 @@ class SignalResponse(BaseModel):
 
 class MarketDataResponse(BaseModel):
     id: int
-    timestamp: datetime
+    timestamp: UTCDatetime
     price: float
     macd_value: Optional[float]
     macd_signal: Optional[float]
@@ -1,10 +1,11 @@
 """Position-related Pydantic schemas"""
 
-from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, computed_field
 
+from app.json_response import UTCDatetime
+
 
 class PositionResponse(BaseModel):
     id: int
@@ -14,8 +15,8 @@ class PositionResponse(BaseModel):
     user_deal_number: Optional[int] = None  # Deal number (SUCCESSFUL deals only)
     product_id: str = "ETH-BTC"
     status: str
-    opened_at: datetime
-    closed_at: Optional[datetime]
+    opened_at: UTCDatetime
+    closed_at: Optional[UTCDatetime]
     strategy_config_snapshot: Optional[dict] = None  # Frozen config from bot at position creation
     initial_quote_balance: float  # BTC or USD
     max_quote_allowed: float  # BTC or USD
@@ -37,7 +38,7 @@ class PositionResponse(BaseModel):
     first_buy_price: Optional[float] = None  # Price of first (base order) buy trade
     last_buy_price: Optional[float] = None  # Price of most recent buy trade
     last_error_message: Optional[str] = None  # Last error message
-    last_error_timestamp: Optional[datetime] = None  # When error occurred
+    last_error_timestamp: Optional[UTCDatetime] = None  # When error occurred
     notes: Optional[str] = None  # User notes
     exit_reason: Optional[str] = None
     exit_source: Optional[str] = None
@@ -61,7 +62,7 @@ class LimitOrderFill(BaseModel):
     price: float
     base_amount: float
     quote_amount: float
-    timestamp: datetime
+    timestamp: UTCDatetime
 
 
 class LimitOrderDetails(BaseModel):
@@ -76,7 +77,7 @@ class LimitOrderDetails(BaseModel):
 class TradeResponse(BaseModel):
     id: int
     position_id: int
-    timestamp: datetime
+    timestamp: UTCDatetime
     side: str
     quote_amount: float  # BTC or USD
     base_amount: float  # ETH, ADA, etc.
@@ -113,7 +114,7 @@ class AIBotLogResponse(BaseModel):
     id: int
     bot_id: int
     position_id: Optional[int]
-    timestamp: datetime
+    timestamp: UTCDatetime
     thinking: str
     decision: str
     confidence: Optional[float]
@@ -141,10 +142,10 @@ class AIOpinionLogResponse(BaseModel):
     reasoning: Optional[str]
     ai_model: Optional[str]
     tool_calls: Optional[List[Dict[str, Any]]]
-    created_at: datetime
+    created_at: UTCDatetime
     outcome: Optional[str]
     realized_pnl_pct: Optional[float]
-    closed_at: Optional[datetime]
+    closed_at: Optional[UTCDatetime]
 
     model_config = ConfigDict(from_attributes=True)
 
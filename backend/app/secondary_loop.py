@@ -99,12 +99,18 @@ def start_secondary_loop():
 def stop_secondary_loop():
     """Stop the secondary event loop and release its resources. Called during FastAPI shutdown.
 
-    Disposes the loop-bound DB engine (on its own loop) before stopping, then
-    closes the loop so its self-pipe sockets are released rather than left for
-    the GC — otherwise each start/stop cycle leaks an unclosed event loop.
+    Closes the loop's pooled HTTP clients and disposes the loop-bound DB engine
+    (both on their own loop) before stopping, then closes the loop so its
+    self-pipe sockets are released rather than left for the GC — otherwise
+    each start/stop cycle leaks an unclosed event loop.
     """
     global _loop, _thread, _session_maker, _engine
     if _loop and _loop.is_running():
+        from app.http_pool import http_pool
+        try:
+            asyncio.run_coroutine_threadsafe(http_pool.aclose(), _loop).result(timeout=10)
+        except Exception as exc:
+            logger.warning("Secondary HTTP client pool close failed during shutdown: %s", exc)
         if _engine is not None:
             try:
                 asyncio.run_coroutine_threadsafe(_engine.dispose(), _loop).result(timeout=10)
@@ -1,7 +1,8 @@
 """
 Server Resource Plan
 
-Auto-derives DB pool sizes and concurrency caps from pg_max_connections.
+Auto-derives DB pool sizes and concurrency caps from pg_max_connections, and
+the strategy-optimizer worker cap from the CPU count.
 The only value you ever need to change manually is MONITOR_RESOURCE_SHARE —
 everything else recalculates when you bump hardware.
 """
@@ -33,6 +34,10 @@ TRADER_MONITOR_SHARE = 0.20
 TRADER_READ_SHARE = 0.04
 TRADER_BOT_CONCURRENCY_CAP = 2
 TRADER_PAIR_CONCURRENCY_CAP = 2
+
+# Fraction of CPU cores (after one reserved for the event loop / trader) that
+# strategy-optimizer worker processes may use. Trader processes run none.
+OPTIMIZER_CPU_SHARE = 0.50
 # ─────────────────────────────────────────────────────────────────────────────
 
 
@@ -66,6 +71,10 @@ class ResourcePlan:
     Concurrency maxes are derived from monitor_slots:
       pair_max = floor(sqrt(monitor_slots)) - 1
       bot_max  = floor(monitor_slots / (1 + pair_max))
+
+    Optimizer worker processes are capped from the CPU count:
+      optimizer_workers_max = floor((cpus - 1) * OPTIMIZER_CPU_SHARE), min 1
+      (0 in the trader role — sweeps never run there)
     """
 
     __slots__ = (
@@ -75,6 +84,7 @@ class ResourcePlan:
         'write_pool_size', 'write_pool_overflow',
         'read_pool_size', 'read_pool_overflow',
         'bot_concurrency_max', 'pair_concurrency_max',
+        'optimizer_workers_max',
     )
 
     def __init__(self) -> None:
@@ -127,14 +137,21 @@ class ResourcePlan:
                 self.pair_concurrency_max = min(self.pair_concurrency_max, TRADER_PAIR_CONCURRENCY_CAP)
                 self.bot_concurrency_max = min(self.bot_concurrency_max, TRADER_BOT_CONCURRENCY_CAP)
 
+        if role == 'trader':
+            self.optimizer_workers_max = 0
+        else:
+            cpus = os.cpu_count() or 1
+            self.optimizer_workers_max = max(1, math.floor((cpus - 1) * OPTIMIZER_CPU_SHARE))
+
         logger.info(
             'ResourcePlan(%s): pg_max=%d usable=%d | '
             'write_pool=%d+%d  read_pool=%d+%d | '
-            'monitor_slots=%d (bot_max=%d pair_max=%d)  api_slots=%d',
+            'monitor_slots=%d (bot_max=%d pair_max=%d)  api_slots=%d | optimizer_workers=%d',
             role, pg_max, usable,
             self.write_pool_size, self.write_pool_overflow,
             self.read_pool_size, self.read_pool_overflow,
             monitor, self.bot_concurrency_max, self.pair_concurrency_max, api,
+            self.optimizer_workers_max,
         )
 
 
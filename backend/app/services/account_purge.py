@@ -22,6 +22,7 @@ from app.models import (
     Bot, Position, Trade, Signal, PendingOrder, OrderHistory, AIOpinionLog,
 )
 from app.models.reporting import AccountValueSnapshot
+from app.services.pnl_rollup_service import delete_account_rollups
 
 logger = logging.getLogger(__name__)
 
@@ -76,6 +77,8 @@ async def purge_account_history(db: AsyncSession, account_id: int) -> Dict[str,
     await db.execute(delete(AccountValueSnapshot).where(
         AccountValueSnapshot.account_id == account_id))
     await db.execute(delete(Position).where(Position.account_id == account_id))
+    # Derived from the positions just deleted (not counted — not history).
+    await delete_account_rollups(db, account_id)
     # Zero the bots' reserved balances — their positions are gone, so any lingering
     # reservation would make the bot think capital is still deployed and refuse to
     # open new positions until restarted.
@@ -22,6 +22,7 @@ from datetime import timedelta
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.json_response import utc_isoformat
 from app.models import Account, User
 from app.models.sharing import AccountInvitation, AccountMembership, AccountMembershipEvent
 
@@ -135,7 +136,7 @@ async def preview_invitation(
         "account_name": account.get_display_name() if account else "Unknown Account",
         "invited_by": (inviter.display_name or inviter.email) if inviter else "Unknown",
         "role": invitation.role,
-        "expires_at": invitation.expires_at.isoformat(),
+        "expires_at": utc_isoformat(invitation.expires_at),
     }
 
 
@@ -276,8 +277,8 @@ async def list_members(
             "email": email_field,
             "display_name": user.display_name if user else None,
             "role": m.role,
-            "joined_at": m.joined_at.isoformat(),
-            "expires_at": m.expires_at.isoformat() if m.expires_at else None,
+            "joined_at": utc_isoformat(m.joined_at),
+            "expires_at": utc_isoformat(m.expires_at) if m.expires_at else None,
             "invited_by": invited_by,
         })
     return members
@@ -394,8 +395,8 @@ async def list_pending_invitations_for_account(
             "id": inv.id,
             "invited_email": inv.invited_email,
             "role": inv.role,
-            "expires_at": inv.expires_at.isoformat(),
-            "created_at": inv.created_at.isoformat(),
+            "expires_at": utc_isoformat(inv.expires_at),
+            "created_at": utc_isoformat(inv.created_at),
         }
         for inv in result.scalars().all()
     ]
@@ -427,7 +428,7 @@ async def list_pending_invitations_for_user(
             "account_name": account.get_display_name() if account else "Unknown Account",
             "invited_by": (inviter.display_name or inviter.email) if inviter else "Unknown",
             "role": inv.role,
-            "expires_at": inv.expires_at.isoformat(),
+            "expires_at": utc_isoformat(inv.expires_at),
         })
     return output
 
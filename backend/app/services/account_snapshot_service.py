@@ -6,6 +6,7 @@ Runs once per day via scheduled task.
 """
 
 import asyncio
+import json
 from app.utils.timeutil import utcnow
 import logging
 from datetime import timedelta
@@ -14,18 +15,34 @@ from typing import Any, Dict, List, Optional
 from sqlalchemy import String, and_, case, cast, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.exchange_clients.paper_trading_client import valuation_prices_ctx
+from app.json_response import utc_isoformat
 from app.models import Account, AccountTransfer, AccountValueSnapshot, Position
 from app.services.exchange_service import get_exchange_client_for_account
 
 logger = logging.getLogger(__name__)
 
+# Accounts valued at once by run_account_snapshot_once (each holds an exchange client)
+SNAPSHOT_MAX_CONCURRENT_ACCOUNTS = 4
 
-async def _fetch_position_prices(client, positions: List) -> Dict[str, float]:
-    """Fetch prices for unique product_ids in parallel using asyncio.gather."""
+_SNAPSHOT_QUOTE_CURRENCIES = {"BTC", "USD", "USDC", "USDT"}
+
+
+async def _fetch_position_prices(
+    client, positions: List, prices: Optional[Dict[str, float]] = None,
+) -> Dict[str, float]:
+    """Prices for the positions' unique product_ids.
+
+    Products found in ``prices`` (the shared map of a snapshot run) are taken
+    from it; the rest are fetched in parallel using asyncio.gather.
+    """
     unique_products = list({p.product_id for p in positions})
     if not unique_products:
         return {}
 
+    shared = prices or {}
+    price_map = {pid: shared[pid] for pid in unique_products if shared.get(pid)}
+
     async def _get_price(product_id: str):
         try:
             price = await client.get_current_price(product_id)
@@ -33,50 +50,100 @@ async def _fetch_position_prices(client, positions: List) -> Dict[str, float]:
         except Exception:
             return (product_id, None)
 
-    results = await asyncio.gather(*[_get_price(pid) for pid in unique_products])
-    return {pid: price for pid, price in results if price is not None}
+    missing = [pid for pid in unique_products if pid not in price_map]
+    results = await asyncio.gather(*[_get_price(pid) for pid in missing])
+    price_map.update({pid: price for pid, price in results if price is not None})
+    return price_map
 
 
-async def capture_account_snapshot(db: AsyncSession, account: Account, session_maker=None) -> bool:
+async def _fetch_btc_usd_price(client, account_id: int, prices: Optional[Dict[str, float]] = None) -> Optional[float]:
+    if prices and prices.get("BTC-USD"):
+        return prices["BTC-USD"]
+    try:
+        return await client.get_current_price("BTC-USD")
+    except Exception:
+        logger.debug(
+            "Snapshot: BTC price fetch failed for account %s; proceeding without it",
+            account_id, exc_info=True,
+        )
+        return None
+
+
+def _unrealized_pnl(open_positions: List, price_map: Dict[str, float]) -> tuple[float, float]:
+    """(USD, BTC) unrealized P&L of open positions priced from ``price_map``."""
+    unrealized_pnl_usd = 0.0
+    unrealized_pnl_btc = 0.0
+    for pos in open_positions:
+        if pos.total_base_acquired and pos.total_base_acquired > 0:
+            price = price_map.get(pos.product_id)
+            if price:
+                pos_unrealized = (
+                    pos.total_base_acquired * price
+                    - (pos.total_quote_spent or 0)
+                )
+                quote = pos.get_quote_currency()
+                if quote in ("USD", "USDC", "USDT"):
+                    unrealized_pnl_usd += pos_unrealized
+                elif quote == "BTC":
+                    unrealized_pnl_btc += pos_unrealized
+    return unrealized_pnl_usd, unrealized_pnl_btc
+
+
+async def _load_open_positions(db: AsyncSession, account_id: int) -> List:
+    pos_result = await db.execute(
+        select(Position).where(
+            Position.account_id == account_id,
+            Position.status == "open"
+        )
+    )
+    return pos_result.scalars().all()
+
+
+async def value_account(
+    db: AsyncSession,
+    account: Account,
+    session_maker=None,
+    prices: Optional[Dict[str, float]] = None,
+    open_positions: Optional[List] = None,
+) -> Optional[Dict[str, Any]]:
     """
-    Capture a single account value snapshot.
+    Value one account for its daily snapshot, without writing anything.
 
     Args:
         db: Database session
-        account: Account to snapshot
+        account: Account to value
+        prices: Shared product_id -> price map; products missing from it are
+            fetched from the account's exchange client
+        open_positions: The account's open positions, when already loaded
 
     Returns:
-        True if snapshot captured successfully
+        AccountValueSnapshot column values, or None if the account can't be valued
     """
-    try:
-        # Use the same portfolio calculation that the header/dashboard uses
-        from app.services.portfolio_service import get_cex_portfolio, get_dex_portfolio
-        from app.services.exchange_service import get_coinbase_for_account
-
-        usd_portion_usd = None
-        btc_portion_btc = None
-        unrealized_pnl_usd = 0.0
-        unrealized_pnl_btc = 0.0
-        btc_usd_price = None
-
-        if account.is_paper_trading:
-            # Paper trading - use exchange client directly
-            client = await get_exchange_client_for_account(db, account.id, session_maker=session_maker)
-            if not client:
-                logger.error(f"Failed to get exchange client for account {account.id}")
-                return False
-
+    # Use the same portfolio calculation that the header/dashboard uses
+    from app.services.portfolio_service import get_cex_portfolio, get_dex_portfolio
+    from app.services.exchange_service import get_coinbase_for_account
+
+    usd_portion_usd = None
+    btc_portion_btc = None
+    unrealized_pnl_usd = 0.0
+    unrealized_pnl_btc = 0.0
+    btc_usd_price = None
+
+    if account.is_paper_trading:
+        # Paper trading - use exchange client directly
+        client = await get_exchange_client_for_account(db, account.id, session_maker=session_maker)
+        if not client:
+            logger.error(f"Failed to get exchange client for account {account.id}")
+            return None
+
+        # The paper client prices balances from the shared map first
+        token = valuation_prices_ctx.set(prices)
+        try:
             total_btc = await client.calculate_aggregate_btc_value()
             total_usd = await client.calculate_aggregate_usd_value()
 
             # Fetch BTC price for snapshot
-            try:
-                btc_usd_price = await client.get_current_price("BTC-USD")
-            except Exception:
-                logger.debug(
-                    "Snapshot: BTC price fetch failed for account %s; proceeding without it",
-                    account.id, exc_info=True,
-                )
+            btc_usd_price = await _fetch_btc_usd_price(client, account.id, prices)
 
             # Compute quote-currency deployment portions.
             # Use calculate_market_budget (free balance + open position
@@ -85,138 +152,129 @@ async def capture_account_snapshot(db: AsyncSession, account: Account, session_m
             # free BTC balance.
             btc_portion_btc = await client.calculate_market_budget("BTC")
             usd_portion_usd = await client.calculate_market_budget("USD")
+        finally:
+            valuation_prices_ctx.reset(token)
 
-            # Compute unrealized PnL from open positions
-            pos_result = await db.execute(
-                select(Position).where(
-                    Position.account_id == account.id,
-                    Position.status == "open"
-                )
-            )
-            open_positions = pos_result.scalars().all()
+        # Compute unrealized PnL from open positions
+        if open_positions is None:
+            open_positions = await _load_open_positions(db, account.id)
+
+        # Parallel price fetch: dedupe product_ids, gather all at once
+        price_map = await _fetch_position_prices(
+            client, [p for p in open_positions if p.total_base_acquired and p.total_base_acquired > 0], prices,
+        )
+        unrealized_pnl_usd, unrealized_pnl_btc = _unrealized_pnl(open_positions, price_map)
+
+        portfolio = {
+            "total_btc_value": total_btc,
+            "total_usd_value": total_usd
+        }
+    elif account.type == "cex":
+        portfolio = await get_cex_portfolio(account, db, get_coinbase_for_account)
+
+        # Extract portions from balance breakdown
+        breakdown = portfolio.get("balance_breakdown", {})
+        usd_portion_usd = (
+            breakdown.get("usd", {}).get("total", 0.0)
+            + breakdown.get("usdc", {}).get("total", 0.0)
+        )
+        btc_portion_btc = breakdown.get("btc", {}).get("total", 0.0)
+
+        # Compute unrealized PnL from open positions
+        if open_positions is None:
+            open_positions = await _load_open_positions(db, account.id)
+        cb_client = await get_exchange_client_for_account(db, account.id, session_maker=session_maker)
 
-            # Parallel price fetch: dedupe product_ids, gather all at once
+        # Parallel price fetch: dedupe product_ids, gather all at once
+        if cb_client:
             price_map = await _fetch_position_prices(
-                client, [p for p in open_positions if p.total_base_acquired and p.total_base_acquired > 0]
+                cb_client, [p for p in open_positions if p.total_base_acquired and p.total_base_acquired > 0], prices,
             )
-            for pos in open_positions:
-                if pos.total_base_acquired and pos.total_base_acquired > 0:
-                    price = price_map.get(pos.product_id)
-                    if price:
-                        current_value = pos.total_base_acquired * price
-                        pos_unrealized = current_value - (pos.total_quote_spent or 0)
-                        quote = pos.get_quote_currency()
-                        if quote in ("USD", "USDC", "USDT"):
-                            unrealized_pnl_usd += pos_unrealized
-                        elif quote == "BTC":
-                            unrealized_pnl_btc += pos_unrealized
-
-            portfolio = {
-                "total_btc_value": total_btc,
-                "total_usd_value": total_usd
-            }
-        elif account.type == "cex":
-            portfolio = await get_cex_portfolio(account, db, get_coinbase_for_account)
-
-            # Extract portions from balance breakdown
-            breakdown = portfolio.get("balance_breakdown", {})
-            usd_portion_usd = (
-                breakdown.get("usd", {}).get("total", 0.0)
-                + breakdown.get("usdc", {}).get("total", 0.0)
-            )
-            btc_portion_btc = breakdown.get("btc", {}).get("total", 0.0)
+        else:
+            price_map = {}
+        unrealized_pnl_usd, unrealized_pnl_btc = _unrealized_pnl(open_positions, price_map)
+
+        # Fetch BTC price
+        if cb_client:
+            btc_usd_price = await _fetch_btc_usd_price(cb_client, account.id, prices)
+    elif account.type == "dex":
+        portfolio = await get_dex_portfolio(account, db, get_coinbase_for_account)
+        # DEX: portions not applicable
+    else:
+        logger.error(f"Unknown account type: {account.type}")
+        return None
 
-            # Compute unrealized PnL from open positions
-            pos_result = await db.execute(
-                select(Position).where(
-                    Position.account_id == account.id,
-                    Position.status == "open"
-                )
-            )
-            cb_client = await get_exchange_client_for_account(db, account.id, session_maker=session_maker)
-            open_positions = pos_result.scalars().all()
+    return {
+        "account_id": account.id,
+        "user_id": account.user_id,
+        "total_value_btc": portfolio.get("total_btc_value", 0.0),
+        "total_value_usd": portfolio.get("total_usd_value", 0.0),
+        "usd_portion_usd": usd_portion_usd,
+        "btc_portion_btc": btc_portion_btc,
+        "unrealized_pnl_usd": unrealized_pnl_usd,
+        "unrealized_pnl_btc": unrealized_pnl_btc,
+        "btc_usd_price": btc_usd_price,
+    }
 
-            # Parallel price fetch: dedupe product_ids, gather all at once
-            if cb_client:
-                price_map = await _fetch_position_prices(
-                    cb_client, [p for p in open_positions if p.total_base_acquired and p.total_base_acquired > 0]
-                )
-            else:
-                price_map = {}
-
-            for pos in open_positions:
-                if pos.total_base_acquired and pos.total_base_acquired > 0:
-                    price = price_map.get(pos.product_id)
-                    if price:
-                        pos_unrealized = (
-                            pos.total_base_acquired * price
-                            - (pos.total_quote_spent or 0)
-                        )
-                        quote = pos.get_quote_currency()
-                        if quote in ("USD", "USDC", "USDT"):
-                            unrealized_pnl_usd += pos_unrealized
-                        elif quote == "BTC":
-                            unrealized_pnl_btc += pos_unrealized
-
-            # Fetch BTC price
-            if cb_client:
-                try:
-                    btc_usd_price = await cb_client.get_current_price("BTC-USD")
-                except Exception:
-                    logger.debug(
-                        "Snapshot: BTC price fetch failed for account %s; proceeding without it",
-                        account.id, exc_info=True,
-                    )
-        elif account.type == "dex":
-            portfolio = await get_dex_portfolio(account, db, get_coinbase_for_account)
-            # DEX: portions not applicable
-        else:
-            logger.error(f"Unknown account type: {account.type}")
-            return False
 
-        # Extract totals from portfolio
-        total_btc = portfolio.get("total_btc_value", 0.0)
-        total_usd = portfolio.get("total_usd_value", 0.0)
+async def write_account_snapshots(db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """
+    Upsert today's snapshot for every row from ``value_account`` (caller commits).
 
-        # Create snapshot with today's date (00:00:00)
-        snapshot_date = utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    Existing same-day snapshots are read in one query and updated; the rest
+    are added together so the session flushes them as one bulk insert.
+    """
+    if not rows:
+        return
 
-        # Check if snapshot already exists for today
-        result = await db.execute(
-            select(AccountValueSnapshot).where(
-                AccountValueSnapshot.account_id == account.id,
-                AccountValueSnapshot.snapshot_date == snapshot_date
-            )
+    # Create snapshot with today's date (00:00:00)
+    snapshot_date = utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    # Check which accounts already have a snapshot for today
+    result = await db.execute(
+        select(AccountValueSnapshot).where(
+            AccountValueSnapshot.account_id.in_([row["account_id"] for row in rows]),
+            AccountValueSnapshot.snapshot_date == snapshot_date
         )
-        existing = result.scalar_one_or_none()
+    )
+    existing_by_account = {snap.account_id: snap for snap in result.scalars().all()}
 
+    new_snapshots = []
+    for row in rows:
+        existing = existing_by_account.get(row["account_id"])
         if existing:
             # Update existing snapshot
-            existing.total_value_btc = total_btc
-            existing.total_value_usd = total_usd
-            existing.usd_portion_usd = usd_portion_usd
-            existing.btc_portion_btc = btc_portion_btc
-            existing.unrealized_pnl_usd = unrealized_pnl_usd
-            existing.unrealized_pnl_btc = unrealized_pnl_btc
-            existing.btc_usd_price = btc_usd_price
-            logger.info(f"Updated snapshot for account {account.id}: {total_btc:.8f} BTC / ${total_usd:.2f} USD")
+            for field, value in row.items():
+                if field not in ("account_id", "user_id"):
+                    setattr(existing, field, value)
+            action = "Updated"
         else:
             # Create new snapshot
-            snapshot = AccountValueSnapshot(
-                account_id=account.id,
-                user_id=account.user_id,
-                snapshot_date=snapshot_date,
-                total_value_btc=total_btc,
-                total_value_usd=total_usd,
-                usd_portion_usd=usd_portion_usd,
-                btc_portion_btc=btc_portion_btc,
-                unrealized_pnl_usd=unrealized_pnl_usd,
-                unrealized_pnl_btc=unrealized_pnl_btc,
-                btc_usd_price=btc_usd_price,
-            )
-            db.add(snapshot)
-            logger.info(f"Created snapshot for account {account.id}: {total_btc:.8f} BTC / ${total_usd:.2f} USD")
+            new_snapshots.append(AccountValueSnapshot(snapshot_date=snapshot_date, **row))
+            action = "Created"
+        logger.info(
+            f"{action} snapshot for account {row['account_id']}: "
+            f"{row['total_value_btc']:.8f} BTC / ${row['total_value_usd']:.2f} USD"
+        )
+    db.add_all(new_snapshots)
+
+
+async def capture_account_snapshot(db: AsyncSession, account: Account, session_maker=None) -> bool:
+    """
+    Capture a single account value snapshot.
+
+    Args:
+        db: Database session
+        account: Account to snapshot
 
+    Returns:
+        True if snapshot captured successfully
+    """
+    try:
+        row = await value_account(db, account, session_maker=session_maker)
+        if row is None:
+            return False
+        await write_account_snapshots(db, [row])
         await db.commit()
         return True
 
@@ -348,7 +406,7 @@ async def get_account_value_history(
     for row in result:
         snapshots.append({
             "date": row.snapshot_date.strftime("%Y-%m-%d"),
-            "timestamp": row.snapshot_date.isoformat(),
+            "timestamp": utc_isoformat(row.snapshot_date),
             "total_value_btc": float(row.total_btc),
             "total_value_usd": float(row.total_usd),
             "usd_portion_usd": float(row.usd_portion) if row.usd_portion is not None else None,
@@ -398,7 +456,7 @@ async def get_latest_snapshot(db: AsyncSession, user_id: int, include_paper_trad
 
     return {
         "date": row.snapshot_date.strftime("%Y-%m-%d"),
-        "timestamp": row.snapshot_date.isoformat(),
+        "timestamp": utc_isoformat(row.snapshot_date),
         "total_value_btc": float(row.total_btc),
         "total_value_usd": float(row.total_usd)
     }
@@ -545,8 +603,40 @@ async def get_daily_activity(
     return result
 
 
+def _snapshot_products(accounts: List[Account], open_positions: List) -> List[str]:
+    """Every product a snapshot run prices: open positions, paper holdings and BTC-USD."""
+    products = {"BTC-USD"}
+    products.update(
+        p.product_id for p in open_positions if p.total_base_acquired and p.total_base_acquired > 0
+    )
+    for account in accounts:
+        if not (account.is_paper_trading and account.paper_balances):
+            continue
+        try:
+            balances = json.loads(account.paper_balances)
+        except (TypeError, ValueError):
+            continue
+        for currency, amount in balances.items():
+            if currency not in _SNAPSHOT_QUOTE_CURRENCIES and amount:
+                products.update((f"{currency}-USD", f"{currency}-BTC"))
+    return sorted(products)
+
+
+async def build_snapshot_price_map(product_ids: List[str]) -> Dict[str, float]:
+    """One bulk price fetch for a snapshot run; products it misses are left to each account's client."""
+    from app.coinbase_api.public_market_data import bulk_prices_for_products
+
+    # A fresh product list: the hourly cached copy is too stale for a daily valuation
+    return await bulk_prices_for_products(product_ids, bypass_cache=True)
+
+
 async def run_account_snapshot_once(session_maker=None):
-    """Capture daily account value snapshots for all active users. Called by APScheduler."""
+    """Capture daily account value snapshots for all active users. Called by APScheduler.
+
+    One pass for all users: every product held or in an open position is
+    priced once, accounts are valued concurrently (SNAPSHOT_MAX_CONCURRENT_ACCOUNTS
+    at a time, each in its own session) and the snapshots are written together.
+    """
     from sqlalchemy import select
     from app.database import async_session_maker as _default_sm
     from app.models import User
@@ -554,21 +644,64 @@ async def run_account_snapshot_once(session_maker=None):
     sm = session_maker or _default_sm
     try:
         async with sm() as db:
-            result = await db.execute(select(User).where(User.is_active.is_(True)))
-            users = result.scalars().all()
+            result = await db.execute(
+                select(Account)
+                .join(User, User.id == Account.user_id)
+                .where(User.is_active.is_(True), Account.is_active.is_(True))
+            )
+            accounts = result.scalars().all()
+            if not accounts:
+                return
+            pos_result = await db.execute(
+                select(Position).where(
+                    Position.account_id.in_([a.id for a in accounts]),
+                    Position.status == "open",
+                )
+            )
+            open_positions = pos_result.scalars().all()
+
+        positions_by_account: Dict[int, List] = {}
+        for pos in open_positions:
+            positions_by_account.setdefault(pos.account_id, []).append(pos)
 
-            for user in users:
+        prices = await build_snapshot_price_map(_snapshot_products(accounts, open_positions))
+        semaphore = asyncio.Semaphore(SNAPSHOT_MAX_CONCURRENT_ACCOUNTS)
+
+        async def _value(account_id: int) -> Optional[Dict[str, Any]]:
+            async with semaphore:
                 try:
-                    logger.info(f"Capturing account snapshots for user {user.id}")
-                    res = await capture_all_account_snapshots(db, user.id, session_maker=sm)
-                    logger.info(
-                        f"User {user.id}: {res['success_count']}/"
-                        f"{res['total_accounts']} snapshots captured"
-                    )
-                    if res['errors']:
-                        for error in res['errors']:
-                            logger.warning(f"Snapshot error: {error}")
+                    async with sm() as db:
+                        account = await db.get(Account, account_id)
+                        return await value_account(
+                            db, account, session_maker=sm, prices=prices,
+                            open_positions=positions_by_account.get(account_id, []),
+                        )
                 except Exception as e:
-                    logger.error(f"Failed to capture snapshots for user {user.id}: {e}")
+                    logger.error(f"Failed to capture snapshot for account {account_id}: {e}")
+                    return None
+
+        values = await asyncio.gather(*(_value(a.id) for a in accounts))
+        rows = [row for row in values if row is not None]
+
+        async with sm() as db:
+            await write_account_snapshots(db, rows)
+            await db.commit()
+
+            # After all account snapshots, capture goal progress snapshots
+            from app.services.goal_snapshot_service import capture_goal_snapshots
+            for user_id in sorted({row["user_id"] for row in rows}):
+                try:
+                    goal_count = await capture_goal_snapshots(db, user_id)
+                    if goal_count > 0:
+                        await db.commit()
+                        logger.info(f"Captured {goal_count} goal progress snapshots for user {user_id}")
+                except Exception as e:
+                    logger.error(f"Failed to capture goal snapshots for user {user_id}: {e}")
+                    await db.rollback()
+
+        logger.info(
+            f"Account snapshots: {len(rows)}/{len(accounts)} captured "
+            f"({len(prices)} shared prices)"
+        )
     except Exception as e:
         logger.error(f"Error in account snapshot capture: {e}")
@@ -18,6 +18,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.cache import api_cache
+from app.json_response import utc_isoformat
 from app.models import Account, AccountValueSnapshot, User
 from app.services.account_access import accessible_accounts_filter
 from app.services.account_service import get_portfolio_for_account
@@ -76,7 +77,7 @@ async def get_account_value_summary(
                 "total_usd_value": float(snapshot.total_value_usd or 0.0),
                 "total_btc_value": float(snapshot.total_value_btc or 0.0),
                 "btc_usd_price": float(snapshot.btc_usd_price or 0.0),
-                "as_of": snapshot.snapshot_date.isoformat(),
+                "as_of": utc_isoformat(snapshot.snapshot_date),
                 "is_stale": True,
                 "is_refreshing": is_refreshing,
             }
@@ -97,7 +98,7 @@ async def get_account_value_summary(
             "total_usd_value": float(portfolio.get("total_usd_value", 0.0) or 0.0),
             "total_btc_value": float(portfolio.get("total_btc_value", 0.0) or 0.0),
             "btc_usd_price": float(portfolio.get("btc_usd_price", 0.0) or 0.0),
-            "as_of": utcnow().isoformat(),
+            "as_of": utc_isoformat(utcnow()),
             "is_stale": False,
             "is_refreshing": False,
         }
@@ -109,7 +110,7 @@ async def get_account_value_summary(
             "total_usd_value": float(portfolio.get("total_usd_value", 0.0) or 0.0),
             "total_btc_value": float(portfolio.get("total_btc_value", 0.0) or 0.0),
             "btc_usd_price": float(portfolio.get("btc_usd_price", 0.0) or 0.0),
-            "as_of": utcnow().isoformat(),
+            "as_of": utc_isoformat(utcnow()),
             "is_stale": False,
             "is_refreshing": False,
         }
@@ -163,7 +164,7 @@ async def _build_live_paper_account_value_summary(account: Account) -> Dict[str,
         "total_usd_value": valuation["total_usd_value"],
         "total_btc_value": valuation["total_btc_value"],
         "btc_usd_price": valuation["btc_usd_price"],
-        "as_of": utcnow().isoformat(),
+        "as_of": utc_isoformat(utcnow()),
         "is_stale": False,
         "is_refreshing": False,
     }
@@ -0,0 +1,402 @@
+"""
+Candle Archive Service
+
+Persistent local OHLCV history, so candle consumers stop re-fetching the same
+closed candles from the exchange ~300 at a time.
+
+Each (source, product, granularity) series is an append-only binary file of
+fixed-width records (int64 start + five float64 OHLCV columns, 48 bytes) in
+start order, plus a small JSON sidecar listing the time ranges already fetched
+from the exchange. The start column doubles as the time index: reads
+memory-map the file and binary-search it, so any time range is served without
+loading the series. Ranges the sidecar does not cover are backfilled in paged
+exchange requests before the read. Only pages that returned candles are marked
+covered: an empty answer may be an exchange hiccup rather than a quiet pair, so
+it is only skipped for EMPTY_RANGE_TTL_SECONDS (in memory) and then asked for
+again. A gap's pages are merged into the file in one write, so backfilling
+history in front of existing data rewrites it once, not once per page.
+
+Only settled candles are archived. The still-forming candle and the one that
+just closed (the exchange may still revise it) are fetched live, in the same
+request as any tail backfill, and returned alongside archived data. File
+reads and writes run in a worker thread, off the event loop.
+
+The web and trader processes share the files, so every write holds an
+exclusive fcntl lock on the series' .lock file (reads a shared one) and
+re-reads the coverage sidecar under it before merging.
+
+Files live under backend/candle_archive/<source>/<product>/<granularity>.ohlcv.
+"""
+
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.utils.candle_utils import SYNTHETIC_TIMEFRAMES, TIMEFRAME_MAP
+
+logger = logging.getLogger(__name__)
+
+# Filesystem storage directory (relative to backend/)
+CANDLE_ARCHIVE_DIR = Path(__file__).parent.parent.parent / "candle_archive"
+
+# Candles per backfill request (Coinbase caps candle responses at 350).
+BACKFILL_PAGE_CANDLES = 300
+
+# How long a page the exchange answered empty is not asked for again
+# (pre-listing history, delisted pairs, or a transient exchange hiccup).
+EMPTY_RANGE_TTL_SECONDS = 3600
+
+RECORD_DTYPE = np.dtype([
+    ("start", "<i8"), ("open", "<f8"), ("high", "<f8"),
+    ("low", "<f8"), ("close", "<f8"), ("volume", "<f8"),
+])
+
+# Exchange client class -> archive namespace. Clients not listed (DEX, MT5,
+# test doubles) bypass the archive, since their product IDs and candles may
+# not match another source's series.
+_CANDLE_SOURCES = {
+    "CoinbaseClient": "coinbase",
+    "CoinbaseAdapter": "coinbase",
+    "PublicMarketDataClient": "coinbase",
+    "PaperTradingClient": "coinbase",  # public Coinbase data when no real client
+    "ByBitAdapter": "bybit",
+}
+
+_SAFE_NAME = re.compile(r"^[A-Za-z0-9._-]+$")
+
+FetchCandles = Callable[..., Awaitable[List[Dict[str, Any]]]]
+Range = Tuple[int, int]
+
+
+def candle_source(client: Any) -> Optional[str]:
+    """Archive namespace for an exchange client's candles, or None to bypass the archive."""
+    name = type(client).__name__
+    if name == "PaperTradingClient" and client.real_client is not None:
+        return candle_source(client.real_client)  # paper trading proxies a real exchange
+    if name == "PropGuardClient":
+        return candle_source(client._inner)
+    return _CANDLE_SOURCES.get(name)
+
+
+def _candle_start(candle: Dict[str, Any]) -> int:
+    return int(float(candle.get("start", candle.get("time", 0))))
+
+
+def _dedupe(records: np.ndarray) -> np.ndarray:
+    """Sort records by start, keeping the last occurrence of each start."""
+    if len(records) < 2:
+        return records
+    # Reverse so np.unique's first occurrence is the last one written.
+    _, first = np.unique(records["start"][::-1], return_index=True)
+    return records[::-1][first]
+
+
+def _to_records(candles: List[Dict[str, Any]]) -> np.ndarray:
+    """Exchange candle dicts (string or float fields, any order) -> sorted records."""
+    return _dedupe(np.array(
+        [
+            (_candle_start(c), float(c["open"]), float(c["high"]),
+             float(c["low"]), float(c["close"]), float(c["volume"]))
+            for c in candles
+        ],
+        dtype=RECORD_DTYPE,
+    ))
+
+
+def _to_dicts(records: np.ndarray) -> List[Dict[str, Any]]:
+    return [
+        {"start": start, "open": o, "high": h, "low": lo, "close": c, "volume": v}
+        for start, o, h, lo, c, v in records.tolist()
+    ]
+
+
+def _merge_ranges(ranges: List[Range]) -> List[Range]:
+    merged: List[Range] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _subtract_ranges(start: int, end: int, covered: List[Range]) -> List[Range]:
+    """Parts of [start, end) not in the (merged, sorted) covered ranges."""
+    missing = []
+    cursor = start
+    for c_start, c_end in covered:
+        if c_end <= cursor:
+            continue
+        if c_start >= end:
+            break
+        if c_start > cursor:
+            missing.append((cursor, c_start))
+        cursor = max(cursor, c_end)
+    if cursor < end:
+        missing.append((cursor, end))
+    return missing
+
+
+class CandleArchive:
+    """On-disk candle history per (source, product, granularity) with gap-aware backfill."""
+
+    def __init__(
+        self, root: Path = CANDLE_ARCHIVE_DIR, page_candles: int = BACKFILL_PAGE_CANDLES,
+        empty_ttl: float = EMPTY_RANGE_TTL_SECONDS,
+    ):
+        self.root = Path(root)
+        self.page_candles = page_candles
+        self.empty_ttl = empty_ttl
+        # key -> (coverage file mtime_ns, ranges); refreshed when another process rewrites it
+        self._coverage: Dict[Tuple[str, str, str], Tuple[int, List[Range]]] = {}
+        # key -> [(start, end, expires_at)] pages the exchange answered empty
+        self._empty: Dict[Tuple[str, str, str], List[Tuple[int, int, float]]] = {}
+        self._locks: Dict[Tuple[str, str, str], asyncio.Lock] = {}
+        self.backfill_requests = 0
+
+    # ------------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------------
+
+    def _paths(self, source: str, product_id: str, granularity: str) -> Tuple[Path, Path]:
+        for name in (source, product_id, granularity):
+            if not _SAFE_NAME.match(name):
+                raise ValueError(f"Invalid candle archive key component: {name!r}")
+        directory = self.root / source / product_id
+        return directory / f"{granularity}.ohlcv", directory / f"{granularity}.coverage.json"
+
+    @contextmanager
+    def _file_lock(self, data_path: Path, exclusive: bool) -> Iterator[None]:
+        """Hold an fcntl lock on the series' lock file (shared across processes)."""
+        with open(data_path.with_suffix(".lock"), "a+b") as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield  # closing the file releases the lock
+
+    @staticmethod
+    def _load_coverage(coverage_path: Path) -> Tuple[int, List[Range]]:
+        try:
+            mtime_ns = coverage_path.stat().st_mtime_ns
+            ranges = [tuple(r) for r in json.loads(coverage_path.read_text())["ranges"]]
+        except FileNotFoundError:
+            return 0, []
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Discarding unreadable candle coverage {coverage_path}: {e}")
+            return 0, []
+        return mtime_ns, _merge_ranges(ranges)
+
+    def coverage(self, source: str, product_id: str, granularity: str) -> List[Range]:
+        """Time ranges [start, end) already fetched from the exchange."""
+        key = (source, product_id, granularity)
+        _, coverage_path = self._paths(*key)
+        try:
+            mtime_ns = coverage_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime_ns = 0
+        cached = self._coverage.get(key)
+        if cached is None or cached[0] != mtime_ns:
+            cached = self._coverage[key] = self._load_coverage(coverage_path)
+        return cached[1]
+
+    def read(self, source: str, product_id: str, granularity: str, start: int, end: int) -> List[Dict[str, Any]]:
+        """Archived candles with start in [start, end), oldest first."""
+        data_path, _ = self._paths(source, product_id, granularity)
+        if not data_path.exists():
+            return []
+        with self._file_lock(data_path, exclusive=False):
+            n_records = data_path.stat().st_size // RECORD_DTYPE.itemsize
+            if n_records == 0:
+                return []
+            records = np.memmap(data_path, dtype=RECORD_DTYPE, mode="r", shape=(n_records,))
+            starts = records["start"]
+            lo = int(np.searchsorted(starts, start, side="left"))
+            hi = int(np.searchsorted(starts, end, side="left"))
+            return _to_dicts(np.array(records[lo:hi]))
+
+    def write(
+        self, source: str, product_id: str, granularity: str,
+        candles: List[Dict[str, Any]], start: int, end: int,
+    ) -> None:
+        """Store settled candles fetched for [start, end) and mark the range covered.
+
+        A fetch with no candles in the range stores nothing and leaves the
+        range uncovered, so it is fetched again."""
+        records = _to_records([c for c in candles if start <= _candle_start(c) < end])
+        if len(records):
+            self._store((source, product_id, granularity), records, [(start, end)])
+
+    def _store(self, key: Tuple[str, str, str], records: np.ndarray, ranges: List[Range]) -> None:
+        """Merge sorted records into the series file and mark ``ranges`` covered.
+
+        Records newer than the archive's last one are appended; older or
+        overlapping ones (backfill behind the archive) rewrite the file once."""
+        data_path, coverage_path = self._paths(*key)
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._file_lock(data_path, exclusive=True):
+            self._merge_into_files(data_path, coverage_path, key, records, ranges)
+
+    def _merge_into_files(
+        self, data_path: Path, coverage_path: Path, key: Tuple[str, str, str],
+        records: np.ndarray, ranges: List[Range],
+    ) -> None:
+        if len(records):
+            size = data_path.stat().st_size if data_path.exists() else 0
+            usable = size - size % RECORD_DTYPE.itemsize  # drop a torn record from an interrupted append
+            last_start = None
+            if usable:
+                with open(data_path, "rb") as f:
+                    f.seek(usable - RECORD_DTYPE.itemsize)
+                    last_start = int(np.frombuffer(f.read(RECORD_DTYPE.itemsize), dtype=RECORD_DTYPE)["start"][0])
+            if last_start is None or records["start"][0] > last_start:
+                with open(data_path, "r+b" if size else "wb") as f:
+                    f.truncate(usable)
+                    f.seek(usable)
+                    f.write(records.tobytes())
+            else:
+                existing = np.fromfile(data_path, dtype=RECORD_DTYPE, count=usable // RECORD_DTYPE.itemsize)
+                merged = _dedupe(np.concatenate([existing, records]))
+                tmp_path = data_path.with_suffix(".ohlcv.tmp")
+                merged.tofile(tmp_path)
+                os.replace(tmp_path, data_path)
+
+        # Re-read under the lock: another process may have added ranges since
+        # this one cached the sidecar.
+        _, on_disk = self._load_coverage(coverage_path)
+        merged_ranges = _merge_ranges(on_disk + list(ranges))
+        tmp_path = coverage_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps({"ranges": [list(r) for r in merged_ranges]}))
+        os.replace(tmp_path, coverage_path)
+        self._coverage[key] = (coverage_path.stat().st_mtime_ns, merged_ranges)
+
+    def _recent_empty_ranges(self, key: Tuple[str, str, str], now: float) -> List[Range]:
+        """Pages answered empty less than ``empty_ttl`` ago; drops expired ones."""
+        live = [entry for entry in self._empty.get(key, []) if entry[2] > now]
+        if live:
+            self._empty[key] = live
+        else:
+            self._empty.pop(key, None)
+        return [(start, end) for start, end, _ in live]
+
+    # ------------------------------------------------------------------
+    # Read-through
+    # ------------------------------------------------------------------
+
+    async def get_candles(
+        self,
+        fetch_candles: FetchCandles,
+        source: str,
+        product_id: str,
+        start: int,
+        end: int,
+        granularity: str,
+        include_forming: bool = True,
+        now: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Candles with start in [start, end], oldest first, served from the archive.
+
+        ``fetch_candles`` is an exchange client's get_candles; it is only
+        called for ranges the archive has not covered yet (in pages of
+        ``page_candles``) and for the just-closed candle plus, with
+        include_forming, the forming one. Only native granularities are
+        archived; aggregate synthetic ones from their base series.
+        """
+        if granularity in SYNTHETIC_TIMEFRAMES or granularity not in TIMEFRAME_MAP:
+            raise ValueError(f"Candle archive only stores native granularities, not {granularity}")
+        seconds = TIMEFRAME_MAP[granularity]
+        now = time.time() if now is None else now
+        forming_start = int(now) // seconds * seconds
+        settled_end = forming_start - seconds  # start of the just-closed candle
+        range_start = int(start) // seconds * seconds
+        range_end = min(int(end) // seconds * seconds + seconds, forming_start)
+        archive_end = min(range_end, settled_end)
+        live_start = max(range_start, settled_end)
+        want_forming = include_forming and int(end) >= forming_start
+        need_live = live_start < range_end or want_forming
+        live: Optional[List[Dict[str, Any]]] = None
+        step = self.page_candles * seconds
+
+        key = (source, product_id, granularity)
+        pages = 0
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            covered = await asyncio.to_thread(self.coverage, *key)
+            skipped = _merge_ranges(covered + self._recent_empty_ranges(key, now))
+            missing = _subtract_ranges(range_start, archive_end, skipped) if range_start < archive_end else []
+            for gap_start, gap_end in missing:
+                fetched: List[np.ndarray] = []
+                fetched_ranges: List[Range] = []
+                for page_start in range(gap_start, gap_end, step):
+                    page_end = min(page_start + step, gap_end)
+                    # The live candles ride along with a backfill page that ends at them.
+                    tail = need_live and page_end == settled_end
+                    pages += 1
+                    self.backfill_requests += 1
+                    candles = await fetch_candles(
+                        product_id=product_id, start=page_start, end=int(end) if tail else page_end,
+                        granularity=granularity,
+                    ) or []
+                    records = _to_records([c for c in candles if page_start <= _candle_start(c) < page_end])
+                    if len(records):
+                        fetched.append(records)
+                        fetched_ranges.append((page_start, page_end))
+                    else:
+                        self._empty.setdefault(key, []).append((page_start, page_end, now + self.empty_ttl))
+                    if tail:
+                        live = candles
+                if fetched_ranges:
+                    await asyncio.to_thread(self._store, key, np.concatenate(fetched), fetched_ranges)
+
+        candles = await asyncio.to_thread(self.read, source, product_id, granularity, int(start), archive_end)
+        if need_live and live is None:
+            live = await fetch_candles(
+                product_id=product_id, start=live_start if live_start < range_end else forming_start,
+                end=int(end), granularity=granularity,
+            ) or []
+        if live:
+            first_live = max(int(start), settled_end)
+            live = [
+                c for c in live
+                if first_live <= _candle_start(c) < range_end or (want_forming and _candle_start(c) >= forming_start)
+            ]
+            candles.extend(_to_dicts(_to_records(live)))
+        if pages:
+            logger.debug(
+                f"Candle archive backfilled {pages} page(s) for {source}:{product_id}:{granularity}"
+            )
+        return candles
+
+
+# Global instance
+candle_archive = CandleArchive()
+
+
+async def get_archived_candles(
+    client: Any,
+    product_id: str,
+    start: int,
+    end: int,
+    granularity: str,
+    include_forming: bool = True,
+) -> List[Dict[str, Any]]:
+    """Candles from ``client`` for [start, end], oldest first, read through the archive.
+
+    Falls back to a plain ``client.get_candles`` call (dict candles sorted
+    oldest-first) for clients without an archive namespace and for synthetic
+    granularities.
+    """
+    source = candle_source(client)
+    if source is not None and granularity in TIMEFRAME_MAP and granularity not in SYNTHETIC_TIMEFRAMES:
+        return await candle_archive.get_candles(
+            client.get_candles, source, product_id, start, end, granularity, include_forming=include_forming,
+        )
+    candles = await client.get_candles(product_id=product_id, start=start, end=end, granularity=granularity)
+    if candles and isinstance(candles[0], dict):
+        return sorted(candles, key=_candle_start)
+    return candles or []
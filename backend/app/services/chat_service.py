@@ -12,6 +12,7 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import aliased
 
+from app.json_response import utc_isoformat
 from app.models import User
 from app.models.social import (
     BlockedUser, ChatChannel, ChatChannelMember, ChatMessage,
@@ -116,8 +117,8 @@ async def _build_message_dict(
         "content": msg.content if msg.deleted_at is None else None,
         "media_url": msg.media_url if msg.deleted_at is None else None,
         "is_deleted": msg.deleted_at is not None,
-        "edited_at": msg.edited_at.isoformat() if msg.edited_at else None,
-        "created_at": msg.created_at.isoformat() if msg.created_at else None,
+        "edited_at": utc_isoformat(msg.edited_at) if msg.edited_at else None,
+        "created_at": utc_isoformat(msg.created_at) if msg.created_at else None,
         "is_pinned": bool(msg.is_pinned),
         "reply_to": None,
         "reactions": [],
@@ -449,7 +450,7 @@ async def get_user_channels(db: AsyncSession, user_id: int) -> list[dict]:
                 "sender_id": msg.sender_id,
                 "sender_name": sender.display_name,
                 "content": msg.content[:100] if msg.content else "",
-                "created_at": msg.created_at.isoformat() if msg.created_at else None,
+                "created_at": utc_isoformat(msg.created_at) if msg.created_at else None,
             }
 
     # Batch: unread counts — single query using LEFT JOIN with per-channel filter
@@ -485,7 +486,7 @@ async def get_user_channels(db: AsyncSession, user_id: int) -> list[dict]:
             "unread_count": unread_counts.get(channel.id, 0),
             "last_message": last_messages.get(channel.id),
             "my_role": membership.role,
-            "updated_at": channel.updated_at.isoformat() if channel.updated_at else None,
+            "updated_at": utc_isoformat(channel.updated_at) if channel.updated_at else None,
         })
 
     return channels
@@ -782,7 +783,7 @@ async def get_channel_members(db: AsyncSession, channel_id: int) -> list[dict]:
             "user_id": member.user_id,
             "display_name": user.display_name,
             "role": member.role,
-            "joined_at": member.joined_at.isoformat() if member.joined_at else None,
+            "joined_at": utc_isoformat(member.joined_at) if member.joined_at else None,
             "is_admin": bool(user.is_superuser),
         }
         for member, user in result.all()
@@ -15,6 +15,7 @@ from sqlalchemy import select
 
 from app.config import settings
 from app.database import async_session_maker as _default_session_maker, init_db
+from app.json_response import utc_isoformat
 from app.models import Account, BlacklistedCoin
 from app.coinbase_unified_client import CoinbaseClient
 from app.encryption import decrypt_value, is_encrypted
@@ -469,7 +470,7 @@ async def run_weekly_review(standalone: bool = False, session_maker=None) -> Dic
 
         return {
             "status": "success",
-            "timestamp": end_time.isoformat(),
+            "timestamp": utc_isoformat(end_time),
             "duration_seconds": duration,
             "coins_analyzed": len(analysis),
             "stats": stats,
@@ -482,7 +483,7 @@ async def run_weekly_review(standalone: bool = False, session_maker=None) -> Dic
         return {
             "status": "error",
             "message": str(e),
-            "timestamp": utcnow().isoformat(),
+            "timestamp": utc_isoformat(utcnow()),
         }
 
 
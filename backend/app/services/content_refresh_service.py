@@ -10,6 +10,7 @@ responses from the database.
 import logging
 from datetime import datetime
 
+from app.json_response import utc_isoformat
 from app.services.session_maker_mixin import SessionMakerMixin
 from app.utils.timeutil import utcnow
 
@@ -61,8 +62,8 @@ class ContentRefreshService(SessionMakerMixin):
     def status(self) -> dict:
         """Get current status of the refresh service."""
         return {
-            "last_news_refresh": self._last_news_refresh.isoformat() if self._last_news_refresh else None,
-            "last_video_refresh": self._last_video_refresh.isoformat() if self._last_video_refresh else None,
+            "last_news_refresh": utc_isoformat(self._last_news_refresh) if self._last_news_refresh else None,
+            "last_video_refresh": utc_isoformat(self._last_video_refresh) if self._last_video_refresh else None,
             "news_interval_minutes": NEWS_REFRESH_INTERVAL // 60,
             "video_interval_minutes": VIDEO_REFRESH_INTERVAL // 60,
         }
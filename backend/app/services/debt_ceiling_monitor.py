@@ -14,6 +14,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from app.json_response import utc_isoformat
 from app.news_data import DEBT_CEILING_HISTORY
 from app.services.coin_review_service import (
     _call_claude,
@@ -194,7 +195,7 @@ Respond in JSON format only:
     def status(self) -> dict:
         """Get current status of the monitor service."""
         return {
-            "last_check": self._last_check.isoformat() if self._last_check else None,
+            "last_check": utc_isoformat(self._last_check) if self._last_check else None,
             "last_result": self._last_result,
             "check_interval_days": CHECK_INTERVAL // (24 * 60 * 60),
             "current_ceiling_trillion": (
@@ -16,6 +16,7 @@ from typing import Dict, List, Set
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.json_response import utc_isoformat
 from app.models import Bot, BotProduct, Account
 from app.services.exchange_service import get_exchange_client_for_account
 from app.services.session_maker_mixin import SessionMakerMixin
@@ -447,7 +448,7 @@ class TradingPairMonitor(SessionMakerMixin):
             dict with summary of changes made
         """
         results = {
-            "checked_at": utcnow().isoformat(),
+            "checked_at": utc_isoformat(utcnow()),
             "bots_checked": 0,
             "pairs_removed": 0,
             "pairs_added": 0,
@@ -642,7 +643,7 @@ class TradingPairMonitor(SessionMakerMixin):
     def get_status(self) -> dict:
         """Get current status of the monitor."""
         return {
-            "last_check": self._last_check.isoformat() if self._last_check else None,
+            "last_check": utc_isoformat(self._last_check) if self._last_check else None,
             "available_products_count": len(self._available_products),
             "btc_pairs_count": len(self._btc_pairs),
             "usd_pairs_count": len(self._usd_pairs),
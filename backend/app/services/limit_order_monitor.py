@@ -21,6 +21,7 @@ from app.models import PendingOrder, Position, Trade
 from app.services.pnl_service import calculate_realized_spot_profit
 from app.services.exit_provenance import record_exit_provenance
 from app.services.exchange_service import get_exchange_client_for_account
+from app.services.order_status_poller import poll_pending_orders
 from app.services.websocket_manager import OrderFillEvent
 from app.services.broadcast_backend import broadcast_backend
 
@@ -119,35 +120,23 @@ async def _check_all_pending_limit_orders_scoped(session_maker) -> None:
     async with session_maker() as db:
         snapshots = await _snapshot_pending_limit_orders(db)
 
-    snapshots_by_account: Dict[int, list[PendingLimitOrderSnapshot]] = {}
-    for snapshot in snapshots:
-        snapshots_by_account.setdefault(snapshot.account_id, []).append(snapshot)
-
-    for account_id, account_snapshots in snapshots_by_account.items():
-        async with session_maker() as db:
-            exchange = await get_exchange_client_for_account(db, account_id)
-        if not exchange:
-            logger.warning(
-                f"No exchange client for account {account_id}; "
-                f"skipping {len(account_snapshots)} pending limit order(s) this cycle"
-            )
-            continue
-        for snapshot in account_snapshots:
-            try:
-                order_data = await _poll_limit_order_without_db(exchange, snapshot)
-                await _apply_polled_limit_order(session_maker, snapshot, exchange, order_data)
-            except Exception as e:
-                logger.error(
-                    "Error checking limit order %s for position %s: %s",
-                    snapshot.order_id, snapshot.position_id, e, exc_info=True,
-                )
+    # Late-bound so the module attributes stay patchable
+    await poll_pending_orders(
+        session_maker,
+        snapshots,
+        kind="limit",
+        resolve_exchange=lambda db, account_id: get_exchange_client_for_account(db, account_id),
+        poll_one=lambda exchange, snapshot: _poll_limit_order_without_db(exchange, snapshot),
+        apply=lambda *args: _apply_polled_limit_order(*args),
+    )
 
 
 async def check_all_pending_limit_orders(db: Optional[AsyncSession] = None, *, session_maker=None) -> None:
     """Check every position with a pending limit close order.
 
     Groups positions by account so the exchange client is resolved once per
-    account instead of once per position.
+    account instead of once per position. The scoped path batches each
+    account's status reads (see ``order_status_poller``).
     """
     if session_maker is not None:
         await _check_all_pending_limit_orders_scoped(session_maker)
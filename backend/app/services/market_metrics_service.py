@@ -14,7 +14,7 @@ Also includes metric snapshot recording and pruning.
 """
 
 import asyncio
-from app.utils.timeutil import utcnow
+from app.utils.timeutil import utcfromtimestamp, utcnow
 import logging
 import time
 from datetime import datetime, timedelta
@@ -26,6 +26,7 @@ from sqlalchemy import delete, select
 
 from app.database import async_session_maker, read_async_session_maker
 from app.indicator_calculator import IndicatorCalculator
+from app.json_response import utc_isoformat
 from app.models import MetricSnapshot
 from app.news_data import (
     FEAR_GREED_CACHE_MINUTES,
@@ -143,8 +144,8 @@ async def fetch_btc_block_height() -> Dict[str, Any]:
             now = utcnow()
             cache_data = {
                 "height": height,
-                "timestamp": now.isoformat(),
-                "cached_at": now.isoformat(),
+                "timestamp": utc_isoformat(now),
+                "cached_at": utc_isoformat(now),
             }
 
             save_block_height_cache(cache_data)
@@ -291,8 +292,8 @@ async def fetch_us_debt() -> Dict[str, Any]:
             "gdp": gdp,
             "debt_to_gdp_ratio": round(debt_to_gdp_ratio, 2),
             "record_date": record_date,
-            "cached_at": now.isoformat(),
-            "cache_expires_at": (now + timedelta(hours=US_DEBT_CACHE_HOURS)).isoformat(),
+            "cached_at": utc_isoformat(now),
+            "cache_expires_at": utc_isoformat(now + timedelta(hours=US_DEBT_CACHE_HOURS)),
             "debt_ceiling": debt_ceiling,
             "debt_ceiling_suspended": debt_ceiling_suspended,
             "debt_ceiling_note": debt_ceiling_note,
@@ -329,11 +330,11 @@ async def fetch_fear_greed_index() -> Dict[str, Any]:
                 "data": {
                     "value": int(fng_data.get("value", 50)),
                     "value_classification": fng_data.get("value_classification", "Neutral"),
-                    "timestamp": datetime.fromtimestamp(int(fng_data.get("timestamp", 0))).isoformat(),
+                    "timestamp": utc_isoformat(utcfromtimestamp(int(fng_data.get("timestamp", 0)))),
                     "time_until_update": fng_data.get("time_until_update"),
                 },
-                "cached_at": now.isoformat(),
-                "cache_expires_at": (now + timedelta(minutes=FEAR_GREED_CACHE_MINUTES)).isoformat(),
+                "cached_at": utc_isoformat(now),
+                "cache_expires_at": utc_isoformat(now + timedelta(minutes=FEAR_GREED_CACHE_MINUTES)),
             }
 
             save_fear_greed_cache(cache_data)
@@ -371,7 +372,7 @@ async def fetch_btc_dominance() -> Dict[str, Any]:
                 "eth_dominance": round(eth_dominance, 2),
                 "others_dominance": round(100 - btc_dominance - eth_dominance, 2),
                 "total_market_cap": total_mcap,
-                "cached_at": now.isoformat(),
+                "cached_at": utc_isoformat(now),
             }
 
             save_btc_dominance_cache(cache_data)
@@ -438,7 +439,7 @@ async def fetch_altseason_index() -> Dict[str, Any]:
                 "outperformers": outperformers,
                 "total_altcoins": total_altcoins,
                 "btc_30d_change": round(btc_change, 2),
-                "cached_at": now.isoformat(),
+                "cached_at": utc_isoformat(now),
             }
 
             save_altseason_cache(cache_data)
@@ -495,7 +496,7 @@ async def fetch_stablecoin_mcap() -> Dict[str, Any]:
                 "usdc_mcap": usdc_mcap,
                 "dai_mcap": dai_mcap,
                 "others_mcap": others_mcap,
-                "cached_at": now.isoformat(),
+                "cached_at": utc_isoformat(now),
             }
 
             save_stablecoin_mcap_cache(cache_data)
@@ -546,7 +547,7 @@ async def fetch_mempool_stats() -> Dict[str, Any]:
             "congestion": "High" if mempool_data.get("count", 0) > 50000 else (
                 "Medium" if mempool_data.get("count", 0) > 20000 else "Low"
             ),
-            "cached_at": now.isoformat(),
+            "cached_at": utc_isoformat(now),
         }
 
         save_mempool_cache(cache_data)
@@ -597,7 +598,7 @@ async def fetch_hash_rate() -> Dict[str, Any]:
             "hash_rate_eh": round(hash_rate_eh, 2),
             "difficulty": difficulty,
             "difficulty_t": round(difficulty, 2),
-            "cached_at": now.isoformat(),
+            "cached_at": utc_isoformat(now),
         }
 
         save_hash_rate_cache(cache_data)
@@ -636,7 +637,7 @@ async def fetch_lightning_stats() -> Dict[str, Any]:
             "total_capacity_btc": round(data.get("total_capacity", 0) / 100_000_000, 2),
             "avg_capacity_sats": data.get("avg_capacity", 0),
             "avg_fee_rate": data.get("avg_fee_rate", 0),
-            "cached_at": now.isoformat(),
+            "cached_at": utc_isoformat(now),
         }
 
         save_lightning_cache(cache_data)
@@ -691,7 +692,7 @@ async def fetch_ath_data() -> Dict[str, Any]:
             "days_since_ath": days_since_ath,
             "drawdown_pct": round(ath_change_pct, 2),
             "recovery_pct": round(100 + ath_change_pct, 2) if ath_change_pct < 0 else 100,
-            "cached_at": now.isoformat(),
+            "cached_at": utc_isoformat(now),
         }
 
         save_ath_cache(cache_data)
@@ -750,8 +751,8 @@ async def fetch_btc_rsi() -> Dict[str, Any]:
             cache_data = {
                 "rsi": rsi,
                 "zone": zone,
-                "cached_at": now_dt.isoformat(),
-                "cache_expires_at": (now_dt + timedelta(minutes=15)).isoformat(),
+                "cached_at": utc_isoformat(now_dt),
+                "cache_expires_at": utc_isoformat(now_dt + timedelta(minutes=15)),
             }
 
             save_btc_rsi_cache(cache_data)
@@ -820,9 +821,9 @@ async def get_metric_history_data(
             end = int((i + 1) * bucket_size)
             bucket = rows[start:end]
             avg_value = sum(r.value for r in bucket) / len(bucket)
-            sampled.append({"value": avg_value, "recorded_at": bucket[-1].recorded_at.isoformat()})
+            sampled.append({"value": avg_value, "recorded_at": utc_isoformat(bucket[-1].recorded_at)})
     else:
-        sampled = [{"value": r.value, "recorded_at": r.recorded_at.isoformat()} for r in rows]
+        sampled = [{"value": r.value, "recorded_at": utc_isoformat(r.recorded_at)} for r in rows]
 
     # Prune old data periodically (piggyback on reads)
     if len(rows) > 0:
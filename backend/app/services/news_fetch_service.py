@@ -23,6 +23,7 @@ from sqlalchemy import delete, desc, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import async_session_maker as _default_session_maker
+from app.json_response import utc_isoformat
 from app.models import ArticleTTS, ContentSource, NewsArticle, VideoArticle
 from app.news_data import (
     NEWS_ITEM_MAX_AGE_DAYS,
@@ -827,8 +828,8 @@ async def fetch_all_videos(session_maker=None) -> Dict[str, Any]:
     cache_data = {
         "videos": merged_items,
         "sources": sources_list,
-        "cached_at": now.isoformat(),
-        "cache_expires_at": (now + timedelta(minutes=VIDEO_CACHE_CHECK_MINUTES)).isoformat(),
+        "cached_at": utc_isoformat(now),
+        "cache_expires_at": utc_isoformat(now + timedelta(minutes=VIDEO_CACHE_CHECK_MINUTES)),
         "total_items": len(merged_items),
     }
     save_video_cache(cache_data)
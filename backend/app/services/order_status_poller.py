@@ -0,0 +1,176 @@
+"""Batched order-status polling shared by the limit-close and safety-order monitors.
+
+Each cycle a monitor snapshots its pending orders in one DB read and hands them
+to :func:`poll_pending_orders`, which:
+
+- polls accounts concurrently, at most ORDER_POLL_MAX_CONCURRENT_ACCOUNTS at a
+  time, so many accounts (or one slow exchange) don't serialize the cycle;
+- fetches each account's live orders with one ``ExchangeClient.get_orders``
+  call (Coinbase: the historical batch endpoint), falling back to the
+  monitor's per-order poll for IDs the bulk response left out, for paper
+  orders, and for clients without a bulk call;
+- hands an order to the monitor's apply step only when its status or filled
+  size changed since the last successful apply, when its status is terminal
+  (the DB still lists it as pending, so the apply hasn't landed), or when
+  UNCHANGED_RECHECK_SECONDS have passed — time-based rules such as the limit
+  bid fallback still get to run on resting orders.
+
+Each monitor kind gets its own :class:`OrderChangeTracker` (``tracker_for``):
+a poll forgets every tracked order its snapshot no longer lists, so a tracker
+shared between monitors would erase the other monitor's entries each cycle.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+ORDER_POLL_MAX_CONCURRENT_ACCOUNTS = 4
+UNCHANGED_RECHECK_SECONDS = 30.0
+
+_TERMINAL_STATUSES = {"FILLED", "CANCELLED", "CANCELED", "EXPIRED", "FAILED"}
+
+
+class OrderChangeTracker:
+    """Last applied (status, filled_size) per order_id."""
+
+    def __init__(self, recheck_seconds: float = UNCHANGED_RECHECK_SECONDS):
+        self.recheck_seconds = recheck_seconds
+        self._applied: Dict[str, Tuple[Tuple[str, float], float]] = {}
+
+    @staticmethod
+    def signature(order_data: Dict[str, Any]) -> Tuple[str, float]:
+        try:
+            filled = float(order_data.get("filled_size") or 0)
+        except (TypeError, ValueError):
+            filled = 0.0
+        return str(order_data.get("status") or "UNKNOWN").upper(), filled
+
+    def needs_apply(self, order_id: str, order_data: Dict[str, Any], now: Optional[float] = None) -> bool:
+        sig = self.signature(order_data)
+        if sig[0] in _TERMINAL_STATUSES:
+            return True
+        seen = self._applied.get(order_id)
+        if seen is None or seen[0] != sig:
+            return True
+        return (time.monotonic() if now is None else now) - seen[1] >= self.recheck_seconds
+
+    def record(self, order_id: str, order_data: Dict[str, Any], now: Optional[float] = None) -> None:
+        self._applied[order_id] = (self.signature(order_data), time.monotonic() if now is None else now)
+
+    def retain(self, order_ids: Iterable[str]) -> None:
+        """Forget orders that are no longer pending."""
+        keep = set(order_ids)
+        for order_id in [o for o in self._applied if o not in keep]:
+            del self._applied[order_id]
+
+    def clear(self) -> None:
+        self._applied.clear()
+
+    def __len__(self) -> int:
+        return len(self._applied)
+
+
+# One tracker per monitor kind ("limit", "safety")
+order_change_trackers: Dict[str, OrderChangeTracker] = {}
+
+
+def tracker_for(kind: str) -> OrderChangeTracker:
+    """The change tracker for ``kind``, created on first use."""
+    tracker = order_change_trackers.get(kind)
+    if tracker is None:
+        tracker = order_change_trackers[kind] = OrderChangeTracker()
+    return tracker
+
+
+async def fetch_order_statuses(exchange, order_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """One bulk status call for ``order_ids``; {} when there is nothing to batch or it fails."""
+    get_orders = getattr(exchange, "get_orders", None)
+    if len(order_ids) < 2 or get_orders is None:
+        return {}
+    try:
+        result = await get_orders(order_ids)
+    except Exception as e:
+        logger.warning(f"Bulk order status fetch failed for {len(order_ids)} order(s), polling each: {e}")
+        return {}
+    return result if isinstance(result, dict) else {}
+
+
+async def poll_pending_orders(
+    session_maker,
+    snapshots: Sequence[Any],
+    *,
+    kind: str,
+    resolve_exchange: Callable[[Any, int], Awaitable[Any]],
+    poll_one: Callable[[Any, Any], Awaitable[Optional[dict]]],
+    apply: Callable[[Any, Any, Any, Optional[dict]], Awaitable[None]],
+    tracker: Optional[OrderChangeTracker] = None,
+    max_concurrent_accounts: int = ORDER_POLL_MAX_CONCURRENT_ACCOUNTS,
+) -> Dict[str, int]:
+    """Poll and apply ``snapshots`` (objects with ``account_id`` and ``order_id``).
+
+    ``resolve_exchange(db, account_id)`` returns the account's client,
+    ``poll_one(exchange, snapshot)`` fetches a single order (or synthesizes a
+    paper fill) and ``apply(session_maker, snapshot, exchange, order_data)``
+    writes the result in its own session. No DB session is held while the
+    exchange is polled. ``tracker`` defaults to ``tracker_for(kind)``.
+    """
+    if tracker is None:
+        tracker = tracker_for(kind)
+    by_account: Dict[int, List[Any]] = {}
+    for snapshot in snapshots:
+        by_account.setdefault(snapshot.account_id, []).append(snapshot)
+    tracker.retain(s.order_id for s in snapshots)
+
+    stats = {"accounts": len(by_account), "orders": len(snapshots), "bulk_calls": 0,
+             "single_calls": 0, "applied": 0, "unchanged": 0}
+    semaphore = asyncio.Semaphore(max_concurrent_accounts)
+
+    async def _poll_account(account_id: int, items: List[Any]) -> None:
+        async with semaphore:
+            try:
+                async with session_maker() as db:
+                    exchange = await resolve_exchange(db, account_id)
+                if not exchange:
+                    logger.warning(
+                        f"No exchange client for account {account_id}; "
+                        f"skipping {len(items)} pending {kind} order(s) this cycle"
+                    )
+                    return
+                live_ids = [s.order_id for s in items if not s.order_id.startswith("paper-")]
+                statuses = await fetch_order_statuses(exchange, live_ids)
+                if len(live_ids) >= 2:
+                    stats["bulk_calls"] += 1
+
+                for snapshot in items:
+                    try:
+                        order_data = statuses.get(snapshot.order_id)
+                        if order_data is None:
+                            if not snapshot.order_id.startswith("paper-"):
+                                stats["single_calls"] += 1
+                            order_data = await poll_one(exchange, snapshot)
+                        if order_data and not tracker.needs_apply(snapshot.order_id, order_data):
+                            stats["unchanged"] += 1
+                            continue
+                        await apply(session_maker, snapshot, exchange, order_data)
+                        stats["applied"] += 1
+                        if order_data:
+                            tracker.record(snapshot.order_id, order_data)
+                    except Exception as e:
+                        logger.error(
+                            f"Error checking {kind} order {snapshot.order_id} for account {account_id}: {e}",
+                            exc_info=True,
+                        )
+            except Exception as e:
+                logger.error(f"Error polling {kind} orders for account {account_id}: {e}")
+
+    await asyncio.gather(*(_poll_account(a, items) for a, items in by_account.items()))
+    if snapshots:
+        logger.debug(
+            f"{kind} order poll: {stats['orders']} order(s) in {stats['accounts']} account(s), "
+            f"{stats['bulk_calls']} bulk + {stats['single_calls']} single call(s), "
+            f"{stats['applied']} applied, {stats['unchanged']} unchanged"
+        )
+    return stats
@@ -0,0 +1,507 @@
+"""
+In-memory paper-trading ledger with write-behind persistence.
+
+Paper balances live in ``Account.paper_balances`` as a JSON string. Reading and
+rewriting that row on every simulated fill meant two DB sessions per order and
+constant SQLite lock retries once a user ran many paper bots. PaperLedger keeps
+each account's balances in memory instead:
+
+- Mutations (``apply``) are checked and applied atomically under one
+  process-wide lock. The main and secondary event loops share the ledger.
+- Once ``start()`` has run (the trading process), in-memory balances are
+  authoritative: the row is read on first access only. Each mutation's
+  deltas are appended to a fill journal (``journal.jsonl``, fsync'd) by
+  ``persist()`` before the fill is acknowledged. The append runs in a worker
+  thread and group-commits: one fsync covers every mutation queued by then.
+- A background flusher writes every dirty account in one transaction each
+  PAPER_LEDGER_FLUSH_SECONDS, then compacts the journal down to the entries
+  that are still unflushed. ``start()`` replays a leftover journal into the
+  DB before anything trades, so a crash between a fill and its flush loses
+  nothing. Replay adds the deltas to the row, so deposits written to the row
+  by another process meanwhile survive. Before each commit the flusher
+  journals a marker with the row text it writes; if the row still holds that
+  text at replay, the commit landed and the deltas it covered are skipped.
+- Until ``start()`` runs (the web process, tests, scripts), every access
+  re-reads the row and every mutation is written through immediately — the
+  pre-ledger behaviour.
+
+Other writers still update the row directly (the paper-trading router's
+deposit / withdraw / reset, which runs in the web process in split
+deployments). The ledger remembers the row content it last loaded or wrote
+per account; when the row differs from that at flush or reconcile time, the
+external change is merged in as a per-currency delta instead of being
+overwritten. Clean accounts are reconciled every PAPER_LEDGER_RECONCILE_SECONDS
+or on the next flush after ``request_reconcile()``.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import select
+
+from app.models import Account
+
+logger = logging.getLogger(__name__)
+
+PAPER_LEDGER_DIR = Path(__file__).parent.parent.parent / "paper_ledger"
+PAPER_LEDGER_FLUSH_SECONDS = 2.0
+PAPER_LEDGER_RECONCILE_SECONDS = 10.0
+PAPER_LEDGER_FSYNC = True  # fsync each journal append (crash safety over ~ms latency)
+
+
+class InsufficientPaperBalance(Exception):
+    """A paper mutation would take a balance below what it requires."""
+
+
+class PaperLedger:
+    """Process-wide in-memory paper balances with journaled write-behind."""
+
+    def __init__(
+        self,
+        journal_dir: Path = PAPER_LEDGER_DIR,
+        flush_interval: float = PAPER_LEDGER_FLUSH_SECONDS,
+        reconcile_interval: float = PAPER_LEDGER_RECONCILE_SECONDS,
+    ):
+        self.journal_path = Path(journal_dir) / "journal.jsonl"
+        self.flush_interval = flush_interval
+        self.reconcile_interval = reconcile_interval
+        self._balances: Dict[int, Dict[str, float]] = {}
+        self._base: Dict[int, Dict[str, float]] = {}  # row content last loaded / written
+        self._base_gen: Dict[int, int] = {}  # bumped whenever _base changes
+        self._version: Dict[int, int] = {}  # bumped per mutation
+        self._flushed: Dict[int, int] = {}  # version last committed to the DB
+        self._lock = threading.Lock()
+        # Serializes journal file writes; taken before self._lock, never inside it
+        self._journal_lock = threading.Lock()
+        self._pending: List[Dict[str, Any]] = []  # journal entries not yet written
+        self._unflushed: Dict[int, List[tuple]] = {}  # account -> [(version, entry)] not yet in the DB
+        self._flush_locks: Dict[int, asyncio.Lock] = {}  # per event loop
+        self._flush_task: Optional[asyncio.Task] = None
+        self._reconcile_requested = False
+        self._last_reconcile = 0.0
+        self._seq = 0
+        self.stats_counters = {
+            "mutations": 0, "flushes": 0, "rows_written": 0, "external_merges": 0, "replayed": 0,
+        }
+
+    @property
+    def write_behind(self) -> bool:
+        return self._flush_task is not None and not self._flush_task.done()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def peek(self, account_id: int) -> Optional[Dict[str, float]]:
+        """Copy of the in-memory balances, or None if the account is not loaded."""
+        with self._lock:
+            balances = self._balances.get(account_id)
+            return dict(balances) if balances is not None else None
+
+    def live(self, account_id: int) -> Optional[Dict[str, float]]:
+        """In-memory balances if they are authoritative in this process
+        (write-behind running), else None — read the row instead."""
+        return self.peek(account_id) if self.write_behind else None
+
+    async def load(
+        self,
+        account_id: int,
+        session_maker: Optional[Callable] = None,
+        fallback: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, float]:
+        """Balances for an account.
+
+        Under write-behind the row is read on first access only; otherwise it
+        is re-read every time and merged in. ``fallback`` seeds the ledger when
+        the row is missing or has no balances (e.g. the caller already holds a
+        freshly created account).
+        """
+        if self.write_behind:
+            balances = self.peek(account_id)
+            if balances is not None:
+                return balances
+
+        with self._lock:
+            gen = self._base_gen.get(account_id, 0)
+        row = None
+        async with _session_maker(session_maker)() as db:
+            result = await db.execute(select(Account).where(Account.id == account_id))
+            account = result.scalar_one_or_none()
+            if account and account.paper_balances:
+                row = json.loads(account.paper_balances)
+
+        with self._lock:
+            if row is not None and self._base_gen.get(account_id, 0) == gen:
+                self._merge_row(account_id, row)
+            elif account_id not in self._balances:
+                self._adopt(account_id, row if row is not None else dict(fallback or {}))
+            return dict(self._balances[account_id])
+
+    def seed(self, account_id: int, balances: Dict[str, float]) -> Dict[str, float]:
+        """Load an account from a row the caller already read; no-op if loaded."""
+        with self._lock:
+            if account_id not in self._balances:
+                self._adopt(account_id, balances)
+            return dict(self._balances[account_id])
+
+    def _adopt(self, account_id: int, row: Dict[str, float]) -> None:
+        # Caller holds self._lock
+        self._balances[account_id] = {k: float(v) for k, v in row.items()}
+        self._base[account_id] = dict(self._balances[account_id])
+        self._base_gen[account_id] = self._base_gen.get(account_id, 0) + 1
+        self._version.setdefault(account_id, 0)
+        self._flushed.setdefault(account_id, 0)
+
+    def _merge_row(self, account_id: int, row: Dict[str, float]) -> None:
+        """Fold a row written by someone else into memory. Caller holds self._lock.
+
+        Three-way merge per currency: memory += row - base, so local fills not
+        yet flushed survive and the external change (deposit, reset) lands too.
+        """
+        if account_id not in self._balances:
+            self._adopt(account_id, row)
+            return
+        balances, base = self._balances[account_id], self._base[account_id]
+        merged = False
+        for currency in set(row) | set(base):
+            delta = float(row.get(currency) or 0.0) - base.get(currency, 0.0)
+            if delta:
+                balances[currency] = balances.get(currency, 0.0) + delta
+                merged = True
+        if merged:
+            self._base[account_id] = {k: float(v) for k, v in row.items()}
+            self._base_gen[account_id] += 1
+            self.stats_counters["external_merges"] += 1
+
+    # ------------------------------------------------------------------
+    # Mutations
+    # ------------------------------------------------------------------
+
+    def apply(
+        self,
+        account_id: int,
+        deltas: Dict[str, float],
+        require: Optional[Dict[str, float]] = None,
+        kind: str = "adjust",
+        detail: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, float]:
+        """Atomically check ``require`` (currency -> minimum balance) and add
+        ``deltas``. The account must be loaded. Returns the new balances."""
+        with self._lock:
+            balances = self._balances.get(account_id)
+            if balances is None:
+                raise RuntimeError(f"Paper account {account_id} not loaded — await load() first")
+            for currency, needed in (require or {}).items():
+                available = balances.get(currency, 0.0)
+                if available < needed:
+                    raise InsufficientPaperBalance(
+                        f"Insufficient {currency} balance. Available: {available}, Required: {needed}"
+                    )
+            for currency, delta in deltas.items():
+                balances[currency] = balances.get(currency, 0.0) + delta
+
+            self._version[account_id] += 1
+            self._seq += 1
+            self.stats_counters["mutations"] += 1
+            if self.write_behind:
+                entry = {"seq": self._seq, "account_id": account_id, "kind": kind, "deltas": dict(deltas)}
+                if detail:
+                    entry["detail"] = detail
+                self._pending.append(entry)
+                self._unflushed.setdefault(account_id, []).append((self._version[account_id], entry))
+            return dict(balances)
+
+    async def persist(self, session_maker: Optional[Callable] = None) -> None:
+        """Called after a mutation: journal it under write-behind, else write through."""
+        if self.write_behind:
+            await asyncio.to_thread(self._write_pending)
+        else:
+            await self.flush(session_maker)
+
+    def request_reconcile(self) -> None:
+        """Pick up rows written outside the ledger on the next flush cycle."""
+        self._reconcile_requested = True
+
+    # ------------------------------------------------------------------
+    # Journal
+    # ------------------------------------------------------------------
+
+    def _write_pending(self) -> None:
+        """Append every queued entry to the journal (worker thread).
+
+        Concurrent callers group-commit: whoever holds the journal lock writes
+        everything queued so far, the rest find the queue empty once it is
+        durable."""
+        with self._journal_lock:
+            with self._lock:
+                entries, self._pending = self._pending, []
+            if entries:
+                self._append_journal(entries)
+
+    def _append_journal(self, entries: List[Dict[str, Any]]) -> None:
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.journal_path, "a") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            f.flush()
+            if PAPER_LEDGER_FSYNC:
+                os.fsync(f.fileno())
+
+    def _read_journal(self) -> List[Dict[str, Any]]:
+        if not self.journal_path.exists():
+            return []
+        entries = []
+        with open(self.journal_path) as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Torn final append from a crash — it was never acknowledged
+                    logger.warning(f"Skipping unreadable paper journal line: {line[:80]!r}")
+        return entries
+
+    def _compact_journal(self) -> None:
+        """Rewrite the journal to the entries not yet flushed (worker thread).
+
+        The rewrite covers anything still queued, so the queue is dropped."""
+        with self._journal_lock:
+            with self._lock:
+                self._pending = []
+                entries = sorted(
+                    (entry for account_entries in self._unflushed.values() for _, entry in account_entries),
+                    key=lambda entry: entry["seq"],
+                )
+            if not entries:
+                if self.journal_path.exists():
+                    self.journal_path.unlink()
+                return
+            tmp = self.journal_path.with_suffix(".tmp")
+            with open(tmp, "w") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+                f.flush()
+                if PAPER_LEDGER_FSYNC:
+                    os.fsync(f.fileno())
+            os.replace(tmp, self.journal_path)
+
+    async def replay(self, session_maker: Optional[Callable] = None) -> int:
+        """Apply journal entries left by an unclean shutdown to the DB. Returns the count."""
+        entries = await asyncio.to_thread(self._read_journal)
+        if not entries:
+            return 0
+        by_account: Dict[int, List[Dict[str, Any]]] = {}
+        for entry in sorted(entries, key=lambda e: e.get("seq", 0)):
+            by_account.setdefault(entry["account_id"], []).append(entry)
+
+        replayed = 0
+        async with _session_maker(session_maker)() as db:
+            for account_id, account_entries in by_account.items():
+                result = await db.execute(select(Account).where(Account.id == account_id))
+                account = result.scalar_one_or_none()
+                if account is None:
+                    continue
+                raw = account.paper_balances
+                balances = json.loads(raw) if raw else {}
+                # A flush whose row text is still in the DB committed: its deltas are in the row
+                committed_upto = max(
+                    (e["seq"] for e in account_entries if e.get("kind") == "flush" and e.get("row") == raw),
+                    default=0,
+                )
+                for entry in account_entries:
+                    if entry.get("kind") == "flush":
+                        continue
+                    if "deltas" in entry:
+                        if entry["seq"] <= committed_upto:
+                            continue
+                        for currency, delta in entry["deltas"].items():
+                            balances[currency] = float(balances.get(currency) or 0.0) + delta
+                    elif entry.get("replace"):  # absolute-balance journals from before deltas
+                        balances = dict(entry["balances"])
+                    else:
+                        balances.update(entry["balances"])
+                    replayed += 1
+                account.paper_balances = json.dumps(balances)
+            await db.commit()
+
+        with self._lock:
+            # Anything cached was loaded before the replay; reload on next use.
+            for account_id in by_account:
+                self._forget(account_id)
+            self.journal_path.unlink()
+        self.stats_counters["replayed"] += replayed
+        logger.warning(
+            f"Replayed {replayed} paper ledger journal entr(ies) for {len(by_account)} account(s)"
+        )
+        return replayed
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def _dirty_accounts(self) -> List[int]:
+        # Caller holds self._lock
+        return [a for a, v in self._version.items() if v > self._flushed.get(a, 0) and a in self._balances]
+
+    async def flush(self, session_maker: Optional[Callable] = None, reconcile: bool = False) -> int:
+        """Write every dirty account in one transaction. Returns rows written.
+
+        Each row is re-read inside the transaction and external changes are
+        merged before writing. With ``reconcile`` clean accounts are re-read
+        (and merged) too. Retries with exponential backoff + jitter on SQLite
+        lock contention.
+        """
+        loop = asyncio.get_running_loop()
+        flush_lock = self._flush_locks.setdefault(id(loop), asyncio.Lock())
+        async with flush_lock:
+            with self._lock:
+                account_ids = list(self._balances) if reconcile else self._dirty_accounts()
+            if not account_ids:
+                return 0
+
+            max_attempts = 5
+            for attempt in range(max_attempts):
+                written: Dict[int, tuple] = {}
+                markers: List[Dict[str, Any]] = []
+                try:
+                    async with _session_maker(session_maker)() as db:
+                        for account_id in account_ids:
+                            with self._lock:
+                                gen = self._base_gen.get(account_id, 0)
+                            result = await db.execute(select(Account).where(Account.id == account_id))
+                            account = result.scalar_one_or_none()
+                            row = json.loads(account.paper_balances) if account and account.paper_balances else None
+                            with self._lock:
+                                if account_id not in self._balances:
+                                    continue  # cleared meanwhile
+                                if row is not None and self._base_gen.get(account_id, 0) == gen:
+                                    self._merge_row(account_id, row)
+                                if account is None or self._version[account_id] <= self._flushed[account_id]:
+                                    continue
+                                version = self._version[account_id]
+                                balances = dict(self._balances[account_id])
+                                written[account_id] = (version, balances)
+                                covered = [e["seq"] for v, e in self._unflushed.get(account_id, ()) if v <= version]
+                            raw = json.dumps(balances)
+                            account.paper_balances = raw
+                            if covered:
+                                markers.append({
+                                    "seq": max(covered), "account_id": account_id, "kind": "flush", "row": raw,
+                                })
+                        if markers:
+                            # Durable before the commit, so replay can tell whether it landed
+                            with self._lock:
+                                self._pending.extend(markers)
+                            await asyncio.to_thread(self._write_pending)
+                        await db.commit()
+                    break
+                except Exception as e:
+                    err_str = str(e).lower()
+                    if ("database is locked" in err_str or "not persistent" in err_str) and attempt < max_attempts - 1:
+                        delay = (0.15 * (2 ** attempt)) + random.uniform(0, 0.1)
+                        logger.warning(
+                            f"Paper ledger flush failed (attempt {attempt + 1}/{max_attempts},"
+                            f" retry in {delay:.2f}s): {e}"
+                        )
+                        await asyncio.sleep(delay)
+                    else:
+                        raise
+
+            with self._lock:
+                for account_id, (version, balances) in written.items():
+                    if account_id not in self._balances:
+                        continue
+                    self._flushed[account_id] = max(self._flushed[account_id], version)
+                    self._base[account_id] = balances
+                    self._base_gen[account_id] += 1
+                    flushed = self._flushed[account_id]
+                    remaining = [(v, e) for v, e in self._unflushed.get(account_id, ()) if v > flushed]
+                    if remaining:
+                        self._unflushed[account_id] = remaining
+                    else:
+                        self._unflushed.pop(account_id, None)
+                compact = self.write_behind and bool(written)
+            if compact:
+                await asyncio.to_thread(self._compact_journal)
+            self.stats_counters["flushes"] += 1
+            self.stats_counters["rows_written"] += len(written)
+            return len(written)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            now = time.monotonic()
+            reconcile = self._reconcile_requested or now - self._last_reconcile >= self.reconcile_interval
+            try:
+                self._reconcile_requested = False
+                await self.flush(reconcile=reconcile)
+                if reconcile:
+                    self._last_reconcile = now
+            except Exception as e:
+                logger.error(f"Paper ledger flush failed; retrying next cycle: {e}")
+
+    async def start(self) -> None:
+        """Replay any leftover journal, then switch to write-behind (main loop)."""
+        if self.write_behind:
+            return
+        await self.replay()
+        with self._lock:
+            # Loaded under write-through; re-read now that memory becomes authoritative
+            for account_id in list(self._balances):
+                self._forget(account_id)
+        self._last_reconcile = time.monotonic()
+        self._flush_task = asyncio.create_task(self._flush_loop(), name="paper-ledger-flush")
+        logger.info(f"Paper ledger write-behind started (flush every {self.flush_interval:.0f}s)")
+
+    async def stop(self) -> None:
+        """Stop the flusher and write everything still pending."""
+        task, self._flush_task = self._flush_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+        await asyncio.to_thread(self._compact_journal)
+
+    def _forget(self, account_id: int) -> None:
+        # Caller holds self._lock
+        for state in (self._balances, self._base, self._version, self._flushed, self._unflushed):
+            state.pop(account_id, None)
+        # _base_gen is kept (and bumped) so in-flight loads discard their read
+        self._base_gen[account_id] = self._base_gen.get(account_id, 0) + 1
+
+    def clear(self) -> None:
+        """Forget all cached balances (tests; unflushed changes are lost)."""
+        with self._lock:
+            for account_id in list(self._balances):
+                self._forget(account_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            dirty = len(self._dirty_accounts())
+            accounts = len(self._balances)
+        return {
+            **self.stats_counters,
+            "accounts": accounts,
+            "dirty_accounts": dirty,
+            "write_behind": self.write_behind,
+        }
+
+
+def _session_maker(session_maker: Optional[Callable]) -> Callable:
+    if session_maker is not None:
+        return session_maker
+    from app.database import async_session_maker
+    return async_session_maker
+
+
+# Global instance
+paper_ledger = PaperLedger()
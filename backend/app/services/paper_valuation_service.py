@@ -20,11 +20,19 @@ _STABLES = {"USD", "USDC", "USDT"}
 
 
 def load_paper_balances(account: Any) -> dict[str, float]:
-    """Return normalized paper balances for an account-like object."""
-    if account.paper_balances:
-        raw_balances = json.loads(account.paper_balances)
-    else:
-        raw_balances = {"BTC": 0.0, "ETH": 0.0, "USD": 0.0, "USDC": 0.0, "USDT": 0.0}
+    """Return normalized paper balances for an account-like object.
+
+    Prefers the paper ledger's in-memory balances when this process runs it
+    write-behind; they may be ahead of the row by one flush.
+    """
+    from app.services.paper_ledger import paper_ledger
+    account_id = getattr(account, "id", None)
+    raw_balances = paper_ledger.live(account_id) if isinstance(account_id, int) else None
+    if raw_balances is None:
+        if account.paper_balances:
+            raw_balances = json.loads(account.paper_balances)
+        else:
+            raw_balances = {"BTC": 0.0, "ETH": 0.0, "USD": 0.0, "USDC": 0.0, "USDT": 0.0}
 
     return {currency: float(amount or 0.0) for currency, amount in raw_balances.items()}
 
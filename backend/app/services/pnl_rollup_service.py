@@ -0,0 +1,297 @@
+"""
+Realized-P&L rollups per (account, bot, product, UTC day).
+
+The P&L chart (/positions/pnl-timeseries), /positions/completed/stats and
+/positions/realized-pnl used to load or aggregate every closed Position of the
+user's accounts on each request. They now read PnlDailyRollup rows, so their
+cost grows with trading days x pairs rather than with closed deals.
+
+Rollups are maintained by recomputing a whole (account, day) bucket from its
+positions — a range scan on ix_positions_account_status_closed — rather than
+by adding deltas. Recomputation is idempotent, so a duplicated POSITION_CLOSED
+event, a retry, or the reconcile job all converge on the same rows. Each
+delete-and-insert runs under a per-account transaction advisory lock on
+Postgres, so two concurrent rebuilds of the same account cannot both insert
+(SQLite already serializes writers).
+
+- on_position_closed: event_bus subscriber for POSITION_CLOSED
+- reconcile_recent_rollups: scheduled safety net for closes whose event was
+  lost or whose handler failed, and for positions edited directly in the DB
+- rebuild_rollups: full backfill; run once when the table is first empty
+  (run_pnl_rollup_maintenance_once) and by scripts/rebuild_pnl_rollups.py
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import PnlDailyRollup, Position
+from app.services.pnl_service import resolve_btc_usd_price
+from app.utils.timeutil import utcnow
+
+logger = logging.getLogger(__name__)
+
+RECONCILE_LOOKBACK_HOURS = 48
+# First key of pg_advisory_xact_lock(int, int); the second is the account id
+ROLLUP_LOCK_NAMESPACE = 14096
+STABLE_QUOTES = ("USD", "USDC", "USDT")
+
+_POSITION_COLUMNS = (
+    Position.id,
+    Position.account_id,
+    Position.bot_id,
+    Position.product_id,
+    Position.closed_at,
+    Position.profit_usd,
+    Position.profit_quote,
+    Position.btc_usd_price_at_close,
+    Position.btc_usd_price_at_open,
+    Position.exit_reason,
+)
+
+BucketKey = Tuple[int, Optional[int], str, date]  # (account_id, bot_id, product_id, day)
+
+
+@dataclass
+class _Bucket:
+    # Chart columns (closed_count, profit_usd, profit_btc) only count closes
+    # with a recorded profit_usd, like the old per-position chart query;
+    # profit_quote and the stats columns count every close.
+    closed_count: int = 0
+    profit_usd: float = 0.0
+    profit_btc: float = 0.0
+    profit_quote: float = 0.0
+    stats_count: int = 0
+    stats_profit_usd: float = 0.0
+    stats_profit_btc: float = 0.0
+    win_count: int = 0
+    loss_count: int = 0
+
+    def add(self, row) -> None:
+        product_id = row.product_id or ""
+        profit_usd = row.profit_usd or 0.0
+        is_btc_pair = product_id.endswith("-BTC")
+
+        # Chart BTC: BTC pairs report profit_quote; others convert USD at the
+        # stored BTC price (pnl_service.resolve_btc_usd_price).
+        if row.profit_usd is not None:
+            if is_btc_pair:
+                profit_btc = row.profit_quote or 0.0
+            elif profit_usd:
+                btc_price = resolve_btc_usd_price(row)
+                profit_btc = profit_usd / btc_price if btc_price > 0 else 0.0
+            else:
+                profit_btc = 0.0
+            self.closed_count += 1
+            self.profit_usd += profit_usd
+            self.profit_btc += profit_btc
+
+        # Native quote amount; stablecoin pairs with NULL profit_quote
+        # (dust/force closes) fall back to profit_usd.
+        if row.profit_quote is not None:
+            profit_quote = row.profit_quote
+        elif product_id.rsplit("-", 1)[-1] in STABLE_QUOTES:
+            profit_quote = profit_usd
+        else:
+            profit_quote = 0.0
+
+        self.profit_quote += profit_quote
+
+        if row.exit_reason == "manual":
+            return
+        # Stats BTC only trusts the close price (matches the old SQL aggregate)
+        if is_btc_pair:
+            stats_btc = row.profit_quote or 0.0
+        elif row.btc_usd_price_at_close and row.btc_usd_price_at_close > 0:
+            stats_btc = profit_usd / row.btc_usd_price_at_close
+        else:
+            stats_btc = 0.0
+        self.stats_count += 1
+        self.stats_profit_usd += profit_usd
+        self.stats_profit_btc += stats_btc
+        if row.profit_usd is not None and row.profit_usd > 0:
+            self.win_count += 1
+        elif row.profit_usd is not None and row.profit_usd < 0:
+            self.loss_count += 1
+
+
+def _fold(rows: Iterable) -> Dict[BucketKey, _Bucket]:
+    buckets: Dict[BucketKey, _Bucket] = {}
+    for row in rows:
+        key = (row.account_id, row.bot_id, row.product_id or "", row.closed_at.date())
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = _Bucket()
+        bucket.add(row)
+    return buckets
+
+
+def _rollup_rows(buckets: Dict[BucketKey, _Bucket]) -> list:
+    now = utcnow()
+    return [
+        PnlDailyRollup(
+            account_id=account_id, bot_id=bot_id, product_id=product_id, day=day,
+            closed_count=b.closed_count, profit_usd=b.profit_usd, profit_btc=b.profit_btc,
+            profit_quote=b.profit_quote, stats_count=b.stats_count,
+            stats_profit_usd=b.stats_profit_usd, stats_profit_btc=b.stats_profit_btc,
+            win_count=b.win_count, loss_count=b.loss_count, updated_at=now,
+        )
+        for (account_id, bot_id, product_id, day), b in buckets.items()
+    ]
+
+
+def _closed_positions_query():
+    return select(*_POSITION_COLUMNS).where(
+        Position.status == "closed",
+        Position.closed_at.isnot(None),
+        Position.account_id.isnot(None),
+    )
+
+
+async def _lock_account(db: AsyncSession, account_id: int) -> None:
+    """Serialize rollup rewrites of one account until the transaction ends (Postgres only)."""
+    if db.bind is None or db.bind.dialect.name != "postgresql":
+        return
+    await db.execute(
+        text("SELECT pg_advisory_xact_lock(:namespace, :account_id)"),
+        {"namespace": ROLLUP_LOCK_NAMESPACE, "account_id": account_id},
+    )
+
+
+async def rebuild_rollup_day(db: AsyncSession, account_id: int, day: date) -> int:
+    """Recompute one account's rollup rows for one UTC day. Returns rows written.
+
+    Does not commit — the caller owns the transaction (and with it the
+    account lock taken here).
+    """
+    await _lock_account(db, account_id)
+    start = datetime.combine(day, time.min)
+    rows = (await db.execute(
+        _closed_positions_query().where(
+            Position.account_id == account_id,
+            Position.closed_at >= start,
+            Position.closed_at < start + timedelta(days=1),
+        )
+    )).all()
+    await db.execute(delete(PnlDailyRollup).where(
+        PnlDailyRollup.account_id == account_id,
+        PnlDailyRollup.day == day,
+    ))
+    new_rows = _rollup_rows(_fold(rows))
+    db.add_all(new_rows)
+    await db.flush()
+    return len(new_rows)
+
+
+async def rebuild_rollups(db: AsyncSession, account_ids: Optional[Iterable[int]] = None) -> int:
+    """Rebuild rollups from scratch, for all accounts or only ``account_ids``.
+
+    Works one account at a time so memory is bounded by the largest account's
+    closed-position columns. Does not commit. Returns rows written.
+    """
+    if account_ids is None:
+        await db.execute(delete(PnlDailyRollup))
+        account_ids = (await db.execute(
+            select(Position.account_id).where(
+                Position.status == "closed",
+                Position.closed_at.isnot(None),
+                Position.account_id.isnot(None),
+            ).distinct()
+        )).scalars().all()
+    else:
+        account_ids = list(account_ids)
+        if not account_ids:
+            return 0
+
+    written = 0
+    for account_id in account_ids:
+        # Lock before deleting so a concurrent day rebuild cannot slip rows in
+        # between this account's delete and insert.
+        await _lock_account(db, account_id)
+        await db.execute(delete(PnlDailyRollup).where(PnlDailyRollup.account_id == account_id))
+        rows = (await db.execute(
+            _closed_positions_query().where(Position.account_id == account_id)
+        )).all()
+        new_rows = _rollup_rows(_fold(rows))
+        db.add_all(new_rows)
+        await db.flush()
+        written += len(new_rows)
+    return written
+
+
+async def delete_account_rollups(db: AsyncSession, account_id: int) -> None:
+    """Drop an account's rollups alongside a purge/reset of its positions. Does not commit."""
+    await db.execute(delete(PnlDailyRollup).where(PnlDailyRollup.account_id == account_id))
+
+
+async def on_position_closed(payload, session_maker=None) -> None:
+    """Event bus handler for POSITION_CLOSED: refresh the position's (account, day)."""
+    from app.database import async_session_maker as _default_sm
+
+    sm = session_maker or _default_sm
+    async with sm() as db:
+        row = (await db.execute(
+            select(Position.account_id, Position.closed_at).where(Position.id == payload.position_id)
+        )).first()
+        if row is None or row.account_id is None or row.closed_at is None:
+            return
+        await rebuild_rollup_day(db, row.account_id, row.closed_at.date())
+        await db.commit()
+
+
+async def reconcile_recent_rollups(session_maker=None, hours: int = RECONCILE_LOOKBACK_HOURS) -> int:
+    """Recompute every (account, day) with a position closed in the last ``hours``.
+
+    Catches closes that published no POSITION_CLOSED event or whose handler
+    failed. Called by APScheduler. Returns the number of buckets refreshed.
+    """
+    from app.database import async_session_maker as _default_sm
+
+    sm = session_maker or _default_sm
+    since = utcnow() - timedelta(hours=hours)
+    async with sm() as db:
+        recent = (await db.execute(
+            select(Position.account_id, Position.closed_at).where(
+                Position.status == "closed",
+                Position.closed_at >= since,
+                Position.account_id.isnot(None),
+            )
+        )).all()
+        buckets = {(r.account_id, r.closed_at.date()) for r in recent}
+        for account_id, day in sorted(buckets):
+            await rebuild_rollup_day(db, account_id, day)
+        await db.commit()
+    return len(buckets)
+
+
+async def ensure_rollups_built(session_maker=None) -> None:
+    """Backfill on first startup after the rollup table appears (empty table, closed positions exist)."""
+    from app.database import async_session_maker as _default_sm
+
+    sm = session_maker or _default_sm
+    async with sm() as db:
+        has_rollups = (await db.execute(select(PnlDailyRollup.id).limit(1))).first()
+        if has_rollups is not None:
+            return
+        has_closed = (await db.execute(
+            select(Position.id).where(Position.status == "closed", Position.closed_at.isnot(None)).limit(1)
+        )).first()
+        if has_closed is None:
+            return
+        written = await rebuild_rollups(db)
+        await db.commit()
+    logger.info(f"P&L rollups backfilled: {written} rows")
+
+
+async def run_pnl_rollup_maintenance_once(session_maker=None) -> None:
+    """First-run backfill, then reconcile recent days. Called by APScheduler."""
+    try:
+        await ensure_rollups_built(session_maker)
+        refreshed = await reconcile_recent_rollups(session_maker)
+        logger.debug(f"P&L rollups reconciled: {refreshed} account-days")
+    except Exception as e:
+        logger.error(f"P&L rollup maintenance failed: {e}", exc_info=True)
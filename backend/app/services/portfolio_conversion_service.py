@@ -7,6 +7,7 @@ import logging
 from typing import Dict, List, Optional
 
 from app.constants import BUY_FEE_RESERVE
+from app.json_response import utc_isoformat
 from app.services.exchange_service import get_exchange_client_for_account
 
 logger = logging.getLogger(__name__)
@@ -41,7 +42,7 @@ def init_task(task_id: str, user_id: int) -> None:
         "failed_count": 0,
         "errors": [],
         "message": "Initializing...",
-        "started_at": utcnow().isoformat(),
+        "started_at": utc_isoformat(utcnow()),
         "completed_at": None,
     }
 
@@ -72,7 +73,7 @@ def update_task_progress(
             "failed_count": 0,
             "errors": [],
             "message": "",
-            "started_at": utcnow().isoformat(),
+            "started_at": utc_isoformat(utcnow()),
             "completed_at": None,
         }
 
@@ -94,7 +95,7 @@ def update_task_progress(
         task["errors"] = errors
 
     if status == "completed" or status == "failed":
-        task["completed_at"] = utcnow().isoformat()
+        task["completed_at"] = utc_isoformat(utcnow())
 
     # Calculate progress percentage
     if task["total"] > 0:
@@ -112,7 +113,7 @@ def cleanup_old_tasks():
 
     for task_id, task in _conversion_tasks.items():
         if task.get("completed_at"):
-            completed = datetime.fromisoformat(task["completed_at"])
+            completed = datetime.fromisoformat(task["completed_at"]).replace(tzinfo=None)
             if completed < cutoff:
                 to_remove.append(task_id)
 
@@ -12,6 +12,7 @@ from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.json_response import utc_isoformat
 from app.models import Account, Report, ReportGoal, ReportSchedule, User
 from app.services.account_access import accessible_accounts_filter, manager_account_ids
 
@@ -109,19 +110,19 @@ def report_to_dict(report: Report, include_html: bool = False) -> dict:
         "account_id": report.account_id,
         "schedule_id": report.schedule_id,
         "schedule_name": schedule_name,
-        "period_start": report.period_start.isoformat() if report.period_start else None,
-        "period_end": report.period_end.isoformat() if report.period_end else None,
+        "period_start": utc_isoformat(report.period_start) if report.period_start else None,
+        "period_end": utc_isoformat(report.period_end) if report.period_end else None,
         "periodicity": report.periodicity,
         "report_data": report.report_data,
         "ai_summary": ai_summary,
         "ai_provider_used": report.ai_provider_used,
         "delivery_status": report.delivery_status,
-        "delivered_at": report.delivered_at.isoformat() if report.delivered_at else None,
+        "delivered_at": utc_isoformat(report.delivered_at) if report.delivered_at else None,
         "delivery_recipients": report.delivery_recipients,
         "generation_status": getattr(report, "generation_status", "complete"),
         "generation_error": getattr(report, "generation_error", None),
         "has_pdf": report.pdf_content is not None,
-        "created_at": report.created_at.isoformat() if report.created_at else None,
+        "created_at": utc_isoformat(report.created_at) if report.created_at else None,
     }
     if include_html:
         result["html_content"] = report.html_content
@@ -23,6 +23,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import PendingOrder, Position
 from app.services.exchange_service import get_exchange_client_for_account
+from app.services.order_status_poller import poll_pending_orders
 from app.utils.timeutil import utcnow
 
 logger = logging.getLogger(__name__)
@@ -123,32 +124,15 @@ async def _check_all_pending_safety_orders_scoped(session_maker) -> None:
     async with session_maker() as db:
         snapshots = await _snapshot_pending_safety_orders(db)
 
-    by_account: Dict[int, List[PendingSafetyOrderSnapshot]] = {}
-    for snapshot in snapshots:
-        by_account.setdefault(snapshot.account_id, []).append(snapshot)
-
-    for account_id, items in by_account.items():
-        try:
-            async with session_maker() as db:
-                exchange = await get_exchange_client_for_account(db, account_id)
-            if not exchange:
-                logger.warning(
-                    f"No exchange client for account {account_id}; "
-                    f"skipping {len(items)} pending safety order(s) this cycle"
-                )
-                continue
-            for snapshot in items:
-                try:
-                    order_data = await _poll_safety_order_without_db(exchange, snapshot)
-                    await _apply_polled_safety_order(session_maker, snapshot, exchange, order_data)
-                except Exception as e:
-                    logger.error(
-                        f"Error reconciling safety order {snapshot.order_id} "
-                        f"for account {account_id}: {e}",
-                        exc_info=True,
-                    )
-        except Exception as e:
-            logger.error(f"Error reconciling safety orders for account {account_id}: {e}")
+    # Late-bound so the module attributes stay patchable
+    await poll_pending_orders(
+        session_maker,
+        snapshots,
+        kind="safety",
+        resolve_exchange=lambda db, account_id: get_exchange_client_for_account(db, account_id),
+        poll_one=lambda exchange, snapshot: _poll_safety_order_without_db(exchange, snapshot),
+        apply=lambda *args: _apply_polled_safety_order(*args),
+    )
 
 
 async def check_all_pending_safety_orders(db: AsyncSession = None, *, session_maker=None) -> None:
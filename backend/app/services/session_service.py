@@ -169,6 +169,14 @@ async def end_session(session_id: str, db: AsyncSession) -> bool:
 
 async def check_session_valid(session_id: str, db: AsyncSession) -> bool:
     """Check if a session is still active and not expired."""
+    return await get_valid_session(session_id, db) is not None
+
+
+async def get_valid_session(session_id: str, db: AsyncSession) -> Optional[ActiveSession]:
+    """Return the session if it is still active and not expired, else None.
+
+    An expired session found here is marked inactive.
+    """
     result = await db.execute(
         select(ActiveSession).where(
             and_(
@@ -179,15 +187,15 @@ async def check_session_valid(session_id: str, db: AsyncSession) -> bool:
     )
     session = result.scalar_one_or_none()
     if not session:
-        return False
+        return None
 
     # Check expiry
     if session.expires_at and utcnow() > session.expires_at:
         session.is_active = False
         session.ended_at = utcnow()
-        return False
+        return None
 
-    return True
+    return session
 
 
 async def expire_stale_sessions_for_user(user_id: int, db: AsyncSession):
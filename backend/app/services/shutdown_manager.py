@@ -11,6 +11,8 @@ import logging
 from datetime import datetime
 from typing import Optional
 
+from app.json_response import utc_isoformat
+
 logger = logging.getLogger(__name__)
 
 
@@ -150,7 +152,9 @@ class ShutdownManager:
         return {
             "shutting_down": self._shutting_down,
             "in_flight_count": self._in_flight_count,
-            "shutdown_requested_at": self._shutdown_requested_at.isoformat() if self._shutdown_requested_at else None,
+            "shutdown_requested_at": (
+                utc_isoformat(self._shutdown_requested_at) if self._shutdown_requested_at else None
+            ),
         }
 
 
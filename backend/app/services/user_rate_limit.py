@@ -1,7 +1,8 @@
 """
-Per-user sliding-window rate limiter.
+Per-user rate limiter.
 
-In-memory limiter keyed by (user_id, bucket). Designed for authenticated
+In-memory GCRA limiter (app.rate_limit_engine) keyed by (user_id, bucket):
+one timestamp per key, O(1) per check. Designed for authenticated
 endpoints that need defensive throttling on top of the IP-based public
 limiter in app.middleware.public_rate_limit.
 
@@ -15,21 +16,26 @@ Typical use:
         window_seconds=3600,
     )  # raises HTTPException(429) when exceeded
 
-State lives in a module-level dict; one process only. For multi-process
-deployments, swap the backing store for Redis without changing callers.
+A fresh key admits max_requests back to back, then one more every
+window_seconds / max_requests. These checks are synchronous, so state is
+per process; the engine's async API shares it through Redis when attached.
 """
 
-import time
-from collections import defaultdict
-from threading import Lock
+import math
 
 from fastapi import HTTPException
 
-_buckets: dict[tuple[int, str], list[float]] = defaultdict(list)
-_lock = Lock()
+from app.rate_limit_engine import RateLimitEngine
 
-# Entries older than this are eligible for pruning.
-_STALE_SECONDS = 7200.0
+_limiter = RateLimitEngine("user")
+
+
+def _raise_429(message: str, retry_after: float) -> None:
+    raise HTTPException(
+        status_code=429,
+        detail=message,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
 
 
 def check_user_rate_limit(
@@ -43,27 +49,12 @@ def check_user_rate_limit(
     """
     Raise HTTPException(429) if user_id has exceeded max_requests in the window.
 
-    Records a successful request (adds timestamp to bucket) when under the
-    limit — do not call this on code paths you don't want to count.
+    Records a successful request when under the limit — do not call this on
+    code paths you don't want to count.
     """
-    key = (user_id, bucket)
-    now = time.time()
-    cutoff = now - window_seconds
-
-    with _lock:
-        timestamps = _buckets[key]
-        # Drop expired entries in-place
-        timestamps[:] = [t for t in timestamps if t > cutoff]
-
-        if len(timestamps) >= max_requests:
-            retry_after = int(window_seconds - (now - timestamps[0])) + 1
-            raise HTTPException(
-                status_code=429,
-                detail=message,
-                headers={"Retry-After": str(max(1, retry_after))},
-            )
-
-        timestamps.append(now)
+    decision = _limiter.hit((user_id, bucket), max_requests, window_seconds)
+    if not decision.allowed:
+        _raise_429(message, decision.retry_after)
 
 
 def record_user_failure(
@@ -80,39 +71,18 @@ def record_user_failure(
     meant to be called only on failed attempts (e.g., bad MFA code) so
     successful requests don't count toward the limit.
     """
-    key = (user_id, f"fail:{bucket}")
-    now = time.time()
-    cutoff = now - window_seconds
-
-    with _lock:
-        timestamps = _buckets[key]
-        timestamps[:] = [t for t in timestamps if t > cutoff]
-        timestamps.append(now)
-
-        if len(timestamps) >= max_failures:
-            retry_after = int(window_seconds - (now - timestamps[0])) + 1
-            raise HTTPException(
-                status_code=429,
-                detail=message,
-                headers={"Retry-After": str(max(1, retry_after))},
-            )
+    decision = _limiter.hit(
+        (user_id, f"fail:{bucket}"), max_failures, window_seconds, force=True,
+    )
+    if decision.used >= max_failures:
+        _raise_429(message, decision.retry_after)
 
 
 def clear_user_failures(*, user_id: int, bucket: str) -> None:
     """Clear failure count for user_id in bucket. Call after a successful attempt."""
-    key = (user_id, f"fail:{bucket}")
-    with _lock:
-        _buckets.pop(key, None)
+    _limiter.reset((user_id, f"fail:{bucket}"))
 
 
 def prune_stale() -> int:
-    """Remove buckets that haven't been touched recently. Returns count pruned."""
-    now = time.time()
-    with _lock:
-        stale = [
-            key for key, ts in _buckets.items()
-            if not ts or (now - max(ts)) > _STALE_SECONDS
-        ]
-        for key in stale:
-            del _buckets[key]
-    return len(stale)
+    """Remove keys whose budget has fully refilled. Returns count pruned."""
+    return len(_limiter.prune())
@@ -3,22 +3,61 @@ WebSocket Connection Manager for real-time notifications
 
 Manages WebSocket connections and broadcasts order fill events to connected clients.
 Connections are scoped by user_id so notifications only reach the owning user.
+
+Fan-out is queued per connection: a broadcast encodes its message once and
+appends the text frame to each target connection's bounded send queue, and a
+writer task per connection drains that queue to the socket. A slow client
+therefore only backs up its own queue instead of stalling delivery to every
+socket after it. When a queue is full the manager's SlowConsumerPolicy
+decides what gives:
+
+- DROP_OLDEST: discard the oldest queued frame;
+- COALESCE:    superseded snapshot frames (game:player_state, chat:typing for
+               the same room/player or channel/user) are replaced by the newer
+               one even before the queue fills; when full, the oldest
+               coalescible frame goes first, then the oldest frame;
+- DISCONNECT:  close the socket (4011) and let the client reconnect.
+
+Direct replies on the receiving socket (game:error, echo, ...) are still
+sent inline by the receive loop; only fan-out goes through the queues.
 """
 
 import logging
 from app.utils.timeutil import utcnow
 import asyncio
+import time
+from collections import deque
 from dataclasses import dataclass
+from enum import Enum
 from typing import Optional
 
 from fastapi import WebSocket
 
+from app.json_response import dumps
+
 logger = logging.getLogger(__name__)
 
 # Limits
 MAX_CONNECTIONS_PER_USER = 5
 MAX_MESSAGE_SIZE = 32768  # 32 KB — game state broadcasts (spectator view) need headroom
 RECEIVE_TIMEOUT_SECONDS = 300  # 5 minutes
+SEND_QUEUE_MAX_FRAMES = 256
+SEND_TIMEOUT_SECONDS = 10.0  # a single frame write stuck this long drops the socket
+SLOW_CONSUMER_CLOSE_CODE = 4011
+_LATENCY_SAMPLES = 500
+
+# Message types whose newer frame makes an older queued one obsolete, with the
+# fields that identify "the same" snapshot.
+COALESCE_KEYS = {
+    "game:player_state": ("roomId", "playerId"),
+    "chat:typing": ("channelId", "userId"),
+}
+
+
+class SlowConsumerPolicy(str, Enum):
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+    DISCONNECT = "disconnect"
 
 
 @dataclass
@@ -47,19 +86,140 @@ class OrderFillEvent:
     unexpected_exit: bool = False
 
 
+def _coalesce_key(message: dict) -> Optional[tuple]:
+    msg_type = message.get("type")
+    fields = COALESCE_KEYS.get(msg_type)
+    if fields is None:
+        return None
+    return (msg_type,) + tuple(message.get(f) for f in fields)
+
+
+class _Frame:
+    __slots__ = ("text", "key", "enqueued_at")
+
+    def __init__(self, text: str, key: Optional[tuple], enqueued_at: float):
+        self.text = text
+        self.key = key
+        self.enqueued_at = enqueued_at
+
+
+@dataclass
+class _FanoutStats:
+    encodes: int = 0
+    enqueued: int = 0
+    sent: int = 0
+    send_failures: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+    slow_disconnects: int = 0
+    queue_high_water: int = 0
+
+
+class _Connection:
+    """One accepted socket: its bounded send queue and the writer task draining it."""
+
+    def __init__(self, manager: "WebSocketManager", websocket: WebSocket, user_id: int):
+        self.manager = manager
+        self.websocket = websocket
+        self.user_id = user_id
+        self.queue: deque[_Frame] = deque()
+        self.closed = False
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.task = asyncio.create_task(self._run())
+
+    def offer(self, frame: _Frame) -> bool:
+        """Queue a frame. Returns False if the policy says to disconnect instead."""
+        if self.closed:
+            return True
+        mgr = self.manager
+        policy = mgr.slow_consumer_policy
+        if policy is SlowConsumerPolicy.COALESCE and frame.key is not None:
+            for queued in self.queue:
+                if queued.key == frame.key:
+                    # Drop the stale snapshot and re-append so order follows the newest
+                    self.queue.remove(queued)
+                    mgr._stats.coalesced += 1
+                    break
+        if len(self.queue) >= mgr.max_queue_frames:
+            if policy is SlowConsumerPolicy.DISCONNECT:
+                return False
+            victim = None
+            if policy is SlowConsumerPolicy.COALESCE:
+                victim = next((f for f in self.queue if f.key is not None), None)
+            if victim is not None:
+                self.queue.remove(victim)
+            else:
+                self.queue.popleft()
+            mgr._stats.dropped += 1
+        self.queue.append(frame)
+        mgr._stats.enqueued += 1
+        if len(self.queue) > mgr._stats.queue_high_water:
+            mgr._stats.queue_high_water = len(self.queue)
+        self._idle.clear()
+        self._wakeup.set()
+        return True
+
+    async def wait_idle(self) -> None:
+        await self._idle.wait()
+
+    def close(self) -> None:
+        """Stop the writer and discard anything still queued."""
+        self.closed = True
+        self.queue.clear()
+        self._idle.set()
+        if self.task is not asyncio.current_task():
+            self.task.cancel()
+
+    async def _run(self) -> None:
+        mgr = self.manager
+        try:
+            while True:
+                if not self.queue:
+                    self._idle.set()
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                frame = self.queue.popleft()
+                await asyncio.wait_for(
+                    self.websocket.send_text(frame.text), timeout=SEND_TIMEOUT_SECONDS,
+                )
+                mgr._stats.sent += 1
+                mgr._latency_ms.append((time.monotonic() - frame.enqueued_at) * 1000)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            mgr._stats.send_failures += 1
+            logger.warning(f"Failed to send message to user {self.user_id}: {e}")
+            self.close()
+            await mgr.disconnect(self.websocket)
+
+
 class WebSocketManager:
     """Manages WebSocket connections and broadcasts messages to clients.
 
     Uses Dict[int, Set[WebSocket]] for O(1) user lookups instead of
-    scanning a flat list on every operation.
+    scanning a flat list on every operation. Each socket has a _Connection
+    holding its send queue; broadcasts return once frames are queued.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        slow_consumer_policy: SlowConsumerPolicy = SlowConsumerPolicy.COALESCE,
+        max_queue_frames: int = SEND_QUEUE_MAX_FRAMES,
+    ):
         # user_id → set of WebSocket connections
         self._user_connections: dict[int, set[WebSocket]] = {}
         # WebSocket → user_id (reverse lookup for disconnect)
         self._socket_owners: dict[WebSocket, int] = {}
+        # WebSocket → its send queue + writer task
+        self._connections: dict[WebSocket, _Connection] = {}
         self._lock = asyncio.Lock()
+        self.slow_consumer_policy = SlowConsumerPolicy(slow_consumer_policy)
+        self.max_queue_frames = max_queue_frames
+        self._stats = _FanoutStats()
+        self._latency_ms: deque[float] = deque(maxlen=_LATENCY_SAMPLES)
 
     @property
     def active_connections(self) -> list[tuple[WebSocket, int]]:
@@ -94,6 +254,7 @@ class WebSocketManager:
             await websocket.accept()
             self._user_connections.setdefault(user_id, set()).add(websocket)
             self._socket_owners[websocket] = user_id
+            self._connections[websocket] = _Connection(self, websocket, user_id)
 
         total = sum(len(s) for s in self._user_connections.values())
         logger.info(
@@ -102,60 +263,81 @@ class WebSocketManager:
         )
         return True
 
+    def _unregister(self, websocket: WebSocket) -> None:
+        """Drop a socket from every index and stop its writer. Caller holds _lock."""
+        user_id = self._socket_owners.pop(websocket, None)
+        if user_id is not None:
+            sockets = self._user_connections.get(user_id)
+            if sockets:
+                sockets.discard(websocket)
+                if not sockets:
+                    del self._user_connections[user_id]
+        conn = self._connections.pop(websocket, None)
+        if conn is not None:
+            conn.close()
+
     async def disconnect(self, websocket: WebSocket):
         """Remove a WebSocket connection. O(1) via reverse lookup."""
         async with self._lock:
-            user_id = self._socket_owners.pop(websocket, None)
-            if user_id is not None:
-                sockets = self._user_connections.get(user_id)
-                if sockets:
-                    sockets.discard(websocket)
-                    if not sockets:
-                        del self._user_connections[user_id]
+            self._unregister(websocket)
 
         total = sum(len(s) for s in self._user_connections.values())
         logger.info(f"WebSocket disconnected. Total connections: {total}")
 
-    async def broadcast(self, message: dict, user_id: Optional[int] = None):
-        """
-        Broadcast a message to connected clients.
+    async def _fan_out(self, user_ids: Optional[set[int]], message: dict) -> None:
+        """Encode message once and queue it on every target connection.
 
-        If user_id is provided, only send to that user's connections — O(Cu).
-        If user_id is None, send to all (for system-wide messages) — O(C).
+        user_ids=None targets every connection.
         """
         async with self._lock:
-            if user_id is not None:
-                sockets = list(self._user_connections.get(user_id, ()))
+            if user_ids is None:
+                targets = list(self._connections.values())
             else:
-                sockets = [
-                    ws
-                    for s in self._user_connections.values()
-                    for ws in s
+                targets = [
+                    self._connections[ws]
+                    for uid in user_ids
+                    for ws in self._user_connections.get(uid, ())
+                    if ws in self._connections
                 ]
 
-        if not sockets:
+        if not targets:
             return
 
-        disconnected = []
-        for ws in sockets:
-            try:
-                await ws.send_json(message)
-            except Exception as e:
-                uid = self._socket_owners.get(ws, "?")
-                logger.warning(f"Failed to send message to user {uid}: {e}")
-                disconnected.append(ws)
-
-        # Clean up disconnected clients
-        if disconnected:
-            async with self._lock:
-                for ws in disconnected:
-                    uid = self._socket_owners.pop(ws, None)
-                    if uid is not None:
-                        s = self._user_connections.get(uid)
-                        if s:
-                            s.discard(ws)
-                            if not s:
-                                del self._user_connections[uid]
+        frame = _Frame(dumps(message).decode(), _coalesce_key(message), time.monotonic())
+        self._stats.encodes += 1
+
+        slow = [conn for conn in targets if not conn.offer(frame)]
+        for conn in slow:
+            await self._evict_slow_consumer(conn)
+
+    async def _evict_slow_consumer(self, conn: _Connection) -> None:
+        self._stats.slow_disconnects += 1
+        logger.warning(
+            f"WebSocket for user {conn.user_id} closed: send queue full "
+            f"({self.max_queue_frames} frames)"
+        )
+        async with self._lock:
+            self._unregister(conn.websocket)
+        try:
+            await conn.websocket.close(code=SLOW_CONSUMER_CLOSE_CODE, reason="Slow consumer")
+        except Exception:
+            pass
+
+    async def broadcast(self, message: dict, user_id: Optional[int] = None):
+        """
+        Broadcast a message to connected clients.
+
+        If user_id is provided, only send to that user's connections — O(Cu).
+        If user_id is None, send to all (for system-wide messages) — O(C).
+        Returns once the frame is queued; writer tasks do the socket sends.
+        """
+        await self._fan_out(None if user_id is None else {user_id}, message)
+
+    async def drain(self) -> None:
+        """Wait until every connection's send queue is empty (tests, shutdown)."""
+        conns = list(self._connections.values())
+        if conns:
+            await asyncio.gather(*(conn.wait_idle() for conn in conns))
 
     async def sweep_stale_connections(self) -> int:
         """Remove WebSocket connections that are no longer open. Returns count removed."""
@@ -178,15 +360,46 @@ class WebSocketManager:
         """Return the set of user IDs that have active WebSocket connections. O(1)."""
         return set(self._user_connections.keys())
 
+    def stats(self) -> dict:
+        """Queue depth, send latency (enqueue → written) and fan-out counters."""
+        depths = [len(conn.queue) for conn in self._connections.values()]
+        latencies = sorted(self._latency_ms)
+
+        def pct(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 1)
+
+        s = self._stats
+        return {
+            "policy": self.slow_consumer_policy.value,
+            "connections": len(self._connections),
+            "queued_frames": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "queue_high_water": s.queue_high_water,
+            "queue_limit": self.max_queue_frames,
+            "send_latency_ms": {
+                "count": len(latencies),
+                "p50": pct(0.50),
+                "p95": pct(0.95),
+                "max": round(latencies[-1], 1) if latencies else 0.0,
+            },
+            "encodes": s.encodes,
+            "enqueued": s.enqueued,
+            "sent": s.sent,
+            "send_failures": s.send_failures,
+            "dropped": s.dropped,
+            "coalesced": s.coalesced,
+            "slow_disconnects": s.slow_disconnects,
+        }
+
     async def send_to_user(self, user_id: int, message: dict):
         """Send a message to a specific user's connections."""
         await self.broadcast(message, user_id=user_id)
 
     async def send_to_room(self, player_ids: set[int], message: dict, exclude_user: int | None = None):
-        """Send a message to all players in a room."""
-        for uid in player_ids:
-            if uid != exclude_user:
-                await self.send_to_user(uid, message)
+        """Send a message to all players in a room (encoded once for the whole room)."""
+        await self._fan_out({uid for uid in player_ids if uid != exclude_user}, message)
 
     async def broadcast_order_fill(self, event: OrderFillEvent):
         """Broadcast an order fill event to the owning user's connections"""
@@ -16,6 +16,7 @@ from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import BlacklistedCoin, ScannerLog
+from app.services.candle_archive import get_archived_candles
 
 logger = logging.getLogger(__name__)
 
@@ -111,15 +112,13 @@ async def calculate_volume_sma_50(
             return cached_value
 
     try:
-        # Fetch 55 days of daily candles (extra buffer for calculation)
-        # Calculate start/end timestamps (Coinbase API requires these, not limit)
+        # Fetch 55 days of closed daily candles (extra buffer for calculation)
+        # from the local candle archive, oldest first; only days not archived
+        # yet are requested from the exchange.
         end_time = int(utcnow().timestamp())
         start_time = int((utcnow() - timedelta(days=55)).timestamp())
-        candles = await exchange_client.get_candles(
-            product_id=product_id,
-            granularity="ONE_DAY",
-            start=start_time,
-            end=end_time
+        candles = await get_archived_candles(
+            exchange_client, product_id, start_time, end_time, "ONE_DAY", include_forming=False
         )
 
         if not candles or len(candles) < 50:
@@ -128,7 +127,7 @@ async def calculate_volume_sma_50(
 
         # Extract volumes (candle format: [timestamp, low, high, open, close, volume])
         volumes = []
-        for candle in candles[:50]:  # Use most recent 50 days
+        for candle in candles[-50:]:  # Use most recent 50 days
             if isinstance(candle, dict):
                 volume = float(candle.get("volume", 0))
             else:
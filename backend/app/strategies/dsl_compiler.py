@@ -0,0 +1,390 @@
+"""
+Compiled DSL Scripts
+
+``dsl_interpreter.evaluate`` walks the validated AST on every bot tick:
+``isinstance`` dispatch per node, operator lookup per comparison, argument
+checks per data call. A script only changes when the user edits it, so
+``compile_script`` does that work once and turns the validated statements
+into a ``CompiledScript`` — a tuple of pre-bound Python closures:
+
+- constants (and ``-30``-style negated literals) are folded into the closures
+  that use them;
+- each data call (``rsi(14)``, ``price('BTC-USD')``) becomes a closure bound
+  to its argument and source location;
+- comparisons are bound to their ``operator`` function; ``and``/``or`` keep
+  Python's short-circuit semantics.
+
+Security model
+--------------
+Compilation starts from ``parse_script``, so the AST whitelist and the
+structural checks are exactly those of the interpreter. The closures are
+ordinary functions defined in this module — user text is **never** passed to
+``eval()``, ``exec()``, or ``compile()``, and no code object is generated from
+it. Only the data functions, actions, literals and operators the whitelist
+allows can be reached.
+
+Results (intents, values and ``DSLError`` messages with line/col) match
+``evaluate`` for every script. Errors the interpreter raises at evaluation
+time (missing data, a bare function name in a condition) are still raised at
+evaluation time.
+
+Data calls
+----------
+``CompiledScript.data_calls`` lists every data call the script can make, with
+its literal argument, in order of first appearance — e.g.
+``(DataCall('rsi', 14), DataCall('price', 'ETH-USD'))``. Callers use it to
+fetch the prices and indicators a script needs in one batch before running it.
+
+Compiled scripts are cached by a hash of the script text, so every per-cycle
+strategy instance of a bot reuses one compilation until the script changes.
+"""
+
+import ast
+import hashlib
+import operator
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+from app.strategies.dsl_interpreter import (
+    _DATA_FUNCTIONS,
+    DSLError,
+    OrderIntent,
+    _node_loc,
+    parse_script,
+)
+
+SCRIPT_CACHE_SIZE = 512
+
+Context = Dict[str, Any]
+Expr = Callable[[Context], Any]
+Action = Callable[[Context], OrderIntent]
+
+_CMP_FUNCTIONS = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+
+
+class DataCall(NamedTuple):
+    """One data function call in a script and its literal argument (None when omitted)."""
+    name: str
+    arg: Any = None
+
+
+# ---------------------------------------------------------------------------
+# Expression compilation
+# ---------------------------------------------------------------------------
+
+
+def _raiser(message: str, line: Optional[int], col: Optional[int]) -> Expr:
+    """A closure that raises ``DSLError`` when (and only when) it is evaluated."""
+    def fail(ctx):
+        raise DSLError(message, line, col)
+    return fail
+
+
+def _constant(value: Any) -> Expr:
+    return lambda ctx: value
+
+
+class _Compiler:
+    """Compiles one validated script, recording its data calls as it goes."""
+
+    def __init__(self):
+        self.data_calls: Dict[DataCall, None] = {}
+
+    # -- data functions --
+
+    def data_call(self, call: ast.Call) -> Expr:
+        fname = call.func.id
+        line, col = _node_loc(call)
+
+        if fname in ("price", "rsi"):
+            if len(call.args) != 1 or not isinstance(call.args[0], ast.Constant):
+                if fname == "price":
+                    return _raiser("price() requires exactly one string argument: price('SYMBOL')", line, col)
+                return _raiser("rsi() requires exactly one integer period argument: rsi(14)", line, col)
+            arg = call.args[0].value
+            self.data_calls[DataCall(fname, arg)] = None
+            shown = f"'{arg}'" if fname == "price" else arg
+            missing = f"{fname}({shown}) not available in context"
+
+            def lookup(ctx):
+                data = ctx.get(fname, {})
+                if callable(data):
+                    return data(arg)
+                if arg not in data:
+                    raise DSLError(missing, line, col)
+                return float(data[arg])
+            return lookup
+
+        if fname == "macd":
+            self.data_calls[DataCall("macd")] = None
+
+            def macd(ctx):
+                data = ctx.get("macd", {})
+                if callable(data):
+                    return data()
+                if "line" not in data:
+                    raise DSLError("macd() not available in context", line, col)
+                return float(data["line"])
+            return macd
+
+        if fname in ("bb_pct", "bb"):
+            has_arg = bool(call.args) and isinstance(call.args[0], ast.Constant)
+            arg = call.args[0].value if has_arg else None
+            self.data_calls[DataCall(fname, arg)] = None
+
+            def bb(ctx):
+                data = ctx.get("bb_pct", ctx.get("bb", {}))
+                if callable(data):
+                    return data(arg) if has_arg else data()
+                if isinstance(data, (int, float)):
+                    return float(data)
+                raise DSLError(f"{fname}() not available in context", line, col)
+            return bb
+
+        return _raiser(f"Unknown data function '{fname}'", line, col)
+
+    # -- expressions --
+
+    def expr(self, node: ast.expr) -> Expr:
+        if isinstance(node, ast.Constant):
+            return _constant(node.value)
+
+        if isinstance(node, ast.Name):
+            if node.id == "all":
+                return _constant("all")
+            return _raiser(f"Unexpected bare name '{node.id}'", *_node_loc(node))
+
+        if isinstance(node, ast.UnaryOp):
+            return self._unary(node)
+
+        if isinstance(node, ast.BoolOp):
+            return self._bool_op(node)
+
+        if isinstance(node, ast.Compare):
+            return self._compare(node)
+
+        if isinstance(node, ast.Call):
+            fname = node.func.id
+            if fname in _DATA_FUNCTIONS:
+                return self.data_call(node)
+            return _raiser(f"Action function '{fname}' cannot be used as an expression value", *_node_loc(node))
+
+        return _raiser(f"Cannot evaluate node '{type(node).__name__}'", *_node_loc(node))
+
+    def _unary(self, node: ast.UnaryOp) -> Expr:
+        negate = isinstance(node.op, ast.USub)
+        if not negate and not isinstance(node.op, ast.Not):
+            return _raiser(f"Cannot evaluate node '{type(node).__name__}'", *_node_loc(node))
+
+        if isinstance(node.operand, ast.Constant):
+            value = node.operand.value
+            try:
+                return _constant(-value if negate else not value)
+            except TypeError:
+                pass  # e.g. -'abc': let it raise at evaluation time, like the interpreter
+
+        operand = self.expr(node.operand)
+        if negate:
+            return lambda ctx: -operand(ctx)
+        return lambda ctx: not operand(ctx)
+
+    def _bool_op(self, node: ast.BoolOp) -> Expr:
+        values = tuple(self.expr(v) for v in node.values)
+        if isinstance(node.op, ast.And):
+            if len(values) == 2:
+                first, second = values
+                return lambda ctx: first(ctx) and second(ctx)
+
+            def all_of(ctx):
+                result = True
+                for value in values:
+                    result = value(ctx)
+                    if not result:
+                        return result
+                return result
+            return all_of
+
+        if isinstance(node.op, ast.Or):
+            if len(values) == 2:
+                first, second = values
+                return lambda ctx: first(ctx) or second(ctx)
+
+            def any_of(ctx):
+                result = False
+                for value in values:
+                    result = value(ctx)
+                    if result:
+                        return result
+                return result
+            return any_of
+
+        return _raiser(f"Cannot evaluate node '{type(node).__name__}'", *_node_loc(node))
+
+    def _compare(self, node: ast.Compare) -> Expr:
+        left = self.expr(node.left)
+
+        if len(node.ops) == 1:
+            compare = _CMP_FUNCTIONS[type(node.ops[0])]
+            right_node = node.comparators[0]
+            if isinstance(right_node, ast.Constant):
+                threshold = right_node.value
+                return lambda ctx: compare(left(ctx), threshold)
+            right = self.expr(right_node)
+            return lambda ctx: compare(left(ctx), right(ctx))
+
+        # Chained comparison: like the interpreter, every operand is evaluated
+        # even once the result is known to be False
+        links = tuple(
+            (_CMP_FUNCTIONS[type(op)], self.expr(comparator))
+            for op, comparator in zip(node.ops, node.comparators)
+        )
+
+        def chain(ctx):
+            current = left(ctx)
+            result = True
+            for compare, right in links:
+                value = right(ctx)
+                result = result and compare(current, value)
+                current = value
+            return result
+        return chain
+
+    # -- actions --
+
+    def action(self, call: ast.Call) -> Action:
+        fname = call.func.id
+        side, symbol, size = (self.expr(arg) for arg in call.args)
+
+        if fname == "limit":
+            offset = self.expr(call.keywords[0].value) if call.keywords else None
+
+            def limit(ctx):
+                side_value, symbol_value, raw_size = side(ctx), symbol(ctx), size(ctx)
+                price_offset = str(offset(ctx)) if offset is not None else None
+                if raw_size == "all":
+                    return OrderIntent(
+                        side=side_value, symbol=symbol_value, order_type="limit",
+                        size=None, price_offset=price_offset, size_is_all=True,
+                    )
+                return OrderIntent(
+                    side=side_value, symbol=symbol_value, order_type="limit",
+                    size=float(raw_size), price_offset=price_offset,
+                )
+            return limit
+
+        def market(ctx):
+            side_value, symbol_value, raw_size = side(ctx), symbol(ctx), size(ctx)
+            if raw_size == "all":
+                return OrderIntent(
+                    side=side_value, symbol=symbol_value, order_type="market",
+                    size=None, size_is_all=True,
+                )
+            return OrderIntent(
+                side=side_value, symbol=symbol_value, order_type="market",
+                size=float(raw_size),
+            )
+        return market
+
+
+# ---------------------------------------------------------------------------
+# Public types
+# ---------------------------------------------------------------------------
+
+
+class CompiledScript:
+    """A validated DSL script compiled to closures.
+
+    Attributes:
+        digest: Hash of the script text (the cache key).
+        statements: The validated ``ast.stmt`` objects from ``parse_script``.
+        data_calls: Every data call the script can make, in order of first
+            appearance.
+    """
+
+    __slots__ = ("digest", "statements", "data_calls", "_steps")
+
+    def __init__(
+        self,
+        digest: str,
+        statements: Tuple[ast.stmt, ...],
+        data_calls: Tuple[DataCall, ...],
+        steps: Tuple[Tuple[Optional[Expr], Action], ...],
+    ):
+        self.digest = digest
+        self.statements = statements
+        self.data_calls = data_calls
+        self._steps = steps
+
+    @property
+    def symbols(self) -> FrozenSet[Any]:
+        """Symbols passed to ``price()``."""
+        return frozenset(call.arg for call in self.data_calls if call.name == "price")
+
+    def run(self, context: Context) -> List[OrderIntent]:
+        """Evaluate the script against a market-data context.
+
+        Takes the same context as ``dsl_interpreter.evaluate`` and returns the
+        same intents.
+
+        Raises:
+            DSLError: If evaluation fails due to missing data or invalid arguments.
+        """
+        intents: List[OrderIntent] = []
+        for test, action in self._steps:
+            if test is None or test(context):
+                intents.append(action(context))
+        return intents
+
+
+# ---------------------------------------------------------------------------
+# Public compile entry point
+# ---------------------------------------------------------------------------
+
+
+def script_digest(text: str) -> str:
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def _build(text: str, digest: str) -> CompiledScript:
+    statements = parse_script(text)
+    compiler = _Compiler()
+    steps = []
+    for stmt in statements:
+        if isinstance(stmt, ast.Expr):
+            steps.append((None, compiler.action(stmt.value)))
+        elif isinstance(stmt, ast.If):
+            steps.append((compiler.expr(stmt.test), compiler.action(stmt.body[0].value)))
+    return CompiledScript(digest, tuple(statements), tuple(compiler.data_calls), tuple(steps))
+
+
+_script_cache: "OrderedDict[str, CompiledScript]" = OrderedDict()
+
+
+def compile_script(text: str) -> CompiledScript:
+    """Parse, validate and compile a DSL script, reusing the cached compilation for the same text.
+
+    Raises:
+        DSLError: If the script is invalid or violates the sandbox (see
+            ``parse_script``). Invalid scripts are not cached.
+    """
+    digest = script_digest(text)
+    compiled = _script_cache.get(digest)
+    if compiled is not None:
+        _script_cache.move_to_end(digest)
+        return compiled
+    compiled = _build(text, digest)
+    _script_cache[digest] = compiled
+    if len(_script_cache) > SCRIPT_CACHE_SIZE:
+        _script_cache.popitem(last=False)
+    return compiled
+
+
+def clear_script_cache() -> None:
+    _script_cache.clear()
@@ -6,7 +6,9 @@ domain-specific language (DSL) that is evaluated as a bot strategy.
 
 The sandbox is enforced by the DSL interpreter (``dsl_interpreter.py``).
 User-supplied text is NEVER passed to ``eval()``, ``exec()``, or
-``compile()``; every AST node is whitelisted before execution.
+``compile()``; every AST node is whitelisted before execution. Validated
+scripts are compiled once into closures (``dsl_compiler.py``) and the
+compilation is shared by every instance running the same script text.
 
 Config
 ------
@@ -27,7 +29,7 @@ trigger : str
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 from app.indicator_calculator import IndicatorCalculator
 from app.strategies import (
@@ -36,28 +38,36 @@ from app.strategies import (
     StrategyRegistry,
     TradingStrategy,
 )
-from app.strategies.dsl_interpreter import (
-    DSLError,
-    OrderIntent,
-    evaluate,
-    parse_script,
-)
+from app.strategies.dsl_compiler import compile_script
+from app.strategies.dsl_interpreter import DSLError, OrderIntent
 
 logger = logging.getLogger(__name__)
 
 
+def _rsi_period(arg: Any) -> Optional[int]:
+    """Positive integral period of an ``rsi()`` literal (``14`` or ``14.0``), else None."""
+    if isinstance(arg, bool) or not isinstance(arg, (int, float)):
+        return None
+    if isinstance(arg, float) and not arg.is_integer():
+        return None
+    return int(arg) if arg > 0 else None
+
+
 @StrategyRegistry.register
 class DSLTradingStrategy(TradingStrategy):
     """
     DSL scripting strategy — executes user-authored custom trading logic.
 
     Account-scoped: each instance holds the parsed script for a single bot;
-    no class-level state is shared across accounts.
+    no class-level state is shared across accounts. The compiled script is
+    stateless and cached by script hash, so instances with the same text
+    share it.
     """
 
     def __init__(self, config: Dict[str, Any]):
         # Reset per-instance state before validate_config() runs
         self._parsed_script = None
+        self._compiled_script = None
         self.indicator_calculator = None
         super().__init__(config)
 
@@ -108,8 +118,31 @@ class DSLTradingStrategy(TradingStrategy):
         if not isinstance(script_text, str):
             raise DSLError("'script' config key must be a string")
 
-        # parse_script performs full whitelist validation — fail fast on bad scripts
-        self._parsed_script = parse_script(script_text)
+        # compile_script runs parse_script's full whitelist validation — fail fast on bad scripts
+        self._compiled_script = compile_script(script_text)
+        self._parsed_script = list(self._compiled_script.statements)
+
+    def get_required_indicators(self) -> Set[str]:
+        """Indicator keys (IndicatorCalculator format) the script's data calls read."""
+        required: Set[str] = set()
+        if self._compiled_script is None:
+            return required
+        for call in self._compiled_script.data_calls:
+            if call.name == "rsi":
+                period = _rsi_period(call.arg)
+                if period is not None:
+                    required.add(f"rsi_{period}")
+            elif call.name == "macd":
+                required.add("macd_12_26_9")
+            elif call.name in ("bb_pct", "bb"):
+                required.update({"bb_upper_20_2", "bb_middle_20_2", "bb_lower_20_2"})
+        return required
+
+    def get_required_symbols(self) -> Set[str]:
+        """Symbols the script reads with ``price()``, for callers that prefetch prices."""
+        if self._compiled_script is None:
+            return set()
+        return set(self._compiled_script.symbols)
 
     # ------------------------------------------------------------------
     # Indicator calculation
@@ -120,21 +153,22 @@ class DSLTradingStrategy(TradingStrategy):
         candles: List[Dict[str, Any]],
         current_price: float,
         symbol: Optional[str] = None,
+        prices: Optional[Dict[str, float]] = None,
     ) -> Dict[str, Any]:
-        """Build the data context dict for ``evaluate()``.
-
-        Calculates the indicators referenced by the script and packages them
-        into the format expected by ``dsl_interpreter.evaluate()``.
+        """Build the data context dict for the compiled script.
 
-        We calculate a broad set of indicators regardless of what the script
-        references; the overhead is negligible and avoids having to pre-scan
-        the AST for required indicators.
+        Calculates the indicators the script's data calls reference (see
+        ``get_required_indicators``) in one ``calculate_all_indicators`` call
+        and packages them in the format ``dsl_interpreter.evaluate()`` expects.
 
         Args:
             candles: Recent OHLCV candles (same list as passed to
                 ``analyze_signal``).
             current_price: Current market price.
             symbol: The product symbol for the primary pair (e.g. 'BTC-USD').
+            prices: Prefetched prices for other symbols the script reads
+                (``get_required_symbols``); the primary symbol's price always
+                comes from ``current_price``/the candles.
 
         Returns:
             Context dict with keys ``"price"``, ``"rsi"``, ``"macd"``, and
@@ -142,6 +176,8 @@ class DSLTradingStrategy(TradingStrategy):
         """
         # Always include the current price for the primary symbol
         price_map: Dict[str, float] = {}
+        if prices:
+            price_map.update(prices)
         if symbol:
             price_map[symbol] = current_price
 
@@ -150,13 +186,13 @@ class DSLTradingStrategy(TradingStrategy):
         bb_pct_value: Optional[float] = None
 
         if candles:
-            required = {"rsi_14", "macd_12_26_9", "bb_upper_20_2", "bb_middle_20_2", "bb_lower_20_2"}
+            required = self.get_required_indicators()
             indicators = self.indicator_calculator.calculate_all_indicators(candles, required)
 
             # RSI — expose as {period: value} dict
-            rsi_14 = indicators.get("rsi_14")
-            if rsi_14 is not None:
-                rsi_map[14] = float(rsi_14)
+            for key in required:
+                if key.startswith("rsi_") and indicators.get(key) is not None:
+                    rsi_map[int(key[len("rsi_"):])] = float(indicators[key])
 
             # MACD line
             macd_line = indicators.get("macd_12_26_9")
@@ -206,6 +242,8 @@ class DSLTradingStrategy(TradingStrategy):
         Kwargs:
             symbol: Product pair (e.g. ``'BTC-USD'``) to expose as the
                 ``price()`` key in the context.
+            prices: Optional ``{symbol: price}`` for the other symbols the
+                script reads (see ``get_required_symbols``).
 
         Returns:
             Signal dict with ``signal_type`` ``'dsl_result'``, the list of
@@ -213,15 +251,15 @@ class DSLTradingStrategy(TradingStrategy):
             ``None`` if no intents were produced (script evaluated but no
             conditions were satisfied).
         """
-        if self._parsed_script is None:
-            logger.error("dsl_trading: parsed script is None — validate_config may have been skipped")
+        if self._compiled_script is None:
+            logger.error("dsl_trading: compiled script is None — validate_config may have been skipped")
             return None
 
         symbol = kwargs.get("symbol")
-        context = self._build_context(candles, current_price, symbol=symbol)
+        context = self._build_context(candles, current_price, symbol=symbol, prices=kwargs.get("prices"))
 
         try:
-            intents: List[OrderIntent] = evaluate(self._parsed_script, context)
+            intents: List[OrderIntent] = self._compiled_script.run(context)
         except DSLError as exc:
             logger.warning("dsl_trading: script evaluation error — %s", exc)
             return {
@@ -102,6 +102,11 @@ class IndicatorBasedStrategy(IndicatorCalculationMixin, TradingStrategy):
         self.take_profit_conditions = self.config.get("take_profit_conditions", [])
         self.take_profit_logic = self.config.get("take_profit_logic", "and")
 
+        # Compiled once per config version; strategy instances for the same config share the plans
+        self._base_order_plan = self.phase_evaluator.compile(self.base_order_conditions, self.base_order_logic)
+        self._safety_order_plan = self.phase_evaluator.compile(self.safety_order_conditions, self.safety_order_logic)
+        self._take_profit_plan = self.phase_evaluator.compile(self.take_profit_conditions, self.take_profit_logic)
+
         # Track previous indicators for crossing detection
         self.previous_indicators = None
 
@@ -203,29 +208,44 @@ class IndicatorBasedStrategy(IndicatorCalculationMixin, TradingStrategy):
         """
         Evaluate conditions for each phase (base order, safety order, take profit).
 
-        Handles both grouped and legacy flat condition formats via evaluate_expression.
+        Handles both grouped and legacy flat condition formats. Signals come from
+        the compiled plans; per-condition details are only built when the
+        indicator log will record them (a position is open or a phase fired).
 
         Returns:
             Tuple of (base_order_signal, base_order_details,
                       safety_order_signal, safety_order_details,
                       take_profit_signal, take_profit_details)
         """
-        base_order_signal = False
-        base_order_details: List = []
-        if self.base_order_conditions:
-            base_order_signal, base_order_details = self.phase_evaluator.evaluate_expression(
-                self.base_order_conditions, current_indicators, self.previous_indicators, self.base_order_logic,
-                capture_details=True
-            )
+        phases = (
+            (self.base_order_conditions, self.base_order_logic, self._base_order_plan),
+            (self.safety_order_conditions, self.safety_order_logic, self._safety_order_plan),
+            (self.take_profit_conditions, self.take_profit_logic, self._take_profit_plan),
+        )
+        # pair_processor._log_indicator_evaluations skips pairs with no position and no signal
+        capture_details = position is not None
+        if not capture_details:
+            results = [
+                (plan.evaluate(current_indicators, self.previous_indicators) if conditions else False, [])
+                for conditions, _, plan in phases
+            ]
+            capture_details = any(signal for signal, _ in results)
+        if capture_details:
+            results = [
+                self.phase_evaluator.evaluate_expression(
+                    conditions, current_indicators, self.previous_indicators, logic, capture_details=True
+                ) if conditions else (False, [])
+                for conditions, logic, _ in phases
+            ]
+        (
+            (base_order_signal, base_order_details),
+            (indicator_signal, indicator_details),
+            (take_profit_signal, take_profit_details),
+        ) = results
 
         safety_order_signal = False
         safety_order_details: List = []
         if self.safety_order_conditions:
-            # First evaluate the indicator conditions
-            indicator_signal, indicator_details = self.phase_evaluator.evaluate_expression(
-                self.safety_order_conditions, current_indicators, self.previous_indicators, self.safety_order_logic,
-                capture_details=True
-            )
             safety_order_details = indicator_details
 
             # For DCA, also require the price-move condition (mandatory, regardless of
@@ -241,14 +261,6 @@ class IndicatorBasedStrategy(IndicatorCalculationMixin, TradingStrategy):
                 # No position means DCA not applicable
                 safety_order_signal = indicator_signal
 
-        take_profit_signal = False
-        take_profit_details: List = []
-        if self.take_profit_conditions:
-            take_profit_signal, take_profit_details = self.phase_evaluator.evaluate_expression(
-                self.take_profit_conditions, current_indicators, self.previous_indicators, self.take_profit_logic,
-                capture_details=True
-            )
-
         return (
             base_order_signal, base_order_details,
             safety_order_signal, safety_order_details,
@@ -326,7 +338,8 @@ class IndicatorBasedStrategy(IndicatorCalculationMixin, TradingStrategy):
 
         # Calculate traditional indicators for each required timeframe
         current_indicators = self._calculate_traditional_indicators(
-            candles_by_timeframe, candles, min_candles_needed
+            candles_by_timeframe, candles, min_candles_needed,
+            product_id=kwargs.get("product_id"), streams=kwargs.get("indicator_streams"),
         )
 
         # Calculate aggregate indicators if needed
@@ -54,13 +54,17 @@ class IndicatorCalculationMixin:
         candles_by_timeframe: Dict[str, List[Dict[str, Any]]],
         candles: List[Dict[str, Any]],
         min_candles_needed: int,
+        product_id: Optional[str] = None,
+        streams: Optional[Any] = None,
     ) -> Dict[str, Any]:
         """
         Calculate traditional indicators (RSI, MACD, BB%, etc.) for each required timeframe.
 
         Extracts required indicators from all phase conditions, determines which timeframes
         are needed, then calculates indicators per timeframe with previous-candle values
-        for crossing detection.
+        for crossing detection. With a product_id, the shared incremental indicator state
+        for each product/timeframe is reused across bots and cycles; ``streams``
+        substitutes a private registry (the backtester keeps one per run).
 
         Returns:
             Dict of indicator values keyed by {timeframe}_{indicator_name}.
@@ -89,6 +93,8 @@ class IndicatorCalculationMixin:
                 indicator_name = indicator_key[len(timeframe) + 1:]
                 tf_to_indicators.setdefault(timeframe, set()).add(indicator_name)
 
+        use_stream = bool(product_id) or streams is not None
+
         # Calculate traditional indicators for each timeframe
         for timeframe, tf_required in tf_to_indicators.items():
             tf_candles = candles_by_timeframe.get(timeframe, candles)
@@ -104,6 +110,7 @@ class IndicatorCalculationMixin:
             indicators_for_tf = self.indicator_calculator.calculate_all_indicators(
                 tf_candles, tf_required, calculate_previous=True,
                 previous_indicators_cache=self.previous_indicators,
+                stream_key=(product_id, timeframe) if use_stream else None, streams=streams,
             )
 
             for key, value in indicators_for_tf.items():
@@ -9,12 +9,17 @@ Sell side:
   - Minimum/Trailing mode: blocks if VWAP profit < take_profit_percentage (profit floor).
   - Fixed mode: blocks if VWAP > max_sell_slippage_pct below best bid.
 
+Depth is read from the local order book (monitor/order_book_store.py) when
+it holds a trusted book for the product — no network I/O. Otherwise a REST
+snapshot is fetched and walked the same way.
+
 Gracefully skips when book data is unavailable (paper trading, API errors).
 """
 
 import logging
 from typing import Any, Dict, Optional, Tuple
 
+from app.monitor.order_book_store import LocalOrderBook, order_books
 from app.services.pnl_service import fee_adjusted_tp_floor
 
 logger = logging.getLogger(__name__)
@@ -127,6 +132,12 @@ def calculate_vwap_from_asks(
     return vwap, total_quote, fully_filled
 
 
+async def _fetch_book(exchange: Any, product_id: str) -> LocalOrderBook:
+    """REST snapshot of the book as a private (unshared) LocalOrderBook."""
+    book_data = await exchange.get_product_book(product_id)
+    return LocalOrderBook.from_pricebook(book_data.get("pricebook", book_data))
+
+
 async def check_sell_slippage(
     exchange: Any,
     product_id: str,
@@ -142,8 +153,12 @@ async def check_sell_slippage(
     if not hasattr(exchange, 'get_product_book'):
         return True, None
 
+    with order_books.reading(product_id) as book:
+        if book is not None:
+            return _check_sell_depth(book, position, config)
+
     try:
-        book_data = await exchange.get_product_book(product_id)
+        book = await _fetch_book(exchange, product_id)
     except Exception as e:
         # Fail CLOSED: if we can't fetch the order book, block the trade.
         # During exchange API instability (when slippage is most dangerous),
@@ -151,10 +166,14 @@ async def check_sell_slippage(
         logger.warning(f"Slippage guard: could not fetch book for {product_id}: {e}")
         return False, f"Slippage guard: order book fetch failed for {product_id}: {e}"
 
-    pricebook = book_data.get("pricebook", book_data)
-    bids = pricebook.get("bids", [])
+    return _check_sell_depth(book, position, config)
+
 
-    if not bids:
+def _check_sell_depth(
+    book: LocalOrderBook, position: Any, config: Dict[str, Any]
+) -> Tuple[bool, Optional[str]]:
+    best_bid = book.best_bid
+    if best_bid <= 0:
         logger.debug("Slippage guard: no bids in book, skipping check")
         return True, None
 
@@ -162,7 +181,7 @@ async def check_sell_slippage(
     if not sell_amount or sell_amount <= 0:
         return True, None
 
-    vwap, filled, fully_filled = calculate_vwap_from_bids(bids, sell_amount)
+    vwap, filled, fully_filled = book.sell_vwap(sell_amount)
 
     if vwap <= 0:
         return True, None
@@ -175,8 +194,6 @@ async def check_sell_slippage(
         logger.warning(f"Slippage guard BLOCKED sell: {reason}")
         return False, reason
 
-    best_bid = float(bids[0]["price"])
-
     # Determine TP mode
     take_profit_mode = config.get("take_profit_mode")
     if take_profit_mode is None:
@@ -232,8 +249,12 @@ async def check_buy_slippage(
     if not hasattr(exchange, 'get_product_book'):
         return True, None
 
+    with order_books.reading(product_id) as book:
+        if book is not None:
+            return _check_buy_depth(book, quote_amount, config)
+
     try:
-        book_data = await exchange.get_product_book(product_id)
+        book = await _fetch_book(exchange, product_id)
     except Exception as e:
         # Fail CLOSED: if we can't fetch the order book, block the trade.
         # During exchange API instability (when slippage is most dangerous),
@@ -241,17 +262,21 @@ async def check_buy_slippage(
         logger.warning(f"Slippage guard: could not fetch book for {product_id}: {e}")
         return False, f"Slippage guard: order book fetch failed for {product_id}: {e}"
 
-    pricebook = book_data.get("pricebook", book_data)
-    asks = pricebook.get("asks", [])
+    return _check_buy_depth(book, quote_amount, config)
 
-    if not asks:
+
+def _check_buy_depth(
+    book: LocalOrderBook, quote_amount: float, config: Dict[str, Any]
+) -> Tuple[bool, Optional[str]]:
+    best_ask = book.best_ask
+    if best_ask <= 0:
         logger.debug("Slippage guard: no asks in book, skipping check")
         return True, None
 
     if not quote_amount or quote_amount <= 0:
         return True, None
 
-    vwap, filled_quote, fully_filled = calculate_vwap_from_asks(asks, quote_amount)
+    vwap, filled_quote, fully_filled = book.buy_vwap_quote(quote_amount)
 
     if vwap <= 0:
         return True, None
@@ -264,7 +289,6 @@ async def check_buy_slippage(
         logger.warning(f"Slippage guard BLOCKED buy: {reason}")
         return False, reason
 
-    best_ask = float(asks[0]["price"])
     max_buy_slip = config.get("max_buy_slippage_pct", 0.5)
 
     if best_ask > 0:
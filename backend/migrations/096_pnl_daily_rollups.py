@@ -0,0 +1,81 @@
+"""Add pnl_daily_rollups table (realized P&L per account/bot/product/day).
+
+The table starts empty; the trader's pnl_rollup_maintenance job backfills it on
+first run (or run scripts/rebuild_pnl_rollups.py --yes).
+"""
+
+from migrations.db_utils import get_migration_connection, is_postgres
+
+COLUMNS = """
+    product_id VARCHAR NOT NULL,
+    day DATE NOT NULL,
+    closed_count INTEGER NOT NULL DEFAULT 0,
+    profit_usd FLOAT NOT NULL DEFAULT 0,
+    profit_btc FLOAT NOT NULL DEFAULT 0,
+    profit_quote FLOAT NOT NULL DEFAULT 0,
+    stats_count INTEGER NOT NULL DEFAULT 0,
+    stats_profit_usd FLOAT NOT NULL DEFAULT 0,
+    stats_profit_btc FLOAT NOT NULL DEFAULT 0,
+    win_count INTEGER NOT NULL DEFAULT 0,
+    loss_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP
+"""
+
+
+def run():
+    print("Migration 096: Creating pnl_daily_rollups table...")
+    conn = get_migration_connection()
+    try:
+        cursor = conn.cursor()
+        try:
+            if is_postgres():
+                cursor.execute(
+                    "SELECT 1 FROM information_schema.tables "
+                    "WHERE table_schema = 'reporting' AND table_name = 'pnl_daily_rollups'"
+                )
+            else:
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type='table' AND name='pnl_daily_rollups'"
+                )
+            if cursor.fetchone() is not None:
+                print("  Table pnl_daily_rollups already exists, skipping")
+                return
+
+            if is_postgres():
+                cursor.execute(f"""
+                    CREATE TABLE reporting.pnl_daily_rollups (
+                        id SERIAL PRIMARY KEY,
+                        account_id INTEGER NOT NULL
+                            REFERENCES trading.accounts(id) ON DELETE CASCADE,
+                        bot_id INTEGER,
+                        {COLUMNS}
+                    )
+                """)
+                cursor.execute(
+                    "CREATE INDEX ix_pnl_daily_rollups_account_day "
+                    "ON reporting.pnl_daily_rollups (account_id, day)"
+                )
+            else:
+                cursor.execute(f"""
+                    CREATE TABLE pnl_daily_rollups (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        account_id INTEGER NOT NULL,
+                        bot_id INTEGER,
+                        {COLUMNS}
+                    )
+                """)
+                cursor.execute(
+                    "CREATE INDEX ix_pnl_daily_rollups_account_day "
+                    "ON pnl_daily_rollups (account_id, day)"
+                )
+            conn.commit()
+            print("  Created table pnl_daily_rollups")
+        finally:
+            cursor.close()
+    finally:
+        conn.close()
+    print("Migration 096 complete")
+
+
+if __name__ == "__main__":
+    run()
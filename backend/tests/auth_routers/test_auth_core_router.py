@@ -49,8 +49,7 @@ def _mock_db():
 def _clear_rate_limit_state():
     """Clear in-memory rate limiter state between tests."""
     from app.auth_routers import rate_limiters
-    for store in rate_limiters._CATEGORY_STORE.values():
-        store.clear()
+    rate_limiters._limiter.clear()
     rate_limiters._warmed.clear()
 
 
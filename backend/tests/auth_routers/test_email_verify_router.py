@@ -17,15 +17,14 @@ import pytest
 from fastapi import HTTPException
 from sqlalchemy import select
 
-from app.auth_routers.rate_limiters import _CATEGORY_STORE, _warmed
+from app.auth_routers.rate_limiters import _limiter, _warmed
 from app.auth_routers.schemas import VerifyEmailCodeRequest, VerifyEmailRequest
 from app.models import EmailVerificationToken, User
 
 
 @pytest.fixture(autouse=True)
 def _reset_rate_limiter_state():
-    for store in _CATEGORY_STORE.values():
-        store.clear()
+    _limiter.clear()
     _warmed.clear()
     yield
 
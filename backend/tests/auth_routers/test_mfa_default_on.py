@@ -13,7 +13,6 @@ Coverage:
   - mfa_email_disable blocked when no TOTP fallback
 """
 
-import time
 import pytest
 from fastapi import HTTPException
 from unittest.mock import MagicMock
@@ -126,7 +125,7 @@ class TestDisposableEmailJail:
     def setup_method(self):
         """Clear disposable email jail state before each test."""
         from app.auth_routers import rate_limiters
-        rate_limiters._disposable_email_attempts.clear()
+        rate_limiters._limiter.clear()
         rate_limiters._warmed.discard(("disposable_email", "1.2.3.4"))
 
     def test_first_attempt_not_jailed(self):
@@ -190,13 +189,16 @@ class TestDisposableEmailJail:
         # 1.2.3.4 is jailed — 5.6.7.8 should be fine
         _check_disposable_email_jail("5.6.7.8")   # should not raise
 
-    def test_jail_expires_after_window(self):
+    def test_jail_expires_after_window(self, monkeypatch):
         """Attempts older than the 24h window do not count."""
         from app.auth_routers import rate_limiters
-        # Manually insert timestamps outside the 24h window
-        old_ts = time.time() - (86400 + 60)   # 24h + 1 min ago
-        rate_limiters._disposable_email_attempts["9.9.9.9"] = [old_ts, old_ts]
-        rate_limiters._warmed.add(("disposable_email", "9.9.9.9"))
+        # Record both attempts 24h + 1 min ago
+        local = rate_limiters._limiter.local
+        real_clock = local.clock
+        monkeypatch.setattr(local, "clock", lambda: real_clock() - (86400 + 60))
+        rate_limiters._record_disposable_email_attempt("9.9.9.9")
+        rate_limiters._record_disposable_email_attempt("9.9.9.9")
+        monkeypatch.setattr(local, "clock", real_clock)
         # Should not be jailed — all attempts are stale
         rate_limiters._check_disposable_email_jail("9.9.9.9")
 
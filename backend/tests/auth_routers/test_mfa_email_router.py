@@ -6,7 +6,6 @@ Covers:
 - POST /mfa/resend-email: rate limiting on resend endpoint
 """
 
-import time
 from app.utils.timeutil import utcnow
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -195,7 +194,7 @@ class TestResendEmailRateLimit:
         """Hitting /mfa/resend-email many times should eventually return 429."""
         from app.auth_routers.rate_limiters import (
             _check_mfa_rate_limit,
-            _mfa_attempts,
+            _limiter,
             _LIMITS,
         )
 
@@ -203,8 +202,8 @@ class TestResendEmailRateLimit:
         max_attempts, window = _LIMITS["mfa"]
 
         # Simulate max_attempts worth of attempts
-        now = time.time()
-        _mfa_attempts[token] = [now for _ in range(max_attempts)]
+        for _ in range(max_attempts):
+            _limiter.hit(("mfa", token), max_attempts, window)
 
         with pytest.raises(HTTPException) as exc_info:
             _check_mfa_rate_limit(token)
@@ -212,7 +211,7 @@ class TestResendEmailRateLimit:
         assert exc_info.value.status_code == 429
 
         # Cleanup
-        del _mfa_attempts[token]
+        _limiter.reset(("mfa", token))
 
     @pytest.mark.asyncio
     async def test_resend_rate_limit_applied_in_endpoint(self):
@@ -18,7 +18,7 @@ from fastapi import HTTPException
 from sqlalchemy import select
 
 from app.auth_routers.helpers import verify_password
-from app.auth_routers.rate_limiters import _CATEGORY_STORE, _warmed
+from app.auth_routers.rate_limiters import _limiter, _warmed
 from app.auth_routers.schemas import ForgotPasswordRequest, ResetPasswordRequest
 from app.models import EmailVerificationToken, User
 
@@ -31,8 +31,7 @@ from app.models import EmailVerificationToken, User
 @pytest.fixture(autouse=True)
 def _reset_rate_limiter_state():
     """Clear the auth rate-limit in-memory buckets between tests."""
-    for store in _CATEGORY_STORE.values():
-        store.clear()
+    _limiter.clear()
     _warmed.clear()
     yield
 
@@ -168,7 +168,7 @@ class TestAuthenticatedRequest:
         mock_client.__aenter__ = AsyncMock(return_value=mock_client)
         mock_client.__aexit__ = AsyncMock(return_value=False)
 
-        with patch("app.coinbase_api.auth.httpx.AsyncClient", return_value=mock_client):
+        with patch("app.coinbase_api.auth.http_pool.client", return_value=mock_client):
             result = await authenticated_request(
                 "GET",
                 "/api/v3/brokerage/accounts",
@@ -199,7 +199,7 @@ class TestAuthenticatedRequest:
         mock_client.__aenter__ = AsyncMock(return_value=mock_client)
         mock_client.__aexit__ = AsyncMock(return_value=False)
 
-        with patch("app.coinbase_api.auth.httpx.AsyncClient", return_value=mock_client):
+        with patch("app.coinbase_api.auth.http_pool.client", return_value=mock_client):
             result = await authenticated_request(
                 "POST",
                 "/api/v3/brokerage/orders",
@@ -241,7 +241,7 @@ class TestAuthenticatedRequest:
         mock_client.__aenter__ = AsyncMock(return_value=mock_client)
         mock_client.__aexit__ = AsyncMock(return_value=False)
 
-        with patch("app.coinbase_api.auth.httpx.AsyncClient", return_value=mock_client):
+        with patch("app.coinbase_api.auth.http_pool.client", return_value=mock_client):
             result = await authenticated_request(
                 "GET", "/api/v3/test", auth_type="hmac",
                 api_key="k", api_secret="s",
@@ -271,7 +271,7 @@ class TestAuthenticatedRequest:
         mock_client.__aenter__ = AsyncMock(return_value=mock_client)
         mock_client.__aexit__ = AsyncMock(return_value=False)
 
-        with patch("app.coinbase_api.auth.httpx.AsyncClient", return_value=mock_client):
+        with patch("app.coinbase_api.auth.http_pool.client", return_value=mock_client):
             with pytest.raises(httpx.HTTPStatusError):
                 await authenticated_request(
                     "GET", "/api/v3/test", auth_type="hmac",
@@ -290,7 +290,7 @@ class TestAuthenticatedRequest:
         mock_client.__aenter__ = AsyncMock(return_value=mock_client)
         mock_client.__aexit__ = AsyncMock(return_value=False)
 
-        with patch("app.coinbase_api.auth.httpx.AsyncClient", return_value=mock_client):
+        with patch("app.coinbase_api.auth.http_pool.client", return_value=mock_client):
             with pytest.raises(ValueError, match="Unsupported method: PATCH"):
                 await authenticated_request(
                     "PATCH", "/api/v3/test", auth_type="hmac",
@@ -312,7 +312,7 @@ class TestAuthenticatedRequest:
         mock_client.__aenter__ = AsyncMock(return_value=mock_client)
         mock_client.__aexit__ = AsyncMock(return_value=False)
 
-        with patch("app.coinbase_api.auth.httpx.AsyncClient", return_value=mock_client):
+        with patch("app.coinbase_api.auth.http_pool.client", return_value=mock_client):
             result = await authenticated_request(
                 "DELETE", "/api/v3/test", auth_type="hmac",
                 api_key="k", api_secret="s",
@@ -356,7 +356,7 @@ class TestAuthenticatedRequest401Retry:
         mock_client.__aenter__ = AsyncMock(return_value=mock_client)
         mock_client.__aexit__ = AsyncMock(return_value=False)
 
-        with patch("app.coinbase_api.auth.httpx.AsyncClient", return_value=mock_client):
+        with patch("app.coinbase_api.auth.http_pool.client", return_value=mock_client):
             result = await authenticated_request(
                 "GET", "/api/v3/test", auth_type="cdp",
                 key_name="k", private_key="pk",
@@ -379,7 +379,7 @@ class TestAuthenticatedRequest401Retry:
         mock_client.__aenter__ = AsyncMock(return_value=mock_client)
         mock_client.__aexit__ = AsyncMock(return_value=False)
 
-        with patch("app.coinbase_api.auth.httpx.AsyncClient", return_value=mock_client):
+        with patch("app.coinbase_api.auth.http_pool.client", return_value=mock_client):
             result = await authenticated_request(
                 "GET", "/api/v3/test", auth_type="hmac",
                 api_key="k", api_secret="s",
@@ -400,7 +400,7 @@ class TestAuthenticatedRequest401Retry:
         mock_client.__aenter__ = AsyncMock(return_value=mock_client)
         mock_client.__aexit__ = AsyncMock(return_value=False)
 
-        with patch("app.coinbase_api.auth.httpx.AsyncClient", return_value=mock_client):
+        with patch("app.coinbase_api.auth.http_pool.client", return_value=mock_client):
             with pytest.raises(httpx.HTTPStatusError):
                 await authenticated_request(
                     "GET", "/api/v3/test", auth_type="cdp",
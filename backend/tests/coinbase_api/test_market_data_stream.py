@@ -0,0 +1,352 @@
+"""
+Tests for backend/app/coinbase_api/market_data_stream.py
+
+Runs CoinbaseMarketStream against a local WebSocket stand-in that replays
+recorded Advanced Trade frames.
+
+Covers:
+- Subscriptions: channels + heartbeats on connect, set_products() diffs,
+  removed products forgotten
+- ticker → state + shared price cache (REST get_ticker/get_current_price bypassed),
+  stale tickers not served
+- level2 snapshot/update into the order book store, sequence-gap resnapshot
+- candles → listeners and MultiBotMonitor.apply_stream_candles
+- Reconnect after the server drops / goes idle, state cleared meanwhile
+- bulk_prices_for_products overlay
+"""
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import websockets
+
+import app.coinbase_api.market_data_stream as stream_mod
+from app.cache import api_cache
+from app.coinbase_api.market_data_stream import CoinbaseMarketStream
+
+TICKER = {
+    "channel": "ticker", "client_id": "", "timestamp": "2026-10-16T12:00:00.1Z", "sequence_num": 1,
+    "events": [{"type": "snapshot", "tickers": [{
+        "type": "ticker", "product_id": "ETH-BTC", "price": "0.05010", "volume_24_h": "1520.3",
+        "best_bid": "0.05000", "best_bid_quantity": "3.1", "best_ask": "0.05020", "best_ask_quantity": "2.4",
+    }]}],
+}
+L2_SNAPSHOT = {
+    "channel": "l2_data", "client_id": "", "timestamp": "2026-10-16T12:00:00.2Z", "sequence_num": 2,
+    "events": [{"type": "snapshot", "product_id": "ETH-BTC", "updates": [
+        {"side": "bid", "event_time": "2026-10-16T12:00:00Z", "price_level": "0.05000", "new_quantity": "3.1"},
+        {"side": "bid", "event_time": "2026-10-16T12:00:00Z", "price_level": "0.04990", "new_quantity": "5"},
+        {"side": "offer", "event_time": "2026-10-16T12:00:00Z", "price_level": "0.05020", "new_quantity": "2.4"},
+        {"side": "offer", "event_time": "2026-10-16T12:00:00Z", "price_level": "0.05030", "new_quantity": "7"},
+    ]}],
+}
+L2_UPDATE = {
+    "channel": "l2_data", "client_id": "", "timestamp": "2026-10-16T12:00:00.3Z", "sequence_num": 3,
+    "events": [{"type": "update", "product_id": "ETH-BTC", "updates": [
+        {"side": "offer", "event_time": "2026-10-16T12:00:00Z", "price_level": "0.05020", "new_quantity": "0"},
+        {"side": "bid", "event_time": "2026-10-16T12:00:00Z", "price_level": "0.05005", "new_quantity": "1.5"},
+    ]}],
+}
+CANDLES = {
+    "channel": "candles", "client_id": "", "timestamp": "2026-10-16T12:00:01Z", "sequence_num": 4,
+    "events": [{"type": "update", "candles": [
+        {"start": "1792152300", "high": "0.0503", "low": "0.0499", "open": "0.0500", "close": "0.0502",
+         "volume": "12.5", "product_id": "ETH-BTC"},
+    ]}],
+}
+HEARTBEAT = {
+    "channel": "heartbeats", "client_id": "", "timestamp": "2026-10-16T12:00:01Z", "sequence_num": 5,
+    "events": [{"current_time": "2026-10-16 12:00:01 +0000 UTC", "heartbeat_counter": 1}],
+}
+
+
+def _with_sequence(frame, sequence):
+    return {**frame, "sequence_num": sequence}
+
+
+class ReplayServer:
+    """Local WebSocket stand-in: replays one recorded script per connection."""
+
+    def __init__(self, scripts):
+        self.scripts = list(scripts)
+        self.received = []
+        self.connections = 0
+        self.server = None
+
+    async def _handler(self, ws):
+        script = self.scripts[min(self.connections, len(self.scripts) - 1)]
+        self.connections += 1
+        reader = asyncio.create_task(self._read(ws))
+        try:
+            for step in script:
+                if step == "close":
+                    return
+                if isinstance(step, (int, float)):
+                    await asyncio.sleep(step)
+                    continue
+                await ws.send(json.dumps(step))
+            await ws.wait_closed()  # hold the connection open
+        finally:
+            reader.cancel()
+
+    async def _read(self, ws):
+        async for raw in ws:
+            self.received.append(json.loads(raw))
+
+    @property
+    def url(self):
+        port = self.server.sockets[0].getsockname()[1]
+        return f"ws://127.0.0.1:{port}"
+
+    async def __aenter__(self):
+        self.server = await websockets.serve(self._handler, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+async def _until(predicate, timeout=3.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture(autouse=True)
+async def clear_cache(monkeypatch):
+    monkeypatch.setattr(stream_mod, "RECONNECT_MIN_SECONDS", 0.01)
+    await api_cache.clear()
+    yield
+    await api_cache.clear()
+
+
+@pytest.fixture
+def stream_factory():
+    streams = []
+
+    def make(url, **kwargs):
+        stream = CoinbaseMarketStream(url=url, **kwargs)
+        streams.append(stream)
+        return stream
+
+    yield make
+    for stream in streams:
+        if stream._task is not None:
+            stream._task.cancel()
+
+
+class TestSubscriptions:
+    @pytest.mark.asyncio
+    async def test_subscribes_channels_and_heartbeats(self, stream_factory):
+        """Happy path: one subscribe per channel for the product set, plus heartbeats."""
+        async with ReplayServer([[]]) as server:
+            stream = stream_factory(server.url)
+            await stream.start(["ETH-BTC", "BTC-USD"])
+            await _until(lambda: len(server.received) == 4)
+            await stream.stop()
+
+        assert server.received[0] == {"type": "subscribe", "channel": "heartbeats"}
+        assert {m["channel"] for m in server.received[1:]} == {"ticker", "candles", "level2"}
+        assert all(m["product_ids"] == ["BTC-USD", "ETH-BTC"] for m in server.received[1:])
+
+    @pytest.mark.asyncio
+    async def test_set_products_sends_only_the_diff(self, stream_factory):
+        """Adding/removing products subscribes/unsubscribes just those."""
+        async with ReplayServer([[]]) as server:
+            stream = stream_factory(server.url, channels=("ticker",))
+            await stream.start(["ETH-BTC", "BTC-USD"])
+            await _until(lambda: len(server.received) == 2)
+            await stream.set_products(["ETH-BTC", "SOL-USD"])
+            await _until(lambda: len(server.received) == 4)
+            await stream.stop()
+
+        assert server.received[2:] == [
+            {"type": "unsubscribe", "channel": "ticker", "product_ids": ["BTC-USD"]},
+            {"type": "subscribe", "channel": "ticker", "product_ids": ["SOL-USD"]},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_removed_products_lose_ticker_and_book(self, stream_factory):
+        """Edge case: an unsubscribed product no longer serves its last ticker or book."""
+        async with ReplayServer([[TICKER, L2_SNAPSHOT]]) as server:
+            stream = stream_factory(server.url)
+            await stream.start(["ETH-BTC", "BTC-USD"])
+            await _until(lambda: stream.state.stats_counters["messages"] == 2)
+            assert stream.state.get_ticker("ETH-BTC") is not None
+            assert stream.state.books.pricebook("ETH-BTC") is not None
+
+            await stream.set_products(["BTC-USD"])
+            snapshot = stream.state.get_snapshot()
+            await stream.stop()
+
+        assert stream.state.get_ticker("ETH-BTC") is None
+        assert stream.state.books.pricebook("ETH-BTC") is None
+        assert snapshot["tickers"] == 0 and snapshot["order_books"]["books"] == 0
+
+
+class TestTicker:
+    @pytest.mark.asyncio
+    async def test_ticker_feeds_state_and_price_cache(self, stream_factory):
+        """Ticks land in state and price_{id}; REST get_ticker is not called."""
+        from app.coinbase_api import public_market_data
+
+        async with ReplayServer([[TICKER]]) as server:
+            stream = stream_factory(server.url)
+            with patch.object(stream_mod, "market_data_stream", stream):
+                await stream.start(["ETH-BTC"])
+                await _until(lambda: stream.state.get_price("ETH-BTC") is not None)
+
+                with patch.object(public_market_data, "_public_request", new_callable=AsyncMock) as rest:
+                    ticker = await public_market_data.get_ticker("ETH-BTC")
+                    price = await public_market_data.get_current_price("ETH-BTC")
+                rest.assert_not_called()
+            await stream.stop()
+
+        assert price == pytest.approx(0.0501)
+        assert await api_cache.get("price_ETH-BTC") == pytest.approx(0.0501)
+        assert float(ticker["best_bid"]) == pytest.approx(0.05)
+        assert ticker["source"] == "stream"
+
+    @pytest.mark.asyncio
+    async def test_unstreamed_product_falls_back_to_rest(self, stream_factory):
+        """Failure path: no streamed ticker → the REST endpoint answers."""
+        from app.coinbase_api import market_data_api
+
+        request = AsyncMock(return_value={"best_bid": "1", "best_ask": "2"})
+        assert await market_data_api.get_ticker(request, "DOGE-USD") == {"best_bid": "1", "best_ask": "2"}
+        request.assert_awaited_once()
+
+    def test_stale_ticker_is_not_served(self):
+        """Failure path: a ticker older than ticker_max_age reads as missing (REST answers instead)."""
+        state = stream_mod.MarketDataState(ticker_max_age=5.0)
+        state.connected = True
+        state.update_ticker("ETH-BTC", {"price": 0.0501, "best_bid": 0.05, "best_ask": 0.0502})
+        assert state.get_price("ETH-BTC") == pytest.approx(0.0501)
+
+        with patch.object(stream_mod.time, "time", return_value=time.time() + 6):
+            assert state.get_ticker("ETH-BTC") is None
+            assert state.get_prices(["ETH-BTC"]) == {}
+
+
+class TestLevel2:
+    @pytest.mark.asyncio
+    async def test_snapshot_then_updates(self, stream_factory):
+        """Updates patch the snapshot; zero quantity removes a level."""
+        async with ReplayServer([[L2_SNAPSHOT, L2_UPDATE]]) as server:
+            stream = stream_factory(server.url)
+            await stream.start(["ETH-BTC"])
+            await _until(lambda: stream.state.stats_counters["messages"] == 2)
+            book = stream.state.books.pricebook("ETH-BTC", limit=2)
+            await stream.stop()
+
+        assert book["pricebook"]["bids"] == [{"price": "0.05005", "size": "1.5"}, {"price": "0.05", "size": "3.1"}]
+        assert book["pricebook"]["asks"] == [{"price": "0.0503", "size": "7.0"}]
+
+    @pytest.mark.asyncio
+    async def test_sequence_gap_resnapshots_level2(self, stream_factory):
+        """A dropped message stales the book and re-subscribes level2 for a new snapshot."""
+        fresh_snapshot = _with_sequence(L2_SNAPSHOT, 8)
+        async with ReplayServer([[L2_SNAPSHOT, _with_sequence(L2_UPDATE, 7), 0.2, fresh_snapshot]]) as server:
+            stream = stream_factory(server.url)
+            await stream.start(["ETH-BTC"])
+            await _until(lambda: stream.state.stats_counters["sequence_gaps"] == 1)
+            assert stream.state.books.pricebook("ETH-BTC") is None  # update against the gap was not applied
+            await _until(lambda: stream.state.books.pricebook("ETH-BTC") is not None)
+            resubscribes = [m for m in server.received if m["channel"] == "level2"][1:]
+            await stream.stop()
+
+        assert [m["type"] for m in resubscribes] == ["unsubscribe", "subscribe"]
+        assert stream.state.stats_counters["resnapshots"] == 1
+
+
+class TestCandles:
+    @pytest.mark.asyncio
+    async def test_candles_reach_listeners(self, stream_factory):
+        """Happy path: five-minute candles are handed to listeners per product."""
+        received = []
+        async with ReplayServer([[CANDLES]]) as server:
+            stream = stream_factory(server.url)
+            stream.add_candle_listener(lambda *args: received.append(args))
+            await stream.start(["ETH-BTC"])
+            await _until(lambda: received)
+            await stream.stop()
+
+        ((product_id, granularity, candles),) = received
+        assert (product_id, granularity) == ("ETH-BTC", "FIVE_MINUTE")
+        assert candles[0]["close"] == "0.0502"
+
+    def test_monitor_merges_only_contiguous_candles(self):
+        """The monitor extends a fetched series; cold or gapped series are left to REST."""
+        from app.multi_bot_monitor import MultiBotMonitor
+
+        monitor = MultiBotMonitor()
+        candle = CANDLES["events"][0]["candles"][0]
+        start = int(candle["start"])
+        assert monitor.apply_stream_candles("ETH-BTC", "FIVE_MINUTE", [candle]) == 0  # cold
+
+        series = monitor._candle_store.series("ETH-BTC", "FIVE_MINUTE")
+        series.merge([{**candle, "start": start - 600}])
+        assert monitor.apply_stream_candles("ETH-BTC", "FIVE_MINUTE", [candle]) == 0  # gap
+        series.merge([{**candle, "start": start - 300}])
+        series.fetched_at = 0
+
+        assert monitor.apply_stream_candles("ETH-BTC", "FIVE_MINUTE", [candle]) == 1
+        assert series.last_start == start
+        assert monitor._cached_candles_if_fresh("ETH-BTC", "FIVE_MINUTE", 3)[-1]["close"] == 0.0502
+
+
+class TestReconnect:
+    @pytest.mark.asyncio
+    async def test_reconnects_and_resubscribes_after_drop(self, stream_factory):
+        """Server drop → state cleared, reconnect, same products re-subscribed."""
+        async with ReplayServer([[TICKER, 0.1, "close"], [HEARTBEAT]]) as server:
+            stream = stream_factory(server.url, channels=("ticker",))
+            await stream.start(["ETH-BTC"])
+            await _until(lambda: stream.state.get_price("ETH-BTC") is not None)
+            await _until(lambda: server.connections == 2 and stream.state.connected)
+            await stream.stop()
+
+        assert stream.state.get_price("ETH-BTC") is None
+        assert stream.state.stats_counters["reconnects"] == 1
+        subscribes = [m for m in server.received if m["channel"] == "ticker"]
+        assert len(subscribes) == 2
+
+    @pytest.mark.asyncio
+    async def test_idle_connection_is_recycled(self, stream_factory):
+        """Failure path: no frames within idle_timeout counts as a dead link."""
+        async with ReplayServer([[]]) as server:
+            stream = stream_factory(server.url, idle_timeout=0.05)
+            await stream.start(["ETH-BTC"])
+            await _until(lambda: server.connections >= 2)
+            await stream.stop()
+
+        assert stream.state.stats_counters["reconnects"] >= 1
+
+
+class TestBulkPrices:
+    @pytest.mark.asyncio
+    async def test_streamed_products_skip_the_bulk_list(self):
+        """Streamed prices win; list_products is only fetched for the rest."""
+        from app.coinbase_api import public_market_data
+
+        state = stream_mod.market_data_stream.state
+        state.connected = True
+        state.update_ticker("ETH-BTC", {"price": 0.0501, "best_bid": 0.05, "best_ask": 0.0502})
+        try:
+            with patch.object(public_market_data, "list_products", new_callable=AsyncMock) as list_products:
+                list_products.return_value = [{"product_id": "BTC-USD", "price": "60000"}]
+                prices = await public_market_data.bulk_prices_for_products(["ETH-BTC"])
+                assert prices == {"ETH-BTC": pytest.approx(0.0501)}
+                list_products.assert_not_called()
+
+                prices = await public_market_data.bulk_prices_for_products(["ETH-BTC", "BTC-USD"])
+        finally:
+            state.reset()
+
+        assert prices == {"ETH-BTC": pytest.approx(0.0501), "BTC-USD": 60000.0}
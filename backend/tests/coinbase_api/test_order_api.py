@@ -2,7 +2,7 @@
 Tests for backend/app/coinbase_api/order_api.py
 
 Covers order creation (market, limit, bracket, stop-limit),
-order management (get, cancel, edit, list), and convenience trading methods.
+order management (get, batch get, cancel, edit, list), and convenience trading methods.
 """
 
 import pytest
@@ -19,6 +19,7 @@ from app.coinbase_api.order_api import (
     edit_order,
     edit_order_preview,
     get_order,
+    get_orders,
     list_orders,
     sell_eth_for_btc,
     sell_for_usd,
@@ -205,6 +206,38 @@ class TestGetOrder:
         assert result["status"] == "PENDING"
 
 
+class TestGetOrders:
+    """Tests for get_orders()"""
+
+    @pytest.mark.asyncio
+    async def test_returns_orders_keyed_by_id(self):
+        """Happy path: one batch request, result keyed by order_id."""
+        mock_request = AsyncMock(return_value={"orders": [
+            {"order_id": "a", "status": "OPEN"},
+            {"order_id": "b", "status": "FILLED"},
+        ]})
+
+        result = await get_orders(mock_request, ["a", "b", "c"])
+
+        assert set(result) == {"a", "b"}
+        assert result["b"]["status"] == "FILLED"
+        mock_request.assert_awaited_once_with(
+            "GET", "/api/v3/brokerage/orders/historical/batch",
+            params={"order_ids": ["a", "b", "c"], "limit": 3},
+        )
+
+    @pytest.mark.asyncio
+    @patch("app.coinbase_api.order_api.ORDER_STATUS_BATCH_SIZE", 2)
+    async def test_splits_into_batches(self):
+        """Edge case: more IDs than the batch size take several requests."""
+        mock_request = AsyncMock(return_value={"orders": []})
+
+        await get_orders(mock_request, ["a", "b", "c"])
+
+        chunks = [c.kwargs["params"]["order_ids"] for c in mock_request.await_args_list]
+        assert chunks == [["a", "b"], ["c"]]
+
+
 # ---------------------------------------------------------------------------
 # cancel_order
 # ---------------------------------------------------------------------------
@@ -62,7 +62,7 @@ class TestPublicRequest:
         mock_client.__aenter__ = AsyncMock(return_value=mock_client)
         mock_client.__aexit__ = AsyncMock(return_value=False)
 
-        with patch("app.coinbase_api.public_market_data.httpx.AsyncClient", return_value=mock_client):
+        with patch("app.coinbase_api.public_market_data.http_pool.client", return_value=mock_client):
             result = await _public_request("/api/v3/brokerage/market/products")
 
         assert result == {"products": []}
@@ -86,7 +86,7 @@ class TestPublicRequest:
         mock_client.__aenter__ = AsyncMock(return_value=mock_client)
         mock_client.__aexit__ = AsyncMock(return_value=False)
 
-        with patch("app.coinbase_api.public_market_data.httpx.AsyncClient", return_value=mock_client):
+        with patch("app.coinbase_api.public_market_data.http_pool.client", return_value=mock_client):
             with patch("app.coinbase_api.public_market_data.asyncio.sleep", new_callable=AsyncMock):
                 result = await _public_request("/test")
 
@@ -108,7 +108,7 @@ class TestPublicRequest:
         mock_client.__aenter__ = AsyncMock(return_value=mock_client)
         mock_client.__aexit__ = AsyncMock(return_value=False)
 
-        with patch("app.coinbase_api.public_market_data.httpx.AsyncClient", return_value=mock_client):
+        with patch("app.coinbase_api.public_market_data.http_pool.client", return_value=mock_client):
             with pytest.raises(httpx.HTTPStatusError):
                 await _public_request("/notfound")
 
@@ -120,7 +120,7 @@ class TestPublicRequest:
         mock_client.__aenter__ = AsyncMock(return_value=mock_client)
         mock_client.__aexit__ = AsyncMock(return_value=False)
 
-        with patch("app.coinbase_api.public_market_data.httpx.AsyncClient", return_value=mock_client):
+        with patch("app.coinbase_api.public_market_data.http_pool.client", return_value=mock_client):
             with patch("app.coinbase_api.public_market_data.asyncio.sleep", new_callable=AsyncMock):
                 with pytest.raises(ConnectionError):
                     await _public_request("/failing")
@@ -141,7 +141,7 @@ class TestPublicRequest:
         mock_client.__aenter__ = AsyncMock(return_value=mock_client)
         mock_client.__aexit__ = AsyncMock(return_value=False)
 
-        with patch("app.coinbase_api.public_market_data.httpx.AsyncClient", return_value=mock_client):
+        with patch("app.coinbase_api.public_market_data.http_pool.client", return_value=mock_client):
             await _public_request("/test", params={"key": "value"})
 
         mock_client.get.assert_called_once()
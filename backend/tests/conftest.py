@@ -151,6 +151,62 @@ def mock_exchange_client():
     return client
 
 
+# ---------------------------------------------------------------------------
+# Process-wide in-memory state
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(autouse=True)
+def _isolate_paper_ledger():
+    """The paper ledger caches balances per account id for the whole process;
+    without this, tests reusing an account id would see each other's fills."""
+    from app.services.paper_ledger import paper_ledger
+    paper_ledger.clear()
+    yield
+    paper_ledger.clear()
+
+
+@pytest.fixture(autouse=True)
+def _isolate_principal_cache():
+    """Resolved principals are cached per (jti, sid) for the whole process."""
+    from app.auth.principal_cache import principal_cache
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _isolate_order_books():
+    """Local order books are keyed by product id for the whole process."""
+    from app.monitor.order_book_store import order_books
+    order_books.drop()
+    yield
+    order_books.drop()
+
+
+@pytest.fixture(autouse=True)
+def _isolate_order_status_tracker():
+    """The order-status change trackers remember order ids across poll cycles."""
+    from app.services.order_status_poller import order_change_trackers
+    order_change_trackers.clear()
+    yield
+    order_change_trackers.clear()
+
+
+@pytest.fixture(autouse=True)
+def _isolate_rate_limits():
+    """Rate-limit budgets (auth, per-user, public) live in process-wide engines."""
+    from app.auth_routers import rate_limiters
+    from app.rate_limit_engine import _ENGINES
+    for engine in _ENGINES:
+        engine.clear()
+    rate_limiters._warmed.clear()
+    yield
+    for engine in _ENGINES:
+        engine.clear()
+    rate_limiters._warmed.clear()
+
+
 # ---------------------------------------------------------------------------
 # Sample data factories
 # ---------------------------------------------------------------------------
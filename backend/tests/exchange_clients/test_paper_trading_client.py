@@ -14,8 +14,8 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 from app.exchange_clients.paper_trading_client import (
     PaperTradingClient,
-    _account_balance_locks,
     simulate_slippage_ctx,
+    valuation_prices_ctx,
 )
 
 
@@ -886,6 +886,24 @@ class TestMarketDataDelegation:
             result = await client.get_price("BTC-USD")
             assert result is None
 
+    @pytest.mark.asyncio
+    async def test_get_price_reads_shared_valuation_prices(self):
+        """Happy path: prices set for a valuation pass skip the exchange."""
+        account = _make_mock_account()
+        real_client = _make_mock_real_client(price=42000.0)
+        client = PaperTradingClient(account, _make_mock_db(), real_client=real_client)
+
+        token = valuation_prices_ctx.set({"ETH-BTC": 0.05, "BTC-USD": 100000.0})
+        try:
+            assert await client.get_price("ETH-BTC") == 0.05
+            assert await client.get_btc_usd_price() == 100000.0
+            assert await client.get_price("SOL-USD") == 42000.0  # not in the map
+        finally:
+            valuation_prices_ctx.reset(token)
+
+        real_client.get_current_price.assert_awaited_once_with("SOL-USD")
+        real_client.get_btc_usd_price.assert_not_awaited()
+
     @pytest.mark.asyncio
     async def test_get_candles_with_real_client(self):
         """Happy path: candles delegate to real_client."""
@@ -1027,25 +1045,18 @@ class TestConvenienceMethods:
 
 
 class TestConcurrentBalanceSafety:
-    """Tests for per-account locking and fresh DB reads in place_order.
+    """Tests for the shared paper ledger and fresh DB reads in place_order.
 
     These verify that concurrent paper trading clients sharing the same
     account do not silently overwrite each other's balance changes.
     """
 
-    @pytest.fixture(autouse=True)
-    def clear_lock_registry(self):
-        """Ensure a clean lock registry for each test."""
-        _account_balance_locks.clear()
-        yield
-        _account_balance_locks.clear()
-
     @pytest.mark.asyncio
     async def test_concurrent_buys_same_account_no_balance_loss(self):
         """Happy path: two concurrent buys on the same account both deduct BTC.
 
         Simulates two bots buying different alts from the same paper account.
-        Without locking, last-writer-wins would silently drop one deduction.
+        Without a shared ledger, last-writer-wins would silently drop one deduction.
         """
         ACCOUNT_ID = 3
         initial = {"BTC": 1.0, "ETH": 0.0, "UNI": 0.0}
@@ -1103,11 +1114,9 @@ class TestConcurrentBalanceSafety:
         assert final["ETH"] == pytest.approx(7.0, abs=1e-8)
 
     @pytest.mark.asyncio
-    async def test_lock_released_on_insufficient_balance_error(self):
-        """Failure case: insufficient funds error still releases the lock.
-
-        If the lock wasn't released, a subsequent order would deadlock.
-        """
+    async def test_insufficient_balance_error_then_external_deposit(self):
+        """Failure case: an insufficient-funds rejection changes nothing, and
+        funds added to the row afterwards are merged in for the next order."""
         ACCOUNT_ID = 3
         initial = {"BTC": 0.01, "ETH": 0.0}
         account = _make_mock_account(paper_balances=initial, account_id=ACCOUNT_ID)
@@ -1126,10 +1135,9 @@ class TestConcurrentBalanceSafety:
             # Give the account enough funds via shared DB state
             db_state["balances"] = json.dumps({"BTC": 5.0, "ETH": 0.0})
 
-            # Second order should NOT deadlock (lock was released)
             result = await asyncio.wait_for(
                 client.place_order("ETH-BTC", "buy", "market", funds=0.1),
-                timeout=2.0,  # Would hang forever if lock stuck
+                timeout=2.0,
             )
             assert result["success"] is True
 
@@ -1170,9 +1178,9 @@ class TestConcurrentBalanceSafety:
 
         Regression test for the partial-sell bug: when two bots share a
         paper account, bot B's session could hold a stale transaction
-        snapshot from SQLite WAL mode.  get_balance() now acquires the
-        per-account lock and calls _reload_balances() to force a fresh
-        DB read, ensuring the sell executor sees the true available amount.
+        snapshot from SQLite WAL mode.  get_balance() calls
+        _reload_balances() to force a fresh DB read (outside write-behind),
+        ensuring the sell executor sees the true available amount.
         """
         ACCOUNT_ID = 42
         initial = {"BTC": 1.0, "USD": 500.0}
@@ -1492,6 +1500,25 @@ class TestSlippageSimulation:
         assert float(result["price"]) == pytest.approx(0.055, rel=1e-6)
         assert float(result["average_filled_price"]) == pytest.approx(0.055, rel=1e-6)
 
+    @pytest.mark.asyncio
+    async def test_local_order_book_skips_the_fetch(self):
+        """A live local book prices the fill without calling get_product_book."""
+        from app.monitor.order_book_store import order_books
+
+        order_books.apply_snapshot("ETH-BTC", bids=[(0.049, 3.0), (0.048, 10.0)], asks=[])
+        balances = {"BTC": 0.0, "ETH": 10.0}
+        account = _make_mock_account(paper_balances=balances)
+        real_client = _make_mock_real_client(price=0.050)
+        real_client.get_product_book = AsyncMock()
+        client = PaperTradingClient(account, real_client=real_client)
+
+        simulate_slippage_ctx.set(True)
+
+        await client.place_order(product_id="ETH-BTC", side="sell", order_type="market", size=5.0)
+
+        assert client.balances["BTC"] == pytest.approx(3 * 0.049 + 2 * 0.048, rel=1e-6)
+        real_client.get_product_book.assert_not_called()
+
 
 class TestSessionMakerInjection:
     """
@@ -20,9 +20,9 @@ from app.middleware.public_rate_limit import (
 @pytest.fixture(autouse=True)
 def _reset_limiter_state():
     """Ensure each test starts with an empty IP bucket."""
-    PublicEndpointRateLimiter._ip_timestamps.clear()
+    PublicEndpointRateLimiter._limiter.clear()
     yield
-    PublicEndpointRateLimiter._ip_timestamps.clear()
+    PublicEndpointRateLimiter._limiter.clear()
 
 
 def _build_app(public_paths: list[str], private_paths: list[str] | None = None) -> TestClient:
@@ -107,10 +107,14 @@ class TestPublicEndpointRateLimiter:
             == 200
         )
 
-    def test_prune_stale_removes_inactive_ips(self):
+    def test_prune_stale_removes_inactive_ips(self, monkeypatch):
         """Housekeeping: prune_stale() clears IPs that have gone cold."""
-        # Seed a bucket with only ancient timestamps.
-        PublicEndpointRateLimiter._ip_timestamps["9.9.9.9"] = [0.0]
+        # Spend from a bucket an hour ago; its budget has long since refilled.
+        limiter = PublicEndpointRateLimiter._limiter
+        real_clock = limiter.local.clock
+        monkeypatch.setattr(limiter.local, "clock", lambda: real_clock() - 3600)
+        limiter.hit("9.9.9.9", _MAX_REQUESTS, 60.0)
+        monkeypatch.setattr(limiter.local, "clock", real_clock)
         pruned = PublicEndpointRateLimiter.prune_stale()
         assert pruned >= 1
-        assert "9.9.9.9" not in PublicEndpointRateLimiter._ip_timestamps
+        assert "9.9.9.9" not in limiter
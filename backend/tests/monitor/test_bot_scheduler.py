@@ -0,0 +1,229 @@
+"""
+Tests for backend/app/monitor/bot_scheduler.py
+
+Covers:
+- deadline heap: earliest-first pop, rescheduling, unscheduled bots dropped
+- roster staleness: invalidation and max age
+- cross-process invalidation: web process publishes, trader's handle_message applies
+- wait(): sleeps until the next deadline, woken early by earlier work / events
+- MultiBotMonitor integration: event-driven dispatch without DB re-reads
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.event_bus import BotStartedPayload
+from app.monitor.bot_scheduler import (
+    ROSTER_INVALIDATION_CHANNEL,
+    BotScheduler,
+    RosterEntry,
+    publish_roster_invalidation,
+)
+
+
+class FakeClock:
+    def __init__(self, now=1_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _entry(bot_id):
+    return RosterEntry(bot_id=bot_id, name=f"bot-{bot_id}", check_interval=300, ai_interval=3600)
+
+
+# =============================================================================
+# Deadline heap
+# =============================================================================
+
+
+def test_pop_due_returns_due_bots_earliest_first():
+    clock = FakeClock()
+    scheduler = BotScheduler(clock=clock)
+    scheduler.schedule(1, 1_005)
+    scheduler.schedule(2, 990)
+    scheduler.schedule(3, 1_000)
+
+    assert scheduler.pop_due() == [2, 3]
+    assert scheduler.next_deadline() == 1_005
+    clock.now = 1_005
+    assert scheduler.pop_due() == [1]
+    assert scheduler.next_deadline() is None
+
+
+def test_reschedule_replaces_previous_deadline():
+    scheduler = BotScheduler(clock=FakeClock())
+    scheduler.schedule(1, 900)
+    scheduler.schedule(1, 2_000)  # moved out — the old heap entry is stale
+
+    assert scheduler.pop_due() == []
+    assert scheduler.next_deadline() == 2_000
+    assert scheduler.stats()["scheduled"] == 1
+
+
+def test_set_roster_unschedules_departed_bots():
+    scheduler = BotScheduler(clock=FakeClock())
+    scheduler.set_roster([_entry(1), _entry(2)])
+    scheduler.schedule(1, 900)
+    scheduler.schedule(2, 900)
+
+    scheduler.set_roster([_entry(2)])
+
+    assert scheduler.pop_due() == [2]
+
+
+def test_roster_stale_until_loaded_then_on_invalidate_or_age():
+    clock = FakeClock()
+    scheduler = BotScheduler(roster_max_age=120, clock=clock)
+    assert scheduler.roster_stale
+
+    scheduler.set_roster([_entry(1)])
+    assert not scheduler.roster_stale
+    scheduler.invalidate()
+    assert scheduler.roster_stale
+
+    scheduler.set_roster([_entry(1)])
+    clock.now += 120
+    assert scheduler.roster_stale
+
+
+async def test_bot_event_in_web_process_reaches_trader_roster():
+    """Happy path: a bot started via the web process invalidates the trader's roster over Redis."""
+    redis = MagicMock(publish=AsyncMock())
+    with patch("app.redis_client.get_redis", AsyncMock(return_value=redis)):
+        await publish_roster_invalidation(BotStartedPayload(bot_id=7, user_id=1))
+    channel, raw = redis.publish.call_args.args
+    assert channel == ROSTER_INVALIDATION_CHANNEL
+
+    scheduler = BotScheduler(clock=FakeClock())
+    scheduler.set_roster([_entry(1)])
+    scheduler.handle_message(raw)
+    assert scheduler.roster_stale
+    assert scheduler.stats()["remote_invalidations"] == 1
+
+
+async def test_roster_invalidation_publish_failure_is_swallowed():
+    """Failure: a Redis outage only logs; the max age still bounds staleness."""
+    with patch("app.redis_client.get_redis", AsyncMock(side_effect=ConnectionError("down"))):
+        await publish_roster_invalidation(BotStartedPayload(bot_id=7, user_id=1))
+
+
+# =============================================================================
+# wait()
+# =============================================================================
+
+
+async def test_wait_sleeps_until_next_deadline():
+    scheduler = BotScheduler(clock=time.time)
+    scheduler.set_roster([_entry(1)])
+    scheduler.schedule(1, time.time() + 0.05)
+
+    started = time.perf_counter()
+    await scheduler.wait()
+
+    assert 0.04 <= time.perf_counter() - started < 1.0
+    assert scheduler.pop_due() == [1]
+
+
+async def test_wait_woken_by_earlier_deadline_and_invalidation():
+    scheduler = BotScheduler(clock=time.time)
+    scheduler.set_roster([_entry(1), _entry(2)])
+    scheduler.schedule(1, time.time() + 60)
+
+    waiter = asyncio.create_task(scheduler.wait())
+    await asyncio.sleep(0.01)
+    scheduler.schedule(2, time.time())
+    await asyncio.wait_for(waiter, 1.0)
+
+    waiter = asyncio.create_task(scheduler.wait())
+    await asyncio.sleep(0.01)
+    await scheduler.on_bot_event(object())
+    await asyncio.wait_for(waiter, 1.0)
+    assert scheduler.roster_stale
+
+
+# =============================================================================
+# MultiBotMonitor integration
+# =============================================================================
+
+
+async def test_monitor_dispatches_on_deadline_without_rereading_roster():
+    from app.multi_bot_monitor import MultiBotMonitor
+
+    monitor = MultiBotMonitor()
+    bot = MagicMock()
+    bot.id, bot.name, bot.strategy_config = 1, "Fast", {}
+    bot.check_interval_seconds, bot.last_ai_check = 3600, None
+    bot.get_trading_pairs.return_value = ["BTC-USD"]
+
+    runs = []
+
+    async def _process(bot_id, bot_name, needs_ai_analysis, **_kwargs):
+        runs.append((time.time(), needs_ai_analysis))
+        # Next candle close 50 ms out (what next_check_time_aligned would return)
+        monitor._bot_next_check[bot_id] = monitor.bot_scheduler.now() + 0.05
+        if len(runs) == 3:
+            monitor.running = False
+            monitor.bot_scheduler.invalidate()  # wake the loop so it sees running=False
+
+    session = MagicMock()
+    session.return_value.__aenter__ = AsyncMock(return_value=MagicMock())
+    session.return_value.__aexit__ = AsyncMock(return_value=False)
+    get_bots = AsyncMock(return_value=[bot])
+
+    monitor.running = True
+    with patch("app.multi_bot_monitor.async_session_maker", session), \
+         patch.object(monitor, "get_active_bots", get_bots), \
+         patch.object(monitor, "_process_single_bot", side_effect=_process):
+        await asyncio.wait_for(monitor.monitor_loop(), 5.0)
+
+    assert len(runs) == 3
+    assert get_bots.await_count == 1  # roster loaded once, not per wake-up
+    assert [needs_ai for _, needs_ai in runs] == [True, False, False]
+    assert all(later - earlier >= 0.04 for (earlier, _), (later, _) in zip(runs, runs[1:]))
+
+
+@pytest.mark.parametrize("stop_event", ["bot.stopped", "position.closed"])
+async def test_monitor_reloads_roster_on_bot_event(stop_event):
+    from app.event_bus import InProcessEventBus
+    from app.multi_bot_monitor import MultiBotMonitor
+
+    monitor = MultiBotMonitor()
+    bus = InProcessEventBus()
+    bus.subscribe(stop_event, monitor.bot_scheduler.on_bot_event)
+
+    bot = MagicMock()
+    bot.id, bot.name, bot.strategy_config = 1, "Slow", {}
+    bot.check_interval_seconds, bot.last_ai_check = 3600, None
+    bot.get_trading_pairs.return_value = ["BTC-USD"]
+    monitor._bot_next_check[1] = monitor.bot_scheduler.now() + 600
+
+    loads = []
+
+    async def _get_bots(*_args, **_kwargs):
+        loads.append(time.perf_counter())
+        if len(loads) == 2:
+            monitor.running = False
+            return []
+        return [bot]
+
+    session = MagicMock()
+    session.return_value.__aenter__ = AsyncMock(return_value=MagicMock())
+    session.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    monitor.running = True
+    with patch("app.multi_bot_monitor.async_session_maker", session), \
+         patch.object(monitor, "get_active_bots", side_effect=_get_bots), \
+         patch.object(monitor, "_process_single_bot", new_callable=AsyncMock) as process:
+        loop_task = asyncio.create_task(monitor.monitor_loop())
+        await asyncio.sleep(0.02)
+        await bus.publish(stop_event, object())
+        await asyncio.wait_for(loop_task, 2.0)
+
+    assert len(loads) == 2
+    process.assert_not_awaited()
+    assert monitor.bot_scheduler.roster == {}
@@ -0,0 +1,143 @@
+"""Tests for app/monitor/candle_store.py — shared columnar OHLCV ring buffer."""
+import pytest
+
+from app.monitor.candle_store import CandleSeries, CandleStore
+
+
+def _candle(start, close=1.0, **extra):
+    candle = {"start": start, "open": close, "high": close + 1, "low": close - 1, "close": close, "volume": 10.0}
+    candle.update(extra)
+    return candle
+
+
+# ===========================================================================
+# Class: TestCandleSeries
+# ===========================================================================
+
+
+class TestCandleSeries:
+    """Merge/window semantics of the mirrored ring buffer."""
+
+    def test_rejects_non_positive_capacity(self):
+        with pytest.raises(ValueError):
+            CandleSeries(0)
+
+    def test_merge_appends_in_order_and_coerces_strings(self):
+        """Exchange strings are stored as numbers and come back in the dict shape."""
+        series = CandleSeries(5)
+        appended = series.merge([
+            {"start": "60", "open": "1.5", "high": "2", "low": "1", "close": "1.75", "volume": "3"},
+            _candle(120, close=2.0),
+        ])
+        assert appended == 2
+        assert series.to_dicts(10) == [
+            {"start": 60, "open": 1.5, "high": 2.0, "low": 1.0, "close": 1.75, "volume": 3.0},
+            _candle(120, close=2.0),
+        ]
+
+    def test_same_start_replaces_forming_candle(self):
+        series = CandleSeries(5)
+        series.merge([_candle(60), _candle(120, close=1.0)])
+        version = series.version
+        appended = series.merge([_candle(120, close=5.0)])
+        assert appended == 0
+        assert len(series) == 2
+        assert series.to_dicts(1)[0]["close"] == 5.0
+        assert series.version > version
+
+    def test_older_candles_ignored(self):
+        series = CandleSeries(5)
+        series.merge([_candle(120)])
+        assert series.merge([_candle(60)]) == 0
+        assert series.last_start == 120
+
+    def test_wraparound_keeps_newest_window_contiguous(self):
+        """After the head wraps, every window is still one contiguous view."""
+        series = CandleSeries(4)
+        series.merge([_candle(60 * i, close=float(i)) for i in range(1, 8)])
+        assert len(series) == 4
+        view = series.window(4)
+        assert view["close"].tolist() == [4.0, 5.0, 6.0, 7.0]
+        assert view["close"].base is not None  # a view, not a copy
+        assert series.window(2)["start"].tolist() == [360, 420]
+        assert series.last_start == 420
+
+    def test_window_larger_than_size_returns_everything(self):
+        series = CandleSeries(10)
+        series.merge([_candle(60), _candle(120)])
+        assert len(series.to_dicts(100)) == 2
+        assert series.to_dicts(0) == []
+
+    def test_synthetic_flag_round_trips(self):
+        series = CandleSeries(3)
+        series.merge([_candle(60), _candle(120, _synthetic=True)])
+        first, second = series.to_dicts(2)
+        assert "_synthetic" not in first
+        assert second["_synthetic"] is True
+
+    def test_cached_dicts_built_once_per_version(self):
+        """Reads between merges share one list; a merge or clear rebuilds it."""
+        series = CandleSeries(5)
+        series.merge([_candle(60), _candle(120)])
+        first = series.cached_dicts(2)
+        assert series.cached_dicts(2) is first
+        assert first == series.to_dicts(2)
+        assert series.cached_dicts(1) == [_candle(120)]
+
+        series.merge([_candle(120, close=3.0)])
+        refreshed = series.cached_dicts(2)
+        assert refreshed is not first
+        assert refreshed[-1]["close"] == 3.0
+
+        series.clear()
+        assert series.cached_dicts(2) == []
+
+    def test_clear_resets_contents(self):
+        series = CandleSeries(3)
+        series.merge([_candle(60)])
+        series.depth = 3
+        series.clear()
+        assert len(series) == 0
+        assert series.last_start is None
+        assert series.depth == 0
+
+
+# ===========================================================================
+# Class: TestCandleStore
+# ===========================================================================
+
+
+class TestCandleStore:
+    """Registry and metrics."""
+
+    def test_series_created_once_per_key(self):
+        store = CandleStore(10)
+        a = store.series("ETH-BTC", "ONE_HOUR")
+        assert store.series("ETH-BTC", "ONE_HOUR") is a
+        assert ("ETH-BTC", "ONE_HOUR") in store
+        assert store.get("ETH-BTC", "FIVE_MINUTE") is None
+
+    def test_discard_removes_series(self):
+        store = CandleStore(10)
+        store.series("ETH-BTC", "ONE_HOUR")
+        store.discard(("ETH-BTC", "ONE_HOUR"))
+        assert len(store) == 0
+
+    def test_stats_report_hit_rate_and_bytes_per_pair(self):
+        store = CandleStore(10)
+        store.series("ETH-BTC", "ONE_HOUR")
+        store.series("ETH-BTC", "FIVE_MINUTE")
+        store.series("SOL-BTC", "ONE_HOUR")
+        store.hits, store.misses, store.refreshes = 6, 1, 1
+
+        stats = store.stats()
+        per_series = store.get("SOL-BTC", "ONE_HOUR").nbytes
+        assert stats["series"] == 3
+        assert stats["hit_rate"] == 0.75
+        assert stats["bytes_by_pair"] == {"ETH-BTC": 2 * per_series, "SOL-BTC": per_series}
+        assert stats["total_bytes"] == 3 * per_series
+
+    def test_stats_empty_store(self):
+        stats = CandleStore(10).stats()
+        assert stats["hit_rate"] == 0.0
+        assert stats["bytes_per_pair"] == 0
@@ -0,0 +1,150 @@
+"""Tests for app/monitor/order_book_store.py — locally maintained level-2 books."""
+import random
+import time
+
+import pytest
+
+from app.monitor.order_book_store import LocalOrderBook, OrderBookStore
+from app.trading_engine.book_depth_guard import calculate_vwap_from_asks, calculate_vwap_from_bids
+
+BIDS = [{"price": "99", "size": "5"}, {"price": "100", "size": "3"}, {"price": "98", "size": "0"}]
+ASKS = [{"price": "102", "size": "4"}, {"price": "101", "size": "2"}]
+
+
+def _book():
+    return LocalOrderBook.from_pricebook({"bids": BIDS, "asks": ASKS})
+
+
+# ===========================================================================
+# Class: TestLocalOrderBook
+# ===========================================================================
+
+
+class TestLocalOrderBook:
+    """Sorted-array maintenance and depth walks."""
+
+    def test_snapshot_sorts_and_drops_empty_levels(self):
+        """Happy path: levels come back best-first; zero sizes are not stored."""
+        book = _book()
+        assert book.bids(10) == [(100.0, 3.0), (99.0, 5.0)]
+        assert book.asks(10) == [(101.0, 2.0), (102.0, 4.0)]
+        assert (book.best_bid, book.best_ask) == (100.0, 101.0)
+
+    def test_update_changes_inserts_and_removes_levels(self):
+        """Edge cases: existing level resized, new level inserted mid-book, level removed."""
+        book = _book()
+        book.update("bid", 99.0, 7.0)
+        book.update("bid", 99.5, 1.0)
+        book.update("offer", 101.0, 0)
+        book.update("offer", 150.0, 0)  # removing a missing level is a no-op
+        assert book.bids(10) == [(100.0, 3.0), (99.5, 1.0), (99.0, 7.0)]
+        assert book.asks(10) == [(102.0, 4.0)]
+
+    def test_random_updates_match_a_dict_book(self):
+        """Arrays stay sorted and equal to a reference dict after many updates."""
+        rng = random.Random(3)
+        book = LocalOrderBook()
+        reference = {"bid": {}, "offer": {}}
+        for _ in range(2000):
+            side = rng.choice(["bid", "offer"])
+            price = float(rng.randint(1, 200))
+            size = rng.choice([0.0, rng.uniform(0.1, 5)])
+            book.update(side, price, size)
+            if size > 0:
+                reference[side][price] = size
+            else:
+                reference[side].pop(price, None)
+        assert book.bids(1000) == sorted(reference["bid"].items(), reverse=True)
+        assert book.asks(1000) == sorted(reference["offer"].items())
+
+    def test_vwaps_match_list_walkers(self):
+        """The O(k) walks agree with the REST list walkers in book_depth_guard."""
+        book = _book()
+        bids = [{"price": str(p), "size": str(s)} for p, s in book.bids(10)]
+        asks = [{"price": str(p), "size": str(s)} for p, s in book.asks(10)]
+        for amount in (1.0, 4.0, 20.0):
+            assert book.sell_vwap(amount) == pytest.approx(calculate_vwap_from_bids(bids, amount))
+        for quote in (100.0, 500.0, 5000.0):
+            assert book.buy_vwap_quote(quote) == pytest.approx(calculate_vwap_from_asks(asks, quote))
+
+    def test_buy_vwap_by_base(self):
+        """2 @ 101 + 1 @ 102; more than the book holds is not fully filled."""
+        book = _book()
+        assert book.buy_vwap(3.0) == pytest.approx(((2 * 101 + 102) / 3, 3.0, True))
+        assert book.buy_vwap(10.0)[2] is False
+
+    def test_empty_or_zero_amount(self):
+        """Failure: nothing to walk returns the zero result."""
+        assert LocalOrderBook().sell_vwap(1.0) == (0.0, 0.0, False)
+        assert _book().buy_vwap_quote(0) == (0.0, 0.0, False)
+
+
+# ===========================================================================
+# Class: TestOrderBookStore
+# ===========================================================================
+
+
+class TestOrderBookStore:
+    """Freshness rules and stream/REST precedence."""
+
+    def test_stream_book_trusted_until_marked_stale(self):
+        store = OrderBookStore()
+        store.apply_snapshot("ETH-BTC", [(100, 1)], [(101, 1)])
+        assert store.apply_updates("ETH-BTC", [("bid", 100.5, 2.0)])
+        with store.reading("ETH-BTC") as book:
+            assert book.best_bid == 100.5
+
+        store.mark_stale("stream")
+        assert store.apply_updates("ETH-BTC", [("bid", 100.7, 1.0)]) is False
+        with store.reading("ETH-BTC") as book:
+            assert book is None
+
+    def test_rest_snapshot_expires_and_respects_depth(self):
+        """REST books serve only within max age and up to the depth they were fetched with."""
+        store = OrderBookStore(rest_max_age=60)
+        store.apply_snapshot("ETH-BTC", BIDS, ASKS, source="rest", depth_limit=50)
+        assert store.pricebook("ETH-BTC", 10)["pricebook"]["bids"][0] == {"price": "100.0", "size": "3.0"}
+        assert store.pricebook("ETH-BTC", 100) is None
+
+        store._books["ETH-BTC"].updated_at = time.time() - 61
+        assert store.pricebook("ETH-BTC", 10) is None
+
+    def test_rest_snapshot_never_replaces_live_stream_book(self):
+        store = OrderBookStore()
+        store.apply_snapshot("ETH-BTC", [(100, 1)], [(101, 1)])
+        store.apply_snapshot("ETH-BTC", [(90, 1)], [(91, 1)], source="rest")
+        with store.reading("ETH-BTC") as book:
+            assert (book.source, book.best_bid) == ("stream", 100.0)
+
+    def test_drop_by_source(self):
+        store = OrderBookStore()
+        store.apply_snapshot("ETH-BTC", [(100, 1)], [])
+        store.apply_snapshot("SOL-USD", [(150, 1)], [], source="rest")
+        store.drop("stream")
+        assert len(store) == 1
+        assert store.stats()["books"] == 1
+
+    def test_drop_by_product(self):
+        """Unsubscribed products lose only their stream book."""
+        store = OrderBookStore()
+        store.apply_snapshot("ETH-BTC", [(100, 1)], [])
+        store.apply_snapshot("BTC-USD", [(60000, 1)], [])
+        store.apply_snapshot("SOL-USD", [(150, 1)], [], source="rest")
+        store.drop("stream", ["ETH-BTC", "SOL-USD", "DOGE-USD"])
+        assert store.pricebook("ETH-BTC") is None
+        assert store.pricebook("BTC-USD") is not None
+        assert store.pricebook("SOL-USD") is not None
+
+    def test_quiet_stream_book_expires_and_rest_takes_over(self):
+        """Edge case: a stream book with no traffic past stream_max_age is evicted."""
+        store = OrderBookStore(stream_max_age=30)
+        store.apply_snapshot("ETH-BTC", [(100, 1)], [(101, 1)])
+        store._books["ETH-BTC"].updated_at = time.time() - 31
+
+        assert store.pricebook("ETH-BTC") is None
+        assert len(store) == 0 and store.stats()["expired"] == 1
+
+        store.apply_snapshot("ETH-BTC", [(90, 1)], [(91, 1)], source="rest")
+        with store.reading("ETH-BTC") as book:
+            assert (book.source, book.best_bid) == ("rest", 90.0)
+        assert store.apply_updates("ETH-BTC", [("bid", 95.0, 1.0)]) is False  # REST snapshots are never patched
@@ -9,7 +9,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from app.monitor.pair_processor import process_bot_pair, _log_indicator_evaluations
+from app.monitor.pair_processor import process_bot_pair, _log_indicator_evaluations, _script_data_kwargs
 
 
 # ---------------------------------------------------------------------------
@@ -1168,3 +1168,50 @@ class TestLogIndicatorEvaluationsFiltering:
             )
 
         mock_log.assert_not_called()
+
+
+# ===========================================================================
+# Class: TestScriptDataKwargs
+# ===========================================================================
+
+
+class TestScriptDataKwargs:
+    """Tests for prefetching the prices a DSL script reads."""
+
+    @pytest.mark.asyncio
+    async def test_prefetches_other_symbols_for_dsl_bots(self):
+        """Happy path: price() symbols other than the pair are fetched; the pair is passed as symbol."""
+        from app.strategies.dsl_trading import DSLTradingStrategy
+
+        monitor = _make_monitor()
+        monitor.exchange.get_current_price = AsyncMock(side_effect=lambda s: {"BTC-USD": 100000.0}[s])
+        strategy = DSLTradingStrategy({
+            "script": "if price('BTC-USD') > 90000 and price('ETH-USD') > 1: market('buy', 'ETH-USD', 1)",
+        })
+
+        kwargs = await _script_data_kwargs(monitor, _make_bot(strategy_type="dsl_trading"), "ETH-USD", strategy)
+
+        assert kwargs == {"symbol": "ETH-USD", "prices": {"BTC-USD": 100000.0}}
+        monitor.exchange.get_current_price.assert_awaited_once_with("BTC-USD")
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_is_skipped(self):
+        """Failure: a symbol whose price can't be fetched is left out (the script reports it missing)."""
+        from app.strategies.dsl_trading import DSLTradingStrategy
+
+        monitor = _make_monitor()
+        monitor.exchange.get_current_price = AsyncMock(side_effect=RuntimeError("ticker down"))
+        strategy = DSLTradingStrategy({"script": "if price('BTC-USD') > 1: market('buy', 'ETH-USD', 1)"})
+
+        kwargs = await _script_data_kwargs(monitor, _make_bot(strategy_type="dsl_trading"), "ETH-USD", strategy)
+
+        assert kwargs["prices"] == {}
+
+    @pytest.mark.asyncio
+    async def test_other_strategies_get_nothing(self):
+        """Edge case: non-DSL bots pass no extra kwargs and fetch nothing."""
+        monitor = _make_monitor()
+        monitor.exchange.get_current_price = AsyncMock()
+
+        assert await _script_data_kwargs(monitor, _make_bot(), "ETH-BTC", _make_strategy()) == {}
+        monitor.exchange.get_current_price.assert_not_called()
@@ -14,6 +14,7 @@ from app.models import (
     Account, AIBotLog, BlacklistedCoin, Bot, PendingOrder,
     Position, Trade, User,
 )
+from app.services.pnl_rollup_service import rebuild_rollups
 
 
 # =============================================================================
@@ -1267,6 +1268,7 @@ class TestGetPnlTimeseries:
                 product_id="ETH-USD",
             )
 
+        await rebuild_rollups(db_session)
         result = await get_pnl_timeseries(
             account_id=None,
             db=db_session,
@@ -1335,6 +1337,7 @@ class TestGetPnlTimeseries:
             btc_usd_price_at_close=50000.0,
         )
 
+        await rebuild_rollups(db_session)
         result = await get_pnl_timeseries(
             account_id=None,
             db=db_session,
@@ -1344,6 +1347,48 @@ class TestGetPnlTimeseries:
         # BTC pair: profit_btc should be profit_quote directly
         assert result["summary"][0]["profit_btc"] == 0.002
 
+    @pytest.mark.asyncio
+    async def test_summary_timestamp_is_utc_midnight(self, db_session):
+        """Happy path: each summary point is stamped with its day's UTC midnight."""
+        from app.position_routers.position_query_router import get_pnl_timeseries
+
+        user, account = await _create_user_with_account(db_session)
+        closed_at = utcnow()
+        await _create_position(
+            db_session, account, status="closed", closed_at=closed_at,
+            profit_usd=1.0, product_id="ETH-USD",
+        )
+
+        await rebuild_rollups(db_session)
+        result = await get_pnl_timeseries(account_id=None, db=db_session, current_user=user)
+
+        point = result["summary"][0]
+        assert point["timestamp"] == f"{closed_at.date().isoformat()}T00:00:00Z"
+
+    @pytest.mark.asyncio
+    async def test_closes_without_profit_usd_are_not_counted(self, db_session):
+        """Edge case: closes with no recorded profit_usd stay out of the chart."""
+        from app.position_routers.position_query_router import get_pnl_timeseries
+
+        user, account = await _create_user_with_account(db_session)
+        await _create_position(
+            db_session, account, status="closed", closed_at=utcnow(),
+            profit_usd=4.0, product_id="ETH-USD",
+        )
+        await _create_position(
+            db_session, account, status="closed", closed_at=utcnow(),
+            profit_usd=None, product_id="ETH-USD",
+        )
+        await _create_position(
+            db_session, account, status="closed", closed_at=utcnow(),
+            profit_usd=None, product_id="ADA-USD",
+        )
+
+        await rebuild_rollups(db_session)
+        result = await get_pnl_timeseries(account_id=None, db=db_session, current_user=user)
+
+        assert [(p["product_id"], p["trade_count"]) for p in result["summary"]] == [("ETH-USD", 1)]
+
 
 # =============================================================================
 # GET /positions/completed/stats
@@ -1371,6 +1416,7 @@ class TestGetCompletedTradesStats:
                 btc_usd_price_at_close=50000.0,
             )
 
+        await rebuild_rollups(db_session)
         result = await get_completed_trades_stats(
             account_id=None,
             db=db_session,
@@ -1459,6 +1505,7 @@ class TestGetRealizedPnl:
 
         # Patch the module's "now" source (utcnow helper); real datetime(...)
         # construction is left intact for the period-boundary math.
+        await rebuild_rollups(db_session)
         with patch("app.position_routers.position_query_router.utcnow", return_value=fixed_now):
             result = await get_realized_pnl(
                 account_id=None,
@@ -1509,6 +1556,7 @@ class TestGetRealizedPnl:
             btc_usd_price_at_close=50000.0,
         )
 
+        await rebuild_rollups(db_session)
         result = await get_realized_pnl(
             account_id=None,
             db=db_session,
@@ -1534,6 +1582,7 @@ class TestGetRealizedPnl:
             profit_quote=None,  # NULL — this is the bug scenario
         )
 
+        await rebuild_rollups(db_session)
         result = await get_realized_pnl(
             account_id=None,
             db=db_session,
@@ -1560,6 +1609,7 @@ class TestGetRealizedPnl:
             profit_quote=None,
         )
 
+        await rebuild_rollups(db_session)
         result = await get_realized_pnl(
             account_id=None,
             db=db_session,
@@ -1583,6 +1633,7 @@ class TestGetRealizedPnl:
             profit_quote=None,  # NULL on non-USD pair
         )
 
+        await rebuild_rollups(db_session)
         result = await get_realized_pnl(
             account_id=None,
             db=db_session,
@@ -0,0 +1,208 @@
+"""
+Tests for backend/app/price_feeds/stat_arb_analyzer.py
+
+Covers:
+- Incremental correlation / hedge ratio / z-score parity with numpy over the window
+- Candle grid alignment: missing slots, in-progress candle replacement, late candles
+- get_signal: entry directions, exit with a position, min_samples gating
+- correlation_matrix / top_pairs: one-pass pairwise matrix and ranking
+- StatisticalArbitrageStrategy integration
+"""
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from app.price_feeds.stat_arb_analyzer import StatArbAnalyzer
+
+STEP = 3600
+
+
+def _feed(analyzer, n=300, seed=7, products=("A", "B", "NOISE")):
+    """B tracks A's log price (β≈0.8) with noise; NOISE is independent."""
+    rng = random.Random(seed)
+    logs = {p: [] for p in products}
+    a = 100.0
+    for t in range(n):
+        a *= math.exp(rng.gauss(0, 0.01))
+        prices = {"A": a, "B": 3 * a ** 0.8 * math.exp(rng.gauss(0, 0.004)), "NOISE": rng.uniform(1, 2)}
+        for product in products:
+            analyzer.update(product, t * STEP, prices[product])
+            logs[product].append(math.log(prices[product]))
+    return {p: np.array(v) for p, v in logs.items()}
+
+
+def _numpy_stats(x, y):
+    cov = np.cov(x, y, bias=True)[0, 1]
+    beta = cov / np.var(y)
+    spread = x - beta * y
+    return np.corrcoef(x, y)[0, 1], beta, (spread[-1] - spread.mean()) / spread.std()
+
+
+class TestIncrementalStats:
+    def test_matches_numpy_over_rolling_window(self):
+        """Happy path: O(1) updates agree with a full recompute of the last window."""
+        analyzer = StatArbAnalyzer(window=100, granularity_seconds=STEP, min_samples=20)
+        analyzer.track_pair("A", "B")
+        logs = _feed(analyzer)
+
+        corr = analyzer.calculate_correlation("A", "B")
+        signal = analyzer.get_signal("A", "B")
+        expected_corr, expected_beta, expected_z = _numpy_stats(logs["A"][-100:], logs["B"][-100:])
+
+        assert corr.samples == 100
+        assert corr.correlation == pytest.approx(expected_corr, rel=1e-9)
+        assert corr.hedge_ratio == pytest.approx(expected_beta, rel=1e-9)
+        assert signal.z_score == pytest.approx(expected_z, rel=1e-6)
+
+    def test_late_tracking_seeds_from_stored_windows(self):
+        """A pair first queried after the candles arrived is backfilled from the ring buffers."""
+        analyzer = StatArbAnalyzer(window=100, granularity_seconds=STEP, min_samples=20)
+        logs = _feed(analyzer)
+
+        corr = analyzer.calculate_correlation("A", "B")
+        assert corr.correlation == pytest.approx(np.corrcoef(logs["A"][-100:], logs["B"][-100:])[0, 1])
+
+    def test_in_progress_candle_replaces_slot(self):
+        """Edge case: re-sending the open candle replaces, not appends, the sample."""
+        analyzer = StatArbAnalyzer(window=50, granularity_seconds=STEP, min_samples=5)
+        analyzer.track_pair("A", "B")
+        _feed(analyzer, n=30)
+        before = analyzer.calculate_correlation("A", "B").samples
+
+        analyzer.update("A", 29 * STEP + 60, 123.0)
+        analyzer.update("A", 29 * STEP + 120, 124.0)
+
+        assert analyzer.calculate_correlation("A", "B").samples == before
+
+    def test_unaligned_slots_are_skipped(self):
+        """Edge case: candles one product is missing never enter the pair stats."""
+        analyzer = StatArbAnalyzer(window=50, granularity_seconds=STEP, min_samples=2)
+        for t in range(10):
+            analyzer.update("A", t * STEP, 100 + t)
+            if t % 2 == 0:
+                analyzer.update("B", t * STEP, 50 + t * t)
+        assert analyzer.calculate_correlation("A", "B").samples == 5
+
+    def test_not_enough_samples_returns_none(self):
+        """Failure: below min_samples nothing is reported."""
+        analyzer = StatArbAnalyzer(window=100, granularity_seconds=STEP, min_samples=50)
+        _feed(analyzer, n=20)
+        assert analyzer.calculate_correlation("A", "B") is None
+        assert analyzer.get_signal("A", "B") is None
+
+    def test_ignores_non_positive_prices(self):
+        """Failure: a zero/negative close cannot be logged and is dropped."""
+        analyzer = StatArbAnalyzer(window=10, granularity_seconds=STEP, min_samples=2)
+        analyzer.update("A", 0, 0.0)
+        analyzer.update("A", STEP, -1.0)
+        assert analyzer.correlation_matrix(["A"])[0] == []
+
+
+class TestGetSignal:
+    def _diverged(self, bump):
+        analyzer = StatArbAnalyzer(window=100, granularity_seconds=STEP, min_samples=20)
+        logs = _feed(analyzer, n=120)
+        last = 119 * STEP
+        analyzer.update("A", last, math.exp(logs["A"][-1]) * bump)
+        return analyzer
+
+    def test_spread_above_entry_shorts_the_spread(self):
+        """Pair 1 rich vs pair 2: sell pair 1, buy pair 2."""
+        signal = self._diverged(1.05).get_signal("A", "B", entry_threshold=2.0)
+        assert signal.direction == "short_spread"
+        assert (signal.pair_1_action, signal.pair_2_action) == ("sell", "buy")
+        assert 0 < signal.confidence <= 1
+
+    def test_spread_below_entry_longs_the_spread(self):
+        """Pair 1 cheap vs pair 2: buy pair 1, sell pair 2."""
+        signal = self._diverged(0.95).get_signal("A", "B", entry_threshold=2.0)
+        assert signal.direction == "long_spread"
+        assert (signal.pair_1_action, signal.pair_2_action) == ("buy", "sell")
+
+    def test_exit_once_reverted_with_position(self):
+        """With a position, a z-score inside ±exit signals exit; outside holds."""
+        analyzer = StatArbAnalyzer(window=100, granularity_seconds=STEP, min_samples=20)
+        _feed(analyzer)
+        z = analyzer.get_signal("A", "B").z_score
+        wide = abs(z) + 0.1
+        assert analyzer.get_signal("A", "B", exit_threshold=wide, current_position="long_spread").direction == "exit"
+        assert analyzer.get_signal("A", "B", exit_threshold=wide, current_position="short_spread").direction == "exit"
+        held = analyzer.get_signal("A", "B", exit_threshold=0.0, current_position="long_spread"
+                                   if z < 0 else "short_spread")
+        assert held.direction == "hold"
+
+
+class TestCorrelationMatrix:
+    def test_matrix_matches_numpy(self):
+        """Happy path: one pass gives the full symmetric matrix."""
+        analyzer = StatArbAnalyzer(window=100, granularity_seconds=STEP, min_samples=20)
+        logs = _feed(analyzer)
+
+        products, matrix = analyzer.correlation_matrix()
+
+        assert products == ["A", "B", "NOISE"]
+        expected = np.corrcoef(np.vstack([logs[p][-100:] for p in products]))
+        np.testing.assert_allclose(matrix, expected, rtol=1e-9)
+
+    def test_top_pairs_ranks_correlated_pairs(self):
+        """Only the strongly related pair clears the threshold."""
+        analyzer = StatArbAnalyzer(window=100, granularity_seconds=STEP, min_samples=20)
+        _feed(analyzer)
+        (pair,) = analyzer.top_pairs(min_correlation=0.7)
+        assert pair[:2] == ("A", "B") and pair[2] > 0.9
+
+    def test_too_few_shared_slots_gives_nan(self):
+        """Edge case: products with disjoint candles cannot be compared."""
+        analyzer = StatArbAnalyzer(window=50, granularity_seconds=STEP, min_samples=5)
+        for t in range(10):
+            analyzer.update("A" if t % 2 else "B", t * STEP, 1 + t)
+        _, matrix = analyzer.correlation_matrix()
+        assert np.isnan(matrix[0, 1]) and np.isnan(matrix[1, 0])
+        assert analyzer.top_pairs() == []
+
+    def test_sparse_product_only_blanks_its_own_row(self):
+        """Edge case: a product with 10 closes doesn't NaN the pairs that have 100."""
+        analyzer = StatArbAnalyzer(window=100, granularity_seconds=STEP, min_samples=20)
+        logs = _feed(analyzer, n=100, products=("A", "B"))
+        for t in range(90, 100):
+            analyzer.update("NEW", t * STEP, 5 + t % 3)
+
+        products, matrix = analyzer.correlation_matrix()
+
+        assert products == ["A", "B", "NEW"]
+        np.testing.assert_allclose(matrix[:2, :2], np.corrcoef(logs["A"], logs["B"]), rtol=1e-9)
+        assert np.isnan(matrix[2]).all() and np.isnan(matrix[:, 2]).all()
+        (pair,) = analyzer.top_pairs(min_correlation=0.7)
+        assert pair[:2] == ("A", "B")
+
+    def test_pairs_use_their_own_shared_slots(self):
+        """Edge case: a product with enough closes is compared over the slots it has."""
+        analyzer = StatArbAnalyzer(window=100, granularity_seconds=STEP, min_samples=20)
+        logs = _feed(analyzer, n=100, products=("A", "B"))
+        for t in range(60, 100):
+            analyzer.update("LATE", t * STEP, math.exp(logs["A"][t]))
+
+        _, matrix = analyzer.correlation_matrix()
+
+        np.testing.assert_allclose(matrix[0, 1], np.corrcoef(logs["A"], logs["B"])[0, 1], rtol=1e-9)
+        np.testing.assert_allclose(matrix[1, 2], np.corrcoef(logs["B"][60:], logs["A"][60:])[0, 1], rtol=1e-9)
+        assert matrix[0, 2] == pytest.approx(1.0)
+
+
+class TestStrategyIntegration:
+    @pytest.mark.asyncio
+    async def test_entry_signal_from_analyzer(self):
+        """The strategy turns a diverged spread into a two-leg entry."""
+        from app.strategies.statistical_arbitrage import StatisticalArbitrageStrategy
+
+        strategy = StatisticalArbitrageStrategy({"pair_1": "A", "pair_2": "B"})
+        analyzer = TestGetSignal()._diverged(1.05)
+
+        signal = await strategy.analyze_signal([], 0.0, stat_analyzer=analyzer)
+
+        assert signal["signal"] == "stat_arb_entry"
+        assert signal["direction"] == "short_spread"
+        assert signal["pair_2_size_usd"] == pytest.approx(500 * signal["hedge_ratio"])
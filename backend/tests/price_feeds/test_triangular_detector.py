@@ -0,0 +1,177 @@
+"""
+Tests for backend/app/price_feeds/triangular_detector.py
+
+Covers:
+- Graph construction: 3-cycle enumeration, malformed/duplicate products
+- update_ticker: incremental re-scoring of only the touched cycles
+- find_profitable_paths: fee/threshold filtering, start currencies, ordering
+- Depth: ticker top-of-book size caps and order-book VWAP fills
+- TriangularArbitrageStrategy integration (signal + execution plan)
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from app.price_feeds.base import OrderBook, OrderBookLevel
+from app.price_feeds.triangular_detector import TriangularDetector
+from app.utils.timeutil import utcnow
+
+PRODUCTS = ["ETH-BTC", "BTC-USDT", "ETH-USDT"]
+
+
+def _mispriced(fee_pct="0.1", **sizes):
+    """ETH is 3100 USDT directly but 3000 USDT via BTC (~3.3% edge)."""
+    detector = TriangularDetector(PRODUCTS, fee_pct=Decimal(fee_pct))
+    detector.update_ticker("ETH-BTC", Decimal("0.05"), Decimal("0.05"), sizes.get("eth_btc_bid"),
+                           sizes.get("eth_btc_ask"))
+    detector.update_ticker("BTC-USDT", Decimal("60000"), Decimal("60000"))
+    detector.update_ticker("ETH-USDT", Decimal("3100"), Decimal("3100"))
+    return detector
+
+
+# ===========================================================================
+# Graph construction
+# ===========================================================================
+
+
+class TestGraph:
+    def test_enumerates_both_directions_of_each_triangle(self):
+        """Happy path: one triangle gives two directed cycles."""
+        detector = TriangularDetector(PRODUCTS)
+        assert detector.cycle_count == 2
+
+    def test_skips_malformed_duplicate_and_reverse_pairs(self):
+        """Edge case: bad ids, repeats and QUOTE-BASE duplicates add no edges."""
+        detector = TriangularDetector(PRODUCTS + ["WEIRD", "ETH-BTC", "BTC-ETH", "A-B-C"])
+        assert detector.cycle_count == 2
+        assert "WEIRD" not in detector.currencies
+
+    def test_no_cycles_without_a_closing_pair(self):
+        """Edge case: a chain with no closing edge has nothing to scan."""
+        detector = TriangularDetector(["ETH-BTC", "BTC-USDT"])
+        assert detector.cycle_count == 0
+
+
+# ===========================================================================
+# Incremental scoring
+# ===========================================================================
+
+
+class TestUpdateTicker:
+    def test_rescores_only_cycles_on_the_pair(self):
+        """Happy path: a tick touches the cycles that trade the pair, not the rest."""
+        detector = TriangularDetector(PRODUCTS + ["SOL-USD", "SOL-BTC", "BTC-USD"])
+        assert detector.update_ticker("ETH-USDT", Decimal("3000"), Decimal("3001")) == 2
+        assert detector.update_ticker("SOL-USD", Decimal("150"), Decimal("150.1")) == 2
+
+    def test_unknown_product_is_ignored(self):
+        """Failure: ticks for pairs outside the graph are a no-op."""
+        detector = TriangularDetector(PRODUCTS)
+        assert detector.update_ticker("DOGE-USD", Decimal("0.1"), Decimal("0.1")) == 0
+
+    @pytest.mark.asyncio
+    async def test_cycles_missing_a_price_never_qualify(self):
+        """Edge case: a leg with no ticker yet keeps the cycle unprofitable."""
+        detector = TriangularDetector(PRODUCTS)
+        detector.update_ticker("ETH-BTC", Decimal("0.05"), Decimal("0.05"))
+        detector.update_ticker("ETH-USDT", Decimal("3100"), Decimal("3100"))
+        assert await detector.find_profitable_paths(["ETH"], Decimal("0.1"), Decimal("1")) == []
+
+    @pytest.mark.asyncio
+    async def test_repricing_closes_the_opportunity(self):
+        """A later tick that removes the mispricing drops the path."""
+        detector = _mispriced()
+        detector.update_ticker("ETH-USDT", Decimal("3000"), Decimal("3000"))
+        assert await detector.find_profitable_paths(["ETH"], Decimal("0.01"), Decimal("1")) == []
+
+
+# ===========================================================================
+# find_profitable_paths
+# ===========================================================================
+
+
+class TestFindProfitablePaths:
+    @pytest.mark.asyncio
+    async def test_finds_cycle_with_fees_applied(self):
+        """Happy path: ETH → USDT → BTC → ETH nets the edge minus three fees."""
+        detector = _mispriced(fee_pct="0.1")
+        (best,) = await detector.find_profitable_paths(["ETH"], Decimal("0.1"), Decimal("1"))
+
+        assert str(best.path) == "ETH → USDT → BTC → ETH"
+        assert best.path.pairs == ("ETH-USDT", "BTC-USDT", "ETH-BTC")
+        assert best.path.directions == ("sell", "buy", "buy")
+        expected = Decimal("3100") / Decimal("60000") / Decimal("0.05") * Decimal("0.999") ** 3
+        assert best.end_amount == pytest.approx(expected)
+        assert best.profit_pct == pytest.approx((expected - 1) * 100)
+        assert len(best.fees) == 3 and all(f > 0 for f in best.fees)
+
+    @pytest.mark.asyncio
+    async def test_fees_can_erase_the_edge(self):
+        """Failure: 1.2% per leg exceeds the ~3.3% edge."""
+        detector = _mispriced(fee_pct="1.2")
+        assert await detector.find_profitable_paths(["ETH"], Decimal("0.1"), Decimal("1")) == []
+
+    @pytest.mark.asyncio
+    async def test_each_start_currency_gets_its_rotation(self):
+        """Every requested start currency reports the cycle starting from itself."""
+        detector = _mispriced()
+        paths = await detector.find_profitable_paths(["ETH", "BTC", "USDT", "XRP"], Decimal("0.1"), Decimal("1"))
+        assert sorted(p.path.currencies[0] for p in paths) == ["BTC", "ETH", "USDT"]
+        assert all(p.path.currencies[0] == p.path.currencies[-1] for p in paths)
+
+    @pytest.mark.asyncio
+    async def test_min_profit_threshold(self):
+        """Edge case: a threshold above the edge filters the cycle out."""
+        detector = _mispriced()
+        assert await detector.find_profitable_paths(["ETH"], Decimal("5"), Decimal("1")) == []
+
+
+# ===========================================================================
+# Depth
+# ===========================================================================
+
+
+class TestDepth:
+    @pytest.mark.asyncio
+    async def test_top_of_book_size_caps_leg(self):
+        """Failure: the ETH-BTC ask cannot fill ~1 ETH when only 0.1 ETH is offered."""
+        detector = _mispriced(eth_btc_ask=Decimal("0.1"))
+        assert await detector.find_profitable_paths(["ETH"], Decimal("0.1"), Decimal("1")) == []
+        assert await detector.find_profitable_paths(["ETH"], Decimal("0.1"), Decimal("0.05")) != []
+
+    @pytest.mark.asyncio
+    async def test_order_book_vwap_reduces_profit(self):
+        """Walking deeper asks lowers the fill and the reported profit."""
+        detector = _mispriced()
+        (shallow,) = await detector.find_profitable_paths(["ETH"], Decimal("0.1"), Decimal("1"))
+
+        detector.update_order_book(OrderBook(
+            exchange="coinbase", exchange_type="cex", base="ETH", quote="BTC", timestamp=utcnow(),
+            bids=[OrderBookLevel(Decimal("0.05"), Decimal("10"))],
+            asks=[OrderBookLevel(Decimal("0.05"), Decimal("0.5")), OrderBookLevel(Decimal("0.0505"), Decimal("10"))],
+        ))
+        (deep,) = await detector.find_profitable_paths(["ETH"], Decimal("0.1"), Decimal("1"))
+
+        assert Decimal("0.05") < deep.rates[2] < Decimal("0.0505")
+        assert deep.profit_pct < shallow.profit_pct
+
+
+# ===========================================================================
+# Strategy integration
+# ===========================================================================
+
+
+class TestStrategyIntegration:
+    @pytest.mark.asyncio
+    async def test_analyze_signal_and_execution_plan(self):
+        """The strategy turns the best path into a 3-leg plan."""
+        from app.strategies.triangular_arbitrage import TriangularArbitrageStrategy
+
+        strategy = TriangularArbitrageStrategy({"currencies_to_scan": "ETH", "trade_amount": 1.0})
+        signal = await strategy.analyze_signal([], 0.0, triangular_detector=_mispriced())
+
+        assert signal["pairs"] == ("ETH-USDT", "BTC-USDT", "ETH-BTC")
+        plan = strategy.get_execution_plan(signal)
+        assert [leg["side"] for leg in plan] == ["SELL", "BUY", "BUY"]
+        assert plan[0]["quote_amount"] == pytest.approx(3100.0)
@@ -960,9 +960,9 @@ class TestInviteRateLimit:
     @pytest.fixture(autouse=True)
     def _clear_rate_state(self):
         from app.services import user_rate_limit
-        user_rate_limit._buckets.clear()
+        user_rate_limit._limiter.clear()
         yield
-        user_rate_limit._buckets.clear()
+        user_rate_limit._limiter.clear()
 
     @pytest.mark.asyncio
     async def test_invite_succeeds_when_under_limit(self, db_session, shared_account, owner, member_user):
@@ -48,15 +48,9 @@ from app.routers.auth_router import (
 
 @pytest.fixture(autouse=True)
 def _clear_rate_limiters():
-    """Clear all in-memory rate limiter dicts before each test."""
+    """Clear all in-memory rate limiter state before each test."""
     from app.routers import auth_router
-    auth_router._login_attempts.clear()
-    auth_router._login_attempts_by_username.clear()
-    auth_router._signup_attempts.clear()
-    auth_router._forgot_pw_attempts.clear()
-    auth_router._forgot_pw_by_email.clear()
-    auth_router._resend_attempts.clear()
-    auth_router._mfa_attempts.clear()
+    auth_router._limiter.clear()
     yield
 
 
@@ -628,7 +622,7 @@ class TestRefreshEndpoint:
     def _isolate_rate_limiter(self, monkeypatch):
         """Rate limiters read from the production DB via async_session_maker at
         module load; in tests that DB may contain real rows and trip the 429
-        guard. Also the in-memory _CATEGORY_STORE is module-level state that
+        guard. Also the in-memory _limiter is module-level state that
         carries across tests. Both are reset here per test."""
         from unittest.mock import AsyncMock
         from app.auth_routers import rate_limit_backend as rlb, rate_limiters as rl
@@ -637,8 +631,7 @@ class TestRefreshEndpoint:
         fake.count_recent = AsyncMock(return_value=0)
         fake.cleanup = AsyncMock(return_value=None)
         monkeypatch.setattr(rlb, "rate_limit_backend", fake)
-        for store in rl._CATEGORY_STORE.values():
-            store.clear()
+        rl._limiter.clear()
         rl._warmed.clear()
         yield
 
@@ -725,7 +718,7 @@ class TestChangePasswordEndpoint:
     def _isolate_rate_limiter(self, monkeypatch):
         """Rate limiters read from the production DB via async_session_maker at
         module load; in tests that DB may contain real rows and trip the 429
-        guard. Also the in-memory _CATEGORY_STORE is module-level state that
+        guard. Also the in-memory _limiter is module-level state that
         carries across tests. Both are reset here per test."""
         from unittest.mock import AsyncMock
         from app.auth_routers import rate_limit_backend as rlb, rate_limiters as rl
@@ -735,8 +728,7 @@ class TestChangePasswordEndpoint:
         fake.cleanup = AsyncMock(return_value=None)
         monkeypatch.setattr(rlb, "rate_limit_backend", fake)
         # Reset module-level memory to avoid cross-test contamination
-        for store in rl._CATEGORY_STORE.values():
-            store.clear()
+        rl._limiter.clear()
         rl._warmed.clear()
         yield
 
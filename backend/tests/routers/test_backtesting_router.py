@@ -3,15 +3,30 @@ Tests for backend/app/routers/backtesting_router.py
 
 Covers: account-scoping security of _prepare_backtest_inputs — a caller-supplied
 account_id must belong to the caller (else it would build an exchange client from
-another user's credentials).
+another user's credentials) — and the /optimize progress, cancel and
+client-disconnect wiring.
 """
 
+import asyncio
+
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
 from fastapi import HTTPException
 
 from app.models import User, Account
-from app.routers.backtesting_router import _prepare_backtest_inputs
+from app.routers.backtesting_router import (
+    OptimizeRequest,
+    _prepare_backtest_inputs,
+    _running_optimizations,
+    cancel_optimization,
+    get_optimization_progress,
+    optimize_strategy,
+)
+
+_OPTIMIZE_REQUEST = OptimizeRequest(
+    strategy_type="indicator_based", strategy_config={}, parameter_ranges={"x": [1, 2]},
+    product_id="BTC-USD", start_ts=1700000000, end_ts=1700086400,
+)
 
 
 @pytest.mark.asyncio
@@ -56,3 +71,102 @@ async def test_prepare_backtest_accepts_owned_account(db_session):
             )
     # Got PAST the ownership check (would be 404) to the client-build failure (400).
     assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_optimize_reports_progress_and_honours_cancel():
+    """Happy path: the sweep's progress is readable and /optimize/cancel sets its cancel_event."""
+    user = MagicMock(id=705)
+    http_request = MagicMock(is_disconnected=AsyncMock(return_value=False))
+    seen = {}
+
+    async def fake_run_optimization(**kwargs):
+        kwargs["progress_callback"](1, 2, MagicMock(score=3.5))
+        seen["progress"] = await get_optimization_progress(current_user=user)
+        await cancel_optimization(current_user=user)
+        seen["cancel_set"] = kwargs["cancel_event"].is_set()
+        return MagicMock(to_dict=lambda: {"cancelled": True})
+
+    with patch("app.routers.backtesting_router._prepare_backtest_inputs", AsyncMock(return_value=(None, []))), \
+            patch("app.backtesting.optimizer.run_optimization", fake_run_optimization):
+        response = await optimize_strategy(_OPTIMIZE_REQUEST, http_request, current_user=user, db=None)
+
+    assert seen["progress"] == {"completed": 1, "planned": 2, "best_score": 3.5, "cancelling": False}
+    assert seen["cancel_set"] is True
+    assert response.result == {"cancelled": True}
+    assert user.id not in _running_optimizations
+    with pytest.raises(HTTPException) as exc:
+        await get_optimization_progress(current_user=user)
+    assert exc.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_optimize_cancels_when_client_disconnects():
+    """Edge case: a dropped connection stops the sweep instead of burning the worker pool."""
+    user = MagicMock(id=706)
+    http_request = MagicMock(is_disconnected=AsyncMock(return_value=True))
+
+    async def fake_run_optimization(**kwargs):
+        await asyncio.wait_for(kwargs["cancel_event"].wait(), timeout=5)
+        return MagicMock(to_dict=lambda: {"cancelled": True})
+
+    with patch("app.routers.backtesting_router._prepare_backtest_inputs", AsyncMock(return_value=(None, []))), \
+            patch("app.backtesting.optimizer.run_optimization", fake_run_optimization):
+        response = await optimize_strategy(_OPTIMIZE_REQUEST, http_request, current_user=user, db=None)
+    assert response.status == "ok"
+
+
+@pytest.mark.asyncio
+async def test_optimize_rejects_second_sweep_for_same_user():
+    """Failure: one running sweep per user (409), so the cancel handle stays unambiguous."""
+    user = MagicMock(id=707)
+    _running_optimizations[user.id] = MagicMock()
+    try:
+        with pytest.raises(HTTPException) as exc:
+            await optimize_strategy(_OPTIMIZE_REQUEST, MagicMock(), current_user=user, db=None)
+    finally:
+        _running_optimizations.pop(user.id, None)
+    assert exc.value.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_concurrent_optimize_requests_keep_the_first_job():
+    """Failure: a second request racing the first one's input fetch gets the 409 and frees nothing."""
+    user = MagicMock(id=708)
+    http_request = MagicMock(is_disconnected=AsyncMock(return_value=False))
+    prepared = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_prepare(*_args):
+        prepared.set()
+        await release.wait()
+        return None, []
+
+    async def fake_run_optimization(**kwargs):
+        return MagicMock(to_dict=lambda: {})
+
+    with patch("app.routers.backtesting_router._prepare_backtest_inputs", slow_prepare), \
+            patch("app.backtesting.optimizer.run_optimization", fake_run_optimization):
+        first = asyncio.create_task(optimize_strategy(_OPTIMIZE_REQUEST, http_request, current_user=user, db=None))
+        await prepared.wait()
+        job = _running_optimizations[user.id]
+
+        with pytest.raises(HTTPException) as exc:
+            await optimize_strategy(_OPTIMIZE_REQUEST, http_request, current_user=user, db=None)
+        assert exc.value.status_code == 409
+        assert _running_optimizations[user.id] is job
+
+        release.set()
+        assert (await first).status == "ok"
+    assert user.id not in _running_optimizations
+
+
+@pytest.mark.asyncio
+async def test_failed_input_fetch_releases_the_slot():
+    """Failure: an HTTPException while fetching candles still frees the user's sweep slot."""
+    user = MagicMock(id=709)
+    prepare = AsyncMock(side_effect=HTTPException(status_code=400, detail="no account"))
+    with patch("app.routers.backtesting_router._prepare_backtest_inputs", prepare):
+        with pytest.raises(HTTPException):
+            await optimize_strategy(_OPTIMIZE_REQUEST, MagicMock(), current_user=user, db=None)
+    assert user.id not in _running_optimizations
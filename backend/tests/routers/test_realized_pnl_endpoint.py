@@ -1,7 +1,7 @@
 """
 Tests for the /positions/realized-pnl endpoint.
 
-Verifies that SQL conditional aggregation matches the previous
+Verifies that the daily-rollup aggregation matches the previous
 Python-loop logic for all time period buckets.
 """
 
@@ -10,6 +10,7 @@ from datetime import timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from app.models import Position, Account, User, Bot
+from app.services.pnl_rollup_service import rebuild_rollups
 from app.utils.timeutil import utcnow
 
 
@@ -104,6 +105,7 @@ async def setup_closed_positions(db_session):
     for p in positions:
         db_session.add(p)
     await db_session.flush()
+    await rebuild_rollups(db_session)
     await db_session.commit()
 
     return {"user": user, "account": account, "positions": positions}
@@ -194,6 +196,8 @@ class TestRealizedPnlAggregation:
                 total_quote_spent=100.0,
                 total_base_acquired=0.001,
             ))
+        await db_session.flush()
+        await rebuild_rollups(db_session)
         await db_session.commit()
 
         current_user = MagicMock(id=owner.id)
@@ -26,6 +26,7 @@ from dateutil.relativedelta import relativedelta
 from fastapi import HTTPException
 
 from app.auth.dependencies import Perm
+from app.json_response import utc_isoformat
 from app.models import (
     Account,
     AIProviderCredential,
@@ -499,7 +500,7 @@ class TestUpdateGoal:
         )
 
         assert result["start_date"].startswith(reset_start.date().isoformat())
-        assert result["target_date"] == original_target.isoformat()
+        assert result["target_date"] == utc_isoformat(original_target)
 
     @pytest.mark.asyncio
     async def test_resets_start_date_and_recomputes_deadline_when_horizon_is_sent(self, db_session):
@@ -819,7 +819,7 @@ class TestTransferToDict:
         result = _transfer_to_dict(t)
         assert result["id"] == 1
         assert result["transfer_type"] == "deposit"
-        assert result["occurred_at"] == "2026-01-15T12:00:00"
+        assert result["occurred_at"] == "2026-01-15T12:00:00Z"
 
     def test_handles_none_dates(self):
         """Edge case: None dates produce None in output."""
@@ -6,6 +6,7 @@ Covers:
 - get_latest_snapshot — get most recent aggregated snapshot
 - capture_account_snapshot (via mocked portfolio services)
 - capture_all_account_snapshots aggregation
+- run_account_snapshot_once shared price map, concurrent valuation and bulk write
 """
 
 import pytest
@@ -13,13 +14,16 @@ from app.utils.timeutil import utcnow
 from datetime import timedelta
 from unittest.mock import AsyncMock, patch
 
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
 from sqlalchemy import select
 
-from app.models import Account, AccountValueSnapshot, User
+from app.models import Account, AccountValueSnapshot, Position, User
 from app.services.account_snapshot_service import (
     get_account_value_history,
     get_latest_snapshot,
     capture_account_snapshot,
+    run_account_snapshot_once,
 )
 
 
@@ -583,3 +587,123 @@ class TestPortionFieldsInHistory:
         assert len(result) == 1
         assert result[0]["usd_portion_usd"] == pytest.approx(45000.0)
         assert result[0]["btc_portion_btc"] == pytest.approx(0.3)
+
+
+# ---------------------------------------------------------------------------
+# run_account_snapshot_once
+# ---------------------------------------------------------------------------
+
+
+def _paper_client(btc=1.0, usd=100000.0):
+    client = AsyncMock()
+    client.calculate_aggregate_btc_value = AsyncMock(return_value=btc)
+    client.calculate_aggregate_usd_value = AsyncMock(return_value=usd)
+    client.calculate_market_budget = AsyncMock(return_value=0.0)
+    client.get_current_price = AsyncMock(return_value=1.0)
+    return client
+
+
+class TestRunAccountSnapshotOnce:
+    """Tests for run_account_snapshot_once()"""
+
+    @pytest.fixture
+    def session_maker(self, async_engine):
+        return async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def _seed(self, session_maker):
+        async with session_maker() as db:
+            u1 = await _create_user(db, "a@example.com")
+            u2 = await _create_user(db, "b@example.com")
+            accounts = [
+                await _create_account(db, u1.id, name="P1", is_paper=True),
+                await _create_account(db, u1.id, name="P2", is_paper=True),
+                await _create_account(db, u2.id, name="P3", is_paper=True),
+            ]
+            accounts[0].paper_balances = '{"BTC": 1.0, "SOL": 5.0, "USD": 0}'
+            for account in accounts:
+                db.add(Position(
+                    user_id=account.user_id, account_id=account.id, product_id="ETH-BTC",
+                    status="open", total_base_acquired=2.0, total_quote_spent=0.08,
+                ))
+            await db.commit()
+            return [a.id for a in accounts]
+
+    @pytest.mark.asyncio
+    async def test_prices_each_product_once_for_all_accounts(self, session_maker):
+        """Happy path: one bulk price fetch serves every account's valuation."""
+        account_ids = await self._seed(session_maker)
+        clients = {account_id: _paper_client() for account_id in account_ids}
+        bulk = AsyncMock(return_value={"BTC-USD": 100000.0, "ETH-BTC": 0.05})
+
+        async def client_for(_db, account_id, session_maker=None):
+            return clients[account_id]
+
+        with patch("app.coinbase_api.public_market_data.bulk_prices_for_products", bulk), \
+             patch("app.services.account_snapshot_service.get_exchange_client_for_account",
+                   side_effect=client_for), \
+             patch("app.services.goal_snapshot_service.capture_goal_snapshots",
+                   new_callable=AsyncMock, return_value=0):
+            await run_account_snapshot_once(session_maker=session_maker)
+
+        bulk.assert_awaited_once()
+        assert bulk.await_args.args[0] == ["BTC-USD", "ETH-BTC", "SOL-BTC", "SOL-USD"]
+        assert bulk.await_args.kwargs == {"bypass_cache": True}
+        for client in clients.values():
+            client.get_current_price.assert_not_awaited()
+
+        async with session_maker() as db:
+            snaps = (await db.execute(select(AccountValueSnapshot))).scalars().all()
+        assert sorted(s.account_id for s in snaps) == sorted(account_ids)
+        for snap in snaps:
+            assert snap.btc_usd_price == pytest.approx(100000.0)
+            assert snap.unrealized_pnl_btc == pytest.approx(2.0 * 0.05 - 0.08)
+
+    @pytest.mark.asyncio
+    async def test_products_missing_from_bulk_map_are_fetched_per_account(self, session_maker):
+        """Edge case: the account's client prices what the bulk list lacked."""
+        account_ids = await self._seed(session_maker)
+        clients = {account_id: _paper_client() for account_id in account_ids}
+
+        async def client_for(_db, account_id, session_maker=None):
+            return clients[account_id]
+
+        with patch("app.coinbase_api.public_market_data.bulk_prices_for_products",
+                   AsyncMock(return_value={"BTC-USD": 100000.0})), \
+             patch("app.services.account_snapshot_service.get_exchange_client_for_account",
+                   side_effect=client_for), \
+             patch("app.services.goal_snapshot_service.capture_goal_snapshots",
+                   new_callable=AsyncMock, return_value=0):
+            await run_account_snapshot_once(session_maker=session_maker)
+
+        for client in clients.values():
+            client.get_current_price.assert_awaited_once_with("ETH-BTC")
+
+    @pytest.mark.asyncio
+    async def test_failed_account_does_not_block_the_rest(self, session_maker):
+        """Failure: an account without a client is skipped; the others are written together."""
+        account_ids = await self._seed(session_maker)
+
+        async def client_for(_db, account_id, session_maker=None):
+            return None if account_id == account_ids[0] else _paper_client()
+
+        async with session_maker() as db:
+            await _create_snapshot(
+                db, account_ids[1], 1, utcnow().replace(hour=0, minute=0, second=0, microsecond=0),
+                0.1, 10.0,
+            )
+            await db.commit()
+
+        with patch("app.coinbase_api.public_market_data.bulk_prices_for_products",
+                   AsyncMock(return_value={"BTC-USD": 100000.0, "ETH-BTC": 0.05})), \
+             patch("app.services.account_snapshot_service.get_exchange_client_for_account",
+                   side_effect=client_for), \
+             patch("app.services.goal_snapshot_service.capture_goal_snapshots",
+                   new_callable=AsyncMock, return_value=0) as goals:
+            await run_account_snapshot_once(session_maker=session_maker)
+
+        async with session_maker() as db:
+            snaps = (await db.execute(select(AccountValueSnapshot))).scalars().all()
+        by_account = {s.account_id: s for s in snaps}
+        assert set(by_account) == set(account_ids[1:])
+        assert by_account[account_ids[1]].total_value_btc == pytest.approx(1.0)  # updated in place
+        assert goals.await_count == 2
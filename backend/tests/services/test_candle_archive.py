@@ -0,0 +1,328 @@
+"""
+Tests for backend/app/services/candle_archive.py
+
+Covers:
+- write/read: append, out-of-order backfill rewrite, torn-record recovery
+- coverage bookkeeping: persisted ranges, empty fetches stay uncovered,
+  writers from separate processes serialized by a file lock without losing ranges
+- get_candles: paged backfill of gaps only (one file write per gap), empty pages
+  skipped until their TTL expires, just-closed and forming candles fetched
+  live, file I/O off the event loop
+- candle_source / get_archived_candles: archive namespace per exchange client
+"""
+
+import fcntl
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.candle_archive import (
+    RECORD_DTYPE,
+    CandleArchive,
+    _subtract_ranges,
+    candle_source,
+    get_archived_candles,
+)
+
+HOUR = 3600
+T0 = 1_700_000_000 // HOUR * HOUR
+
+
+def _candle(start, close=100.0):
+    # Exchange-style payload: string fields
+    return {
+        "start": str(start), "open": str(close - 1), "high": str(close + 1),
+        "low": str(close - 2), "close": str(close), "volume": "10",
+    }
+
+
+class FakeExchange:
+    """get_candles stand-in serving hourly candles for [start, end], newest first."""
+
+    def __init__(self, listed_from=T0 - 10_000 * HOUR):
+        self.listed_from = listed_from
+        self.calls = []
+
+    async def get_candles(self, product_id, start, end, granularity):
+        self.calls.append((start, end))
+        first = max(start, self.listed_from)
+        first += -first % HOUR
+        return [_candle(t, close=float(t // HOUR % 1000)) for t in range(end // HOUR * HOUR, first - 1, -HOUR)]
+
+
+# =============================================================================
+# write / read
+# =============================================================================
+
+
+def test_write_appends_and_reads_time_range(tmp_path):
+    archive = CandleArchive(tmp_path)
+    archive.write("coinbase", "BTC-USD", "ONE_HOUR", [_candle(T0 + i * HOUR) for i in range(5)], T0, T0 + 5 * HOUR)
+    archive.write("coinbase", "BTC-USD", "ONE_HOUR", [_candle(T0 + 5 * HOUR)], T0 + 5 * HOUR, T0 + 6 * HOUR)
+
+    path = tmp_path / "coinbase" / "BTC-USD" / "ONE_HOUR.ohlcv"
+    assert path.stat().st_size == 6 * RECORD_DTYPE.itemsize
+    rows = archive.read("coinbase", "BTC-USD", "ONE_HOUR", T0 + HOUR, T0 + 4 * HOUR)
+    assert [r["start"] for r in rows] == [T0 + HOUR, T0 + 2 * HOUR, T0 + 3 * HOUR]
+    assert rows[0] == {"start": T0 + HOUR, "open": 99.0, "high": 101.0, "low": 98.0, "close": 100.0, "volume": 10.0}
+
+
+def test_backfill_behind_archive_rewrites_in_order(tmp_path):
+    archive = CandleArchive(tmp_path)
+    archive.write("coinbase", "ETH-USD", "ONE_HOUR", [_candle(T0 + 3 * HOUR)], T0 + 3 * HOUR, T0 + 4 * HOUR)
+    archive.write(
+        "coinbase", "ETH-USD", "ONE_HOUR",
+        [_candle(T0 + 3 * HOUR, close=5.0), _candle(T0), _candle(T0 + HOUR)], T0, T0 + 4 * HOUR,
+    )
+
+    rows = archive.read("coinbase", "ETH-USD", "ONE_HOUR", T0, T0 + 10 * HOUR)
+    assert [r["start"] for r in rows] == [T0, T0 + HOUR, T0 + 3 * HOUR]
+    assert rows[-1]["close"] == 5.0  # newest write wins
+    assert archive.coverage("coinbase", "ETH-USD", "ONE_HOUR") == [(T0, T0 + 4 * HOUR)]
+
+
+def test_torn_trailing_record_is_ignored_and_overwritten(tmp_path):
+    archive = CandleArchive(tmp_path)
+    archive.write("coinbase", "BTC-USD", "ONE_HOUR", [_candle(T0)], T0, T0 + HOUR)
+    path = tmp_path / "coinbase" / "BTC-USD" / "ONE_HOUR.ohlcv"
+    with open(path, "ab") as f:
+        f.write(b"\x00" * 10)  # interrupted append
+
+    assert len(archive.read("coinbase", "BTC-USD", "ONE_HOUR", T0, T0 + 5 * HOUR)) == 1
+    archive.write("coinbase", "BTC-USD", "ONE_HOUR", [_candle(T0 + HOUR)], T0 + HOUR, T0 + 2 * HOUR)
+    assert path.stat().st_size == 2 * RECORD_DTYPE.itemsize
+    assert [r["start"] for r in archive.read("coinbase", "BTC-USD", "ONE_HOUR", T0, T0 + 5 * HOUR)] == [
+        T0, T0 + HOUR,
+    ]
+
+
+def test_coverage_persists_across_instances(tmp_path):
+    CandleArchive(tmp_path).write("coinbase", "BTC-USD", "ONE_HOUR", [_candle(T0 + HOUR)], T0, T0 + 10 * HOUR)
+    assert CandleArchive(tmp_path).coverage("coinbase", "BTC-USD", "ONE_HOUR") == [(T0, T0 + 10 * HOUR)]
+
+
+def test_empty_write_leaves_range_uncovered(tmp_path):
+    """Failure: an empty fetch may be an exchange hiccup, so the range is asked for again."""
+    archive = CandleArchive(tmp_path)
+    archive.write("coinbase", "BTC-USD", "ONE_HOUR", [], T0, T0 + 10 * HOUR)
+    assert archive.coverage("coinbase", "BTC-USD", "ONE_HOUR") == []
+    assert not (tmp_path / "coinbase" / "BTC-USD" / "ONE_HOUR.coverage.json").exists()
+
+
+def test_writers_with_stale_coverage_keep_each_others_ranges(tmp_path):
+    """Edge case: a second process's ranges survive this one writing from a cached sidecar."""
+    web, trader = CandleArchive(tmp_path), CandleArchive(tmp_path)
+    web.write("coinbase", "BTC-USD", "ONE_HOUR", [_candle(T0)], T0, T0 + HOUR)
+    trader.write("coinbase", "BTC-USD", "ONE_HOUR", [_candle(T0 + 5 * HOUR)], T0 + 5 * HOUR, T0 + 6 * HOUR)
+    web.write("coinbase", "BTC-USD", "ONE_HOUR", [_candle(T0 + 9 * HOUR)], T0 + 9 * HOUR, T0 + 10 * HOUR)
+
+    expected = [(T0, T0 + HOUR), (T0 + 5 * HOUR, T0 + 6 * HOUR), (T0 + 9 * HOUR, T0 + 10 * HOUR)]
+    assert CandleArchive(tmp_path).coverage("coinbase", "BTC-USD", "ONE_HOUR") == expected
+    assert web.coverage("coinbase", "BTC-USD", "ONE_HOUR") == expected
+
+
+def test_write_waits_for_another_process_file_lock(tmp_path):
+    """Security: a write blocks while another holder has the series' lock file."""
+    archive = CandleArchive(tmp_path)
+    archive.write("coinbase", "BTC-USD", "ONE_HOUR", [_candle(T0)], T0, T0 + HOUR)
+    lock_path = tmp_path / "coinbase" / "BTC-USD" / "ONE_HOUR.lock"
+
+    with open(lock_path, "a+b") as held:
+        fcntl.flock(held, fcntl.LOCK_EX)
+        writer = threading.Thread(target=archive.write, args=(
+            "coinbase", "BTC-USD", "ONE_HOUR", [_candle(T0 + HOUR)], T0 + HOUR, T0 + 2 * HOUR,
+        ))
+        writer.start()
+        writer.join(timeout=0.2)
+        assert writer.is_alive()
+    writer.join(timeout=5)
+
+    assert not writer.is_alive()
+    assert archive.coverage("coinbase", "BTC-USD", "ONE_HOUR") == [(T0, T0 + 2 * HOUR)]
+
+
+def test_invalid_key_component_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        CandleArchive(tmp_path).read("coinbase", "../etc", "ONE_HOUR", 0, 1)
+
+
+def test_subtract_ranges():
+    covered = [(10, 20), (30, 40)]
+    assert _subtract_ranges(0, 50, covered) == [(0, 10), (20, 30), (40, 50)]
+    assert _subtract_ranges(12, 18, covered) == []
+    assert _subtract_ranges(15, 35, covered) == [(20, 30)]
+
+
+# =============================================================================
+# get_candles (read-through with backfill)
+# =============================================================================
+
+
+async def test_get_candles_backfills_in_pages_then_serves_from_disk(tmp_path):
+    archive = CandleArchive(tmp_path, page_candles=100)
+    exchange = FakeExchange()
+    now = T0 + 1000 * HOUR + 60
+    start, end = T0 + 500 * HOUR, now
+
+    first = await archive.get_candles(exchange.get_candles, "coinbase", "BTC-USD", start, end, "ONE_HOUR", now=now)
+    # 499 settled candles in 5 pages; the just-closed and forming candles ride along with the last page.
+    assert len(exchange.calls) == 5
+    assert exchange.calls[-1] == (T0 + 900 * HOUR, end)
+    assert [c["start"] for c in first] == list(range(start, T0 + 1001 * HOUR, HOUR))
+    assert archive.coverage("coinbase", "BTC-USD", "ONE_HOUR") == [(start, T0 + 999 * HOUR)]
+
+    exchange.calls.clear()
+    second = await archive.get_candles(exchange.get_candles, "coinbase", "BTC-USD", start, end, "ONE_HOUR", now=now)
+    assert exchange.calls == [(T0 + 999 * HOUR, end)]  # only the just-closed and forming candles
+    assert second == first
+
+
+async def test_get_candles_just_closed_candle_is_not_archived(tmp_path):
+    """Edge case: the just-closed candle is refetched until the next one closes, so revisions are picked up."""
+    archive = CandleArchive(tmp_path)
+    exchange = FakeExchange()
+    now = T0 + 100 * HOUR + 60
+    kwargs = dict(include_forming=False, now=now)
+
+    await archive.get_candles(exchange.get_candles, "coinbase", "BTC-USD", T0, now, "ONE_HOUR", **kwargs)
+    exchange.calls.clear()
+    candles = await archive.get_candles(exchange.get_candles, "coinbase", "BTC-USD", T0, now, "ONE_HOUR", **kwargs)
+
+    assert exchange.calls == [(T0 + 99 * HOUR, now)]
+    assert candles[-1]["start"] == T0 + 99 * HOUR
+    assert archive.read("coinbase", "BTC-USD", "ONE_HOUR", T0, now)[-1]["start"] == T0 + 98 * HOUR
+
+
+async def test_get_candles_fetches_only_the_gaps(tmp_path):
+    archive = CandleArchive(tmp_path)
+    exchange = FakeExchange()
+    now = T0 + 1000 * HOUR
+    await archive.get_candles(
+        exchange.get_candles, "coinbase", "BTC-USD", T0 + 100 * HOUR, T0 + 200 * HOUR, "ONE_HOUR", now=now,
+    )
+    exchange.calls.clear()
+
+    candles = await archive.get_candles(
+        exchange.get_candles, "coinbase", "BTC-USD", T0 + 50 * HOUR, T0 + 250 * HOUR, "ONE_HOUR",
+        include_forming=False, now=now,
+    )
+
+    assert exchange.calls == [(T0 + 50 * HOUR, T0 + 100 * HOUR), (T0 + 201 * HOUR, T0 + 251 * HOUR)]
+    assert [c["start"] for c in candles] == list(range(T0 + 50 * HOUR, T0 + 251 * HOUR, HOUR))
+
+
+async def test_get_candles_partly_listed_page_is_not_refetched(tmp_path):
+    archive = CandleArchive(tmp_path)
+    exchange = FakeExchange(listed_from=T0 + 90 * HOUR)
+    now = T0 + 1000 * HOUR
+    kwargs = dict(include_forming=False, now=now)
+
+    await archive.get_candles(exchange.get_candles, "coinbase", "NEW-USD", T0, T0 + 99 * HOUR, "ONE_HOUR", **kwargs)
+    exchange.calls.clear()
+    candles = await archive.get_candles(
+        exchange.get_candles, "coinbase", "NEW-USD", T0, T0 + 99 * HOUR, "ONE_HOUR", **kwargs,
+    )
+
+    assert exchange.calls == []
+    assert candles[0]["start"] == T0 + 90 * HOUR
+
+
+async def test_get_candles_empty_pages_are_refetched_after_ttl(tmp_path):
+    """Failure: pages that came back empty are not marked covered, only skipped until their TTL runs out."""
+    archive = CandleArchive(tmp_path, page_candles=50, empty_ttl=HOUR)
+    exchange = FakeExchange(listed_from=T0 + 60 * HOUR)
+    now = T0 + 1000 * HOUR
+
+    async def fetch(at):
+        await archive.get_candles(
+            exchange.get_candles, "coinbase", "NEW-USD", T0, T0 + 99 * HOUR, "ONE_HOUR",
+            include_forming=False, now=at,
+        )
+
+    await fetch(now)
+    assert archive.coverage("coinbase", "NEW-USD", "ONE_HOUR") == [(T0 + 50 * HOUR, T0 + 100 * HOUR)]
+    exchange.calls.clear()
+    await fetch(now + HOUR - 1)
+    assert exchange.calls == []
+    await fetch(now + HOUR)
+    assert exchange.calls == [(T0, T0 + 50 * HOUR)]
+
+
+async def test_get_candles_backfill_in_front_writes_once_per_gap(tmp_path):
+    """Edge case: backfilling many pages before existing data merges them into the file in one rewrite."""
+    archive = CandleArchive(tmp_path, page_candles=10)
+    exchange = FakeExchange()
+    kwargs = dict(include_forming=False, now=T0 + 1000 * HOUR)
+    await archive.get_candles(exchange.get_candles, "coinbase", "BTC-USD", T0 + 100 * HOUR, T0 + 109 * HOUR,
+                              "ONE_HOUR", **kwargs)
+
+    with patch.object(archive, "_store", wraps=archive._store) as store:
+        candles = await archive.get_candles(
+            exchange.get_candles, "coinbase", "BTC-USD", T0, T0 + 109 * HOUR, "ONE_HOUR", **kwargs,
+        )
+
+    assert store.call_count == 1
+    assert len(store.call_args.args[2]) == 10  # ten pages, one merge
+    assert [c["start"] for c in candles] == list(range(T0, T0 + 110 * HOUR, HOUR))
+
+
+async def test_get_candles_file_io_runs_off_the_event_loop(tmp_path):
+    """Happy path: reads and writes go through asyncio.to_thread."""
+    import asyncio
+
+    archive = CandleArchive(tmp_path)
+    exchange = FakeExchange()
+    with patch("app.services.candle_archive.asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+        await archive.get_candles(
+            exchange.get_candles, "coinbase", "BTC-USD", T0, T0 + 9 * HOUR, "ONE_HOUR",
+            include_forming=False, now=T0 + 1000 * HOUR,
+        )
+    called = {call.args[0].__name__ for call in to_thread.call_args_list}
+    assert {"coverage", "_store", "read"} <= called
+
+
+async def test_get_candles_rejects_synthetic_granularity(tmp_path):
+    with pytest.raises(ValueError):
+        await CandleArchive(tmp_path).get_candles(
+            FakeExchange().get_candles, "coinbase", "BTC-USD", T0, T0 + HOUR, "ONE_WEEK",
+        )
+
+
+# =============================================================================
+# candle_source
+# =============================================================================
+
+
+def test_candle_source_by_client_type():
+    from app.coinbase_api.public_market_data import PublicMarketDataClient
+    from app.exchange_clients.paper_trading_client import PaperTradingClient
+
+    assert candle_source(PublicMarketDataClient()) == "coinbase"
+    assert candle_source(MagicMock()) is None
+
+    paper = PaperTradingClient.__new__(PaperTradingClient)
+    paper.real_client = None
+    assert candle_source(paper) == "coinbase"
+
+
+async def test_get_archived_candles_falls_back_for_unknown_clients():
+    client = MagicMock()
+    client.get_candles = AsyncMock(return_value=[_candle(T0 + HOUR), _candle(T0)])
+
+    candles = await get_archived_candles(client, "BTC-USD", T0, T0 + HOUR, "ONE_HOUR")
+
+    assert [c["start"] for c in candles] == [str(T0), str(T0 + HOUR)]  # sorted, otherwise untouched
+
+
+async def test_get_archived_candles_reads_through_archive_for_coinbase(tmp_path):
+    from app.coinbase_api.public_market_data import PublicMarketDataClient
+
+    client = PublicMarketDataClient()
+    exchange = FakeExchange()
+    client.get_candles = exchange.get_candles
+    with patch("app.services.candle_archive.candle_archive", CandleArchive(tmp_path)):
+        candles = await get_archived_candles(client, "BTC-USD", T0, T0 + 9 * HOUR, "ONE_HOUR")
+
+    assert len(candles) == 10
+    assert (tmp_path / "coinbase" / "BTC-USD" / "ONE_HOUR.ohlcv").exists()
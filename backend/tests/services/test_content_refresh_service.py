@@ -88,8 +88,8 @@ class TestContentRefreshServiceStatus:
         svc._last_video_refresh = now
 
         status = svc.status
-        assert status["last_news_refresh"] == now.isoformat()
-        assert status["last_video_refresh"] == now.isoformat()
+        assert status["last_news_refresh"] == now.isoformat() + "Z"
+        assert status["last_video_refresh"] == now.isoformat() + "Z"
 
 
 # ---------------------------------------------------------------------------
@@ -303,5 +303,5 @@ class TestDebtCeilingMonitorStatus:
         ]):
             status = monitor.status
 
-        assert status["last_check"] == "2025-06-01T10:00:00"
+        assert status["last_check"] == "2025-06-01T10:00:00Z"
         assert status["last_result"]["new_legislation_found"] is False
@@ -0,0 +1,240 @@
+"""
+Tests for backend/app/services/order_status_poller.py
+
+Covers:
+- One bulk get_orders call per account, per-order fallback for missing IDs
+- Paper orders and clients without get_orders
+- Change filtering: unchanged orders skipped, rechecked after the interval,
+  terminal statuses always applied, failed applies retried, one tracker per
+  monitor kind
+- Account isolation and the concurrency bound
+"""
+
+import asyncio
+from dataclasses import dataclass
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.order_status_poller import (
+    OrderChangeTracker,
+    fetch_order_statuses,
+    poll_pending_orders,
+    tracker_for,
+)
+
+
+@dataclass(frozen=True)
+class _Snap:
+    account_id: int
+    order_id: str
+
+
+class _Session:
+    async def __aenter__(self):
+        return MagicMock()
+
+    async def __aexit__(self, *_args):
+        return False
+
+
+def _session_maker():
+    return _Session()
+
+
+def _exchange(statuses=None):
+    exchange = MagicMock()
+    exchange.get_orders = AsyncMock(return_value=statuses or {})
+    exchange.get_order = AsyncMock(return_value={"status": "OPEN", "filled_size": "0"})
+    return exchange
+
+
+async def _poll_one(exchange, snapshot):
+    if snapshot.order_id.startswith("paper-"):
+        return {"status": "FILLED", "filled_size": "1"}
+    return await exchange.get_order(snapshot.order_id)
+
+
+async def _run(snapshots, exchanges, tracker=None, apply=None, **kwargs):
+    apply = apply or AsyncMock()
+
+    async def resolve(_db, account_id):
+        return exchanges.get(account_id)
+
+    stats = await poll_pending_orders(
+        _session_maker, snapshots, kind="test",
+        resolve_exchange=resolve, poll_one=_poll_one, apply=apply,
+        tracker=OrderChangeTracker() if tracker is None else tracker, **kwargs,
+    )
+    return stats, apply
+
+
+class TestBulkFetch:
+    """Tests for the per-account bulk status read"""
+
+    @pytest.mark.asyncio
+    async def test_one_bulk_call_per_account(self):
+        """Happy path: three orders on one account cost one exchange request."""
+        open_ = {"status": "OPEN", "filled_size": "0"}
+        exchange = _exchange({"a": open_, "b": open_, "c": open_})
+
+        stats, apply = await _run([_Snap(1, o) for o in "abc"], {1: exchange})
+
+        exchange.get_orders.assert_awaited_once_with(["a", "b", "c"])
+        exchange.get_order.assert_not_awaited()
+        assert apply.await_count == 3
+        assert (stats["bulk_calls"], stats["single_calls"]) == (1, 0)
+
+    @pytest.mark.asyncio
+    async def test_missing_ids_fall_back_to_single_poll(self):
+        """Edge case: IDs absent from the bulk response are polled individually."""
+        exchange = _exchange({"a": {"status": "OPEN", "filled_size": "0"}})
+
+        stats, _ = await _run([_Snap(1, "a"), _Snap(1, "b")], {1: exchange})
+
+        exchange.get_order.assert_awaited_once_with("b")
+        assert stats["single_calls"] == 1
+
+    @pytest.mark.asyncio
+    async def test_bulk_failure_polls_each_order(self):
+        """Failure: a bulk error degrades to per-order polling."""
+        exchange = _exchange()
+        exchange.get_orders.side_effect = RuntimeError("429")
+
+        _, apply = await _run([_Snap(1, "a"), _Snap(1, "b")], {1: exchange})
+
+        assert exchange.get_order.await_count == 2
+        assert apply.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_single_order_and_paper_orders_skip_the_bulk_call(self):
+        """Edge case: nothing to batch — one live order plus a paper order."""
+        exchange = _exchange()
+
+        await _run([_Snap(1, "a"), _Snap(1, "paper-1")], {1: exchange})
+
+        exchange.get_orders.assert_not_awaited()
+        exchange.get_order.assert_awaited_once_with("a")
+
+    @pytest.mark.asyncio
+    async def test_client_without_get_orders(self):
+        """Edge case: clients lacking the bulk method are treated as a miss."""
+        assert await fetch_order_statuses(object(), ["a", "b"]) == {}
+
+
+class TestChangeFiltering:
+    """Tests for OrderChangeTracker-driven apply skipping"""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_order_is_skipped_until_recheck(self):
+        """Happy path: a resting order is applied once, then only after the interval."""
+        tracker = OrderChangeTracker(recheck_seconds=30)
+        exchange = _exchange()
+        snaps = [_Snap(1, "a")]
+
+        await _run(snaps, {1: exchange}, tracker=tracker)
+        stats, apply = await _run(snaps, {1: exchange}, tracker=tracker)
+        assert apply.await_count == 0
+        assert stats["unchanged"] == 1
+
+        order_id, (sig, seen_at) = next(iter(tracker._applied.items()))
+        tracker._applied[order_id] = (sig, seen_at - 31)
+        _, apply = await _run(snaps, {1: exchange}, tracker=tracker)
+        assert apply.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_partial_fill_is_a_change(self):
+        """Happy path: a new filled_size is applied immediately."""
+        tracker = OrderChangeTracker()
+        exchange = _exchange()
+        await _run([_Snap(1, "a")], {1: exchange}, tracker=tracker)
+
+        exchange.get_order.return_value = {"status": "OPEN", "filled_size": "0.5"}
+        _, apply = await _run([_Snap(1, "a")], {1: exchange}, tracker=tracker)
+        assert apply.await_count == 1
+
+    def test_terminal_status_always_needs_apply(self):
+        """Edge case: a FILLED order still pending in the DB is applied every cycle."""
+        tracker = OrderChangeTracker()
+        filled = {"status": "FILLED", "filled_size": "1"}
+        tracker.record("a", filled)
+        assert tracker.needs_apply("a", filled) is True
+
+    @pytest.mark.asyncio
+    async def test_failed_apply_is_retried_next_cycle(self):
+        """Failure: an apply error leaves the order unrecorded."""
+        tracker = OrderChangeTracker()
+        exchange = _exchange()
+        failing = AsyncMock(side_effect=RuntimeError("db locked"))
+
+        await _run([_Snap(1, "a")], {1: exchange}, tracker=tracker, apply=failing)
+        _, apply = await _run([_Snap(1, "a")], {1: exchange}, tracker=tracker)
+
+        assert apply.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_orders_no_longer_pending_are_forgotten(self):
+        tracker = OrderChangeTracker()
+        await _run([_Snap(1, "a")], {1: _exchange()}, tracker=tracker)
+        await _run([], {}, tracker=tracker)
+        assert len(tracker) == 0
+
+    @pytest.mark.asyncio
+    async def test_monitor_kinds_keep_separate_trackers(self):
+        """Edge case: a safety-order poll doesn't forget the limit orders (and vice versa)."""
+        exchange = _exchange()
+
+        async def resolve(_db, _account_id):
+            return exchange
+
+        async def poll(kind, order_id):
+            apply = AsyncMock()
+            await poll_pending_orders(
+                _session_maker, [_Snap(1, order_id)], kind=kind,
+                resolve_exchange=resolve, poll_one=_poll_one, apply=apply,
+            )
+            return apply
+
+        await poll("limit", "limit-1")
+        await poll("safety", "safety-1")
+        assert len(tracker_for("limit")) == 1 and len(tracker_for("safety")) == 1
+
+        assert (await poll("limit", "limit-1")).await_count == 0  # still unchanged, not re-applied
+        assert (await poll("safety", "safety-1")).await_count == 0
+
+
+class TestAccounts:
+    """Tests for per-account isolation and concurrency"""
+
+    @pytest.mark.asyncio
+    async def test_account_without_client_does_not_block_others(self):
+        """Failure: a missing client skips only that account."""
+        exchange = _exchange()
+
+        _, apply = await _run([_Snap(1, "a"), _Snap(2, "b")], {2: exchange})
+
+        assert [c.args[1].order_id for c in apply.await_args_list] == ["b"]
+
+    @pytest.mark.asyncio
+    async def test_accounts_poll_concurrently_up_to_the_bound(self):
+        """Happy path: no more than max_concurrent_accounts are in flight."""
+        in_flight = peak = 0
+
+        async def slow_get_order(_order_id):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"status": "OPEN", "filled_size": "0"}
+
+        exchanges = {}
+        for account_id in range(6):
+            exchanges[account_id] = _exchange()
+            exchanges[account_id].get_order.side_effect = slow_get_order
+
+        await _run(
+            [_Snap(a, f"o{a}") for a in range(6)], exchanges, max_concurrent_accounts=2,
+        )
+
+        assert peak == 2
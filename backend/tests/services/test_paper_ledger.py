@@ -0,0 +1,235 @@
+"""
+Tests for backend/app/services/paper_ledger.py
+
+Covers:
+- apply(): atomic require check, InsufficientPaperBalance leaves balances untouched
+- write-through (not started): row re-read per load, mutations persisted immediately
+- write-behind: memory authoritative, fills journaled, one flush writes all dirty rows
+- external row writes (deposit / reset from another process) merged, not overwritten
+- journal replay after a crash: deltas on top of the row, torn final line skipped,
+  committed flushes not applied twice
+- journal appends run off the event loop (group commit in persist())
+"""
+
+import json
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models import Account
+from app.services.paper_ledger import InsufficientPaperBalance, PaperLedger
+
+
+@pytest.fixture
+def session_maker(async_engine):
+    return async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return PaperLedger(journal_dir=tmp_path, flush_interval=3600, reconcile_interval=3600)
+
+
+async def _add_account(session_maker, account_id, balances):
+    async with session_maker() as db:
+        db.add(Account(
+            id=account_id, user_id=1, name=f"Paper{account_id}", type="cex",
+            is_paper_trading=True, paper_balances=json.dumps(balances),
+        ))
+        await db.commit()
+
+
+async def _row(session_maker, account_id):
+    async with session_maker() as db:
+        account = (await db.execute(select(Account).where(Account.id == account_id))).scalar_one()
+        return json.loads(account.paper_balances)
+
+
+async def _write_row(session_maker, account_id, balances):
+    async with session_maker() as db:
+        account = (await db.execute(select(Account).where(Account.id == account_id))).scalar_one()
+        account.paper_balances = json.dumps(balances)
+        await db.commit()
+
+
+async def _start_write_behind(ledger, session_maker, monkeypatch):
+    import app.database
+    monkeypatch.setattr(app.database, "async_session_maker", session_maker)
+    await ledger.start()
+
+
+# =============================================================================
+# apply()
+# =============================================================================
+
+
+def test_apply_checks_require_atomically(ledger):
+    ledger.seed(1, {"USD": 100.0, "BTC": 0.0})
+
+    after = ledger.apply(1, {"USD": -60.0, "BTC": 0.001}, require={"USD": 60.0})
+    assert after == {"USD": 40.0, "BTC": 0.001}
+
+    with pytest.raises(InsufficientPaperBalance, match="Insufficient USD balance. Available: 40.0"):
+        ledger.apply(1, {"USD": -60.0, "BTC": 0.001}, require={"USD": 60.0})
+    assert ledger.peek(1) == {"USD": 40.0, "BTC": 0.001}
+
+
+def test_apply_requires_loaded_account(ledger):
+    with pytest.raises(RuntimeError, match="not loaded"):
+        ledger.apply(7, {"USD": 1.0})
+
+
+# =============================================================================
+# Write-through (ledger not started)
+# =============================================================================
+
+
+async def test_write_through_persists_and_rereads_row(ledger, session_maker):
+    await _add_account(session_maker, 1, {"USD": 100.0})
+    await ledger.load(1, session_maker)
+
+    ledger.apply(1, {"USD": -30.0})
+    await ledger.persist(session_maker)
+    assert await _row(session_maker, 1) == {"USD": 70.0}
+    assert not ledger.journal_path.exists()
+
+    # Another process changed the row: the next load sees it
+    await _write_row(session_maker, 1, {"USD": 500.0})
+    assert await ledger.load(1, session_maker) == {"USD": 500.0}
+
+
+# =============================================================================
+# Write-behind
+# =============================================================================
+
+
+async def test_write_behind_journals_fills_and_flushes_in_one_pass(ledger, session_maker, monkeypatch):
+    await _add_account(session_maker, 1, {"USD": 100.0})
+    await _add_account(session_maker, 2, {"USD": 100.0})
+    await _start_write_behind(ledger, session_maker, monkeypatch)
+    try:
+        for account_id in (1, 2):
+            await ledger.load(account_id, session_maker)
+            ledger.apply(account_id, {"USD": -10.0}, kind="fill")
+            ledger.apply(account_id, {"USD": -10.0}, kind="fill")
+            await ledger.persist(session_maker)  # journals the fills, no DB write
+
+        assert await _row(session_maker, 1) == {"USD": 100.0}
+        assert len(ledger._read_journal()) == 4
+        assert ledger.stats()["dirty_accounts"] == 2
+
+        assert await ledger.flush(session_maker) == 2
+        assert await _row(session_maker, 1) == {"USD": 80.0}
+        assert await _row(session_maker, 2) == {"USD": 80.0}
+        assert not ledger.journal_path.exists()  # compacted away once clean
+    finally:
+        await ledger.stop()
+
+
+async def test_write_behind_merges_external_row_changes(ledger, session_maker, monkeypatch):
+    await _add_account(session_maker, 1, {"USD": 100.0, "BTC": 1.0})
+    await _start_write_behind(ledger, session_maker, monkeypatch)
+    try:
+        await ledger.load(1, session_maker)
+        ledger.apply(1, {"USD": -25.0, "BTC": 0.5}, kind="fill")  # not flushed yet
+
+        # Web process deposits straight into the row meanwhile
+        await _write_row(session_maker, 1, {"USD": 1100.0, "BTC": 1.0})
+        await ledger.flush(session_maker)
+
+        expected = {"USD": 1075.0, "BTC": 1.5}
+        assert ledger.peek(1) == expected
+        assert await _row(session_maker, 1) == expected
+
+        # A clean account picks up a reset on reconcile
+        await _write_row(session_maker, 1, {"USD": 100000.0, "BTC": 1.0})
+        assert await ledger.flush(session_maker) == 0
+        assert ledger.peek(1) == expected
+        await ledger.flush(session_maker, reconcile=True)
+        assert ledger.peek(1) == {"USD": 100000.0, "BTC": 1.0}
+    finally:
+        await ledger.stop()
+
+
+# =============================================================================
+# Journal replay
+# =============================================================================
+
+
+async def test_replay_applies_journal_left_by_crash(ledger, session_maker, monkeypatch, tmp_path):
+    await _add_account(session_maker, 1, {"USD": 100.0, "BTC": 0.0})
+    await _start_write_behind(ledger, session_maker, monkeypatch)
+    await ledger.load(1, session_maker)
+    ledger.apply(1, {"USD": -50.0, "BTC": 0.001}, kind="fill")
+    ledger.apply(1, {"USD": -25.0, "BTC": 0.0005}, kind="fill")
+    await ledger.persist(session_maker)
+    ledger._flush_task.cancel()  # crash: nothing flushed
+    with open(ledger.journal_path, "a") as f:
+        f.write('{"seq": 3, "account_id": 1, "bal')  # torn final append
+
+    restarted = PaperLedger(journal_dir=tmp_path, flush_interval=3600)
+    assert await restarted.replay(session_maker) == 2
+
+    assert await _row(session_maker, 1) == {"USD": 25.0, "BTC": 0.0015}
+    assert not restarted.journal_path.exists()
+
+
+async def test_replay_keeps_external_deposit_made_before_crash(ledger, session_maker, monkeypatch, tmp_path):
+    """Edge case: replay adds the journaled deltas to the row instead of overwriting it."""
+    await _add_account(session_maker, 1, {"USD": 100.0})
+    await _start_write_behind(ledger, session_maker, monkeypatch)
+    await ledger.load(1, session_maker)
+    ledger.apply(1, {"USD": -30.0}, kind="fill")
+    await ledger.persist(session_maker)
+    await _write_row(session_maker, 1, {"USD": 1100.0})  # web process deposit
+    ledger._flush_task.cancel()  # crash before the flush merged it
+
+    restarted = PaperLedger(journal_dir=tmp_path, flush_interval=3600)
+    assert await restarted.replay(session_maker) == 1
+    assert await _row(session_maker, 1) == {"USD": 1070.0}
+
+
+async def test_replay_skips_deltas_of_a_committed_flush(ledger, session_maker, monkeypatch, tmp_path):
+    """Failure: a crash after the flush commit but before compaction doesn't apply the fills twice."""
+    await _add_account(session_maker, 1, {"USD": 100.0})
+    await _start_write_behind(ledger, session_maker, monkeypatch)
+    await ledger.load(1, session_maker)
+    ledger.apply(1, {"USD": -30.0}, kind="fill")
+    await ledger.persist(session_maker)
+    monkeypatch.setattr(ledger, "_compact_journal", lambda: None)  # crash right after the commit
+    await ledger.flush(session_maker)
+    ledger._flush_task.cancel()
+    assert await _row(session_maker, 1) == {"USD": 70.0}
+
+    restarted = PaperLedger(journal_dir=tmp_path, flush_interval=3600)
+    assert await restarted.replay(session_maker) == 0
+    assert await _row(session_maker, 1) == {"USD": 70.0}
+
+
+async def test_persist_writes_journal_off_the_event_loop(ledger, session_maker, monkeypatch):
+    """Happy path: the fsync'd append runs in a worker thread and covers every queued fill."""
+    import threading
+
+    await _add_account(session_maker, 1, {"USD": 100.0})
+    await _start_write_behind(ledger, session_maker, monkeypatch)
+    try:
+        await ledger.load(1, session_maker)
+        writes = []
+        real_append = ledger._append_journal
+
+        def recording_append(entries):
+            writes.append((threading.current_thread() is threading.main_thread(), len(entries)))
+            real_append(entries)
+
+        monkeypatch.setattr(ledger, "_append_journal", recording_append)
+        ledger.apply(1, {"USD": -10.0}, kind="fill")
+        ledger.apply(1, {"USD": -10.0}, kind="fill")
+        assert not ledger.journal_path.exists()  # queued until persist()
+        await ledger.persist(session_maker)
+        await ledger.persist(session_maker)
+
+        assert writes == [(False, 2)]  # one group-committed append, not on the loop's thread
+        assert [e["deltas"] for e in ledger._read_journal()] == [{"USD": -10.0}, {"USD": -10.0}]
+    finally:
+        await ledger.stop()
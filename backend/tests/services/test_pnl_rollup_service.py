@@ -0,0 +1,224 @@
+"""
+Tests for the realized-P&L daily rollups.
+
+- rebuild_rollup_day(): recompute is idempotent and scoped to one (account, day),
+  serialized per account with an advisory lock on Postgres
+- chart columns skip closes without a recorded profit_usd
+- stats columns exclude manual closes; chart columns include them
+- on_position_closed(): event handler refreshes the closed position's day
+- reconcile_recent_rollups(): picks up closes that published no event
+- delete_account_rollups(): purge/reset companion
+"""
+
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import select
+
+from app.models import Account, PnlDailyRollup, Position, User
+from app.services.pnl_rollup_service import (
+    ROLLUP_LOCK_NAMESPACE,
+    delete_account_rollups,
+    on_position_closed,
+    rebuild_rollup_day,
+    rebuild_rollups,
+    reconcile_recent_rollups,
+)
+from app.utils.timeutil import utcnow
+
+
+async def _seed_account(db, email):
+    user = User(email=email, hashed_password="fakehash")
+    db.add(user)
+    await db.flush()
+    account = Account(user_id=user.id, name="Acct", type="cex", is_active=True)
+    db.add(account)
+    await db.flush()
+    return account
+
+
+def _closed(account_id, product_id, profit_usd, closed_at, profit_quote=None, exit_reason=None):
+    return Position(
+        account_id=account_id, product_id=product_id, status="closed",
+        profit_usd=profit_usd, profit_quote=profit_quote, closed_at=closed_at,
+        btc_usd_price_at_close=50000.0, exit_reason=exit_reason,
+    )
+
+
+def _session_maker(db):
+    @asynccontextmanager
+    async def _sm():
+        yield db
+    return _sm
+
+
+async def _rollups(db, account_id):
+    return (await db.execute(
+        select(PnlDailyRollup).where(PnlDailyRollup.account_id == account_id)
+        .order_by(PnlDailyRollup.day, PnlDailyRollup.product_id)
+    )).scalars().all()
+
+
+class TestRebuildRollupDay:
+    async def test_buckets_by_product_and_is_idempotent(self, db_session):
+        """Happy path: one row per product; rebuilding twice does not double count."""
+        acct = await _seed_account(db_session, "roll1@example.com")
+        now = utcnow()
+        db_session.add_all([
+            _closed(acct.id, "ETH-USD", 10.0, now, profit_quote=10.0),
+            _closed(acct.id, "ETH-USD", -4.0, now, profit_quote=-4.0),
+            _closed(acct.id, "SOL-BTC", 5.0, now, profit_quote=0.0001),
+        ])
+        await db_session.flush()
+
+        await rebuild_rollup_day(db_session, acct.id, now.date())
+        await rebuild_rollup_day(db_session, acct.id, now.date())
+
+        rows = await _rollups(db_session, acct.id)
+        assert [(r.product_id, r.closed_count) for r in rows] == [("ETH-USD", 2), ("SOL-BTC", 1)]
+        eth, sol = rows
+        assert eth.profit_usd == 6.0
+        assert eth.profit_btc == 6.0 / 50000.0
+        assert eth.win_count == 1 and eth.loss_count == 1
+        assert sol.profit_btc == 0.0001
+
+    async def test_only_touches_requested_day(self, db_session):
+        """Edge: other days' rows survive a single-day rebuild."""
+        acct = await _seed_account(db_session, "roll2@example.com")
+        now = utcnow()
+        db_session.add_all([
+            _closed(acct.id, "ETH-USD", 1.0, now),
+            _closed(acct.id, "ETH-USD", 2.0, now - timedelta(days=3)),
+        ])
+        await db_session.flush()
+        await rebuild_rollups(db_session)
+
+        await rebuild_rollup_day(db_session, acct.id, now.date())
+
+        rows = await _rollups(db_session, acct.id)
+        assert [r.profit_usd for r in rows] == [2.0, 1.0]
+
+    async def test_manual_exits_excluded_from_stats(self, db_session):
+        """Manual closes count toward the chart totals but not the trade stats."""
+        acct = await _seed_account(db_session, "roll3@example.com")
+        now = utcnow()
+        db_session.add_all([
+            _closed(acct.id, "ETH-USD", 10.0, now),
+            _closed(acct.id, "ETH-USD", -50.0, now, exit_reason="manual"),
+        ])
+        await db_session.flush()
+
+        await rebuild_rollup_day(db_session, acct.id, now.date())
+
+        (row,) = await _rollups(db_session, acct.id)
+        assert row.closed_count == 2 and row.profit_usd == -40.0
+        assert row.stats_count == 1 and row.stats_profit_usd == 10.0
+        assert row.win_count == 1 and row.loss_count == 0
+
+    async def test_null_profit_quote_falls_back_for_stable_quotes_only(self, db_session):
+        """USD-family pairs fall back to profit_usd; BTC pairs stay 0."""
+        acct = await _seed_account(db_session, "roll4@example.com")
+        now = utcnow()
+        db_session.add_all([
+            _closed(acct.id, "ADA-USDC", 3.0, now),
+            _closed(acct.id, "DOT-BTC", 3.0, now),
+        ])
+        await db_session.flush()
+
+        await rebuild_rollup_day(db_session, acct.id, now.date())
+
+        ada, dot = await _rollups(db_session, acct.id)
+        assert ada.profit_quote == 3.0
+        assert dot.profit_quote == 0.0
+
+    async def test_null_profit_usd_kept_out_of_chart_columns(self, db_session):
+        """Edge: a close without profit_usd adds to profit_quote and stats, not the chart count."""
+        acct = await _seed_account(db_session, "roll9@example.com")
+        now = utcnow()
+        db_session.add_all([
+            _closed(acct.id, "SOL-BTC", 5.0, now, profit_quote=0.0001),
+            _closed(acct.id, "SOL-BTC", None, now, profit_quote=0.0002),
+        ])
+        await db_session.flush()
+
+        await rebuild_rollup_day(db_session, acct.id, now.date())
+
+        (row,) = await _rollups(db_session, acct.id)
+        assert row.closed_count == 1 and row.profit_btc == 0.0001
+        assert row.profit_quote == 0.0001 + 0.0002
+        assert row.stats_count == 2
+
+    async def test_postgres_rebuild_takes_account_advisory_lock(self):
+        """Security: on Postgres a day rebuild locks its account before reading and rewriting."""
+        executed = []
+
+        class _FakeSession:
+            bind = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+
+            async def execute(self, statement, params=None):
+                executed.append((str(statement), params))
+                return SimpleNamespace(all=lambda: [])
+
+            def add_all(self, rows):
+                pass
+
+            async def flush(self):
+                pass
+
+        await rebuild_rollup_day(_FakeSession(), 42, utcnow().date())
+
+        sql, params = executed[0]
+        assert "pg_advisory_xact_lock" in sql
+        assert params == {"namespace": ROLLUP_LOCK_NAMESPACE, "account_id": 42}
+
+
+class TestRollupMaintenance:
+    async def test_on_position_closed_refreshes_the_day(self, db_session):
+        """Happy path: the event handler writes the closed position's bucket."""
+        acct = await _seed_account(db_session, "roll5@example.com")
+        position = _closed(acct.id, "ETH-USD", 7.0, utcnow())
+        db_session.add(position)
+        await db_session.flush()
+
+        payload = SimpleNamespace(position_id=position.id)
+        await on_position_closed(payload, session_maker=_session_maker(db_session))
+
+        (row,) = await _rollups(db_session, acct.id)
+        assert row.profit_usd == 7.0
+
+    async def test_on_position_closed_ignores_unknown_position(self, db_session):
+        """Failure: a stale/unknown position id is a no-op."""
+        await on_position_closed(SimpleNamespace(position_id=999999), session_maker=_session_maker(db_session))
+        assert (await db_session.execute(select(PnlDailyRollup))).first() is None
+
+    async def test_reconcile_picks_up_recent_closes_without_events(self, db_session):
+        """Closes inside the lookback are rolled up; older days are left alone."""
+        acct = await _seed_account(db_session, "roll6@example.com")
+        db_session.add_all([
+            _closed(acct.id, "ETH-USD", 4.0, utcnow()),
+            _closed(acct.id, "ETH-USD", 9.0, utcnow() - timedelta(days=10)),
+        ])
+        await db_session.flush()
+
+        refreshed = await reconcile_recent_rollups(session_maker=_session_maker(db_session))
+
+        assert refreshed == 1
+        (row,) = await _rollups(db_session, acct.id)
+        assert row.profit_usd == 4.0
+
+    async def test_delete_account_rollups_scoped_to_account(self, db_session):
+        """Purge/reset removes only the target account's rollups."""
+        acct = await _seed_account(db_session, "roll7@example.com")
+        other = await _seed_account(db_session, "roll8@example.com")
+        db_session.add_all([
+            _closed(acct.id, "ETH-USD", 1.0, utcnow()),
+            _closed(other.id, "ETH-USD", 2.0, utcnow()),
+        ])
+        await db_session.flush()
+        await rebuild_rollups(db_session)
+
+        await delete_account_rollups(db_session, acct.id)
+
+        assert await _rollups(db_session, acct.id) == []
+        assert len(await _rollups(db_session, other.id)) == 1
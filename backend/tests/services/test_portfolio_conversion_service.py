@@ -3,8 +3,10 @@
 from datetime import timedelta
 from app.utils.timeutil import utcnow
 
+from app.json_response import utc_isoformat
 from app.services.portfolio_conversion_service import (
     get_task_progress,
+    init_task,
     update_task_progress,
     cleanup_old_tasks,
     _conversion_tasks,
@@ -103,6 +105,20 @@ class TestCleanupOldTasks:
         cleanup_old_tasks()
         assert "recent-task" in _conversion_tasks
 
+    def test_removes_tasks_stamped_by_update_task_progress(self):
+        """Edge case: completed_at is UTC-suffixed ("...Z") and still compares against utcnow()."""
+        init_task("done-task", user_id=1)
+        update_task_progress("done-task", status="completed")
+        assert _conversion_tasks["done-task"]["completed_at"].endswith("Z")
+        cleanup_old_tasks()
+        assert "done-task" in _conversion_tasks
+
+        _conversion_tasks["done-task"]["completed_at"] = (
+            utc_isoformat(utcnow() - timedelta(hours=2))
+        )
+        cleanup_old_tasks()
+        assert "done-task" not in _conversion_tasks
+
     def test_keeps_running_tasks(self):
         _conversion_tasks["running-task"] = {
             "task_id": "running-task",
@@ -1518,6 +1518,7 @@ class TestPaperConvert:
         """Happy path: paper convert moves balances 1:1."""
         import json
         from app.exchange_clients.paper_trading_client import PaperTradingClient
+        from app.services.paper_ledger import paper_ledger
 
         account = MagicMock()
         account.id = 99
@@ -1526,20 +1527,22 @@ class TestPaperConvert:
         client = PaperTradingClient(account)
         # Mock DB operations — unit test, no real DB
         client._reload_balances = AsyncMock()
-        client._save_balances = AsyncMock()
+        paper_ledger.seed(99, {"USD": 500.0, "USDC": 100.0})
 
-        result = await client.convert_currency("USD", "USDC", 200.0)
+        with patch.object(paper_ledger, "persist", new_callable=AsyncMock) as persist:
+            result = await client.convert_currency("USD", "USDC", 200.0)
 
         assert result.get("success_response", {}).get("order_id")
         assert client.balances["USD"] == pytest.approx(300.0)
         assert client.balances["USDC"] == pytest.approx(300.0)
-        client._save_balances.assert_called_once()
+        persist.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_paper_convert_insufficient_balance_fails(self):
         """Failure case: not enough source currency returns error."""
         import json
         from app.exchange_clients.paper_trading_client import PaperTradingClient
+        from app.services.paper_ledger import paper_ledger
 
         account = MagicMock()
         account.id = 100
@@ -1548,15 +1551,16 @@ class TestPaperConvert:
         client = PaperTradingClient(account)
         # Mock DB operations — unit test, no real DB
         client._reload_balances = AsyncMock()
-        client._save_balances = AsyncMock()
+        paper_ledger.seed(100, {"USD": 50.0, "USDC": 0.0})
 
-        result = await client.convert_currency("USD", "USDC", 200.0)
+        with patch.object(paper_ledger, "persist", new_callable=AsyncMock) as persist:
+            result = await client.convert_currency("USD", "USDC", 200.0)
 
         assert "error_response" in result
         assert "Insufficient" in result["error_response"]["message"]
         # Balances unchanged
         assert client.balances["USD"] == pytest.approx(50.0)
-        client._save_balances.assert_not_called()
+        persist.assert_not_awaited()
 
 
 # ---------------------------------------------------------------------------
@@ -2,24 +2,55 @@
 Tests for backend/app/services/websocket_manager.py
 
 Tests the WebSocketManager class which manages WebSocket connections
-and broadcasts order fill events to connected clients scoped by user_id.
+and broadcasts order fill events to connected clients scoped by user_id,
+through per-connection send queues with a slow-consumer policy.
 """
 
+import asyncio
+import json
+
 import pytest
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, patch
 
-from app.services.websocket_manager import WebSocketManager, MAX_CONNECTIONS_PER_USER, OrderFillEvent
+from app.services.websocket_manager import (
+    MAX_CONNECTIONS_PER_USER,
+    SLOW_CONSUMER_CLOSE_CODE,
+    OrderFillEvent,
+    SlowConsumerPolicy,
+    WebSocketManager,
+)
 
 
-def _make_ws(accept_side_effect=None, send_json_side_effect=None, close_side_effect=None):
+def _make_ws(accept_side_effect=None, send_text_side_effect=None, close_side_effect=None):
     """Helper to create a mock WebSocket."""
     ws = AsyncMock()
     ws.accept = AsyncMock(side_effect=accept_side_effect)
-    ws.send_json = AsyncMock(side_effect=send_json_side_effect)
+    ws.send_text = AsyncMock(side_effect=send_text_side_effect)
     ws.close = AsyncMock(side_effect=close_side_effect)
     return ws
 
 
+def _sent(ws) -> list[dict]:
+    """Messages written to a mock socket, decoded."""
+    return [json.loads(call.args[0]) for call in ws.send_text.call_args_list]
+
+
+async def _settle():
+    """Let writer tasks run until they block or go idle."""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def _blocked_ws():
+    """A socket whose writes hang until the returned event is set."""
+    release = asyncio.Event()
+
+    async def _send(_text):
+        await release.wait()
+
+    return _make_ws(send_text_side_effect=_send), release
+
+
 class TestWebSocketManagerConnect:
     """Tests for connect()."""
 
@@ -119,8 +150,9 @@ class TestWebSocketManagerBroadcast:
 
         msg = {"type": "test"}
         await mgr.broadcast(msg)
-        ws1.send_json.assert_awaited_once_with(msg)
-        ws2.send_json.assert_awaited_once_with(msg)
+        await mgr.drain()
+        assert _sent(ws1) == [msg]
+        assert _sent(ws2) == [msg]
 
     @pytest.mark.asyncio
     async def test_broadcast_to_specific_user(self):
@@ -133,8 +165,9 @@ class TestWebSocketManagerBroadcast:
 
         msg = {"type": "test"}
         await mgr.broadcast(msg, user_id=1)
-        ws1.send_json.assert_awaited_once_with(msg)
-        ws2.send_json.assert_not_awaited()
+        await mgr.drain()
+        assert _sent(ws1) == [msg]
+        ws2.send_text.assert_not_awaited()
 
     @pytest.mark.asyncio
     async def test_broadcast_no_connections_does_nothing(self):
@@ -147,11 +180,12 @@ class TestWebSocketManagerBroadcast:
         """Failure: disconnected sockets are cleaned up on send failure."""
         mgr = WebSocketManager()
         ws_good = _make_ws()
-        ws_bad = _make_ws(send_json_side_effect=ConnectionError("gone"))
+        ws_bad = _make_ws(send_text_side_effect=ConnectionError("gone"))
         await mgr.connect(ws_good, user_id=1)
         await mgr.connect(ws_bad, user_id=1)
 
         await mgr.broadcast({"type": "test"})
+        await mgr.drain()
         # Bad socket should be removed
         assert len(mgr.active_connections) == 1
         assert mgr.active_connections[0][0] is ws_good
@@ -179,9 +213,10 @@ class TestBroadcastOrderFill:
             profit_percentage=10.0,
             user_id=1,
         ))
+        await mgr.drain()
 
-        ws.send_json.assert_awaited_once()
-        msg = ws.send_json.call_args[0][0]
+        ws.send_text.assert_awaited_once()
+        msg = _sent(ws)[0]
         assert msg["type"] == "order_fill"
         assert msg["fill_type"] == "base_order"
         assert msg["product_id"] == "BTC-USD"
@@ -210,8 +245,9 @@ class TestBroadcastOrderFill:
             position_id=1,
             user_id=1,
         ))
+        await mgr.drain()
 
-        msg = ws.send_json.call_args[0][0]
+        msg = _sent(ws)[0]
         assert msg["profit"] is None
         assert msg["profit_percentage"] is None
 
@@ -231,8 +267,9 @@ class TestBroadcastOrderFill:
             position_id=42,
             user_id=999,  # no such user connected
         ))
+        await mgr.drain()
 
-        ws.send_json.assert_not_awaited()
+        ws.send_text.assert_not_awaited()
 
 
 class TestCountUserConnections:
@@ -253,3 +290,140 @@ class TestCountUserConnections:
         await mgr.connect(_make_ws(), user_id=2)
         assert mgr._count_user_connections(1) == 2
         assert mgr._count_user_connections(2) == 1
+
+
+class TestQueuedFanOut:
+    """Tests for encode-once fan-out through per-connection queues."""
+
+    @pytest.mark.asyncio
+    async def test_room_message_encoded_once(self):
+        """Happy path: one encode for the whole room, excluded user skipped."""
+        mgr = WebSocketManager()
+        sockets = {uid: _make_ws() for uid in (1, 2, 3)}
+        for uid, ws in sockets.items():
+            await mgr.connect(ws, user_id=uid)
+
+        with patch(
+            "app.services.websocket_manager.dumps", side_effect=lambda m: json.dumps(m).encode(),
+        ) as mock_dumps:
+            await mgr.send_to_room({1, 2, 3}, {"type": "game:started", "roomId": "r"}, exclude_user=3)
+        await mgr.drain()
+
+        assert mock_dumps.call_count == 1
+        assert _sent(sockets[1]) == [{"type": "game:started", "roomId": "r"}]
+        assert _sent(sockets[2]) == [{"type": "game:started", "roomId": "r"}]
+        sockets[3].send_text.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_stall_others(self):
+        """Edge case: a socket stuck mid-write doesn't delay delivery to others."""
+        mgr = WebSocketManager()
+        ws_slow, release = _blocked_ws()
+        ws_fast = _make_ws()
+        await mgr.connect(ws_slow, user_id=1)
+        await mgr.connect(ws_fast, user_id=2)
+
+        await mgr.broadcast({"type": "a"})
+        await mgr.broadcast({"type": "b"})
+        await _settle()
+
+        assert _sent(ws_fast) == [{"type": "a"}, {"type": "b"}]
+        assert mgr.stats()["max_queue_depth"] == 1  # "b" waiting behind the stuck "a"
+
+        release.set()
+        await mgr.drain()
+        assert _sent(ws_slow) == [{"type": "a"}, {"type": "b"}]
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_policy(self):
+        """Overflow: oldest queued frame is discarded."""
+        mgr = WebSocketManager(SlowConsumerPolicy.DROP_OLDEST, max_queue_frames=2)
+        ws, release = _blocked_ws()
+        await mgr.connect(ws, user_id=1)
+
+        for n in range(4):
+            await mgr.broadcast({"type": "n", "n": n})
+            await _settle()  # writer picks up frame 0 and blocks on it
+
+        release.set()
+        await mgr.drain()
+        assert [m["n"] for m in _sent(ws)] == [0, 2, 3]
+        assert mgr.stats()["dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_coalesce_policy_replaces_superseded_state(self):
+        """Coalesce: newer player_state replaces the queued one; others keep order."""
+        mgr = WebSocketManager(SlowConsumerPolicy.COALESCE)
+        ws, release = _blocked_ws()
+        await mgr.connect(ws, user_id=1)
+
+        await mgr.broadcast({"type": "order_fill", "position_id": 1})
+        await _settle()
+        await mgr.broadcast({"type": "game:player_state", "roomId": "r", "playerId": 2, "state": 1})
+        await mgr.broadcast({"type": "game:chat", "roomId": "r"})
+        await mgr.broadcast({"type": "game:player_state", "roomId": "r", "playerId": 2, "state": 2})
+        await mgr.broadcast({"type": "game:player_state", "roomId": "r", "playerId": 3, "state": 9})
+
+        release.set()
+        await mgr.drain()
+        assert [(m["type"], m.get("state")) for m in _sent(ws)] == [
+            ("order_fill", None),
+            ("game:chat", None),
+            ("game:player_state", 2),
+            ("game:player_state", 9),
+        ]
+        assert mgr.stats()["coalesced"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disconnect_policy_closes_slow_consumer(self):
+        """Overflow: slow socket is closed and removed; others unaffected."""
+        mgr = WebSocketManager(SlowConsumerPolicy.DISCONNECT, max_queue_frames=1)
+        ws_slow, _release = _blocked_ws()
+        ws_fast = _make_ws()
+        await mgr.connect(ws_slow, user_id=1)
+        await mgr.connect(ws_fast, user_id=2)
+
+        for n in range(3):
+            await mgr.broadcast({"type": "n", "n": n})
+            await _settle()
+
+        ws_slow.close.assert_awaited_once()
+        assert ws_slow.close.call_args.kwargs["code"] == SLOW_CONSUMER_CLOSE_CODE
+        assert [ws for ws, _ in mgr.active_connections] == [ws_fast]
+        await mgr.drain()
+        assert len(_sent(ws_fast)) == 3
+        assert mgr.stats()["slow_disconnects"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stats_report_latency_and_counters(self):
+        """Happy path: stats() reports sends, encodes and latency samples."""
+        mgr = WebSocketManager()
+        await mgr.connect(_make_ws(), user_id=1)
+        await mgr.connect(_make_ws(), user_id=2)
+
+        await mgr.broadcast({"type": "test"})
+        await mgr.drain()
+
+        stats = mgr.stats()
+        assert stats["connections"] == 2
+        assert stats["encodes"] == 1
+        assert stats["enqueued"] == 2
+        assert stats["sent"] == 2
+        assert stats["queued_frames"] == 0
+        assert stats["send_latency_ms"]["count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_disconnect_stops_writer(self):
+        """Edge case: disconnecting cancels the writer and drops queued frames."""
+        mgr = WebSocketManager()
+        ws, _release = _blocked_ws()
+        await mgr.connect(ws, user_id=1)
+        await mgr.broadcast({"type": "a"})
+        await mgr.broadcast({"type": "b"})
+        await _settle()
+
+        conn = mgr._connections[ws]
+        await mgr.disconnect(ws)
+        await _settle()
+        assert conn.task.cancelled() or conn.task.done()
+        assert not conn.queue
@@ -0,0 +1,241 @@
+"""
+Tests for backend/app/strategies/dsl_compiler.py
+
+Covers:
+- CompiledScript.run agrees with dsl_interpreter.evaluate on randomized
+  scripts and contexts (intents, and DSLError messages when data is missing)
+- Runtime-only errors stay runtime errors (bare names, actions in conditions)
+- Sandbox: compile_script rejects what parse_script rejects; eval/exec/compile
+  are never called
+- data_calls: every data call with its literal argument, first-appearance order
+- Script cache keyed by script hash
+"""
+
+import ast
+import builtins
+import random
+
+import pytest
+
+from app.strategies.dsl_compiler import (
+    SCRIPT_CACHE_SIZE,
+    DataCall,
+    _script_cache,
+    clear_script_cache,
+    compile_script,
+    script_digest,
+)
+from app.strategies.dsl_interpreter import DSLError, evaluate, parse_script
+
+_SYMBOLS = ["BTC-USD", "ETH-USD", "SOL-USD"]
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    clear_script_cache()
+    yield
+    clear_script_cache()
+
+
+def _random_value(rng):
+    return rng.choice([
+        "rsi(14)", "rsi(7)", "macd()", "bb_pct()", "bb(20)",
+        f"price('{rng.choice(_SYMBOLS)}')",
+        str(rng.randint(0, 100)), f"-{rng.randint(1, 5)}", "0.5",
+    ])
+
+
+def _random_condition(rng, depth=0):
+    roll = rng.random()
+    if depth < 2 and roll < 0.25:
+        op = rng.choice([" and ", " or "])
+        return "(" + op.join(_random_condition(rng, depth + 1) for _ in range(rng.randint(2, 3))) + ")"
+    if depth < 2 and roll < 0.35:
+        return f"not {_random_condition(rng, depth + 1)}"
+    ops = rng.sample(["<", "<=", ">", ">=", "==", "!="], rng.randint(1, 2))
+    parts = [_random_value(rng)]
+    for op in ops:
+        parts += [op, _random_value(rng)]
+    return " ".join(parts)
+
+
+def _random_action(rng):
+    side = rng.choice(["'buy'", "'sell'"])
+    symbol = f"'{rng.choice(_SYMBOLS)}'"
+    size = rng.choice(["0.01", "1", "all", "rsi(14)", "-0.5"])
+    if rng.random() < 0.5:
+        return f"market({side}, {symbol}, {size})"
+    price = rng.choice(["", ", price='-1%'", ", price=-2", ", price=macd()"])
+    return f"limit({side}, {symbol}, {size}{price})"
+
+
+def _random_script(rng):
+    lines = []
+    for _ in range(rng.randint(1, 4)):
+        if rng.random() < 0.75:
+            lines.append(f"if {_random_condition(rng)}: {_random_action(rng)}")
+        else:
+            lines.append(_random_action(rng))
+    return "\n".join(lines)
+
+
+def _random_context(rng):
+    context = {
+        "price": {s: rng.choice([10.0, 50.0, rng.uniform(0, 100)]) for s in _SYMBOLS if rng.random() < 0.9},
+        "rsi": {p: rng.choice([30.0, rng.uniform(0, 100)]) for p in (7, 14) if rng.random() < 0.9},
+        "macd": {"line": rng.uniform(-5, 5)} if rng.random() < 0.9 else {},
+    }
+    if rng.random() < 0.9:
+        context["bb_pct"] = context["bb"] = rng.uniform(0, 1)
+    return context
+
+
+def _outcome(fn):
+    try:
+        return fn()
+    except DSLError as exc:
+        return ("DSLError", str(exc))
+
+
+class TestMatchesInterpreter:
+    """Differential tests against dsl_interpreter.evaluate"""
+
+    def test_random_scripts_agree(self):
+        """Happy path: same intents (or the same DSLError) for every script and context."""
+        rng = random.Random(11)
+        for _ in range(300):
+            script = _random_script(rng)
+            parsed = parse_script(script)
+            compiled = compile_script(script)
+            for _ in range(5):
+                context = _random_context(rng)
+                expected = _outcome(lambda: evaluate(parsed, context))
+                assert _outcome(lambda: compiled.run(context)) == expected, (script, context)
+
+    def test_callable_context_values(self):
+        """Happy path: callable data sources get the same arguments as in the interpreter."""
+        script = "if rsi(7) < 30 and price('ETH-USD') > 10 and bb(50) < 0.2: limit('buy', 'ETH-USD', 1)"
+        seen = []
+        context = {
+            "rsi": lambda period: seen.append(("rsi", period)) or 20.0,
+            "price": lambda symbol: seen.append(("price", symbol)) or 11.0,
+            "bb_pct": lambda *args: seen.append(("bb", args)) or 0.1,
+        }
+        assert compile_script(script).run(context) == evaluate(parse_script(script), context)
+        assert seen[:3] == [("rsi", 7), ("price", "ETH-USD"), ("bb", (50,))]
+
+    def test_chained_comparison_evaluates_every_operand(self):
+        """Edge case: like the interpreter, a failed first link doesn't skip later data calls."""
+        script = "if 50 < rsi(14) < price('BTC-USD'): market('buy', 'BTC-USD', 1)"
+        context = {"rsi": {14: 10.0}, "price": {}}
+        with pytest.raises(DSLError, match=r"price\('BTC-USD'\) not available"):
+            evaluate(parse_script(script), context)
+        with pytest.raises(DSLError, match=r"price\('BTC-USD'\) not available"):
+            compile_script(script).run(context)
+
+
+class TestRuntimeErrors:
+    """Errors the interpreter raises at evaluation time"""
+
+    @pytest.mark.parametrize("script, message", [
+        ("if rsi < 30: limit('buy', 'BTC-USD', 1)", "Unexpected bare name 'rsi'"),
+        ("if limit('buy', 'BTC-USD', 1): market('sell', 'BTC-USD', all)", "cannot be used as an expression value"),
+        ("if price(1, 2) > 3: market('sell', 'BTC-USD', all)", "price() requires exactly one string argument"),
+        ("if rsi(price('X')) > 3: market('sell', 'BTC-USD', all)", "rsi() requires exactly one integer period"),
+    ])
+    def test_raised_on_run_not_on_compile(self, script, message):
+        """Failure: the script compiles (as it parses) and fails with the interpreter's message when run."""
+        compiled = compile_script(script)
+        with pytest.raises(DSLError) as exc_info:
+            compiled.run({})
+        assert message in str(exc_info.value)
+        assert exc_info.value.line == 1
+
+    def test_missing_data_carries_location(self):
+        compiled = compile_script("market('buy', 'BTC-USD', 1)\nif macd() > 0: market('buy', 'BTC-USD', 1)")
+        with pytest.raises(DSLError) as exc_info:
+            compiled.run({})
+        assert (exc_info.value.line, exc_info.value.col) == (2, 3)
+
+
+class TestSandbox:
+    """compile_script keeps parse_script's guarantees"""
+
+    @pytest.mark.parametrize("script", [
+        "__import__('os').system('id')",
+        "if ().__class__.__bases__: limit('buy', 'BTC-USD', 1)",
+        "x = 1",
+        "if eval('1'): limit('buy', 'BTC-USD', 1)",
+        "limit('buy', 'BTC-USD', 1, **all)",
+    ])
+    def test_rejected_scripts_raise_and_are_not_cached(self, script):
+        """Failure: sandbox violations raise DSLError and nothing is cached."""
+        with pytest.raises(DSLError):
+            compile_script(script)
+        assert len(_script_cache) == 0
+
+    def test_never_calls_eval_exec_or_compile(self, monkeypatch):
+        """Security: compiling and running use no dynamic code execution (ast.parse only builds an AST)."""
+        real_compile = builtins.compile
+
+        def forbidden(*args, **kwargs):
+            raise AssertionError("dynamic code execution")
+
+        def ast_only_compile(source, filename, mode, flags=0, *args, **kwargs):
+            if not flags & ast.PyCF_ONLY_AST:
+                raise AssertionError("code object compiled")
+            return real_compile(source, filename, mode, flags, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "eval", forbidden)
+        monkeypatch.setattr(builtins, "exec", forbidden)
+        monkeypatch.setattr(builtins, "compile", ast_only_compile)
+
+        compiled = compile_script("if rsi(14) < 30 or not macd() > 0: limit('buy', 'BTC-USD', 0.01, price='-1%')")
+        intents = compiled.run({"rsi": {14: 25.0}, "macd": {"line": 1.0}})
+        assert len(intents) == 1
+
+
+class TestDataCalls:
+    """Tests for the up-front data-call list"""
+
+    def test_lists_every_call_once_in_order(self):
+        """Happy path: conditions, action arguments and keywords are all collected."""
+        compiled = compile_script(
+            "if rsi(14) < 30 and price('ETH-USD') > 100: limit('buy', 'ETH-USD', rsi(7), price=macd())\n"
+            "if rsi(14) > 70 or bb_pct() > 0.9: market('sell', 'SOL-USD', all)"
+        )
+        assert compiled.data_calls == (
+            DataCall("rsi", 14), DataCall("price", "ETH-USD"), DataCall("rsi", 7),
+            DataCall("macd"), DataCall("bb_pct"),
+        )
+        assert compiled.symbols == {"ETH-USD"}
+
+    def test_unresolvable_calls_are_not_listed(self):
+        """Edge case: calls that can only fail, and arguments of data calls, aren't data needs."""
+        compiled = compile_script("if rsi(price('X')) > 3: market('sell', 'BTC-USD', all)")
+        assert compiled.data_calls == ()
+
+    def test_action_only_script_needs_no_data(self):
+        assert compile_script("market('sell', 'BTC-USD', all)").data_calls == ()
+
+
+class TestScriptCache:
+    """Tests for the script-hash cache"""
+
+    def test_same_text_reuses_compilation(self):
+        """Happy path: one compilation per script text."""
+        first = compile_script("market('sell', 'BTC-USD', all)")
+        assert compile_script("market('sell', 'BTC-USD', all)") is first
+        assert first.digest == script_digest("market('sell', 'BTC-USD', all)")
+
+    def test_edited_script_compiles_again(self):
+        first = compile_script("if rsi(14) < 30: market('buy', 'BTC-USD', 1)")
+        second = compile_script("if rsi(14) < 25: market('buy', 'BTC-USD', 1)")
+        assert first is not second
+        assert second.run({"rsi": {14: 27.0}}) == []
+
+    def test_cache_is_bounded(self):
+        """Edge case: the least recently used script is evicted past SCRIPT_CACHE_SIZE."""
+        for size in range(SCRIPT_CACHE_SIZE + 3):
+            compile_script(f"market('buy', 'BTC-USD', {size + 1})")
+        assert len(_script_cache) == SCRIPT_CACHE_SIZE
@@ -432,6 +432,25 @@ class TestDSLTradingStrategyRegistration:
         strategy = _make_strategy(script="")
         assert strategy._parsed_script == []
 
+    def test_same_script_shares_one_compilation(self):
+        a = _make_strategy(script="market('sell', 'BTC-USD', all)")
+        b = _make_strategy(script="market('sell', 'BTC-USD', all)")
+        assert a._compiled_script is b._compiled_script
+        assert a._parsed_script is not b._parsed_script
+
+    def test_required_indicators_follow_data_calls(self):
+        strategy = _make_strategy(
+            script="if rsi(7) < 30 and bb_pct() < 0.1: limit('buy', 'ETH-USD', 0.05, price=macd())",
+        )
+        assert strategy.get_required_indicators() == {
+            "rsi_7", "macd_12_26_9", "bb_upper_20_2", "bb_middle_20_2", "bb_lower_20_2",
+        }
+
+    def test_required_symbols(self):
+        strategy = _make_strategy(script="if price('BTC-USD') > 100000: market('sell', 'ETH-USD', all)")
+        assert strategy.get_required_symbols() == {"BTC-USD"}
+        assert _make_strategy(script="market('sell', 'ETH-USD', all)").get_required_indicators() == set()
+
 
 # =============================================================================
 # DSLTradingStrategy — analyze_signal
@@ -472,6 +491,50 @@ class TestDSLTradingStrategyAnalyzeSignal:
         assert result["signal_type"] == "dsl_result"
         assert result["intents"][0]["side"] == "buy"
 
+    @pytest.mark.asyncio
+    async def test_any_rsi_period_is_calculated(self):
+        candles = []
+        for i in range(60):
+            p = 50_000.0 - i * 200
+            candles.append({"open": p, "high": p, "low": p, "close": p, "volume": 100.0})
+
+        strategy = _make_strategy(script="if rsi(7) < 30: limit('buy', 'BTC-USD', 0.01)")
+        result = await strategy.analyze_signal(candles, candles[-1]["close"], symbol="BTC-USD")
+        assert result is not None
+        assert result["signal_type"] == "dsl_result"
+
+    @pytest.mark.asyncio
+    async def test_integral_float_rsi_period_is_calculated(self):
+        """Edge case: rsi(14.0) reads the 14-period RSI, as it did before scripts were compiled."""
+        candles = []
+        for i in range(60):
+            p = 50_000.0 - i * 200
+            candles.append({"open": p, "high": p, "low": p, "close": p, "volume": 100.0})
+
+        strategy = _make_strategy(script="if rsi(14.0) < 30: limit('buy', 'BTC-USD', 0.01)")
+        assert strategy.get_required_indicators() == {"rsi_14"}
+        result = await strategy.analyze_signal(candles, candles[-1]["close"], symbol="BTC-USD")
+        assert result["signal_type"] == "dsl_result"
+        assert result["intents"][0]["side"] == "buy"
+
+        # A fractional period names no indicator and still fails as missing data
+        fractional = _make_strategy(script="if rsi(14.5) < 30: limit('buy', 'BTC-USD', 0.01)")
+        assert fractional.get_required_indicators() == set()
+
+    @pytest.mark.asyncio
+    async def test_prefetched_prices_feed_price_calls(self):
+        strategy = _make_strategy(script="if price('BTC-USD') > 100000: market('sell', 'ETH-USD', all)")
+        candles = _minimal_candles(price=3_000.0)
+
+        result = await strategy.analyze_signal(
+            candles, 3_000.0, symbol="ETH-USD", prices={"BTC-USD": 110_000.0, "ETH-USD": 1.0},
+        )
+        assert result["intents"][0]["symbol"] == "ETH-USD"
+
+        # The pair's own price comes from the candles, not the prefetched map
+        context = strategy._build_context(candles, 3_000.0, symbol="ETH-USD", prices={"ETH-USD": 1.0})
+        assert context["price"]["ETH-USD"] == 3_000.0
+
     @pytest.mark.asyncio
     async def test_returns_none_when_no_intents(self):
         # Condition that is never true
@@ -6,8 +6,12 @@ Covers:
 - run_backtest: signal processing, trade execution, metrics calculation
 - Edge cases: insufficient candles, no trades, all winning/losing trades
 - Metrics: win rate, max drawdown, profit factor, Sharpe ratio
+- Streaming mode: CandleWindow views, parity with the re-slicing replay
 """
 
+import logging
+import random
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -15,6 +19,7 @@ from app.backtesting import (
     BacktestResult, BacktestPosition,
     SimulatedBroker, run_backtest, _MockPosition, _compute_metrics,
 )
+from app.backtesting.candle_window import CandleWindow
 
 
 # =============================================================================
@@ -331,3 +336,101 @@ def test_mock_position_attributes():
     assert mock.status == "open"
     assert mock.direction == "long"
     assert mock.safety_order_count == 2
+
+
+# =============================================================================
+# Streaming mode tests
+# =============================================================================
+
+
+def test_candle_window_behaves_like_slice():
+    """Indexing, slicing, iteration and len match the sliced list."""
+    candles = _make_candles(12)
+    window = CandleWindow(candles, 0, 8)
+    expected = candles[:8]
+
+    assert len(window) == 8
+    assert window == expected
+    assert window[-1] is candles[7]
+    assert window[:-1] == expected[:-1]
+    assert window[-3:] == expected[-3:]
+    assert window[5:2] == []
+    assert window[::2] == expected[::2]
+    assert list(window[2:][1:4]) == expected[2:][1:4]
+    with pytest.raises(IndexError):
+        window[8]
+
+
+def test_candle_window_slice_is_a_view():
+    """Slicing a window does not copy the candles."""
+    candles = _make_candles(5)
+    tail = CandleWindow(candles)[:-1]
+    assert isinstance(tail, CandleWindow)
+    candles[0]["close"] = "1"
+    assert tail[0]["close"] == "1"
+
+
+async def test_run_backtest_streaming_passes_windows():
+    """Streaming mode hands the strategy views plus a private stream registry."""
+    candles = _make_candles(25)
+    seen = []
+
+    async def mock_analyze(candles_data, price, **kwargs):
+        seen.append((candles_data, kwargs.get("indicator_streams")))
+        return None
+
+    mock_strategy = MagicMock()
+    mock_strategy.analyze_signal = mock_analyze
+
+    with patch("app.strategies.StrategyRegistry.get_strategy", return_value=mock_strategy):
+        await run_backtest("indicator_based", {}, candles, "BTC-USD")
+
+    assert all(isinstance(window, CandleWindow) for window, _ in seen)
+    assert [len(window) for window, _ in seen] == list(range(21, 26))
+    registries = {id(streams) for _, streams in seen}
+    assert len(registries) == 1 and None not in {streams for _, streams in seen}
+
+
+def _random_walk_candles(n: int, seed: int = 3) -> list:
+    rng = random.Random(seed)
+    price = 100.0
+    candles = []
+    for i in range(n):
+        price *= 1 + rng.uniform(-0.01, 0.01)
+        candles.append({
+            "start": str(i * 60), "open": str(price), "high": str(price * 1.004),
+            "low": str(price * 0.996), "close": str(price), "volume": str(rng.uniform(1, 100)),
+        })
+    return candles
+
+
+_PARITY_CONFIG = {
+    "base_order_conditions": [
+        {"type": "rsi", "operator": "less_than", "value": 40, "timeframe": "FIVE_MINUTE"},
+    ],
+    "safety_order_conditions": [
+        {"type": "macd", "operator": "crossing_above", "value": 0, "timeframe": "FIVE_MINUTE"},
+    ],
+    "take_profit_conditions": [
+        {"type": "rsi", "operator": "greater_than", "value": 60, "timeframe": "FIVE_MINUTE"},
+    ],
+}
+
+
+@pytest.mark.parametrize("candles, trades", [
+    (_make_candles(120), False),
+    (_random_walk_candles(400), True),
+], ids=["oscillating", "walk"])
+async def test_run_backtest_streaming_matches_reslicing(candles, trades):
+    """The streaming replay produces exactly the original engine's result."""
+    logging.disable(logging.WARNING)  # _MockPosition gaps in should_sell are logged per bar
+    try:
+        streamed = await run_backtest("indicator_based", _PARITY_CONFIG, candles, "BTC-USD", fee_pct=0.1)
+        resliced = await run_backtest(
+            "indicator_based", _PARITY_CONFIG, candles, "BTC-USD", fee_pct=0.1, streaming=False,
+        )
+    finally:
+        logging.disable(logging.NOTSET)
+
+    assert bool(resliced.trades) is trades
+    assert streamed.to_dict() == resliced.to_dict()
@@ -4,15 +4,15 @@ Tests for backend/app/cache.py
 Covers:
 - CacheEntry (TTL expiry logic)
 - SimpleCache (get, set, delete, clear, delete_prefix, cleanup_expired, get_or_fetch)
+- SimpleCache bounded mode (LRU by entries / approximate bytes) and per-prefix stats
+- SimpleCache stale-while-revalidate
 - PersistentPortfolioCache (get, save, invalidate)
 """
 
 import asyncio
-from app.utils.timeutil import utcnow
 import os
 import time
 import pytest
-from datetime import timedelta
 from unittest.mock import AsyncMock
 
 from app.cache import CacheEntry, SimpleCache, PersistentPortfolioCache
@@ -34,7 +34,7 @@ class TestCacheEntry:
     def test_expired_after_ttl(self):
         """Happy path: entry is expired when expires_at is in the past."""
         entry = CacheEntry("value", ttl_seconds=60)
-        entry.expires_at = utcnow() - timedelta(seconds=1)
+        entry.expires_at = time.monotonic() - 1
         assert entry.is_expired() is True
 
     def test_stores_value(self):
@@ -46,7 +46,7 @@ class TestCacheEntry:
         """Edge case: TTL of 0 means expires immediately (or near-immediately)."""
         entry = CacheEntry("value", ttl_seconds=0)
         # Might not be expired instantly due to timing, but should be expired very soon
-        entry.expires_at = utcnow() - timedelta(milliseconds=1)
+        entry.expires_at = time.monotonic() - 0.001
         assert entry.is_expired() is True
 
 
@@ -79,7 +79,7 @@ class TestSimpleCache:
         cache = SimpleCache()
         await cache.set("key1", "value1", ttl_seconds=60)
         # Manually expire the entry
-        cache._cache["key1"].expires_at = utcnow() - timedelta(seconds=1)
+        cache._cache["key1"].expires_at = time.monotonic() - 1
         result = await cache.get("key1")
         assert result is None
         assert "key1" not in cache._cache
@@ -135,7 +135,7 @@ class TestSimpleCache:
         cache = SimpleCache()
         await cache.set("fresh", "value1", ttl_seconds=60)
         await cache.set("stale", "value2", ttl_seconds=60)
-        cache._cache["stale"].expires_at = utcnow() - timedelta(seconds=1)
+        cache._cache["stale"].expires_at = time.monotonic() - 1
         await cache.cleanup_expired()
         assert await cache.get("fresh") == "value1"
         assert "stale" not in cache._cache
@@ -258,6 +258,114 @@ class TestSimpleCacheGetOrFetch:
         assert call_count == 1  # Only one actual fetch
 
 
+class TestSimpleCacheStaleWhileRevalidate:
+    """Tests for get_or_fetch(..., stale_ttl=...)."""
+
+    @pytest.mark.asyncio
+    async def test_expired_value_served_while_one_refresh_runs(self):
+        """Happy path: callers in the stale window get the old value at once; one refresh replaces it."""
+        cache = SimpleCache()
+        await cache.set("price_BTC-USD", 100.0, ttl_seconds=60, stale_ttl=30)
+        cache._cache["price_BTC-USD"].expires_at = time.monotonic() - 1
+        release = asyncio.Event()
+        calls = 0
+
+        async def slow_fetch():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return 101.0
+
+        results = [await cache.get_or_fetch("price_BTC-USD", slow_fetch, 60, stale_ttl=30) for _ in range(3)]
+        assert results == [100.0, 100.0, 100.0]
+        assert await cache.get("price_BTC-USD") is None  # plain get never returns stale values
+
+        release.set()
+        await asyncio.gather(*cache._refresh_tasks)
+        assert calls == 1
+        assert await cache.get_or_fetch("price_BTC-USD", slow_fetch, 60, stale_ttl=30) == 101.0
+        stats = cache.stats()["by_prefix"]["price"]
+        assert stats["stale_hits"] == 3
+        assert cache.stats()["refreshes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_the_stale_value(self):
+        """Failure: a refresh error is logged and the old value is still served."""
+        cache = SimpleCache()
+        await cache.set("k", "old", ttl_seconds=60, stale_ttl=30)
+        cache._cache["k"].expires_at = time.monotonic() - 1
+        fetch_fn = AsyncMock(side_effect=ConnectionError("coinbase down"))
+
+        assert await cache.get_or_fetch("k", fetch_fn, 60, stale_ttl=30) == "old"
+        await asyncio.gather(*cache._refresh_tasks)
+        assert await cache.get_or_fetch("k", fetch_fn, 60, stale_ttl=30) == "old"
+        assert cache.stats()["refresh_errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_past_the_stale_window_callers_wait(self):
+        """Edge case: once the stale window closes the entry is gone and the fetch is awaited."""
+        cache = SimpleCache()
+        await cache.set("k", "old", ttl_seconds=60, stale_ttl=30)
+        cache._cache["k"].expires_at = time.monotonic() - 31
+        fetch_fn = AsyncMock(return_value="new")
+        assert await cache.get_or_fetch("k", fetch_fn, 60, stale_ttl=30) == "new"
+
+    @pytest.mark.asyncio
+    async def test_cleanup_keeps_entries_inside_their_stale_window(self):
+        cache = SimpleCache()
+        await cache.set("k", "old", ttl_seconds=60, stale_ttl=30)
+        cache._cache["k"].expires_at = time.monotonic() - 1
+        await cache.cleanup_expired()
+        assert "k" in cache._cache
+
+
+class TestSimpleCacheBounded:
+    """Tests for max_entries / max_bytes LRU eviction and per-prefix stats."""
+
+    @pytest.mark.asyncio
+    async def test_entry_budget_evicts_least_recently_used(self):
+        cache = SimpleCache(max_entries=2)
+        await cache.set("price_a", 1, 60)
+        await cache.set("price_b", 2, 60)
+        await cache.get("price_a")
+        await cache.set("balance_c", 3, 60)
+        assert await cache.get("price_b") is None
+        assert await cache.get("price_a") == 1
+        assert cache.stats()["by_prefix"]["price"]["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_byte_budget_counts_nested_values(self):
+        """Edge case: a large product list pushes older entries out; deletes give bytes back."""
+        cache = SimpleCache(max_bytes=20_000)
+        await cache.set("price_a", 1.0, 60)
+        await cache.set("all_products", [{"product_id": f"P{i}-USD", "status": "online"} for i in range(40)], 60)
+        assert cache.stats()["bytes"] <= 20_000
+        await cache.set("big", "x" * 50_000, 60)  # larger than the whole budget
+        assert "big" not in cache._cache
+        await cache.delete("all_products")
+        assert cache.stats()["bytes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_unbounded_by_default(self):
+        cache = SimpleCache()
+        for i in range(500):
+            await cache.set(f"k_{i}", i, 60)
+        assert cache.stats()["entries"] == 500
+        assert cache.stats()["evictions"] == 0
+
+    @pytest.mark.asyncio
+    async def test_per_prefix_hits_and_misses(self):
+        cache = SimpleCache()
+        await cache.set("balance_btc_1", 1.0, 60)
+        await cache.get("balance_btc_1")
+        await cache.get("balance_eth_1")
+        await cache.get("price_BTC-USD")
+        stats = cache.stats()
+        assert stats["by_prefix"]["balance"] == {"hits": 1, "misses": 1, "stale_hits": 0, "evictions": 0}
+        assert stats["by_prefix"]["price"]["misses"] == 1
+        assert stats["hit_ratio"] == pytest.approx(1 / 3, abs=1e-4)
+
+
 # ---------------------------------------------------------------------------
 # PersistentPortfolioCache
 # ---------------------------------------------------------------------------
@@ -0,0 +1,110 @@
+"""
+Tests for backend/app/http_pool.py
+
+Covers:
+- one shared client per (event loop, host), recreated after close
+- connection reuse metrics against a local keep-alive HTTP server
+- per-host connection cap
+- aclose() only closes the calling loop's clients
+- Set-Cookie responses are not replayed on later requests
+"""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.http_pool import HttpClientPool
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = json.dumps({"ok": True, "cookie": self.headers["Cookie"]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Set-Cookie", "session=abc; Path=/")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+async def test_client_shared_per_host_on_one_loop():
+    pool = HttpClientPool()
+    a = pool.client("https://api.coinbase.com/api/v3/brokerage/accounts")
+    b = pool.client("https://api.coinbase.com/api/v3/brokerage/market/products")
+    c = pool.client("https://example.com/x")
+
+    assert a is b
+    assert a is not c
+    assert pool.stats()["clients"] == 2
+    await pool.aclose()
+    assert pool.stats()["clients"] == 0
+    assert pool.client("https://api.coinbase.com/") is not a  # fresh client after close
+    await pool.aclose()
+
+
+def test_each_event_loop_gets_its_own_client():
+    pool = HttpClientPool()
+
+    async def grab():
+        client = pool.client("https://api.coinbase.com/")
+        await pool.aclose()
+        return client
+
+    assert asyncio.run(grab()) is not asyncio.run(grab())
+    assert pool.clients_created == 2
+
+
+async def test_sequential_requests_reuse_one_connection(local_server):
+    pool = HttpClientPool()
+    for _ in range(5):
+        resp = await pool.client(local_server).get(f"{local_server}/ping")
+        assert resp.json()["ok"] is True
+    await pool.aclose()
+
+    stats = pool.stats()
+    assert stats["requests"] == 5
+    assert stats["connections_opened"] == 1
+    assert stats["reused_requests"] == 4
+    assert stats["reuse_ratio"] == 0.8
+
+
+async def test_per_host_connection_cap(local_server):
+    pool = HttpClientPool(max_connections_per_host=2, max_keepalive_per_host=2)
+    client = pool.client(local_server)
+    responses = await asyncio.gather(*[client.get(f"{local_server}/ping") for _ in range(8)])
+    await pool.aclose()
+
+    assert all(r.status_code == 200 for r in responses)
+    assert pool.stats()["connections_opened"] <= 2
+
+
+async def test_response_cookies_are_not_persisted(local_server):
+    """Security: a cookie set for one caller is never sent on another caller's request."""
+    pool = HttpClientPool()
+    client = pool.client(local_server)
+    first = await client.get(f"{local_server}/ping")
+    second = await client.get(f"{local_server}/ping")
+    await pool.aclose()
+
+    assert first.cookies.get("session") == "abc"  # still visible on the response itself
+    assert second.json()["cookie"] is None
+    assert len(client.cookies) == 0
@@ -0,0 +1,120 @@
+"""
+Parity tests for backend/app/indicator_batch.py
+
+The vectorized path must return exactly (==, not approx) what the scalar
+IndicatorCalculator.calculate_all_indicators returns for each pair.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from app.indicator_batch import calculate_indicators_batch, stack_candles
+from app.indicator_calculator import IndicatorCalculator
+
+ALL_KEYS = {
+    "price", "volume", "unknown",
+    "rsi_14", "rsi_2", "volume_rsi_14",
+    "ema_9", "ema_50", "sma_20", "sma_5",
+    "macd_12_26_9", "macd_3_7_2",
+    "bb_upper_20_2", "bb_upper_10_2.5",
+    "stoch_k_14_3", "stoch_k_5_5",
+    "vwap", "gap_fill_pct",
+}
+
+
+def _candles(n, seed=7, flat=False):
+    rng = random.Random(seed)
+    price = 100.0 + seed
+    out = []
+    for i in range(n):
+        if not flat:
+            price *= 1 + rng.uniform(-0.02, 0.02)
+        candle = {
+            "start": 1_700_000_000 + i * 60,
+            "open": price,
+            "high": price * (1 + rng.uniform(0, 0.01)),
+            "low": price * (1 - rng.uniform(0, 0.01)),
+            "close": price,
+            "volume": 0.0 if flat else rng.uniform(0, 500),
+        }
+        if i % 11 == seed % 11:
+            candle["_synthetic"] = True
+        if i % 17 == seed % 17:
+            candle["_synthetic_count"] = 1
+            candle["_synthetic_total"] = 3
+        out.append(candle)
+    return out
+
+
+@pytest.fixture
+def calc():
+    return IndicatorCalculator()
+
+
+# ===========================================================================
+# Class: TestBatchParity
+# ===========================================================================
+
+
+class TestBatchParity:
+    """Batch output == scalar output for every pair."""
+
+    @pytest.mark.parametrize("length", [0, 1, 2, 3, 4, 6, 12, 16, 34, 40, 120])
+    @pytest.mark.parametrize("calculate_previous", [False, True])
+    def test_matches_scalar_for_every_history_length(self, calc, length, calculate_previous):
+        """Covers each indicator's not-enough-data threshold."""
+        pairs = [_candles(length, seed=s) for s in range(5)]
+        batch = calculate_indicators_batch(stack_candles(pairs), ALL_KEYS, calculate_previous)
+        for candles, values in zip(pairs, batch):
+            assert values == calc.calculate_all_indicators(candles, ALL_KEYS, calculate_previous)
+
+    def test_flat_and_zero_volume_pairs(self, calc):
+        """Zero-range stochastic, zero-loss RSI and missing VWAP per row."""
+        pairs = [_candles(60, seed=1, flat=True), _candles(60, seed=2)]
+        batch = calculate_indicators_batch(stack_candles(pairs), ALL_KEYS, True)
+        assert "vwap" not in batch[0]
+        assert "vwap" in batch[1]
+        for candles, values in zip(pairs, batch):
+            assert values == calc.calculate_all_indicators(candles, ALL_KEYS, True)
+
+    def test_gap_fill_defaults_to_zero_without_synthetic_weights(self):
+        pairs = [_candles(10, seed=3)]
+        arrays = {name: stack_candles(pairs)[name] for name in ("close", "high", "low", "volume")}
+        assert calculate_indicators_batch(arrays, {"gap_fill_pct"})[0]["gap_fill_pct"] == 0.0
+
+    def test_values_are_plain_floats(self):
+        values = calculate_indicators_batch(stack_candles([_candles(40)]), {"rsi_14", "ema_9"})[0]
+        assert all(type(v) is float for v in values.values())
+
+
+# ===========================================================================
+# Class: TestStacking
+# ===========================================================================
+
+
+class TestStacking:
+    """stack_candles and the grouped IndicatorCalculator entry point."""
+
+    def test_unequal_lengths_rejected(self):
+        with pytest.raises(ValueError):
+            stack_candles([_candles(5), _candles(6)])
+
+    def test_requires_2d_arrays(self):
+        with pytest.raises(ValueError):
+            calculate_indicators_batch({"close": np.ones(5)}, {"rsi_14"})
+
+    def test_synthetic_weights(self):
+        batch = stack_candles([[
+            {"close": 1, "high": 1, "low": 1, "volume": 1, "_synthetic": True},
+            {"close": 1, "high": 1, "low": 1, "volume": 1, "_synthetic_count": 2, "_synthetic_total": 5},
+            {"close": 1, "high": 1, "low": 1, "volume": 1},
+        ]])
+        assert batch["synthetic_count"].tolist() == [[1.0, 2.0, 0.0]]
+        assert batch["synthetic_total"].tolist() == [[1.0, 5.0, 1.0]]
+
+    def test_for_pairs_groups_mixed_lengths_in_input_order(self, calc):
+        pairs = [_candles(40, seed=1), _candles(25, seed=2), _candles(40, seed=3), []]
+        results = calc.calculate_indicators_for_pairs(pairs, ALL_KEYS, calculate_previous=True)
+        assert results == [calc.calculate_all_indicators(c, ALL_KEYS, calculate_previous=True) for c in pairs]
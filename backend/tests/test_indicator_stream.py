@@ -0,0 +1,267 @@
+"""
+Parity tests for backend/app/indicator_stream.py
+
+The streaming engine must return exactly (==, not approx) what the batch
+IndicatorCalculator.calculate_all_indicators returns over the same candles,
+for growing, sliding and repeated windows alike.
+"""
+
+import random
+
+import pytest
+
+from app.indicator_calculator import IndicatorCalculator
+from app.indicator_stream import IndicatorStream, IndicatorStreamRegistry
+
+ALL_KEYS = {
+    "price", "volume", "unknown",
+    "rsi_14", "rsi_2", "volume_rsi_14",
+    "ema_9", "ema_50", "sma_20", "sma_5",
+    "macd_12_26_9", "macd_3_7_2",
+    "bb_upper_20_2", "bb_upper_10_2.5",
+    "stoch_k_14_3", "stoch_k_5_5",
+    "vwap", "gap_fill_pct",
+}
+
+
+def _candles(n, seed=7, flat=False):
+    rng = random.Random(seed)
+    price = 100.0
+    out = []
+    for i in range(n):
+        if not flat:
+            price *= 1 + rng.uniform(-0.02, 0.02)
+        candle = {
+            "start": 1_700_000_000 + i * 60,
+            "open": price,
+            "high": price * (1 + rng.uniform(0, 0.01)),
+            "low": price * (1 - rng.uniform(0, 0.01)),
+            "close": price,
+            "volume": 0.0 if flat else rng.uniform(0, 500),
+        }
+        if i % 11 == 0:
+            candle["_synthetic"] = True
+        if i % 17 == 0:
+            candle["_synthetic_count"] = 1
+            candle["_synthetic_total"] = 3
+        out.append(candle)
+    return out
+
+
+@pytest.fixture
+def calc():
+    return IndicatorCalculator()
+
+
+class TestStreamParity:
+    """Stream output == batch output for the same candles."""
+
+    @pytest.mark.parametrize("calculate_previous", [False, True])
+    def test_growing_history_matches_batch_every_step(self, calc, calculate_previous):
+        candles = _candles(160)
+        stream = IndicatorStream()
+        for end in range(1, len(candles) + 1):
+            window = candles[:end]
+            expected = calc.calculate_all_indicators(window, ALL_KEYS, calculate_previous=calculate_previous)
+            assert stream.calculate(window, ALL_KEYS, calculate_previous=calculate_previous) == expected
+
+    def test_growing_history_folds_one_candle_per_step(self):
+        candles = _candles(80)
+        stream = IndicatorStream()
+        stream.calculate(candles[:40], ALL_KEYS)
+        for end in range(41, 81):
+            stream.calculate(candles[:end], ALL_KEYS)
+            assert stream.last_update == (1, False)
+
+    @pytest.mark.parametrize("step", [1, 7])
+    def test_sliding_window_matches_batch_over_the_window(self, calc, step):
+        """Happy path: a slid window re-anchors, so EMA/RSI/MACD are seeded from its own first candles."""
+        candles = _candles(260)
+        stream = IndicatorStream()
+        for end in range(100, 260, step):
+            window = candles[end - 100:end]
+            expected = calc.calculate_all_indicators(window, ALL_KEYS, calculate_previous=True)
+            assert stream.calculate(window, ALL_KEYS, calculate_previous=True) == expected
+            assert stream.last_update == (99, True)
+            assert stream.anchor == window[0]["start"]
+
+    def test_repeated_window_folds_nothing(self, calc):
+        """Happy path: calling again with the same window reuses the state as is."""
+        window = _candles(100)
+        stream = IndicatorStream()
+        stream.calculate(window, ALL_KEYS, calculate_previous=True)
+        expected = calc.calculate_all_indicators(window, ALL_KEYS, calculate_previous=True)
+        assert stream.calculate(window, ALL_KEYS, calculate_previous=True) == expected
+        assert stream.last_update == (0, False)
+
+    def test_window_ending_before_history_uses_batch(self, calc):
+        """Edge case: a stale window is served by the batch path and leaves the stream alone."""
+        candles = _candles(80)
+        stream = IndicatorStream()
+        stream.calculate(candles, ALL_KEYS)
+        stale = candles[:50]
+        expected = calc.calculate_all_indicators(stale, ALL_KEYS, calculate_previous=True)
+        assert stream.calculate(stale, ALL_KEYS, calculate_previous=True) == expected
+        assert len(stream) == 79
+        stream.calculate(candles + _candles(81)[80:], ALL_KEYS)
+        assert stream.last_update == (1, False)
+
+    def test_deeper_window_reanchors(self, calc):
+        """Edge case: a window reaching before the history replays from its first candle."""
+        candles = _candles(80)
+        stream = IndicatorStream()
+        stream.calculate(candles[40:], ALL_KEYS)
+        expected = calc.calculate_all_indicators(candles, ALL_KEYS, calculate_previous=True)
+        assert stream.calculate(candles, ALL_KEYS, calculate_previous=True) == expected
+        assert stream.last_update == (79, True)
+
+    def test_gap_after_history_reanchors(self, calc):
+        """Failure: candles missing between the history and the window force a replay."""
+        candles = _candles(120)
+        stream = IndicatorStream()
+        stream.calculate(candles[:50], ALL_KEYS)
+        window = candles[60:120]
+        expected = calc.calculate_all_indicators(window, ALL_KEYS, calculate_previous=True)
+        assert stream.calculate(window, ALL_KEYS, calculate_previous=True) == expected
+        assert stream.last_update == (59, True)
+
+    @pytest.mark.parametrize("k_period, d_period", [(14, 3), (5, 5), (3, 1), (30, 4)])
+    def test_stochastic_deques_match_batch(self, calc, k_period, d_period):
+        """Happy path: rolling highest high / lowest low reproduce the batch %K and %D."""
+        candles = _candles(150, seed=3)
+        for i in range(20, 60):
+            candles[i]["high"] = candles[i]["low"] = candles[i]["close"] = 100.0  # plateaus and ties
+        key = f"stoch_k_{k_period}_{d_period}"
+        stream = IndicatorStream()
+        for end in range(1, len(candles) + 1):
+            window = candles[:end]
+            expected = calc.calculate_all_indicators(window, {key}, calculate_previous=True)
+            assert stream.calculate(window, {key}, calculate_previous=True) == expected
+
+    def test_flat_prices_match_batch(self, calc):
+        candles = _candles(60, flat=True)
+        stream = IndicatorStream()
+        expected = calc.calculate_all_indicators(candles, ALL_KEYS, calculate_previous=True)
+        assert stream.calculate(candles, ALL_KEYS, calculate_previous=True) == expected
+        assert expected["rsi_14"] == 100.0
+
+    def test_keys_added_midway_are_seeded_from_history(self, calc):
+        candles = _candles(120)
+        stream = IndicatorStream()
+        stream.calculate(candles[:60], {"rsi_14"})
+        for end in (61, 90, 120):
+            expected = calc.calculate_all_indicators(candles[:end], ALL_KEYS, calculate_previous=True)
+            assert stream.calculate(candles[:end], ALL_KEYS, calculate_previous=True) == expected
+
+    def test_key_added_on_a_later_window_agrees_with_older_keys(self, calc):
+        """Edge case: a key first asked for after the history grew replays that whole history."""
+        candles = _candles(150)
+        stream = IndicatorStream()
+        for end in range(40, 120):
+            stream.calculate(candles[:end], {"ema_9"})
+        keys = {"ema_9", "ema_50", "rsi_14", "sma_20"}
+        expected = calc.calculate_all_indicators(candles[:150], keys, calculate_previous=True)
+        assert stream.calculate(candles[:150], keys, calculate_previous=True) == expected
+        assert stream.last_update == (31, False)
+
+    def test_revised_closed_candle_reanchors(self, calc):
+        candles = _candles(60)
+        stream = IndicatorStream()
+        stream.calculate(candles, ALL_KEYS)
+        revised = [dict(c) for c in candles]
+        revised[-2]["close"] *= 1.05
+        expected = calc.calculate_all_indicators(revised, ALL_KEYS, calculate_previous=True)
+        assert stream.calculate(revised, ALL_KEYS, calculate_previous=True) == expected
+        assert stream.last_update == (59, True)
+
+    def test_previous_indicators_cache_used_like_batch(self, calc):
+        candles = _candles(50)
+        cache = {"rsi_14": 42.0, "prev_rsi_14": 41.0}
+        expected = calc.calculate_all_indicators(
+            candles, ALL_KEYS, calculate_previous=True, previous_indicators_cache=cache
+        )
+        result = IndicatorStream().calculate(
+            candles, ALL_KEYS, calculate_previous=True, previous_indicators_cache=cache
+        )
+        assert result == expected
+
+    @pytest.mark.parametrize("n", [0, 1, 2, 3, 4])
+    def test_short_inputs_match_batch(self, calc, n):
+        candles = _candles(n)
+        expected = calc.calculate_all_indicators(candles, ALL_KEYS, calculate_previous=True)
+        assert IndicatorStream().calculate(candles, ALL_KEYS, calculate_previous=True) == expected
+
+
+class TestIndicatorStreamRegistry:
+    """Sharing and bounding of streams."""
+
+    def test_calculator_stream_key_routes_through_shared_state(self, calc):
+        candles = _candles(60)
+        expected = calc.calculate_all_indicators(candles, ALL_KEYS, calculate_previous=True)
+        result = calc.calculate_all_indicators(
+            candles, ALL_KEYS, calculate_previous=True, stream_key=("TEST-USD", "ONE_MINUTE")
+        )
+        assert result == expected
+
+    def test_bots_on_same_series_share_one_stream(self):
+        registry = IndicatorStreamRegistry()
+        candles = _candles(60)
+        registry.calculate(("ETH-USD", "ONE_MINUTE"), candles, {"rsi_14"})
+        registry.calculate(("ETH-USD", "ONE_MINUTE"), candles, {"rsi_14"})
+        registry.calculate(("ETH-USD", "ONE_MINUTE"), candles + _candles(61)[60:], {"rsi_14"})
+        assert len(registry) == 1
+        assert registry.stats() == {"streams": 1, "appended": 1, "replayed": 59}
+
+    def test_lookbacks_get_their_own_window_streams(self, calc):
+        """Happy path: a shallower lookback on the same series neither reuses nor re-anchors the deeper one."""
+        registry = IndicatorStreamRegistry()
+        series = ("ETH-USD", "ONE_MINUTE")
+        candles = _candles(90)
+        keys = {"ema_9", "rsi_14", "macd_3_7_2"}
+        for end in range(60, 91):
+            deep = registry.calculate(series, candles[:end], keys, calculate_previous=True)
+            shallow = registry.calculate(series, candles[end - 30:end], keys, calculate_previous=True)
+            assert deep == calc.calculate_all_indicators(candles[:end], keys, calculate_previous=True)
+            assert shallow == calc.calculate_all_indicators(candles[end - 30:end], keys, calculate_previous=True)
+        # The growing window appended one candle per step; each slide replayed 29
+        assert registry.appended == 30
+        assert registry.replayed == 59 + 31 * 29
+
+    def test_sliding_window_streams_are_bounded_per_series(self):
+        """Edge case: each slide leaves a stale window stream behind; only a few are kept per series."""
+        from app.indicator_stream import _MAX_WINDOWS_PER_SERIES
+
+        registry = IndicatorStreamRegistry()
+        candles = _candles(80)
+        for offset in range(20):
+            registry.calculate(("ETH-USD", "ONE_MINUTE"), candles[offset:offset + 60], {"ema_9"})
+        assert len(registry) == _MAX_WINDOWS_PER_SERIES
+        registry.discard(("ETH-USD", "ONE_MINUTE"))
+        assert len(registry) == 0
+
+    def test_total_streams_are_bounded(self):
+        registry = IndicatorStreamRegistry(max_streams=3)
+        candles = _candles(10)
+        for i in range(5):
+            registry.calculate((f"P{i}-USD", "ONE_MINUTE"), candles, {"ema_9"})
+        assert len(registry) == 3
+
+    def test_discard_drops_series(self):
+        registry = IndicatorStreamRegistry()
+        registry.calculate(("ETH-USD", "ONE_MINUTE"), _candles(10), {"ema_9"})
+        registry.discard(("ETH-USD", "ONE_MINUTE"))
+        assert len(registry) == 0
+
+    def test_calculator_uses_private_registry_when_given(self, calc):
+        """A caller-owned registry (e.g. a backtest run) leaves the shared one untouched."""
+        from app.indicator_stream import indicator_streams
+
+        private = IndicatorStreamRegistry()
+        candles = _candles(40)
+        before = len(indicator_streams)
+        result = calc.calculate_all_indicators(
+            candles, ALL_KEYS, calculate_previous=True, stream_key=(None, "ONE_MINUTE"), streams=private,
+        )
+        assert result == calc.calculate_all_indicators(candles, ALL_KEYS, calculate_previous=True)
+        assert len(private) == 1
+        assert len(indicator_streams) == before
@@ -0,0 +1,100 @@
+"""
+Tests for backend/app/json_response.py
+
+Covers:
+- UTCJSONResponse: naive datetimes rendered with a "Z" suffix by orjson,
+  Decimal / set fallbacks, non-string keys
+- jsonable_encoder path (dict returns): naive datetimes get "Z"
+- UTCDatetime response-model fields: "Z" in JSON mode only; python-mode
+  model_dump() still returns the naive datetime
+- datetime-looking strings that are not datetimes are left alone
+- the app is wired with UTCJSONResponse as its default response class
+"""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import List, Optional
+
+import orjson
+from fastapi import FastAPI
+from fastapi.datastructures import Default
+from pydantic import BaseModel
+from starlette.testclient import TestClient
+
+from app.json_response import UTCDatetime, UTCJSONResponse, utc_isoformat
+
+NAIVE = datetime(2025, 11, 16, 1, 50, 13, 90200)
+
+
+class Item(BaseModel):
+    name: str
+    created_at: UTCDatetime
+    closed_at: Optional[UTCDatetime] = None
+
+
+def _client():
+    app = FastAPI(default_response_class=Default(UTCJSONResponse))
+
+    @app.get("/dict")
+    async def as_dict():
+        return {"at": NAIVE, "note": "2025-11-16T01:50:13", "items": [{"at": NAIVE.replace(microsecond=0)}]}
+
+    @app.get("/model", response_model=List[Item])
+    async def as_model():
+        return [{"name": "a", "created_at": NAIVE}, {"name": "b", "created_at": NAIVE, "closed_at": NAIVE}]
+
+    @app.get("/direct")
+    async def direct():
+        return UTCJSONResponse({"at": NAIVE, "amount": Decimal("1.5"), "ids": {3}, 1: "one"})
+
+    return TestClient(app)
+
+
+# =============================================================================
+# utc_isoformat / UTCJSONResponse
+# =============================================================================
+
+
+def test_utc_isoformat_matches_orjson():
+    aware_utc = NAIVE.replace(tzinfo=timezone.utc)
+    aware_est = NAIVE.replace(tzinfo=timezone(timedelta(hours=-5)))
+    for value in (NAIVE, NAIVE.replace(microsecond=0), aware_utc, aware_est):
+        rendered = UTCJSONResponse(value).body
+        assert rendered == orjson.dumps(utc_isoformat(value))
+    assert utc_isoformat(NAIVE) == "2025-11-16T01:50:13.090200Z"
+    assert utc_isoformat(aware_est) == "2025-11-16T01:50:13.090200-05:00"
+
+
+def test_direct_response_renders_fallback_types():
+    body = _client().get("/direct").json()
+    assert body == {"at": "2025-11-16T01:50:13.090200Z", "amount": 1.5, "ids": [3], "1": "one"}
+
+
+# =============================================================================
+# Endpoint serialization paths
+# =============================================================================
+
+
+def test_dict_return_gets_utc_suffix_and_strings_untouched():
+    resp = _client().get("/dict")
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.json() == {
+        "at": "2025-11-16T01:50:13.090200Z",
+        "note": "2025-11-16T01:50:13",
+        "items": [{"at": "2025-11-16T01:50:13Z"}],
+    }
+
+
+def test_response_model_fields_get_utc_suffix_in_json_only():
+    body = _client().get("/model").json()
+    assert body[0] == {"name": "a", "created_at": "2025-11-16T01:50:13.090200Z", "closed_at": None}
+    assert body[1]["closed_at"] == "2025-11-16T01:50:13.090200Z"
+
+    item = Item(name="a", created_at=NAIVE)
+    assert item.model_dump()["created_at"] == NAIVE
+    assert item.model_dump(mode="json")["created_at"] == "2025-11-16T01:50:13.090200Z"
+
+
+def test_app_uses_utc_response_class():
+    from app.main import app
+    assert app.router.default_response_class.value is UTCJSONResponse
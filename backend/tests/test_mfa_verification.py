@@ -12,9 +12,9 @@ from app.services import user_rate_limit
 
 @pytest.fixture(autouse=True)
 def clear_rate_limit_state():
-    user_rate_limit._buckets.clear()
+    user_rate_limit._limiter.clear()
     yield
-    user_rate_limit._buckets.clear()
+    user_rate_limit._limiter.clear()
 
 
 def _make_totp_user(secret: str, user_id: int = 42):
@@ -47,8 +47,7 @@ class TestTotpMfaLockout:
             await verify_mfa(db, user, code)
 
         # Success should have cleared the failure bucket
-        assert ((user.id, "fail:mfa_verify") not in user_rate_limit._buckets
-                or not user_rate_limit._buckets[(user.id, "fail:mfa_verify")])
+        assert (user.id, "fail:mfa_verify") not in user_rate_limit._limiter
 
     @pytest.mark.asyncio
     async def test_missing_code_raises_403(self):
@@ -70,7 +69,7 @@ class TestTotpMfaLockout:
 
         assert exc.value.status_code == 403
         # A failure should now be recorded
-        assert len(user_rate_limit._buckets[(user.id, "fail:mfa_verify")]) == 1
+        assert user_rate_limit._limiter.peek((user.id, "fail:mfa_verify"), 5, 900).used == 1
 
     @pytest.mark.asyncio
     async def test_fifth_invalid_attempt_returns_429(self):
@@ -107,7 +107,7 @@ class TestMultiBotMonitorInit:
         assert monitor.interval_seconds == 30
         assert monitor.running is False
         assert monitor.task is None
-        assert monitor._candle_cache == {}
+        assert len(monitor._candle_store) == 0
         assert monitor._exchange_cache == {}
 
     def test_init_sets_active_instance(self):
@@ -263,11 +263,26 @@ class TestGetExchangeForBot:
 class TestGetCandlesCached:
     """Tests for MultiBotMonitor.get_candles_cached()."""
 
+    @staticmethod
+    def _seed(monitor, product_id, granularity, candles, fetched_at=None, depth=None):
+        series = monitor._candle_store.series(product_id, granularity)
+        series.merge(candles)
+        series.depth = len(candles) if depth is None else depth
+        series.fetched_at = utcnow().timestamp() if fetched_at is None else fetched_at
+        return series
+
+    @staticmethod
+    def _candles(n, start=1_700_000_100, step=300, close=1.5):
+        return [
+            {"start": start + i * step, "open": 1.0, "high": 2.0, "low": 0.5, "close": close, "volume": 100.0}
+            for i in range(n)
+        ]
+
     @pytest.mark.asyncio
     async def test_cache_miss_fetches_and_caches(self):
         exchange = _make_exchange()
         monitor = MultiBotMonitor(exchange=exchange)
-        candles = [{"open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 100}]
+        candles = self._candles(1)
         exchange.get_candles = AsyncMock(return_value=candles)
 
         with patch("app.multi_bot_monitor.fill_candle_gaps", return_value=candles), \
@@ -275,31 +290,45 @@ class TestGetCandlesCached:
             result = await monitor.get_candles_cached("ETH-BTC", "FIVE_MINUTE", 100)
 
         assert result == candles
-        # Cache key now includes the lookback size so distinct sizes don't collide.
-        assert "ETH-BTC:FIVE_MINUTE:100" in monitor._candle_cache
+        # One shared series per product:granularity, regardless of lookback.
+        assert ("ETH-BTC", "FIVE_MINUTE") in monitor._candle_store
+        assert monitor._candle_store.misses == 1
 
     @pytest.mark.asyncio
     async def test_cache_hit_returns_cached(self):
         exchange = _make_exchange()
         monitor = MultiBotMonitor(exchange=exchange)
-        cached = [{"close": 99}]
-        # Set a fresh timestamp
-        monitor._candle_cache["ETH-BTC:FIVE_MINUTE:100"] = (utcnow().timestamp(), cached)
+        cached = self._candles(100, close=99.0)
+        self._seed(monitor, "ETH-BTC", "FIVE_MINUTE", cached)
 
         result = await monitor.get_candles_cached("ETH-BTC", "FIVE_MINUTE", 100)
-        assert result is cached
+        assert result == cached
+        assert monitor._candle_store.hits == 1
         # Should not have called exchange
         exchange.get_candles.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_smaller_lookback_served_as_slice_of_shared_series(self):
+        """A 100-candle request is served from a series fetched for 200 — no second
+        fetch, and the result is the newest 100 candles."""
+        exchange = _make_exchange()
+        monitor = MultiBotMonitor(exchange=exchange)
+        big = self._candles(200)
+        self._seed(monitor, "ETH-BTC", "FIVE_MINUTE", big)
+
+        result = await monitor.get_candles_cached("ETH-BTC", "FIVE_MINUTE", 100)
+
+        assert result == big[-100:]
+        exchange.get_candles.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_larger_lookback_not_served_from_smaller_cache(self):
-        """A 200-candle request must NOT be served a cached 100-candle entry — distinct
-        lookbacks use distinct cache keys, so the larger request triggers its own fetch."""
+        """A 200-candle request must NOT be served a cached 100-candle series — the
+        series is too shallow, so the larger request triggers a deeper full fetch."""
         exchange = _make_exchange()
         monitor = MultiBotMonitor(exchange=exchange)
-        small = [{"close": 1}] * 100
-        monitor._candle_cache["ETH-BTC:FIVE_MINUTE:100"] = (utcnow().timestamp(), small)
-        big = [{"open": 1, "high": 2, "low": 0.5, "close": 2, "volume": 5}] * 200
+        self._seed(monitor, "ETH-BTC", "FIVE_MINUTE", self._candles(100, start=1_700_030_100))
+        big = self._candles(200)
         exchange.get_candles = AsyncMock(return_value=big)
 
         with patch("app.multi_bot_monitor.fill_candle_gaps", return_value=big), \
@@ -307,25 +336,33 @@ class TestGetCandlesCached:
             result = await monitor.get_candles_cached("ETH-BTC", "FIVE_MINUTE", 200)
 
         assert len(result) == 200            # got the larger set, not the cached 100
-        exchange.get_candles.assert_awaited()  # a real fetch happened for the 200 key
+        exchange.get_candles.assert_awaited()  # a real fetch happened for the deeper window
 
     @pytest.mark.asyncio
-    async def test_cache_expired_fetches_new(self):
+    async def test_cache_expired_fetches_only_new_candles(self):
+        """A stale series is topped up from its newest candle onward, not re-downloaded."""
         exchange = _make_exchange()
         monitor = MultiBotMonitor(exchange=exchange)
-        old_candles = [{"close": 99}]
+        now = int(utcnow().timestamp())
+        first = now - now % 300 - 300 * 99
+        old_candles = self._candles(100, start=first)
         # Set an old timestamp (10 minutes ago)
-        expired_time = utcnow().timestamp() - 600
-        monitor._candle_cache["ETH-BTC:FIVE_MINUTE:100"] = (expired_time, old_candles)
+        self._seed(monitor, "ETH-BTC", "FIVE_MINUTE", old_candles, fetched_at=utcnow().timestamp() - 600)
 
-        new_candles = [{"open": 1, "high": 2, "low": 0.5, "close": 2, "volume": 50}]
+        last_start = old_candles[-1]["start"]
+        new_candles = [
+            {"start": last_start, "open": 1.0, "high": 3.0, "low": 0.5, "close": 2.5, "volume": 150.0},
+            {"start": last_start + 300, "open": 2.5, "high": 2.6, "low": 2.4, "close": 2.5, "volume": 5.0},
+        ]
         exchange.get_candles = AsyncMock(return_value=new_candles)
 
-        with patch("app.multi_bot_monitor.fill_candle_gaps", return_value=new_candles), \
-             patch("app.multi_bot_monitor.timeframe_to_seconds", return_value=300):
-            result = await monitor.get_candles_cached("ETH-BTC", "FIVE_MINUTE", 100)
+        result = await monitor.get_candles_cached("ETH-BTC", "FIVE_MINUTE", 100)
 
-        assert result == new_candles
+        assert exchange.get_candles.await_args.kwargs["start"] == last_start
+        assert result[-2:] == new_candles    # forming candle replaced, closed candle appended
+        assert len(result) == 100
+        assert result[0] == old_candles[1]   # window slid forward by one
+        assert monitor._candle_store.refreshes == 1
 
     @pytest.mark.asyncio
     async def test_synthetic_timeframe_aggregates(self):
@@ -345,6 +382,28 @@ class TestGetCandlesCached:
 
         assert result == aggregated
 
+    @pytest.mark.asyncio
+    async def test_synthetic_aggregate_reused_until_base_series_changes(self):
+        """The aggregated view is memoized on the base series version."""
+        exchange = _make_exchange()
+        monitor = MultiBotMonitor(exchange=exchange)
+        base = self._candles(300, step=60)
+        series = self._seed(monitor, "ETH-BTC", "ONE_MINUTE", base)
+
+        from app.utils.candle_utils import aggregate_candles
+
+        with patch("app.multi_bot_monitor.aggregate_candles", wraps=aggregate_candles) as agg:
+            first = await monitor.get_candles_cached("ETH-BTC", "THREE_MINUTE", 100)
+            second = await monitor.get_candles_cached("ETH-BTC", "THREE_MINUTE", 100)
+            assert agg.call_count == 1
+            series.merge([dict(base[-1], close=9.0)])
+            third = await monitor.get_candles_cached("ETH-BTC", "THREE_MINUTE", 100)
+
+        assert len(first) == 100 and second is first
+        assert agg.call_count == 2
+        assert third[-1]["close"] == 9.0
+        exchange.get_candles.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_returns_empty_on_exchange_error(self):
         exchange = _make_exchange()
@@ -365,7 +424,7 @@ class TestGetCandlesCached:
         API requests."""
         exchange = _make_exchange()
         monitor = MultiBotMonitor(exchange=exchange)
-        candles = [{"open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 100}]
+        candles = [{"start": 1_700_000_100, "open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 100}]
 
         async def slow_fetch(**kwargs):
             await asyncio.sleep(0.02)
@@ -389,7 +448,7 @@ class TestGetCandlesCached:
         parallel rather than serializing behind one global lock."""
         exchange = _make_exchange()
         monitor = MultiBotMonitor(exchange=exchange)
-        candles = [{"open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 100}]
+        candles = [{"start": 1_700_000_100, "open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 100}]
 
         async def slow_fetch(**kwargs):
             await asyncio.sleep(0.02)
@@ -926,13 +985,14 @@ class TestCleanupCaches:
         monitor = MultiBotMonitor()
         now = utcnow().timestamp()
         # Fresh entry: should stay
-        monitor._candle_cache["ETH-BTC:FIVE_MINUTE"] = (now, [{"close": 1}])
-        # Old entry: should evict (TTL is CANDLE_CACHE_DEFAULT_TTL; use huge age)
-        monitor._candle_cache["BTC-USD:ONE_HOUR"] = (now - 10_000_000, [{"close": 2}])
+        monitor._candle_store.series("ETH-BTC", "FIVE_MINUTE").fetched_at = now
+        # Old entry: should evict (use huge age)
+        monitor._candle_store.series("BTC-USD", "ONE_HOUR").fetched_at = now - 10_000_000
 
         result = monitor.cleanup_caches()
         assert result["candles_evicted"] >= 1
-        assert "ETH-BTC:FIVE_MINUTE" in monitor._candle_cache
+        assert ("ETH-BTC", "FIVE_MINUTE") in monitor._candle_store
+        assert ("BTC-USD", "ONE_HOUR") not in monitor._candle_store
 
     def test_cleanup_evicts_stale_indicators(self):
         monitor = MultiBotMonitor()
@@ -1306,7 +1366,7 @@ class TestMonitorLoop:
     async def test_prunes_caches_for_inactive_bots(self, db_session):
         """Cache hygiene: stale entries for bots/pairs no longer active
         are removed from _previous_indicators_cache, _bot_next_check,
-        and _candle_cache each iteration."""
+        and the candle store each iteration."""
         monitor = MultiBotMonitor()
         monitor.running = True
 
@@ -1322,10 +1382,8 @@ class TestMonitorLoop:
             1: current_ts - 10,     # active bot, past due
             77: current_ts + 500,   # deleted bot
         }
-        monitor._candle_cache = {
-            "ETH-BTC:ONE_HOUR": "keep",
-            "DEAD-PAIR:ONE_HOUR": "drop",
-        }
+        monitor._candle_store.series("ETH-BTC", "ONE_HOUR")
+        monitor._candle_store.series("DEAD-PAIR", "ONE_HOUR")
 
         async def _get_bots_then_stop(*_args, **_kwargs):
             monitor.running = False
@@ -1341,10 +1399,10 @@ class TestMonitorLoop:
         # Stale entries dropped
         assert (99, "OLD-PAIR") not in monitor._previous_indicators_cache
         assert 77 not in monitor._bot_next_check
-        assert "DEAD-PAIR:ONE_HOUR" not in monitor._candle_cache
+        assert ("DEAD-PAIR", "ONE_HOUR") not in monitor._candle_store
         # Active entries retained
         assert (1, "ETH-BTC") in monitor._previous_indicators_cache
-        assert "ETH-BTC:ONE_HOUR" in monitor._candle_cache
+        assert ("ETH-BTC", "ONE_HOUR") in monitor._candle_store
 
     @pytest.mark.asyncio
     async def test_outer_exception_logged_and_loop_continues(self, db_session):
@@ -6,15 +6,22 @@ Covers:
 - Fitness scoring with different metrics
 - run_optimization: full sweep, ranking, error handling
 - OptimizationReport serialization
+- Process-pool sweep: worker sizing, shared candles, progress, cancellation
+- Adaptive searches: random, successive halving, Bayesian
 """
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import pytest
+
+from app.backtesting import optimizer
 from app.backtesting.optimizer import (
     run_optimization, _generate_permutations, _compute_score,
     OptimizationResult, OptimizationReport, FITNESS_METRICS,
 )
 from app.backtesting import BacktestResult
+from app.backtesting.search import SearchSpace, planned_backtests
 
 
 # =============================================================================
@@ -207,6 +214,262 @@ async def test_run_optimization_params_in_results():
         assert "fixed_param" not in result.params
 
 
+# =============================================================================
+# Process-pool sweep tests
+# =============================================================================
+
+
+def test_resolve_workers_small_sweep_runs_in_process():
+    """Sweeps too small to amortize a pool stay in-process."""
+    assert optimizer._resolve_workers(None, total=9, n_candles=30) == 0
+
+
+def test_resolve_workers_capped_by_resource_plan():
+    """Large sweeps use ResourcePlan.optimizer_workers_max, never more than the combos."""
+    plan = MagicMock(optimizer_workers_max=3)
+    with patch("app.server_resources.get_resource_plan", return_value=plan):
+        assert optimizer._resolve_workers(None, total=50, n_candles=5000) == 3
+        assert optimizer._resolve_workers(None, total=2, n_candles=50000) == 2
+    plan.optimizer_workers_max = 0  # trader role
+    with patch("app.server_resources.get_resource_plan", return_value=plan):
+        assert optimizer._resolve_workers(None, total=50, n_candles=5000) == 0
+
+
+def test_resolve_workers_explicit_override():
+    assert optimizer._resolve_workers(4, total=10, n_candles=10) == 4
+    assert optimizer._resolve_workers(1, total=10, n_candles=10**6) == 0
+
+
+def test_shared_candles_round_trip_to_worker_state():
+    """Workers rebuild numeric candle dicts from the shared block."""
+    candles = _make_candles(5)
+    shm = optimizer._share_candles(candles)
+    try:
+        with patch.object(optimizer, "WORKER_NICE", 0):
+            optimizer._init_worker(shm.name, len(candles), {"product_id": "BTC-USD"})
+    finally:
+        shm.close()
+        shm.unlink()
+    assert optimizer._worker_candles[2] == {
+        "start": 600, "open": 50200.0, "high": 50250.0, "low": 50150.0, "close": 50230.0, "volume": 1000.0,
+    }
+    assert optimizer._worker_run_kwargs == {"product_id": "BTC-USD"}
+
+
+def test_shared_candles_keep_synthetic_flags():
+    """Gap-filled and aggregated candles keep their synthetic markers in the workers."""
+    candles = _make_candles(3)
+    candles[0]["_synthetic"] = True
+    candles[1]["_synthetic_count"] = 2
+    candles[1]["_synthetic_total"] = 5
+    shm = optimizer._share_candles(candles)
+    try:
+        with patch.object(optimizer, "WORKER_NICE", 0):
+            optimizer._init_worker(shm.name, len(candles), {})
+    finally:
+        shm.close()
+        shm.unlink()
+    assert optimizer._worker_candles[0]["_synthetic"] is True
+    aggregated = optimizer._worker_candles[1]
+    assert (aggregated["_synthetic_count"], aggregated["_synthetic_total"]) == (2, 5)
+    assert "_synthetic" not in optimizer._worker_candles[2]
+    assert "_synthetic_count" not in optimizer._worker_candles[2]
+
+
+async def test_run_optimization_reports_progress():
+    """progress_callback fires once per combination with the running count."""
+    mock_strategy = MagicMock()
+    mock_strategy.analyze_signal = AsyncMock(return_value=None)
+    progress = []
+
+    with patch("app.strategies.StrategyRegistry.get_strategy", return_value=mock_strategy):
+        report = await run_optimization(
+            strategy_type="indicator_based", strategy_config={}, parameter_ranges={"x": [1, 2, 3]},
+            candles=_make_candles(30), product_id="BTC-USD",
+            progress_callback=lambda done, total, result: progress.append((done, total, result.params)),
+        )
+
+    assert progress == [(1, 3, {"x": 1}), (2, 3, {"x": 2}), (3, 3, {"x": 3})]
+    assert report.completed == 3 and report.cancelled is False
+
+
+async def test_run_optimization_cancel_event_returns_partial_results():
+    mock_strategy = MagicMock()
+    mock_strategy.analyze_signal = AsyncMock(return_value=None)
+    cancel = asyncio.Event()
+
+    def on_progress(done, total, result):
+        if done == 2:
+            cancel.set()
+
+    with patch("app.strategies.StrategyRegistry.get_strategy", return_value=mock_strategy):
+        report = await run_optimization(
+            strategy_type="indicator_based", strategy_config={}, parameter_ranges={"x": [1, 2, 3, 4, 5]},
+            candles=_make_candles(30), product_id="BTC-USD",
+            progress_callback=on_progress, cancel_event=cancel,
+        )
+
+    assert report.cancelled is True
+    assert report.completed == 2
+    assert len(report.results) == 2
+    assert report.to_dict()["cancelled"] is True
+
+
+async def test_run_optimization_task_cancel_propagates():
+    """Cancelling the sweep task stops it and re-raises CancelledError."""
+    mock_strategy = MagicMock()
+    mock_strategy.analyze_signal = AsyncMock(return_value=None)
+    task = None
+
+    def on_progress(done, total, result):
+        if done == 1:
+            task.cancel()
+
+    with patch("app.strategies.StrategyRegistry.get_strategy", return_value=mock_strategy):
+        task = asyncio.ensure_future(run_optimization(
+            strategy_type="indicator_based", strategy_config={}, parameter_ranges={"x": [1, 2, 3]},
+            candles=_make_candles(30), product_id="BTC-USD", progress_callback=on_progress,
+        ))
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert task.cancelled()
+
+
+async def test_run_optimization_process_pool_matches_in_process():
+    """The worker-pool sweep ranks the same results as the in-process sweep."""
+    candles = _make_candles(60)
+    kwargs = dict(
+        strategy_type="indicator_based", strategy_config={}, parameter_ranges={"x": [1, 2, 3]},
+        candles=candles, product_id="BTC-USD",
+    )
+    progress = []
+    pooled = await run_optimization(**kwargs, max_workers=2, progress_callback=lambda *a: progress.append(a[0]))
+    inline = await run_optimization(**kwargs, max_workers=0)
+
+    assert sorted(progress) == [1, 2, 3]
+    assert [(r.params, r.metrics.to_dict()) for r in pooled.results] == [
+        (r.params, r.metrics.to_dict()) for r in inline.results
+    ]
+
+
+# =============================================================================
+# Adaptive search tests
+# =============================================================================
+
+
+def _fake_backtest(windows=None):
+    """run_backtest stand-in: return peaks at a=7, b=3; records candle windows."""
+    async def fake(strategy_config, candles, **kwargs):
+        if windows is not None:
+            windows.append(len(candles))
+        a, b = strategy_config["a"], strategy_config["b"]
+        return BacktestResult(total_return_pct=100.0 - (a - 7) ** 2 - (b - 3) ** 2)
+    return fake
+
+
+_AB_RANGES = {"a": list(range(20)), "b": list(range(20))}  # 400 combinations
+
+
+def test_search_space_index_order_matches_grid():
+    space = SearchSpace({"a": [1, 2], "b": ["x", "y", "z"]})
+    assert space.size == 6
+    assert [space.params(i) for i in range(space.size)] == space.grid()
+    assert space.coordinates([0, 5]).tolist() == [[0.0, 0.0], [1.0, 1.0]]
+
+
+def test_planned_backtests_per_search():
+    assert planned_backtests("grid", 400, 40) == 400
+    assert planned_backtests("random", 400, 40) == 40
+    assert planned_backtests("bayesian", 20, 40) == 20
+    assert planned_backtests("halving", 400, 27) == 27 + 9 + 3
+
+
+async def test_run_optimization_unknown_search_raises():
+    with pytest.raises(ValueError, match="Unknown search strategy"):
+        await run_optimization(
+            strategy_type="indicator_based", strategy_config={}, parameter_ranges={"x": [1]},
+            candles=_make_candles(30), product_id="BTC-USD", search="annealing",
+        )
+
+
+async def test_random_search_spends_budget_and_is_seeded():
+    kwargs = dict(
+        strategy_type="indicator_based", strategy_config={}, parameter_ranges=_AB_RANGES,
+        candles=_make_candles(30), product_id="BTC-USD", search="random", max_evaluations=25, seed=7,
+    )
+    with patch.object(optimizer, "run_backtest", _fake_backtest()):
+        first = await run_optimization(**kwargs)
+        second = await run_optimization(**kwargs)
+
+    assert first.completed == 25 and len(first.results) == 25
+    assert first.bars_evaluated == 25 * 30
+    assert [r.params for r in first.results] == [r.params for r in second.results]
+    assert first.to_dict()["search"] == "random"
+
+
+async def test_successive_halving_promotes_on_growing_windows():
+    """Halving races 27 candidates on short windows and backtests 3 on the full history."""
+    windows = []
+    with patch.object(optimizer, "run_backtest", _fake_backtest(windows)):
+        report = await run_optimization(
+            strategy_type="indicator_based", strategy_config={}, parameter_ranges=_AB_RANGES,
+            candles=_make_candles(2700), product_id="BTC-USD", search="halving", max_evaluations=27, seed=1,
+        )
+
+    assert windows == [300] * 27 + [900] * 9 + [2700] * 3
+    assert report.completed == 39
+    assert report.bars_evaluated == sum(windows)
+    # Only full-history runs are ranked, and they are the best of the first rung.
+    assert len(report.results) == 3
+    assert report.results[0].score == max(r.score for r in report.results)
+
+
+async def test_halving_window_never_below_minimum():
+    windows = []
+    with patch.object(optimizer, "run_backtest", _fake_backtest(windows)):
+        await run_optimization(
+            strategy_type="indicator_based", strategy_config={}, parameter_ranges=_AB_RANGES,
+            candles=_make_candles(500), product_id="BTC-USD", search="halving", max_evaluations=9, seed=1,
+        )
+
+    assert min(windows) == optimizer.MIN_WINDOW_CANDLES
+    assert windows[-1] == 500
+
+
+async def test_bayesian_search_beats_random_with_same_budget():
+    """The surrogate homes in on the optimum that a same-size random sample misses."""
+    kwargs = dict(
+        strategy_type="indicator_based", strategy_config={}, parameter_ranges=_AB_RANGES,
+        candles=_make_candles(30), product_id="BTC-USD", max_evaluations=30, seed=3,
+    )
+    with patch.object(optimizer, "run_backtest", _fake_backtest()):
+        bayes = await run_optimization(**kwargs, search="bayesian")
+        rand = await run_optimization(**kwargs, search="random")
+
+    assert bayes.completed == 30
+    assert bayes.results[0].score >= 98.0
+    assert bayes.results[0].score >= rand.results[0].score
+
+
+async def test_adaptive_search_cancel_event_stops_between_batches():
+    cancel = asyncio.Event()
+
+    def on_progress(done, total, result):
+        if done == 5:
+            cancel.set()
+
+    with patch.object(optimizer, "run_backtest", _fake_backtest()):
+        report = await run_optimization(
+            strategy_type="indicator_based", strategy_config={}, parameter_ranges=_AB_RANGES,
+            candles=_make_candles(30), product_id="BTC-USD", search="bayesian", max_evaluations=30,
+            seed=3, progress_callback=on_progress, cancel_event=cancel,
+        )
+
+    assert report.cancelled is True
+    assert report.completed == 5
+
+
 # =============================================================================
 # OptimizationReport serialization tests
 # =============================================================================
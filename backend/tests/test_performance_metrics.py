@@ -2,6 +2,7 @@ from app.performance_metrics import (
     clear_performance_samples,
     get_performance_snapshot,
     record_client_timings,
+    record_server_queries,
     record_server_timing,
 )
 
@@ -36,3 +37,15 @@ def test_client_snapshot_accepts_only_bounded_startup_measures():
     client = get_performance_snapshot()["client"]
     assert list(client) == ["/positions zenith:bootstrap-to-positions-data-ready"]
     assert client[next(iter(client))]["p50_ms"] == 123.4
+
+
+def test_db_query_counts_summarized_per_route():
+    for count in (0, 0, 0, 4):
+        record_server_queries("GET", "/api/bots/", count)
+
+    assert get_performance_snapshot()["db_queries"]["GET /api/bots/"] == {
+        "count": 4,
+        "mean": 1.0,
+        "p95": 4.0,
+        "max": 4,
+    }
@@ -0,0 +1,213 @@
+"""
+Tests for backend/app/phase_condition_plan.py
+
+Covers:
+- Plans agree with PhaseConditionEvaluator's interpreted path on randomized
+  grouped and legacy expressions (all types, operators, negate, direction)
+- Flat slot table: each indicator key resolved once, bind/run on value lists
+- Short-circuiting AND/OR groups
+- Previous-cycle values only gathered when the plan has crossing/direction ops
+- Plan cache keyed by expression hash, legacy logic and position direction
+"""
+
+import random
+
+import pytest
+
+from app.indicator_calculator import IndicatorCalculator
+from app.phase_condition_plan import (
+    PLAN_CACHE_SIZE,
+    _plan_cache,
+    clear_plan_cache,
+    compile_condition_plan,
+    expression_digest,
+)
+from app.phase_conditions import PhaseConditionEvaluator
+
+_TYPES = [
+    "rsi", "macd", "bb_percent", "ema_cross", "sma_cross", "stochastic", "price_change", "volume",
+    "volume_rsi", "gap_fill_pct", "vwap", "ai_buy", "bull_flag", "qfl_crack", "unknown_type",
+]
+_OPERATORS = [
+    "greater_than", "less_than", "greater_equal", "less_equal", "equal", "not_equal",
+    "crossing_above", "crossing_below", "increasing", "decreasing", "bogus",
+]
+_TIMEFRAMES = ["FIVE_MINUTE", "ONE_HOUR"]
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    clear_plan_cache()
+    yield
+    clear_plan_cache()
+
+
+def _random_condition(rng):
+    condition = {
+        "type": rng.choice(_TYPES),
+        "operator": rng.choice(_OPERATORS),
+        "value": rng.choice([0, 0, 1, 30, 50, -0.5, 2.5]),
+        "timeframe": rng.choice(_TIMEFRAMES),
+        "period": rng.choice([14, 20]),
+    }
+    if rng.random() < 0.25:
+        condition["negate"] = True
+    if rng.random() < 0.25:
+        condition["direction"] = rng.choice(["long", "short"])
+    return condition
+
+
+def _random_indicators(rng, keys):
+    """Values for a random subset of the keys, clustered around the thresholds."""
+    indicators = {}
+    for key in keys:
+        roll = rng.random()
+        if roll < 0.15:
+            continue
+        if roll < 0.25:
+            indicators[key] = 0
+        elif roll < 0.35:
+            indicators[key] = 30
+        else:
+            indicators[key] = rng.choice([rng.uniform(-5, 80), rng.uniform(25, 35), rng.uniform(-1, 1)])
+    return indicators
+
+
+class TestMatchesInterpretedPath:
+    """Differential tests against the detail-capturing evaluator"""
+
+    @pytest.mark.parametrize("direction", [None, "long", "short"])
+    def test_random_expressions_agree(self, direction):
+        """Happy path: compiled and interpreted evaluation give the same signal."""
+        rng = random.Random(7)
+        evaluator = PhaseConditionEvaluator(IndicatorCalculator(), position_direction=direction)
+
+        for _ in range(400):
+            if rng.random() < 0.5:
+                expression = {
+                    "groups": [
+                        {"conditions": [_random_condition(rng) for _ in range(rng.randint(0, 3))],
+                         "logic": rng.choice(["and", "or"])}
+                        for _ in range(rng.randint(0, 3))
+                    ],
+                    "groupLogic": rng.choice(["and", "or"]),
+                }
+            else:
+                expression = [_random_condition(rng) for _ in range(rng.randint(0, 4))]
+            logic = rng.choice(["and", "or"])
+            plan = evaluator.compile(expression, logic)
+            keys = list(plan.keys) + ["ai_buy", "prev_ai_buy"]
+
+            for _ in range(5):
+                current = _random_indicators(rng, keys)
+                previous = _random_indicators(rng, keys) if rng.random() < 0.7 else None
+                expected, _ = evaluator.evaluate_expression(
+                    expression, current, previous, logic, capture_details=True,
+                )
+                assert plan.evaluate(current, previous) == expected, (expression, current, previous)
+
+    def test_evaluate_expression_without_details_uses_the_plan(self):
+        """Happy path: the signal-only path goes through the cached plan."""
+        evaluator = PhaseConditionEvaluator(IndicatorCalculator())
+        conditions = [{"type": "rsi", "operator": "less_than", "value": 30}]
+
+        assert evaluator.evaluate_expression(conditions, {"FIVE_MINUTE_rsi_14": 25.0}) is True
+        assert len(_plan_cache) == 1
+
+
+class TestSlots:
+    """Tests for the flat indicator slot table"""
+
+    def test_keys_resolved_once(self):
+        """Happy path: a key shared by several conditions gets one slot."""
+        plan = compile_condition_plan([
+            {"type": "bb_percent", "operator": "less_than", "value": 20},
+            {"type": "ema_cross", "operator": "crossing_above", "value": 0, "period": 50},
+        ])
+        assert plan.keys.count("FIVE_MINUTE_price") == 1
+        assert "prev_FIVE_MINUTE_price" in plan.keys
+        assert "FIVE_MINUTE_ema_50" in plan.keys
+
+    def test_bind_and_run_on_value_lists(self):
+        """Happy path: evaluation runs against a flat list in slot order."""
+        plan = compile_condition_plan([
+            {"type": "rsi", "operator": "less_than", "value": 30},
+            {"type": "volume", "operator": "greater_than", "value": 100},
+        ])
+        values = plan.bind({"FIVE_MINUTE_rsi_14": 25.0, "FIVE_MINUTE_volume": 500.0, "other": 1})
+        assert values == [25.0, 500.0]
+        assert plan.run(values) is True
+        assert plan.run([25.0, 50.0]) is False
+
+    def test_previous_cycle_only_bound_when_needed(self):
+        """Edge case: comparison-only plans never read previous_indicators."""
+        comparisons = compile_condition_plan([{"type": "rsi", "operator": "less_than", "value": 30}])
+        crossing = compile_condition_plan([{"type": "rsi", "operator": "crossing_above", "value": 30}])
+
+        assert comparisons.needs_previous is False
+        assert crossing.needs_previous is True
+        assert crossing.evaluate({"FIVE_MINUTE_rsi_14": 35.0}, {"FIVE_MINUTE_rsi_14": 25.0}) is True
+
+    def test_unknown_format_is_false(self):
+        """Failure: non-dict, non-list expressions compile to a constant False."""
+        plan = compile_condition_plan("invalid")
+        assert plan.keys == ()
+        assert plan.evaluate({}) is False
+
+
+class TestShortCircuit:
+    """Tests for short-circuiting group logic"""
+
+    def test_and_stops_at_first_false(self):
+        """Happy path: later conditions aren't evaluated once an AND group has failed."""
+        plan = compile_condition_plan([
+            {"type": "rsi", "operator": "less_than", "value": 30},
+            {"type": "volume", "operator": "greater_than", "value": 100},
+        ])
+        # A non-comparable volume would raise if it were evaluated
+        assert plan.run([50.0, object()]) is False
+
+    def test_or_stops_at_first_true(self):
+        plan = compile_condition_plan(
+            [{"type": "rsi", "operator": "less_than", "value": 30},
+             {"type": "volume", "operator": "greater_than", "value": 100}],
+            legacy_logic="or",
+        )
+        assert plan.run([25.0, object()]) is True
+
+
+class TestPlanCache:
+    """Tests for the config-hash plan cache"""
+
+    def test_same_config_reuses_plan(self):
+        """Happy path: equal configs (even different dict objects) share one plan."""
+        first = compile_condition_plan([{"type": "rsi", "operator": "less_than", "value": 30}])
+        second = compile_condition_plan([{"value": 30, "operator": "less_than", "type": "rsi"}])
+        assert first is second
+
+    def test_config_change_compiles_new_plan(self):
+        """Happy path: editing a threshold is a new config version."""
+        first = compile_condition_plan([{"type": "rsi", "operator": "less_than", "value": 30}])
+        second = compile_condition_plan([{"type": "rsi", "operator": "less_than", "value": 35}])
+        assert first is not second
+        assert second.evaluate({"FIVE_MINUTE_rsi_14": 32.0}) is True
+
+    def test_logic_and_direction_are_part_of_the_key(self):
+        """Edge case: the same conditions under OR logic or a short position compile separately."""
+        conditions = [{"type": "rsi", "operator": "less_than", "value": 30, "direction": "long"}]
+        plans = {
+            id(compile_condition_plan(conditions, "and", None)),
+            id(compile_condition_plan(conditions, "or", None)),
+            id(compile_condition_plan(conditions, "and", "short")),
+        }
+        assert len(plans) == 3
+        assert compile_condition_plan(conditions, "and", "short").evaluate({"FIVE_MINUTE_rsi_14": 10.0}) is False
+
+    def test_cache_is_bounded(self):
+        """Edge case: the least recently used plan is evicted past PLAN_CACHE_SIZE."""
+        for threshold in range(PLAN_CACHE_SIZE + 5):
+            compile_condition_plan([{"type": "rsi", "operator": "less_than", "value": threshold}])
+        assert len(_plan_cache) == PLAN_CACHE_SIZE
+
+    def test_digest_ignores_key_order(self):
+        assert expression_digest({"a": 1, "b": [1, 2]}) == expression_digest({"b": [1, 2], "a": 1})
@@ -0,0 +1,211 @@
+"""
+Tests for backend/app/auth/principal_cache.py
+
+Covers:
+- get_current_user: second request for the same (jti, sid) issues no queries
+  and returns a session-attached user whose changes still commit
+- invalidation on commit: logout (revoked jti), password change, role change
+  (core DML on user_groups), session end
+- generation guard: a resolution racing an invalidation is not cached
+- cross-process fan-out: publish to Redis, apply received messages
+"""
+
+import json
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.auth.dependencies import decode_token, get_current_user
+from app.auth.principal_cache import INVALIDATION_CHANNEL, PrincipalCache, principal_cache
+from app.auth_routers.helpers import create_access_token
+from app.models import ActiveSession, Group, Permission, RevokedToken, Role, User
+from app.models.auth import user_groups
+from app.performance_metrics import start_db_query_count, track_db_queries
+from app.utils.timeutil import utcnow
+
+
+@pytest.fixture
+def session_maker(async_engine):
+    track_db_queries(async_engine.sync_engine)
+    return async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest.fixture
+async def principal(session_maker):
+    """A user in one group/role with one permission, plus an active session."""
+    async with session_maker() as db:
+        role = Role(name="trader", permissions=[Permission(name="bots:read")])
+        group = Group(name="Traders", roles=[role])
+        user = User(email="p@example.com", hashed_password="x", is_active=True, groups=[group])
+        db.add(user)
+        await db.flush()
+        db.add(ActiveSession(
+            user_id=user.id, session_id="sess-1", is_active=True,
+            expires_at=utcnow() + timedelta(hours=1),
+        ))
+        await db.commit()
+        return user.id
+
+
+def _creds(user_id, sid="sess-1"):
+    creds = MagicMock()
+    creds.credentials = create_access_token(user_id, "p@example.com", session_id=sid)
+    return creds
+
+
+async def _resolve(session_maker, creds):
+    """Run get_current_user in its own session; returns (user, queries issued)."""
+    counter = start_db_query_count()
+    async with session_maker() as db:
+        user = await get_current_user(credentials=creds, db=db)
+        return user, counter[0]
+
+
+# =============================================================================
+# Cache hits
+# =============================================================================
+
+
+async def test_second_request_resolves_without_queries(session_maker, principal):
+    creds = _creds(principal)
+
+    first, first_queries = await _resolve(session_maker, creds)
+    second, second_queries = await _resolve(session_maker, creds)
+
+    assert first_queries >= 3  # revocation, user (+ RBAC selectin loads), session
+    assert second_queries == 0
+    assert second.id == principal
+    assert [r.name for g in second.groups for r in g.roles] == ["trader"]
+    assert principal_cache.stats()["hits"] == 1
+
+
+async def test_cached_user_is_attached_and_changes_commit(session_maker, principal):
+    creds = _creds(principal)
+    await _resolve(session_maker, creds)
+
+    async with session_maker() as db:
+        user = await get_current_user(credentials=creds, db=db)
+        assert user in db
+        user.display_name = "Renamed"
+        await db.commit()
+
+    async with session_maker() as db:
+        assert (await db.get(User, principal)).display_name == "Renamed"
+    # The commit touched the user, so the next request re-resolves
+    _, queries = await _resolve(session_maker, creds)
+    assert queries > 0
+
+
+# =============================================================================
+# Invalidation
+# =============================================================================
+
+
+async def test_logout_revocation_invalidates(session_maker, principal):
+    creds = _creds(principal)
+    await _resolve(session_maker, creds)
+    jti = decode_token(creds.credentials)["jti"]
+
+    async with session_maker() as db:
+        db.add(RevokedToken(jti=jti, user_id=principal, expires_at=utcnow() + timedelta(hours=1)))
+        await db.commit()
+
+    with pytest.raises(HTTPException, match="revoked"):
+        await _resolve(session_maker, creds)
+
+
+async def test_password_change_invalidates(session_maker, principal):
+    creds = _creds(principal)
+    await _resolve(session_maker, creds)
+
+    async with session_maker() as db:
+        user = await db.get(User, principal)
+        user.tokens_valid_after = utcnow() + timedelta(seconds=5)
+        await db.commit()
+
+    with pytest.raises(HTTPException, match="Session expired"):
+        await _resolve(session_maker, creds)
+
+
+async def test_role_change_via_core_dml_invalidates(session_maker, principal):
+    creds = _creds(principal)
+    await _resolve(session_maker, creds)
+
+    async with session_maker() as db:
+        await db.execute(user_groups.delete().where(user_groups.c.user_id == principal))
+        await db.commit()
+
+    user, queries = await _resolve(session_maker, creds)
+    assert queries > 0
+    assert user.groups == []
+
+
+async def test_session_end_invalidates(session_maker, principal):
+    creds = _creds(principal)
+    await _resolve(session_maker, creds)
+
+    async with session_maker() as db:
+        session = (await db.execute(
+            select(ActiveSession).where(ActiveSession.session_id == "sess-1")
+        )).scalar_one()
+        session.is_active = False
+        await db.commit()
+
+    with pytest.raises(HTTPException, match="Session expired"):
+        await _resolve(session_maker, creds)
+
+
+async def test_rolled_back_changes_do_not_invalidate(session_maker, principal):
+    creds = _creds(principal)
+    await _resolve(session_maker, creds)
+
+    async with session_maker() as db:
+        user = await db.get(User, principal)
+        user.is_active = False
+        await db.flush()
+        await db.rollback()
+
+    _, queries = await _resolve(session_maker, creds)
+    assert queries == 0
+
+
+async def test_resolution_racing_invalidation_is_not_cached(session_maker, principal):
+    cache = PrincipalCache()
+    async with session_maker() as db:
+        user = await db.get(User, principal)
+        generation = cache.generation
+        cache.invalidate([("user", principal)])
+
+        assert cache.put("jti-1", None, user, generation) is False
+        assert cache.put("jti-1", None, user, cache.generation) is True
+    assert cache.get("jti-1", None) is not None
+
+
+# =============================================================================
+# Cross-process fan-out
+# =============================================================================
+
+
+async def test_publish_and_receive_invalidation():
+    cache = PrincipalCache()
+    redis = MagicMock()
+    redis.publish = AsyncMock()
+
+    await cache.publish([("user", 7)])  # fan-out off: nothing sent
+    redis.publish.assert_not_awaited()
+
+    cache.redis_fanout = True
+    with patch("app.redis_client.get_redis", AsyncMock(return_value=redis)):
+        await cache.publish([("user", 7), ("sid", "s-1")])
+    channel, raw = redis.publish.await_args.args
+    assert channel == INVALIDATION_CHANNEL
+    assert json.loads(raw) == [["user", 7], ["sid", "s-1"]]
+
+    before = cache.generation
+    cache.handle_message(raw)
+    assert cache.generation == before + 1
+    assert cache.stats()["remote_invalidations"] == 1
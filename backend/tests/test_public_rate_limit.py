@@ -10,7 +10,7 @@ Covers:
   - Falls back to scope["client"] IP
   - Falls back to "unknown" when no client info
   - Returns 429 with Retry-After header when limited
-  - prune_stale() class method removes old entries
+  - prune_stale() class method removes IPs whose budget has refilled
 """
 
 import time
@@ -23,7 +23,6 @@ from app.middleware.public_rate_limit import (
     _COIN_ICON_PREFIX,
     _MAX_REQUESTS,
     _WINDOW,
-    _STALE_SECONDS,
 )
 
 
@@ -70,9 +69,23 @@ async def _collect_response(app_or_response, scope, receive, send):
 @pytest.fixture(autouse=True)
 def clear_rate_limit_state():
     """Reset shared class state before each test."""
-    PublicEndpointRateLimiter._ip_timestamps.clear()
+    PublicEndpointRateLimiter._limiter.clear()
     yield
-    PublicEndpointRateLimiter._ip_timestamps.clear()
+    PublicEndpointRateLimiter._limiter.clear()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable clock for the limiter's in-process state."""
+    state = {"now": time.monotonic()}
+    monkeypatch.setattr(PublicEndpointRateLimiter._limiter.local, "clock", lambda: state["now"])
+    return state
+
+
+def _spend(ip, n=1):
+    """Count n requests for ip directly on the limiter."""
+    for _ in range(n):
+        PublicEndpointRateLimiter._limiter.hit(ip, _MAX_REQUESTS, _WINDOW)
 
 
 @pytest.fixture
@@ -116,7 +129,7 @@ class TestCoinIconsExemption:
 
         # Inner app reached (200), no timestamp recorded
         assert send.called
-        assert "10.1.1.1" not in PublicEndpointRateLimiter._ip_timestamps
+        assert "10.1.1.1" not in PublicEndpointRateLimiter._limiter
 
     @pytest.mark.asyncio
     async def test_coin_icon_never_returns_429_even_after_many_requests(self, middleware):
@@ -209,8 +222,8 @@ class TestPublicPathMatching:
 
         # Should pass on first request
         assert send.called
-        # But should have recorded the timestamp
-        assert len(PublicEndpointRateLimiter._ip_timestamps) > 0
+        # But should have counted the request
+        assert len(PublicEndpointRateLimiter._limiter) > 0
 
     @pytest.mark.asyncio
     async def test_version_path_is_rate_limited(self, middleware):
@@ -221,7 +234,7 @@ class TestPublicPathMatching:
 
         await middleware(scope, receive, send)
 
-        assert len(PublicEndpointRateLimiter._ip_timestamps) > 0
+        assert len(PublicEndpointRateLimiter._limiter) > 0
 
     @pytest.mark.asyncio
     async def test_brand_path_is_rate_limited(self, middleware):
@@ -232,7 +245,7 @@ class TestPublicPathMatching:
 
         await middleware(scope, receive, send)
 
-        assert len(PublicEndpointRateLimiter._ip_timestamps) > 0
+        assert len(PublicEndpointRateLimiter._limiter) > 0
 
     def test_public_prefixes_are_all_api_paths(self):
         """Sanity: all public prefixes should start with /api/."""
@@ -260,7 +273,7 @@ class TestIPExtraction:
 
         await middleware(scope, receive, send)
 
-        assert "10.0.0.1" in PublicEndpointRateLimiter._ip_timestamps
+        assert "10.0.0.1" in PublicEndpointRateLimiter._limiter
 
     @pytest.mark.asyncio
     async def test_ip_from_x_forwarded_for_multiple_ips(self, middleware):
@@ -272,7 +285,7 @@ class TestIPExtraction:
 
         await middleware(scope, receive, send)
 
-        assert "1.2.3.4" in PublicEndpointRateLimiter._ip_timestamps
+        assert "1.2.3.4" in PublicEndpointRateLimiter._limiter
 
     @pytest.mark.asyncio
     async def test_ip_from_scope_client_fallback(self, middleware):
@@ -283,7 +296,7 @@ class TestIPExtraction:
 
         await middleware(scope, receive, send)
 
-        assert "172.16.0.1" in PublicEndpointRateLimiter._ip_timestamps
+        assert "172.16.0.1" in PublicEndpointRateLimiter._limiter
 
     @pytest.mark.asyncio
     async def test_ip_unknown_when_no_client(self, middleware):
@@ -295,7 +308,7 @@ class TestIPExtraction:
 
         await middleware(scope, receive, send)
 
-        assert "unknown" in PublicEndpointRateLimiter._ip_timestamps
+        assert "unknown" in PublicEndpointRateLimiter._limiter
 
 
 # ---------------------------------------------------------------------------
@@ -381,16 +394,13 @@ class TestRateLimiting:
         assert calls[0][0][0]["status"] == 200
 
     @pytest.mark.asyncio
-    async def test_old_timestamps_are_pruned_within_window(self, middleware):
-        """Edge case: timestamps outside the window should be discarded."""
+    async def test_budget_refills_after_window(self, middleware, clock):
+        """Edge case: requests older than the window no longer count."""
         ip = "10.0.0.4"
-        now = time.time()
-        # Pre-fill with old timestamps (outside window)
-        PublicEndpointRateLimiter._ip_timestamps[ip] = [
-            now - _WINDOW - 10 for _ in range(_MAX_REQUESTS)
-        ]
+        _spend(ip, _MAX_REQUESTS)
+        clock["now"] += _WINDOW + 10
 
-        # New request should succeed because old ones are outside window
+        # New request should succeed because the budget has refilled
         scope = _make_scope(path="/api/ticker/X", client_ip=ip)
         receive = AsyncMock()
         send = AsyncMock()
@@ -409,66 +419,52 @@ class TestRateLimiting:
 class TestPruneStale:
     """Tests for the prune_stale() class method."""
 
-    def test_prune_stale_removes_old_entries(self):
-        """Happy path: entries older than _STALE_SECONDS should be removed."""
-        old_time = time.time() - _STALE_SECONDS - 10
-        PublicEndpointRateLimiter._ip_timestamps["old-ip"] = [old_time]
+    def test_prune_stale_removes_old_entries(self, clock):
+        """Happy path: IPs whose budget has fully refilled should be removed."""
+        _spend("old-ip")
+        clock["now"] += _WINDOW
 
         removed = PublicEndpointRateLimiter.prune_stale()
 
         assert removed == 1
-        assert "old-ip" not in PublicEndpointRateLimiter._ip_timestamps
+        assert "old-ip" not in PublicEndpointRateLimiter._limiter
 
-    def test_prune_stale_keeps_recent_entries(self):
-        """Happy path: recent entries should not be pruned."""
-        recent_time = time.time() - 5
-        PublicEndpointRateLimiter._ip_timestamps["recent-ip"] = [recent_time]
+    def test_prune_stale_keeps_recent_entries(self, clock):
+        """Happy path: IPs still inside their window should not be pruned."""
+        _spend("recent-ip")
+        clock["now"] += 0.1
 
         removed = PublicEndpointRateLimiter.prune_stale()
 
         assert removed == 0
-        assert "recent-ip" in PublicEndpointRateLimiter._ip_timestamps
-
-    def test_prune_stale_removes_empty_lists(self):
-        """Edge case: IPs with empty timestamp lists should be pruned."""
-        PublicEndpointRateLimiter._ip_timestamps["empty-ip"] = []
+        assert "recent-ip" in PublicEndpointRateLimiter._limiter
 
-        removed = PublicEndpointRateLimiter.prune_stale()
-
-        assert removed == 1
-        assert "empty-ip" not in PublicEndpointRateLimiter._ip_timestamps
-
-    def test_prune_stale_mixed_entries(self):
+    def test_prune_stale_mixed_entries(self, clock):
         """Edge case: mix of stale and fresh entries."""
-        now = time.time()
-        PublicEndpointRateLimiter._ip_timestamps["stale"] = [now - _STALE_SECONDS - 50]
-        PublicEndpointRateLimiter._ip_timestamps["fresh"] = [now - 1]
-        PublicEndpointRateLimiter._ip_timestamps["empty"] = []
+        _spend("stale")
+        clock["now"] += _WINDOW
+        _spend("fresh")
 
         removed = PublicEndpointRateLimiter.prune_stale()
 
-        assert removed == 2  # stale + empty
-        assert "fresh" in PublicEndpointRateLimiter._ip_timestamps
-        assert "stale" not in PublicEndpointRateLimiter._ip_timestamps
-        assert "empty" not in PublicEndpointRateLimiter._ip_timestamps
+        assert removed == 1
+        assert "fresh" in PublicEndpointRateLimiter._limiter
+        assert "stale" not in PublicEndpointRateLimiter._limiter
 
     def test_prune_stale_returns_zero_when_nothing_to_prune(self):
         """Edge case: no entries at all should return 0."""
         removed = PublicEndpointRateLimiter.prune_stale()
         assert removed == 0
 
-    def test_prune_stale_uses_max_timestamp(self):
-        """Edge case: entry with mix of old and recent timestamps uses max."""
-        now = time.time()
-        PublicEndpointRateLimiter._ip_timestamps["mixed-ts"] = [
-            now - _STALE_SECONDS - 100,  # old
-            now - 1,                       # recent
-        ]
+    def test_prune_stale_keeps_busy_ip(self, clock):
+        """Edge case: an IP that spent more of its budget takes longer to go stale."""
+        _spend("busy", 10)
+        clock["now"] += _WINDOW / _MAX_REQUESTS * 5
 
         removed = PublicEndpointRateLimiter.prune_stale()
 
-        assert removed == 0  # max timestamp is recent, so not stale
-        assert "mixed-ts" in PublicEndpointRateLimiter._ip_timestamps
+        assert removed == 0
+        assert "busy" in PublicEndpointRateLimiter._limiter
 
 
 # ---------------------------------------------------------------------------
@@ -487,7 +483,3 @@ class TestConstants:
     def test_window_is_positive(self):
         """Sanity: _WINDOW should be a positive number."""
         assert _WINDOW > 0
-
-    def test_stale_seconds_greater_than_window(self):
-        """Sanity: _STALE_SECONDS should be >= _WINDOW."""
-        assert _STALE_SECONDS >= _WINDOW
@@ -0,0 +1,279 @@
+"""
+Tests for backend/app/rate_limit_engine.py
+
+Covers:
+- GCRALimiter: burst of N, gradual refill, peek vs hit, forced hits capped at
+  one window, load() warming, prune(), constant state per key
+- RedisGCRALimiter: key namespacing, script arguments and decoding
+- RateLimitEngine: sync calls stay in-process, async calls go to Redis when
+  attached, fall back to in-process state on Redis errors
+- attach_shared_redis / detach_shared_redis / engine_stats
+
+The fake Redis evaluates GCRA_LUA's arithmetic in Python on a controllable
+millisecond clock standing in for Redis TIME.
+"""
+
+import math
+
+import pytest
+
+from app.rate_limit_engine import (
+    GCRA_LUA,
+    REDIS_KEY_PREFIX,
+    GCRALimiter,
+    RateLimitEngine,
+    RedisGCRALimiter,
+    _ENGINES,
+    attach_shared_redis,
+    detach_shared_redis,
+    engine_stats,
+)
+
+
+class _Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class _FakeRedis:
+    """Runs GCRA_LUA's arithmetic on integer milliseconds, like the script does."""
+
+    def __init__(self, now_ms=1_000_000):
+        self.now_ms = now_ms
+        self.data = {}
+        self.calls = []
+        self.fail = False
+
+    async def eval(self, script, numkeys, key, emission, window, mode):
+        if self.fail:
+            raise ConnectionError("redis unreachable")
+        assert script == GCRA_LUA and numkeys == 1
+        self.calls.append((key, emission, window, mode))
+        now = self.now_ms
+        tat = max(self.data.get(key, now), now)
+        allowed = tat + emission - now <= window
+        if (mode == 1 and allowed) or mode == 2:
+            tat = min(tat + emission, now + window)
+            self.data[key] = tat
+        used = math.ceil((tat - now) / emission)
+        return [1 if allowed else 0, max(0, tat + emission - now - window), used]
+
+    async def delete(self, key):
+        if self.fail:
+            raise ConnectionError("redis unreachable")
+        self.data.pop(key, None)
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+@pytest.fixture
+def limiter(clock):
+    return GCRALimiter(clock)
+
+
+class TestGCRALimiter:
+    """Tests for the in-process GCRA state"""
+
+    def test_burst_of_limit_then_denied(self, limiter):
+        """Happy path: a fresh key admits exactly `limit` requests back to back."""
+        results = [limiter.hit("k", 5, 60).allowed for _ in range(6)]
+        assert results == [True] * 5 + [False]
+
+    def test_refills_one_request_per_emission_interval(self, limiter, clock):
+        """Happy path: after the burst, one request is admitted every window / limit."""
+        for _ in range(5):
+            limiter.hit("k", 5, 60)
+        clock.now += 11.9
+        assert limiter.hit("k", 5, 60).allowed is False
+        clock.now += 0.1
+        assert limiter.hit("k", 5, 60).allowed is True
+        assert limiter.hit("k", 5, 60).allowed is False
+
+    def test_full_window_restores_full_burst(self, limiter, clock):
+        """Edge case: a key idle for one window is back to an unused budget."""
+        for _ in range(5):
+            limiter.hit("k", 5, 60)
+        clock.now += 60
+        assert limiter.peek("k", 5, 60).used == 0
+
+    def test_peek_records_nothing(self, limiter):
+        """Edge case: peek reports without consuming budget or storing the key."""
+        for _ in range(10):
+            assert limiter.peek("k", 2, 60).allowed is True
+        assert "k" not in limiter
+
+    def test_denied_hit_is_not_counted(self, limiter):
+        """Edge case: a rejected request doesn't push the next slot further out."""
+        for _ in range(2):
+            limiter.hit("k", 2, 60)
+        before = limiter.peek("k", 2, 60).retry_after
+        for _ in range(5):
+            limiter.hit("k", 2, 60)
+        assert limiter.peek("k", 2, 60).retry_after == pytest.approx(before)
+
+    def test_retry_after_and_used(self, limiter, clock):
+        """Happy path: retry_after is time to the next slot, used counts the window."""
+        for _ in range(3):
+            limiter.hit("k", 3, 90)
+        decision = limiter.peek("k", 3, 90)
+        assert decision.used == 3
+        assert decision.retry_after == pytest.approx(30)
+        clock.now += 10
+        assert limiter.peek("k", 3, 90).retry_after == pytest.approx(20)
+
+    def test_force_counts_past_the_limit_but_caps_at_one_window(self, limiter, clock):
+        """Edge case: forced hits (failed attempts) are capped so lockout is at most one window."""
+        for _ in range(20):
+            decision = limiter.hit("k", 5, 300, force=True)
+        assert decision.allowed is False
+        assert decision.used == 5
+        clock.now += 300
+        assert limiter.peek("k", 5, 300).allowed is True
+
+    def test_load_marks_persisted_attempts(self, limiter):
+        """Happy path: warming from a persisted count behaves like that many hits."""
+        limiter.load("k", 4, 5, 900)
+        assert limiter.peek("k", 5, 900).used == 4
+        assert limiter.hit("k", 5, 900).allowed is True
+        assert limiter.hit("k", 5, 900).allowed is False
+
+    def test_load_never_lowers_existing_state(self, limiter):
+        """Edge case: a smaller persisted count doesn't undo in-memory hits."""
+        for _ in range(3):
+            limiter.hit("k", 5, 900)
+        limiter.load("k", 1, 5, 900)
+        assert limiter.peek("k", 5, 900).used == 3
+
+    def test_load_zero_is_noop(self, limiter):
+        limiter.load("k", 0, 5, 900)
+        assert "k" not in limiter
+
+    def test_prune_drops_only_refilled_keys(self, limiter, clock):
+        """Happy path: prune returns and removes keys with a full budget."""
+        limiter.hit("old", 5, 60)
+        clock.now += 30
+        limiter.hit("new", 5, 60)
+        assert limiter.prune() == ["old"]
+        assert "old" not in limiter
+        assert "new" in limiter
+
+    def test_state_is_one_float_per_key(self, limiter):
+        """Edge case: memory per key doesn't grow with request count."""
+        for _ in range(1000):
+            limiter.hit("k", 1000, 60)
+        assert len(limiter) == 1
+        assert isinstance(limiter._tat["k"], float)
+
+    def test_reset_and_clear(self, limiter):
+        limiter.hit("a", 5, 60)
+        limiter.hit("b", 5, 60)
+        limiter.reset("a")
+        assert "a" not in limiter
+        limiter.clear()
+        assert len(limiter) == 0
+
+
+class TestRedisGCRALimiter:
+    """Tests for the Redis script backend"""
+
+    @pytest.mark.asyncio
+    async def test_passes_millisecond_arguments_and_decodes(self):
+        """Happy path: emission/window go to the script in ms; the reply becomes a decision."""
+        redis = _FakeRedis()
+        limiter = RedisGCRALimiter(redis, prefix="p:")
+
+        decision = await limiter.hit(("login", "1.2.3.4"), 5, 900)
+
+        assert redis.calls == [("p:login:1.2.3.4", 180_000, 900_000, 1)]
+        assert decision.allowed is True
+        assert decision.used == 1
+        assert decision.retry_after == 0.0
+
+    @pytest.mark.asyncio
+    async def test_matches_in_process_semantics(self):
+        """Happy path: burst, denial and refill agree with GCRALimiter."""
+        redis = _FakeRedis()
+        limiter = RedisGCRALimiter(redis)
+
+        results = [(await limiter.hit("k", 3, 60)).allowed for _ in range(4)]
+        assert results == [True, True, True, False]
+        denied = await limiter.peek("k", 3, 60)
+        assert denied.retry_after == pytest.approx(20)
+
+        redis.now_ms += 20_000
+        assert (await limiter.hit("k", 3, 60)).allowed is True
+
+    @pytest.mark.asyncio
+    async def test_force_and_reset(self):
+        """Edge case: force counts a denied attempt (mode 2); reset deletes the key."""
+        redis = _FakeRedis()
+        limiter = RedisGCRALimiter(redis)
+
+        for _ in range(4):
+            await limiter.hit("k", 2, 60, force=True)
+        assert redis.calls[-1][3] == 2
+        assert (await limiter.peek("k", 2, 60)).used == 2
+
+        await limiter.reset("k")
+        assert f"{REDIS_KEY_PREFIX}k" not in redis.data
+
+
+class TestRateLimitEngine:
+    """Tests for the engine the limiters use"""
+
+    @pytest.fixture
+    def engine(self, clock):
+        engine = RateLimitEngine("test", clock)
+        yield engine
+        _ENGINES.remove(engine)
+
+    @pytest.mark.asyncio
+    async def test_async_calls_use_local_state_without_redis(self, engine):
+        """Happy path: with no Redis attached, async and sync share in-process state."""
+        await engine.ahit("k", 2, 60)
+        engine.hit("k", 2, 60)
+        assert (await engine.apeek("k", 2, 60)).allowed is False
+        assert engine.shared is False
+
+    @pytest.mark.asyncio
+    async def test_async_calls_go_to_redis_when_attached(self, engine):
+        """Happy path: attached engines keep async state in Redis under their namespace."""
+        redis = _FakeRedis()
+        engine.attach_redis(redis)
+
+        await engine.ahit("k", 2, 60)
+
+        assert f"{REDIS_KEY_PREFIX}test:k" in redis.data
+        assert "k" not in engine
+        assert engine.hit("k", 2, 60).allowed is True  # sync callers stay in-process
+
+    @pytest.mark.asyncio
+    async def test_redis_error_falls_back_to_local_state(self, engine):
+        """Failure: a Redis error is counted and the in-process limiter answers."""
+        redis = _FakeRedis()
+        redis.fail = True
+        engine.attach_redis(redis)
+
+        for _ in range(2):
+            assert (await engine.ahit("k", 2, 60)).allowed is True
+        assert (await engine.apeek("k", 2, 60)).allowed is False
+        await engine.areset("k")
+
+        assert "k" not in engine
+        assert engine.stats() == {"keys": 0, "shared": True, "redis_errors": 4}
+
+    def test_attach_and_detach_all_engines(self, engine):
+        """Happy path: the module helpers reach every registered engine."""
+        attach_shared_redis(_FakeRedis())
+        try:
+            assert all(e.shared for e in _ENGINES)
+            assert engine_stats()["test"]["shared"] is True
+        finally:
+            detach_shared_redis()
+        assert not any(e.shared for e in _ENGINES)
@@ -2,8 +2,8 @@
 Tests for backend/app/auth_routers/rate_limiters.py
 
 Covers in-memory rate limiting for login, signup, forgot password,
-resend verification, and MFA categories. All tests use in-memory stores
-only — DB persistence is mocked.
+resend verification, and MFA categories. All tests use in-memory GCRA
+state only — DB persistence is mocked.
 """
 
 import time
@@ -21,7 +21,8 @@ from app.auth_routers.rate_limiters import (
     _check_signup_rate_limit,
     _fire_and_forget,
     _is_forgot_pw_email_rate_limited,
-    _mem_count,
+    _hit,
+    _peek,
     _prune_memory,
     _record,
     _record_attempt,
@@ -30,7 +31,6 @@ from app.auth_routers.rate_limiters import (
     _record_mfa_attempt,
     _record_resend_attempt,
     _record_signup_attempt,
-    _CATEGORY_STORE,
     _LIMITS,
 )
 import app.auth_routers.rate_limiters as rl_module
@@ -44,59 +44,78 @@ import app.auth_routers.rate_limiters as rl_module
 @pytest.fixture(autouse=True)
 def _clear_rate_limiter_state():
     """Reset all in-memory rate limiter state for test isolation."""
-    for store in _CATEGORY_STORE.values():
-        store.clear()
+    rl_module._limiter.clear()
     rl_module._warmed.clear()
     rl_module._last_prune_time = 0.0
     rl_module._pending_db_tasks.clear()
     yield
-    for store in _CATEGORY_STORE.values():
-        store.clear()
+    rl_module._limiter.clear()
     rl_module._warmed.clear()
 
 
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable clock for the limiter's in-process state."""
+    state = {"now": time.monotonic()}
+    monkeypatch.setattr(rl_module._limiter.local, "clock", lambda: state["now"])
+    return state
+
+
+def _fill(category, key, n):
+    """Record n attempts for (category, key) in memory only."""
+    for _ in range(n):
+        _hit(category, key)
+
+
+def _used(category, key):
+    return _peek(category, key).used
+
+
 # =============================================================================
-# _mem_count
+# _peek / _hit
 # =============================================================================
 
 
-class TestMemCount:
-    """Tests for _mem_count() — in-memory window counting."""
-
-    def test_mem_count_returns_zero_for_empty_store(self):
-        """Happy path: no attempts recorded returns count of 0."""
-        from collections import defaultdict
-        store = defaultdict(list)
-        count, timestamps = _mem_count(store, "192.168.1.1", 900)
-        assert count == 0
-        assert timestamps == []
-
-    def test_mem_count_counts_recent_attempts(self):
-        """Happy path: only timestamps within window are counted."""
-        from collections import defaultdict
-        store = defaultdict(list)
-        now = time.time()
-        store["key1"] = [now - 10, now - 5, now - 1]
-        count, timestamps = _mem_count(store, "key1", 900)
-        assert count == 3
-
-    def test_mem_count_filters_expired_attempts(self):
-        """Edge case: timestamps outside the window are pruned."""
-        from collections import defaultdict
-        store = defaultdict(list)
-        now = time.time()
-        store["key1"] = [now - 2000, now - 1500, now - 5]
-        count, timestamps = _mem_count(store, "key1", 900)
-        assert count == 1
-        assert len(store["key1"]) == 1  # Store is cleaned
-
-    def test_mem_count_all_expired(self):
-        """Edge case: all timestamps expired returns 0."""
-        from collections import defaultdict
-        store = defaultdict(list)
-        store["key1"] = [time.time() - 5000, time.time() - 4000]
-        count, timestamps = _mem_count(store, "key1", 900)
-        assert count == 0
+class TestPeekAndHit:
+    """Tests for _peek()/_hit() — in-memory GCRA state per (category, key)."""
+
+    def test_peek_fresh_key_is_allowed_and_unused(self):
+        """Happy path: no attempts recorded — allowed with a count of 0."""
+        decision = _peek("login", "192.168.1.1")
+        assert decision.allowed is True
+        assert decision.used == 0
+
+    def test_hit_counts_attempts(self):
+        """Happy path: each recorded attempt is counted."""
+        _fill("login", "key1", 3)
+        assert _used("login", "key1") == 3
+
+    def test_peek_records_nothing(self):
+        """Edge case: peeking does not consume budget."""
+        for _ in range(10):
+            _peek("login", "key1")
+        assert _used("login", "key1") == 0
+
+    def test_budget_refills_gradually(self, clock):
+        """Edge case: one attempt's worth of budget returns every window / max."""
+        _fill("login", "key1", 5)
+        assert _peek("login", "key1").allowed is False
+        clock["now"] += 900 / 5
+        assert _peek("login", "key1").allowed is True
+        assert _used("login", "key1") == 4
+
+    def test_all_expired(self, clock):
+        """Edge case: a full window later the key is back to 0."""
+        _fill("login", "key1", 5)
+        clock["now"] += 900
+        assert _used("login", "key1") == 0
+
+    def test_attempts_past_the_limit_are_capped(self, clock):
+        """Edge case: hammering a limited key can't push the lockout past one window."""
+        _fill("login", "key1", 50)
+        assert _used("login", "key1") == 5
+        clock["now"] += 900
+        assert _peek("login", "key1").allowed is True
 
 
 # =============================================================================
@@ -113,8 +132,7 @@ class TestCheckRateLimit:
 
     def test_check_rate_limit_blocks_at_limit_by_ip(self):
         """Failure: 5 attempts from same IP raises 429."""
-        now = time.time()
-        rl_module._login_attempts["10.0.0.1"] = [now - i for i in range(5)]
+        _fill("login", "10.0.0.1", 5)
         with pytest.raises(HTTPException) as exc_info:
             _check_rate_limit("10.0.0.1")
         assert exc_info.value.status_code == 429
@@ -122,41 +140,46 @@ class TestCheckRateLimit:
 
     def test_check_rate_limit_blocks_by_username(self):
         """Failure: 5 attempts for same username raises 429."""
-        now = time.time()
-        rl_module._login_attempts_by_username["admin"] = [now - i for i in range(5)]
+        _fill("login_user", "admin", 5)
         with pytest.raises(HTTPException) as exc_info:
             _check_rate_limit("10.0.0.2", username="admin")
         assert exc_info.value.status_code == 429
 
     def test_check_rate_limit_ip_ok_username_blocked(self):
         """Edge case: IP is fine but username is rate limited."""
-        now = time.time()
-        rl_module._login_attempts_by_username["victim"] = [now - i for i in range(5)]
+        _fill("login_user", "victim", 5)
         with pytest.raises(HTTPException):
             _check_rate_limit("192.168.1.1", username="victim")
 
-    def test_check_rate_limit_expired_attempts_not_counted(self):
+    def test_check_rate_limit_expired_attempts_not_counted(self, clock):
         """Edge case: old attempts outside the 15-min window are ignored."""
-        rl_module._login_attempts["10.0.0.1"] = [time.time() - 2000 for _ in range(10)]
+        _fill("login", "10.0.0.1", 10)
+        clock["now"] += 2000
         _check_rate_limit("10.0.0.1")  # Should not raise
 
     def test_check_rate_limit_retry_after_header(self):
         """Failure: the 429 response includes a Retry-After header."""
-        now = time.time()
-        rl_module._login_attempts["10.0.0.1"] = [now - i for i in range(5)]
+        _fill("login", "10.0.0.1", 5)
         with pytest.raises(HTTPException) as exc_info:
             _check_rate_limit("10.0.0.1")
         assert "Retry-After" in exc_info.value.headers
 
     def test_check_rate_limit_singular_minute(self):
         """Edge case: when retry is ~1 minute, message says 'minute' not 'minutes'."""
-        now = time.time()
-        # Place all attempts very recently so retry_after is close to 900s = 15 min
-        rl_module._login_attempts["10.0.0.1"] = [now for _ in range(5)]
+        # Place all attempts just now: the next slot frees in 900 / 5 = 180s
+        _fill("login", "10.0.0.1", 5)
+        with pytest.raises(HTTPException) as exc_info:
+            _check_rate_limit("10.0.0.1")
+        assert "3 minutes" in exc_info.value.detail
+        assert exc_info.value.headers["Retry-After"] == "180"
+
+    def test_check_rate_limit_singular_minute_near_refill(self, clock):
+        """Edge case: under a minute to go reads as '1 minute'."""
+        _fill("login", "10.0.0.1", 5)
+        clock["now"] += 150
         with pytest.raises(HTTPException) as exc_info:
             _check_rate_limit("10.0.0.1")
-        # The detail should contain "minutes" since 900s = 15 minutes
-        assert "minute" in exc_info.value.detail
+        assert "1 minute." in exc_info.value.detail
 
 
 class TestRecordAttempt:
@@ -165,18 +188,18 @@ class TestRecordAttempt:
     def test_record_attempt_adds_to_ip_store(self):
         """Happy path: recording adds a timestamp for the IP."""
         _record_attempt("10.0.0.1")
-        assert len(rl_module._login_attempts["10.0.0.1"]) == 1
+        assert _used("login", "10.0.0.1") == 1
 
     def test_record_attempt_adds_to_username_store(self):
         """Happy path: with username, records in both IP and username stores."""
         _record_attempt("10.0.0.1", username="testuser")
-        assert len(rl_module._login_attempts["10.0.0.1"]) == 1
-        assert len(rl_module._login_attempts_by_username["testuser"]) == 1
+        assert _used("login", "10.0.0.1") == 1
+        assert _used("login_user", "testuser") == 1
 
     def test_record_attempt_no_username_skips_username_store(self):
         """Edge case: without username, only IP store is updated."""
         _record_attempt("10.0.0.1")
-        assert "testuser" not in rl_module._login_attempts_by_username
+        assert ("login_user", "testuser") not in rl_module._limiter
 
     def test_record_attempt_marks_warmed(self):
         """Happy path: recording marks the cache key as warmed."""
@@ -199,8 +222,7 @@ class TestSignupRateLimit:
 
     def test_check_signup_blocks_at_limit(self):
         """Failure: 3 attempts from same IP raises 429."""
-        now = time.time()
-        rl_module._signup_attempts["10.0.0.1"] = [now - i for i in range(3)]
+        _fill("signup", "10.0.0.1", 3)
         with pytest.raises(HTTPException) as exc_info:
             _check_signup_rate_limit("10.0.0.1")
         assert exc_info.value.status_code == 429
@@ -209,7 +231,7 @@ class TestSignupRateLimit:
     def test_record_signup_adds_to_store(self):
         """Happy path: recording increments the signup store."""
         _record_signup_attempt("10.0.0.1")
-        assert len(rl_module._signup_attempts["10.0.0.1"]) == 1
+        assert _used("signup", "10.0.0.1") == 1
         assert ("signup", "10.0.0.1") in rl_module._warmed
 
 
@@ -227,8 +249,7 @@ class TestForgotPwRateLimit:
 
     def test_check_forgot_pw_blocks_at_limit(self):
         """Failure: 3 attempts from same IP raises 429."""
-        now = time.time()
-        rl_module._forgot_pw_attempts["10.0.0.1"] = [now - i for i in range(3)]
+        _fill("forgot_pw", "10.0.0.1", 3)
         with pytest.raises(HTTPException) as exc_info:
             _check_forgot_pw_rate_limit("10.0.0.1")
         assert exc_info.value.status_code == 429
@@ -237,7 +258,7 @@ class TestForgotPwRateLimit:
     def test_record_forgot_pw_adds_to_store(self):
         """Happy path: recording increments the forgot_pw store."""
         _record_forgot_pw_attempt("10.0.0.1")
-        assert len(rl_module._forgot_pw_attempts["10.0.0.1"]) == 1
+        assert _used("forgot_pw", "10.0.0.1") == 1
 
 
 class TestForgotPwEmailRateLimit:
@@ -249,21 +270,19 @@ class TestForgotPwEmailRateLimit:
 
     def test_is_rate_limited_returns_true_at_limit(self):
         """Failure: 3 attempts returns True."""
-        now = time.time()
-        rl_module._forgot_pw_by_email["test@example.com"] = [now - i for i in range(3)]
+        _fill("forgot_pw_email", "test@example.com", 3)
         assert _is_forgot_pw_email_rate_limited("test@example.com") is True
 
-    def test_is_rate_limited_prunes_expired(self):
-        """Edge case: expired timestamps are pruned and not counted."""
-        rl_module._forgot_pw_by_email["test@example.com"] = [
-            time.time() - 5000 for _ in range(10)
-        ]
+    def test_is_rate_limited_prunes_expired(self, clock):
+        """Edge case: attempts older than the window are not counted."""
+        _fill("forgot_pw_email", "test@example.com", 10)
+        clock["now"] += 5000
         assert _is_forgot_pw_email_rate_limited("test@example.com") is False
 
     def test_record_forgot_pw_email_adds_to_store(self):
         """Happy path: recording increments the email store."""
         _record_forgot_pw_email_attempt("a@b.com")
-        assert len(rl_module._forgot_pw_by_email["a@b.com"]) == 1
+        assert _used("forgot_pw_email", "a@b.com") == 1
         assert ("forgot_pw_email", "a@b.com") in rl_module._warmed
 
 
@@ -281,8 +300,7 @@ class TestResendRateLimit:
 
     def test_check_resend_blocks_at_limit(self):
         """Failure: 3 attempts for same user_id raises 429."""
-        now = time.time()
-        rl_module._resend_attempts["42"] = [now - i for i in range(3)]
+        _fill("resend", "42", 3)
         with pytest.raises(HTTPException) as exc_info:
             _check_resend_rate_limit(42)
         assert exc_info.value.status_code == 429
@@ -291,7 +309,7 @@ class TestResendRateLimit:
     def test_record_resend_converts_user_id_to_string(self):
         """Edge case: user_id is stored as string key."""
         _record_resend_attempt(99)
-        assert len(rl_module._resend_attempts["99"]) == 1
+        assert _used("resend", "99") == 1
         assert ("resend", "99") in rl_module._warmed
 
 
@@ -309,8 +327,7 @@ class TestMfaRateLimit:
 
     def test_check_mfa_blocks_at_limit(self):
         """Failure: 5 attempts raises 429 with MFA-specific message."""
-        now = time.time()
-        rl_module._mfa_attempts["mfa-token-abc"] = [now - i for i in range(5)]
+        _fill("mfa", "mfa-token-abc", 5)
         with pytest.raises(HTTPException) as exc_info:
             _check_mfa_rate_limit("mfa-token-abc")
         assert exc_info.value.status_code == 429
@@ -319,8 +336,7 @@ class TestMfaRateLimit:
 
     def test_check_mfa_no_retry_after_header(self):
         """Edge case: MFA 429 does NOT include Retry-After header (different from login)."""
-        now = time.time()
-        rl_module._mfa_attempts["tok"] = [now - i for i in range(5)]
+        _fill("mfa", "tok", 5)
         with pytest.raises(HTTPException) as exc_info:
             _check_mfa_rate_limit("tok")
         # MFA handler doesn't set headers unlike other categories
@@ -329,7 +345,7 @@ class TestMfaRateLimit:
     def test_record_mfa_adds_to_store(self):
         """Happy path: recording increments the MFA store."""
         _record_mfa_attempt("mfa-token-xyz")
-        assert len(rl_module._mfa_attempts["mfa-token-xyz"]) == 1
+        assert _used("mfa", "mfa-token-xyz") == 1
         assert ("mfa", "mfa-token-xyz") in rl_module._warmed
 
 
@@ -341,30 +357,31 @@ class TestMfaRateLimit:
 class TestPruneMemory:
     """Tests for _prune_memory() — periodic stale entry cleanup."""
 
-    def test_prune_memory_skips_when_interval_not_elapsed(self):
+    def test_prune_memory_skips_when_interval_not_elapsed(self, clock):
         """Edge case: prune is a no-op if called before the interval elapses."""
         rl_module._last_prune_time = time.time()
-        now = time.time()
-        rl_module._login_attempts["old_ip"] = [now - 5000]
+        _fill("login", "old_ip", 1)
+        clock["now"] += 5000
         _prune_memory()
         # Should NOT have pruned because interval hasn't passed
-        assert "old_ip" in rl_module._login_attempts
+        assert ("login", "old_ip") in rl_module._limiter
 
-    def test_prune_memory_removes_stale_entries(self):
-        """Happy path: stale entries are removed when interval elapses."""
+    def test_prune_memory_removes_stale_entries(self, clock):
+        """Happy path: refilled entries are removed when interval elapses."""
         rl_module._last_prune_time = 0.0
-        rl_module._login_attempts["stale_ip"] = [time.time() - 5000]
-        rl_module._warmed.add(("login", "stale_ip"))
+        _fill("login", "stale_ip", 1)
+        clock["now"] += 5000
         _prune_memory()
-        assert "stale_ip" not in rl_module._login_attempts
+        assert ("login", "stale_ip") not in rl_module._limiter
         assert ("login", "stale_ip") not in rl_module._warmed
 
-    def test_prune_memory_keeps_fresh_entries(self):
+    def test_prune_memory_keeps_fresh_entries(self, clock):
         """Happy path: entries within the window are preserved."""
         rl_module._last_prune_time = 0.0
-        rl_module._login_attempts["fresh_ip"] = [time.time() - 10]
+        _fill("login", "fresh_ip", 1)
+        clock["now"] += 10
         _prune_memory()
-        assert "fresh_ip" in rl_module._login_attempts
+        assert ("login", "fresh_ip") in rl_module._limiter
 
     def test_prune_memory_clears_warmed_when_oversized(self):
         """Edge case: _warmed set is cleared when it exceeds MAX_WARMED_SIZE."""
@@ -426,8 +443,7 @@ class TestAsyncCheck:
     @patch("app.auth_routers.rate_limiters._db_count", new_callable=AsyncMock, return_value=0)
     async def test_check_blocks_at_limit(self, mock_db_count):
         """Failure: when in-memory count reaches limit, 429 is raised."""
-        now = time.time()
-        rl_module._login_attempts["10.0.0.1"] = [now - i for i in range(5)]
+        _fill("login", "10.0.0.1", 5)
         rl_module._warmed.add(("login", "10.0.0.1"))
         with pytest.raises(HTTPException) as exc_info:
             await _check("login", "10.0.0.1", "Too many login attempts.")
@@ -440,8 +456,8 @@ class TestAsyncCheck:
         await _check("login", "new_ip", "Too many login attempts.")
         # After warming, the key should be in warmed set
         assert ("login", "new_ip") in rl_module._warmed
-        # Memory should have 4 synthetic timestamps
-        assert len(rl_module._login_attempts["new_ip"]) == 4
+        # Memory should count the 4 persisted attempts
+        assert _used("login", "new_ip") == 4
         mock_db_count.assert_called_once_with("login", "new_ip", 900)
 
     @pytest.mark.asyncio
@@ -474,7 +490,7 @@ class TestAsyncRecord:
     async def test_record_adds_to_memory_and_calls_db(self, mock_db_record):
         """Happy path: recording adds to memory and persists to DB."""
         await _record("signup", "10.0.0.1")
-        assert len(rl_module._signup_attempts["10.0.0.1"]) == 1
+        assert _used("signup", "10.0.0.1") == 1
         assert ("signup", "10.0.0.1") in rl_module._warmed
         mock_db_record.assert_awaited_once_with("signup", "10.0.0.1")
 
@@ -488,8 +504,9 @@ class TestLimitsConfig:
     """Tests for the _LIMITS configuration dictionary."""
 
     def test_all_categories_have_limits(self):
-        """Happy path: every category in CATEGORY_STORE has a limit config."""
-        for category in _CATEGORY_STORE:
+        """Happy path: every category with a check/record pair has a limit config."""
+        for category in ("login", "login_user", "signup", "forgot_pw", "forgot_pw_email",
+                         "resend", "mfa", "disposable_email"):
             assert category in _LIMITS, f"Missing limit config for {category}"
 
     def test_limits_are_tuples_of_int(self):
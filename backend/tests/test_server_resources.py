@@ -51,3 +51,15 @@ def test_trader_role_keeps_headroom_for_web_and_postgres(monkeypatch):
     assert plan.write_pool_size + plan.write_pool_overflow <= 19
     assert plan.bot_concurrency_max <= 2
     assert plan.pair_concurrency_max <= 2
+
+
+def test_optimizer_workers_leave_cores_for_the_trader(monkeypatch):
+    server_resources = _load_server_resources(monkeypatch, "combined")
+    monkeypatch.setattr(server_resources.os, "cpu_count", lambda: 8)
+    assert server_resources.ResourcePlan().optimizer_workers_max == 3
+
+    monkeypatch.setattr(server_resources.os, "cpu_count", lambda: 1)
+    assert server_resources.ResourcePlan().optimizer_workers_max == 1
+
+    server_resources = _load_server_resources(monkeypatch, "trader")
+    assert server_resources.ResourcePlan().optimizer_workers_max == 0
@@ -0,0 +1,338 @@
+"""
+Tests for backend/app/cache.py — TwoTierCache
+
+Covers:
+- L1 LRU bound and behaviour without Redis (SimpleCache compatible)
+- L2 read-through, write-through and JSON-shareability rule
+- Cross-process single-flight via the Redis lock
+- delete / delete_prefix / clear invalidation fan-out
+- Redis failures falling back to the in-process tier
+- Per-tier stats
+
+Two caches sharing one in-memory Redis stand in for the web and trader
+processes; published invalidations are delivered to every attached cache the
+way the main.py subscriber does.
+"""
+
+import asyncio
+import fnmatch
+import json
+import time
+
+import pytest
+
+from app.cache import CACHE_INVALIDATION_CHANNEL, TwoTierCache
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._ops = []
+
+    def get(self, key):
+        self._ops.append(("get", key))
+
+    def pttl(self, key):
+        self._ops.append(("pttl", key))
+
+    async def execute(self):
+        return [await getattr(self._redis, op)(key) for op, key in self._ops]
+
+
+class _FakeRedis:
+    """The subset of redis.asyncio the cache uses, with PX/EX expiry and pub/sub delivery."""
+
+    def __init__(self):
+        self.data = {}
+        self.subscribers = []
+        self.published = []
+        self.fail = False
+
+    def _check(self):
+        if self.fail:
+            raise ConnectionError("redis unreachable")
+
+    def _live(self, key):
+        item = self.data.get(key)
+        if item is not None and item[1] is not None and item[1] <= time.monotonic():
+            del self.data[key]
+            return None
+        return item
+
+    def pipeline(self, transaction=True):
+        self._check()
+        return _FakePipeline(self)
+
+    async def get(self, key):
+        self._check()
+        item = self._live(key)
+        return item[0] if item else None
+
+    async def pttl(self, key):
+        item = self._live(key)
+        if item is None:
+            return -2
+        return -1 if item[1] is None else int((item[1] - time.monotonic()) * 1000)
+
+    async def set(self, key, value, px=None, ex=None, nx=False):
+        self._check()
+        if nx and self._live(key) is not None:
+            return None
+        ttl = px / 1000 if px else ex
+        self.data[key] = (value, time.monotonic() + ttl if ttl else None)
+        return True
+
+    async def delete(self, *keys):
+        self._check()
+        return sum(1 for key in keys if self.data.pop(key, None) is not None)
+
+    async def scan_iter(self, match="*", count=None):
+        self._check()
+        for key in [k for k in self.data if fnmatch.fnmatchcase(k, match)]:
+            yield key
+
+    async def eval(self, script, numkeys, key, token):
+        self._check()
+        item = self._live(key)
+        if item and item[0] == token:
+            del self.data[key]
+            return 1
+        return 0
+
+    async def publish(self, channel, message):
+        self._check()
+        self.published.append((channel, json.loads(message)))
+        for handler in self.subscribers:
+            handler(message)
+        return len(self.subscribers)
+
+
+@pytest.fixture
+def redis():
+    return _FakeRedis()
+
+
+def _process(redis, **kwargs):
+    cache = TwoTierCache(**kwargs)
+    cache.attach_redis(redis)
+    redis.subscribers.append(cache.handle_message)
+    return cache
+
+
+# ---------------------------------------------------------------------------
+# L1 only
+# ---------------------------------------------------------------------------
+
+
+class TestInProcessTier:
+    """Without Redis the cache is a bounded SimpleCache."""
+
+    @pytest.mark.asyncio
+    async def test_lru_evicts_least_recently_used(self):
+        """Edge case: reading a key protects it from eviction."""
+        cache = TwoTierCache(max_entries=2)
+        await cache.set("a", 1, 60)
+        await cache.set("b", 2, 60)
+        assert await cache.get("a") == 1
+        await cache.set("c", 3, 60)
+        assert await cache.get("b") is None
+        assert (await cache.get("a"), await cache.get("c")) == (1, 3)
+        assert cache.stats()["l1"]["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_get_or_fetch_without_redis(self):
+        """Happy path: single-flight per loop as in SimpleCache."""
+        cache = TwoTierCache()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"price": 1}
+
+        results = await asyncio.gather(*(cache.get_or_fetch("k", fetch, 60) for _ in range(5)))
+        assert results == [{"price": 1}] * 5
+        assert calls == 1
+        assert cache.stats()["shared"] is False
+
+
+# ---------------------------------------------------------------------------
+# Shared tier
+# ---------------------------------------------------------------------------
+
+
+class TestSharedTier:
+    """Read-through / write-through between two processes."""
+
+    @pytest.mark.asyncio
+    async def test_value_set_in_one_process_is_read_by_the_other(self, redis):
+        """Happy path: web reads what the trader fetched; the L2 hit lands in web's L1."""
+        trader, web = _process(redis), _process(redis)
+        await trader.set("price_BTC-USD", 50000.5, 60)
+
+        assert await web.get("price_BTC-USD") == 50000.5
+        assert await web.get("price_BTC-USD") == 50000.5
+        stats = web.stats()
+        assert stats["l2"]["hits"] == 1
+        assert stats["l1"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_l2_entry_expires_with_the_original_ttl(self, redis):
+        trader, web = _process(redis), _process(redis)
+        await trader.set("k", "v", 60)
+        redis.data["zenith:cache:k"] = ("\"v\"", time.monotonic() - 1)
+        assert await web.get("k") is None
+        assert web.stats()["l2"]["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_values_that_do_not_round_trip_stay_local(self, redis):
+        """Edge case: Decimals and tuples are never shared (they would come back as other types)."""
+        from decimal import Decimal
+
+        trader, web = _process(redis), _process(redis)
+        await trader.set("balance", Decimal("1.5"), 60)
+        await trader.set("pair", ("BTC", "USD"), 60)
+
+        assert await trader.get("balance") == Decimal("1.5")
+        assert await web.get("balance") is None
+        assert await web.get("pair") is None
+        assert trader.stats()["l2"]["unshareable"] == 2
+
+    @pytest.mark.asyncio
+    async def test_l1_copies_are_capped_when_shared(self, redis):
+        cache = _process(redis, l1_max_ttl=5)
+        await cache.set("k", 1, 3600)
+        assert cache._cache["k"].expires_at - time.monotonic() <= 5
+
+
+class TestCrossProcessSingleFlight:
+    """Only one process fetches a missing key."""
+
+    @pytest.mark.asyncio
+    async def test_second_process_waits_for_the_first_fetch(self, redis):
+        trader, web = _process(redis), _process(redis)
+        calls = []
+
+        async def fetch(name):
+            calls.append(name)
+            await asyncio.sleep(0.1)
+            return [{"product_id": "BTC-USD"}]
+
+        results = await asyncio.gather(
+            trader.get_or_fetch("all_products", lambda: fetch("trader"), 3600),
+            web.get_or_fetch("all_products", lambda: fetch("web"), 3600),
+        )
+        assert results == [[{"product_id": "BTC-USD"}]] * 2
+        assert calls == ["trader"]
+        assert web.stats()["single_flight"]["lock_wait_hits"] == 1
+        assert "zenith:cache:lock:all_products" not in redis.data  # released
+
+    @pytest.mark.asyncio
+    async def test_waiter_fetches_itself_after_the_wait_expires(self, redis):
+        """Failure: a lock held by a dead process only delays the fetch by lock_wait."""
+        web = _process(redis, lock_wait=0.1)
+        await redis.set("zenith:cache:lock:k", "other", nx=True, ex=15)
+
+        async def fetch():
+            return "fresh"
+
+        assert await web.get_or_fetch("k", fetch, 60) == "fresh"
+        assert web.stats()["single_flight"]["lock_wait_timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_waiter_takes_over_when_the_holder_fails(self, redis):
+        """Failure: a failed fetch in the other process hands the lock over instead of stalling lock_wait."""
+        trader, web = _process(redis), _process(redis, lock_wait=10)
+
+        async def boom():
+            await asyncio.sleep(0.1)
+            raise RuntimeError("exchange down")
+
+        async def fetch():
+            return "fresh"
+
+        async def web_fetch():
+            await asyncio.sleep(0.02)  # the trader takes the lock first
+            return await web.get_or_fetch("k", fetch, 60)
+
+        started = time.monotonic()
+        trader_result, web_result = await asyncio.gather(
+            trader.get_or_fetch("k", boom, 60), web_fetch(), return_exceptions=True,
+        )
+        assert isinstance(trader_result, RuntimeError)
+        assert web_result == "fresh"
+        assert time.monotonic() - started < 1
+        stats = web.stats()["single_flight"]
+        assert (stats["lock_waits"], stats["lock_acquired"], stats["lock_wait_timeouts"]) == (1, 1, 0)
+        assert "zenith:cache:lock:k" not in redis.data
+
+    @pytest.mark.asyncio
+    async def test_fetch_error_releases_the_lock(self, redis):
+        cache = _process(redis)
+
+        async def boom():
+            raise RuntimeError("exchange down")
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_fetch("k", boom, 60)
+        assert "zenith:cache:lock:k" not in redis.data
+
+
+class TestInvalidation:
+    """Deletes remove the shared copy and the other process's L1 copy."""
+
+    @pytest.mark.asyncio
+    async def test_delete_reaches_the_other_process(self, redis):
+        trader, web = _process(redis), _process(redis)
+        await trader.set("balance_btc_1", 0.5, 60)
+        assert await web.get("balance_btc_1") == 0.5  # now in web's L1
+
+        await trader.delete("balance_btc_1")
+
+        assert await web.get("balance_btc_1") is None
+        assert web.stats()["remote_invalidations"] == 1
+        assert trader.stats()["remote_invalidations"] == 0  # own message ignored
+        assert redis.published[-1] == (
+            CACHE_INVALIDATION_CHANNEL, {"op": "delete", "arg": "balance_btc_1", "origin": trader._origin},
+        )
+
+    @pytest.mark.asyncio
+    async def test_delete_prefix_and_clear(self, redis):
+        trader, web = _process(redis), _process(redis)
+        for key in ("balance_btc_1", "balance_eth_1", "price_BTC-USD"):
+            await trader.set(key, 1.0, 60)
+            await web.get(key)
+
+        await trader.delete_prefix("balance_")
+        assert await web.get("balance_eth_1") is None
+        assert await web.get("price_BTC-USD") == 1.0
+
+        await web.clear()
+        assert await trader.get("price_BTC-USD") is None
+        assert not redis.data
+
+    def test_malformed_message_is_ignored(self):
+        cache = TwoTierCache()
+        cache.handle_message("not json")
+        cache.handle_message(json.dumps({"op": "explode"}))
+        assert cache.stats()["remote_invalidations"] == 0
+
+
+class TestRedisFailures:
+    """Redis errors degrade to the in-process tier."""
+
+    @pytest.mark.asyncio
+    async def test_get_set_and_fetch_survive_redis_errors(self, redis):
+        cache = _process(redis)
+        redis.fail = True
+
+        await cache.set("k", 1, 60)
+        assert await cache.get("k") == 1
+
+        async def fetch():
+            return 2
+
+        assert await cache.get_or_fetch("other", fetch, 60) == 2
+        await cache.delete("k")
+        assert cache.stats()["l2"]["errors"] >= 4
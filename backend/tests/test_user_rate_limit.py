@@ -15,9 +15,9 @@ from app.services.user_rate_limit import (
 @pytest.fixture(autouse=True)
 def clear_state():
     """Ensure each test starts with empty rate-limit state."""
-    user_rate_limit._buckets.clear()
+    user_rate_limit._limiter.clear()
     yield
-    user_rate_limit._buckets.clear()
+    user_rate_limit._limiter.clear()
 
 
 class TestCheckUserRateLimit:
@@ -79,13 +79,13 @@ class TestCheckUserRateLimit:
         assert exc.value.detail == "custom-message"
 
     def test_expired_entries_are_dropped(self, monkeypatch):
-        # Seed timestamps 2 hours in the past
+        # Spend the budget 2 hours in the past
         import time as time_module
 
-        real_time = time_module.time
+        real_time = time_module.monotonic
         fake_now = {"value": real_time() - 7200}
 
-        monkeypatch.setattr(user_rate_limit.time, "time", lambda: fake_now["value"])
+        monkeypatch.setattr(user_rate_limit._limiter.local, "clock", lambda: fake_now["value"])
         for _ in range(5):
             check_user_rate_limit(
                 user_id=1, bucket="test", max_requests=5, window_seconds=60
@@ -121,6 +121,20 @@ class TestRecordUserFailure:
                 user_id=1, bucket="mfa", max_failures=5, window_seconds=900
             )
 
+    def test_failure_count_is_capped_at_the_limit(self):
+        """Edge case: failures past the limit don't extend the lockout beyond one window."""
+        for _ in range(4):
+            record_user_failure(
+                user_id=1, bucket="mfa", max_failures=5, window_seconds=900
+            )
+        for _ in range(3):
+            with pytest.raises(HTTPException) as exc:
+                record_user_failure(
+                    user_id=1, bucket="mfa", max_failures=5, window_seconds=900
+                )
+        assert int(exc.value.headers["Retry-After"]) <= 900
+        assert user_rate_limit._limiter.peek((1, "fail:mfa"), 5, 900).used == 5
+
     def test_clear_nonexistent_bucket_is_noop(self):
         clear_user_failures(user_id=999, bucket="never-seen")
 
@@ -129,9 +143,9 @@ class TestPruneStale:
     def test_prune_removes_old_buckets(self, monkeypatch):
         import time as time_module
 
-        real_time = time_module.time
+        real_time = time_module.monotonic
         fake_now = {"value": real_time() - 10000}
-        monkeypatch.setattr(user_rate_limit.time, "time", lambda: fake_now["value"])
+        monkeypatch.setattr(user_rate_limit._limiter.local, "clock", lambda: fake_now["value"])
 
         check_user_rate_limit(
             user_id=1, bucket="stale", max_requests=10, window_seconds=60
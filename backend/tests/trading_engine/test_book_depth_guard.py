@@ -709,3 +709,38 @@ class TestFmtPrice:
         assert proceed is False
         assert "$0.00)" not in reason  # Must NOT show $0.00
         assert "$0.0035" in reason  # Should show meaningful decimals
+
+
+# ===========================================================================
+# Local order book
+# ===========================================================================
+
+
+class TestLocalOrderBookPath:
+    """A trusted local book is walked in-process; REST is not called."""
+
+    @pytest.mark.asyncio
+    async def test_guards_read_the_local_book(self):
+        """Happy path: the streamed book decides both checks with no fetch."""
+        from app.monitor.order_book_store import order_books
+
+        order_books.apply_snapshot(
+            "BTC-USD",
+            bids=[(50000.0, 0.05), (49000.0, 10.0)],
+            asks=[(50010.0, 0.05), (51000.0, 10.0)],
+        )
+        exchange = AsyncMock()
+        exchange.get_product_book = AsyncMock(side_effect=AssertionError("network I/O"))
+        position = MagicMock()
+        position.total_base_acquired = 1.0
+        position.average_buy_price = 40000.0
+
+        sell_ok, sell_reason = await check_sell_slippage(
+            exchange, "BTC-USD", position, {"take_profit_mode": "fixed", "max_sell_slippage_pct": 0.5},
+        )
+        buy_ok, buy_reason = await check_buy_slippage(exchange, "BTC-USD", 10000.0, {"max_buy_slippage_pct": 0.5})
+
+        # 0.05 @ 50000 + 0.95 @ 49000 → ~1.9% below best bid; the buy walks into 51000 too
+        assert sell_ok is False and "Sell slippage" in sell_reason
+        assert buy_ok is False and "Buy slippage" in buy_reason
+        exchange.get_product_book.assert_not_called()
@@ -16,6 +16,7 @@ interface PnLDataPoint {
   product_id?: string
   bot_id?: number
   bot_name?: string
+  trade_count?: number
 }
 
 interface DailyPnL {
@@ -372,14 +373,15 @@ export function PnLChart({ accountId, onTimeRangeChange }: PnLChartProps) {
         break
     }
 
-    // Always use summary data for stats (one entry per position, not per day/pair)
+    // Always use summary data for stats (one daily rollup per bot/pair/day, not by_day/by_pair)
     // This ensures stats are consistent regardless of which tab is active
     const filteredSummary = data.summary.filter((item) => new Date(item.date) >= cutoffDate)
 
-    // Sum up profits for positions within the selected time range (not cumulative_pnl which is all-time running total)
+    // Sum up daily profits within the selected time range (not cumulative_pnl which is all-time running total)
     const totalPnLUSD = filteredSummary.reduce((sum, item) => sum + item.profit_usd, 0)
     const totalPnLBTC = filteredSummary.reduce((sum, item) => sum + item.profit_btc, 0)
-    const closedTrades = filteredSummary.length
+    // Summary rows are per bot/pair/day rollups; each carries its trade count
+    const closedTrades = filteredSummary.reduce((sum, item) => sum + (item.trade_count ?? 1), 0)
 
     // Calculate by_pair from filtered summary data (respects time range)
     const pairPnLMap = new Map<string, { usd: number; btc: number }>()
@@ -545,7 +547,7 @@ export function PnLChart({ accountId, onTimeRangeChange }: PnLChartProps) {
     const filteredData = getFilteredData() as PnLDataPoint[]
     if (filteredData.length === 0) return
 
-    // First, aggregate profits by day (multiple positions can close on same day)
+    // First, aggregate profits by day (one summary point per bot/pair on each day)
     const dailyProfitsUSD = new Map<string, number>()
     const dailyProfitsBTC = new Map<string, number>()
     filteredData.forEach((point) => {
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: DSL script evaluations per second, AST interpreter vs compiled closures.
+
+Runs a typical multi-rule script against N randomized market-data contexts:
+
+- evaluate: dsl_interpreter.evaluate on the already-parsed statements
+- run: CompiledScript.run (dsl_compiler)
+- per cycle: what a bot pays per tick when its strategy is rebuilt each
+  cycle — parse_script + evaluate before, cached compile_script + run now
+
+    python scripts/bench_dsl.py
+    python scripts/bench_dsl.py --contexts 20000 --repeat 5
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from app.strategies.dsl_compiler import compile_script  # noqa: E402
+from app.strategies.dsl_interpreter import evaluate, parse_script  # noqa: E402
+
+SCRIPT = """
+if rsi(14) < 30 and price('BTC-USD') > 40000: limit('buy', 'BTC-USD', 0.01, price='-1%')
+if rsi(14) > 70 or bb_pct() > 0.95: market('sell', 'BTC-USD', all)
+if macd() > 0 and 0.2 < bb_pct() < 0.8 and not price('ETH-USD') < 2000: limit('buy', 'ETH-USD', 0.5)
+if price('SOL-USD') >= 150 and rsi(7) <= 25: market('buy', 'SOL-USD', 2)
+"""
+
+
+def make_contexts(n, rng):
+    return [
+        {
+            "price": {
+                "BTC-USD": rng.uniform(30000, 60000),
+                "ETH-USD": rng.uniform(1500, 3500),
+                "SOL-USD": rng.uniform(100, 200),
+            },
+            "rsi": {14: rng.uniform(0, 100), 7: rng.uniform(0, 100)},
+            "macd": {"line": rng.uniform(-5, 5)},
+            "bb_pct": rng.uniform(0, 1),
+        }
+        for _ in range(n)
+    ]
+
+
+def best_rate(fn, contexts, repeat):
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for context in contexts:
+            fn(context)
+        best = max(best, len(contexts) / (time.perf_counter() - start))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contexts", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    contexts = make_contexts(args.contexts, random.Random(42))
+    parsed = parse_script(SCRIPT)
+    compiled = compile_script(SCRIPT)
+
+    mismatches = sum(evaluate(parsed, c) != compiled.run(c) for c in contexts)
+
+    rates = {
+        "evaluate": best_rate(lambda c: evaluate(parsed, c), contexts, args.repeat),
+        "run": best_rate(compiled.run, contexts, args.repeat),
+        "parse+evaluate": best_rate(lambda c: evaluate(parse_script(SCRIPT), c), contexts, args.repeat),
+        "compile+run": best_rate(lambda c: compile_script(SCRIPT).run(c), contexts, args.repeat),
+    }
+
+    print(f"{args.contexts} contexts, {len(parsed)} rules, {len(compiled.data_calls)} data calls, "
+          f"best of {args.repeat}")
+    print(f"{'':>10} {'interpreter/s':>14} {'compiled/s':>12} {'speedup':>8}")
+    for label, before, after in (
+        ("per eval", rates["evaluate"], rates["run"]),
+        ("per cycle", rates["parse+evaluate"], rates["compile+run"]),
+    ):
+        print(f"{label:>10} {before:>14,.0f} {after:>12,.0f} {after / before:>7.1f}x")
+    if mismatches:
+        print(f"WARNING: {mismatches} contexts disagree")
+
+
+if __name__ == "__main__":
+    main()
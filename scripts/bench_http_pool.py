@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-request latency of a fresh httpx client per call vs the pooled client.
+
+Runs a local stand-in HTTPS server (self-signed certificate, keep-alive) and
+issues the same GET sequentially through both paths:
+
+- fresh:  ``async with httpx.AsyncClient() as client`` per request, as
+          _public_request / authenticated_request used to do (TCP + TLS every call)
+- pooled: ``http_pool.client(url)`` from app/http_pool.py (warm keep-alive connection)
+
+    python scripts/bench_http_pool.py
+    python scripts/bench_http_pool.py --requests 500 --plain   # no TLS
+"""
+
+import argparse
+import asyncio
+import datetime
+import os
+import ssl
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+import httpx  # noqa: E402
+
+from app.http_pool import HttpClientPool  # noqa: E402
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+    def do_GET(self):
+        body = b'{"price": "50000.00"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def self_signed_cert(directory):
+    """Write a localhost certificate + key; returns (cert_path, key_path)."""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+    import ipaddress
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name).issuer_name(name).public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1)).not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]), False)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), True)
+        .sign(key, hashes.SHA256())
+    )
+    cert_path, key_path = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    with open(cert_path, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption(),
+        ))
+    return cert_path, key_path
+
+
+def start_server(tls_dir):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    scheme = "http"
+    if tls_dir is not None:
+        cert_path, key_path = self_signed_cert(tls_dir)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert_path, key_path)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        os.environ["SSL_CERT_FILE"] = cert_path  # trusted by both client paths
+        scheme = "https"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"{scheme}://127.0.0.1:{server.server_address[1]}/api/v3/brokerage/market/products/BTC-USD"
+
+
+async def timed(n, request):
+    latencies = []
+    for _ in range(n):
+        start = time.perf_counter()
+        resp = await request()
+        resp.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+async def run(url, n):
+    async def fresh():
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            return await client.get(url)
+
+    pool = HttpClientPool()
+
+    async def pooled():
+        return await pool.client(url).get(url, timeout=10.0)
+
+    await fresh()  # warm imports / SSL context caches
+    results = {"fresh": await timed(n, fresh), "pooled": await timed(n, pooled)}
+    await pool.aclose()
+    return results, pool.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--plain", action="store_true", help="plain HTTP instead of TLS")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tls_dir:
+        server, url = start_server(None if args.plain else tls_dir)
+        try:
+            results, stats = asyncio.run(run(url, args.requests))
+        finally:
+            server.shutdown()
+
+    print(f"{args.requests} sequential GETs against {url.split('/api')[0]}")
+    print(f"{'client':>8} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for name, latencies in results.items():
+        p95 = statistics.quantiles(latencies, n=20)[-1]
+        print(f"{name:>8} {statistics.mean(latencies):>9.2f} {statistics.median(latencies):>8.2f} {p95:>8.2f}")
+    print(f"pooled: {stats['connections_opened']} connection(s) opened, reuse ratio {stats['reuse_ratio']:.2%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-cycle indicator CPU time, scalar vs vectorized batch path.
+
+Simulates one monitor cycle of a bot scanning N pairs with a typical
+condition set (RSI, MACD, SMA/EMA, Bollinger, stochastic, volume RSI, VWAP)
+and crossing detection on. The scalar path calls
+IndicatorCalculator.calculate_all_indicators once per pair; the batch path
+stacks the pairs and calls indicator_batch.calculate_indicators_batch once.
+
+    python scripts/bench_indicator_batch.py
+    python scripts/bench_indicator_batch.py --pairs 10 100 500 --candles 200 --repeat 5
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from app.indicator_batch import calculate_indicators_batch, stack_candles  # noqa: E402
+from app.indicator_calculator import IndicatorCalculator  # noqa: E402
+
+REQUIRED = {
+    "price", "rsi_14", "volume_rsi_14", "macd_12_26_9", "sma_20", "ema_50",
+    "bb_upper_20_2", "stoch_k_14_3", "vwap",
+}
+
+
+def make_pairs(n_pairs, n_candles):
+    rng = random.Random(42)
+    pairs = []
+    for _ in range(n_pairs):
+        price = rng.uniform(0.001, 100)
+        candles = []
+        for i in range(n_candles):
+            price *= 1 + rng.uniform(-0.02, 0.02)
+            candles.append({
+                "start": 1_700_000_000 + i * 300,
+                "open": price,
+                "high": price * (1 + rng.uniform(0, 0.01)),
+                "low": price * (1 - rng.uniform(0, 0.01)),
+                "close": price,
+                "volume": rng.uniform(0, 1000),
+            })
+        pairs.append(candles)
+    return pairs
+
+
+def best_of(repeat, fn):
+    """Minimum process CPU time over ``repeat`` runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        fn()
+        best = min(best, time.process_time() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pairs", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--candles", type=int, default=200, help="candles per pair (default: 200)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    calc = IndicatorCalculator()
+    print(f"{len(REQUIRED)} indicator keys, {args.candles} candles/pair, "
+          f"calculate_previous=True, best of {args.repeat}")
+    print(f"{'pairs':>6} {'scalar ms':>11} {'batch ms':>10} {'stack ms':>10} {'speedup':>8}")
+    for n_pairs in args.pairs:
+        pairs = make_pairs(n_pairs, args.candles)
+
+        scalar_ms = best_of(args.repeat, lambda: [
+            calc.calculate_all_indicators(candles, REQUIRED, calculate_previous=True) for candles in pairs
+        ])
+        stack_ms = best_of(args.repeat, lambda: stack_candles(pairs))
+        batch = stack_candles(pairs)
+        batch_ms = best_of(args.repeat, lambda: calculate_indicators_batch(batch, REQUIRED, calculate_previous=True))
+
+        total = batch_ms + stack_ms
+        print(f"{n_pairs:>6} {scalar_ms:>11.1f} {batch_ms:>10.1f} {stack_ms:>10.1f} {scalar_ms / total:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Benchmark: UTC-suffixed datetimes via body-rewriting middleware vs at serialization time.
+
+Serves the same 1000-position payload through an in-process FastAPI app on
+two routes, each in the shape the app actually uses:
+
+- model: ``response_model=List[PositionResponse]`` (GET /api/positions/)
+- dict:  a plain list of dicts (jsonable_encoder path)
+
+and through two stacks:
+
+- middleware: stock JSONResponse + naive datetime fields, with the retired
+              DatetimeTimezoneMiddleware (``body += chunk`` + regex) re-created here
+- utc:        UTCJSONResponse default + UTCDatetime fields (app/json_response.py)
+
+Reports p50 / p99 request latency and the tracemalloc peak of one request.
+
+    python scripts/bench_json_response.py
+    python scripts/bench_json_response.py --requests 500 --positions 2000
+"""
+
+import argparse
+import asyncio
+import datetime
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.datastructures import Default  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import create_model  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+from starlette.responses import Response, StreamingResponse  # noqa: E402
+
+from app.json_response import UTCJSONResponse  # noqa: E402
+from app.schemas.position import PositionResponse  # noqa: E402
+
+# PositionResponse as it was before UTCDatetime: plain naive datetime fields
+LegacyPositionResponse = create_model(
+    "LegacyPositionResponse",
+    __base__=PositionResponse,
+    __module__=PositionResponse.__module__,  # resolves the "LimitOrderDetails" forward ref
+    opened_at=(datetime.datetime, ...),
+    closed_at=(Optional[datetime.datetime], ...),
+    last_error_timestamp=(Optional[datetime.datetime], None),
+)
+
+
+class DatetimeTimezoneMiddleware(BaseHTTPMiddleware):
+    """The removed app/middleware/datetime_timezone.py, verbatim."""
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        if response.headers.get("content-type", "").startswith("application/json") and not isinstance(
+            response, StreamingResponse
+        ):
+            body = b""
+            async for chunk in response.body_iterator:
+                body += chunk
+            modified_body = re.sub(rb'"(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?)"', rb'"\1Z"', body)
+            return Response(
+                content=modified_body,
+                status_code=response.status_code,
+                headers=dict(response.headers),
+                media_type=response.media_type,
+            )
+        return response
+
+
+def make_positions(n):
+    opened = datetime.datetime(2025, 11, 16, 1, 50, 13, 90200)
+    positions = []
+    for i in range(n):
+        closed = i % 3 == 0
+        positions.append({
+            "id": i, "bot_id": i % 20, "account_id": 1, "user_attempt_number": i, "user_deal_number": i,
+            "product_id": "ETH-BTC", "status": "closed" if closed else "open",
+            "opened_at": opened + datetime.timedelta(minutes=i),
+            "closed_at": opened + datetime.timedelta(minutes=i + 90) if closed else None,
+            "strategy_config_snapshot": {"take_profit_percentage": 2.5, "max_safety_orders": 5},
+            "initial_quote_balance": 0.05, "max_quote_allowed": 0.05, "total_quote_spent": 0.01234567,
+            "total_base_acquired": 0.3456789, "average_buy_price": 0.0357, "sell_price": 0.0366 if closed else None,
+            "total_quote_received": 0.0127 if closed else None, "profit_quote": 0.0003 if closed else None,
+            "profit_percentage": 2.5 if closed else None, "btc_usd_price_at_open": 91234.5,
+            "btc_usd_price_at_close": 92000.0 if closed else None, "profit_usd": 27.4 if closed else None,
+            "trade_count": 4, "safety_orders_deployed": 3,
+            "last_error_timestamp": opened if i % 10 == 0 else None,
+            "notes": "rebalanced 2025-11-16T01:50:13" if i % 7 == 0 else None,
+        })
+    return positions
+
+
+def build_app(stack, positions):
+    if stack == "middleware":
+        app = FastAPI()
+        app.add_middleware(DatetimeTimezoneMiddleware)
+        model = LegacyPositionResponse
+
+        @app.get("/dict")
+        async def as_dict():
+            # Stock encoder: naive isoformat, the middleware adds the Z
+            return JSONResponse(jsonable_encoder(positions, custom_encoder={
+                datetime.datetime: datetime.datetime.isoformat,
+            }))
+    else:
+        app = FastAPI(default_response_class=Default(UTCJSONResponse))
+        model = PositionResponse
+
+        @app.get("/dict")
+        async def as_dict():
+            return positions
+
+    @app.get("/model", response_model=List[model])
+    async def as_model():
+        return positions
+
+    return app
+
+
+async def measure(app, path, n):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        body = (await client.get(path)).content  # warm-up
+        latencies = []
+        for _ in range(n):
+            start = time.perf_counter()
+            resp = await client.get(path)
+            resp.raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+        tracemalloc.start()
+        await client.get(path)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return latencies, peak, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--positions", type=int, default=1000)
+    args = parser.parse_args()
+
+    positions = make_positions(args.positions)
+    print(f"{args.requests} sequential GETs, {args.positions} positions per response")
+    print(f"{'route':>6} {'stack':>11} {'p50 ms':>8} {'p99 ms':>8} {'peak KiB':>9} {'bytes':>9}")
+    for path in ("/model", "/dict"):
+        for stack in ("middleware", "utc"):
+            latencies, peak, body = asyncio.run(measure(build_app(stack, positions), path, args.requests))
+            p99 = statistics.quantiles(latencies, n=100)[-1]
+            print(f"{path:>6} {stack:>11} {statistics.median(latencies):>8.2f} {p99:>8.2f} "
+                  f"{peak / 1024:>9.0f} {len(body):>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: LocalOrderBook update and VWAP throughput.
+
+Loads a synthetic book with N levels per side, applies random level2-style
+updates clustered near the touch (resizes, inserts and removals), then times
+the depth queries the slippage guard and paper fills run, next to the
+dict-list walker they replace.
+
+    python scripts/bench_order_book.py
+    python scripts/bench_order_book.py --levels 100 1000 10000 --updates 200000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from app.monitor.order_book_store import LocalOrderBook  # noqa: E402
+from app.trading_engine.book_depth_guard import calculate_vwap_from_bids  # noqa: E402
+
+MID = 50000.0
+TICK = 0.01
+
+
+def make_updates(n_levels, n_updates, rng):
+    updates = []
+    for _ in range(n_updates):
+        side = rng.choice(("bid", "offer"))
+        # Most churn lands within the first few dozen levels of the touch
+        offset = min(int(rng.expovariate(1 / 20)) + 1, n_levels)
+        price = round(MID - offset * TICK if side == "bid" else MID + offset * TICK, 2)
+        size = 0.0 if rng.random() < 0.2 else rng.uniform(0.01, 2)
+        updates.append((side, price, size))
+    return updates
+
+
+def timed(fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--updates", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{args.updates} updates, {args.queries} queries per book; VWAP over ~25 levels")
+    print(f"{'levels':>7} {'update us':>10} {'sell us':>8} {'buy us':>8} {'list us':>8}")
+    for n_levels in args.levels:
+        rng = random.Random(42)
+        bids = [(round(MID - i * TICK, 2), rng.uniform(0.01, 2)) for i in range(1, n_levels + 1)]
+        asks = [(round(MID + i * TICK, 2), rng.uniform(0.01, 2)) for i in range(1, n_levels + 1)]
+        book = LocalOrderBook()
+        book.load(bids, asks)
+        updates = make_updates(n_levels, args.updates, rng)
+
+        start = time.perf_counter()
+        for side, price, size in updates:
+            book.update(side, price, size)
+        update_us = (time.perf_counter() - start) / len(updates) * 1e6
+
+        base = sum(size for _, size in book.bids(25))
+        quote = sum(price * size for price, size in book.asks(25))
+        sell_us = timed(lambda: book.sell_vwap(base), args.queries)
+        buy_us = timed(lambda: book.buy_vwap_quote(quote), args.queries)
+
+        # The REST path: walk a {"price", "size"} string list as returned by product_book
+        rest_bids = [{"price": str(p), "size": str(s)} for p, s in book.bids(n_levels)]
+        list_us = timed(lambda: calculate_vwap_from_bids(rest_bids, base), args.queries)
+
+        print(f"{n_levels:>7} {update_us:>10.2f} {sell_us:>8.2f} {buy_us:>8.2f} {list_us:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
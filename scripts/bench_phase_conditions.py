@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: phase-condition evaluation, interpreted vs compiled plan.
+
+Evaluates a typical grouped base-order expression (RSI, MACD crossing,
+Bollinger %, EMA cross, volume) against N randomized indicator snapshots.
+The interpreted path is PhaseConditionEvaluator.evaluate_expression with
+detail capture, which is what every check did before plans; the compiled
+path is the cached ConditionPlan that signal-only checks now use.
+
+    python scripts/bench_phase_conditions.py
+    python scripts/bench_phase_conditions.py --snapshots 20000 --repeat 5
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from app.indicator_calculator import IndicatorCalculator  # noqa: E402
+from app.phase_condition_plan import compile_condition_plan  # noqa: E402
+from app.phase_conditions import PhaseConditionEvaluator  # noqa: E402
+
+EXPRESSION = {
+    "groupLogic": "and",
+    "groups": [
+        {"logic": "and", "conditions": [
+            {"type": "rsi", "operator": "less_than", "value": 35, "timeframe": "FIVE_MINUTE"},
+            {"type": "macd", "operator": "crossing_above", "value": 0, "timeframe": "FIVE_MINUTE"},
+        ]},
+        {"logic": "or", "conditions": [
+            {"type": "bb_percent", "operator": "less_than", "value": 20, "timeframe": "ONE_HOUR"},
+            {"type": "ema_cross", "operator": "crossing_above", "value": 0, "period": 50,
+             "timeframe": "ONE_HOUR"},
+            {"type": "volume", "operator": "greater_than", "value": 1000, "timeframe": "FIVE_MINUTE"},
+        ]},
+    ],
+}
+
+
+def make_snapshots(keys, n, rng):
+    snapshots = []
+    for _ in range(n):
+        current = {key: rng.uniform(0, 100) for key in keys}
+        previous = {key: rng.uniform(0, 100) for key in keys}
+        snapshots.append((current, previous))
+    return snapshots
+
+
+def best_rate(fn, snapshots, repeat):
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for current, previous in snapshots:
+            fn(current, previous)
+        best = max(best, len(snapshots) / (time.perf_counter() - start))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--snapshots", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    evaluator = PhaseConditionEvaluator(IndicatorCalculator())
+    plan = compile_condition_plan(EXPRESSION)
+    keys = [key[len("prev_"):] if key.startswith("prev_") else key for key in plan.keys]
+    snapshots = make_snapshots(sorted(set(keys)), args.snapshots, random.Random(42))
+
+    def interpreted(current, previous):
+        return evaluator.evaluate_expression(EXPRESSION, current, previous, capture_details=True)[0]
+
+    mismatches = sum(interpreted(c, p) != plan.evaluate(c, p) for c, p in snapshots)
+    interp_rate = best_rate(interpreted, snapshots, args.repeat)
+    plan_rate = best_rate(plan.evaluate, snapshots, args.repeat)
+
+    print(f"{args.snapshots} snapshots, {len(plan.keys)} indicator slots, best of {args.repeat}")
+    print(f"{'interpreted eval/s':>19} {'compiled eval/s':>16} {'speedup':>8}")
+    print(f"{interp_rate:>19,.0f} {plan_rate:>16,.0f} {plan_rate / interp_rate:>7.1f}x")
+    if mismatches:
+        print(f"WARNING: {mismatches} snapshots disagree")
+
+
+if __name__ == "__main__":
+    main()
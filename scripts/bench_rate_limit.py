@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: GCRA rate-limit checks vs the sliding-window timestamp lists.
+
+Replays a request stream over K keys (a few hot keys near their limit, a long
+tail of one-off visitors, like login/public traffic) through the in-process
+GCRALimiter and through the per-key timestamp list the limiters used before,
+then measures resident memory per 100k keys for each with tracemalloc.
+
+    python scripts/bench_rate_limit.py
+    python scripts/bench_rate_limit.py --keys 1000 100000 --checks 500000 --limit 120
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from app.rate_limit_engine import GCRALimiter  # noqa: E402
+
+
+class SlidingWindow:
+    """The previous in-memory limiter: a list of timestamps per key, filtered on every check."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.store = defaultdict(list)
+
+    def hit(self, key, limit, window):
+        now = self.clock()
+        cutoff = now - window
+        timestamps = self.store[key]
+        timestamps[:] = [t for t in timestamps if t > cutoff]
+        if len(timestamps) >= limit:
+            return False
+        timestamps.append(now)
+        return True
+
+
+def make_stream(n_keys, n_checks, rng):
+    # 80% of checks land on the hottest 1% of keys
+    hot = max(1, n_keys // 100)
+    return [
+        f"10.0.{i // 256}.{i % 256}" for i in (
+            rng.randrange(hot) if rng.random() < 0.8 else rng.randrange(n_keys)
+            for _ in range(n_checks)
+        )
+    ]
+
+
+def run(check, stream, limit, window, clock, step):
+    allowed = 0
+    start = time.perf_counter()
+    for key in stream:
+        clock[0] += step
+        allowed += check(key, limit, window)
+    return len(stream) / (time.perf_counter() - start), allowed
+
+
+def memory_per_100k(make, n_keys, fill, limit, window, clock):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    limiter = make()
+    for i in range(n_keys):
+        for _ in range(fill):
+            limiter.hit(f"k{i}", limit, window)
+    used = sum(s.size_diff for s in tracemalloc.take_snapshot().compare_to(before, "filename"))
+    tracemalloc.stop()
+    return used / n_keys * 100_000 / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--checks", type=int, default=300000)
+    parser.add_argument("--limit", type=int, default=120)
+    parser.add_argument("--window", type=float, default=60.0)
+    parser.add_argument("--fill", type=int, default=5, help="requests recorded per key in the memory run")
+    args = parser.parse_args()
+
+    clock = [0.0]
+    now = lambda: clock[0]  # noqa: E731
+    # Simulated traffic: the whole stream spans two windows
+    step = 2 * args.window / args.checks
+
+    print(f"{args.checks} checks, limit {args.limit} per {args.window:g}s; memory with {args.fill} hits per key")
+    print(f"{'keys':>7} {'gcra chk/s':>11} {'list chk/s':>11} {'gcra MB/100k':>13} {'list MB/100k':>13}")
+    for n_keys in args.keys:
+        stream = make_stream(n_keys, args.checks, random.Random(42))
+
+        clock[0] = 0.0
+        gcra = GCRALimiter(now)
+        gcra_rate, gcra_allowed = run(
+            lambda *a: gcra.hit(*a).allowed, stream, args.limit, args.window, clock, step,
+        )
+        clock[0] = 0.0
+        list_rate, list_allowed = run(SlidingWindow(now).hit, stream, args.limit, args.window, clock, step)
+
+        mem_keys = min(n_keys, 100_000)
+        gcra_mb = memory_per_100k(lambda: GCRALimiter(now), mem_keys, args.fill, args.limit, args.window, clock)
+        list_mb = memory_per_100k(lambda: SlidingWindow(now), mem_keys, args.fill, args.limit, args.window, clock)
+
+        print(f"{n_keys:>7} {gcra_rate:>11,.0f} {list_rate:>11,.0f} {gcra_mb:>13.1f} {list_mb:>13.1f}")
+        if gcra_allowed != list_allowed:
+            print(f"        admitted: gcra {gcra_allowed}, list {list_allowed} (GCRA refills gradually)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: TriangularDetector per-tick cost on a synthetic exchange.
+
+Builds a Coinbase-shaped graph (a handful of quote hubs, every alt listed
+against a few of them), feeds random ticker updates and reports the mean
+update_ticker time and the mean find_profitable_paths time over all hubs.
+
+    python scripts/bench_triangular_detector.py
+    python scripts/bench_triangular_detector.py --pairs 100 500 1000 --ticks 20000
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from app.price_feeds.triangular_detector import TriangularDetector  # noqa: E402
+
+HUBS = ["USD", "USDC", "USDT", "BTC", "ETH", "EUR"]
+
+
+def make_products(n_pairs, rng):
+    products = [f"{a}-{b}" for i, a in enumerate(HUBS) for b in HUBS[i + 1:]]
+    alt = 0
+    while len(products) < n_pairs:
+        alt += 1
+        for hub in rng.sample(HUBS, rng.randint(1, 4)):
+            products.append(f"ALT{alt}-{hub}")
+    return products[:n_pairs]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pairs", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--ticks", type=int, default=10000)
+    args = parser.parse_args()
+
+    print(f"{args.ticks} random ticks per graph")
+    print(f"{'pairs':>6} {'cycles':>7} {'build ms':>9} {'tick us':>8} {'scan us':>8}")
+    for n_pairs in args.pairs:
+        rng = random.Random(42)
+        products = make_products(n_pairs, rng)
+
+        start = time.perf_counter()
+        detector = TriangularDetector(products, fee_pct=Decimal("0.6"))
+        build_ms = (time.perf_counter() - start) * 1000
+
+        # Consistent cross rates (each currency has a USD value), so ticks
+        # jitter around no-arbitrage prices as on a real exchange.
+        usd_value = {c: rng.uniform(0.01, 100) for c in detector.currencies}
+        mids = {p: usd_value[p.split("-")[0]] / usd_value[p.split("-")[1]] for p in products}
+        ticks = []
+        for _ in range(args.ticks):
+            product = rng.choice(products)
+            mid = mids[product] * (1 + rng.uniform(-0.001, 0.001))
+            ticks.append((product, Decimal(f"{mid * 0.9995:.8f}"), Decimal(f"{mid * 1.0005:.8f}")))
+        for product, mid in mids.items():
+            detector.update_ticker(product, Decimal(f"{mid:.8f}"), Decimal(f"{mid * 1.001:.8f}"))
+
+        start = time.perf_counter()
+        for product, bid, ask in ticks:
+            detector.update_ticker(product, bid, ask)
+        tick_us = (time.perf_counter() - start) / len(ticks) * 1e6
+
+        async def scan(n):
+            for _ in range(n):
+                await detector.find_profitable_paths(HUBS, Decimal("0.1"), Decimal("1"), 20)
+
+        scans = 1000
+        start = time.perf_counter()
+        asyncio.run(scan(scans))
+        scan_us = (time.perf_counter() - start) / scans * 1e6
+
+        print(f"{n_pairs:>6} {detector.cycle_count:>7} {build_ms:>9.1f} {tick_us:>8.1f} {scan_us:>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
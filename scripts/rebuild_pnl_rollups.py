@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Rebuild realized-P&L daily rollups from closed positions. Dry-run by default."""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+
+async def main(account_ids, commit: bool) -> None:
+    from app.database import async_session_maker
+    from app.services.pnl_rollup_service import rebuild_rollups
+
+    async with async_session_maker() as db:
+        written = await rebuild_rollups(db, account_ids or None)
+        scope = f"accounts {account_ids}" if account_ids else "all accounts"
+        print(f"Rebuilt {written} rollup rows for {scope}")
+        if commit:
+            await db.commit()
+            print("Committed rollup rebuild")
+        else:
+            await db.rollback()
+            print("Dry run only; pass --yes to commit")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--account-id", type=int, action="append", dest="account_ids")
+    parser.add_argument("--yes", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.account_ids, args.yes))